@@ -15,6 +15,8 @@ Interpretation:
 
 from typing import Optional
 
+import numpy as np
+
 from app.analytics.logic.types import (
     BaselineMetrics,
     EntityMetrics,
@@ -174,3 +176,79 @@ def batch_scaling_scores(
     # Sort by score (best opportunities first)
     results.sort(key=lambda x: x.score, reverse=True)
     return results
+
+
+def scaling_score_arrays(
+    today: dict[str, np.ndarray],
+    baseline: dict[str, np.ndarray],
+    params: Optional[ScoringParams] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized scaling score for many entities at once.
+
+    Mirrors ``scaling_score`` element-wise (without EMA smoothing or
+    recommendation text) so nightly jobs can score every campaign of a
+    tenant in one pass.
+
+    Args:
+        today: Arrays keyed by ``roas``, ``cpa``, ``cvr``, ``ctr``,
+            ``conversions`` and optionally ``frequency`` / ``emq_score``
+            (NaN where unknown)
+        baseline: Arrays keyed by ``roas``, ``cpa``, ``cvr``, ``ctr``
+        params: Scoring configuration parameters
+
+    Returns:
+        Tuple of (scores rounded to 4 places, actions as ScalingAction values)
+    """
+    if params is None:
+        params = ScoringParams()
+
+    def _pct_change(new: np.ndarray, old: np.ndarray) -> np.ndarray:
+        new = np.asarray(new, dtype=float)
+        old = np.asarray(old, dtype=float)
+        safe_old = np.where(np.abs(old) < 1e-9, 1.0, np.abs(old))
+        return np.where(np.abs(old) < 1e-9, 0.0, (new - old) / safe_old)
+
+    d_roas = _pct_change(today["roas"], baseline["roas"])
+    d_cpa = _pct_change(today["cpa"], baseline["cpa"])
+    d_cvr = _pct_change(today["cvr"], baseline["cvr"])
+    d_ctr = _pct_change(today["ctr"], baseline["ctr"])
+
+    conversions = np.asarray(today["conversions"], dtype=float)
+    size = conversions.shape
+    frequency = np.asarray(today.get("frequency", np.full(size, np.nan)), dtype=float)
+    emq = np.asarray(today.get("emq_score", np.full(size, np.nan)), dtype=float)
+
+    # Risk penalties (NaN comparisons are False, matching the None checks)
+    freq_target = params.freq_target
+    freq_penalty = np.where(
+        frequency > 0, np.clip((frequency - freq_target) / freq_target, 0.0, 1.0), 0.0
+    )
+    emq_penalty = np.where(
+        emq < params.emq_target,
+        np.clip((params.emq_target - emq) / params.emq_target, 0.0, 1.0),
+        0.0,
+    )
+    safe_conversions = np.where(conversions > 0, conversions, 1.0)
+    vol_penalty = np.where(
+        conversions > 0,
+        np.clip(params.min_conversions / safe_conversions, 0.0, 1.0),
+        1.0,
+    )
+
+    score = (
+        params.roas_weight * np.clip(d_roas, -1.0, 1.0)
+        + params.cpa_weight * np.clip(-d_cpa, -1.0, 1.0)
+        + params.cvr_weight * np.clip(d_cvr, -1.0, 1.0)
+        + params.ctr_weight * np.clip(d_ctr, -1.0, 1.0)
+    )
+    score = score * (1 - params.freq_penalty_weight * freq_penalty)
+    score = score * (1 - params.emq_penalty_weight * emq_penalty)
+    score = score * (1 - params.vol_penalty_weight * vol_penalty)
+
+    actions = np.select(
+        [score >= params.scale_threshold, score <= params.fix_threshold],
+        [ScalingAction.SCALE.value, ScalingAction.FIX.value],
+        default=ScalingAction.WATCH.value,
+    )
+    return np.round(score, 4), actions
@@ -16,6 +16,8 @@ Thresholds:
 
 from typing import List, Optional
 
+import numpy as np
+
 from app.analytics.logic.types import (
     SignalHealthParams,
     SignalHealthResult,
@@ -117,6 +119,48 @@ def signal_health(
     )
 
 
+def signal_health_status_arrays(
+    emq_score: np.ndarray,
+    event_loss_pct: np.ndarray,
+    api_health: Optional[np.ndarray] = None,
+    params: Optional[SignalHealthParams] = None,
+) -> np.ndarray:
+    """
+    Vectorized ``signal_health`` status for many entities at once.
+
+    Args:
+        emq_score: EMQ scores (NaN where unknown)
+        event_loss_pct: Event loss percentages (NaN where unknown)
+        api_health: Boolean API health per entity (defaults to healthy)
+        params: Health check thresholds
+
+    Returns:
+        Array of SignalHealthStatus values
+    """
+    if params is None:
+        params = SignalHealthParams()
+
+    emq = np.asarray(emq_score, dtype=float)
+    loss = np.asarray(event_loss_pct, dtype=float)
+    if api_health is None:
+        api_health = np.ones(emq.shape, dtype=bool)
+    api_ok = np.asarray(api_health, dtype=bool)
+
+    # NaN comparisons are False, so unknown metrics never trip a threshold
+    degraded = (emq < params.emq_risk) | (loss > params.event_loss_risk)
+    risk = (emq < params.emq_healthy) | (loss > params.event_loss_healthy)
+
+    return np.select(
+        [~api_ok, degraded, risk],
+        [
+            SignalHealthStatus.CRITICAL.value,
+            SignalHealthStatus.DEGRADED.value,
+            SignalHealthStatus.RISK.value,
+        ],
+        default=SignalHealthStatus.HEALTHY.value,
+    )
+
+
 def auto_resolve(
     health_result: SignalHealthResult,
 ) -> dict:
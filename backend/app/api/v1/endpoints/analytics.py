@@ -21,6 +21,7 @@ from app.schemas import (
     HeatmapDataResponse,
     KPITileResponse,
 )
+from app.services import dashboard_rollups
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -386,42 +387,38 @@ async def get_platform_breakdown(
     """
     tenant_id = getattr(request.state, "tenant_id", None)
 
-    result = await db.execute(
-        select(
-            Campaign.platform,
-            func.sum(Campaign.total_spend_cents).label("spend"),
-            func.sum(Campaign.revenue_cents).label("revenue"),
-            func.sum(Campaign.impressions).label("impressions"),
-            func.sum(Campaign.clicks).label("clicks"),
-            func.sum(Campaign.conversions).label("conversions"),
-            func.count(Campaign.id).label("campaign_count"),
-        )
+    totals_by_platform = await dashboard_rollups.platform_totals(db, tenant_id)
+    counts_result = await db.execute(
+        select(Campaign.platform, func.count(Campaign.id).label("campaign_count"))
         .where(
             Campaign.tenant_id == tenant_id,
             Campaign.is_deleted == False,
         )
         .group_by(Campaign.platform)
     )
-    rows = result.all()
+    campaign_counts = {row.platform: row.campaign_count for row in counts_result}
 
     breakdown = []
-    for row in rows:
-        spend = (row.spend or 0) / 100
-        revenue = (row.revenue or 0) / 100
+    for platform, campaign_count in campaign_counts.items():
+        totals = totals_by_platform.get(platform, {})
+        spend = totals.get("spend_cents", 0) / 100
+        revenue = totals.get("revenue_cents", 0) / 100
+        impressions = totals.get("impressions", 0)
+        clicks = totals.get("clicks", 0)
         roas = revenue / spend if spend > 0 else 0
-        ctr = ((row.clicks or 0) / (row.impressions or 1)) * 100
+        ctr = (clicks / (impressions or 1)) * 100
 
         breakdown.append(
             {
-                "platform": row.platform.value,
+                "platform": platform.value,
                 "spend": spend,
                 "revenue": revenue,
                 "roas": round(roas, 2),
-                "impressions": row.impressions or 0,
-                "clicks": row.clicks or 0,
-                "conversions": row.conversions or 0,
+                "impressions": impressions,
+                "clicks": clicks,
+                "conversions": totals.get("conversions", 0),
                 "ctr": round(ctr, 2),
-                "campaign_count": row.campaign_count,
+                "campaign_count": campaign_count,
             }
         )
 
@@ -541,48 +538,53 @@ async def get_performance_trends(
     tenant_id = getattr(request.state, "tenant_id", None)
     start_date = date.today() - timedelta(days=days)
 
-    query = select(
-        CampaignMetric.date,
-        func.sum(CampaignMetric.spend_cents).label("spend"),
-        func.sum(CampaignMetric.revenue_cents).label("revenue"),
-        func.sum(CampaignMetric.impressions).label("impressions"),
-        func.sum(CampaignMetric.clicks).label("clicks"),
-        func.sum(CampaignMetric.conversions).label("conversions"),
-    ).where(
-        CampaignMetric.tenant_id == tenant_id,
-        CampaignMetric.date >= start_date,
-    )
-
     if account_id:
-        query = query.join(Campaign, Campaign.id == CampaignMetric.campaign_id).where(
-            Campaign.account_id == account_id
+        # The rollup has no account dimension; account views sum metric rows.
+        query = (
+            select(
+                CampaignMetric.date,
+                func.sum(CampaignMetric.spend_cents).label("spend_cents"),
+                func.sum(CampaignMetric.revenue_cents).label("revenue_cents"),
+                func.sum(CampaignMetric.impressions).label("impressions"),
+                func.sum(CampaignMetric.clicks).label("clicks"),
+                func.sum(CampaignMetric.conversions).label("conversions"),
+            )
+            .join(Campaign, Campaign.id == CampaignMetric.campaign_id)
+            .where(
+                CampaignMetric.tenant_id == tenant_id,
+                CampaignMetric.date >= start_date,
+                Campaign.account_id == account_id,
+            )
+            .group_by(CampaignMetric.date)
+            .order_by(CampaignMetric.date)
+            .limit(1000)
         )
-
-    query = (
-        query.group_by(CampaignMetric.date).order_by(CampaignMetric.date).limit(1000)
-    )
-
-    result = await db.execute(query)
-    rows = result.all()
+        result = await db.execute(query)
+        days_totals = [
+            (row.date, {k: v or 0 for k, v in row._mapping.items() if k != "date"})
+            for row in result.all()
+        ]
+    else:
+        days_totals = await dashboard_rollups.daily_totals(db, tenant_id, start_date)
 
     trends = []
-    for row in rows:
-        spend = (row.spend or 0) / 100
-        revenue = (row.revenue or 0) / 100
+    for day, totals in days_totals:
+        spend = totals["spend_cents"] / 100
+        revenue = totals["revenue_cents"] / 100
         roas = revenue / spend if spend > 0 else 0
 
         value = {
             "spend": spend,
             "revenue": revenue,
-            "impressions": row.impressions or 0,
-            "clicks": row.clicks or 0,
-            "conversions": row.conversions or 0,
+            "impressions": totals["impressions"],
+            "clicks": totals["clicks"],
+            "conversions": totals["conversions"],
             "roas": round(roas, 2),
         }.get(metric, 0)
 
         trends.append(
             {
-                "date": row.date.isoformat(),
+                "date": day.isoformat(),
                 "value": value,
             }
         )
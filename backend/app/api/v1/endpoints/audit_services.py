@@ -22,6 +22,11 @@ Security features:
 - Structured audit logging
 """
 
+import asyncio
+import contextlib
+import os
+import shutil
+import tempfile
 import threading
 import time
 from collections import defaultdict
@@ -34,18 +39,23 @@ from fastapi import (
     APIRouter,
     BackgroundTasks,
     Depends,
+    File,
+    Form,
     HTTPException,
     Query,
     Request,
+    UploadFile,
     status,
 )
 from pydantic import BaseModel, Field
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.uploads import MAX_OFFLINE_CSV_UPLOAD_BYTES, enforce_content_length
 from app.ml.ab_testing import ModelABTestingService
-from app.ml.explainability import ModelExplainer
+from app.ml.explainability import explainer_cache
 from app.ml.ltv_predictor import CustomerBehavior, LTVPredictor
 from app.ml.retraining_pipeline import RetrainingPipeline as ModelRetrainingPipeline
 from app.models import User
@@ -61,12 +71,19 @@ from app.services.competitor_benchmarking_service import (
     Industry,
     Region,
 )
-from app.services.conversion_latency_service import ConversionLatencyTracker
+from app.services.conversion_latency_service import (
+    ConversionLatencyTracker,
+    latency_sketch_store,
+    latency_tracker,
+)
 from app.services.creative_performance_service import CreativePerformanceService
 
 # Import services
 from app.services.emq_measurement_service import RealEMQService as EMQMeasurementService
-from app.services.offline_conversion_service import OfflineConversionService
+from app.services.offline_conversion_service import (
+    OfflineConversionService,
+    offline_conversion_service,
+)
 from app.tenancy.deps import get_current_user, get_db, get_tenant_id
 
 logger = get_logger(__name__)
@@ -596,6 +613,7 @@ async def upload_offline_conversions(
         result = await service.upload_conversions(
             conversions=conversions,
             platform=request.platform,
+            tenant_id=str(tenant_id),
         )
 
         return OfflineConversionUploadResponse(
@@ -619,6 +637,99 @@ async def upload_offline_conversions(
         )
 
 
+async def _run_csv_upload(path: str, platform: str, batch_id: str) -> None:
+    """Background body of the CSV upload; always removes the spooled copy."""
+    try:
+        await offline_conversion_service.upload_csv_stream(
+            path,
+            platform=platform,
+            batch_id=batch_id,
+            hash_workers=settings.offline_conversion_hash_workers,
+        )
+    finally:
+        with contextlib.suppress(OSError):
+            os.unlink(path)
+
+
+def _spool_to_disk(upload: UploadFile) -> str:
+    """Copy the request's spooled upload to a temp file that outlives it."""
+    with tempfile.NamedTemporaryFile(
+        prefix="offline_conversions_", suffix=".csv", delete=False
+    ) as out:
+        shutil.copyfileobj(upload.file, out)
+        return out.name
+
+
+@router.post(
+    "/offline-conversions/upload-csv",
+    response_model=OfflineConversionUploadResponse,
+    status_code=202,
+)
+async def upload_offline_conversions_csv(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    platform: str = Form(...),
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db),
+    tenant_id: int = Depends(get_tenant_id),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Stream an offline conversion CSV to an ad platform.
+
+    Returns the batch id immediately; the file is read, hashed and uploaded
+    chunk by chunk in the background. Poll
+    ``/offline-conversions/batches/{batch_id}`` for per-chunk progress.
+    """
+    if not (file.filename or "").lower().endswith(".csv"):
+        raise HTTPException(status_code=400, detail="File must be a CSV")
+    enforce_content_length(
+        request.headers.get("content-length"), MAX_OFFLINE_CSV_UPLOAD_BYTES
+    )
+    if not offline_conversion_service.supports_platform(platform):
+        raise HTTPException(status_code=400, detail=f"Unknown platform: {platform}")
+
+    # The request's spooled file is closed once the response is sent, so
+    # the background upload reads from its own copy.
+    try:
+        path = await asyncio.to_thread(_spool_to_disk, file)
+    except OSError as e:
+        logger.error("offline_conversion_csv_spool_failed", error=str(e))
+        return OfflineConversionUploadResponse(
+            success=False,
+            total_records=0,
+            errors=[str(e)],
+        )
+
+    batch = offline_conversion_service.create_batch(platform, tenant_id=str(tenant_id))
+    background_tasks.add_task(_run_csv_upload, path, platform, batch.batch_id)
+
+    return OfflineConversionUploadResponse(
+        success=True,
+        batch_id=batch.batch_id,
+        total_records=0,
+    )
+
+
+@router.get("/offline-conversions/batches/{batch_id}")
+async def get_conversion_batch_status(
+    batch_id: str,
+    db: AsyncSession = Depends(get_db),
+    tenant_id: int = Depends(get_tenant_id),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get status and per-chunk progress of an offline conversion batch.
+    """
+    batch_status = offline_conversion_service.get_batch_status(
+        batch_id, tenant_id=str(tenant_id)
+    )
+    if batch_status is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    return {"data": batch_status}
+
+
 @router.get("/offline-conversions/batches")
 async def list_conversion_batches(
     platform: Optional[str] = None,
@@ -631,8 +742,7 @@ async def list_conversion_batches(
     """
     List offline conversion upload batches.
     """
-    service = OfflineConversionService()
-    batches = service.list_batches(
+    batches = offline_conversion_service.list_batches(
         tenant_id=str(tenant_id),
         platform=platform,
         status=status,
@@ -765,8 +875,11 @@ async def get_latency_stats(
 ):
     """
     Get conversion latency statistics.
+
+    Stats are read from the quantile sketches of every live worker,
+    merged via Redis (falls back to this process if Redis is down).
     """
-    tracker = ConversionLatencyTracker()
+    tracker = await latency_sketch_store.merged_tracker(local=latency_tracker)
     stats_list = []
 
     platforms = [platform] if platform else ["meta", "google", "tiktok"]
@@ -804,7 +917,7 @@ async def get_latency_timeline(
     """
     Get latency timeline for visualization.
     """
-    tracker = ConversionLatencyTracker()
+    tracker = await latency_sketch_store.merged_tracker(local=latency_tracker)
     timeline = tracker.get_latency_timeline(
         platform=platform,
         event_type=event_type,
@@ -1363,7 +1476,7 @@ async def explain_prediction(
     """
     Get explanation for a model prediction.
     """
-    explainer = ModelExplainer(request.model_name, models_path="./models")
+    explainer = explainer_cache.get(request.model_name, models_path="./models")
 
     explanation = explainer.explain_prediction(
         features=request.features,
@@ -15,13 +15,12 @@ Provides consolidated endpoints for:
 All data is scoped to the authenticated user's tenant.
 """
 
-import csv
 import json
 import os
 from datetime import UTC, date, datetime, timedelta
 from enum import Enum
-from io import StringIO
-from typing import Optional
+from functools import partial
+from typing import Literal, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import StreamingResponse
@@ -44,6 +43,9 @@ from app.models import (
 from app.models.campaign_builder import ConnectionStatus, TenantPlatformConnection
 from app.models.onboarding import OnboardingStatus, TenantOnboarding
 from app.schemas import APIResponse
+from app.services import dashboard_export, dashboard_rollups
+from app.services.dashboard_cache import cached_insight
+from app.services.reporting.xlsx_stream import XLSX_MEDIA_TYPE
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
@@ -271,6 +273,7 @@ class ExportFormat(str, Enum):
 
     CSV = "csv"
     JSON = "json"
+    XLSX = "xlsx"
 
 
 class DashboardExportRequest(BaseModel):
@@ -281,6 +284,10 @@ class DashboardExportRequest(BaseModel):
     include_campaigns: bool = True
     include_metrics: bool = True
     include_recommendations: bool = True
+    # Resume a broken-off download: the section it stopped in and the last
+    # campaign ID received in that section
+    resume_section: Optional[Literal["campaigns", "recommendations"]] = None
+    resume_after_id: int = Field(default=0, ge=0)
 
 
 class BriefingChangeItem(BaseModel):
@@ -557,44 +564,41 @@ async def _build_dashboard_overview(
     )
     has_connected_platforms = len(connected_platforms) > 0 or has_env_creds
 
-    # Get campaigns and aggregate metrics
-    campaigns_result = await db.execute(
-        select(Campaign).where(
+    # Campaign counts per platform/status — counted in SQL, not by loading rows
+    counts_result = await db.execute(
+        select(Campaign.platform, Campaign.status, func.count(Campaign.id))
+        .where(
             and_(
                 Campaign.tenant_id == tenant_id,
                 Campaign.is_deleted == False,
             )
         )
+        .group_by(Campaign.platform, Campaign.status)
     )
-    campaigns = campaigns_result.scalars().all()
-    has_campaigns = len(campaigns) > 0
+    campaigns_by_platform: dict = {}
+    total_campaigns = 0
+    active_campaigns = 0
+    for platform, campaign_status, count in counts_result.all():
+        campaigns_by_platform[platform] = campaigns_by_platform.get(platform, 0) + count
+        total_campaigns += count
+        if campaign_status == CampaignStatus.ACTIVE:
+            active_campaigns += count
+    has_campaigns = total_campaigns > 0
 
-    # Aggregate current period metrics from CampaignMetric (time-series) for
-    # the selected date range instead of summing all-time Campaign totals.
-    from app.models import CampaignMetric
-
-    period_agg_result = await db.execute(
-        select(
-            func.coalesce(func.sum(CampaignMetric.spend_cents), 0).label("spend"),
-            func.coalesce(func.sum(CampaignMetric.revenue_cents), 0).label("revenue"),
-            func.coalesce(func.sum(CampaignMetric.conversions), 0).label("conversions"),
-            func.coalesce(func.sum(CampaignMetric.impressions), 0).label("impressions"),
-            func.coalesce(func.sum(CampaignMetric.clicks), 0).label("clicks"),
-        ).where(
-            and_(
-                CampaignMetric.tenant_id == tenant_id,
-                CampaignMetric.date >= start_date,
-                CampaignMetric.date <= end_date,
-            )
-        )
+    # Current and previous period totals from the daily rollup in one query
+    periods = await dashboard_rollups.period_totals(
+        db,
+        tenant_id,
+        {"current": (start_date, end_date), "previous": (prev_start, prev_end)},
     )
-    period_agg = period_agg_result.one()
+    current = periods["current"]
+    previous = periods["previous"]
 
-    current_spend = (period_agg.spend or 0) / 100
-    current_revenue = (period_agg.revenue or 0) / 100
-    current_conversions = int(period_agg.conversions or 0)
-    current_impressions = int(period_agg.impressions or 0)
-    current_clicks = int(period_agg.clicks or 0)
+    current_spend = current["spend_cents"] / 100
+    current_revenue = current["revenue_cents"] / 100
+    current_conversions = current["conversions"]
+    current_impressions = current["impressions"]
+    current_clicks = current["clicks"]
 
     # Calculate derived metrics
     current_roas = current_revenue / current_spend if current_spend > 0 else 0
@@ -603,37 +607,14 @@ async def _build_dashboard_overview(
         (current_clicks / current_impressions * 100) if current_impressions > 0 else 0
     )
 
-    # Query previous period from fact_platform_daily for real comparisons
-    try:
-        prev_result = await db.execute(
-            text(
-                "SELECT COALESCE(SUM(spend), 0) as spend, "
-                "COALESCE(SUM(revenue), 0) as revenue, "
-                "COALESCE(SUM(conversions), 0) as conversions, "
-                "COALESCE(SUM(impressions), 0) as impressions, "
-                "COALESCE(SUM(clicks), 0) as clicks "
-                "FROM fact_platform_daily "
-                "WHERE tenant_id = :tenant_id AND date BETWEEN :start AND :end"
-            ),
-            {"tenant_id": tenant_id, "start": prev_start, "end": prev_end},
-        )
-        prev_row = prev_result.mappings().first()
-        if prev_row and prev_row["spend"] > 0:
-            prev_spend = float(prev_row["spend"])
-            prev_revenue = float(prev_row["revenue"])
-            prev_conversions = int(prev_row["conversions"])
-            prev_impressions = int(prev_row["impressions"])
-            prev_clicks = int(prev_row["clicks"])
-        else:
-            # No historical data yet — show zero change
-            prev_spend = current_spend
-            prev_revenue = current_revenue
-            prev_conversions = current_conversions
-            prev_impressions = current_impressions
-            prev_clicks = current_clicks
-    except (SQLAlchemyError, ValueError, TypeError, KeyError) as _prev_err:
-        # Table may not have data yet — show zero change
-        logger.debug("dashboard_previous_period_unavailable", error=str(_prev_err))
+    if previous["spend_cents"] > 0:
+        prev_spend = previous["spend_cents"] / 100
+        prev_revenue = previous["revenue_cents"] / 100
+        prev_conversions = previous["conversions"]
+        prev_impressions = previous["impressions"]
+        prev_clicks = previous["clicks"]
+    else:
+        # No historical data yet — show zero change
         prev_spend = current_spend
         prev_revenue = current_revenue
         prev_conversions = current_conversions
@@ -725,16 +706,17 @@ async def _build_dashboard_overview(
             ),
         )
 
-    # Platform breakdown
+    # Platform breakdown (all-time totals per platform from the rollup)
+    totals_by_platform = await dashboard_rollups.platform_totals(db, tenant_id)
     platforms_summary = []
     for platform in AdPlatform:
         connection = next(
             (c for c in connected_platforms if c.platform == platform), None
         )
 
-        platform_campaigns = [c for c in campaigns if c.platform == platform]
-        platform_spend = sum(c.total_spend_cents or 0 for c in platform_campaigns) / 100
-        platform_revenue = sum(c.revenue_cents or 0 for c in platform_campaigns) / 100
+        platform_totals = totals_by_platform.get(platform, {})
+        platform_spend = platform_totals.get("spend_cents", 0) / 100
+        platform_revenue = platform_totals.get("revenue_cents", 0) / 100
 
         # Check env-var credentials for platform status
         env_connected = False
@@ -750,14 +732,11 @@ async def _build_dashboard_overview(
                 spend=platform_spend,
                 revenue=platform_revenue,
                 roas=platform_revenue / platform_spend if platform_spend > 0 else None,
-                campaigns_count=len(platform_campaigns),
+                campaigns_count=campaigns_by_platform.get(platform, 0),
                 last_synced_at=connection.last_refreshed_at if connection else None,
             )
         )
 
-    # Campaign stats
-    active_campaigns = len([c for c in campaigns if c.status == CampaignStatus.ACTIVE])
-
     # Load tenant's hidden_metrics setting
     tenant_result = await db.execute(select(Tenant).where(Tenant.id == tenant_id))
     tenant = tenant_result.scalar_one_or_none()
@@ -790,7 +769,7 @@ async def _build_dashboard_overview(
             metrics=metrics,
             signal_health=signal_health,
             platforms=platforms_summary,
-            total_campaigns=len(campaigns),
+            total_campaigns=total_campaigns,
             active_campaigns=active_campaigns,
             pending_recommendations=0,
             active_alerts=0,
@@ -1536,237 +1515,54 @@ async def _build_signal_health(tenant_id: int, db: AsyncSession):
 async def export_dashboard(
     request: DashboardExportRequest,
     current_user: CurrentUserDep,
-    db: AsyncSession = Depends(get_async_session),
 ):
     """
-    Export dashboard data as CSV or JSON.
+    Export dashboard data as CSV, JSON or XLSX.
 
-    Returns a file download with campaigns, metrics, and recommendations.
+    Returns a file download with metrics, campaigns, and recommendations.
+    Rows are streamed page by page as they are read, so the download starts
+    at once and memory stays flat for large tenants. Campaign and
+    recommendation rows carry the campaign ID in ascending order; to resume
+    an interrupted download, pass resume_section and resume_after_id.
     """
     tenant_id = current_user.tenant_id
 
     # Get date range
     start_date, end_date = get_date_range(request.period)
 
-    # Get campaigns with their metrics filtered by the selected date range
-    campaigns_result = await db.execute(
-        select(Campaign).where(
-            and_(
-                Campaign.tenant_id == tenant_id,
-                Campaign.is_deleted == False,
-            )
-        )
-    )
-    campaigns = campaigns_result.scalars().all()
-
-    # Aggregate metrics from CampaignMetric (time-series) within the date range
-    # This ensures exports reflect the selected period, not all-time totals
-    from app.base_models import CampaignMetric
-
-    period_metrics_result = await db.execute(
-        select(
-            CampaignMetric.campaign_id,
-            func.sum(CampaignMetric.spend_cents).label("spend_cents"),
-            func.sum(CampaignMetric.revenue_cents).label("revenue_cents"),
-            func.sum(CampaignMetric.conversions).label("conversions"),
-            func.sum(CampaignMetric.impressions).label("impressions"),
-            func.sum(CampaignMetric.clicks).label("clicks"),
-        )
-        .where(
-            and_(
-                CampaignMetric.tenant_id == tenant_id,
-                CampaignMetric.date >= start_date,
-                CampaignMetric.date <= end_date,
-            )
-        )
-        .group_by(CampaignMetric.campaign_id)
-    )
-    period_metrics_by_campaign = {
-        row.campaign_id: row for row in period_metrics_result.mappings().all()
-    }
-
-    # Build export data
-    export_data = {
-        "export_date": datetime.now(UTC).isoformat(),
-        "period": request.period.value,
-        "date_range": {
-            "start": start_date.isoformat(),
-            "end": end_date.isoformat(),
-        },
+    sections = [
+        section
+        for section, included in (
+            ("metrics", request.include_metrics),
+            ("campaigns", request.include_campaigns),
+            ("recommendations", request.include_recommendations),
+        )
+        if included
+    ]
+    media_types = {
+        ExportFormat.CSV: "text/csv",
+        ExportFormat.JSON: "application/json",
+        ExportFormat.XLSX: XLSX_MEDIA_TYPE,
     }
-
-    # Add metrics summary — use period-filtered data from CampaignMetric
-    if request.include_metrics:
-        total_spend_cents = sum(
-            (m.get("spend_cents") or 0) for m in period_metrics_by_campaign.values()
-        )
-        total_revenue_cents = sum(
-            (m.get("revenue_cents") or 0) for m in period_metrics_by_campaign.values()
-        )
-        total_conversions = sum(
-            (m.get("conversions") or 0) for m in period_metrics_by_campaign.values()
-        )
-        total_impressions = sum(
-            (m.get("impressions") or 0) for m in period_metrics_by_campaign.values()
-        )
-        total_clicks = sum(
-            (m.get("clicks") or 0) for m in period_metrics_by_campaign.values()
-        )
-
-        # Convert cents to dollars at the end to avoid floating point accumulation
-        total_spend = total_spend_cents / 100
-        total_revenue = total_revenue_cents / 100
-
-        export_data["metrics"] = {
-            "total_spend": round(total_spend, 2),
-            "total_revenue": round(total_revenue, 2),
-            "roas": round(total_revenue / total_spend, 2) if total_spend > 0 else 0,
-            "conversions": total_conversions,
-            "cpa": (
-                round(total_spend / total_conversions, 2)
-                if total_conversions > 0
-                else 0
-            ),
-            "impressions": total_impressions,
-            "clicks": total_clicks,
-            "ctr": (
-                round((total_clicks / total_impressions * 100), 2)
-                if total_impressions > 0
-                else 0
-            ),
-        }
-
-    # Add campaigns — use period-filtered metrics, not all-time totals
-    if request.include_campaigns:
-        export_data["campaigns"] = []
-        for c in campaigns:
-            pm = period_metrics_by_campaign.get(c.id)
-            c_spend_cents = (pm.get("spend_cents") or 0) if pm else 0
-            c_revenue_cents = (pm.get("revenue_cents") or 0) if pm else 0
-            c_spend = c_spend_cents / 100
-            c_revenue = c_revenue_cents / 100
-
-            export_data["campaigns"].append(
-                {
-                    "id": c.id,
-                    "name": c.name,
-                    "platform": c.platform.value,
-                    "status": c.status.value,
-                    "spend": round(c_spend, 2),
-                    "revenue": round(c_revenue, 2),
-                    "conversions": (pm.get("conversions") or 0) if pm else 0,
-                    "impressions": (pm.get("impressions") or 0) if pm else 0,
-                    "clicks": (pm.get("clicks") or 0) if pm else 0,
-                    "roas": round(c_revenue / c_spend, 2) if c_spend > 0 else 0,
-                }
-            )
-
-    # Add recommendations (mock for demo)
-    if request.include_recommendations:
-        recommendations = []
-        for c in campaigns:
-            spend = (c.total_spend_cents or 0) / 100
-            revenue = (c.revenue_cents or 0) / 100
-            roas = revenue / spend if spend > 0 else 0
-
-            if roas >= 3:
-                recommendations.append(
-                    {
-                        "campaign": c.name,
-                        "type": "scale",
-                        "description": f"Scale budget by 20-30% - ROAS {roas:.2f}x",
-                    }
-                )
-            elif roas < 1 and spend > 0:
-                recommendations.append(
-                    {
-                        "campaign": c.name,
-                        "type": "fix",
-                        "description": f"Review targeting - ROAS {roas:.2f}x below breakeven",
-                    }
-                )
-
-        export_data["recommendations"] = recommendations
-
-    # Generate response based on format
-    if request.format == ExportFormat.CSV:
-        # Create CSV
-        output = StringIO()
-        writer = csv.writer(output)
-
-        # Write metrics header
-        if request.include_metrics:
-            writer.writerow(["=== METRICS SUMMARY ==="])
-            writer.writerow(["Metric", "Value"])
-            for key, value in export_data.get("metrics", {}).items():
-                if isinstance(value, float):
-                    writer.writerow([key, f"{value:.2f}"])
-                else:
-                    writer.writerow([key, value])
-            writer.writerow([])
-
-        # Write campaigns
-        if request.include_campaigns and export_data.get("campaigns"):
-            writer.writerow(["=== CAMPAIGNS ==="])
-            headers = [
-                "ID",
-                "Name",
-                "Platform",
-                "Status",
-                "Spend",
-                "Revenue",
-                "ROAS",
-                "Conversions",
-                "Impressions",
-                "Clicks",
-            ]
-            writer.writerow(headers)
-            for campaign in export_data["campaigns"]:
-                writer.writerow(
-                    [
-                        campaign["id"],
-                        campaign["name"],
-                        campaign["platform"],
-                        campaign["status"],
-                        f"${campaign['spend']:.2f}",
-                        f"${campaign['revenue']:.2f}",
-                        f"{campaign['roas']:.2f}x",
-                        campaign["conversions"],
-                        campaign["impressions"],
-                        campaign["clicks"],
-                    ]
-                )
-            writer.writerow([])
-
-        # Write recommendations
-        if request.include_recommendations and export_data.get("recommendations"):
-            writer.writerow(["=== RECOMMENDATIONS ==="])
-            writer.writerow(["Campaign", "Type", "Description"])
-            for rec in export_data["recommendations"]:
-                writer.writerow([rec["campaign"], rec["type"], rec["description"]])
-
-        output.seek(0)
-        filename = (
-            f"stratum-dashboard-export-{datetime.now(UTC).date().isoformat()}.csv"
-        )
-
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-        )
-
-    else:
-        # JSON format
-        filename = (
-            f"stratum-dashboard-export-{datetime.now(UTC).date().isoformat()}.json"
-        )
-
-        return StreamingResponse(
-            iter([json.dumps(export_data, indent=2, default=str)]),
-            media_type="application/json",
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-        )
+    filename = (
+        f"stratum-dashboard-export-{datetime.now(UTC).date().isoformat()}"
+        f".{request.format.value}"
+    )
+
+    return StreamingResponse(
+        dashboard_export.stream_export(
+            request.format.value,
+            tenant_id,
+            start_date,
+            end_date,
+            request.period.value,
+            sections,
+            resume_section=request.resume_section,
+            resume_after_id=request.resume_after_id,
+        ),
+        media_type=media_types[request.format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 # =============================================================================
@@ -1901,6 +1697,30 @@ async def get_morning_briefing(
     and top actions into a single glanceable briefing card.
     """
     tenant_id = require_tenant_id(user)
+    response = await cached_insight(
+        "morning-briefing",
+        tenant_id,
+        db,
+        _build_morning_briefing,
+        date.today(),
+    )
+
+    # The cached briefing is shared by the whole tenant; personalize a copy
+    user_name = (user.full_name or "").strip()
+    first_name = user_name.split()[0] if user_name else "there"
+    briefing = response.data.model_copy(
+        update={"greeting": f"{response.data.greeting}, {first_name}"}
+    )
+    return response.model_copy(update={"data": briefing})
+
+
+async def _build_morning_briefing(tenant_id: int, db: AsyncSession):
+    """
+    Morning briefing response, computed behind the insights cache.
+
+    Cached per tenant, so it holds nothing user-specific: ``greeting`` is
+    only the mood, and the endpoint adds the caller's name.
+    """
     today = date.today()
     yesterday = today - timedelta(days=1)
 
@@ -2094,10 +1914,6 @@ async def get_morning_briefing(
     else:
         summary += "No significant anomalies detected overnight."
 
-    # Get user's first name for greeting
-    user_name = getattr(user, "full_name", "") or "there"
-    first_name = user_name.split()[0] if user_name else "there"
-
     # Pending recommendations count
     try:
         rec_result = await db.execute(
@@ -2120,7 +1936,7 @@ async def get_morning_briefing(
 
     briefing = MorningBriefingResponse(
         date=today.isoformat(),
-        greeting=f"{greeting_mood}, {first_name}",
+        greeting=greeting_mood,
         summary_narrative=summary,
         portfolio_health=portfolio_health,
         total_spend=round(spend, 2),
@@ -2142,7 +1958,7 @@ async def get_morning_briefing(
         fix_candidates=fix_candidates,
     )
 
-    logger.info("morning_briefing_generated", tenant_id=tenant_id, user=first_name)
+    logger.info("morning_briefing_generated", tenant_id=tenant_id)
 
     return APIResponse(
         success=True,
@@ -2300,6 +2116,16 @@ async def get_signal_recovery(
     freshness to identify degradation and recommend recovery steps.
     """
     tenant_id = require_tenant_id(user)
+    return await cached_insight(
+        "signal-recovery",
+        tenant_id,
+        db,
+        _build_signal_recovery,
+    )
+
+
+async def _build_signal_recovery(tenant_id: int, db: AsyncSession):
+    """Signal recovery response, computed behind the insights cache."""
 
     try:
         # ── Gather signal health indicators ──────────────────────────
@@ -2478,6 +2304,16 @@ async def get_predictive_budget(
     Only auto-executes when signal health passes AND confidence > 85%.
     """
     tenant_id = require_tenant_id(user)
+    return await cached_insight(
+        "predictive-budget",
+        tenant_id,
+        db,
+        _build_predictive_budget,
+    )
+
+
+async def _build_predictive_budget(tenant_id: int, db: AsyncSession):
+    """Predictive budget response, computed behind the insights cache."""
 
     try:
         # ── Fetch campaign data ──────────────────────────────────
@@ -2601,6 +2437,11 @@ async def get_ai_report(
     trend analysis, and actionable recommendations.
     """
     tenant_id = require_tenant_id(user)
+    return await cached_insight("ai-report", tenant_id, db, _build_ai_report)
+
+
+async def _build_ai_report(tenant_id: int, db: AsyncSession):
+    """AI report response, computed behind the insights cache."""
 
     try:
         # ── Fetch current period campaigns ─────────────────────────
@@ -2698,6 +2539,16 @@ async def get_churn_prevention(
     and engagement dimensions.
     """
     tenant_id = require_tenant_id(user)
+    return await cached_insight(
+        "churn-prevention",
+        tenant_id,
+        db,
+        _build_churn_prevention,
+    )
+
+
+async def _build_churn_prevention(tenant_id: int, db: AsyncSession):
+    """Churn prevention response, computed behind the insights cache."""
 
     try:
         # ── Fetch campaigns with sync status ───────────────────────
@@ -2959,6 +2810,20 @@ async def get_cross_platform_optimizer(
     if strategy not in valid_strategies:
         strategy = "balanced"
 
+    return await cached_insight(
+        "cross-platform-optimizer",
+        tenant_id,
+        db,
+        partial(_build_cross_platform_optimizer, strategy=strategy),
+        strategy,
+    )
+
+
+async def _build_cross_platform_optimizer(
+    tenant_id: int, db: AsyncSession, strategy: str
+):
+    """Cross-platform optimizer response, computed behind the insights cache."""
+
     try:
         # ── Fetch campaigns ─────────────────────────────────────────
         result = await db.execute(
@@ -14,11 +14,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.base_models import User
 from app.core.config import settings
 from app.services.knowledge_graph import (
-    KnowledgeGraphInsightsEngine,
     KnowledgeGraphService,
     ProblemCategory,
     ProblemSeverity,
     coverage,
+    problem_detector,
 )
 from app.tenancy.deps import get_current_user, get_db
 
@@ -159,8 +159,7 @@ async def get_health_summary(
 
     Returns health score, status, and top problem if any.
     """
-    engine = KnowledgeGraphInsightsEngine(db)
-    summary = await engine.get_health_summary(current_user.tenant_id)
+    summary = await problem_detector.health_summary(db, current_user.tenant_id)
 
     return HealthSummaryResponse(
         health_score=summary["health_score"],
@@ -185,8 +184,7 @@ async def get_detected_problems(
     Problems are sorted by severity (critical first).
     Each problem includes root cause analysis and suggested solutions.
     """
-    engine = KnowledgeGraphInsightsEngine(db)
-    problems = await engine.detect_all_problems(current_user.tenant_id, days=days)
+    problems = await problem_detector.detect(db, current_user.tenant_id, days=days)
 
     # Apply filters
     if severity:
@@ -234,8 +232,9 @@ async def get_problem_details(
 
     Includes extended root cause analysis and all suggested solutions.
     """
-    engine = KnowledgeGraphInsightsEngine(db)
-    problem = await engine.get_problem_details(current_user.tenant_id, problem_id)
+    problem = await problem_detector.problem_details(
+        db, current_user.tenant_id, problem_id
+    )
 
     if not problem:
         raise HTTPException(status_code=404, detail="Problem not found")
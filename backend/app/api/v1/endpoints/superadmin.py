@@ -27,7 +27,10 @@ from app.core.config import settings
 from app.core.logging import get_logger
 from app.db.session import get_async_session
 from app.models import Campaign, Tenant, User, UserRole
+from app.monitoring.task_telemetry import SORTABLE_FIELDS as TASK_SORT_FIELDS
+from app.monitoring.task_telemetry import TaskTelemetryStore
 from app.schemas import APIResponse
+from app.services.dashboard_rollups import refresh_daily_rollups
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -426,6 +429,55 @@ async def get_system_health(
     )
 
 
+# One reader per process: the store creates its Redis pool on first use
+# and every request reuses it.
+_task_telemetry = TaskTelemetryStore(settings.redis_url)
+
+
+@router.get("/system/tasks", response_model=APIResponse)
+async def get_task_telemetry(
+    request: Request,
+    hours: int = Query(24, ge=1, le=168),
+    limit: int = Query(20, ge=1, le=200),
+    sort_by: str = Query("total_duration_ms"),
+):
+    """
+    Rank Celery tasks by cost across all workers.
+    SuperAdmin only.
+
+    Aggregated from the Redis buckets every worker child writes to (see
+    app/monitoring/task_telemetry.py). Default ranking is total busy time,
+    i.e. the tasks that consume the most worker capacity.
+    """
+    require_superadmin(request)
+
+    import asyncio
+
+    from redis.exceptions import RedisError
+
+    if sort_by not in TASK_SORT_FIELDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"sort_by must be one of: {', '.join(TASK_SORT_FIELDS)}",
+        )
+
+    try:
+        summary = await asyncio.to_thread(
+            _task_telemetry.summary, hours, limit, sort_by
+        )
+    except (RedisError, OSError) as exc:
+        logger.warning(f"Task telemetry read failed: {exc}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Task telemetry is unavailable",
+        ) from exc
+
+    return APIResponse(
+        success=True,
+        data={"enabled": settings.celery_task_telemetry_enabled, **summary},
+    )
+
+
 # =============================================================================
 # Churn Risk Endpoints
 # =============================================================================
@@ -1818,6 +1870,8 @@ WHERE campaigns.id = sub.campaign_id AND campaigns.tenant_id = :tid"""),
     try:
         for step in sql_steps:
             await db.execute(step, params)
+        # Rebuild the tenant's dashboard rollup from the seeded metrics
+        await refresh_daily_rollups(db, tenant_id)
         await db.commit()
     except (SQLAlchemyError, ValueError) as e:
         await db.rollback()
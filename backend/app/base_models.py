@@ -22,6 +22,7 @@ from typing import Any, List, Optional
 
 from sqlalchemy import (
     JSON,
+    BigInteger,
     Boolean,
     CheckConstraint,
     Date,
@@ -593,6 +594,23 @@ class Campaign(Base, TimestampMixin, SoftDeleteMixin, TenantMixin):
         Float, nullable=True
     )  # Return on ad spend
 
+    # Daily Scores (written by the calculate_daily_scores beat task)
+    scaling_score: Mapped[Optional[float]] = mapped_column(
+        Float, nullable=True
+    )  # -1 to +1
+    scaling_recommendation: Mapped[Optional[str]] = mapped_column(
+        String(20), nullable=True
+    )  # scale / watch / fix
+    health_score: Mapped[Optional[float]] = mapped_column(
+        Float, nullable=True
+    )  # 0-100 composite
+    signal_health_status: Mapped[Optional[str]] = mapped_column(
+        String(20), nullable=True
+    )  # healthy / risk / degraded / critical
+    scores_calculated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
     # Targeting (Denormalized for analytics)
     targeting_age_min: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     targeting_age_max: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
@@ -708,6 +726,45 @@ class CampaignMetric(Base, TenantMixin):
     )
 
 
+class TenantDailyRollup(Base, TenantMixin):
+    """
+    Per tenant/day/platform totals of campaign_metrics.
+
+    Maintained by the sync workers (app.services.dashboard_rollups) for the
+    days each sync touched, so dashboard reads scan one row per platform per
+    day instead of every campaign's metric rows.
+    """
+
+    __tablename__ = "tenant_daily_rollups"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    date: Mapped[datetime] = mapped_column(Date, nullable=False)
+    platform: Mapped[AdPlatform] = mapped_column(
+        Enum(AdPlatform, values_callable=lambda x: [e.value for e in x]), nullable=False
+    )
+
+    spend_cents: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    revenue_cents: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    impressions: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    clicks: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    conversions: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    campaigns_with_metrics: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "tenant_id", "date", "platform", name="uq_tenant_daily_rollup"
+        ),
+    )
+
+
 # =============================================================================
 # Creative Asset (Digital Asset Management)
 # =============================================================================
@@ -105,6 +105,13 @@ class Settings(BaseSettings):
         description="ML inference provider: 'local' for scikit-learn or 'vertex' for Google Vertex AI",
     )
     ml_models_path: str = Field(default="./ml_models")
+    # How long a loaded model is served from memory before its .pkl is
+    # re-checked for a newer promotion (0 = check on every call).
+    ml_model_revalidate_seconds: float = Field(
+        default=30.0,
+        ge=0,
+        description="Seconds between on-disk checks of a cached ML model",
+    )
     ml_auto_train: bool = Field(
         default=True,
         description="Train ML models from sample data at startup when none are "
@@ -267,6 +274,61 @@ class Settings(BaseSettings):
         default=None,
         description="Incoming webhook for critical (P0) operational alerts",
     )
+    # Cross-worker task telemetry: every worker child publishes per-task
+    # duration, queue wait, RSS delta and retries into hourly Redis buckets,
+    # read by GET /superadmin/system/tasks. One pipelined write per task.
+    celery_task_telemetry_enabled: bool = Field(
+        default=True,
+        description="Publish Celery task timings to Redis for the superadmin dashboard",
+    )
+    # Every process that records conversion latencies publishes its sketch
+    # state to Redis on this interval (only when it changed); readers merge
+    # the published states. 0 disables the background publisher.
+    latency_sketch_publish_seconds: int = Field(
+        default=30,
+        ge=0,
+        description="Seconds between latency sketch publishes to Redis (0 = off)",
+    )
+    # Offline conversion CSV uploads hash distinct PII values in a process
+    # pool of this size. Worth it only with spare cores: the per-value IPC
+    # costs about as much as the hash. 0 hashes in the upload's own thread.
+    offline_conversion_hash_workers: int = Field(
+        default=0,
+        ge=0,
+        description="Processes hashing PII in offline conversion CSV uploads (0 = inline)",
+    )
+    # Heavy dashboard insight endpoints (morning briefing, AI report, ...)
+    # serve a per-process cached result and refresh it in the background
+    # once it is older than the fresh window or the tenant's data changed.
+    # Past max_stale a request waits for a recompute instead.
+    dashboard_insights_cache_enabled: bool = Field(
+        default=True,
+        description="Serve dashboard insight endpoints from the SWR result cache",
+    )
+    dashboard_insights_cache_fresh_seconds: float = Field(
+        default=300.0,
+        ge=0,
+        description="Age after which a cached insight is refreshed in the background",
+    )
+    dashboard_insights_cache_max_stale_seconds: float = Field(
+        default=3600.0,
+        ge=0,
+        description="Age after which a cached insight is no longer served",
+    )
+    dashboard_insights_cache_max_entries: int = Field(
+        default=2048,
+        ge=1,
+        description="Cached insight results kept per process (LRU)",
+    )
+    # Knowledge-graph problem detection (insights health, problems, problem
+    # detail) is memoized per process for one graph version; a result is
+    # recomputed once the graph is written to or it is older than this.
+    # 0 recomputes on every request.
+    knowledge_graph_problems_cache_seconds: float = Field(
+        default=300.0,
+        ge=0,
+        description="Seconds a knowledge-graph detection result is reused",
+    )
 
     # -------------------------------------------------------------------------
     # SMTP / Email Configuration
@@ -277,6 +339,16 @@ class Settings(BaseSettings):
     smtp_password: Optional[str] = Field(default=None, description="SMTP password")
     smtp_tls: bool = Field(default=True, description="Use STARTTLS")
     smtp_ssl: bool = Field(default=False, description="Use SSL")
+    # Newsletter sends fan out over this many persistent SMTP sessions and
+    # are paced by a token bucket (0 = unthrottled).
+    newsletter_send_concurrency: int = Field(
+        default=8, ge=1, description="Concurrent SMTP sessions per newsletter send"
+    )
+    newsletter_send_rate_per_second: float = Field(
+        default=50.0,
+        ge=0,
+        description="Max newsletter messages per second per worker (0 = no limit)",
+    )
     sendgrid_api_key: Optional[str] = Field(
         default=None, description="SendGrid API key (preferred over SMTP)"
     )
@@ -419,6 +491,19 @@ class Settings(BaseSettings):
     # -------------------------------------------------------------------------
     rate_limit_per_minute: int = Field(default=100)
     rate_limit_burst: int = Field(default=20)
+    # "gcra" spends small token leases taken from Redis, so most requests
+    # never wait on Redis; "fixed_window" does INCR + EXPIRE per request.
+    rate_limit_algorithm: Literal["gcra", "fixed_window"] = Field(default="gcra")
+    rate_limit_lease_size: int = Field(
+        default=5,
+        ge=1,
+        description="Tokens a worker takes from Redis per lease (capped at the burst size)",
+    )
+    rate_limit_lease_seconds: float = Field(
+        default=1.0,
+        gt=0,
+        description="How long a worker may hold leased tokens before refunding them",
+    )
 
     # -------------------------------------------------------------------------
     # Endpoint gates (docs / metrics)
@@ -18,6 +18,10 @@ UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB
 # Default cap for CSV data imports (products / COGS / training data).
 MAX_CSV_UPLOAD_BYTES = 10 * 1024 * 1024  # 10 MiB
 
+# Cap for offline-conversion CSVs. These are streamed from the spooled upload
+# in chunks (never read fully into memory), so the cap only bounds disk spool.
+MAX_OFFLINE_CSV_UPLOAD_BYTES = 2 * 1024 * 1024 * 1024  # 2 GiB
+
 
 def _too_large(max_bytes: int) -> str:
     return f"File too large. Maximum size is {max_bytes // (1024 * 1024)}MB."
@@ -306,6 +306,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     await ws_manager.stop()
     logger.info("websocket_manager_stopped")
 
+    # Write out buffered CAPI delivery logs before the pool goes away
+    from app.services.capi.delivery_logger import get_delivery_logger
+
+    await get_delivery_logger().close()
+
     await async_engine.dispose()
     logger.info("database_connections_closed")
 
@@ -456,6 +461,9 @@ def create_application() -> FastAPI:
         RateLimitMiddleware,
         requests_per_minute=settings.rate_limit_per_minute,
         burst_size=settings.rate_limit_burst,
+        algorithm=settings.rate_limit_algorithm,
+        lease_size=settings.rate_limit_lease_size,
+        lease_seconds=settings.rate_limit_lease_seconds,
     )
 
     # CSRF protection for state-changing requests
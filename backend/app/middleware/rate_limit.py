@@ -2,19 +2,31 @@
 # Stratum AI - Rate Limiting Middleware
 # =============================================================================
 """
-Fixed-window rate limiting using Redis (distributed) with in-memory fallback.
+Distributed rate limiting using Redis with an in-memory fallback.
 
-Uses Redis INCR + EXPIRE for accurate, distributed counting across multiple
-API workers. Falls back to a local in-memory token bucket when Redis is
-unavailable so the middleware never blocks startup.
+Two Redis algorithms are available:
+
+- ``gcra`` (default): the generic cell rate algorithm keeps one theoretical
+  arrival time per client in Redis, which limits smoothly instead of resetting
+  at window edges. Each worker leases a few tokens at a time with one script
+  call and spends them locally, so Redis is only consulted when a lease runs
+  out rather than on every request.
+- ``fixed_window``: INCR + EXPIRE on every request.
+
+Either way the middleware falls back to a local in-memory token bucket when
+Redis is unavailable so it never blocks startup.
 """
 
+import math
 import time
+from dataclasses import dataclass
 from typing import Callable, Optional
 
 import redis.asyncio as aioredis
 from fastapi import Request, Response, status
 from fastapi.responses import JSONResponse
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
@@ -66,6 +78,129 @@ class TokenBucket:
         return int(self.tokens)
 
 
+# =============================================================================
+# GCRA with locally leased tokens
+# =============================================================================
+
+# Takes up to ARGV[3] tokens and refunds ARGV[4] unused ones in one call.
+# The theoretical arrival time (TAT) is kept in milliseconds of Redis server
+# time, so worker clocks never need to agree. Returns
+# {granted, remaining, retry_after_ms}.
+GCRA_LEASE_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local want = tonumber(ARGV[3])
+local refund = tonumber(ARGV[4])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+tat = math.max(tat - refund * interval, now)
+local available = math.floor((now + tolerance - tat) / interval) + 1
+local granted = math.max(0, math.min(want, available))
+tat = tat + granted * interval
+if tat > now then
+    redis.call('SET', KEYS[1], tat, 'PX', math.ceil(tat - now))
+else
+    redis.call('DEL', KEYS[1])
+end
+local retry_after = math.max(0, math.ceil(tat - tolerance - now))
+return {granted, math.max(0, available - granted), retry_after}
+"""
+
+
+@dataclass
+class TokenLease:
+    """Tokens a worker took from Redis for one client."""
+
+    tokens: int = 0
+    expires_at: float = 0.0
+    remote_remaining: int = 0
+    blocked_until: float = 0.0
+
+
+class GcraLeaseLimiter:
+    """
+    Per-process side of the leased GCRA limiter.
+
+    A request is served from the local lease while it has tokens and has not
+    expired. Otherwise one script call refunds what is left of the old lease
+    and takes up to ``lease_size`` new tokens. A rejection is remembered until
+    its retry-after time, so a client that is over its limit is turned away
+    without a Redis round trip either.
+
+    Leases expire after ``lease_seconds`` so tokens never sit on an idle
+    worker for long; at most ``lease_size`` tokens per worker can be in
+    flight beyond what Redis has seen spent.
+    """
+
+    def __init__(
+        self,
+        lease_size: int = 5,
+        lease_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.lease_size = lease_size
+        self.lease_seconds = lease_seconds
+        self._clock = clock
+        self._leases: dict[str, TokenLease] = {}
+        self._script: Optional[AsyncScript] = None
+
+    async def acquire(
+        self,
+        redis_client: aioredis.Redis,
+        client_id: str,
+        rpm: int,
+        burst: int,
+        lease_size: Optional[int] = None,
+    ) -> tuple[bool, int, int]:
+        """
+        Spend one token for ``client_id``.
+
+        Returns (allowed, remaining, retry_after_seconds).
+        """
+        now = self._clock()
+        lease = self._leases.setdefault(client_id, TokenLease())
+        if now < lease.blocked_until:
+            return False, 0, math.ceil(lease.blocked_until - now)
+        if lease.tokens > 0 and now < lease.expires_at:
+            lease.tokens -= 1
+            return True, lease.tokens + lease.remote_remaining, 0
+
+        # Hand back what is left of an expired lease in the same call
+        refund, lease.tokens = lease.tokens, 0
+        want = max(1, min(lease_size or self.lease_size, burst))
+        interval_ms = 60_000 / rpm
+        script = self._script
+        if script is None or script.registered_client is not redis_client:
+            script = self._script = redis_client.register_script(GCRA_LEASE_SCRIPT)
+        granted, remote_remaining, retry_after_ms = await script(
+            keys=[f"rl:gcra:{client_id}"],
+            args=[interval_ms, interval_ms * (max(burst, 1) - 1), want, refund],
+        )
+
+        now = self._clock()
+        if granted <= 0:
+            lease.blocked_until = now + retry_after_ms / 1000
+            return False, 0, max(1, math.ceil(retry_after_ms / 1000))
+        # Another request may have topped the lease up while we waited
+        lease.tokens += granted - 1
+        lease.expires_at = now + self.lease_seconds
+        lease.remote_remaining = remote_remaining
+        return True, lease.tokens + remote_remaining, 0
+
+    def prune(self) -> int:
+        """Drop expired leases; returns how many were removed."""
+        now = self._clock()
+        stale = [
+            cid
+            for cid, lease in self._leases.items()
+            if now >= lease.expires_at and now >= lease.blocked_until
+        ]
+        for cid in stale:
+            del self._leases[cid]
+        return len(stale)
+
+
 # =============================================================================
 # Rate Limit Middleware
 # =============================================================================
@@ -76,7 +211,9 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     Distributed rate limiting middleware.
 
     Strategy:
-    - **Redis available** → fixed-window counter via INCR + EXPIRE.
+    - **Redis available, ``gcra``** → GCRA state in Redis, spent through
+      small per-worker token leases (see GcraLeaseLimiter).
+    - **Redis available, ``fixed_window``** → counter via INCR + EXPIRE.
       Shared across all workers / containers.
     - **Redis unavailable** → per-process token bucket (graceful degradation).
 
@@ -92,12 +229,17 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         app: ASGIApp,
         requests_per_minute: int = 100,
         burst_size: int = 20,
+        algorithm: str = "fixed_window",
+        lease_size: int = 5,
+        lease_seconds: float = 1.0,
     ):
         super().__init__(app)
         self.requests_per_minute = requests_per_minute
         self.burst_size = burst_size
         self.rate_per_second = requests_per_minute / 60.0
         self.window_seconds = 60  # fixed 1-minute window
+        self.algorithm = algorithm
+        self._gcra = GcraLeaseLimiter(lease_size, lease_seconds)
 
         # Stricter limits for authentication endpoints to prevent brute force
         self._auth_limits = {
@@ -177,6 +319,30 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         return allowed, remaining
 
+    async def _check_gcra(
+        self, client_id: str, auth_limit: dict | None = None
+    ) -> tuple[bool, int, int]:
+        """
+        Leased GCRA check.
+
+        Returns (allowed: bool, remaining: int, retry_after: int).
+        """
+        redis_client = await self._get_redis()
+        if redis_client is None:
+            raise ConnectionError("Redis not available")
+
+        rpm = auth_limit["rpm"] if auth_limit else self.requests_per_minute
+        burst = auth_limit["burst"] if auth_limit else self.burst_size
+        # Auth endpoints are low volume and brute-force sensitive: no leasing,
+        # every attempt is checked against the shared state.
+        return await self._gcra.acquire(
+            redis_client,
+            client_id,
+            rpm,
+            burst,
+            lease_size=1 if auth_limit else None,
+        )
+
     # --------------------------------------------------------------------- #
     # In-memory fallback helpers
     # --------------------------------------------------------------------- #
@@ -205,8 +371,13 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             ]
             for cid in to_remove:
                 del self._buckets[cid]
-            if to_remove:
-                logger.debug("rate_limit_cleanup", removed_count=len(to_remove))
+            pruned_leases = self._gcra.prune()
+            if to_remove or pruned_leases:
+                logger.debug(
+                    "rate_limit_cleanup",
+                    removed_count=len(to_remove),
+                    pruned_leases=pruned_leases,
+                )
 
     # --------------------------------------------------------------------- #
     # Dispatch
@@ -225,9 +396,16 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             client_id = f"auth:{client_id}"
 
         # Try Redis first, fall back to in-memory
+        retry_after = None
         try:
-            allowed, remaining = await self._check_redis(client_id, auth_limit)
-        except (ConnectionError, TimeoutError, OSError):
+            if self.algorithm == "gcra":
+                allowed, remaining, retry_after = await self._check_gcra(
+                    client_id, auth_limit
+                )
+                self._maybe_cleanup()
+            else:
+                allowed, remaining = await self._check_redis(client_id, auth_limit)
+        except (ConnectionError, TimeoutError, OSError, RedisError):
             # Redis unavailable — use local token bucket with aggressive limits
             logger.warning("rate_limiter_redis_fallback", client_id=client_id)
             bucket = self._get_bucket(client_id, auth_limit)
@@ -242,7 +420,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 path=path,
             )
             limit_val = auth_limit["rpm"] if auth_limit else self.requests_per_minute
-            return self._rate_limit_response(remaining, limit_val)
+            return self._rate_limit_response(remaining, limit_val, retry_after)
 
         response = await call_next(request)
 
@@ -323,10 +501,13 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         return None
 
     def _rate_limit_response(
-        self, remaining: int, limit: int | None = None
+        self,
+        remaining: int,
+        limit: int | None = None,
+        retry_after: int | None = None,
     ) -> JSONResponse:
         """Create rate limit exceeded response."""
-        retry_after = self.window_seconds
+        retry_after = retry_after or self.window_seconds
         limit_val = limit if limit is not None else self.requests_per_minute
 
         return JSONResponse(
@@ -35,6 +35,13 @@ except ImportError:
     ML_AVAILABLE = False
     logger.warning("scikit-learn/scipy not available. Using heuristic predictions.")
 
+# Batch decay fitting: candidate floors as fractions of each creative's lowest
+# post-peak CTR, how many creatives are fitted per array pass, and how many
+# refinement steps follow the log-linear starting fit.
+DECAY_FLOOR_GRID = np.linspace(0.0, 0.95, 20)
+DECAY_FIT_CHUNK = 1024
+DECAY_REFINE_STEPS = 25
+
 
 class LifecyclePhase(str, Enum):
     """Creative lifecycle phases."""
@@ -200,18 +207,63 @@ class CreativeLifecyclePredictor:
         if len(history.ctr) < 3:
             return self._insufficient_data_prediction(history)
 
-        # Determine current phase
-        current_phase = self._determine_phase(history)
-
-        # Calculate current fatigue score
-        current_fatigue = self._calculate_current_fatigue(history)
-
         # Fit decay model and predict
         if use_ml and ML_AVAILABLE and len(history.ctr) >= 7:
             decay_params = self._fit_decay_model(history)
         else:
             decay_params = self._heuristic_decay(history)
 
+        return self._build_prediction(history, decay_params)
+
+    def predict_fatigue_batch(
+        self,
+        histories: List[CreativePerformanceHistory],
+        use_ml: bool = True,
+    ) -> List[FatiguePrediction]:
+        """
+        Predict fatigue for many creatives at once.
+
+        Equivalent to calling ``predict_fatigue`` per creative, except that
+        the decay models are fitted together by ``_fit_decay_models``
+        instead of one ``curve_fit`` per creative.
+
+        Args:
+            histories: Historical performance data, one per creative
+            use_ml: Whether to use ML decay fitting (requires scipy)
+
+        Returns:
+            One FatiguePrediction per creative, in input order
+        """
+        to_fit = [
+            i
+            for i, history in enumerate(histories)
+            if use_ml and ML_AVAILABLE and len(history.ctr) >= 7
+        ]
+        fitted = dict(
+            zip(to_fit, self._fit_decay_models([histories[i] for i in to_fit]))
+        )
+
+        predictions = []
+        for i, history in enumerate(histories):
+            if len(history.ctr) < 3:
+                predictions.append(self._insufficient_data_prediction(history))
+                continue
+            decay_params = fitted.get(i) or self._heuristic_decay(history)
+            predictions.append(self._build_prediction(history, decay_params))
+        return predictions
+
+    def _build_prediction(
+        self,
+        history: CreativePerformanceHistory,
+        decay_params: Dict[str, Any],
+    ) -> FatiguePrediction:
+        """Assemble a fatigue prediction from fitted decay parameters."""
+        # Determine current phase
+        current_phase = self._determine_phase(history)
+
+        # Calculate current fatigue score
+        current_fatigue = self._calculate_current_fatigue(history)
+
         # Predict days until fatigue
         days_to_fatigue = self._predict_days_to_fatigue(
             history, decay_params, current_fatigue
@@ -390,6 +442,54 @@ class CreativeLifecyclePredictor:
             "method": "ml_fit",
         }
 
+    def _fit_decay_models(
+        self, histories: List[CreativePerformanceHistory]
+    ) -> List[Dict[str, Any]]:
+        """
+        Fit the ``_fit_decay_model`` decay curve for many creatives at once.
+
+        Post-peak CTR series are padded into one creative x day matrix. For
+        each candidate floor c in DECAY_FLOOR_GRID, log(y - c) = log(a) - b*x
+        is solved for every creative by weighted least squares, and each
+        creative starts from the floor with the lowest squared error. All
+        three parameters are then refined together in CTR space. Series with
+        no starting point inside the curve_fit bounds (zero CTR days, rising
+        or overly steep tails) are refitted one by one with
+        ``_fit_decay_model``.
+        """
+        results: List[Dict[str, Any]] = []
+        tails: List[Tuple[int, np.ndarray]] = []
+
+        for i, history in enumerate(histories):
+            ctr_values = np.asarray(history.ctr, dtype=float)
+            peak_idx = int(np.argmax(ctr_values))
+            peak_ctr = float(ctr_values[peak_idx])
+            params = {
+                "peak_day": peak_idx + 1,
+                "peak_ctr": peak_ctr,
+                "method": "ml_fit",
+            }
+            if peak_idx < len(ctr_values) - 3:
+                tails.append((i, ctr_values[peak_idx:]))
+            else:
+                # Not enough post-peak data
+                params["decay_rate"] = self._get_platform_decay_rate(
+                    history.platform, history.creative_type
+                )
+                params["floor_ctr"] = peak_ctr * 0.3
+            results.append(params)
+
+        for start in range(0, len(tails), DECAY_FIT_CHUNK):
+            chunk = tails[start : start + DECAY_FIT_CHUNK]
+            fits = _fit_exp_decay_batch([tail for _, tail in chunk])
+            for (i, _), fit in zip(chunk, fits):
+                if fit is None:
+                    results[i] = self._fit_decay_model(histories[i])
+                else:
+                    results[i]["decay_rate"], results[i]["floor_ctr"] = fit
+
+        return results
+
     def _heuristic_decay(self, history: CreativePerformanceHistory) -> Dict[str, Any]:
         """Heuristic decay estimation when ML is unavailable."""
         ctr_values = history.ctr
@@ -663,7 +763,7 @@ class CreativeLifecyclePredictor:
 
         Returns recommended budget allocation and refresh schedule.
         """
-        predictions = [self.predict_fatigue(c) for c in creatives]
+        predictions = self.predict_fatigue_batch(creatives)
 
         # Sort by urgency and performance
         def urgency_score(p: FatiguePrediction) -> int:
@@ -748,6 +848,105 @@ class CreativeLifecyclePredictor:
         return schedule
 
 
+def _fit_exp_decay_batch(
+    tails: List[np.ndarray],
+) -> List[Optional[Tuple[float, float]]]:
+    """
+    Fit y = a * exp(-b * x) + c to post-peak CTR series (x = 0 at the peak).
+
+    The log-linear fit over candidate floors gives starting parameters, which
+    are refined by batched Levenberg-Marquardt steps on the squared error in
+    CTR space, within the curve_fit bounds of ``_fit_decay_model``.
+
+    Returns (decay_rate, floor) per series, or None where no candidate floor
+    gives a starting point inside those bounds.
+    """
+    width = max(len(tail) for tail in tails)
+    Y = np.zeros((len(tails), width))
+    mask = np.zeros((len(tails), width), dtype=bool)
+    for row, tail in enumerate(tails):
+        Y[row, : len(tail)] = tail
+        mask[row, : len(tail)] = True
+
+    x = np.arange(width, dtype=float)
+    peak = Y[:, 0]
+    tail_min = np.where(mask, Y, np.inf).min(axis=1)
+
+    def squared_error(a, b, c):
+        fitted = a[..., None] * np.exp(-b[..., None] * x) + c[..., None]
+        return np.where(mask, (fitted - Y) ** 2, 0.0).sum(axis=-1)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # Log-linear fit per (creative, floor candidate), over days
+        floors = tail_min[:, None] * DECAY_FLOOR_GRID[None, :]
+        residual = Y[:, None, :] - floors[:, :, None]
+        valid = mask[:, None, :] & (residual > 0)
+        z = np.log(np.where(valid, residual, 1.0))
+        w = np.where(valid, residual**2, 0.0)
+
+        sw = w.sum(axis=2)
+        sx = (w * x).sum(axis=2)
+        sxx = (w * x * x).sum(axis=2)
+        sz = (w * z).sum(axis=2)
+        sxz = (w * x * z).sum(axis=2)
+
+        slope = (sw * sxz - sx * sz) / (sw * sxx - sx**2)
+        a = np.exp((sz - slope * sx) / sw)
+        b = -slope
+
+        fitted = a[:, :, None] * np.exp(-b[:, :, None] * x) + floors[:, :, None]
+        sse = np.where(mask[:, None, :], (fitted - Y[:, None, :]) ** 2, 0.0).sum(axis=2)
+
+    feasible = (
+        np.isfinite(sse)
+        & (tail_min > 0)[:, None]
+        & (b >= 0)
+        & (b <= 1)
+        & (a <= 2 * peak[:, None])
+    )
+    sse = np.where(feasible, sse, np.inf)
+    best = np.argmin(sse, axis=1)
+    rows = np.arange(len(tails))
+    fit_ok = np.isfinite(sse[rows, best])
+
+    a = np.where(fit_ok, a[rows, best], peak)
+    b = np.where(fit_ok, b[rows, best], 0.05)
+    c = np.where(fit_ok, floors[rows, best], 0.0)
+    err = squared_error(a, b, c)
+    damping = np.full(len(tails), 1e-3)
+    eye = np.eye(3)
+
+    for _ in range(DECAY_REFINE_STEPS):
+        decay = np.exp(-b[:, None] * x)
+        r = np.where(mask, Y - (a[:, None] * decay + c[:, None]), 0.0)
+        J = np.stack([decay, -a[:, None] * x * decay, np.ones_like(decay)], axis=2)
+        J = J * mask[:, :, None]
+        JtJ = np.einsum("ntk,ntl->nkl", J, J)
+        Jtr = np.einsum("ntk,nt->nk", J, r)
+        scale = np.einsum("nkk->nk", JtJ) + 1e-12
+        step = np.linalg.solve(
+            JtJ + damping[:, None, None] * scale[:, :, None] * eye,
+            Jtr[:, :, None],
+        )[:, :, 0]
+
+        a_new = np.clip(a + step[:, 0], 0.0, 2 * peak)
+        b_new = np.clip(b + step[:, 1], 0.0, 1.0)
+        c_new = np.clip(c + step[:, 2], 0.0, peak)
+        err_new = squared_error(a_new, b_new, c_new)
+
+        better = err_new < err
+        a = np.where(better, a_new, a)
+        b = np.where(better, b_new, b)
+        c = np.where(better, c_new, c)
+        err = np.where(better, err_new, err)
+        damping = np.where(better, damping / 10, damping * 10)
+
+    return [
+        (float(rate), float(floor)) if ok else None
+        for rate, floor, ok in zip(b, c, fit_ok)
+    ]
+
+
 # Singleton instance
 lifecycle_predictor = CreativeLifecyclePredictor()
 
@@ -25,6 +25,7 @@ from app.models import (
     CampaignStatus,
     Tenant,
 )
+from app.services.dashboard_rollups import refresh_daily_rollups
 
 logger = structlog.get_logger(__name__)
 
@@ -245,6 +246,7 @@ class TrainingDataLoader:
 
         campaigns_created = 0
         metrics_created = 0
+        metric_dates = set()
 
         # Group by campaign if there are multiple rows per campaign
         if "external_id" in df.columns:
@@ -339,7 +341,9 @@ class TrainingDataLoader:
                     )
                     self.db.add(metric)
                     metrics_created += 1
+                    metric_dates.add(metric_date)
 
+        await refresh_daily_rollups(self.db, tenant_id, metric_dates, platform=platform)
         await self.db.commit()
 
         return {
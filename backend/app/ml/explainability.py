@@ -9,10 +9,15 @@ Provides:
 - Global feature importance across all predictions
 - Interaction effects between features
 - User-friendly explanations for non-technical users
+
+Explainers are expensive to build (model load plus SHAP explainer setup), so
+callers should take them from the process-wide ``explainer_cache`` and
+explain many rows at once with ``ModelExplainer.explain_batch``.
 """
 
 import json
 import statistics
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -26,6 +31,10 @@ from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# KernelExplainer needs a background sample; smaller batches are not used to
+# build one and are explained with the fallback instead.
+KERNEL_BACKGROUND_MIN_ROWS = 10
+
 # Try to import SHAP - it's optional
 try:
     import shap
@@ -117,8 +126,11 @@ class ModelExplainer:
         self.scaler = None
         self.imputer = None
         self.feature_names: List[str] = []
+        self.version = "unversioned"
         self.shap_explainer = None
         self.base_value = 0.0
+        self._shap_lock = threading.Lock()
+        self._shap_init_failed = False
 
         self._load_model()
 
@@ -146,6 +158,7 @@ class ModelExplainer:
                 with open(metadata_path) as f:
                     metadata = json.load(f)
                     self.feature_names = metadata.get("features", [])
+                    self.version = str(metadata.get("version", self.version))
 
             logger.info(
                 f"Loaded model {self.model_name} with {len(self.feature_names)} features"
@@ -161,13 +174,7 @@ class ModelExplainer:
 
         try:
             # Use TreeExplainer for tree-based models, KernelExplainer otherwise
-            model_type = type(self.model).__name__
-
-            if (
-                "Gradient" in model_type
-                or "Forest" in model_type
-                or "Tree" in model_type
-            ):
+            if self._is_tree_model():
                 self.shap_explainer = shap.TreeExplainer(self.model)
             else:
                 # Use a sample of background data for KernelExplainer
@@ -186,6 +193,29 @@ class ModelExplainer:
         except (ValueError, TypeError, RuntimeError) as e:
             logger.error(f"Error initializing SHAP explainer: {e}")
             self.shap_explainer = None
+            self._shap_init_failed = True
+
+    def _is_tree_model(self) -> bool:
+        model_type = type(self.model).__name__
+        return (
+            "Gradient" in model_type or "Forest" in model_type or "Tree" in model_type
+        )
+
+    def _ensure_shap_explainer(self, X: np.ndarray):
+        """Build the SHAP explainer on first use and keep it for later calls."""
+        if (
+            not SHAP_AVAILABLE
+            or self.model is None
+            or self.shap_explainer is not None
+            or self._shap_init_failed
+        ):
+            return
+        # Tree models need no background; kernel models use the batch itself
+        if not self._is_tree_model() and len(X) < KERNEL_BACKGROUND_MIN_ROWS:
+            return
+        with self._shap_lock:
+            if self.shap_explainer is None:
+                self._init_shap_explainer(X)
 
     def explain_prediction(
         self,
@@ -209,16 +239,73 @@ class ModelExplainer:
         if prediction_id is None:
             prediction_id = f"pred_{datetime.now(timezone.utc).timestamp()}"
 
-        # Prepare feature vector
-        X = self._prepare_features(features)
+        (explanation,) = self.explain_batch(
+            [features],
+            predictions=[prediction],
+            prediction_ids=[prediction_id],
+            top_k=top_k,
+        )
+        return explanation
+
+    def explain_batch(
+        self,
+        rows: List[Dict[str, Any]],
+        predictions: Optional[List[Optional[float]]] = None,
+        prediction_ids: Optional[List[str]] = None,
+        top_k: int = 5,
+    ) -> List[PredictionExplanation]:
+        """
+        Explain many predictions at once.
 
-        # Get prediction if not provided
-        if prediction is None and self.model is not None:
-            prediction = float(self.model.predict(X)[0])
+        The rows are scored with one model call (for missing predictions)
+        and one SHAP evaluation, instead of one of each per row.
 
-        # Calculate SHAP values or use fallback
-        contributions = self._calculate_contributions(X, features)
+        Args:
+            rows: Feature dicts, one per prediction
+            predictions: Predicted values aligned with ``rows``; None entries
+                are computed
+            prediction_ids: Optional IDs aligned with ``rows``
+            top_k: Number of top factors to highlight per prediction
 
+        Returns:
+            One PredictionExplanation per row, in input order
+        """
+        if not rows:
+            return []
+
+        X = self._prepare_matrix(rows)
+
+        predictions = list(predictions) if predictions else [None] * len(rows)
+        missing = [i for i, p in enumerate(predictions) if p is None]
+        if missing and self.model is not None:
+            for i, value in zip(missing, self.model.predict(X[missing])):
+                predictions[i] = float(value)
+
+        if prediction_ids is None:
+            stamp = datetime.now(timezone.utc).timestamp()
+            prediction_ids = [f"pred_{stamp}_{i}" for i in range(len(rows))]
+
+        self._ensure_shap_explainer(X)
+        contributions = self._batch_contributions(X, rows)
+
+        return [
+            self._build_explanation(
+                features, prediction, prediction_id, contribs, top_k
+            )
+            for features, prediction, prediction_id, contribs in zip(
+                rows, predictions, prediction_ids, contributions
+            )
+        ]
+
+    def _build_explanation(
+        self,
+        features: Dict[str, Any],
+        prediction: Optional[float],
+        prediction_id: str,
+        contributions: List[FeatureContribution],
+        top_k: int,
+    ) -> PredictionExplanation:
+        """Assemble the explanation of one prediction from its contributions."""
         # Sort by absolute contribution
         sorted_contribs = sorted(
             contributions, key=lambda x: abs(x.contribution), reverse=True
@@ -248,14 +335,13 @@ class ModelExplainer:
             detailed_explanation=detailed,
         )
 
-    def _prepare_features(self, features: Dict[str, Any]) -> np.ndarray:
-        """Prepare feature dict as model input."""
-        # Create feature vector in correct order
-        X = np.zeros((1, len(self.feature_names)))
+    def _prepare_matrix(self, rows: List[Dict[str, Any]]) -> np.ndarray:
+        """Prepare feature dicts as one model input matrix."""
+        # Create feature matrix in correct column order
+        X = np.zeros((len(rows), len(self.feature_names)))
 
         for i, name in enumerate(self.feature_names):
-            if name in features:
-                X[0, i] = features[name]
+            X[:, i] = [features.get(name, 0) for features in rows]
 
         # Apply imputer if available
         if self.imputer is not None:
@@ -267,51 +353,58 @@ class ModelExplainer:
 
         return X
 
-    def _calculate_contributions(
+    def _batch_contributions(
         self,
         X: np.ndarray,
-        features: Dict[str, Any],
-    ) -> List[FeatureContribution]:
-        """Calculate feature contributions using SHAP or fallback."""
-        contributions = []
-
+        rows: List[Dict[str, Any]],
+    ) -> List[List[FeatureContribution]]:
+        """Calculate contributions for every row with one SHAP evaluation."""
         if SHAP_AVAILABLE and self.shap_explainer is not None:
             # Use SHAP values
             try:
                 shap_values = self.shap_explainer.shap_values(X)
                 if isinstance(shap_values, list):
                     shap_values = shap_values[0]
-                shap_values = shap_values.flatten()
-
-                total_impact = sum(abs(v) for v in shap_values)
-
-                for i, name in enumerate(self.feature_names):
-                    value = features.get(name, 0)
-                    contrib = float(shap_values[i])
-                    pct = (abs(contrib) / total_impact * 100) if total_impact > 0 else 0
-
-                    contributions.append(
-                        FeatureContribution(
-                            feature_name=name,
-                            feature_value=value,
-                            contribution=contrib,
-                            contribution_percent=round(pct, 1),
-                            direction=(
-                                "positive"
-                                if contrib > 0.01
-                                else "negative" if contrib < -0.01 else "neutral"
-                            ),
-                            human_explanation=self._explain_feature(
-                                name, value, contrib
-                            ),
-                        )
-                    )
+                shap_values = np.asarray(shap_values).reshape(len(rows), -1)
+
+                return [
+                    self._shap_contributions(values, features)
+                    for values, features in zip(shap_values, rows)
+                ]
 
             except (ValueError, TypeError, RuntimeError) as e:
                 logger.warning(f"SHAP calculation failed, using fallback: {e}")
-                contributions = self._fallback_contributions(features)
-        else:
-            contributions = self._fallback_contributions(features)
+
+        return [self._fallback_contributions(features) for features in rows]
+
+    def _shap_contributions(
+        self,
+        shap_values: np.ndarray,
+        features: Dict[str, Any],
+    ) -> List[FeatureContribution]:
+        """Turn one row of SHAP values into feature contributions."""
+        contributions = []
+        total_impact = float(np.abs(shap_values).sum())
+
+        for i, name in enumerate(self.feature_names):
+            value = features.get(name, 0)
+            contrib = float(shap_values[i])
+            pct = (abs(contrib) / total_impact * 100) if total_impact > 0 else 0
+
+            contributions.append(
+                FeatureContribution(
+                    feature_name=name,
+                    feature_value=value,
+                    contribution=contrib,
+                    contribution_percent=round(pct, 1),
+                    direction=(
+                        "positive"
+                        if contrib > 0.01
+                        else "negative" if contrib < -0.01 else "neutral"
+                    ),
+                    human_explanation=self._explain_feature(name, value, contrib),
+                )
+            )
 
         return contributions
 
@@ -621,29 +714,79 @@ class ModelExplainer:
 
 
 # =============================================================================
-# Convenience Functions
+# Explainer Cache
 # =============================================================================
 
 
-def explain_roas_prediction(
-    features: Dict[str, Any],
-    prediction: float,
-    models_path: str = "./models",
-) -> Dict[str, Any]:
+def _model_version(models_path: Path, model_name: str) -> str:
     """
-    Explain a ROAS prediction.
+    Version token for a model's files on disk.
 
-    Args:
-        features: Feature values used for prediction
-        prediction: The ROAS prediction value
-        models_path: Path to models directory
+    The metadata ``version`` is not bumped on every retrain, so the token is
+    built from the model and metadata file modification times, which change
+    whenever a retrain or rollback replaces them.
+    """
+    parts = []
+    for suffix in (".pkl", "_metadata.json"):
+        try:
+            parts.append(
+                str((models_path / f"{model_name}{suffix}").stat().st_mtime_ns)
+            )
+        except OSError:
+            parts.append("-")
+    return ":".join(parts)
 
-    Returns:
-        Dict with explanation details
+
+class ExplainerCache:
     """
-    explainer = ModelExplainer("roas_predictor", models_path)
-    explanation = explainer.explain_prediction(features, prediction)
+    Process-wide cache of ModelExplainer instances.
+
+    Entries are keyed by models directory and model name and hold the model
+    version they were built from. A call that finds a different version on
+    disk replaces the entry, so a promoted model is explained by a freshly
+    loaded explainer and the old one is dropped. SHAP explainers built by a
+    cached ModelExplainer are reused by every later call.
+
+    Usage:
+        explainer = explainer_cache.get("roas_predictor")
+        explanations = explainer.explain_batch(rows, predictions)
+    """
+
+    def __init__(self):
+        self._explainers: Dict[Tuple[str, str], Tuple[str, ModelExplainer]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_name: str, models_path: str = "./models") -> ModelExplainer:
+        """Return the cached explainer for the current version of a model."""
+        key = (str(Path(models_path).resolve()), model_name)
+        version = _model_version(Path(models_path), model_name)
+
+        with self._lock:
+            cached = self._explainers.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+            explainer = ModelExplainer(model_name, models_path)
+            self._explainers[key] = (version, explainer)
+            return explainer
+
+    def invalidate(self, model_name: Optional[str] = None):
+        """Drop cached explainers for ``model_name`` (or for every model)."""
+        with self._lock:
+            for key in list(self._explainers):
+                if model_name is None or key[1] == model_name:
+                    del self._explainers[key]
+
+
+explainer_cache = ExplainerCache()
+
+
+# =============================================================================
+# Convenience Functions
+# =============================================================================
 
+
+def _explanation_to_dict(explanation: PredictionExplanation) -> Dict[str, Any]:
     return {
         "prediction": explanation.predicted_value,
         "confidence": explanation.confidence_score,
@@ -670,6 +813,50 @@ def explain_roas_prediction(
     }
 
 
+def explain_roas_prediction(
+    features: Dict[str, Any],
+    prediction: float,
+    models_path: str = "./models",
+) -> Dict[str, Any]:
+    """
+    Explain a ROAS prediction.
+
+    Args:
+        features: Feature values used for prediction
+        prediction: The ROAS prediction value
+        models_path: Path to models directory
+
+    Returns:
+        Dict with explanation details
+    """
+    explainer = explainer_cache.get("roas_predictor", models_path)
+    explanation = explainer.explain_prediction(features, prediction)
+    return _explanation_to_dict(explanation)
+
+
+def explain_roas_predictions(
+    features: List[Dict[str, Any]],
+    predictions: List[float],
+    models_path: str = "./models",
+) -> List[Dict[str, Any]]:
+    """
+    Explain many ROAS predictions with one SHAP evaluation.
+
+    Args:
+        features: Feature values used for each prediction
+        predictions: The ROAS prediction values, aligned with ``features``
+        models_path: Path to models directory
+
+    Returns:
+        One explanation dict per prediction, in input order
+    """
+    explainer = explainer_cache.get("roas_predictor", models_path)
+    return [
+        _explanation_to_dict(explanation)
+        for explanation in explainer.explain_batch(features, predictions)
+    ]
+
+
 def get_model_feature_importance(
     model_name: str = "roas_predictor",
     models_path: str = "./models",
@@ -680,7 +867,7 @@ def get_model_feature_importance(
     Returns:
         Dict of feature name -> importance score
     """
-    explainer = ModelExplainer(model_name, models_path)
+    explainer = explainer_cache.get(model_name, models_path)
     return explainer._fallback_importance()
 
 
@@ -12,18 +12,24 @@ Based on ML_PROVIDER environment variable:
 import hashlib
 import json
 import os
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 import numpy as np
+import pandas as pd
 
 from app.core.config import settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Rows accepted by predict_many: a DataFrame with named feature columns, or a
+# 2-D array whose columns are already in the model's feature order.
+FeatureRows = Union[pd.DataFrame, np.ndarray]
+
 
 # =============================================================================
 # Exceptions
@@ -79,6 +85,22 @@ class InferenceStrategy(ABC):
         """
         pass
 
+    @abstractmethod
+    async def predict_many(self, model_name: str, rows: FeatureRows) -> Dict[str, Any]:
+        """
+        Score many feature rows with one model call.
+
+        Args:
+            model_name: Name of the model to use
+            rows: DataFrame with feature columns, or a 2-D array in the
+                model's feature order
+
+        Returns:
+            Per-row ``values`` (and ``confidences`` when available) in input
+            order, plus model metadata
+        """
+        pass
+
     @abstractmethod
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about loaded models."""
@@ -99,19 +121,52 @@ class LocalInferenceStrategy(InferenceStrategy):
 
     Models are loaded lazily and cached in memory.
     Supports .pkl files created with joblib.
+
+    A cached model is re-checked against its file at most once every
+    ``revalidate_seconds``; ``invalidate()`` forces a reload immediately
+    (called by the retraining pipeline when it promotes a model).
     """
 
-    def __init__(self, models_path: str = None):
+    def __init__(self, models_path: str = None, revalidate_seconds: float = None):
         self.models_path = Path(models_path or settings.ml_models_path)
+        self.revalidate_seconds = (
+            settings.ml_model_revalidate_seconds
+            if revalidate_seconds is None
+            else revalidate_seconds
+        )
         self._models: Dict[str, Any] = {}
         self._model_metadata: Dict[str, Dict] = {}
         # File mtime the cached model was loaded from (ML-005). Used to detect a
         # retrain/promotion on disk and reload, instead of serving a stale model
         # for the life of the (singleton, long-lived) process.
         self._model_mtimes: Dict[str, float] = {}
+        # Monotonic time each cached model was last checked against disk, so
+        # hot paths don't stat() the .pkl on every prediction.
+        self._validated_at: Dict[str, float] = {}
+
+    def invalidate(self, model_name: Optional[str] = None) -> None:
+        """Force the next load of ``model_name`` (or of every model) to reload.
+
+        The cached copy is kept until the reload succeeds, so a promotion that
+        is still in flight keeps serving the previous model.
+        """
+        if model_name is None:
+            self._validated_at.clear()
+            self._model_mtimes.clear()
+        else:
+            self._validated_at.pop(model_name, None)
+            self._model_mtimes.pop(model_name, None)
 
     def _load_model(self, model_name: str) -> Any:
         """Load a model from disk, reloading if the file changed since caching."""
+        if model_name in self._models:
+            validated_at = self._validated_at.get(model_name)
+            if (
+                validated_at is not None
+                and time.monotonic() - validated_at < self.revalidate_seconds
+            ):
+                return self._models[model_name]
+
         model_file = self.models_path / f"{model_name}.pkl"
 
         if not model_file.exists():
@@ -136,6 +191,7 @@ class LocalInferenceStrategy(InferenceStrategy):
             and current_mtime is not None
             and self._model_mtimes.get(model_name) == current_mtime
         ):
+            self._validated_at[model_name] = time.monotonic()
             return self._models[model_name]
 
         # Integrity check before unpickling (ML-002). A present-but-mismatched
@@ -157,6 +213,7 @@ class LocalInferenceStrategy(InferenceStrategy):
             self._models[model_name] = model
             if current_mtime is not None:
                 self._model_mtimes[model_name] = current_mtime
+            self._validated_at[model_name] = time.monotonic()
 
             # Load metadata if exists
             metadata_file = self.models_path / f"{model_name}_metadata.json"
@@ -229,6 +286,72 @@ class LocalInferenceStrategy(InferenceStrategy):
                 retry_after=60,
             )
 
+    async def predict_many(self, model_name: str, rows: FeatureRows) -> Dict[str, Any]:
+        """Score every row with a single ``model.predict`` call."""
+        model = self._load_model(model_name)
+
+        if model is None:
+            return self._mock_prediction(model_name, {})
+
+        metadata = self._model_metadata.get(model_name, {})
+
+        try:
+            X, feature_names = self._feature_matrix(rows, metadata.get("features"))
+
+            values: List[float] = []
+            confidences: Optional[List[float]] = None
+            if len(X):
+                values = np.asarray(model.predict(X), dtype=float).tolist()
+                if hasattr(model, "predict_proba"):
+                    confidences = model.predict_proba(X).max(axis=1).tolist()
+
+            feature_importances = None
+            if hasattr(model, "feature_importances_"):
+                feature_importances = {
+                    name: float(imp)
+                    for name, imp in zip(feature_names, model.feature_importances_)
+                }
+
+            return {
+                "values": values,
+                "confidences": confidences,
+                "feature_importances": feature_importances,
+                "model_version": metadata.get("version", "1.0.0"),
+                "inference_strategy": "local",
+            }
+
+        except (ValueError, TypeError, RuntimeError, KeyError) as e:
+            logger.error(
+                "local_batch_inference_failed", model_name=model_name, error=str(e)
+            )
+            raise ModelUnavailableError(
+                model_name=model_name,
+                message=f"Batch inference failed for model '{model_name}': {str(e)}",
+                retry_after=60,
+            )
+
+    @staticmethod
+    def _feature_matrix(rows: FeatureRows, feature_names: Optional[List[str]]) -> tuple:
+        """Build the 2-D float matrix for ``rows`` in the model's feature order.
+
+        DataFrame columns missing from ``rows`` score as 0, matching
+        ``predict``'s ``features.get(f, 0)``; extra columns are ignored.
+        """
+        if isinstance(rows, pd.DataFrame):
+            if not feature_names:
+                feature_names = list(rows.columns)
+            X = rows.reindex(columns=feature_names, fill_value=0)
+            return X.fillna(0).to_numpy(dtype=float), feature_names
+
+        X = np.asarray(rows, dtype=float)
+        if X.ndim == 1:
+            X = X.reshape(1, -1) if X.size else X.reshape(0, len(feature_names or []))
+        if feature_names and X.shape[1] != len(feature_names):
+            raise ValueError(
+                f"expected {len(feature_names)} feature columns, got {X.shape[1]}"
+            )
+        return X, feature_names or []
+
     def _mock_prediction(
         self, model_name: str, features: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -366,6 +489,58 @@ class VertexAIStrategy(InferenceStrategy):
             local = LocalInferenceStrategy()
             return await local.predict(model_name, features)
 
+    async def predict_many(self, model_name: str, rows: FeatureRows) -> Dict[str, Any]:
+        """Score every row in one Vertex AI request."""
+        client = self._get_client()
+
+        if client is None:
+            logger.warning("vertex_ai_unavailable_using_fallback")
+            return await LocalInferenceStrategy().predict_many(model_name, rows)
+
+        if not isinstance(rows, pd.DataFrame):
+            # Vertex endpoints take named features; without names the rows
+            # can only be scored by a local model that knows their order.
+            return await LocalInferenceStrategy().predict_many(model_name, rows)
+
+        try:
+            from google.protobuf import json_format
+            from google.protobuf.struct_pb2 import Value
+
+            instances = [
+                json_format.ParseDict(record, Value())
+                for record in rows.to_dict(orient="records")
+            ]
+            endpoint_path = self.endpoint.format(
+                project=self.project,
+                location="us-central1",  # Default location
+                endpoint_id=model_name,
+            )
+            response = client.predict(endpoint=endpoint_path, instances=instances)
+
+            predictions = [json_format.MessageToDict(p) for p in response.predictions]
+            values = [
+                p.get("value", p) if isinstance(p, dict) else p for p in predictions
+            ]
+            confidences = [
+                p.get("confidence") if isinstance(p, dict) else None
+                for p in predictions
+            ]
+            return {
+                "values": values,
+                "confidences": confidences if any(confidences) else None,
+                "feature_importances": None,
+                "model_version": response.deployed_model_id,
+                "inference_strategy": "vertex",
+            }
+
+        except (ConnectionError, TimeoutError, OSError, ValueError, RuntimeError) as e:
+            logger.error(
+                "vertex_ai_batch_prediction_failed",
+                model_name=model_name,
+                error=str(e),
+            )
+            return await LocalInferenceStrategy().predict_many(model_name, rows)
+
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about Vertex AI configuration."""
         return {
@@ -446,6 +621,28 @@ class ModelRegistry:
         """
         return await self._strategy.predict(model_name, features)
 
+    async def predict_many(self, model_name: str, rows: FeatureRows) -> Dict[str, Any]:
+        """
+        Score a batch of rows using the configured strategy.
+
+        One model call for the whole batch; use this instead of looping
+        over ``predict`` when scoring every campaign of a tenant.
+
+        Args:
+            model_name: Name of the model
+            rows: DataFrame of features, or a 2-D array in feature order
+
+        Returns:
+            ``values``/``confidences`` aligned with the input rows
+        """
+        return await self._strategy.predict_many(model_name, rows)
+
+    def invalidate(self, model_name: Optional[str] = None) -> None:
+        """Drop cached model state so the next call reloads from disk."""
+        invalidate = getattr(self._strategy, "invalidate", None)
+        if invalidate is not None:
+            invalidate(model_name)
+
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the current ML setup."""
         return {
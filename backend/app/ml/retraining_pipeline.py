@@ -10,11 +10,16 @@ Features:
 - A/B comparison of new vs old models
 - Rollback capability
 - Performance monitoring
+- Parallel retraining of several models from one feature materialization
 """
 
+import hashlib
 import json
+import multiprocessing
 import os
 import shutil
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
@@ -31,6 +36,8 @@ from app.ml.train import ModelTrainer
 
 logger = structlog.get_logger(__name__)
 
+PLATFORM_MODEL_PREFIX = "roas_predictor_"
+
 
 def _atomic_copy(src: Path, dst: Path) -> None:
     """Copy ``src`` to ``dst`` atomically (ML-004).
@@ -47,6 +54,90 @@ def _atomic_copy(src: Path, dst: Path) -> None:
     os.replace(tmp, dst)
 
 
+def _notify_model_changed(model_name: str) -> None:
+    """Tell this process's inference and explainer caches that ``model_name``
+    was replaced.
+
+    Other processes pick the new file up on their next periodic revalidation
+    (``ml_model_revalidate_seconds``), and rebuild their explainers when they
+    see the new file version.
+    """
+    from app.ml.explainability import explainer_cache
+    from app.ml.inference import ModelRegistry
+
+    if ModelRegistry._instance is not None:
+        ModelRegistry().invalidate(model_name)
+    explainer_cache.invalidate(model_name)
+
+
+# =============================================================================
+# Training Workers
+# =============================================================================
+
+
+def _train_prepared(
+    trainer: ModelTrainer, model_name: str, df: pd.DataFrame
+) -> Dict[str, Any]:
+    """Train ``model_name`` into the trainer's directory from prepared data."""
+    if model_name == "roas_predictor":
+        return trainer.train_roas_predictor(df)
+    if model_name == "conversion_predictor":
+        return trainer.train_conversion_predictor(df)
+    if model_name == "budget_impact":
+        return trainer.train_budget_impact_predictor(df)
+    if model_name.startswith(PLATFORM_MODEL_PREFIX):
+        platform = model_name[len(PLATFORM_MODEL_PREFIX) :]
+        metrics = None
+        if "platform" in df.columns:
+            metrics = trainer.train_platform_model(df, platform)
+        if metrics is None:
+            raise ValueError(f"Insufficient data for {platform}")
+        return metrics
+    raise ValueError(f"Unknown model: {model_name}")
+
+
+def _write_frame(df: pd.DataFrame, stem: Path) -> Path:
+    """Write a feature frame as Parquet, or as a pickle without a Parquet engine."""
+    for suffix, write in (
+        (".parquet", lambda path: df.to_parquet(path, index=False)),
+        (".pkl", df.to_pickle),
+    ):
+        path = stem.with_suffix(suffix)
+        tmp = stem.with_suffix(suffix + ".tmp")
+        try:
+            write(tmp)
+        except (ImportError, ValueError, TypeError) as e:
+            # No pyarrow/fastparquet, or a column Parquet cannot store
+            logger.info("feature_frame_parquet_unavailable", error=str(e))
+            tmp.unlink(missing_ok=True)
+            continue
+        os.replace(tmp, path)
+        return path
+    raise RuntimeError("Could not write feature frame")
+
+
+def _read_frame(path: Path) -> pd.DataFrame:
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def _limit_worker_threads(threads: int) -> None:
+    """Cap a worker's BLAS/OpenMP threads and joblib's ``n_jobs=-1``."""
+    from threadpoolctl import threadpool_limits
+
+    os.environ["LOKY_MAX_CPU_COUNT"] = str(threads)
+    threadpool_limits(threads)
+
+
+def _train_staged_model(
+    model_name: str, features_path: str, staging_path: str
+) -> Dict[str, Any]:
+    """Worker entry point: train one model from the materialized features."""
+    df = _read_frame(Path(features_path))
+    return _train_prepared(ModelTrainer(staging_path), model_name, df)
+
+
 class RetrainingTrigger(str, Enum):
     """Reasons for triggering model retraining."""
 
@@ -98,6 +189,10 @@ class RetrainingConfig:
     max_model_versions: int = 5  # Keep last 5 versions
     staging_validation_hours: int = 24  # Test in staging before promotion
 
+    # Parallel retraining
+    max_workers: Optional[int] = None  # Worker processes; None = one per CPU
+    include_platform_models: bool = True  # Scheduled runs retrain per platform
+
     # Paths
     models_path: str = "./models"
     archive_path: str = "./models/archive"
@@ -274,62 +369,189 @@ class RetrainingPipeline:
 
         try:
             # Train new model in staging
-            if model_name == "roas_predictor":
-                df = self.trainer._prepare_data(training_data)
-                metrics = self.trainer.train_roas_predictor(df)
-            elif model_name == "conversion_predictor":
-                df = self.trainer._prepare_data(training_data)
-                metrics = self.trainer.train_conversion_predictor(df)
-            elif model_name == "budget_impact":
-                df = self.trainer._prepare_data(training_data)
-                metrics = self.trainer.train_budget_impact_predictor(df)
-            elif model_name.startswith("roas_predictor_"):
-                # Platform-specific model
-                platform = model_name.replace("roas_predictor_", "")
-                df = self.trainer._prepare_data(training_data)
-                platform_df = (
-                    df[df["platform"] == platform] if "platform" in df.columns else df
-                )
-                if len(platform_df) < 50:
-                    return {
-                        "status": "failed",
-                        "error": f"Insufficient data for {platform}",
-                    }
-                metrics = self.trainer.train_roas_predictor(platform_df)
-            else:
-                return {"status": "failed", "error": f"Unknown model: {model_name}"}
+            df = self.trainer._prepare_data(training_data)
+            metrics = _train_prepared(self.trainer, model_name, df)
+            self._finish_retraining(
+                results, metrics, trigger, training_data, validate_before_promote
+            )
+
+        except (OSError, ValueError, TypeError, KeyError, RuntimeError) as e:
+            logger.error("retraining_failed", error=str(e))
+            results["status"] = "failed"
+            results["error"] = str(e)
 
-            results["metrics"] = metrics
-            results["training_samples"] = len(training_data)
+        return results
 
-            # Compare with current production model
-            comparison = self._compare_with_production(model_name, metrics)
-            results["comparison"] = comparison
+    def retrain_models(
+        self,
+        models: Dict[str, RetrainingTrigger],
+        training_data: pd.DataFrame,
+        validate_before_promote: bool = True,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrain several models in parallel, then compare and promote them.
 
-            # Decide whether to promote
-            if comparison.get("should_promote", False) or not validate_before_promote:
-                self._promote_model(
-                    model_name, version_id, metrics, trigger, training_data
-                )
-                results["status"] = "promoted"
-                logger.info(
-                    "model_promoted", model_name=model_name, version_id=version_id
+        The training data is prepared once and materialized to the staging
+        directory (Parquet when an engine is installed). Each model is then
+        trained from that file in its own worker process, at most
+        ``config.max_workers`` at a time, with the CPUs split between them.
+        Comparison with production and promotion run afterwards, one model
+        at a time, as in ``retrain_model``.
+
+        Args:
+            models: Model name -> what triggered its retraining
+            training_data: Training data DataFrame
+            validate_before_promote: Whether to validate in staging first
+
+        Returns:
+            Retraining results per model
+        """
+        version_id = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        all_results = {
+            model_name: {
+                "version_id": version_id,
+                "model_name": model_name,
+                "trigger": trigger.value,
+                "status": "started",
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }
+            for model_name, trigger in models.items()
+        }
+        if not models:
+            return all_results
+
+        features_path = self._materialize_features(training_data)
+
+        cpus = os.cpu_count() or 1
+        workers = min(len(models), self.config.max_workers or cpus)
+        threads = max(1, cpus // workers)
+        logger.info(
+            "parallel_retraining_started",
+            models=list(models),
+            workers=workers,
+            threads_per_worker=threads,
+        )
+
+        trained: Dict[str, Any] = {}
+        if workers == 1:
+            for model_name in models:
+                trained[model_name] = self._run_training(
+                    _train_staged_model,
+                    model_name,
+                    str(features_path),
+                    str(self.staging_path),
                 )
-            else:
-                results["status"] = "staged"
-                logger.info(
-                    "model_staged", model_name=model_name, version_id=version_id
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_limit_worker_threads,
+                initargs=(threads,),
+            ) as pool:
+                futures = {
+                    model_name: pool.submit(
+                        _train_staged_model,
+                        model_name,
+                        str(features_path),
+                        str(self.staging_path),
+                    )
+                    for model_name in models
+                }
+                for model_name, future in futures.items():
+                    trained[model_name] = self._run_training(future.result)
+
+        for model_name, trigger in models.items():
+            results = all_results[model_name]
+            outcome = trained[model_name]
+            if isinstance(outcome, Exception):
+                logger.error(
+                    "retraining_failed", model_name=model_name, error=str(outcome)
                 )
-                results["reason"] = comparison.get(
-                    "reason", "Did not meet promotion criteria"
+                results["status"] = "failed"
+                results["error"] = str(outcome)
+                continue
+            try:
+                self._finish_retraining(
+                    results, outcome, trigger, training_data, validate_before_promote
                 )
+            except (OSError, ValueError, TypeError, KeyError, RuntimeError) as e:
+                logger.error("retraining_failed", model_name=model_name, error=str(e))
+                results["status"] = "failed"
+                results["error"] = str(e)
 
-        except (OSError, ValueError, TypeError, KeyError, RuntimeError) as e:
-            logger.error("retraining_failed", error=str(e))
-            results["status"] = "failed"
-            results["error"] = str(e)
+        return all_results
 
-        return results
+    @staticmethod
+    def _run_training(train: Any, *args: Any) -> Any:
+        """Call ``train``; a training error is returned instead of raised."""
+        try:
+            return train(*args)
+        except (
+            OSError,
+            ValueError,
+            TypeError,
+            KeyError,
+            RuntimeError,
+            BrokenProcessPool,
+        ) as e:
+            return e
+
+    def _materialize_features(self, training_data: pd.DataFrame) -> Path:
+        """
+        Prepare the training data once and cache it under the staging path.
+
+        The file is keyed by a hash of the raw data, so a rerun on the same
+        data reuses it; files from earlier data are removed.
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps([str(c) for c in training_data.columns]).encode())
+        digest.update(
+            pd.util.hash_pandas_object(training_data, index=True).values.tobytes()
+        )
+        stem = f"features_{digest.hexdigest()[:16]}"
+
+        features_dir = self.staging_path / "features"
+        features_dir.mkdir(parents=True, exist_ok=True)
+        for path in features_dir.glob("features_*"):
+            if path.stem == stem and not path.name.endswith(".tmp"):
+                logger.info("feature_frame_reused", path=str(path))
+                return path
+            path.unlink(missing_ok=True)
+
+        df = self.trainer._prepare_data(training_data)
+        path = _write_frame(df, features_dir / stem)
+        logger.info("feature_frame_materialized", path=str(path), rows=len(df))
+        return path
+
+    def _finish_retraining(
+        self,
+        results: Dict[str, Any],
+        metrics: Dict[str, Any],
+        trigger: RetrainingTrigger,
+        training_data: pd.DataFrame,
+        validate_before_promote: bool,
+    ) -> None:
+        """Compare a staged model with production and promote or keep it."""
+        model_name = results["model_name"]
+        version_id = results["version_id"]
+        results["metrics"] = metrics
+        results["training_samples"] = len(training_data)
+
+        # Compare with current production model
+        comparison = self._compare_with_production(model_name, metrics)
+        results["comparison"] = comparison
+
+        # Decide whether to promote
+        if comparison.get("should_promote", False) or not validate_before_promote:
+            self._promote_model(model_name, version_id, metrics, trigger, training_data)
+            results["status"] = "promoted"
+            logger.info("model_promoted", model_name=model_name, version_id=version_id)
+        else:
+            results["status"] = "staged"
+            logger.info("model_staged", model_name=model_name, version_id=version_id)
+            results["reason"] = comparison.get(
+                "reason", "Did not meet promotion criteria"
+            )
 
     def _compare_with_production(
         self,
@@ -400,6 +622,7 @@ class RetrainingPipeline:
             prod_path = self.models_path / filename
             if staged_path.exists():
                 _atomic_copy(staged_path, prod_path)
+        _notify_model_changed(model_name)
 
         # Update model history
         if model_name not in self._model_history:
@@ -518,6 +741,7 @@ class RetrainingPipeline:
                     # Restore this version
                     for f in archive_dir.iterdir():
                         _atomic_copy(f, self.models_path / f.name)
+                    _notify_model_changed(model_name)
 
                     logger.info(
                         "model_rolled_back",
@@ -615,11 +839,21 @@ class RetrainingPipeline:
         logger.info("loading_training_data")
         training_data = training_data_loader()
 
-        # Retrain each model that needs it
-        for model_name, trigger, reason in models_to_retrain:
-            logger.info("retraining_model", model_name=model_name)
-            result = self.retrain_model(model_name, training_data, trigger)
-            results[model_name] = result
+        models = {model_name: trigger for model_name, trigger, _ in models_to_retrain}
+        if self.config.include_platform_models and "platform" in training_data:
+            for platform in training_data["platform"].dropna().str.lower().unique():
+                model_name = f"{PLATFORM_MODEL_PREFIX}{platform}"
+                needs_retrain, trigger, reason = self.check_retraining_needed(
+                    model_name
+                )
+                if needs_retrain:
+                    models[model_name] = trigger
+                    logger.info(
+                        "retraining_needed", model_name=model_name, reason=reason
+                    )
+
+        # Retrain every model that needs it, in parallel
+        results = self.retrain_models(models, training_data)
 
         return {
             "status": "completed",
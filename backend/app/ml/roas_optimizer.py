@@ -17,6 +17,19 @@ from app.ml.inference import ModelRegistry, ModelUnavailableError
 
 logger = get_logger(__name__)
 
+# ROAS thresholds by platform
+PLATFORM_ROAS_TARGETS: Dict[str, Dict[str, float]] = {
+    "meta": {"min": 1.5, "good": 2.5, "excellent": 4.0},
+    "google": {"min": 2.0, "good": 3.0, "excellent": 5.0},
+    "tiktok": {"min": 1.2, "good": 2.0, "excellent": 3.5},
+    "snapchat": {"min": 1.0, "good": 1.8, "excellent": 3.0},
+    "linkedin": {"min": 1.5, "good": 2.5, "excellent": 4.0},
+}
+
+# Health score benchmarks
+CTR_BENCHMARK = 1.5  # Average CTR benchmark (%)
+TARGET_CPA = 50  # Default target CPA
+
 
 class RecommendationType(str, Enum):
     """Types of optimization recommendations."""
@@ -55,13 +68,7 @@ class ROASOptimizer:
         self.registry = ModelRegistry()
 
         # ROAS thresholds by platform
-        self.platform_targets = {
-            "meta": {"min": 1.5, "good": 2.5, "excellent": 4.0},
-            "google": {"min": 2.0, "good": 3.0, "excellent": 5.0},
-            "tiktok": {"min": 1.2, "good": 2.0, "excellent": 3.5},
-            "snapchat": {"min": 1.0, "good": 1.8, "excellent": 3.0},
-            "linkedin": {"min": 1.5, "good": 2.5, "excellent": 4.0},
-        }
+        self.platform_targets = {k: dict(v) for k, v in PLATFORM_ROAS_TARGETS.items()}
 
     async def analyze_campaign(self, campaign_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -251,7 +258,7 @@ class ROASOptimizer:
             roas_score = max(0, roas / thresholds["min"] * 20)
 
         # CTR score (0-25 points)
-        ctr_benchmark = 1.5  # Average CTR benchmark
+        ctr_benchmark = CTR_BENCHMARK
         ctr_score = min(25, (ctr / ctr_benchmark) * 25) if ctr_benchmark > 0 else 0
 
         # Conversion score (0-25 points)
@@ -259,7 +266,7 @@ class ROASOptimizer:
         spend = campaign.get("spend", 0)
         if spend > 0 and conversions > 0:
             cpa = spend / conversions
-            target_cpa = 50  # Default target CPA
+            target_cpa = TARGET_CPA
             conversion_score = min(25, (target_cpa / cpa) * 25) if cpa > 0 else 0
         else:
             conversion_score = 0
@@ -756,3 +763,61 @@ class LivePredictionEngine:
                 )
 
         return alerts
+
+
+def calculate_health_scores(
+    platforms: np.ndarray,
+    roas: np.ndarray,
+    ctr: np.ndarray,
+    spend: np.ndarray,
+    conversions: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized campaign health score (0-100) for many campaigns at once.
+
+    Element-wise equivalent of ``ROASOptimizer._calculate_health_score``;
+    used by the nightly scoring job so a tenant's campaigns are scored
+    without building an optimizer per campaign.
+
+    Args:
+        platforms: Platform name per campaign (unknown platforms use meta)
+        roas: ROAS per campaign
+        ctr: CTR per campaign, in percent
+        spend: Spend per campaign
+        conversions: Conversions per campaign
+
+    Returns:
+        Health scores rounded to one decimal place
+    """
+    platforms = np.asarray(platforms, dtype=object)
+    roas = np.asarray(roas, dtype=float)
+    ctr = np.asarray(ctr, dtype=float)
+    spend = np.asarray(spend, dtype=float)
+    conversions = np.asarray(conversions, dtype=float)
+
+    default = PLATFORM_ROAS_TARGETS["meta"]
+    targets = [PLATFORM_ROAS_TARGETS.get(p, default) for p in platforms]
+    t_min = np.array([t["min"] for t in targets], dtype=float)
+    t_good = np.array([t["good"] for t in targets], dtype=float)
+    t_excellent = np.array([t["excellent"] for t in targets], dtype=float)
+
+    # ROAS score (0-50 points)
+    roas_score = np.select(
+        [roas >= t_excellent, roas >= t_good, roas >= t_min],
+        [
+            50.0,
+            35 + (roas - t_good) / (t_excellent - t_good) * 15,
+            20 + (roas - t_min) / (t_good - t_min) * 15,
+        ],
+        default=np.maximum(0.0, roas / t_min * 20),
+    )
+
+    # CTR score (0-25 points)
+    ctr_score = np.minimum(25.0, ctr / CTR_BENCHMARK * 25)
+
+    # Conversion score (0-25 points)
+    has_cpa = (spend > 0) & (conversions > 0)
+    cpa = np.where(has_cpa, spend, 1.0) / np.where(has_cpa, conversions, 1.0)
+    conversion_score = np.where(has_cpa, np.minimum(25.0, TARGET_CPA / cpa * 25), 0.0)
+
+    return np.round(roas_score + ctr_score + conversion_score, 1)
@@ -799,120 +799,131 @@ class ModelTrainer:
         logger.info("training_platform_models", platforms=list(platforms))
 
         for platform in platforms:
-            platform_df = df[df["platform"] == platform].copy()
+            try:
+                metrics = self.train_platform_model(df, platform)
+                if metrics is not None:
+                    results[platform] = metrics
 
-            if len(platform_df) < 50:
-                logger.warning(
-                    "insufficient_platform_data",
-                    platform=platform,
-                    rows=len(platform_df),
+            except (ValueError, TypeError, RuntimeError, KeyError, OSError) as e:
+                logger.error(
+                    "platform_model_training_error", platform=platform, error=str(e)
                 )
-                continue
+                results[platform] = {"error": str(e)}
+
+        return results
+
+    def train_platform_model(
+        self, df: pd.DataFrame, platform: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Train and save the ROAS model for one platform.
+
+        Args:
+            df: Prepared data for all platforms
+            platform: Platform to train (saved as ``roas_predictor_{platform}``)
 
-            logger.info(
-                "training_platform_model",
+        Returns:
+            Model metrics, or None if the platform has too little data
+        """
+        platform_df = df[df["platform"] == platform].copy()
+
+        if len(platform_df) < 50:
+            logger.warning(
+                "insufficient_platform_data",
                 platform=platform,
-                num_samples=len(platform_df),
+                rows=len(platform_df),
             )
+            return None
 
-            try:
-                # Use simplified feature set for platform-specific models
-                feature_cols = [
-                    "log_spend",
-                    "log_impressions",
-                    "log_clicks",
-                    "ctr",
-                    "cvr",
-                    "cpm",
-                    "cpc",
-                ]
-
-                # Add creative features if available
-                creative_cols = [
-                    c for c in platform_df.columns if c.startswith("creative_")
-                ]
-                feature_cols.extend(creative_cols[:5])  # Limit to avoid overfitting
-
-                # Add audience features if available
-                audience_cols = [
-                    c for c in platform_df.columns if c.startswith("audience_")
-                ]
-                feature_cols.extend(audience_cols[:3])
-
-                # Add historical features
-                if "roas_7d_avg" in platform_df.columns:
-                    feature_cols.append("roas_7d_avg")
-
-                feature_cols = [c for c in feature_cols if c in platform_df.columns]
-
-                X = platform_df[feature_cols].values
-                y = platform_df["roas"].values
-
-                # Remove outliers
-                mask = (y > 0) & (y < 10)
-                X, y = X[mask], y[mask]
-
-                if len(X) < 30:
-                    logger.warning(
-                        "insufficient_valid_platform_data", platform=platform
-                    )
-                    continue
+        logger.info(
+            "training_platform_model",
+            platform=platform,
+            num_samples=len(platform_df),
+        )
 
-                # Train-test split
-                X_train, X_test, y_train, y_test = train_test_split(
-                    X, y, test_size=0.2, random_state=42
-                )
+        # Use simplified feature set for platform-specific models
+        feature_cols = [
+            "log_spend",
+            "log_impressions",
+            "log_clicks",
+            "ctr",
+            "cvr",
+            "cpm",
+            "cpc",
+        ]
 
-                # Impute and scale
-                imputer = SimpleImputer(strategy="median")
-                X_train = imputer.fit_transform(X_train)
-                X_test = imputer.transform(X_test)
-
-                scaler = StandardScaler()
-                X_train_scaled = scaler.fit_transform(X_train)
-                X_test_scaled = scaler.transform(X_test)
-
-                # Train model
-                model = HistGradientBoostingRegressor(
-                    max_depth=6,
-                    learning_rate=0.1,
-                    max_iter=100,
-                    random_state=42,
-                    early_stopping=True,
-                    validation_fraction=0.15,
-                )
-                model.fit(X_train_scaled, y_train)
-
-                # Evaluate
-                y_pred = model.predict(X_test_scaled)
-                metrics = self._evaluate_model(y_test, y_pred)
-                metrics["num_samples"] = len(X)
-                metrics["num_features"] = len(feature_cols)
-
-                # Save platform-specific model
-                self._save_model(
-                    model=model,
-                    scaler=scaler,
-                    name=f"roas_predictor_{platform}",
-                    features=feature_cols,
-                    metrics=metrics,
-                    imputer=imputer,
-                )
+        # Add creative features if available
+        creative_cols = [c for c in platform_df.columns if c.startswith("creative_")]
+        feature_cols.extend(creative_cols[:5])  # Limit to avoid overfitting
 
-                results[platform] = metrics
-                logger.info(
-                    "platform_model_trained",
-                    platform=platform,
-                    r2=round(metrics["r2"], 4),
-                )
+        # Add audience features if available
+        audience_cols = [c for c in platform_df.columns if c.startswith("audience_")]
+        feature_cols.extend(audience_cols[:3])
 
-            except (ValueError, TypeError, RuntimeError, KeyError, OSError) as e:
-                logger.error(
-                    "platform_model_training_error", platform=platform, error=str(e)
-                )
-                results[platform] = {"error": str(e)}
+        # Add historical features
+        if "roas_7d_avg" in platform_df.columns:
+            feature_cols.append("roas_7d_avg")
 
-        return results
+        feature_cols = [c for c in feature_cols if c in platform_df.columns]
+
+        X = platform_df[feature_cols].values
+        y = platform_df["roas"].values
+
+        # Remove outliers
+        mask = (y > 0) & (y < 10)
+        X, y = X[mask], y[mask]
+
+        if len(X) < 30:
+            logger.warning("insufficient_valid_platform_data", platform=platform)
+            return None
+
+        # Train-test split
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=0.2, random_state=42
+        )
+
+        # Impute and scale
+        imputer = SimpleImputer(strategy="median")
+        X_train = imputer.fit_transform(X_train)
+        X_test = imputer.transform(X_test)
+
+        scaler = StandardScaler()
+        X_train_scaled = scaler.fit_transform(X_train)
+        X_test_scaled = scaler.transform(X_test)
+
+        # Train model
+        model = HistGradientBoostingRegressor(
+            max_depth=6,
+            learning_rate=0.1,
+            max_iter=100,
+            random_state=42,
+            early_stopping=True,
+            validation_fraction=0.15,
+        )
+        model.fit(X_train_scaled, y_train)
+
+        # Evaluate
+        y_pred = model.predict(X_test_scaled)
+        metrics = self._evaluate_model(y_test, y_pred)
+        metrics["num_samples"] = len(X)
+        metrics["num_features"] = len(feature_cols)
+
+        # Save platform-specific model
+        self._save_model(
+            model=model,
+            scaler=scaler,
+            name=f"roas_predictor_{platform}",
+            features=feature_cols,
+            metrics=metrics,
+            imputer=imputer,
+        )
+
+        logger.info(
+            "platform_model_trained",
+            platform=platform,
+            r2=round(metrics["r2"], 4),
+        )
+        return metrics
 
 
 def train_from_csv(csv_path: str, models_path: str = None) -> Dict[str, Any]:
@@ -23,6 +23,7 @@ from app.base_models import (  # Enums; Models
     RuleOperator,
     RuleStatus,
     Tenant,
+    TenantDailyRollup,
     User,
     UserRole,
     UserTenantMembership,
@@ -286,6 +287,7 @@ __all__ = [
     # Models
     "Tenant",
     "TenantAdAccount",
+    "TenantDailyRollup",
     "TenantEnforcementRule",
     "TenantEnforcementSettings",
     "TenantPlatformConnection",
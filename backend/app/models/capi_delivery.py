@@ -313,3 +313,56 @@ class CAPIDeliveryDailyStats(Base):
         # Unique per tenant/date/platform
         Index("ix_delivery_stats_unique", "tenant_id", "date", "platform", unique=True),
     )
+
+
+class CAPIDeliveryMinuteRollup(Base):
+    """
+    Per-minute delivery counts, maintained on every delivery log flush.
+
+    One row per tenant, minute, platform, event name, status and latency
+    bucket. ``DeliveryLogger.get_metrics`` reads these instead of scanning
+    raw delivery logs; the latency bucket rows double as a histogram for
+    percentiles (see ``delivery_logger.LATENCY_BUCKETS_MS``).
+    """
+
+    __tablename__ = "capi_delivery_minute_rollups"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    tenant_id = Column(
+        Integer,
+        ForeignKey("tenants.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    # Dimensions
+    bucket_start = Column(DateTime(timezone=True), nullable=False)  # minute
+    platform = Column(String(50), nullable=False)
+    event_name = Column(String(100), nullable=False)
+    status = Column(String(20), nullable=False)
+    latency_bucket = Column(Integer, nullable=False)
+
+    # Additive measures
+    event_count = Column(Integer, default=0, nullable=False)
+    latency_sum_ms = Column(Float, default=0, nullable=False)
+    latency_max_ms = Column(Float, default=0, nullable=False)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        # Upsert key
+        Index(
+            "ix_capi_minute_rollup_unique",
+            "tenant_id",
+            "bucket_start",
+            "platform",
+            "event_name",
+            "status",
+            "latency_bucket",
+            unique=True,
+        ),
+    )
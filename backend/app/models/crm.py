@@ -244,6 +244,10 @@ class CRMContact(Base):
     # Raw CRM data (JSON for flexibility)
     raw_properties = Column(JSONB, nullable=True)
 
+    # Stratum fields last written back to the CRM (see writeback_scheduler)
+    writeback_values = Column(JSONB, nullable=True)
+    written_back_at = Column(DateTime(timezone=True), nullable=True)
+
     # Timestamps
     crm_created_at = Column(DateTime(timezone=True), nullable=True)
     crm_updated_at = Column(DateTime(timezone=True), nullable=True)
@@ -270,7 +274,7 @@ class CRMContact(Base):
         Index("ix_crm_contacts_tenant_phone", "tenant_id", "phone_hash"),
         Index("ix_crm_contacts_tenant_gclid", "tenant_id", "gclid"),
         Index("ix_crm_contacts_tenant_fbclid", "tenant_id", "fbclid"),
-        Index("ix_crm_contacts_crm_id", "connection_id", "crm_contact_id"),
+        Index("ix_crm_contacts_crm_id", "connection_id", "crm_contact_id", unique=True),
         Index("ix_crm_contacts_lifecycle", "tenant_id", "lifecycle_stage"),
     )
 
@@ -354,6 +358,10 @@ class CRMDeal(Base):
     # Raw CRM data
     raw_properties = Column(JSONB, nullable=True)
 
+    # Stratum fields last written back to the CRM (see writeback_scheduler)
+    writeback_values = Column(JSONB, nullable=True)
+    written_back_at = Column(DateTime(timezone=True), nullable=True)
+
     # Timestamps
     crm_created_at = Column(DateTime(timezone=True), nullable=True)
     crm_updated_at = Column(DateTime(timezone=True), nullable=True)
@@ -381,7 +389,7 @@ class CRMDeal(Base):
         Index("ix_crm_deals_tenant_stage", "tenant_id", "stage_normalized"),
         Index("ix_crm_deals_tenant_won", "tenant_id", "is_won"),
         Index("ix_crm_deals_tenant_close_date", "tenant_id", "close_date"),
-        Index("ix_crm_deals_crm_id", "connection_id", "crm_deal_id"),
+        Index("ix_crm_deals_crm_id", "connection_id", "crm_deal_id", unique=True),
         Index(
             "ix_crm_deals_attributed_campaign", "tenant_id", "attributed_campaign_id"
         ),
@@ -8,6 +8,7 @@ Components:
 - MemoryAuditor: Core engine (tracemalloc, psutil, gc, objgraph)
 - MemoryProfilingMiddleware: Per-endpoint memory tracking
 - CeleryMemoryHooks: Per-task memory tracking
+- TaskTelemetryStore: Cross-worker task telemetry aggregated in Redis
 - ReportGenerator: HTML reports with embedded visualizations
 """
 
@@ -6,6 +6,10 @@ Celery signal hooks that track memory usage per task type.
 
 Connects to task_prerun/task_postrun signals to measure RSS delta
 for every task execution. Aggregates stats by task name.
+
+With a TaskTelemetryStore attached, each execution is also published to
+Redis together with its queue wait time (enqueue -> start) and retry
+count, so the API can rank tasks across all workers.
 """
 
 from __future__ import annotations
@@ -13,14 +17,27 @@ from __future__ import annotations
 import logging
 import time
 from dataclasses import dataclass, field
-from typing import Any
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Optional
 
 import psutil
 from celery import Celery
-from celery.signals import task_postrun, task_prerun, worker_process_init
+from celery.signals import (
+    before_task_publish,
+    task_postrun,
+    task_prerun,
+    task_retry,
+    worker_process_init,
+)
+
+if TYPE_CHECKING:
+    from app.monitoring.task_telemetry import TaskTelemetryStore
 
 logger = logging.getLogger("stratum.monitoring.celery")
 
+# Message header stamped at publish time; the worker derives queue wait from it.
+ENQUEUED_AT_HEADER = "stratum_enqueued_at"
+
 
 @dataclass
 class TaskMemoryStats:
@@ -113,25 +130,77 @@ class CeleryMemoryHooks:
     Hooks into Celery signals to track per-task memory usage.
 
     Usage:
-        hooks = CeleryMemoryHooks()
+        hooks = CeleryMemoryHooks(telemetry=TaskTelemetryStore(redis_url))
         hooks.connect(celery_app)
     """
 
-    def __init__(self) -> None:
+    def __init__(self, telemetry: Optional[TaskTelemetryStore] = None) -> None:
         self._task_stats: dict[str, TaskMemoryStats] = {}
         self._active_tasks: dict[str, dict[str, Any]] = {}
         self._process = psutil.Process()
         self._worker_start_rss: float = 0.0
+        self._telemetry = telemetry
 
     def connect(self, app: Celery) -> None:
         """Connect signal handlers to the Celery app."""
-        task_prerun.connect(self._on_task_prerun)
-        task_postrun.connect(self._on_task_postrun)
-        worker_process_init.connect(self._on_worker_init)
+        # weak=False: the handlers are bound methods, and Celery's default
+        # weak references would drop them once the caller's reference goes.
+        task_prerun.connect(self._on_task_prerun, weak=False)
+        task_postrun.connect(self._on_task_postrun, weak=False)
+        worker_process_init.connect(self._on_worker_init, weak=False)
+        if self._telemetry is not None:
+            before_task_publish.connect(self._on_before_publish, weak=False)
+            task_retry.connect(self._on_task_retry, weak=False)
         logger.info("Celery memory hooks connected")
 
+    @staticmethod
+    def _on_before_publish(
+        sender: Any = None, headers: Optional[dict] = None, **kwargs: Any
+    ) -> None:
+        """Stamp the enqueue time on outgoing task messages."""
+        if headers is not None and ENQUEUED_AT_HEADER not in headers:
+            headers[ENQUEUED_AT_HEADER] = time.time()
+
+    @staticmethod
+    def _queue_name(request: Any) -> str:
+        delivery_info = getattr(request, "delivery_info", None) or {}
+        return delivery_info.get("routing_key") or "default"
+
+    @staticmethod
+    def _queue_wait_ms(request: Any, started_at: float) -> Optional[float]:
+        """Milliseconds between enqueue (or ETA, if later) and start."""
+        enqueued_at = getattr(request, ENQUEUED_AT_HEADER, None)
+        if enqueued_at is None:
+            enqueued_at = (getattr(request, "headers", None) or {}).get(
+                ENQUEUED_AT_HEADER
+            )
+        if enqueued_at is None:
+            return None
+        try:
+            ready_at = float(enqueued_at)
+        except (TypeError, ValueError):
+            return None
+
+        eta = getattr(request, "eta", None)
+        if eta:
+            try:
+                eta_ts = (
+                    eta.timestamp()
+                    if isinstance(eta, datetime)
+                    else datetime.fromisoformat(eta).timestamp()
+                )
+                ready_at = max(ready_at, eta_ts)
+            except (TypeError, ValueError):
+                pass
+        # Clocks differ between publisher and worker hosts; never go negative.
+        return round(max(0.0, started_at - ready_at) * 1000, 2)
+
     def _on_worker_init(self, sender: Any = None, **kwargs: Any) -> None:
         """Record worker baseline memory on init."""
+        # The hooks are built when celery_app is imported, i.e. in the
+        # prefork parent. Re-bind to this child, or every task would
+        # measure the parent's RSS and report a delta of ~0.
+        self._process = psutil.Process()
         self._worker_start_rss = self._process.memory_info().rss
         logger.info(
             "Worker memory baseline: %.2f MB",
@@ -146,10 +215,13 @@ class CeleryMemoryHooks:
         **kwargs: Any,
     ) -> None:
         """Record memory state before task execution."""
+        request = getattr(task or sender, "request", None)
         self._active_tasks[task_id] = {
             "rss_before": self._process.memory_info().rss,
             "start_time": time.perf_counter(),
             "task_name": sender.name if sender else "unknown",
+            "queue": self._queue_name(request),
+            "wait_ms": self._queue_wait_ms(request, time.time()),
         }
 
     def _on_task_postrun(
@@ -181,6 +253,15 @@ class CeleryMemoryHooks:
             peak_rss_mb=peak_rss_mb,
             failed=failed,
         )
+        if self._telemetry is not None:
+            self._telemetry.record(
+                task_name,
+                pre["queue"],
+                duration_ms=duration_ms,
+                wait_ms=pre["wait_ms"],
+                rss_delta_kb=rss_delta_kb,
+                failed=failed,
+            )
 
         # Log warning for large memory growth
         if rss_delta_kb > 50_000:  # >50MB
@@ -190,6 +271,15 @@ class CeleryMemoryHooks:
                 rss_delta_kb / 1024,
             )
 
+    def _on_task_retry(
+        self, sender: Any = None, request: Any = None, **kwargs: Any
+    ) -> None:
+        """Count retries per task and queue."""
+        if self._telemetry is None:
+            return
+        task_name = getattr(sender, "name", None) or "unknown"
+        self._telemetry.record_retry(task_name, self._queue_name(request))
+
     def get_task_stats(
         self, sort_by: str = "avg_rss_delta_kb", limit: int = 50
     ) -> list[dict[str, Any]]:
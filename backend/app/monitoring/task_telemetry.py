@@ -0,0 +1,344 @@
+# =============================================================================
+# Stratum AI - Cross-Worker Celery Task Telemetry
+# =============================================================================
+"""
+Redis-backed aggregation of Celery task performance across every worker.
+
+CeleryMemoryHooks keeps its TaskMemoryStats in process memory, so each
+prefork child only ever sees its own slice of the traffic, and nothing
+scrapes the worker for Prometheus metrics (see the heartbeat note in
+app/workers/tasks/monitoring.py). Instead, every worker child writes its
+measurements into shared, hourly-bucketed Redis hashes and the API merges
+the buckets on read.
+
+Per task and queue, each hour holds:
+- execution / failure / retry counts
+- sums of duration, queue wait (enqueue -> start) and RSS delta
+- fixed-bucket histograms of duration and wait, for approximate p50/p95
+- maxima of duration, wait and RSS delta (sorted sets, ZADD GT)
+
+Writes are a single pipelined round trip and never raise: telemetry must
+not fail the task it measures.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import time
+from typing import Any, Optional
+
+logger = logging.getLogger("stratum.monitoring.telemetry")
+
+TELEMETRY_KEY_PREFIX = "stratum:celery:telemetry"
+TELEMETRY_RETENTION_SECONDS = 8 * 24 * 3600  # a week of hourly buckets + slack
+
+# Histogram upper bounds in milliseconds; the last bucket is open-ended.
+LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    10,
+    50,
+    100,
+    250,
+    500,
+    1_000,
+    2_500,
+    5_000,
+    10_000,
+    30_000,
+    60_000,
+    300_000,
+    900_000,
+)
+
+SORTABLE_FIELDS = (
+    "total_duration_ms",
+    "avg_duration_ms",
+    "p95_duration_ms",
+    "avg_wait_ms",
+    "p95_wait_ms",
+    "avg_rss_delta_kb",
+    "executions",
+    "failures",
+    "retries",
+)
+
+_MAX_METRICS = ("duration_ms", "wait_ms", "rss_delta_kb")
+
+
+def _hour_bucket(ts: float) -> int:
+    return int(ts // 3600)
+
+
+def _bucket_index(value_ms: float) -> int:
+    """Index of the first histogram bucket whose upper bound is >= value."""
+    return bisect.bisect_left(LATENCY_BUCKETS_MS, value_ms)
+
+
+def _percentile(buckets: list[int], total: int, q: float) -> Optional[float]:
+    """Approximate a percentile as the upper bound of the bucket holding it."""
+    if total <= 0:
+        return None
+    rank = q * total
+    seen = 0
+    for i, count in enumerate(buckets):
+        seen += count
+        if seen >= rank:
+            if i < len(LATENCY_BUCKETS_MS):
+                return float(LATENCY_BUCKETS_MS[i])
+            return None  # beyond the last bound; report the max instead
+    return None
+
+
+class TaskTelemetryStore:
+    """
+    Shared task telemetry in Redis.
+
+    Usage:
+        store = TaskTelemetryStore(settings.redis_url)
+        store.record("app.workers.tasks.sync", "sync", 1200.0, 35.0, 512.0)
+        store.summary(hours=24, limit=20)
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, client: Any = None) -> None:
+        self._redis_url = redis_url
+        self._client = client
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            import redis
+
+            self._client = redis.from_url(self._redis_url, decode_responses=True)
+        return self._client
+
+    # -------------------------------------------------------------------------
+    # Keys
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _stats_key(hour: int, member: str) -> str:
+        return f"{TELEMETRY_KEY_PREFIX}:{hour}:stats:{member}"
+
+    @staticmethod
+    def _index_key(hour: int) -> str:
+        return f"{TELEMETRY_KEY_PREFIX}:{hour}:index"
+
+    @staticmethod
+    def _max_key(hour: int, metric: str) -> str:
+        return f"{TELEMETRY_KEY_PREFIX}:{hour}:max:{metric}"
+
+    @staticmethod
+    def _member(task_name: str, queue: str) -> str:
+        return f"{task_name}|{queue}"
+
+    # -------------------------------------------------------------------------
+    # Writes (worker side)
+    # -------------------------------------------------------------------------
+
+    def record(
+        self,
+        task_name: str,
+        queue: str,
+        duration_ms: float,
+        wait_ms: Optional[float],
+        rss_delta_kb: float,
+        failed: bool = False,
+        now: Optional[float] = None,
+    ) -> None:
+        """Record one task execution. Never raises."""
+        hour = _hour_bucket(now if now is not None else time.time())
+        member = self._member(task_name, queue)
+        stats_key = self._stats_key(hour, member)
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.sadd(self._index_key(hour), member)
+            pipe.hincrby(stats_key, "count", 1)
+            if failed:
+                pipe.hincrby(stats_key, "failures", 1)
+            pipe.hincrbyfloat(stats_key, "duration_ms_sum", duration_ms)
+            pipe.hincrbyfloat(stats_key, "rss_delta_kb_sum", rss_delta_kb)
+            pipe.hincrby(stats_key, f"d{_bucket_index(duration_ms)}", 1)
+            pipe.zadd(
+                self._max_key(hour, "duration_ms"), {member: duration_ms}, gt=True
+            )
+            pipe.zadd(
+                self._max_key(hour, "rss_delta_kb"), {member: rss_delta_kb}, gt=True
+            )
+            if wait_ms is not None:
+                pipe.hincrby(stats_key, "wait_count", 1)
+                pipe.hincrbyfloat(stats_key, "wait_ms_sum", wait_ms)
+                pipe.hincrby(stats_key, f"w{_bucket_index(wait_ms)}", 1)
+                pipe.zadd(self._max_key(hour, "wait_ms"), {member: wait_ms}, gt=True)
+            self._expire_hour(pipe, hour, stats_key)
+            pipe.execute()
+        except Exception as exc:  # noqa: BLE001 - telemetry must never fail a task
+            logger.debug("task_telemetry_write_failed: %s", exc)
+
+    def record_retry(
+        self, task_name: str, queue: str, now: Optional[float] = None
+    ) -> None:
+        """Count a retry of ``task_name`` on ``queue``. Never raises."""
+        hour = _hour_bucket(now if now is not None else time.time())
+        member = self._member(task_name, queue)
+        stats_key = self._stats_key(hour, member)
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.sadd(self._index_key(hour), member)
+            pipe.hincrby(stats_key, "retries", 1)
+            self._expire_hour(pipe, hour, stats_key)
+            pipe.execute()
+        except Exception as exc:  # noqa: BLE001 - telemetry must never fail a task
+            logger.debug("task_telemetry_retry_write_failed: %s", exc)
+
+    def _expire_hour(self, pipe: Any, hour: int, stats_key: str) -> None:
+        expire_at = (hour + 1) * 3600 + TELEMETRY_RETENTION_SECONDS
+        pipe.expireat(stats_key, expire_at)
+        pipe.expireat(self._index_key(hour), expire_at)
+        for metric in _MAX_METRICS:
+            pipe.expireat(self._max_key(hour, metric), expire_at)
+
+    # -------------------------------------------------------------------------
+    # Reads (API side)
+    # -------------------------------------------------------------------------
+
+    def summary(
+        self,
+        hours: int = 24,
+        limit: int = 20,
+        sort_by: str = "total_duration_ms",
+        now: Optional[float] = None,
+    ) -> dict[str, Any]:
+        """
+        Merge the last ``hours`` hourly buckets into per task/queue rows.
+
+        Rows are ranked by ``sort_by`` (default: total busy time, i.e. the
+        tasks that consume the most worker capacity). ``share_pct`` is each
+        row's share of all task time in the window.
+        """
+        if sort_by not in SORTABLE_FIELDS:
+            raise ValueError(f"sort_by must be one of {', '.join(SORTABLE_FIELDS)}")
+
+        current = _hour_bucket(now if now is not None else time.time())
+        window = range(current - hours + 1, current + 1)
+        client = self.client
+
+        pipe = client.pipeline(transaction=False)
+        for hour in window:
+            pipe.smembers(self._index_key(hour))
+        indexes = pipe.execute()
+
+        pipe = client.pipeline(transaction=False)
+        fetched: list[tuple[int, str]] = []
+        for hour, members in zip(window, indexes):
+            for member in members or ():
+                pipe.hgetall(self._stats_key(hour, member))
+                fetched.append((hour, member))
+        for hour in window:
+            for metric in _MAX_METRICS:
+                pipe.zrange(self._max_key(hour, metric), 0, -1, withscores=True)
+        results = pipe.execute()
+
+        merged: dict[str, dict[str, Any]] = {}
+        for (_, member), raw in zip(fetched, results):
+            row = merged.setdefault(member, _empty_row())
+            _merge_hash(row, raw or {})
+
+        maxima = results[len(fetched) :]
+        for i, pairs in enumerate(maxima):
+            metric = _MAX_METRICS[i % len(_MAX_METRICS)]
+            for member, score in pairs or ():
+                if member in merged:
+                    key = f"max_{metric}"
+                    merged[member][key] = max(merged[member][key], float(score))
+
+        total_busy_ms = sum(r["duration_ms_sum"] for r in merged.values())
+        tasks = [
+            _finalize_row(member, row, total_busy_ms) for member, row in merged.items()
+        ]
+        tasks.sort(key=lambda t: t[sort_by] or 0, reverse=True)
+
+        return {
+            "window_hours": hours,
+            "sort_by": sort_by,
+            "total_executions": sum(t["executions"] for t in tasks),
+            "total_failures": sum(t["failures"] for t in tasks),
+            "total_retries": sum(t["retries"] for t in tasks),
+            "total_busy_ms": round(total_busy_ms, 2),
+            "task_types": len(tasks),
+            "tasks": tasks[:limit],
+        }
+
+
+def _empty_row() -> dict[str, Any]:
+    n = len(LATENCY_BUCKETS_MS) + 1
+    return {
+        "count": 0,
+        "failures": 0,
+        "retries": 0,
+        "wait_count": 0,
+        "duration_ms_sum": 0.0,
+        "wait_ms_sum": 0.0,
+        "rss_delta_kb_sum": 0.0,
+        "duration_buckets": [0] * n,
+        "wait_buckets": [0] * n,
+        "max_duration_ms": 0.0,
+        "max_wait_ms": 0.0,
+        "max_rss_delta_kb": 0.0,
+    }
+
+
+def _merge_hash(row: dict[str, Any], raw: dict[str, str]) -> None:
+    for name, value in raw.items():
+        if name in ("count", "failures", "retries", "wait_count"):
+            row[name] += int(value)
+        elif name in ("duration_ms_sum", "wait_ms_sum", "rss_delta_kb_sum"):
+            row[name] += float(value)
+        elif name[0] in ("d", "w") and name[1:].isdigit():
+            target = row["duration_buckets" if name[0] == "d" else "wait_buckets"]
+            index = int(name[1:])
+            if index < len(target):
+                target[index] += int(value)
+
+
+def _finalize_row(member: str, row: dict[str, Any], total_busy_ms: float) -> dict:
+    task_name, _, queue = member.rpartition("|")
+    count = row["count"]
+    wait_count = row["wait_count"]
+
+    def _avg(total: float, n: int) -> Optional[float]:
+        return round(total / n, 2) if n else None
+
+    p95_duration = _percentile(row["duration_buckets"], count, 0.95)
+    p95_wait = _percentile(row["wait_buckets"], wait_count, 0.95)
+    return {
+        "task_name": task_name,
+        "short_name": task_name.split(".")[-1],
+        "queue": queue,
+        "executions": count,
+        "failures": row["failures"],
+        "retries": row["retries"],
+        "failure_rate": round(row["failures"] / count, 4) if count else None,
+        "total_duration_ms": round(row["duration_ms_sum"], 2),
+        "share_pct": (
+            round(100 * row["duration_ms_sum"] / total_busy_ms, 2)
+            if total_busy_ms
+            else 0.0
+        ),
+        "avg_duration_ms": _avg(row["duration_ms_sum"], count),
+        "p50_duration_ms": _percentile(row["duration_buckets"], count, 0.5),
+        "p95_duration_ms": (
+            p95_duration
+            if p95_duration is not None or not count
+            else round(row["max_duration_ms"], 2)
+        ),
+        "max_duration_ms": round(row["max_duration_ms"], 2),
+        "avg_wait_ms": _avg(row["wait_ms_sum"], wait_count),
+        "p95_wait_ms": (
+            p95_wait
+            if p95_wait is not None or not wait_count
+            else round(row["max_wait_ms"], 2)
+        ),
+        "max_wait_ms": round(row["max_wait_ms"], 2) if wait_count else None,
+        "avg_rss_delta_kb": _avg(row["rss_delta_kb_sum"], count),
+        "max_rss_delta_kb": round(row["max_rss_delta_kb"], 2),
+    }
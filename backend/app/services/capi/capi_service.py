@@ -80,6 +80,13 @@ def _build_delivery_kwargs(
     }
 
 
+def _pixel_id(connector: Optional[BaseCAPIConnector]) -> Optional[str]:
+    """The pixel a connector sends to, for platforms that have one."""
+    return getattr(connector, "pixel_id", None) or getattr(
+        connector, "pixel_code", None
+    )
+
+
 @dataclass
 class StreamResult:
     """Result of streaming events to platforms."""
@@ -401,6 +408,8 @@ class CAPIService:
                     or "delivery failed"
                 )[:500]
                 platform_response = {"errors": errors} if errors else None
+                pixel_id = _pixel_id(self.connectors.get(platform))
+                context = {"pixel_id": pixel_id} if pixel_id else None
                 for event in events:
                     await dlq.add_failed_event(
                         tenant_id=self.tenant_id,
@@ -411,10 +420,49 @@ class CAPIService:
                         retry_count=0,  # synchronous send exhausted; DLQ owns replay
                         max_retries=3,
                         platform_response=platform_response,
+                        context=context,
                     )
         except Exception as e:  # noqa: BLE001 - DLQ capture must not break sends
             logger.warning("capi_dlq_enqueue_failed", error=str(e))
 
+    async def replay_dead_letters(
+        self,
+        platform: Optional[str] = None,
+        limit: int = 10000,
+        concurrency: int = 4,
+    ) -> Dict[str, Any]:
+        """
+        Replay this tenant's pending DLQ entries through the connected platforms.
+
+        Entries are sent in platform-sized batches with at most
+        ``concurrency`` sends in flight. Entries for a platform or pixel that
+        is not connected are left pending.
+
+        Args:
+            platform: Only replay entries for this platform
+            limit: Maximum entries to replay
+            concurrency: Maximum batch sends in flight
+
+        Returns:
+            Replay counts (claimed, recovered, failed, skipped, batches)
+        """
+        from .dead_letter_queue import DLQReplayEngine, get_dlq
+
+        async def send(tenant_id, platform, pixel_id, events):
+            # Connectors hold this tenant's credentials only
+            connector = self.connectors.get(platform)
+            if tenant_id != self.tenant_id or connector is None:
+                return None
+            if pixel_id and _pixel_id(connector) != pixel_id:
+                return None
+            return await connector.send_events(events)
+
+        engine = DLQReplayEngine(await get_dlq(), send, concurrency=concurrency)
+        result = await engine.replay(
+            platform=platform, tenant_id=self.tenant_id, limit=limit
+        )
+        return result.to_dict()
+
     def analyze_data_quality(
         self, user_data: Dict[str, Any], platform: str = None
     ) -> Dict[str, Any]:
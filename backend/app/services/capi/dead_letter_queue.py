@@ -14,14 +14,28 @@ Features:
 - Replay capability for manual/automated recovery
 - Detailed failure context for debugging
 - Metrics and alerting hooks
+
+Redis layout:
+- ``QUEUE_KEY``: every entry id, scored by last failure (retention sweep)
+- ``ENTRY_PREFIX<id>``: the entry itself, as JSON with a TTL
+- ``STATUS_INDEX_PREFIX<status>`` / ``PLATFORM_INDEX_PREFIX<platform>``:
+  entry ids scored by first failure, kept in step with every write
+- ``STATS_KEY``: counters per platform and failure category
+- ``LABELS_KEY``: id -> platform and category, so an entry whose JSON has
+  already expired can still be taken out of the counters
+
+Statistics are therefore read from the indexes in one round trip instead of
+by loading every entry, and replays fetch entries with MGET in chunks.
 """
 
+import asyncio
 import json
 import logging
+from collections.abc import Awaitable, Callable
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
 from uuid import uuid4
 
 try:
@@ -41,12 +55,15 @@ except ImportError:  # pragma: no cover - redis is a hard dependency in prod
 
 
 from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.db.session import async_session_factory
 
+from .platform_connectors import BatchOptimizer
+
 logger = logging.getLogger(__name__)
 
 
@@ -136,6 +153,11 @@ class DLQStats:
     recovery_rate_pct: float = 0.0
 
 
+def _chunks(items: List[Any], size: int) -> Iterable[List[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
 class DeadLetterQueue:
     """
     Dead Letter Queue for failed CAPI events.
@@ -148,6 +170,12 @@ class DeadLetterQueue:
     QUEUE_KEY = "stratum:dlq:queue"
     ENTRY_PREFIX = "stratum:dlq:entry:"
     STATS_KEY = "stratum:dlq:stats"
+    STATUS_INDEX_PREFIX = "stratum:dlq:status:"
+    PLATFORM_INDEX_PREFIX = "stratum:dlq:platform:"
+    LABELS_KEY = "stratum:dlq:labels"
+
+    # Entries fetched per MGET round trip
+    FETCH_CHUNK = 500
 
     # Default retention period (7 days)
     DEFAULT_RETENTION_DAYS = 7
@@ -317,8 +345,12 @@ class DeadLetterQueue:
         return entry
 
     async def _store_entry(self, entry: DLQEntry):
-        """Store entry in Redis (fast-access working set) and Postgres (durable
-        system of record).
+        """Store one entry; see ``_store_entries``."""
+        await self._store_entries([entry])
+
+    async def _store_entries(self, entries: List[DLQEntry]):
+        """Store entries in Redis (fast-access working set) and Postgres
+        (durable system of record).
 
         Redis/memory carry a TTL and can be evicted or wiped on restart, so on
         their own they cannot be trusted to retain failed events long enough to
@@ -328,26 +360,16 @@ class DeadLetterQueue:
         stored_in_redis = False
         if self._connected and self._redis:
             try:
-                # Store entry data
-                entry_key = f"{self.ENTRY_PREFIX}{entry.id}"
-                await self._redis.set(
-                    entry_key,
-                    json.dumps(entry.to_dict()),
-                    ex=self._retention_days * 86400,  # TTL in seconds
-                )
-
-                # Add to sorted set for ordering (score = timestamp)
-                await self._redis.zadd(
-                    self.QUEUE_KEY,
-                    {entry.id: entry.last_failure_at.timestamp()},
-                )
+                await self._index_entries(entries)
                 stored_in_redis = True
             except (ConnectionError, TimeoutError, OSError, RedisError) as e:
                 logger.warning(f"Failed to store DLQ entry in Redis: {e}")
 
         if not stored_in_redis:
-            # Fallback to memory
-            self._memory_queue.append(entry)
+            # Fallback to memory; updates arrive as the same objects get_entry
+            # handed out, so only new entries are appended.
+            known = {id(e) for e in self._memory_queue}
+            self._memory_queue.extend(e for e in entries if id(e) not in known)
 
             # Trim if too large
             if len(self._memory_queue) > self.MAX_MEMORY_ENTRIES:
@@ -355,7 +377,96 @@ class DeadLetterQueue:
 
         # Durable system of record — always attempted, best-effort so a DB
         # outage never loses the Redis/memory copy or breaks the send path.
-        await self._persist_to_db(entry)
+        if len(entries) == 1:
+            await self._persist_to_db(entries[0])
+        elif entries:
+            await self._persist_batch_to_db(entries)
+
+    async def _index_entries(self, entries: List[DLQEntry]) -> None:
+        """Write entries and move them to their status index in one
+        transaction, then count the ones Redis had not seen before."""
+        pipe = self._redis.pipeline(transaction=True)
+        for entry in entries:
+            pipe.hsetnx(self.LABELS_KEY, entry.id, self._label(entry))
+            pipe.set(
+                f"{self.ENTRY_PREFIX}{entry.id}",
+                json.dumps(entry.to_dict()),
+                ex=self._retention_days * 86400,  # TTL in seconds
+            )
+            # Add to sorted set for ordering (score = timestamp)
+            pipe.zadd(self.QUEUE_KEY, {entry.id: entry.last_failure_at.timestamp()})
+
+            since = entry.first_failure_at.timestamp()
+            pipe.zadd(
+                f"{self.PLATFORM_INDEX_PREFIX}{entry.platform}", {entry.id: since}
+            )
+            for status in DLQStatus:
+                if status != entry.status:
+                    pipe.zrem(f"{self.STATUS_INDEX_PREFIX}{status.value}", entry.id)
+            pipe.zadd(
+                f"{self.STATUS_INDEX_PREFIX}{entry.status.value}", {entry.id: since}
+            )
+        results = await pipe.execute()
+
+        per_entry = len(results) // len(entries) if entries else 0
+        new = [e for i, e in enumerate(entries) if results[i * per_entry]]
+        if new:
+            pipe = self._redis.pipeline(transaction=True)
+            for entry in new:
+                pipe.hincrby(self.STATS_KEY, f"platform:{entry.platform}", 1)
+                pipe.hincrby(
+                    self.STATS_KEY, f"category:{entry.failure_category.value}", 1
+                )
+            await pipe.execute()
+
+    @staticmethod
+    def _label(entry: DLQEntry) -> str:
+        return f"{entry.platform}|{entry.failure_category.value}"
+
+    def _unindex(self, pipe: Any, entry_id: str, label: Optional[str]) -> None:
+        """Queue the commands that take an entry out of every index."""
+        pipe.zrem(self.QUEUE_KEY, entry_id)
+        for status in DLQStatus:
+            pipe.zrem(f"{self.STATUS_INDEX_PREFIX}{status.value}", entry_id)
+        if label:
+            platform, category = label.split("|", 1)
+            pipe.zrem(f"{self.PLATFORM_INDEX_PREFIX}{platform}", entry_id)
+            pipe.hdel(self.LABELS_KEY, entry_id)
+            pipe.hincrby(self.STATS_KEY, f"platform:{platform}", -1)
+            pipe.hincrby(self.STATS_KEY, f"category:{category}", -1)
+
+    async def rebuild_index(self) -> int:
+        """
+        Rebuild the status/platform indexes and counters from the queue.
+
+        Needed once for entries written before the indexes existed; safe to
+        run again at any time.
+
+        Returns:
+            Number of entries indexed
+        """
+        if not (self._connected and self._redis):
+            return 0
+
+        stale = [self.STATS_KEY, self.LABELS_KEY]
+        stale += [f"{self.STATUS_INDEX_PREFIX}{s.value}" for s in DLQStatus]
+        stale += [
+            key
+            async for key in self._redis.scan_iter(
+                match=f"{self.PLATFORM_INDEX_PREFIX}*"
+            )
+        ]
+        await self._redis.delete(*stale)
+
+        indexed = 0
+        entry_ids = await self._redis.zrange(self.QUEUE_KEY, 0, -1)
+        for chunk in _chunks(entry_ids, self.FETCH_CHUNK):
+            entries = list((await self._get_entries(chunk)).values())
+            if entries:
+                await self._index_entries(entries)
+                indexed += len(entries)
+        logger.info(f"DLQ: rebuilt index for {indexed} entries")
+        return indexed
 
     async def _persist_to_db(self, entry: DLQEntry) -> None:
         """Upsert the entry into the ``capi_dead_letter_queue`` Postgres table.
@@ -394,6 +505,63 @@ class DeadLetterQueue:
         except (SQLAlchemyError, ValueError, OSError) as e:
             logger.error(f"DLQ: failed to persist entry {entry.id} to Postgres: {e}")
 
+    async def _persist_batch_to_db(self, entries: List[DLQEntry]) -> None:
+        """Upsert many entries in one ``INSERT ... ON CONFLICT`` statement.
+
+        Same contract as ``_persist_to_db``; used by bulk transitions such as
+        batch replay and the retention sweep.
+        """
+        try:
+            from app.models.capi_delivery import CAPIDeadLetterEntry
+
+            now = datetime.now(timezone.utc)
+            rows = [
+                {
+                    "id": entry.id,
+                    "tenant_id": entry.tenant_id,
+                    "platform": entry.platform,
+                    "event_id": entry.event_id,
+                    "event_name": entry.event_name,
+                    "event_data": entry.event_data,
+                    "failure_reason": entry.failure_reason,
+                    "failure_category": entry.failure_category.value,
+                    "error_message": entry.error_message,
+                    "retry_count": entry.retry_count,
+                    "max_retries": entry.max_retries,
+                    "status": entry.status.value,
+                    "platform_response": entry.platform_response,
+                    "context": entry.context,
+                    "first_failure_at": entry.first_failure_at,
+                    "last_failure_at": entry.last_failure_at,
+                    "recovered_at": entry.recovered_at,
+                    "updated_at": now,
+                }
+                for entry in entries
+            ]
+            statement = pg_insert(CAPIDeadLetterEntry).values(rows)
+            statement = statement.on_conflict_do_update(
+                index_elements=[CAPIDeadLetterEntry.id],
+                set_={
+                    column: statement.excluded[column]
+                    for column in (
+                        "error_message",
+                        "retry_count",
+                        "status",
+                        "context",
+                        "last_failure_at",
+                        "recovered_at",
+                        "updated_at",
+                    )
+                },
+            )
+            async with async_session_factory() as db:
+                await db.execute(statement)
+                await db.commit()
+        except (SQLAlchemyError, ValueError, OSError) as e:
+            logger.error(
+                f"DLQ: failed to persist {len(entries)} entries to Postgres: {e}"
+            )
+
     async def get_entry(self, entry_id: str) -> Optional[DLQEntry]:
         """
         Get a specific DLQ entry.
@@ -426,6 +594,31 @@ class DeadLetterQueue:
 
         return None
 
+    async def _get_entries(self, entry_ids: List[str]) -> Dict[str, DLQEntry]:
+        """Fetch entries from Redis with one MGET per ``FETCH_CHUNK`` ids.
+
+        Ids whose entry has expired or is unreadable are left out. Redis
+        errors propagate to the caller.
+        """
+        found: Dict[str, DLQEntry] = {}
+        for chunk in _chunks(list(entry_ids), self.FETCH_CHUNK):
+            keys = [f"{self.ENTRY_PREFIX}{entry_id}" for entry_id in chunk]
+            for entry_id, data in zip(chunk, await self._redis.mget(keys)):
+                entry = self._decode(entry_id, data)
+                if entry:
+                    found[entry_id] = entry
+        return found
+
+    @staticmethod
+    def _decode(entry_id: str, data: Optional[str]) -> Optional[DLQEntry]:
+        if not data:
+            return None
+        try:
+            return DLQEntry.from_dict(json.loads(data))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Skipping unreadable DLQ entry {entry_id}: {e}")
+            return None
+
     async def get_pending_entries(
         self,
         platform: Optional[str] = None,
@@ -449,15 +642,21 @@ class DeadLetterQueue:
 
         if self._connected and self._redis:
             try:
-                # Get entry IDs from sorted set
+                # Page through the narrowest index, then fetch in one MGET
+                index = (
+                    f"{self.PLATFORM_INDEX_PREFIX}{platform}"
+                    if platform
+                    else f"{self.STATUS_INDEX_PREFIX}{DLQStatus.PENDING.value}"
+                )
                 entry_ids = await self._redis.zrange(
-                    self.QUEUE_KEY,
+                    index,
                     offset,
                     offset + limit - 1,
                 )
+                found = await self._get_entries(entry_ids)
 
                 for entry_id in entry_ids:
-                    entry = await self.get_entry(entry_id)
+                    entry = found.get(entry_id)
                     if entry and entry.status == DLQStatus.PENDING:
                         if platform and entry.platform != platform:
                             continue
@@ -551,26 +750,69 @@ class DeadLetterQueue:
         """
         Get DLQ statistics.
 
+        With Redis the counts come from the indexes in a single round trip,
+        however many entries are queued.
+
         Returns:
             DLQStats object with current statistics
         """
-        stats = DLQStats()
-
-        entries = []
+        stats = None
 
         if self._connected and self._redis:
             try:
-                entry_ids = await self._redis.zrange(self.QUEUE_KEY, 0, -1)
-                for entry_id in entry_ids:
-                    entry = await self.get_entry(entry_id)
-                    if entry:
-                        entries.append(entry)
+                stats = await self._indexed_stats()
             except (ConnectionError, TimeoutError, OSError, RedisError) as e:
                 logger.warning(f"Failed to get DLQ stats from Redis: {e}")
-                entries = self._memory_queue
-        else:
-            entries = self._memory_queue
 
+        if stats is None:
+            stats = self._scan_stats(self._memory_queue)
+
+        # Calculate recovery rate
+        total_processed = stats.recovered + stats.discarded + stats.expired
+        if total_processed > 0:
+            stats.recovery_rate_pct = (stats.recovered / total_processed) * 100
+
+        return stats
+
+    async def _indexed_stats(self) -> DLQStats:
+        """Read counts from the status indexes and the counter hash."""
+        statuses = list(DLQStatus)
+        pipe = self._redis.pipeline(transaction=False)
+        for status in statuses:
+            pipe.zcard(f"{self.STATUS_INDEX_PREFIX}{status.value}")
+        for status in statuses:
+            # Lowest score = earliest first failure
+            pipe.zrange(
+                f"{self.STATUS_INDEX_PREFIX}{status.value}", 0, 0, withscores=True
+            )
+        pipe.hgetall(self.STATS_KEY)
+        results = await pipe.execute()
+
+        stats = DLQStats()
+        for status, count in zip(statuses, results[: len(statuses)]):
+            setattr(stats, status.value, int(count))
+        stats.total_entries = sum(int(c) for c in results[: len(statuses)])
+
+        for field_name, count in (results[-1] or {}).items():
+            kind, _, name = field_name.partition(":")
+            if int(count) <= 0:
+                continue
+            if kind == "platform":
+                stats.by_platform[name] = int(count)
+            elif kind == "category":
+                stats.by_failure_category[name] = int(count)
+
+        firsts = [rows[0][1] for rows in results[len(statuses) : -1] if rows]
+        if firsts:
+            age = datetime.now(timezone.utc).timestamp() - min(firsts)
+            stats.oldest_entry_age_hours = age / 3600
+
+        return stats
+
+    @staticmethod
+    def _scan_stats(entries: List[DLQEntry]) -> DLQStats:
+        """Count entries one by one (in-memory fallback)."""
+        stats = DLQStats()
         stats.total_entries = len(entries)
 
         for entry in entries:
@@ -603,17 +845,15 @@ class DeadLetterQueue:
             age = datetime.now(timezone.utc) - oldest.first_failure_at
             stats.oldest_entry_age_hours = age.total_seconds() / 3600
 
-        # Calculate recovery rate
-        total_processed = stats.recovered + stats.discarded + stats.expired
-        if total_processed > 0:
-            stats.recovery_rate_pct = (stats.recovered / total_processed) * 100
-
         return stats
 
     async def cleanup_expired(self) -> int:
         """
         Remove expired entries.
 
+        Pending entries past retention are marked expired; every entry past
+        retention leaves the queue, the indexes and the counters.
+
         Returns:
             Number of entries removed
         """
@@ -629,16 +869,30 @@ class DeadLetterQueue:
                     cutoff.timestamp(),
                 )
 
-                for entry_id in entry_ids:
-                    entry = await self.get_entry(entry_id)
-                    if entry and entry.status == DLQStatus.PENDING:
-                        entry.status = DLQStatus.EXPIRED
-                        await self._store_entry(entry)
-
-                    # Remove from queue
-                    await self._redis.zrem(self.QUEUE_KEY, entry_id)
-                    removed += 1
-
+                expired = []
+                for chunk in _chunks(entry_ids, self.FETCH_CHUNK):
+                    pipe = self._redis.pipeline(transaction=False)
+                    pipe.mget([f"{self.ENTRY_PREFIX}{i}" for i in chunk])
+                    pipe.hmget(self.LABELS_KEY, chunk)
+                    raw, labels = await pipe.execute()
+
+                    pipe = self._redis.pipeline(transaction=True)
+                    for entry_id, data, label in zip(chunk, raw, labels):
+                        entry = self._decode(entry_id, data)
+                        if entry and entry.status == DLQStatus.PENDING:
+                            entry.status = DLQStatus.EXPIRED
+                            pipe.set(
+                                f"{self.ENTRY_PREFIX}{entry_id}",
+                                json.dumps(entry.to_dict()),
+                                ex=self._retention_days * 86400,
+                            )
+                            expired.append(entry)
+                        self._unindex(pipe, entry_id, label)
+                    await pipe.execute()
+                    removed += len(chunk)
+
+                if expired:
+                    await self._persist_batch_to_db(expired)
                 return removed
             except (ConnectionError, TimeoutError, OSError, RedisError) as e:
                 logger.warning(f"Failed to cleanup expired DLQ entries: {e}")
@@ -681,6 +935,80 @@ class DeadLetterQueue:
             "original_retry_count": entry.retry_count,
         }
 
+    async def claim_pending(
+        self,
+        platform: Optional[str] = None,
+        tenant_id: Optional[int] = None,
+        limit: int = 10000,
+    ) -> AsyncIterator[List[DLQEntry]]:
+        """
+        Claim pending entries for replay, oldest first, in chunks.
+
+        Each chunk is marked RETRYING (one pipeline and one Postgres write)
+        before it is yielded, so a concurrent replay will not pick it up.
+
+        Args:
+            platform: Only claim entries for this platform
+            tenant_id: Only claim entries for this tenant
+            limit: Maximum entries to claim
+
+        Yields:
+            Lists of claimed DLQEntry objects
+        """
+        if not (self._connected and self._redis):
+            pending = [
+                e
+                for e in self._memory_queue
+                if e.status == DLQStatus.PENDING
+                and (platform is None or e.platform == platform)
+                and (tenant_id is None or e.tenant_id == tenant_id)
+            ]
+            pending.sort(key=lambda e: e.first_failure_at)
+            for chunk in _chunks(pending[:limit], self.FETCH_CHUNK):
+                for entry in chunk:
+                    entry.status = DLQStatus.RETRYING
+                await self._store_entries(chunk)
+                yield chunk
+            return
+
+        # Claimed entries leave the pending index, so only the ids skipped
+        # over move the offset; the platform index keeps every entry.
+        index = (
+            f"{self.PLATFORM_INDEX_PREFIX}{platform}"
+            if platform
+            else f"{self.STATUS_INDEX_PREFIX}{DLQStatus.PENDING.value}"
+        )
+        offset = 0
+        claimed = 0
+        while claimed < limit:
+            try:
+                entry_ids = await self._redis.zrange(
+                    index, offset, offset + self.FETCH_CHUNK - 1
+                )
+                if not entry_ids:
+                    return
+                found = await self._get_entries(entry_ids)
+            except (ConnectionError, TimeoutError, OSError, RedisError) as e:
+                logger.warning(f"Failed to claim DLQ entries from Redis: {e}")
+                return
+
+            chunk = [
+                entry
+                for entry in (found.get(i) for i in entry_ids)
+                if entry
+                and entry.status == DLQStatus.PENDING
+                and (tenant_id is None or entry.tenant_id == tenant_id)
+            ][: limit - claimed]
+            offset += len(entry_ids) if platform else len(entry_ids) - len(chunk)
+            if not chunk:
+                continue
+
+            for entry in chunk:
+                entry.status = DLQStatus.RETRYING
+            await self._store_entries(chunk)
+            claimed += len(chunk)
+            yield chunk
+
     async def health_check(self) -> Dict[str, Any]:
         """
         Perform health check on the DLQ.
@@ -710,6 +1038,190 @@ class DeadLetterQueue:
         return health
 
 
+# =============================================================================
+# Batch Replay
+# =============================================================================
+
+# (tenant_id, platform, pixel_id, events) -> CAPIResponse, or None when the
+# tenant has no connected destination for that platform/pixel.
+ReplaySender = Callable[[int, str, Optional[str], List[Dict[str, Any]]], Awaitable[Any]]
+
+
+@dataclass
+class ReplayResult:
+    """Outcome of a batch replay."""
+
+    claimed: int = 0
+    recovered: int = 0
+    failed: int = 0
+    skipped: int = 0
+    batches: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "claimed": self.claimed,
+            "recovered": self.recovered,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "batches": self.batches,
+            "errors": self.errors[:10],
+        }
+
+
+class DLQReplayEngine:
+    """
+    Replays pending DLQ entries through the platforms' batch sends.
+
+    Entries are claimed in chunks, grouped by tenant, platform and pixel, and
+    sent in batches of the platform's default batch size with at most
+    ``concurrency`` sends in flight. Each batch settles with one DLQ write:
+    recovered on success, back to pending with the retry counted on failure,
+    or back to pending untouched when there is nowhere to send it.
+
+    Usage:
+        engine = DLQReplayEngine(dlq, send, concurrency=4)
+        result = await engine.replay(platform="meta", limit=50000)
+    """
+
+    DEFAULT_BATCH_SIZE = 500
+
+    def __init__(
+        self,
+        dlq: DeadLetterQueue,
+        send: ReplaySender,
+        concurrency: int = 4,
+        batch_sizes: Optional[Dict[str, int]] = None,
+    ):
+        self.dlq = dlq
+        self.send = send
+        self.concurrency = max(1, concurrency)
+        self.batch_sizes = (
+            batch_sizes
+            if batch_sizes is not None
+            else BatchOptimizer.DEFAULT_BATCH_SIZES
+        )
+
+    async def replay(
+        self,
+        platform: Optional[str] = None,
+        tenant_id: Optional[int] = None,
+        limit: int = 10000,
+    ) -> ReplayResult:
+        """
+        Replay up to ``limit`` pending entries.
+
+        Args:
+            platform: Only replay entries for this platform
+            tenant_id: Only replay entries for this tenant
+            limit: Maximum entries to replay
+
+        Returns:
+            ReplayResult with per-outcome counts
+        """
+        result = ReplayResult()
+        groups: Dict[Tuple[int, str, Optional[str]], List[DLQEntry]] = {}
+        in_flight: set = set()
+
+        async for chunk in self.dlq.claim_pending(platform, tenant_id, limit):
+            result.claimed += len(chunk)
+            for entry in chunk:
+                key = (
+                    entry.tenant_id,
+                    entry.platform,
+                    (entry.context or {}).get("pixel_id"),
+                )
+                batch = groups.setdefault(key, [])
+                batch.append(entry)
+                if len(batch) >= self._batch_size(entry.platform):
+                    await self._dispatch(in_flight, key, groups.pop(key), result)
+
+        for key, batch in groups.items():
+            await self._dispatch(in_flight, key, batch, result)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+        logger.info(
+            f"DLQ: replayed {result.claimed} entries in {result.batches} batches | "
+            f"recovered={result.recovered} failed={result.failed} "
+            f"skipped={result.skipped}"
+        )
+        return result
+
+    def _batch_size(self, platform: str) -> int:
+        return self.batch_sizes.get(platform, self.DEFAULT_BATCH_SIZE)
+
+    async def _dispatch(
+        self,
+        in_flight: set,
+        key: Tuple[int, str, Optional[str]],
+        batch: List[DLQEntry],
+        result: ReplayResult,
+    ) -> None:
+        """Start a batch send once fewer than ``concurrency`` are running."""
+        while len(in_flight) >= self.concurrency:
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            in_flight.difference_update(done)
+            for task in done:
+                task.result()
+        in_flight.add(asyncio.create_task(self._send_batch(key, batch, result)))
+
+    async def _send_batch(
+        self,
+        key: Tuple[int, str, Optional[str]],
+        batch: List[DLQEntry],
+        result: ReplayResult,
+    ) -> None:
+        tenant_id, platform, pixel_id = key
+        result.batches += 1
+        try:
+            response = await self.send(
+                tenant_id, platform, pixel_id, [e.event_data for e in batch]
+            )
+        except (ConnectionError, TimeoutError, OSError) as e:
+            await self._retry_later(batch, str(e), result)
+            return
+
+        if response is None:
+            for entry in batch:
+                entry.status = DLQStatus.PENDING
+            await self.dlq._store_entries(batch)
+            result.skipped += len(batch)
+        elif response.success:
+            now = datetime.now(timezone.utc)
+            for entry in batch:
+                entry.status = DLQStatus.RECOVERED
+                entry.recovered_at = now
+            await self.dlq._store_entries(batch)
+            result.recovered += len(batch)
+        else:
+            errors = response.errors or []
+            error_message = (
+                "; ".join(str(e.get("message", e)) for e in errors) or "replay failed"
+            )[:500]
+            await self._retry_later(batch, error_message, result)
+
+    async def _retry_later(
+        self, batch: List[DLQEntry], error_message: str, result: ReplayResult
+    ) -> None:
+        """Put a failed batch back in the queue, counting the attempt."""
+        now = datetime.now(timezone.utc)
+        for entry in batch:
+            entry.retry_count += 1
+            entry.last_failure_at = now
+            entry.error_message = error_message
+            entry.status = DLQStatus.PENDING
+        await self.dlq._store_entries(batch)
+        result.failed += len(batch)
+        result.errors.append(
+            {
+                "platform": batch[0].platform,
+                "events": len(batch),
+                "error": error_message,
+            }
+        )
+
+
 # =============================================================================
 # Singleton Instance
 # =============================================================================
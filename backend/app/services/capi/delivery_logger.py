@@ -13,23 +13,58 @@ Features:
 - Aggregated metrics for monitoring
 - Retention management
 - Integration with DLQ for failed events
+
+Buffered entries are written with one multi-row INSERT per flush. The same
+transaction upserts ``capi_delivery_minute_rollups`` (one row per tenant,
+minute, platform, event, status and latency bucket), which is what
+``get_metrics`` reads, so metric queries do not grow with event volume.
 """
 
+import asyncio
 import logging
+from bisect import bisect_right
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
-from uuid import uuid4
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
 
-from sqlalchemy import and_, desc, func, select
+from sqlalchemy import case, desc, func, insert, select
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import async_session_factory
 
 logger = logging.getLogger(__name__)
 
+# Upper edges of the latency histogram kept in the minute rollups. A latency
+# falls in bucket ``bisect_right(LATENCY_BUCKETS_MS, latency_ms)``; migration
+# 070 backfills with the same edges.
+LATENCY_BUCKETS_MS = (
+    10,
+    25,
+    50,
+    100,
+    150,
+    250,
+    400,
+    600,
+    1000,
+    1500,
+    2500,
+    5000,
+    10000,
+    30000,
+)
+
+
+def _insert_for(dialect_name: str):
+    """Dialect ``insert`` that supports ON CONFLICT (PostgreSQL, SQLite)."""
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert
+
 
 class DeliveryStatus(str, Enum):
     """CAPI delivery status."""
@@ -119,18 +154,25 @@ class DeliveryLogger:
 
     # In-memory buffer for batch inserts
     _buffer: List[DeliveryLogEntry] = []
-    _buffer_max_size: int = 100
+    _buffer_max_size: int = 500
+    _flush_interval: float = 5.0
     _last_flush: datetime = None
 
-    def __init__(self, buffer_size: int = 100):
+    def __init__(self, buffer_size: int = 500, flush_interval: float = 5.0):
         """
         Initialize the delivery logger.
 
         Args:
             buffer_size: Number of entries to buffer before flushing
+            flush_interval: Seconds an entry may wait in the buffer
         """
         self._buffer_max_size = buffer_size
+        self._flush_interval = flush_interval
         self._last_flush = datetime.now(timezone.utc)
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        # The event loop only holds tasks weakly; timed flushes are kept
+        # here until done so one is never collected mid-write
+        self._flush_tasks: set[asyncio.Task] = set()
 
     async def log_delivery(
         self,
@@ -195,11 +237,14 @@ class DeliveryLogger:
         # Add to buffer
         self._buffer.append(entry)
 
-        # Flush if buffer is full or enough time has passed
+        # Flush if buffer is full or enough time has passed; otherwise make
+        # sure a quiet period still flushes within the interval.
         if len(self._buffer) >= self._buffer_max_size:
             await self.flush()
-        elif (now - self._last_flush).total_seconds() > 30:
+        elif (now - self._last_flush).total_seconds() > self._flush_interval:
             await self.flush()
+        else:
+            self._arm_flush_timer()
 
         # Log for immediate visibility
         log_level = (
@@ -214,8 +259,40 @@ class DeliveryLogger:
 
         return entry
 
+    def _arm_flush_timer(self) -> None:
+        """Schedule a flush ``flush_interval`` seconds from now, once."""
+        if self._flush_timer is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._flush_timer = loop.call_later(self._flush_interval, self._start_flush)
+
+    def _start_flush(self) -> None:
+        task = asyncio.get_running_loop().create_task(self.flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def close(self) -> None:
+        """Wait for timed flushes in progress, then flush what is left."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks)
+        await self.flush()
+
     async def flush(self):
-        """Flush buffered entries to database."""
+        """Flush buffered entries to database.
+
+        The entries go out as one multi-row INSERT and their minute rollups
+        as one upsert, committed together; on failure both roll back and the
+        entries are re-buffered.
+        """
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
         if not self._buffer:
             return
 
@@ -224,33 +301,17 @@ class DeliveryLogger:
         self._last_flush = datetime.now(timezone.utc)
 
         try:
-            async with async_session_factory() as db:
-                for entry in entries_to_flush:
-                    # Import here to avoid circular imports
-                    from app.models.capi_delivery import CAPIDeliveryLog
-
-                    db_entry = CAPIDeliveryLog(
-                        id=entry.id,
-                        tenant_id=entry.tenant_id,
-                        platform=entry.platform,
-                        event_id=entry.event_id,
-                        event_name=entry.event_name,
-                        event_time=entry.event_time,
-                        delivery_time=entry.delivery_time,
-                        status=entry.status.value,
-                        latency_ms=entry.latency_ms,
-                        retry_count=entry.retry_count,
-                        error_message=entry.error_message,
-                        request_id=entry.request_id,
-                        platform_response=entry.platform_response,
-                        user_data_hash=entry.user_data_hash,
-                        event_value_cents=(
-                            int(entry.event_value * 100) if entry.event_value else None
-                        ),
-                        currency=entry.currency,
-                    )
-                    db.add(db_entry)
+            # Import here to avoid circular imports
+            from app.models.capi_delivery import CAPIDeliveryLog
 
+            async with async_session_factory() as db:
+                await db.execute(
+                    insert(CAPIDeliveryLog),
+                    [self._log_row(entry) for entry in entries_to_flush],
+                )
+                await db.execute(
+                    self._rollup_upsert(db.get_bind().dialect.name, entries_to_flush)
+                )
                 await db.commit()
                 logger.debug(
                     f"Flushed {len(entries_to_flush)} delivery log entries to database"
@@ -261,6 +322,93 @@ class DeliveryLogger:
             # Re-add entries to buffer for retry
             self._buffer.extend(entries_to_flush)
 
+    @staticmethod
+    def _log_row(entry: DeliveryLogEntry) -> Dict[str, Any]:
+        return {
+            "id": UUID(entry.id),
+            "tenant_id": entry.tenant_id,
+            "platform": entry.platform,
+            "event_id": entry.event_id,
+            "event_name": entry.event_name,
+            "event_time": entry.event_time,
+            "delivery_time": entry.delivery_time,
+            "status": entry.status.value,
+            "latency_ms": entry.latency_ms,
+            "retry_count": entry.retry_count,
+            "error_message": entry.error_message,
+            "request_id": entry.request_id,
+            "platform_response": entry.platform_response,
+            "user_data_hash": entry.user_data_hash,
+            "event_value_cents": (
+                int(entry.event_value * 100) if entry.event_value else None
+            ),
+            "currency": entry.currency,
+        }
+
+    @staticmethod
+    def _rollup_upsert(dialect_name: str, entries: List[DeliveryLogEntry]):
+        """One upsert adding ``entries`` to their minute rollup rows."""
+        from app.models.capi_delivery import CAPIDeliveryMinuteRollup as Rollup
+
+        totals: Dict[Tuple[Any, ...], List[float]] = {}
+        for entry in entries:
+            key = (
+                entry.tenant_id,
+                entry.delivery_time.replace(second=0, microsecond=0),
+                entry.platform,
+                entry.event_name,
+                entry.status.value,
+                bisect_right(LATENCY_BUCKETS_MS, entry.latency_ms),
+            )
+            total = totals.setdefault(key, [0, 0.0, 0.0])
+            total[0] += 1
+            total[1] += entry.latency_ms
+            total[2] = max(total[2], entry.latency_ms)
+
+        now = datetime.now(timezone.utc)
+        # Sorted so concurrent flushes lock rows in the same order
+        rows = [
+            {
+                "id": uuid4(),
+                "tenant_id": key[0],
+                "bucket_start": key[1],
+                "platform": key[2],
+                "event_name": key[3],
+                "status": key[4],
+                "latency_bucket": key[5],
+                "event_count": count,
+                "latency_sum_ms": latency_sum,
+                "latency_max_ms": latency_max,
+                "updated_at": now,
+            }
+            for key, (count, latency_sum, latency_max) in sorted(totals.items())
+        ]
+
+        statement = _insert_for(dialect_name)(Rollup).values(rows)
+        excluded = statement.excluded
+        return statement.on_conflict_do_update(
+            index_elements=[
+                "tenant_id",
+                "bucket_start",
+                "platform",
+                "event_name",
+                "status",
+                "latency_bucket",
+            ],
+            set_={
+                "event_count": Rollup.event_count + excluded.event_count,
+                "latency_sum_ms": Rollup.latency_sum_ms + excluded.latency_sum_ms,
+                "latency_max_ms": case(
+                    (
+                        excluded.latency_max_ms > Rollup.latency_max_ms,
+                        excluded.latency_max_ms,
+                    ),
+                    else_=Rollup.latency_max_ms,
+                ),
+                "updated_at": excluded.updated_at,
+            },
+        )
+
     async def get_delivery_history(
         self,
         tenant_id: int,
@@ -371,97 +519,83 @@ class DeliveryLogger:
         )
 
         try:
-            from app.models.capi_delivery import CAPIDeliveryLog
+            from app.models.capi_delivery import CAPIDeliveryMinuteRollup as Rollup
 
             async with async_session_factory() as db:
-                # Base query
-                base_filter = and_(
-                    CAPIDeliveryLog.tenant_id == tenant_id,
-                    CAPIDeliveryLog.delivery_time >= start_time,
-                    CAPIDeliveryLog.delivery_time <= end_time,
-                )
-
-                # Total counts
+                # One row per platform/event/status/latency bucket, however
+                # many deliveries the period holds
                 result = await db.execute(
                     select(
-                        func.count(CAPIDeliveryLog.id).label("total"),
-                        func.count(CAPIDeliveryLog.id)
-                        .filter(CAPIDeliveryLog.status == "success")
-                        .label("successful"),
-                        func.count(CAPIDeliveryLog.id)
-                        .filter(CAPIDeliveryLog.status == "failed")
-                        .label("failed"),
-                        func.avg(CAPIDeliveryLog.latency_ms).label("avg_latency"),
-                    ).where(base_filter)
-                )
-                row = result.one()
-
-                metrics.total_events = row.total or 0
-                metrics.successful = row.successful or 0
-                metrics.failed = row.failed or 0
-                metrics.avg_latency_ms = float(row.avg_latency or 0)
-
-                if metrics.total_events > 0:
-                    metrics.success_rate_pct = (
-                        metrics.successful / metrics.total_events
-                    ) * 100
-
-                # Latency percentiles
-                latency_result = await db.execute(
-                    select(CAPIDeliveryLog.latency_ms)
-                    .where(base_filter)
-                    .where(CAPIDeliveryLog.status == "success")
-                    .order_by(CAPIDeliveryLog.latency_ms)
-                )
-                latencies = [r[0] for r in latency_result.all()]
-
-                if latencies:
-                    n = len(latencies)
-                    metrics.p50_latency_ms = latencies[int(n * 0.50)]
-                    metrics.p95_latency_ms = (
-                        latencies[int(n * 0.95)] if n > 20 else latencies[-1]
+                        Rollup.platform,
+                        Rollup.event_name,
+                        Rollup.status,
+                        Rollup.latency_bucket,
+                        func.sum(Rollup.event_count).label("count"),
+                        func.sum(Rollup.latency_sum_ms).label("latency_sum"),
+                        func.max(Rollup.latency_max_ms).label("latency_max"),
                     )
-                    metrics.p99_latency_ms = (
-                        latencies[int(n * 0.99)] if n > 100 else latencies[-1]
+                    .where(
+                        Rollup.tenant_id == tenant_id,
+                        Rollup.bucket_start
+                        >= start_time.replace(second=0, microsecond=0),
+                        Rollup.bucket_start <= end_time,
                     )
-
-                # By platform
-                platform_result = await db.execute(
-                    select(
-                        CAPIDeliveryLog.platform,
-                        CAPIDeliveryLog.status,
-                        func.count(CAPIDeliveryLog.id).label("count"),
+                    .group_by(
+                        Rollup.platform,
+                        Rollup.event_name,
+                        Rollup.status,
+                        Rollup.latency_bucket,
                     )
-                    .where(base_filter)
-                    .group_by(CAPIDeliveryLog.platform, CAPIDeliveryLog.status)
                 )
-
-                for row in platform_result.all():
-                    if row.platform not in metrics.by_platform:
-                        metrics.by_platform[row.platform] = {"success": 0, "failed": 0}
-                    metrics.by_platform[row.platform][row.status] = row.count
-
-                # By event type
-                event_result = await db.execute(
-                    select(
-                        CAPIDeliveryLog.event_name,
-                        CAPIDeliveryLog.status,
-                        func.count(CAPIDeliveryLog.id).label("count"),
-                    )
-                    .where(base_filter)
-                    .group_by(CAPIDeliveryLog.event_name, CAPIDeliveryLog.status)
-                )
-
-                for row in event_result.all():
-                    if row.event_name not in metrics.by_event_type:
-                        metrics.by_event_type[row.event_name] = {
-                            "success": 0,
-                            "failed": 0,
-                        }
-                    metrics.by_event_type[row.event_name][row.status] = row.count
+                rows = result.all()
 
         except (SQLAlchemyError, ValueError, OSError) as e:
             logger.error(f"Failed to get delivery metrics: {e}")
+            return metrics
+
+        latency_sum = 0.0
+        # latency bucket -> [successful deliveries, max latency]
+        histogram: Dict[int, List[float]] = {}
+        for row in rows:
+            count = int(row.count or 0)
+            metrics.total_events += count
+            latency_sum += float(row.latency_sum or 0)
+            if row.status == DeliveryStatus.SUCCESS.value:
+                metrics.successful += count
+                bucket = histogram.setdefault(row.latency_bucket, [0, 0.0])
+                bucket[0] += count
+                bucket[1] = max(bucket[1], float(row.latency_max or 0))
+            elif row.status == DeliveryStatus.FAILED.value:
+                metrics.failed += count
+
+            for breakdown, name in (
+                (metrics.by_platform, row.platform),
+                (metrics.by_event_type, row.event_name),
+            ):
+                counts = breakdown.setdefault(name, {"success": 0, "failed": 0})
+                counts[row.status] = counts.get(row.status, 0) + count
+
+        if metrics.total_events > 0:
+            metrics.success_rate_pct = (metrics.successful / metrics.total_events) * 100
+            metrics.avg_latency_ms = latency_sum / metrics.total_events
+
+        # Latency percentiles: the highest latency seen in the bucket that
+        # holds the percentile's rank
+        n = metrics.successful
+        if n:
+            ordered = sorted(histogram.items())
+
+            def latency_at(rank: int) -> float:
+                seen = 0
+                for _, (count, latency_max) in ordered:
+                    seen += count
+                    if rank < seen:
+                        return latency_max
+                return ordered[-1][1][1]
+
+            metrics.p50_latency_ms = latency_at(int(n * 0.50))
+            metrics.p95_latency_ms = latency_at(int(n * 0.95) if n > 20 else n - 1)
+            metrics.p99_latency_ms = latency_at(int(n * 0.99) if n > 100 else n - 1)
 
         return metrics
 
@@ -480,7 +614,10 @@ class DeliveryLogger:
         try:
             from sqlalchemy import delete
 
-            from app.models.capi_delivery import CAPIDeliveryLog
+            from app.models.capi_delivery import (
+                CAPIDeliveryLog,
+                CAPIDeliveryMinuteRollup,
+            )
 
             async with async_session_factory() as db:
                 result = await db.execute(
@@ -488,6 +625,11 @@ class DeliveryLogger:
                         CAPIDeliveryLog.delivery_time < cutoff
                     )
                 )
+                await db.execute(
+                    delete(CAPIDeliveryMinuteRollup).where(
+                        CAPIDeliveryMinuteRollup.bucket_start < cutoff
+                    )
+                )
                 await db.commit()
 
                 deleted = result.rowcount
@@ -25,6 +25,7 @@ from app.models.cdp import (
     CDPProfile,
     ComputedTraitType,
 )
+from app.services.cdp.trait_batch_engine import TraitBatchEngine
 
 logger = structlog.get_logger()
 
@@ -292,47 +293,28 @@ class ComputedTraitsService:
         batch_size: int = 500,
     ) -> tuple[int, int]:
         """
-        Compute all traits for all profiles in batches.
+        Compute all active traits for all of the tenant's profiles.
 
-        Returns: (profiles_processed, errors)
+        Each trait is one set-based statement over the tenant's events (see
+        TraitBatchEngine), so ``batch_size`` no longer affects the work done;
+        it is kept for API compatibility.
+
+        Returns: (profiles_processed, errors) where errors counts traits whose
+        statement failed.
         """
         traits, _ = await self.list_traits(active_only=True)
         if not traits:
             return 0, 0
 
-        processed = 0
-        errors = 0
-        offset = 0
+        processed, failed = await TraitBatchEngine(
+            self.db, self.tenant_id
+        ).compute_traits(traits)
+        errors = len(failed)
 
-        while True:
-            result = await self.db.execute(
-                select(CDPProfile)
-                .where(CDPProfile.tenant_id == self.tenant_id)
-                .offset(offset)
-                .limit(batch_size)
-            )
-            profiles = result.scalars().all()
-
-            if not profiles:
-                break
-
-            for profile in profiles:
-                try:
-                    await self.compute_all_traits_for_profile(profile)
-                    processed += 1
-                except (ValueError, TypeError, KeyError) as e:
-                    errors += 1
-                    logger.error(
-                        "cdp_batch_trait_error",
-                        profile_id=str(profile.id),
-                        error=str(e),
-                    )
-
-            offset += batch_size
-            await self.db.flush()
-
-        # Update last_computed_at for all traits
+        # Update last_computed_at for the traits that were written
         for trait in traits:
+            if trait.name in failed:
+                continue
             trait.last_computed_at = datetime.now(UTC)
 
         await self.db.flush()
@@ -542,71 +524,25 @@ class RFMAnalysisService:
         """
         Calculate RFM for all profiles and store in computed_traits.
 
+        Runs as one statement (see TraitBatchEngine.compute_rfm). Scores are
+        quintiles of the tenant's purchasers rather than the fixed bands used
+        by calculate_rfm_for_profile; ``batch_size`` is kept for API
+        compatibility.
+
         Returns summary statistics.
         """
-        processed = 0
-        segment_counts: dict[str, int] = {}
-        offset = 0
-
-        while True:
-            result = await self.db.execute(
-                select(CDPProfile)
-                .where(CDPProfile.tenant_id == self.tenant_id)
-                .offset(offset)
-                .limit(batch_size)
-            )
-            profiles = list(result.scalars().all())
-
-            if not profiles:
-                break
-
-            for profile in profiles:
-                try:
-                    rfm = await self.calculate_rfm_for_profile(
-                        profile,
-                        purchase_event_name,
-                        revenue_property,
-                        analysis_window_days,
-                    )
-
-                    # Store in computed_traits
-                    traits = profile.computed_traits or {}
-                    traits["rfm_recency_days"] = rfm["recency_days"]
-                    traits["rfm_frequency"] = rfm["frequency"]
-                    traits["rfm_monetary"] = rfm["monetary"]
-                    traits["rfm_score"] = rfm["rfm_score"]
-                    traits["rfm_segment"] = rfm["rfm_segment"]
-                    traits["rfm_calculated_at"] = rfm["calculated_at"]
-                    profile.computed_traits = traits
-
-                    # Track segment
-                    segment = rfm["rfm_segment"]
-                    segment_counts[segment] = segment_counts.get(segment, 0) + 1
-                    processed += 1
-
-                except (ValueError, TypeError, KeyError) as e:
-                    logger.error(
-                        "cdp_rfm_calculation_error",
-                        profile_id=str(profile.id),
-                        error=str(e),
-                    )
-
-            offset += batch_size
-            await self.db.flush()
+        summary = await TraitBatchEngine(self.db, self.tenant_id).compute_rfm(
+            purchase_event_name, revenue_property, analysis_window_days
+        )
 
         logger.info(
             "cdp_rfm_batch_completed",
             tenant_id=self.tenant_id,
-            profiles_processed=processed,
-            segment_counts=segment_counts,
+            profiles_processed=summary["profiles_processed"],
+            segment_counts=summary["segment_distribution"],
         )
 
-        return {
-            "profiles_processed": processed,
-            "segment_distribution": segment_counts,
-            "analysis_window_days": analysis_window_days,
-            "calculated_at": datetime.now(UTC).isoformat(),
-        }
+        return summary
 
     async def get_rfm_summary(self) -> dict[str, Any]:
         """
@@ -0,0 +1,390 @@
+# =============================================================================
+# Stratum AI - CDP Identity Graph Resolver
+# =============================================================================
+"""
+Batched identity graph resolution.
+
+Given the identifiers touched by a batch of events, the resolver loads the
+connected components they belong to one frontier at a time (a few ``IN``
+queries per hop, however many nodes the frontier holds), groups them with
+an in-memory union-find, and merges every component that spans more than
+one profile with bulk statements:
+
+- identifiers, events and consents move with one UPDATE each, mapping every
+  merged profile to its survivor with a CASE;
+- merged profiles and their canonical identities go with one DELETE each;
+- merge records and canonical identities are written in the same flush.
+
+Survivors are chosen like IdentityResolutionService.determine_surviving_profile:
+highest canonical priority, then most events, then oldest.
+"""
+
+from collections.abc import Hashable, Iterable
+from datetime import UTC, datetime
+from typing import Optional
+from uuid import UUID
+
+import structlog
+from sqlalchemy import case, delete, or_, select, update
+
+from app.models.cdp import (
+    CDPCanonicalIdentity,
+    CDPConsent,
+    CDPEvent,
+    CDPIdentityLink,
+    CDPProfile,
+    CDPProfileIdentifier,
+    CDPProfileMerge,
+    MergeReason,
+)
+from app.services.cdp.identity_resolution import IdentityResolutionService
+
+logger = structlog.get_logger()
+
+
+class UnionFind:
+    """Disjoint sets with path halving and union by size."""
+
+    def __init__(self) -> None:
+        self._parent: dict[Hashable, Hashable] = {}
+        self._size: dict[Hashable, int] = {}
+
+    def add(self, node: Hashable) -> None:
+        if node not in self._parent:
+            self._parent[node] = node
+            self._size[node] = 1
+
+    def find(self, node: Hashable) -> Hashable:
+        self.add(node)
+        while self._parent[node] != node:
+            self._parent[node] = self._parent[self._parent[node]]
+            node = self._parent[node]
+        return node
+
+    def union(self, a: Hashable, b: Hashable) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self._size[root_a] < self._size[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size[root_b]
+
+    def groups(self, nodes: Iterable[Hashable]) -> dict[Hashable, list[Hashable]]:
+        """``nodes`` grouped by their set representative."""
+        grouped: dict[Hashable, list[Hashable]] = {}
+        for node in nodes:
+            grouped.setdefault(self.find(node), []).append(node)
+        return grouped
+
+
+class IdentityGraphResolver:
+    """Resolves and merges the identity-graph components of a batch."""
+
+    def __init__(self, service: IdentityResolutionService):
+        self.service = service
+        self.db = service.db
+        self.tenant_id = service.tenant_id
+
+    # =========================================================================
+    # Graph loading
+    # =========================================================================
+
+    async def load_components(
+        self,
+        identifier_ids: Iterable[UUID],
+        max_depth: Optional[int] = None,
+    ) -> tuple[UnionFind, dict[UUID, CDPProfileIdentifier]]:
+        """
+        Load the components reachable from ``identifier_ids``.
+
+        Nodes are identifiers and profiles: an identifier is joined to its
+        profile and to every identifier it has an active link with. Each hop
+        loads the frontier's identifiers, the other identifiers of their
+        profiles, and the links leaving all of them, so the number of queries
+        grows with the graph's depth rather than its size.
+
+        Returns the union-find over identifier and profile ids, and the
+        loaded identifiers by id.
+        """
+        sets = UnionFind()
+        identifiers: dict[UUID, CDPProfileIdentifier] = {}
+        profiles: set[UUID] = set()
+        frontier = set(identifier_ids)
+        depth = 0
+
+        while frontier and (max_depth is None or depth <= max_depth):
+            loaded = await self._identifiers(CDPProfileIdentifier.id.in_(frontier))
+            new_profiles = {i.profile_id for i in loaded} - profiles
+            if new_profiles:
+                loaded += await self._identifiers(
+                    CDPProfileIdentifier.profile_id.in_(new_profiles),
+                    ~CDPProfileIdentifier.id.in_(frontier),
+                )
+                profiles |= new_profiles
+
+            new_ids = set()
+            for identifier in loaded:
+                if identifier.id not in identifiers:
+                    identifiers[identifier.id] = identifier
+                    new_ids.add(identifier.id)
+                sets.union(identifier.id, identifier.profile_id)
+            if not new_ids:
+                break
+
+            result = await self.db.execute(
+                select(
+                    CDPIdentityLink.source_identifier_id,
+                    CDPIdentityLink.target_identifier_id,
+                ).where(
+                    CDPIdentityLink.tenant_id == self.tenant_id,
+                    CDPIdentityLink.is_active == True,
+                    or_(
+                        CDPIdentityLink.source_identifier_id.in_(new_ids),
+                        CDPIdentityLink.target_identifier_id.in_(new_ids),
+                    ),
+                )
+            )
+            frontier = set()
+            for source_id, target_id in result.all():
+                sets.union(source_id, target_id)
+                frontier |= {source_id, target_id} - identifiers.keys()
+            depth += 1
+
+        return sets, identifiers
+
+    async def _identifiers(self, *criteria) -> list[CDPProfileIdentifier]:
+        result = await self.db.execute(
+            select(CDPProfileIdentifier).where(
+                CDPProfileIdentifier.tenant_id == self.tenant_id, *criteria
+            )
+        )
+        return list(result.scalars().all())
+
+    # =========================================================================
+    # Merging
+    # =========================================================================
+
+    async def resolve(
+        self,
+        identifier_ids: Iterable[UUID],
+        merge_reason: MergeReason = MergeReason.IDENTITY_MATCH,
+    ) -> list[CDPProfileMerge]:
+        """
+        Merge every profile that shares a component with ``identifier_ids``.
+
+        Returns the merge records, one per merged-away profile.
+        """
+        sets, identifiers = await self.load_components(identifier_ids)
+        profile_ids = {i.profile_id for i in identifiers.values()}
+        components = [
+            group for group in sets.groups(profile_ids).values() if len(group) > 1
+        ]
+        if not components:
+            return []
+
+        involved = [p for group in components for p in group]
+        result = await self.db.execute(
+            select(CDPProfile).where(
+                CDPProfile.tenant_id == self.tenant_id,
+                CDPProfile.id.in_(involved),
+            )
+        )
+        profiles = {p.id: p for p in result.scalars().all()}
+        result = await self.db.execute(
+            select(CDPCanonicalIdentity).where(
+                CDPCanonicalIdentity.tenant_id == self.tenant_id,
+                CDPCanonicalIdentity.profile_id.in_(involved),
+            )
+        )
+        canonicals = {c.profile_id: c for c in result.scalars().all()}
+
+        by_profile: dict[UUID, list[CDPProfileIdentifier]] = {}
+        for identifier in identifiers.values():
+            by_profile.setdefault(identifier.profile_id, []).append(identifier)
+
+        survivor_of: dict[UUID, UUID] = {}
+        records: list[CDPProfileMerge] = []
+        for group in components:
+            members = [profiles[p] for p in group if p in profiles]
+            if len(members) < 2:
+                continue
+            surviving, *merged = sorted(
+                members, key=lambda p: self._survival_rank(p, canonicals)
+            )
+            for profile in merged:
+                survivor_of[profile.id] = surviving.id
+                records.append(
+                    self._merge_record(
+                        surviving,
+                        profile,
+                        len(by_profile.get(profile.id, [])),
+                        merge_reason,
+                    )
+                )
+                self.service._absorb_profile(surviving, profile)
+
+        if not survivor_of:
+            return []
+
+        await self._merge_consents(survivor_of)
+        await self._move_rows(survivor_of)
+        self._update_canonicals(survivor_of, by_profile, profiles, canonicals)
+        self.db.add_all(records)
+        await self.db.flush()
+
+        # The merged profiles and their identifier/consent collections are
+        # stale now; drop them from the session and reload the survivors'
+        for profile_id in survivor_of:
+            self.db.expunge(profiles[profile_id])
+            if profile_id in canonicals:
+                self.db.expunge(canonicals[profile_id])
+        for surviving_id in set(survivor_of.values()):
+            await self.db.refresh(
+                profiles[surviving_id], attribute_names=["identifiers", "consents"]
+            )
+
+        logger.info(
+            "cdp_identity_graph_resolved",
+            tenant_id=self.tenant_id,
+            identifiers=len(identifiers),
+            profiles_merged=len(survivor_of),
+            survivors=len(set(survivor_of.values())),
+        )
+        return records
+
+    def _survival_rank(
+        self,
+        profile: CDPProfile,
+        canonicals: dict[UUID, CDPCanonicalIdentity],
+    ) -> tuple:
+        canonical = canonicals.get(profile.id)
+        return (
+            -(canonical.priority_score if canonical else 0),
+            -(profile.total_events or 0),
+            profile.created_at or datetime.min.replace(tzinfo=UTC),
+        )
+
+    def _merge_record(
+        self,
+        surviving: CDPProfile,
+        merged: CDPProfile,
+        identifier_count: int,
+        merge_reason: MergeReason,
+    ) -> CDPProfileMerge:
+        snapshot = self.service._merge_snapshot(merged, identifier_count)
+        return CDPProfileMerge(
+            tenant_id=self.tenant_id,
+            surviving_profile_id=surviving.id,
+            merged_profile_id=merged.id,
+            merge_reason=merge_reason.value,
+            merged_profile_snapshot=snapshot,
+            merged_event_count=merged.total_events,
+            merged_identifier_count=identifier_count,
+        )
+
+    async def _merge_consents(self, survivor_of: dict[UUID, UUID]) -> None:
+        """Keep the latest decision per survivor and consent type."""
+        survivors = set(survivor_of.values())
+        result = await self.db.execute(
+            select(CDPConsent).where(
+                CDPConsent.tenant_id == self.tenant_id,
+                CDPConsent.profile_id.in_(survivors | survivor_of.keys()),
+            )
+        )
+        consents = list(result.scalars().all())
+
+        kept: dict[tuple[UUID, str], CDPConsent] = {
+            (c.profile_id, c.consent_type): c
+            for c in consents
+            if c.profile_id in survivors
+        }
+        doomed: list[UUID] = []
+        for consent in consents:
+            if consent.profile_id in survivors:
+                continue
+            key = (survivor_of[consent.profile_id], consent.consent_type)
+            existing = kept.get(key)
+            if existing is None:
+                kept[key] = consent
+                continue
+            # Two merged profiles can hold the same type; the newer one wins
+            newer, older = (
+                (consent, existing)
+                if consent.updated_at > existing.updated_at
+                else (existing, consent)
+            )
+            if older.profile_id in survivors:
+                older.granted = newer.granted
+                older.granted_at = newer.granted_at
+                older.revoked_at = newer.revoked_at
+                doomed.append(newer.id)
+            else:
+                kept[key] = newer
+                doomed.append(older.id)
+
+        # Write the survivors' updated decisions before rows move under them
+        await self.db.flush()
+        if doomed:
+            await self.db.execute(
+                delete(CDPConsent)
+                .where(CDPConsent.id.in_(doomed))
+                .execution_options(synchronize_session=False)
+            )
+
+    async def _move_rows(self, survivor_of: dict[UUID, UUID]) -> None:
+        """Repoint identifiers, events and consents, then delete the merged."""
+        merged = list(survivor_of)
+        for model in (CDPProfileIdentifier, CDPEvent, CDPConsent):
+            await self.db.execute(
+                update(model)
+                .where(model.tenant_id == self.tenant_id, model.profile_id.in_(merged))
+                .values(profile_id=case(survivor_of, value=model.profile_id))
+                .execution_options(synchronize_session=False)
+            )
+        for model in (CDPCanonicalIdentity, CDPProfile):
+            column = model.id if model is CDPProfile else model.profile_id
+            await self.db.execute(
+                delete(model)
+                .where(model.tenant_id == self.tenant_id, column.in_(merged))
+                .execution_options(synchronize_session=False)
+            )
+
+    def _update_canonicals(
+        self,
+        survivor_of: dict[UUID, UUID],
+        by_profile: dict[UUID, list[CDPProfileIdentifier]],
+        profiles: dict[UUID, CDPProfile],
+        canonicals: dict[UUID, CDPCanonicalIdentity],
+    ) -> None:
+        """Point each survivor's canonical identity at its strongest identifier."""
+        pooled: dict[UUID, list[CDPProfileIdentifier]] = {}
+        for profile_id in profiles:
+            owner = survivor_of.get(profile_id, profile_id)
+            pooled.setdefault(owner, []).extend(by_profile.get(profile_id, []))
+
+        for surviving_id in set(survivor_of.values()):
+            strongest = self.service.get_strongest_identifier(pooled[surviving_id])
+            if not strongest:
+                continue
+            values = {
+                "canonical_identifier_id": strongest.id,
+                "canonical_type": strongest.identifier_type,
+                "canonical_value_hash": strongest.identifier_hash,
+                "priority_score": self.service.get_identifier_priority(
+                    strongest.identifier_type
+                ),
+                "is_verified": strongest.verified_at is not None,
+                "verified_at": strongest.verified_at,
+            }
+            canonical = canonicals.get(surviving_id)
+            if canonical:
+                for name, value in values.items():
+                    setattr(canonical, name, value)
+                canonical.updated_at = datetime.now(UTC)
+            else:
+                self.db.add(
+                    CDPCanonicalIdentity(
+                        tenant_id=self.tenant_id, profile_id=surviving_id, **values
+                    )
+                )
@@ -18,7 +18,7 @@ from typing import Optional
 from uuid import UUID
 
 import structlog
-from sqlalchemy import and_, or_, select, update
+from sqlalchemy import or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -92,24 +92,33 @@ class IdentityResolutionService:
         Returns:
             The matched or newly created CDPProfile
         """
-        # Try to find existing profile by any identifier hash
-        for identifier in identifiers:
+        # One lookup for all hashes; the first identifier (in the order
+        # given) that matches decides the profile
+        hashes = [i.get("hash") for i in identifiers if i.get("hash")]
+        matched: dict[str, UUID] = {}
+        if hashes:
             result = await self.db.execute(
-                select(CDPProfileIdentifier).where(
+                select(
+                    CDPProfileIdentifier.identifier_hash,
+                    CDPProfileIdentifier.profile_id,
+                ).where(
                     CDPProfileIdentifier.tenant_id == self.tenant_id,
-                    CDPProfileIdentifier.identifier_hash == identifier.get("hash"),
+                    CDPProfileIdentifier.identifier_hash.in_(hashes),
                 )
             )
-            existing = result.scalar_one_or_none()
-            if existing:
-                # Found a profile, load it
-                profile_result = await self.db.execute(
-                    select(CDPProfile).where(CDPProfile.id == existing.profile_id)
-                )
-                profile = profile_result.scalar_one_or_none()
-                if profile:
-                    profile.updated_at = datetime.now(UTC)
-                    return profile
+            for identifier_hash, profile_id in result.all():
+                matched.setdefault(identifier_hash, profile_id)
+
+        for identifier_hash in hashes:
+            if identifier_hash not in matched:
+                continue
+            profile_result = await self.db.execute(
+                select(CDPProfile).where(CDPProfile.id == matched[identifier_hash])
+            )
+            profile = profile_result.scalar_one_or_none()
+            if profile:
+                profile.updated_at = datetime.now(UTC)
+                return profile
 
         # No existing profile found, create new one
         profile = CDPProfile(
@@ -211,28 +220,27 @@ class IdentityResolutionService:
         evidence = evidence or {}
         created_links = []
 
+        # Existing links among these identifiers, in either direction
+        ids = [i.id for i in identifiers]
+        result = await self.db.execute(
+            select(
+                CDPIdentityLink.source_identifier_id,
+                CDPIdentityLink.target_identifier_id,
+            ).where(
+                CDPIdentityLink.tenant_id == self.tenant_id,
+                CDPIdentityLink.source_identifier_id.in_(ids),
+                CDPIdentityLink.target_identifier_id.in_(ids),
+            )
+        )
+        linked = {frozenset(pair) for pair in result.all()}
+
         # Create links between all pairs
         for i, source in enumerate(identifiers):
             for target in identifiers[i + 1 :]:
-                # Check if link already exists
-                existing = await self.db.execute(
-                    select(CDPIdentityLink).where(
-                        CDPIdentityLink.tenant_id == self.tenant_id,
-                        or_(
-                            and_(
-                                CDPIdentityLink.source_identifier_id == source.id,
-                                CDPIdentityLink.target_identifier_id == target.id,
-                            ),
-                            and_(
-                                CDPIdentityLink.source_identifier_id == target.id,
-                                CDPIdentityLink.target_identifier_id == source.id,
-                            ),
-                        ),
-                    )
-                )
-
-                if existing.scalar_one_or_none():
+                pair = frozenset((source.id, target.id))
+                if pair in linked:
                     continue
+                linked.add(pair)
 
                 # Calculate confidence based on identifier types
                 source_priority = self.get_identifier_priority(source.identifier_type)
@@ -350,30 +358,10 @@ class IdentityResolutionService:
         )
 
         # 1. Create snapshot of merged profile
-        snapshot = {
-            "id": str(merged_profile.id),
-            "external_id": merged_profile.external_id,
-            "lifecycle_stage": merged_profile.lifecycle_stage,
-            "total_events": merged_profile.total_events,
-            "total_sessions": merged_profile.total_sessions,
-            "total_purchases": merged_profile.total_purchases,
-            "total_revenue": float(merged_profile.total_revenue),
-            "profile_data": merged_profile.profile_data,
-            "computed_traits": merged_profile.computed_traits,
-            "first_seen_at": (
-                merged_profile.first_seen_at.isoformat()
-                if merged_profile.first_seen_at
-                else None
-            ),
-            "last_seen_at": (
-                merged_profile.last_seen_at.isoformat()
-                if merged_profile.last_seen_at
-                else None
-            ),
-            "identifier_count": (
-                len(merged_profile.identifiers) if merged_profile.identifiers else 0
-            ),
-        }
+        snapshot = self._merge_snapshot(
+            merged_profile,
+            len(merged_profile.identifiers) if merged_profile.identifiers else 0,
+        )
 
         # 2. Move identifiers to surviving profile
         await self.db.execute(
@@ -419,40 +407,7 @@ class IdentityResolutionService:
                 consent.profile_id = surviving_profile.id
 
         # 5. Update surviving profile counters
-        surviving_profile.total_events += merged_profile.total_events
-        surviving_profile.total_sessions += merged_profile.total_sessions
-        surviving_profile.total_purchases += merged_profile.total_purchases
-        surviving_profile.total_revenue += merged_profile.total_revenue
-
-        # Update first_seen_at to earliest
-        if merged_profile.first_seen_at and (
-            not surviving_profile.first_seen_at
-            or merged_profile.first_seen_at < surviving_profile.first_seen_at
-        ):
-            surviving_profile.first_seen_at = merged_profile.first_seen_at
-
-        # Update last_seen_at to latest
-        if merged_profile.last_seen_at and (
-            not surviving_profile.last_seen_at
-            or merged_profile.last_seen_at > surviving_profile.last_seen_at
-        ):
-            surviving_profile.last_seen_at = merged_profile.last_seen_at
-
-        # Merge profile_data (surviving takes precedence)
-        merged_data = {**merged_profile.profile_data, **surviving_profile.profile_data}
-        surviving_profile.profile_data = merged_data
-
-        # Update lifecycle stage to most advanced
-        lifecycle_order = {
-            LifecycleStage.ANONYMOUS.value: 0,
-            LifecycleStage.KNOWN.value: 1,
-            LifecycleStage.CUSTOMER.value: 2,
-            LifecycleStage.CHURNED.value: 1,  # Churned is at known level
-        }
-        surviving_stage = lifecycle_order.get(surviving_profile.lifecycle_stage, 0)
-        merged_stage = lifecycle_order.get(merged_profile.lifecycle_stage, 0)
-        if merged_stage > surviving_stage:
-            surviving_profile.lifecycle_stage = merged_profile.lifecycle_stage
+        self._absorb_profile(surviving_profile, merged_profile)
 
         # 6. Record merge in history
         merge_record = CDPProfileMerge(
@@ -491,6 +446,62 @@ class IdentityResolutionService:
 
         return merge_record
 
+    def _merge_snapshot(self, profile: CDPProfile, identifier_count: int) -> dict:
+        """Snapshot of a profile about to be merged away, for the merge record."""
+        return {
+            "id": str(profile.id),
+            "external_id": profile.external_id,
+            "lifecycle_stage": profile.lifecycle_stage,
+            "total_events": profile.total_events,
+            "total_sessions": profile.total_sessions,
+            "total_purchases": profile.total_purchases,
+            "total_revenue": float(profile.total_revenue),
+            "profile_data": profile.profile_data,
+            "computed_traits": profile.computed_traits,
+            "first_seen_at": (
+                profile.first_seen_at.isoformat() if profile.first_seen_at else None
+            ),
+            "last_seen_at": (
+                profile.last_seen_at.isoformat() if profile.last_seen_at else None
+            ),
+            "identifier_count": identifier_count,
+        }
+
+    def _absorb_profile(self, surviving: CDPProfile, merged: CDPProfile) -> None:
+        """Fold the merged profile's counters, dates, data and stage into survivor."""
+        surviving.total_events += merged.total_events
+        surviving.total_sessions += merged.total_sessions
+        surviving.total_purchases += merged.total_purchases
+        surviving.total_revenue += merged.total_revenue
+
+        # Update first_seen_at to earliest
+        if merged.first_seen_at and (
+            not surviving.first_seen_at
+            or merged.first_seen_at < surviving.first_seen_at
+        ):
+            surviving.first_seen_at = merged.first_seen_at
+
+        # Update last_seen_at to latest
+        if merged.last_seen_at and (
+            not surviving.last_seen_at or merged.last_seen_at > surviving.last_seen_at
+        ):
+            surviving.last_seen_at = merged.last_seen_at
+
+        # Merge profile_data (surviving takes precedence)
+        surviving.profile_data = {**merged.profile_data, **surviving.profile_data}
+
+        # Update lifecycle stage to most advanced
+        lifecycle_order = {
+            LifecycleStage.ANONYMOUS.value: 0,
+            LifecycleStage.KNOWN.value: 1,
+            LifecycleStage.CUSTOMER.value: 2,
+            LifecycleStage.CHURNED.value: 1,  # Churned is at known level
+        }
+        surviving_stage = lifecycle_order.get(surviving.lifecycle_stage, 0)
+        merged_stage = lifecycle_order.get(merged.lifecycle_stage, 0)
+        if merged_stage > surviving_stage:
+            surviving.lifecycle_stage = merged.lifecycle_stage
+
     async def resolve_and_merge(
         self,
         identifier_type: str,
@@ -610,44 +621,30 @@ class IdentityResolutionService:
         """
         Get all identifiers linked to a given identifier (graph traversal).
 
-        Uses BFS to traverse the identity graph up to max_depth.
+        Breadth-first up to max_depth, with one query per depth for the
+        whole frontier.
         """
         visited: set[UUID] = {identifier_id}
-        to_visit = [identifier_id]
+        frontier = {identifier_id}
         depth = 0
 
-        while to_visit and depth < max_depth:
-            current_batch = to_visit
-            to_visit = []
-
-            for current_id in current_batch:
-                # Find all linked identifiers
-                result = await self.db.execute(
-                    select(CDPIdentityLink)
-                    .where(
-                        CDPIdentityLink.tenant_id == self.tenant_id,
-                        CDPIdentityLink.is_active == True,
-                        or_(
-                            CDPIdentityLink.source_identifier_id == current_id,
-                            CDPIdentityLink.target_identifier_id == current_id,
-                        ),
-                    )
-                    .limit(1000)
+        while frontier and depth < max_depth:
+            result = await self.db.execute(
+                select(
+                    CDPIdentityLink.source_identifier_id,
+                    CDPIdentityLink.target_identifier_id,
+                ).where(
+                    CDPIdentityLink.tenant_id == self.tenant_id,
+                    CDPIdentityLink.is_active == True,
+                    or_(
+                        CDPIdentityLink.source_identifier_id.in_(frontier),
+                        CDPIdentityLink.target_identifier_id.in_(frontier),
+                    ),
                 )
-                links = result.scalars().all()
-
-                for link in links:
-                    # Get the "other" identifier in the link
-                    other_id = (
-                        link.target_identifier_id
-                        if link.source_identifier_id == current_id
-                        else link.source_identifier_id
-                    )
-
-                    if other_id not in visited:
-                        visited.add(other_id)
-                        to_visit.append(other_id)
-
+            )
+            reached = {node for pair in result.all() for node in pair}
+            frontier = reached - visited
+            visited |= frontier
             depth += 1
 
         # Fetch all visited identifiers
@@ -742,7 +739,7 @@ async def resolve_identity_on_event(
 
     Called after event ingestion to:
     1. Link identifiers that appeared together
-    2. Check for profile merges needed
+    2. Merge the profiles their identity-graph components span
     3. Update canonical identity
     """
     service = IdentityResolutionService(db, tenant_id)
@@ -754,21 +751,20 @@ async def resolve_identity_on_event(
         evidence={"event_id": str(event_id)} if event_id else {},
     )
 
-    # Check for potential merges
-    merge_result = None
-    for identifier in identifiers:
-        merge = await service.resolve_and_merge(
-            identifier.identifier_type,
-            identifier.identifier_hash,
-        )
-        if merge:
-            merge_result = merge
+    # Merge every profile connected to these identifiers in the graph
+    from app.services.cdp.identity_graph import IdentityGraphResolver
+
+    merges = await IdentityGraphResolver(service).resolve(i.id for i in identifiers)
+    merge_result = next(
+        (m for m in merges if m.merged_profile_id == profile.id),
+        merges[-1] if merges else None,
+    )
 
-    # Update canonical identity — use the surviving profile ID if a merge
-    # occurred, because the original profile may have been deleted during merge.
+    # Update canonical identity — use the surviving profile ID if this
+    # profile was merged away, because it has been deleted.
     canonical_profile_id = (
         merge_result.surviving_profile_id
-        if merge_result and merge_result.surviving_profile_id
+        if merge_result and merge_result.merged_profile_id == profile.id
         else profile.id
     )
     await service.update_canonical_identity(canonical_profile_id)
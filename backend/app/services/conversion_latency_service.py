@@ -15,14 +15,28 @@ Used for:
 - Diagnosing data freshness problems
 """
 
+import atexit
+import json
+import os
+import socket
 import statistics
 import threading
-from collections import defaultdict
+import time
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
+try:
+    import redis.asyncio as aioredis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+from app.core.config import settings
 from app.core.logging import get_logger
+from app.services.latency_sketch import LatencySketch, TieredSketchRing
 
 logger = get_logger(__name__)
 
@@ -89,16 +103,76 @@ class ConversionLatencyTracker:
         stats = tracker.get_stats("meta", "click_to_conversion")
     """
 
-    def __init__(self, max_pending_age_hours: int = 168):  # 7 days default
+    def __init__(
+        self,
+        max_pending_age_hours: int = 168,  # 7 days default
+        max_recent_measurements: int = 10000,
+        slot_minutes: int = 5,
+        retention_hours: int = 168,
+        fine_hours: int = 6,
+    ):
         self._pending: Dict[str, PendingConversion] = {}
-        self._measurements: List[LatencyMeasurement] = []
         self._lock = threading.RLock()
         self._max_pending_age = timedelta(hours=max_pending_age_hours)
+        self._slot_minutes = slot_minutes
+        self._retention_hours = retention_hours
+        self._fine_hours = fine_hours
+
+        # Bumped on every recorded measurement so publishers can skip
+        # unchanged state; ``on_record`` lets a publisher start lazily.
+        self._version = 0
+        self.on_record: Optional[Callable[[], None]] = None
+
+        # Most recent raw measurements (bounded), kept for slow-conversion
+        # drill-down and diagnostics only. Stats come from the sketches.
+        self._measurements: Deque[LatencyMeasurement] = deque(
+            maxlen=max_recent_measurements
+        )
 
-        # In-memory aggregated stats by platform and event type
-        self._stats_cache: Dict[str, Dict[str, List[float]]] = defaultdict(
-            lambda: defaultdict(list)
+        # Per (platform, event_type) rings of time-bucketed quantile sketches:
+        # fine slots for the last ``fine_hours``, hourly roll-ups beyond that
+        self._series: Dict[Tuple[str, str], TieredSketchRing] = {}
+
+    @property
+    def version(self) -> int:
+        """Number of measurements recorded so far (monotonic change marker)."""
+        return self._version
+
+    def _ring(self, platform: str, event_type: str) -> TieredSketchRing:
+        key = (platform, event_type)
+        ring = self._series.get(key)
+        if ring is None:
+            ring = TieredSketchRing(
+                slot_minutes=self._slot_minutes,
+                retention_hours=self._retention_hours,
+                fine_hours=self._fine_hours,
+            )
+            self._series[key] = ring
+        return ring
+
+    def _record(self, measurement: LatencyMeasurement) -> None:
+        self._measurements.append(measurement)
+        self._ring(measurement.platform, measurement.event_type).add(
+            measurement.latency_ms, measurement.end_time
         )
+        self._version += 1
+        if self.on_record is not None:
+            self.on_record()
+
+    def _merged_sketch(
+        self,
+        cutoff: datetime,
+        platform: Optional[str] = None,
+        event_type: Optional[str] = None,
+    ) -> LatencySketch:
+        merged = LatencySketch()
+        for (series_platform, series_type), ring in self._series.items():
+            if platform is not None and series_platform != platform:
+                continue
+            if event_type is not None and series_type != event_type:
+                continue
+            merged.merge(ring.merged_since(cutoff))
+        return merged
 
     def start_tracking(
         self,
@@ -192,18 +266,7 @@ class ConversionLatencyTracker:
                 metadata=combined_metadata,
             )
 
-            self._measurements.append(measurement)
-            self._stats_cache[platform][event_type].append(latency_ms)
-
-            # Keep only last 100k measurements in memory
-            if len(self._measurements) > 100000:
-                self._measurements = self._measurements[-100000:]
-
-            # Keep only last 10k latencies per platform/type for stats
-            if len(self._stats_cache[platform][event_type]) > 10000:
-                self._stats_cache[platform][event_type] = self._stats_cache[platform][
-                    event_type
-                ][-10000:]
+            self._record(measurement)
 
             return latency_ms
 
@@ -238,8 +301,7 @@ class ConversionLatencyTracker:
                 metadata=metadata or {},
             )
 
-            self._measurements.append(measurement)
-            self._stats_cache[platform][event_type].append(latency_ms)
+            self._record(measurement)
 
     def get_stats(
         self,
@@ -260,22 +322,9 @@ class ConversionLatencyTracker:
         """
         with self._lock:
             cutoff = datetime.now(timezone.utc) - timedelta(hours=period_hours)
-
-            # Filter measurements
-            measurements = [
-                m
-                for m in self._measurements
-                if m.end_time >= cutoff
-                and (platform is None or m.platform == platform)
-                and (event_type is None or m.event_type == event_type)
-            ]
-
-            if not measurements:
-                return LatencyStats()
-
-            latencies = [m.latency_ms for m in measurements]
-
-            return self._calculate_stats(latencies)
+            return self._stats_from_sketch(
+                self._merged_sketch(cutoff, platform, event_type)
+            )
 
     def get_stats_by_platform(
         self,
@@ -286,15 +335,15 @@ class ConversionLatencyTracker:
             cutoff = datetime.now(timezone.utc) - timedelta(hours=period_hours)
 
             # Group by platform
-            by_platform: Dict[str, List[float]] = defaultdict(list)
+            by_platform: Dict[str, LatencySketch] = defaultdict(LatencySketch)
 
-            for m in self._measurements:
-                if m.end_time >= cutoff:
-                    by_platform[m.platform].append(m.latency_ms)
+            for (platform, _), ring in self._series.items():
+                by_platform[platform].merge(ring.merged_since(cutoff))
 
             return {
-                platform: self._calculate_stats(latencies)
-                for platform, latencies in by_platform.items()
+                platform: self._stats_from_sketch(sketch)
+                for platform, sketch in by_platform.items()
+                if sketch.count
             }
 
     def get_stats_by_event_type(
@@ -306,53 +355,34 @@ class ConversionLatencyTracker:
         with self._lock:
             cutoff = datetime.now(timezone.utc) - timedelta(hours=period_hours)
 
-            by_type: Dict[str, List[float]] = defaultdict(list)
+            by_type: Dict[str, LatencySketch] = defaultdict(LatencySketch)
 
-            for m in self._measurements:
-                if m.end_time >= cutoff:
-                    if platform is None or m.platform == platform:
-                        by_type[m.event_type].append(m.latency_ms)
+            for (series_platform, event_type), ring in self._series.items():
+                if platform is None or series_platform == platform:
+                    by_type[event_type].merge(ring.merged_since(cutoff))
 
             return {
-                event_type: self._calculate_stats(latencies)
-                for event_type, latencies in by_type.items()
+                event_type: self._stats_from_sketch(sketch)
+                for event_type, sketch in by_type.items()
+                if sketch.count
             }
 
-    def _calculate_stats(self, latencies: List[float]) -> LatencyStats:
-        """Calculate statistics from a list of latencies."""
-        if not latencies:
+    def _stats_from_sketch(self, sketch: LatencySketch) -> LatencyStats:
+        """Read statistics off a merged sketch without touching raw values."""
+        if sketch.count == 0:
             return LatencyStats()
 
-        sorted_latencies = sorted(latencies)
-        n = len(sorted_latencies)
-
         return LatencyStats(
-            count=n,
-            min_ms=round(sorted_latencies[0], 2),
-            max_ms=round(sorted_latencies[-1], 2),
-            avg_ms=round(statistics.mean(latencies), 2),
-            median_ms=round(statistics.median(latencies), 2),
-            p75_ms=(
-                round(sorted_latencies[int(n * 0.75)], 2)
-                if n > 1
-                else sorted_latencies[0]
-            ),
-            p90_ms=(
-                round(sorted_latencies[int(n * 0.90)], 2)
-                if n > 1
-                else sorted_latencies[0]
-            ),
-            p95_ms=(
-                round(sorted_latencies[int(n * 0.95)], 2)
-                if n > 1
-                else sorted_latencies[0]
-            ),
-            p99_ms=(
-                round(sorted_latencies[int(n * 0.99)], 2)
-                if n > 1
-                else sorted_latencies[0]
-            ),
-            std_dev_ms=round(statistics.stdev(latencies), 2) if n > 1 else 0.0,
+            count=sketch.count,
+            min_ms=round(sketch.min, 2),
+            max_ms=round(sketch.max, 2),
+            avg_ms=round(sketch.mean, 2),
+            median_ms=round(sketch.median(), 2),
+            p75_ms=round(sketch.quantile(0.75), 2),
+            p90_ms=round(sketch.quantile(0.90), 2),
+            p95_ms=round(sketch.quantile(0.95), 2),
+            p99_ms=round(sketch.quantile(0.99), 2),
+            std_dev_ms=round(sketch.std_dev, 2),
         )
 
     def get_latency_timeline(
@@ -365,50 +395,39 @@ class ConversionLatencyTracker:
         """
         Get latency over time for charting.
 
-        Returns a list of time buckets with average latency.
+        Returns a list of time buckets with average latency. Buckets are
+        built from the tracker's ring slots, so ``bucket_minutes`` finer
+        than the slot width collapses to one bucket per slot (hourly for
+        data older than the fine window).
         """
         with self._lock:
-            cutoff = datetime.now(timezone.utc) - timedelta(hours=period_hours)
-            bucket_size = timedelta(minutes=bucket_minutes)
-
-            # Filter measurements
-            measurements = [
-                m
-                for m in self._measurements
-                if m.end_time >= cutoff
-                and m.platform == platform
-                and m.event_type == event_type
-            ]
-
-            if not measurements:
+            ring = self._series.get((platform, event_type))
+            if ring is None:
                 return []
 
-            # Group by time bucket
-            buckets: Dict[datetime, List[float]] = defaultdict(list)
+            cutoff = datetime.now(timezone.utc) - timedelta(hours=period_hours)
+            bucket_seconds = max(bucket_minutes, ring.slot_minutes) * 60
+
+            # Group slots by time bucket
+            buckets: Dict[datetime, LatencySketch] = defaultdict(LatencySketch)
 
-            for m in measurements:
-                # Round to bucket
-                bucket_time = m.end_time.replace(
-                    minute=(m.end_time.minute // bucket_minutes) * bucket_minutes,
-                    second=0,
-                    microsecond=0,
+            for slot_start, sketch in ring.sketches_since(cutoff):
+                slot_ts = slot_start.timestamp()
+                bucket_time = datetime.fromtimestamp(
+                    slot_ts - slot_ts % bucket_seconds, tz=timezone.utc
                 )
-                buckets[bucket_time].append(m.latency_ms)
+                buckets[bucket_time].merge(sketch)
 
             # Create timeline
             timeline = []
             for bucket_time in sorted(buckets.keys()):
-                latencies = buckets[bucket_time]
+                sketch = buckets[bucket_time]
                 timeline.append(
                     {
                         "timestamp": bucket_time.isoformat(),
-                        "count": len(latencies),
-                        "avg_ms": round(statistics.mean(latencies), 2),
-                        "p95_ms": (
-                            round(sorted(latencies)[int(len(latencies) * 0.95)], 2)
-                            if len(latencies) > 1
-                            else latencies[0]
-                        ),
+                        "count": sketch.count,
+                        "avg_ms": round(sketch.mean, 2),
+                        "p95_ms": round(sketch.quantile(0.95), 2),
                     }
                 )
 
@@ -476,19 +495,26 @@ class ConversionLatencyTracker:
     def get_diagnostics(self) -> Dict[str, Any]:
         """Get diagnostics about the tracker state."""
         with self._lock:
+            live = [key for key, ring in self._series.items() if ring.total_count()]
+            starts = [
+                slot_start
+                for ring in self._series.values()
+                for slot_start, _ in ring.sketches_since(
+                    datetime.now(timezone.utc) - timedelta(hours=ring.retention_hours)
+                )
+            ]
+            oldest = min(starts) if starts else None
             return {
-                "total_measurements": len(self._measurements),
+                "total_measurements": sum(
+                    ring.total_count() for ring in self._series.values()
+                ),
+                "recent_measurements_held": len(self._measurements),
+                "series_tracked": len(live),
                 "pending_conversions": len(self._pending),
                 "pending_by_platform": self.get_pending_count(),
-                "platforms_tracked": list(set(m.platform for m in self._measurements)),
-                "event_types_tracked": list(
-                    set(m.event_type for m in self._measurements)
-                ),
-                "oldest_measurement": (
-                    self._measurements[0].end_time.isoformat()
-                    if self._measurements
-                    else None
-                ),
+                "platforms_tracked": sorted({platform for platform, _ in live}),
+                "event_types_tracked": sorted({event_type for _, event_type in live}),
+                "oldest_measurement": oldest.isoformat() if oldest else None,
                 "newest_measurement": (
                     self._measurements[-1].end_time.isoformat()
                     if self._measurements
@@ -496,9 +522,234 @@ class ConversionLatencyTracker:
                 ),
             }
 
+    # -------------------------------------------------------------------------
+    # Cross-worker state
+    # -------------------------------------------------------------------------
+
+    def export_state(self) -> Dict[str, Any]:
+        """Serialize every series' sketch ring to a JSON-safe dict."""
+        with self._lock:
+            return {
+                f"{platform}:{event_type}": ring.to_dict()
+                for (platform, event_type), ring in self._series.items()
+                if ring.total_count()
+            }
+
+    def merge_state(self, state: Dict[str, Any]) -> None:
+        """Merge state produced by ``export_state`` (e.g. from another worker)."""
+        with self._lock:
+            for series_key, ring_data in state.items():
+                platform, _, event_type = series_key.partition(":")
+                other = TieredSketchRing.from_dict(ring_data)
+                self._ring(platform, event_type).merge(other)
+
+    def merge_tracker(self, other: "ConversionLatencyTracker") -> None:
+        """Merge another in-process tracker's sketches without serializing."""
+        with other._lock, self._lock:
+            for (platform, event_type), ring in other._series.items():
+                self._ring(platform, event_type).merge(ring)
+
+
+class LatencySketchStore:
+    """
+    Redis-backed aggregation of latency sketches across workers.
+
+    Each process that records measurements publishes its tracker state
+    under its own key from a background thread (every
+    ``publish_interval_seconds``, only when the state changed; unchanged
+    state just has its TTL refreshed). Keys carry a TTL so dead workers
+    age out. Readers never publish: they merge every other live worker's
+    state with the caller's local tracker in memory, and reuse the merged
+    result for ``cache_seconds``. Falls back to the local tracker only if
+    Redis is unavailable.
+    """
+
+    KEY_PREFIX = "stratum:latency:sketch:"
+    INDEX_KEY = "stratum:latency:workers"
+    DEFAULT_TTL_SECONDS = 3600
+    DEFAULT_CACHE_SECONDS = 10.0
 
-# Singleton instance
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        worker_id: Optional[str] = None,
+        publish_interval_seconds: Optional[float] = None,
+        cache_seconds: float = DEFAULT_CACHE_SECONDS,
+    ):
+        self._redis_url = redis_url or settings.redis_url
+        self._ttl_seconds = ttl_seconds
+        self._worker_id = worker_id
+        self._publish_interval = (
+            settings.latency_sketch_publish_seconds
+            if publish_interval_seconds is None
+            else publish_interval_seconds
+        )
+        self._cache_seconds = cache_seconds
+        self._redis: Optional[Any] = None
+        self._sync_redis: Optional[Any] = None
+        self._publisher_pid: Optional[int] = None
+        self._published_version: Optional[int] = None
+        self._publisher_lock = threading.Lock()
+        self._merged: Optional[Tuple[float, ConversionLatencyTracker]] = None
+
+    @property
+    def worker_id(self) -> str:
+        """Per-process key; resolved lazily so forked children get their own."""
+        return self._worker_id or f"{socket.gethostname()}:{os.getpid()}"
+
+    async def _client(self) -> Optional[Any]:
+        if not REDIS_AVAILABLE:
+            return None
+        if self._redis is None:
+            try:
+                self._redis = aioredis.from_url(
+                    self._redis_url, encoding="utf-8", decode_responses=True
+                )
+            except Exception as e:
+                logger.warning(f"Latency sketch store unavailable: {e}")
+                return None
+        return self._redis
+
+    def _sync_client(self) -> Optional[Any]:
+        if not REDIS_AVAILABLE:
+            return None
+        if self._sync_redis is None:
+            import redis
+
+            self._sync_redis = redis.from_url(self._redis_url, decode_responses=True)
+        return self._sync_redis
+
+    # -------------------------------------------------------------------------
+    # Publishing (every recording process)
+    # -------------------------------------------------------------------------
+
+    async def publish(self, tracker: ConversionLatencyTracker) -> bool:
+        """Publish this worker's tracker state now. Returns False on failure."""
+        client = await self._client()
+        if client is None:
+            return False
+        try:
+            key = f"{self.KEY_PREFIX}{self.worker_id}"
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.set(key, json.dumps(tracker.export_state()), ex=self._ttl_seconds)
+                pipe.sadd(self.INDEX_KEY, self.worker_id)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to publish latency sketches: {e}")
+            return False
+
+    def publish_if_changed(self, tracker: ConversionLatencyTracker) -> bool:
+        """
+        Publish ``tracker`` synchronously if it changed since the last publish.
+
+        Unchanged state only has its key TTL refreshed, so an idle but
+        live worker does not age out. Returns False on failure.
+        """
+        client = self._sync_client()
+        if client is None:
+            return False
+        key = f"{self.KEY_PREFIX}{self.worker_id}"
+        version = tracker.version
+        try:
+            pipe = client.pipeline(transaction=False)
+            if version == self._published_version:
+                pipe.expire(key, self._ttl_seconds)
+            else:
+                pipe.set(key, json.dumps(tracker.export_state()), ex=self._ttl_seconds)
+            pipe.sadd(self.INDEX_KEY, self.worker_id)
+            pipe.execute()
+        except Exception as e:
+            logger.debug(f"Failed to publish latency sketches: {e}")
+            return False
+        self._published_version = version
+        return True
+
+    def attach(self, tracker: ConversionLatencyTracker) -> None:
+        """Start publishing ``tracker`` from the first process that records."""
+        if self._publish_interval > 0:
+            tracker.on_record = lambda: self.ensure_publisher(tracker)
+
+    def ensure_publisher(self, tracker: ConversionLatencyTracker) -> None:
+        """Start this process's publisher thread if it is not running yet."""
+        pid = os.getpid()
+        if self._publisher_pid == pid:
+            return
+        with self._publisher_lock:
+            if self._publisher_pid == pid:
+                return
+            # A forked child inherits the parent's fields but not its thread
+            # or sockets: reset both and publish under the child's own key.
+            self._publisher_pid = pid
+            self._published_version = None
+            self._sync_redis = None
+            thread = threading.Thread(
+                target=self._publish_loop,
+                args=(tracker, pid),
+                name="latency-sketch-publisher",
+                daemon=True,
+            )
+            thread.start()
+            atexit.register(self.publish_if_changed, tracker)
+
+    def _publish_loop(self, tracker: ConversionLatencyTracker, pid: int) -> None:
+        while self._publisher_pid == pid:
+            time.sleep(self._publish_interval)
+            self.publish_if_changed(tracker)
+
+    # -------------------------------------------------------------------------
+    # Reading (API side)
+    # -------------------------------------------------------------------------
+
+    async def merged_tracker(
+        self, local: Optional[ConversionLatencyTracker] = None
+    ) -> ConversionLatencyTracker:
+        """
+        Build a tracker holding the merged state of all live workers.
+
+        ``local`` is merged in memory (its published key is skipped) so the
+        caller's own latest measurements are included without serializing
+        them. The result is cached for ``cache_seconds``; if Redis is
+        unreachable, ``local`` is returned as-is.
+        """
+        if self._merged is not None:
+            built_at, cached = self._merged
+            if time.monotonic() - built_at < self._cache_seconds:
+                return cached
+
+        client = await self._client()
+        if client is None:
+            return local or ConversionLatencyTracker()
+
+        merged = ConversionLatencyTracker()
+        try:
+            worker_ids = sorted(await client.smembers(self.INDEX_KEY))
+            others = [w for w in worker_ids if local is None or w != self.worker_id]
+            raws = (
+                await client.mget([f"{self.KEY_PREFIX}{w}" for w in others])
+                if others
+                else []
+            )
+            for worker_id, raw in zip(others, raws):
+                if raw is None:
+                    # Worker key expired; drop it from the index
+                    await client.srem(self.INDEX_KEY, worker_id)
+                    continue
+                merged.merge_state(json.loads(raw))
+        except Exception as e:
+            logger.warning(f"Failed to merge latency sketches: {e}")
+            return local or merged
+        if local is not None:
+            merged.merge_tracker(local)
+        self._merged = (time.monotonic(), merged)
+        return merged
+
+
+# Singleton instances
 latency_tracker = ConversionLatencyTracker()
+latency_sketch_store = LatencySketchStore()
+latency_sketch_store.attach(latency_tracker)
 
 
 # =============================================================================
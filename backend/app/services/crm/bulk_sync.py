@@ -0,0 +1,217 @@
+# =============================================================================
+# Stratum AI - CRM Bulk Sync Writer
+# =============================================================================
+"""
+Page-at-a-time writes for CRM syncs.
+
+The CRM sync services fetch records a page at a time (100 from HubSpot,
+200 from Zoho). Each page is parsed into rows first, then written here
+with a fixed number of statements, whatever the page size:
+
+- Contacts and deals: one SELECT of the keys that already exist (for the
+  created/updated counts) and one ``INSERT ... ON CONFLICT DO UPDATE`` on
+  the unique (connection_id, CRM id) index.
+- Deal-contact associations: one UPDATE joining crm_deals to crm_contacts.
+
+An update never blanks a column: a field the CRM did not send (None) keeps
+its stored value, as the per-record setattr loop did before.
+"""
+
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID, uuid4
+
+from sqlalchemy import case, func, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.models.cdp import CDPProfile, CDPProfileIdentifier, IdentifierType
+from app.models.crm import CRMContact, CRMDeal
+
+logger = get_logger(__name__)
+
+# utm_source values copied onto a deal as its attributed platform
+UTM_SOURCE_PLATFORMS = {
+    "facebook": "meta",
+    "fb": "meta",
+    "meta": "meta",
+    "google": "google",
+    "tiktok": "tiktok",
+    "snapchat": "snapchat",
+}
+
+
+def _insert_for(dialect_name: str):
+    """Dialect ``insert`` that supports ON CONFLICT (PostgreSQL, SQLite)."""
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert
+
+
+class CRMBulkWriter:
+    """
+    Writes parsed CRM contact and deal rows for one connection.
+
+    Rows are dicts of model columns plus the CRM id (``crm_contact_id`` or
+    ``crm_deal_id``); tenant, connection, primary key and timestamps are
+    filled in here.
+
+    Usage:
+        writer = CRMBulkWriter(db, tenant_id, connection.id)
+        created, updated = await writer.upsert_contacts(rows)
+    """
+
+    def __init__(self, db: AsyncSession, tenant_id: int, connection_id: UUID):
+        self.db = db
+        self.tenant_id = tenant_id
+        self.connection_id = connection_id
+
+    async def upsert_contacts(self, rows: list[dict[str, Any]]) -> tuple[int, int]:
+        """Insert or update a page of contacts. Returns (created, updated)."""
+        return await self._upsert(CRMContact, "crm_contact_id", rows)
+
+    async def upsert_deals(self, rows: list[dict[str, Any]]) -> tuple[int, int]:
+        """Insert or update a page of deals. Returns (created, updated)."""
+        return await self._upsert(CRMDeal, "crm_deal_id", rows)
+
+    async def link_deals_to_contacts(self, links: dict[str, str]) -> int:
+        """
+        Point deals at their contacts in one joined UPDATE.
+
+        Args:
+            links: CRM deal id -> CRM contact id
+
+        Deals also take the contact's last-touch campaign and its utm_source
+        (mapped to a platform) when the contact has them. Links to contacts
+        not synced yet are skipped.
+
+        Returns:
+            Number of deals linked
+        """
+        if not links:
+            return 0
+
+        contact_key = case(
+            {deal_id: contact_id for deal_id, contact_id in links.items()},
+            value=CRMDeal.crm_deal_id,
+        )
+        utm_source = func.lower(CRMContact.utm_source)
+        platform = case(
+            *(
+                (utm_source == source, literal(name))
+                for source, name in UTM_SOURCE_PLATFORMS.items()
+            ),
+            else_=CRMContact.utm_source,
+        )
+        result = await self.db.execute(
+            update(CRMDeal)
+            .where(
+                CRMDeal.connection_id == self.connection_id,
+                CRMDeal.crm_deal_id.in_(list(links)),
+                CRMContact.connection_id == self.connection_id,
+                CRMContact.crm_contact_id == contact_key,
+            )
+            .values(
+                contact_id=CRMContact.id,
+                attributed_campaign_id=case(
+                    (
+                        func.coalesce(CRMContact.last_touch_campaign_id, "") != "",
+                        CRMContact.last_touch_campaign_id,
+                    ),
+                    else_=CRMDeal.attributed_campaign_id,
+                ),
+                attributed_platform=case(
+                    (func.coalesce(CRMContact.utm_source, "") != "", platform),
+                    else_=CRMDeal.attributed_platform,
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def _upsert(
+        self, model: Any, key: str, rows: list[dict[str, Any]]
+    ) -> tuple[int, int]:
+        # A record listed twice in one page would hit its own row twice in
+        # one statement, which Postgres rejects; the later copy wins.
+        by_key = {row[key]: row for row in rows}
+        if not by_key:
+            return 0, 0
+
+        key_column = getattr(model, key)
+        existing = set(
+            (
+                await self.db.execute(
+                    select(key_column).where(
+                        model.connection_id == self.connection_id,
+                        key_column.in_(list(by_key)),
+                    )
+                )
+            ).scalars()
+        )
+
+        now = datetime.now(UTC)
+        fields = sorted({column for row in by_key.values() for column in row} - {key})
+        values = [
+            {
+                **dict.fromkeys(fields),
+                **row,
+                "id": uuid4(),
+                "tenant_id": self.tenant_id,
+                "connection_id": self.connection_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for row in by_key.values()
+        ]
+
+        insert = _insert_for(self.db.get_bind().dialect.name)
+        statement = insert(model).values(values)
+        statement = statement.on_conflict_do_update(
+            index_elements=["connection_id", key],
+            set_={
+                **{
+                    column: func.coalesce(
+                        getattr(statement.excluded, column), getattr(model, column)
+                    )
+                    for column in fields
+                },
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+        await self.db.execute(statement)
+
+        updated = len(existing)
+        return len(by_key) - updated, updated
+
+
+async def profiles_by_external_id(
+    db: AsyncSession, tenant_id: int, external_ids: Iterable[str]
+) -> dict[str, CDPProfile]:
+    """
+    CDP profiles holding the given external-id identifiers, in one query.
+
+    The Salesforce and Pipedrive syncs write into CDP profiles rather than
+    crm_contacts, and find a record's profile by an external id such as
+    ``pipedrive:42``.
+
+    Returns:
+        External id -> profile, for the ids that resolve
+    """
+    external_ids = list(dict.fromkeys(external_ids))
+    if not external_ids:
+        return {}
+
+    result = await db.execute(
+        select(CDPProfileIdentifier.identifier_hash, CDPProfile)
+        .join(CDPProfile, CDPProfile.id == CDPProfileIdentifier.profile_id)
+        .where(
+            CDPProfileIdentifier.tenant_id == tenant_id,
+            CDPProfileIdentifier.identifier_type == IdentifierType.EXTERNAL_ID.value,
+            CDPProfileIdentifier.identifier_hash.in_(external_ids),
+        )
+    )
+    return {external_id: profile for external_id, profile in result.all()}
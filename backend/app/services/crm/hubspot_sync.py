@@ -17,13 +17,13 @@ from app.core.logging import get_logger
 from app.models.crm import (
     CRMConnection,
     CRMConnectionStatus,
-    CRMContact,
     CRMDeal,
     CRMProvider,
     DailyPipelineMetrics,
     DealStage,
     Touchpoint,
 )
+from app.services.crm.bulk_sync import CRMBulkWriter
 from app.services.crm.hubspot_client import HubSpotClient, hash_email, hash_phone
 from app.services.crm.identity_matching import IdentityMatcher
 
@@ -187,6 +187,7 @@ class HubSpotSyncService:
             "createdate",
             "lastmodifieddate",
         ]
+        writer = CRMBulkWriter(self.db, self.tenant_id, connection.id)
 
         async with self.client:
             while True:
@@ -200,22 +201,21 @@ class HubSpotSyncService:
                 if not response or "results" not in response:
                     break
 
+                rows = []
                 for contact_data in response["results"]:
                     try:
-                        created, updated = await self._upsert_contact(
-                            connection.id,
-                            contact_data,
-                        )
-                        results["synced"] += 1
-                        if created:
-                            results["created"] += 1
-                        elif updated:
-                            results["updated"] += 1
+                        rows.append(self._contact_row(contact_data))
                     except (ValueError, TypeError, KeyError) as e:
                         results["errors"].append(
                             f"Contact {contact_data.get('id')}: {str(e)}"
                         )
 
+                # Write the page in one upsert
+                created, updated = await writer.upsert_contacts(rows)
+                results["synced"] += created + updated
+                results["created"] += created
+                results["updated"] += updated
+
                 # Check for more pages
                 paging = response.get("paging", {})
                 next_page = paging.get("next", {})
@@ -236,25 +236,22 @@ class HubSpotSyncService:
         contact_data: Dict[str, Any],
     ) -> Tuple[bool, bool]:
         """
-        Insert or update a contact.
+        Insert or update a single contact (webhook path).
 
         Returns:
             Tuple of (created, updated) booleans
         """
+        writer = CRMBulkWriter(self.db, self.tenant_id, connection_id)
+        created, updated = await writer.upsert_contacts(
+            [self._contact_row(contact_data)]
+        )
+        return created == 1, updated == 1
+
+    def _contact_row(self, contact_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse a HubSpot contact into a crm_contacts row for CRMBulkWriter."""
         crm_contact_id = str(contact_data["id"])
         properties = contact_data.get("properties", {})
 
-        # Check if contact exists
-        result = await self.db.execute(
-            select(CRMContact).where(
-                and_(
-                    CRMContact.connection_id == connection_id,
-                    CRMContact.crm_contact_id == crm_contact_id,
-                )
-            )
-        )
-        existing = result.scalar_one_or_none()
-
         # Extract and hash identity fields
         email = properties.get("email", "")
         phone = properties.get("phone") or properties.get("mobilephone") or ""
@@ -280,7 +277,8 @@ class HubSpotSyncService:
             except (ValueError, TypeError):
                 pass
 
-        contact_fields = {
+        return {
+            "crm_contact_id": crm_contact_id,
             "crm_owner_id": properties.get("hubspot_owner_id"),
             "email_hash": email_hashed,
             "phone_hash": phone_hashed,
@@ -298,24 +296,6 @@ class HubSpotSyncService:
             "crm_updated_at": crm_updated,
         }
 
-        if existing:
-            # Update existing contact
-            for key, value in contact_fields.items():
-                if value is not None:
-                    setattr(existing, key, value)
-            existing.updated_at = datetime.now(timezone.utc)
-            return False, True
-        else:
-            # Create new contact
-            contact = CRMContact(
-                tenant_id=self.tenant_id,
-                connection_id=connection_id,
-                crm_contact_id=crm_contact_id,
-                **contact_fields,
-            )
-            self.db.add(contact)
-            return True, False
-
     async def _sync_deals(
         self,
         connection: CRMConnection,
@@ -338,6 +318,7 @@ class HubSpotSyncService:
             "createdate",
             "hs_lastmodifieddate",
         ]
+        writer = CRMBulkWriter(self.db, self.tenant_id, connection.id)
 
         async with self.client:
             while True:
@@ -351,22 +332,21 @@ class HubSpotSyncService:
                 if not response or "results" not in response:
                     break
 
+                rows = []
                 for deal_data in response["results"]:
                     try:
-                        created, updated = await self._upsert_deal(
-                            connection.id,
-                            deal_data,
-                        )
-                        results["synced"] += 1
-                        if created:
-                            results["created"] += 1
-                        elif updated:
-                            results["updated"] += 1
+                        rows.append(self._deal_row(deal_data))
                     except (ValueError, TypeError, KeyError) as e:
                         results["errors"].append(
                             f"Deal {deal_data.get('id')}: {str(e)}"
                         )
 
+                # Write the page in one upsert
+                created, updated = await writer.upsert_deals(rows)
+                results["synced"] += created + updated
+                results["created"] += created
+                results["updated"] += updated
+
                 # Check for more pages
                 paging = response.get("paging", {})
                 next_page = paging.get("next", {})
@@ -391,25 +371,20 @@ class HubSpotSyncService:
         deal_data: Dict[str, Any],
     ) -> Tuple[bool, bool]:
         """
-        Insert or update a deal.
+        Insert or update a single deal (webhook path).
 
         Returns:
             Tuple of (created, updated) booleans
         """
+        writer = CRMBulkWriter(self.db, self.tenant_id, connection_id)
+        created, updated = await writer.upsert_deals([self._deal_row(deal_data)])
+        return created == 1, updated == 1
+
+    def _deal_row(self, deal_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse a HubSpot deal into a crm_deals row for CRMBulkWriter."""
         crm_deal_id = str(deal_data["id"])
         properties = deal_data.get("properties", {})
 
-        # Check if deal exists
-        result = await self.db.execute(
-            select(CRMDeal).where(
-                and_(
-                    CRMDeal.connection_id == connection_id,
-                    CRMDeal.crm_deal_id == crm_deal_id,
-                )
-            )
-        )
-        existing = result.scalar_one_or_none()
-
         # Parse amount
         amount = None
         amount_cents = None
@@ -459,6 +434,7 @@ class HubSpotSyncService:
                 pass
 
         deal_fields = {
+            "crm_deal_id": crm_deal_id,
             "crm_pipeline_id": properties.get("pipeline"),
             "crm_owner_id": properties.get("hubspot_owner_id"),
             "deal_name": properties.get("dealname"),
@@ -482,91 +458,44 @@ class HubSpotSyncService:
                 tzinfo=timezone.utc,
             )
 
-        if existing:
-            # Update existing deal
-            for key, value in deal_fields.items():
-                if value is not None:
-                    setattr(existing, key, value)
-            existing.updated_at = datetime.now(timezone.utc)
-            return False, True
-        else:
-            # Create new deal
-            deal = CRMDeal(
-                tenant_id=self.tenant_id,
-                connection_id=connection_id,
-                crm_deal_id=crm_deal_id,
-                **deal_fields,
-            )
-            self.db.add(deal)
-            return True, False
+        return deal_fields
 
     async def _associate_deals_with_contacts(self, connection_id: UUID) -> None:
         """Associate deals with their contacts via HubSpot associations API."""
         # Get all deals without contacts
         result = await self.db.execute(
-            select(CRMDeal).where(
+            select(CRMDeal.crm_deal_id).where(
                 and_(
                     CRMDeal.connection_id == connection_id,
                     CRMDeal.contact_id.is_(None),
                 )
             )
         )
-        deals_without_contacts = result.scalars().all()
+        deal_ids = result.scalars().all()
 
+        # Collect each deal's first associated contact, then link them all
+        # in one joined UPDATE
+        links = {}
         async with self.client:
-            for deal in deals_without_contacts:
+            for deal_id in deal_ids:
                 try:
-                    # Get deal associations
                     associations = await self.client.get_deal_associations(
-                        deal.crm_deal_id,
+                        deal_id,
                         "contacts",
                     )
 
                     if associations and associations.get("results"):
-                        # Get first associated contact
-                        contact_id = str(associations["results"][0].get("id"))
-
-                        # Find contact in our database
-                        contact_result = await self.db.execute(
-                            select(CRMContact).where(
-                                and_(
-                                    CRMContact.connection_id == connection_id,
-                                    CRMContact.crm_contact_id == contact_id,
-                                )
-                            )
-                        )
-                        contact = contact_result.scalar_one_or_none()
-
-                        if contact:
-                            deal.contact_id = contact.id
-
-                            # Copy attribution from contact if available
-                            if contact.last_touch_campaign_id:
-                                deal.attributed_campaign_id = (
-                                    contact.last_touch_campaign_id
-                                )
-                            if contact.utm_source:
-                                # Map utm_source to platform
-                                platform_map = {
-                                    "facebook": "meta",
-                                    "fb": "meta",
-                                    "meta": "meta",
-                                    "google": "google",
-                                    "tiktok": "tiktok",
-                                    "snapchat": "snapchat",
-                                }
-                                deal.attributed_platform = platform_map.get(
-                                    contact.utm_source.lower(),
-                                    contact.utm_source,
-                                )
+                        links[deal_id] = str(associations["results"][0].get("id"))
 
                 except (ValueError, TypeError, KeyError) as e:
                     logger.warning(
                         "deal_association_failed",
-                        deal_id=deal.crm_deal_id,
+                        deal_id=deal_id,
                         error=str(e),
                     )
 
+        writer = CRMBulkWriter(self.db, self.tenant_id, connection_id)
+        await writer.link_deals_to_contacts(links)
         await self.db.commit()
 
     async def process_webhook(
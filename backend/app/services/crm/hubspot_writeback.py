@@ -26,9 +26,17 @@ from app.models.crm import (
     CRMConnectionStatus,
     CRMContact,
     CRMDeal,
+    CRMProvider,
     Touchpoint,
 )
 from app.services.crm.hubspot_client import HubSpotClient
+from app.services.crm.writeback_scheduler import (
+    CONTACT,
+    DEAL,
+    HubSpotTarget,
+    WritebackScheduler,
+    request_budget,
+)
 
 logger = get_logger(__name__)
 
@@ -344,7 +352,7 @@ class HubSpotWritebackService:
         # Build query for contacts to sync
         conditions = [
             CRMContact.tenant_id == self.tenant_id,
-            CRMContact.provider_contact_id.isnot(None),
+            CRMContact.connection_id.in_(self._connection_ids()),
         ]
 
         if contact_id:
@@ -366,72 +374,62 @@ class HubSpotWritebackService:
                 "failed": 0,
             }
 
-        # Build update payloads
-        updates = []
-        for contact in contacts:
-            # Get attribution data
-            attribution = await self._get_contact_attribution(contact.id)
-
-            if attribution:
-                properties = {
-                    "stratum_ad_platform": attribution.get("platform"),
-                    "stratum_campaign_id": attribution.get("campaign_id"),
-                    "stratum_campaign_name": attribution.get("campaign_name"),
-                    "stratum_adset_id": attribution.get("adset_id"),
-                    "stratum_ad_id": attribution.get("ad_id"),
-                    "stratum_first_touch_source": attribution.get("first_touch_source"),
-                    "stratum_last_touch_source": attribution.get("last_touch_source"),
-                    "stratum_attribution_confidence": attribution.get("confidence"),
-                    "stratum_total_ad_spend": attribution.get("total_spend"),
-                    "stratum_touchpoints_count": attribution.get("touchpoints_count"),
-                    "stratum_last_sync": datetime.now(timezone.utc).strftime(
-                        "%Y-%m-%d"
-                    ),
-                }
-
-                # Remove None values
-                properties = {k: v for k, v in properties.items() if v is not None}
-
-                updates.append(
-                    {
-                        "id": contact.provider_contact_id,
-                        "properties": properties,
-                    }
-                )
-
-        if not updates:
-            return {
-                "status": "success",
-                "message": "No attribution data to sync",
-                "synced": 0,
-                "failed": 0,
-            }
-
-        # Batch update in HubSpot
         async with HubSpotClient(self.db, self.tenant_id) as client:
-            response = await client.batch_update_contacts(updates)
+            scheduler = self._scheduler(client)
+
+            for contact in contacts:
+                # Get attribution data
+                attribution = await self._get_contact_attribution(contact.id)
+
+                if attribution:
+                    scheduler.enqueue(
+                        CONTACT,
+                        contact.crm_contact_id,
+                        {
+                            "stratum_ad_platform": attribution.get("platform"),
+                            "stratum_campaign_id": attribution.get("campaign_id"),
+                            "stratum_campaign_name": attribution.get("campaign_name"),
+                            "stratum_adset_id": attribution.get("adset_id"),
+                            "stratum_ad_id": attribution.get("ad_id"),
+                            "stratum_first_touch_source": attribution.get(
+                                "first_touch_source"
+                            ),
+                            "stratum_last_touch_source": attribution.get(
+                                "last_touch_source"
+                            ),
+                            "stratum_attribution_confidence": attribution.get(
+                                "confidence"
+                            ),
+                            "stratum_total_ad_spend": attribution.get("total_spend"),
+                            "stratum_touchpoints_count": attribution.get(
+                                "touchpoints_count"
+                            ),
+                        },
+                        record=contact,
+                    )
+
+            if not scheduler.pending:
+                return {
+                    "status": "success",
+                    "message": "No attribution data to sync",
+                    "synced": 0,
+                    "failed": 0,
+                }
 
-        synced = len(response.get("results", [])) if response else 0
-        failed = len(response.get("errors", [])) if response else len(updates)
+            # Changed contacts only, in batches of 100
+            flushed = await scheduler.flush()
 
-        # Update local sync timestamps
-        for contact in contacts:
-            contact.last_synced_at = datetime.now(timezone.utc)
         await self.db.commit()
 
         logger.info(
             "hubspot_contact_writeback_complete",
             tenant_id=self.tenant_id,
-            synced=synced,
-            failed=failed,
+            synced=flushed.synced,
+            failed=flushed.failed,
+            unchanged=flushed.unchanged,
         )
 
-        return {
-            "status": "completed" if failed == 0 else "partial",
-            "synced": synced,
-            "failed": failed,
-            "errors": response.get("errors", []) if response else [],
-        }
+        return flushed.to_dict()
 
     async def sync_deal_attribution(
         self,
@@ -453,7 +451,7 @@ class HubSpotWritebackService:
         # Build query for deals to sync
         conditions = [
             CRMDeal.tenant_id == self.tenant_id,
-            CRMDeal.provider_deal_id.isnot(None),
+            CRMDeal.connection_id.in_(self._connection_ids()),
         ]
 
         if deal_id:
@@ -475,71 +473,70 @@ class HubSpotWritebackService:
                 "failed": 0,
             }
 
-        # Build update payloads
-        updates = []
-        for deal in deals:
-            # Get attribution data
-            attribution = await self._get_deal_attribution(deal.id)
-
-            properties = {
-                "stratum_attributed_platform": attribution.get("platform"),
-                "stratum_attributed_campaign": attribution.get("campaign_name"),
-                "stratum_attributed_campaign_id": attribution.get("campaign_id"),
-                "stratum_attribution_model": attribution.get("attribution_model"),
-                "stratum_attributed_spend": attribution.get("attributed_spend"),
-                "stratum_revenue_roas": attribution.get("revenue_roas"),
-                "stratum_profit_roas": attribution.get("profit_roas"),
-                "stratum_cogs": attribution.get("cogs"),
-                "stratum_gross_profit": attribution.get("gross_profit"),
-                "stratum_net_profit": attribution.get("net_profit"),
-                "stratum_days_to_close": attribution.get("days_to_close"),
-                "stratum_touchpoints_count": attribution.get("touchpoints_count"),
-                "stratum_last_sync": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
-            }
-
-            # Remove None values
-            properties = {k: v for k, v in properties.items() if v is not None}
-
-            updates.append(
-                {
-                    "id": deal.provider_deal_id,
-                    "properties": properties,
-                }
-            )
+        async with HubSpotClient(self.db, self.tenant_id) as client:
+            scheduler = self._scheduler(client)
 
-        if not updates:
-            return {
-                "status": "success",
-                "message": "No attribution data to sync",
-                "synced": 0,
-                "failed": 0,
-            }
+            for deal in deals:
+                # Get attribution data
+                attribution = await self._get_deal_attribution(deal.id)
 
-        # Batch update in HubSpot
-        async with HubSpotClient(self.db, self.tenant_id) as client:
-            response = await client.batch_update_deals(updates)
+                scheduler.enqueue(
+                    DEAL,
+                    deal.crm_deal_id,
+                    {
+                        "stratum_attributed_platform": attribution.get("platform"),
+                        "stratum_attributed_campaign": attribution.get("campaign_name"),
+                        "stratum_attributed_campaign_id": attribution.get(
+                            "campaign_id"
+                        ),
+                        "stratum_attribution_model": attribution.get(
+                            "attribution_model"
+                        ),
+                        "stratum_attributed_spend": attribution.get("attributed_spend"),
+                        "stratum_revenue_roas": attribution.get("revenue_roas"),
+                        "stratum_profit_roas": attribution.get("profit_roas"),
+                        "stratum_cogs": attribution.get("cogs"),
+                        "stratum_gross_profit": attribution.get("gross_profit"),
+                        "stratum_net_profit": attribution.get("net_profit"),
+                        "stratum_days_to_close": attribution.get("days_to_close"),
+                        "stratum_touchpoints_count": attribution.get(
+                            "touchpoints_count"
+                        ),
+                    },
+                    record=deal,
+                )
 
-        synced = len(response.get("results", [])) if response else 0
-        failed = len(response.get("errors", [])) if response else len(updates)
+            # Changed deals only, in batches of 100
+            flushed = await scheduler.flush()
 
-        # Update local sync timestamps
-        for deal in deals:
-            deal.last_synced_at = datetime.now(timezone.utc)
         await self.db.commit()
 
         logger.info(
             "hubspot_deal_writeback_complete",
             tenant_id=self.tenant_id,
-            synced=synced,
-            failed=failed,
+            synced=flushed.synced,
+            failed=flushed.failed,
+            unchanged=flushed.unchanged,
         )
 
-        return {
-            "status": "completed" if failed == 0 else "partial",
-            "synced": synced,
-            "failed": failed,
-            "errors": response.get("errors", []) if response else [],
-        }
+        return flushed.to_dict()
+
+    def _connection_ids(self):
+        """Subquery of the tenant's HubSpot connection ids."""
+        return select(CRMConnection.id).where(
+            CRMConnection.tenant_id == self.tenant_id,
+            CRMConnection.provider == CRMProvider.HUBSPOT,
+        )
+
+    def _scheduler(self, client: HubSpotClient) -> WritebackScheduler:
+        """Writeback scheduler for this tenant's HubSpot account."""
+        return WritebackScheduler(
+            HubSpotTarget(client),
+            request_budget(CRMProvider.HUBSPOT, self.tenant_id),
+            stamp={
+                "stratum_last_sync": datetime.now(timezone.utc).strftime("%Y-%m-%d")
+            },
+        )
 
     async def full_sync(
         self,
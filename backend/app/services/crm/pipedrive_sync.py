@@ -22,6 +22,7 @@ from app.models.cdp import (
 )
 from app.models.crm import CRMProvider, CRMSyncLog
 from app.services.cdp.identity_resolution import IdentityResolutionService
+from app.services.crm.bulk_sync import profiles_by_external_id
 
 from .pipedrive_client import PipedriveClient, hash_email, hash_phone
 
@@ -277,9 +278,16 @@ class PipedriveSyncService:
                 if not data:
                     break
 
+                # Resolve the page's persons to profiles in one query
+                profiles = await profiles_by_external_id(
+                    self.db,
+                    self.tenant_id,
+                    (f"pipedrive:{d['person_id']}" for d in data if d.get("person_id")),
+                )
+
                 for deal in data:
                     try:
-                        await self._process_deal(deal)
+                        await self._process_deal(deal, profiles)
                         results["deals_synced"] += 1
                         results["deals_created"] += 1
                     except (ValueError, TypeError, KeyError) as e:
@@ -299,8 +307,16 @@ class PipedriveSyncService:
 
         return results
 
-    async def _process_deal(self, deal: dict[str, Any]) -> None:
-        """Process a single Pipedrive deal."""
+    async def _process_deal(
+        self, deal: dict[str, Any], profiles: dict[str, CDPProfile]
+    ) -> None:
+        """
+        Process a single Pipedrive deal.
+
+        Args:
+            deal: Pipedrive deal record
+            profiles: The page's profiles by Pipedrive external ID
+        """
         deal_id = deal.get("id")
         person_id = deal.get("person_id")
 
@@ -308,7 +324,7 @@ class PipedriveSyncService:
             return
 
         # Find profile by Pipedrive person ID
-        profile = await self._find_profile_by_pipedrive_id(person_id)
+        profile = profiles.get(f"pipedrive:{person_id}")
         if not profile:
             return
 
@@ -349,29 +365,6 @@ class PipedriveSyncService:
             )
             profile.lifecycle_stage = LifecycleStage.CUSTOMER.value
 
-    async def _find_profile_by_pipedrive_id(
-        self, person_id: int
-    ) -> Optional[CDPProfile]:
-        """Find CDP profile by Pipedrive person ID."""
-        # Look for external ID identifier
-        result = await self.db.execute(
-            select(CDPProfileIdentifier).where(
-                CDPProfileIdentifier.tenant_id == self.tenant_id,
-                CDPProfileIdentifier.identifier_type
-                == IdentifierType.EXTERNAL_ID.value,
-                CDPProfileIdentifier.identifier_hash == f"pipedrive:{person_id}",
-            )
-        )
-        identifier = result.scalar_one_or_none()
-
-        if identifier:
-            result = await self.db.execute(
-                select(CDPProfile).where(CDPProfile.id == identifier.profile_id)
-            )
-            return result.scalar_one_or_none()
-
-        return None
-
     async def _log_sync(
         self,
         results: dict[str, Any],
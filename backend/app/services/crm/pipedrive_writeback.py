@@ -30,6 +30,13 @@ from app.models.crm import (
     Touchpoint,
 )
 from app.services.crm.pipedrive_client import PipedriveClient
+from app.services.crm.writeback_scheduler import (
+    CONTACT,
+    DEAL,
+    PipedriveTarget,
+    WritebackScheduler,
+    request_budget,
+)
 
 logger = get_logger(__name__)
 
@@ -321,7 +328,7 @@ class PipedriveWritebackService:
         # Build query for contacts to sync
         conditions = [
             CRMContact.tenant_id == self.tenant_id,
-            CRMContact.provider_contact_id.isnot(None),
+            CRMContact.connection_id.in_(self._connection_ids()),
         ]
 
         if contact_id:
@@ -343,105 +350,58 @@ class PipedriveWritebackService:
                 "failed": 0,
             }
 
-        synced = 0
-        failed = 0
-        errors = []
-
         async with self.client:
+            scheduler = self._scheduler()
+
             for contact in contacts:
-                try:
-                    # Get attribution data
-                    attribution = await self._get_contact_attribution(contact.id)
-
-                    if not attribution:
-                        continue
-
-                    # Build properties dict with field keys
-                    properties = {}
-                    field_mappings = {
-                        "stratum_ad_platform": attribution.get("platform"),
-                        "stratum_campaign_id": attribution.get("campaign_id"),
-                        "stratum_campaign_name": attribution.get("campaign_name"),
-                        "stratum_adset_id": attribution.get("adset_id"),
-                        "stratum_ad_id": attribution.get("ad_id"),
-                        "stratum_first_touch_source": attribution.get(
-                            "first_touch_source"
-                        ),
-                        "stratum_last_touch_source": attribution.get(
-                            "last_touch_source"
-                        ),
-                        "stratum_attribution_confidence": attribution.get("confidence"),
-                        "stratum_total_ad_spend": attribution.get("total_spend"),
-                        "stratum_touchpoints_count": attribution.get(
-                            "touchpoints_count"
-                        ),
-                        "stratum_last_sync": datetime.now(UTC).strftime("%Y-%m-%d"),
-                    }
-
-                    for field_name, value in field_mappings.items():
-                        if value is not None and field_name in self._field_key_cache:
-                            properties[self._field_key_cache[field_name]] = value
-
-                    if not properties:
-                        continue
-
-                    # Update person in Pipedrive
-                    response = await self.client.update_person(
-                        contact.provider_contact_id,
-                        properties,
-                    )
+                # Get attribution data
+                attribution = await self._get_contact_attribution(contact.id)
 
-                    if response and response.get("success"):
-                        synced += 1
-                        contact.last_synced_at = datetime.now(UTC)
-                    else:
-                        failed += 1
-                        errors.append(
-                            {
-                                "contact_id": str(contact.id),
-                                "error": (
-                                    response.get("error")
-                                    if response
-                                    else "Unknown error"
-                                ),
-                            }
-                        )
+                if not attribution:
+                    continue
 
-                except (
-                    ConnectionError,
-                    TimeoutError,
-                    OSError,
-                    ValueError,
-                    TypeError,
-                ) as e:
-                    failed += 1
-                    errors.append(
+                scheduler.enqueue(
+                    CONTACT,
+                    contact.crm_contact_id,
+                    self._field_keys(
                         {
-                            "contact_id": str(contact.id),
-                            "error": str(e),
+                            "stratum_ad_platform": attribution.get("platform"),
+                            "stratum_campaign_id": attribution.get("campaign_id"),
+                            "stratum_campaign_name": attribution.get("campaign_name"),
+                            "stratum_adset_id": attribution.get("adset_id"),
+                            "stratum_ad_id": attribution.get("ad_id"),
+                            "stratum_first_touch_source": attribution.get(
+                                "first_touch_source"
+                            ),
+                            "stratum_last_touch_source": attribution.get(
+                                "last_touch_source"
+                            ),
+                            "stratum_attribution_confidence": attribution.get(
+                                "confidence"
+                            ),
+                            "stratum_total_ad_spend": attribution.get("total_spend"),
+                            "stratum_touchpoints_count": attribution.get(
+                                "touchpoints_count"
+                            ),
                         }
-                    )
-                    logger.warning(
-                        "pipedrive_person_writeback_error",
-                        contact_id=str(contact.id),
-                        error=str(e),
-                    )
+                    ),
+                    record=contact,
+                )
+
+            # Changed persons only; Pipedrive has no bulk update
+            flushed = await scheduler.flush()
 
         await self.db.commit()
 
         logger.info(
             "pipedrive_person_writeback_complete",
             tenant_id=self.tenant_id,
-            synced=synced,
-            failed=failed,
+            synced=flushed.synced,
+            failed=flushed.failed,
+            unchanged=flushed.unchanged,
         )
 
-        return {
-            "status": "completed" if failed == 0 else "partial",
-            "synced": synced,
-            "failed": failed,
-            "errors": errors[:10],  # Limit errors returned
-        }
+        return flushed.to_dict()
 
     async def sync_deal_attribution(
         self,
@@ -465,7 +425,7 @@ class PipedriveWritebackService:
         # Build query for deals to sync
         conditions = [
             CRMDeal.tenant_id == self.tenant_id,
-            CRMDeal.provider_deal_id.isnot(None),
+            CRMDeal.connection_id.in_(self._connection_ids()),
         ]
 
         if deal_id:
@@ -487,106 +447,87 @@ class PipedriveWritebackService:
                 "failed": 0,
             }
 
-        synced = 0
-        failed = 0
-        errors = []
-
         async with self.client:
-            for deal in deals:
-                try:
-                    # Get attribution data
-                    attribution = await self._get_deal_attribution(deal.id)
-
-                    # Build properties dict with field keys
-                    properties = {}
-                    field_mappings = {
-                        "stratum_attributed_platform": attribution.get("platform"),
-                        "stratum_attributed_campaign": attribution.get("campaign_name"),
-                        "stratum_attributed_campaign_id": attribution.get(
-                            "campaign_id"
-                        ),
-                        "stratum_attribution_model": attribution.get(
-                            "attribution_model"
-                        ),
-                        "stratum_attributed_spend": attribution.get("attributed_spend"),
-                        "stratum_revenue_roas": attribution.get("revenue_roas"),
-                        "stratum_profit_roas": attribution.get("profit_roas"),
-                        "stratum_cogs": attribution.get("cogs"),
-                        "stratum_gross_profit": attribution.get("gross_profit"),
-                        "stratum_net_profit": attribution.get("net_profit"),
-                        "stratum_days_to_close": attribution.get("days_to_close"),
-                        "stratum_touchpoints_count": attribution.get(
-                            "touchpoints_count"
-                        ),
-                        "stratum_last_sync": datetime.now(UTC).strftime("%Y-%m-%d"),
-                    }
-
-                    for field_name, value in field_mappings.items():
-                        cache_key = f"deal_{field_name}"
-                        if value is not None and cache_key in self._field_key_cache:
-                            properties[self._field_key_cache[cache_key]] = value
-
-                    if not properties:
-                        continue
-
-                    # Update deal in Pipedrive
-                    response = await self.client.update_deal(
-                        deal.provider_deal_id,
-                        properties,
-                    )
+            scheduler = self._scheduler(prefix="deal_")
 
-                    if response and response.get("success"):
-                        synced += 1
-                        deal.last_synced_at = datetime.now(UTC)
-                    else:
-                        failed += 1
-                        errors.append(
-                            {
-                                "deal_id": str(deal.id),
-                                "error": (
-                                    response.get("error")
-                                    if response
-                                    else "Unknown error"
-                                ),
-                            }
-                        )
+            for deal in deals:
+                # Get attribution data
+                attribution = await self._get_deal_attribution(deal.id)
 
-                except (
-                    ConnectionError,
-                    TimeoutError,
-                    OSError,
-                    ValueError,
-                    TypeError,
-                ) as e:
-                    failed += 1
-                    errors.append(
+                scheduler.enqueue(
+                    DEAL,
+                    deal.crm_deal_id,
+                    self._field_keys(
                         {
-                            "deal_id": str(deal.id),
-                            "error": str(e),
-                        }
-                    )
-                    logger.warning(
-                        "pipedrive_deal_writeback_error",
-                        deal_id=str(deal.id),
-                        error=str(e),
-                    )
+                            "stratum_attributed_platform": attribution.get("platform"),
+                            "stratum_attributed_campaign": attribution.get(
+                                "campaign_name"
+                            ),
+                            "stratum_attributed_campaign_id": attribution.get(
+                                "campaign_id"
+                            ),
+                            "stratum_attribution_model": attribution.get(
+                                "attribution_model"
+                            ),
+                            "stratum_attributed_spend": attribution.get(
+                                "attributed_spend"
+                            ),
+                            "stratum_revenue_roas": attribution.get("revenue_roas"),
+                            "stratum_profit_roas": attribution.get("profit_roas"),
+                            "stratum_cogs": attribution.get("cogs"),
+                            "stratum_gross_profit": attribution.get("gross_profit"),
+                            "stratum_net_profit": attribution.get("net_profit"),
+                            "stratum_days_to_close": attribution.get("days_to_close"),
+                            "stratum_touchpoints_count": attribution.get(
+                                "touchpoints_count"
+                            ),
+                        },
+                        prefix="deal_",
+                    ),
+                    record=deal,
+                )
+
+            # Changed deals only; Pipedrive has no bulk update
+            flushed = await scheduler.flush()
 
         await self.db.commit()
 
         logger.info(
             "pipedrive_deal_writeback_complete",
             tenant_id=self.tenant_id,
-            synced=synced,
-            failed=failed,
+            synced=flushed.synced,
+            failed=flushed.failed,
+            unchanged=flushed.unchanged,
         )
 
+        return flushed.to_dict()
+
+    def _field_keys(self, values: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+        """Map Stratum field names to the account's custom field keys."""
         return {
-            "status": "completed" if failed == 0 else "partial",
-            "synced": synced,
-            "failed": failed,
-            "errors": errors[:10],
+            self._field_key_cache[f"{prefix}{name}"]: value
+            for name, value in values.items()
+            if f"{prefix}{name}" in self._field_key_cache
         }
 
+    def _connection_ids(self):
+        """Subquery of the tenant's Pipedrive connection ids."""
+        return select(CRMConnection.id).where(
+            CRMConnection.tenant_id == self.tenant_id,
+            CRMConnection.provider == CRMProvider.PIPEDRIVE,
+        )
+
+    def _scheduler(self, prefix: str = "") -> WritebackScheduler:
+        """Writeback scheduler for this tenant's Pipedrive account."""
+        return WritebackScheduler(
+            PipedriveTarget(self.client),
+            request_budget(CRMProvider.PIPEDRIVE, self.tenant_id),
+            stamp=self._field_keys(
+                {"stratum_last_sync": datetime.now(UTC).strftime("%Y-%m-%d")},
+                prefix=prefix,
+            ),
+        )
+
     async def full_sync(
         self,
         sync_persons: bool = True,
@@ -782,6 +782,29 @@ class SalesforceClient:
     # Bulk Operations
     # =========================================================================
 
+    async def update_records(
+        self,
+        object_name: str,
+        records: list[dict[str, Any]],
+    ) -> Optional[Any]:
+        """
+        Update up to 200 records in one sObject Collections request.
+
+        Args:
+            object_name: sObject type, e.g. "Contact"
+            records: Field values, each with the record's "id"
+
+        Returns:
+            One {"id", "success", "errors"} result per record, in order
+        """
+        data = {
+            "allOrNone": False,
+            "records": [
+                {"attributes": {"type": object_name}, **record} for record in records
+            ],
+        }
+        return await self._make_request("PATCH", "/composite/sobjects", data=data)
+
     async def create_bulk_job(
         self,
         object_name: str,
@@ -22,6 +22,7 @@ from app.models.cdp import (
 )
 from app.models.crm import CRMProvider, CRMSyncLog
 from app.services.cdp.identity_resolution import IdentityResolutionService
+from app.services.crm.bulk_sync import profiles_by_external_id
 
 from .salesforce_client import SalesforceClient, hash_email, hash_phone
 
@@ -411,9 +412,14 @@ class SalesforceSyncService:
                 if not records:
                     break
 
+                # Resolve the page's accounts to profiles in one query
+                account_profiles = await self._profiles_by_salesforce_account(
+                    [r["AccountId"] for r in records if r.get("AccountId")]
+                )
+
                 for opp in records:
                     try:
-                        await self._process_opportunity(opp)
+                        await self._process_opportunity(opp, account_profiles)
                         results["opportunities_synced"] += 1
                         results["opportunities_created"] += 1
                     except (ValueError, TypeError, KeyError) as e:
@@ -431,8 +437,16 @@ class SalesforceSyncService:
 
         return results
 
-    async def _process_opportunity(self, opp: dict[str, Any]) -> None:
-        """Process a single Salesforce opportunity."""
+    async def _process_opportunity(
+        self, opp: dict[str, Any], account_profiles: dict[str, CDPProfile]
+    ) -> None:
+        """
+        Process a single Salesforce opportunity.
+
+        Args:
+            opp: Salesforce opportunity record
+            account_profiles: The page's profiles by Salesforce account ID
+        """
         opp_id = opp.get("Id")
         account_id = opp.get("AccountId")
 
@@ -440,19 +454,20 @@ class SalesforceSyncService:
             return
 
         # Find profile by Salesforce account ID (through contact)
-        profile = await self._find_profile_by_salesforce_account(account_id)
+        profile = account_profiles.get(account_id)
         if not profile:
-            # Try to find via opportunity contact roles
+            # Try to find via opportunity contact roles, first match wins
             contact_roles = await self.client.get_opportunity_contact_roles(opp_id)
             if contact_roles and contact_roles.get("records"):
-                for role in contact_roles.get("records", []):
-                    contact_id = role.get("ContactId")
-                    if contact_id:
-                        profile = await self._find_profile_by_salesforce_id(
-                            f"salesforce_contact:{contact_id}"
-                        )
-                        if profile:
-                            break
+                external_ids = [
+                    f"salesforce_contact:{role['ContactId']}"
+                    for role in contact_roles["records"]
+                    if role.get("ContactId")
+                ]
+                found = await profiles_by_external_id(
+                    self.db, self.tenant_id, external_ids
+                )
+                profile = next((found[i] for i in external_ids if i in found), None)
 
         if not profile:
             return
@@ -499,40 +514,29 @@ class SalesforceSyncService:
         if mapped_stage:
             profile.lifecycle_stage = mapped_stage.value
 
-    async def _find_profile_by_salesforce_id(
-        self, external_id: str
-    ) -> Optional[CDPProfile]:
-        """Find CDP profile by Salesforce external ID."""
-        result = await self.db.execute(
-            select(CDPProfileIdentifier).where(
-                CDPProfileIdentifier.tenant_id == self.tenant_id,
-                CDPProfileIdentifier.identifier_type
-                == IdentifierType.EXTERNAL_ID.value,
-                CDPProfileIdentifier.identifier_hash == external_id,
-            )
-        )
-        identifier = result.scalar_one_or_none()
-
-        if identifier:
-            result = await self.db.execute(
-                select(CDPProfile).where(CDPProfile.id == identifier.profile_id)
-            )
-            return result.scalar_one_or_none()
+    async def _profiles_by_salesforce_account(
+        self, account_ids: list[str]
+    ) -> dict[str, CDPProfile]:
+        """
+        CDP profiles by Salesforce account ID, in one query.
 
-        return None
+        Profiles carry their account in profile_data. When several share an
+        account, the earliest created stands for it.
+        """
+        if not account_ids:
+            return {}
 
-    async def _find_profile_by_salesforce_account(
-        self, account_id: str
-    ) -> Optional[CDPProfile]:
-        """Find CDP profile by Salesforce account ID."""
-        # Search for any profile with this account_id in profile_data
+        account_id = CDPProfile.profile_data["account_id"].astext
         result = await self.db.execute(
-            select(CDPProfile).where(
+            select(account_id, CDPProfile)
+            .where(
                 CDPProfile.tenant_id == self.tenant_id,
-                CDPProfile.profile_data["account_id"].astext == account_id,
+                account_id.in_(sorted(set(account_ids))),
             )
+            .order_by(CDPProfile.created_at.desc())
         )
-        return result.scalar_one_or_none()
+        # Later rows overwrite earlier ones: the earliest created is kept
+        return dict(result.all())
 
     async def _log_sync(
         self,
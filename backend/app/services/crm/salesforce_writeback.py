@@ -30,6 +30,13 @@ from app.models.crm import (
     Touchpoint,
 )
 from app.services.crm.salesforce_client import SalesforceClient
+from app.services.crm.writeback_scheduler import (
+    CONTACT,
+    DEAL,
+    SalesforceTarget,
+    WritebackScheduler,
+    request_budget,
+)
 
 logger = get_logger(__name__)
 
@@ -325,7 +332,7 @@ class SalesforceWritebackService:
         # Build query for contacts to sync
         conditions = [
             CRMContact.tenant_id == self.tenant_id,
-            CRMContact.provider_contact_id.isnot(None),
+            CRMContact.connection_id.in_(self._connection_ids()),
         ]
 
         if contact_id:
@@ -347,21 +354,20 @@ class SalesforceWritebackService:
                 "failed": 0,
             }
 
-        synced = 0
-        failed = 0
-        errors = []
-
         async with self.client:
+            scheduler = self._scheduler()
+
             for contact in contacts:
-                try:
-                    # Get attribution data
-                    attribution = await self._get_contact_attribution(contact.id)
+                # Get attribution data
+                attribution = await self._get_contact_attribution(contact.id)
 
-                    if not attribution:
-                        continue
+                if not attribution:
+                    continue
 
-                    # Build properties dict
-                    properties = {
+                scheduler.enqueue(
+                    CONTACT,
+                    contact.crm_contact_id,
+                    {
                         "Stratum_Ad_Platform__c": attribution.get("platform"),
                         "Stratum_Campaign_ID__c": attribution.get("campaign_id"),
                         "Stratum_Campaign_Name__c": attribution.get("campaign_name"),
@@ -378,68 +384,24 @@ class SalesforceWritebackService:
                         "Stratum_Touchpoints_Count__c": attribution.get(
                             "touchpoints_count"
                         ),
-                        "Stratum_Last_Sync__c": datetime.now(UTC).isoformat(),
-                    }
-
-                    # Remove None values
-                    properties = {k: v for k, v in properties.items() if v is not None}
-
-                    if not properties:
-                        continue
-
-                    # Update contact in Salesforce
-                    response = await self.client.update_contact(
-                        contact.provider_contact_id,
-                        properties,
-                    )
-
-                    if response and response.get("success"):
-                        synced += 1
-                        contact.last_synced_at = datetime.now(UTC)
-                    else:
-                        failed += 1
-                        errors.append(
-                            {
-                                "contact_id": str(contact.id),
-                                "error": str(response) if response else "Unknown error",
-                            }
-                        )
-
-                except (
-                    ConnectionError,
-                    TimeoutError,
-                    OSError,
-                    ValueError,
-                    TypeError,
-                ) as e:
-                    failed += 1
-                    errors.append(
-                        {
-                            "contact_id": str(contact.id),
-                            "error": str(e),
-                        }
-                    )
-                    logger.warning(
-                        "salesforce_contact_writeback_error",
-                        contact_id=str(contact.id),
-                        error=str(e),
-                    )
+                    },
+                    record=contact,
+                )
+
+            # Changed contacts only, 200 per composite request
+            flushed = await scheduler.flush()
 
         await self.db.commit()
 
         logger.info(
             "salesforce_contact_writeback_complete",
             tenant_id=self.tenant_id,
-            synced=synced,
-            failed=failed,
+            synced=flushed.synced,
+            failed=flushed.failed,
+            unchanged=flushed.unchanged,
         )
 
-        return {
-            "status": "completed" if failed == 0 else "partial",
-            "synced": synced,
-            "failed": failed,
-            "errors": errors[:10],
-        }
+        return flushed.to_dict()
 
     async def sync_opportunity_attribution(
         self,
@@ -461,7 +423,7 @@ class SalesforceWritebackService:
         # Build query for deals to sync
         conditions = [
             CRMDeal.tenant_id == self.tenant_id,
-            CRMDeal.provider_deal_id.isnot(None),
+            CRMDeal.connection_id.in_(self._connection_ids()),
         ]
 
         if deal_id:
@@ -483,18 +445,17 @@ class SalesforceWritebackService:
                 "failed": 0,
             }
 
-        synced = 0
-        failed = 0
-        errors = []
-
         async with self.client:
+            scheduler = self._scheduler()
+
             for deal in deals:
-                try:
-                    # Get attribution data
-                    attribution = await self._get_deal_attribution(deal.id)
+                # Get attribution data
+                attribution = await self._get_deal_attribution(deal.id)
 
-                    # Build properties dict
-                    properties = {
+                scheduler.enqueue(
+                    DEAL,
+                    deal.crm_deal_id,
+                    {
                         "Stratum_Attributed_Platform__c": attribution.get("platform"),
                         "Stratum_Attributed_Campaign__c": attribution.get(
                             "campaign_name"
@@ -513,68 +474,39 @@ class SalesforceWritebackService:
                         "Stratum_Touchpoints_Count__c": attribution.get(
                             "touchpoints_count"
                         ),
-                        "Stratum_Last_Sync__c": datetime.now(UTC).isoformat(),
-                    }
-
-                    # Remove None values
-                    properties = {k: v for k, v in properties.items() if v is not None}
-
-                    if not properties:
-                        continue
-
-                    # Update opportunity in Salesforce
-                    response = await self.client.update_opportunity(
-                        deal.provider_deal_id,
-                        properties,
-                    )
-
-                    if response and response.get("success"):
-                        synced += 1
-                        deal.last_synced_at = datetime.now(UTC)
-                    else:
-                        failed += 1
-                        errors.append(
-                            {
-                                "deal_id": str(deal.id),
-                                "error": str(response) if response else "Unknown error",
-                            }
-                        )
-
-                except (
-                    ConnectionError,
-                    TimeoutError,
-                    OSError,
-                    ValueError,
-                    TypeError,
-                ) as e:
-                    failed += 1
-                    errors.append(
-                        {
-                            "deal_id": str(deal.id),
-                            "error": str(e),
-                        }
-                    )
-                    logger.warning(
-                        "salesforce_opportunity_writeback_error",
-                        deal_id=str(deal.id),
-                        error=str(e),
-                    )
+                    },
+                    record=deal,
+                )
+
+            # Changed opportunities only, 200 per composite request
+            flushed = await scheduler.flush()
 
         await self.db.commit()
 
         logger.info(
             "salesforce_opportunity_writeback_complete",
             tenant_id=self.tenant_id,
-            synced=synced,
-            failed=failed,
+            synced=flushed.synced,
+            failed=flushed.failed,
+            unchanged=flushed.unchanged,
         )
 
-        return {
-            "status": "completed" if failed == 0 else "partial",
-            "synced": synced,
-            "failed": failed,
-            "errors": errors[:10],
-        }
+        return flushed.to_dict()
+
+    def _connection_ids(self):
+        """Subquery of the tenant's Salesforce connection ids."""
+        return select(CRMConnection.id).where(
+            CRMConnection.tenant_id == self.tenant_id,
+            CRMConnection.provider == CRMProvider.SALESFORCE,
+        )
+
+    def _scheduler(self) -> WritebackScheduler:
+        """Writeback scheduler for this tenant's Salesforce org."""
+        return WritebackScheduler(
+            SalesforceTarget(self.client),
+            request_budget(CRMProvider.SALESFORCE, self.tenant_id),
+            stamp={"Stratum_Last_Sync__c": datetime.now(UTC).isoformat()},
+        )
 
     async def full_sync(
         self,
@@ -0,0 +1,378 @@
+# =============================================================================
+# Stratum AI - CRM Writeback Scheduler
+# =============================================================================
+"""
+Coalesced, batched writeback of Stratum fields to CRMs.
+
+The writeback services used to push each contact or deal with its own API
+call on every run, whether or not its attribution had changed. They now
+enqueue field updates here and flush once per run:
+
+- Updates are coalesced per CRM object: enqueuing the same object twice
+  merges the fields, the later value winning.
+- Fields whose value matches what was last written to the CRM (kept in the
+  record's ``writeback_values``) are dropped. An object with nothing left to
+  change is not sent at all.
+- Pending objects go out through the provider's batch API (HubSpot batch
+  update, Salesforce sObject Collections, Zoho bulk update) in batches of
+  the provider's maximum size. Pipedrive has no bulk update endpoint, so its
+  objects are sent one per request and only benefit from the first two.
+- Every request spends one token from a per-provider, per-tenant budget, so
+  a large flush is paced below the provider's rate limit.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any, Optional
+
+from app.core.logging import get_logger
+from app.models.crm import CRMProvider
+
+logger = get_logger(__name__)
+
+CONTACT = "contact"
+DEAL = "deal"
+
+
+# =============================================================================
+# Rate Budgets
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class ProviderBudget:
+    """Sustained request rate and burst allowed for one CRM account."""
+
+    rate: float  # requests per second
+    burst: int
+
+
+# Kept below each provider's published limits, leaving room for the syncs
+# running against the same account.
+PROVIDER_BUDGETS: dict[CRMProvider, ProviderBudget] = {
+    CRMProvider.HUBSPOT: ProviderBudget(rate=8.0, burst=80),  # 100 per 10s
+    CRMProvider.SALESFORCE: ProviderBudget(rate=5.0, burst=25),
+    CRMProvider.ZOHO: ProviderBudget(rate=2.0, burst=10),
+    CRMProvider.PIPEDRIVE: ProviderBudget(rate=10.0, burst=40),  # 80 per 2s
+}
+
+
+class RequestBudget:
+    """Async token bucket; ``acquire`` waits until a request may be sent."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await self._sleep((1 - self._tokens) / self.rate)
+
+
+_budgets: dict[tuple[CRMProvider, int], RequestBudget] = {}
+
+
+def request_budget(provider: CRMProvider, tenant_id: int) -> RequestBudget:
+    """The process-wide request budget for a tenant's CRM account."""
+    key = (provider, tenant_id)
+    if key not in _budgets:
+        budget = PROVIDER_BUDGETS[provider]
+        _budgets[key] = RequestBudget(budget.rate, budget.burst)
+    return _budgets[key]
+
+
+# =============================================================================
+# Provider Targets
+# =============================================================================
+
+
+@dataclass
+class PendingUpdate:
+    """Fields waiting to be written to one CRM object."""
+
+    object_type: str
+    external_id: str
+    fields: dict[str, Any] = field(default_factory=dict)
+    record: Any = None  # CRMContact / CRMDeal stamped once written
+
+
+def _all_failed(batch: list[PendingUpdate], error: str) -> dict[str, str]:
+    return {update.external_id: error for update in batch}
+
+
+class HubSpotTarget:
+    """HubSpot CRM v3 batch update, 100 objects per request."""
+
+    provider = CRMProvider.HUBSPOT
+    batch_size = 100
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    async def send(
+        self, object_type: str, batch: list[PendingUpdate]
+    ) -> dict[str, str]:
+        updates = [{"id": u.external_id, "properties": u.fields} for u in batch]
+        if object_type == CONTACT:
+            response = await self.client.batch_update_contacts(updates)
+        else:
+            response = await self.client.batch_update_deals(updates)
+
+        written = {str(r.get("id")) for r in (response or {}).get("results", [])}
+        errors = (response or {}).get("errors") or [{"message": "Request failed"}]
+        message = str(errors[0].get("message", errors[0]))
+        return {u.external_id: message for u in batch if u.external_id not in written}
+
+
+class SalesforceTarget:
+    """Salesforce sObject Collections update, 200 records per request."""
+
+    provider = CRMProvider.SALESFORCE
+    batch_size = 200
+    sobjects = {CONTACT: "Contact", DEAL: "Opportunity"}
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    async def send(
+        self, object_type: str, batch: list[PendingUpdate]
+    ) -> dict[str, str]:
+        response = await self.client.update_records(
+            self.sobjects[object_type],
+            [{"id": u.external_id, **u.fields} for u in batch],
+        )
+        if not isinstance(response, list):
+            return _all_failed(batch, str(response) if response else "Request failed")
+
+        # One result per record, in request order
+        return {
+            update.external_id: str(result.get("errors") or result)
+            for update, result in zip(batch, response)
+            if not result.get("success")
+        }
+
+
+class ZohoTarget:
+    """Zoho CRM bulk update, 100 records per request."""
+
+    provider = CRMProvider.ZOHO
+    batch_size = 100
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    async def send(
+        self, object_type: str, batch: list[PendingUpdate]
+    ) -> dict[str, str]:
+        updates = [{"id": u.external_id, **u.fields} for u in batch]
+        if object_type == CONTACT:
+            response = await self.client.batch_update_contacts(updates)
+        else:
+            response = await self.client.batch_update_deals(updates)
+
+        data = (response or {}).get("data") or []
+        if not data:
+            return _all_failed(batch, "Request failed")
+
+        # One result per record, in request order
+        return {
+            update.external_id: str(result.get("message") or result)
+            for update, result in zip(batch, data)
+            if result.get("status") != "success"
+        }
+
+
+class PipedriveTarget:
+    """Pipedrive person and deal updates; the API has no bulk update."""
+
+    provider = CRMProvider.PIPEDRIVE
+    batch_size = 1
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    async def send(
+        self, object_type: str, batch: list[PendingUpdate]
+    ) -> dict[str, str]:
+        (update,) = batch
+        if object_type == CONTACT:
+            response = await self.client.update_person(
+                update.external_id, update.fields
+            )
+        else:
+            response = await self.client.update_deal(update.external_id, update.fields)
+
+        if response and response.get("success"):
+            return {}
+        error = response.get("error") if response else None
+        return {update.external_id: str(error or "Request failed")}
+
+
+# =============================================================================
+# Scheduler
+# =============================================================================
+
+
+@dataclass
+class FlushResult:
+    """Outcome of one writeback flush."""
+
+    synced: int = 0
+    failed: int = 0
+    unchanged: int = 0
+    requests: int = 0
+    errors: list[dict[str, str]] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "status": "completed" if self.failed == 0 else "partial",
+            "synced": self.synced,
+            "failed": self.failed,
+            "unchanged": self.unchanged,
+            "requests": self.requests,
+            "errors": self.errors[:10],
+        }
+
+
+class WritebackScheduler:
+    """
+    Coalesces pending CRM field updates and flushes them in provider batches.
+
+    ``stamp`` fields (e.g. a "last synced" date) are added to every object
+    actually written, but never make an object count as changed.
+
+    Usage:
+        scheduler = WritebackScheduler(
+            HubSpotTarget(client),
+            request_budget(CRMProvider.HUBSPOT, tenant_id),
+            stamp={"stratum_last_sync": today},
+        )
+        scheduler.enqueue(CONTACT, contact.crm_contact_id, fields, contact)
+        result = await scheduler.flush()
+    """
+
+    def __init__(
+        self,
+        target: Any,
+        budget: RequestBudget,
+        stamp: Optional[dict[str, Any]] = None,
+    ):
+        self.target = target
+        self.budget = budget
+        self.stamp = stamp or {}
+        self._pending: dict[tuple[str, str], PendingUpdate] = {}
+
+    @property
+    def pending(self) -> int:
+        """Number of CRM objects with enqueued updates."""
+        return len(self._pending)
+
+    def enqueue(
+        self,
+        object_type: str,
+        external_id: Any,
+        fields: dict[str, Any],
+        record: Any = None,
+    ) -> None:
+        """
+        Queue field updates for one CRM object.
+
+        Args:
+            object_type: CONTACT or DEAL
+            external_id: The object's id in the CRM
+            fields: CRM field name -> value; None values are ignored
+            record: Local CRMContact / CRMDeal holding ``writeback_values``
+        """
+        key = (object_type, str(external_id))
+        update = self._pending.get(key)
+        if update is None:
+            update = self._pending[key] = PendingUpdate(object_type, key[1])
+        update.fields.update({k: v for k, v in fields.items() if v is not None})
+        if record is not None:
+            update.record = record
+
+    async def flush(self) -> FlushResult:
+        """Write every pending object that changed, then clear the queue."""
+        result = FlushResult()
+        due: dict[str, list[PendingUpdate]] = {}
+        changes: dict[tuple[str, str], dict[str, Any]] = {}
+
+        for key, update in self._pending.items():
+            written = (update.record.writeback_values or {}) if update.record else {}
+            changed = {k: v for k, v in update.fields.items() if written.get(k) != v}
+            if not changed:
+                result.unchanged += 1
+                continue
+            changes[key] = changed
+            due.setdefault(update.object_type, []).append(
+                PendingUpdate(
+                    update.object_type,
+                    update.external_id,
+                    {**changed, **self.stamp},
+                    update.record,
+                )
+            )
+        pending, self._pending = self._pending, {}
+
+        size = self.target.batch_size
+        for object_type, updates in due.items():
+            for i in range(0, len(updates), size):
+                batch = updates[i : i + size]
+                await self.budget.acquire()
+                result.requests += 1
+                try:
+                    failures = await self.target.send(object_type, batch)
+                except (ConnectionError, TimeoutError, OSError) as e:
+                    failures = _all_failed(batch, str(e))
+
+                now = datetime.now(UTC)
+                for update in batch:
+                    error = failures.get(update.external_id)
+                    if error is not None:
+                        result.failed += 1
+                        result.errors.append(
+                            {"object_id": update.external_id, "error": error}
+                        )
+                        continue
+                    result.synced += 1
+                    record = update.record
+                    if record is not None:
+                        record.writeback_values = {
+                            **(record.writeback_values or {}),
+                            **changes[(object_type, update.external_id)],
+                        }
+                        record.written_back_at = now
+
+        logger.info(
+            "crm_writeback_flushed",
+            provider=self.target.provider.value,
+            objects=len(pending),
+            synced=result.synced,
+            failed=result.failed,
+            unchanged=result.unchanged,
+            requests=result.requests,
+        )
+        return result
@@ -18,11 +18,11 @@ from app.core.logging import get_logger
 from app.models.crm import (
     CRMConnection,
     CRMConnectionStatus,
-    CRMContact,
     CRMDeal,
     CRMProvider,
     DealStage,
 )
+from app.services.crm.bulk_sync import CRMBulkWriter
 from app.services.crm.identity_matching import IdentityMatcher
 from app.services.crm.zoho_client import ZohoClient, hash_email, hash_phone
 
@@ -208,6 +208,7 @@ class ZohoSyncService:
             "fbclid",
             "ttclid",
         ]
+        writer = CRMBulkWriter(self.db, self.tenant_id, connection.id)
 
         async with self.client:
             while True:
@@ -221,22 +222,21 @@ class ZohoSyncService:
                 if not response or "data" not in response:
                     break
 
+                rows = []
                 for contact_data in response["data"]:
                     try:
-                        created, updated = await self._upsert_contact(
-                            connection.id,
-                            contact_data,
-                        )
-                        results["synced"] += 1
-                        if created:
-                            results["created"] += 1
-                        elif updated:
-                            results["updated"] += 1
+                        rows.append(self._contact_row(contact_data))
                     except (ValueError, TypeError, KeyError) as e:
                         results["errors"].append(
                             f"Contact {contact_data.get('id')}: {e!s}"
                         )
 
+                # Write the page in one upsert
+                created, updated = await writer.upsert_contacts(rows)
+                results["synced"] += created + updated
+                results["created"] += created
+                results["updated"] += updated
+
                 # Check for more pages
                 info = response.get("info", {})
                 if not info.get("more_records", False):
@@ -272,6 +272,7 @@ class ZohoSyncService:
             "Created_Time",
             "Modified_Time",
         ]
+        writer = CRMBulkWriter(self.db, self.tenant_id, connection.id)
 
         async with self.client:
             while True:
@@ -285,23 +286,21 @@ class ZohoSyncService:
                 if not response or "data" not in response:
                     break
 
+                rows = []
                 for lead_data in response["data"]:
                     try:
                         # Convert lead to contact format
                         contact_data = self._convert_lead_to_contact(lead_data)
-                        created, updated = await self._upsert_contact(
-                            connection.id,
-                            contact_data,
-                            is_lead=True,
-                        )
-                        results["synced"] += 1
-                        if created:
-                            results["created"] += 1
-                        elif updated:
-                            results["updated"] += 1
+                        rows.append(self._contact_row(contact_data, is_lead=True))
                     except (ValueError, TypeError, KeyError) as e:
                         results["errors"].append(f"Lead {lead_data.get('id')}: {e!s}")
 
+                # Write the page in one upsert
+                created, updated = await writer.upsert_contacts(rows)
+                results["synced"] += created + updated
+                results["created"] += created
+                results["updated"] += updated
+
                 # Check for more pages
                 info = response.get("info", {})
                 if not info.get("more_records", False):
@@ -338,23 +337,22 @@ class ZohoSyncService:
         is_lead: bool = False,
     ) -> tuple[bool, bool]:
         """
-        Insert or update a contact.
+        Insert or update a single contact.
 
         Returns:
             Tuple of (created, updated) booleans
         """
-        crm_contact_id = str(contact_data.get("id"))
-
-        # Check if contact exists
-        result = await self.db.execute(
-            select(CRMContact).where(
-                and_(
-                    CRMContact.connection_id == connection_id,
-                    CRMContact.crm_contact_id == crm_contact_id,
-                )
-            )
+        writer = CRMBulkWriter(self.db, self.tenant_id, connection_id)
+        created, updated = await writer.upsert_contacts(
+            [self._contact_row(contact_data, is_lead=is_lead)]
         )
-        existing = result.scalar_one_or_none()
+        return created == 1, updated == 1
+
+    def _contact_row(
+        self, contact_data: dict[str, Any], is_lead: bool = False
+    ) -> dict[str, Any]:
+        """Parse a Zoho contact into a crm_contacts row for CRMBulkWriter."""
+        crm_contact_id = str(contact_data.get("id"))
 
         # Extract and hash identity fields
         email = contact_data.get("Email", "") or ""
@@ -403,7 +401,8 @@ class ZohoSyncService:
         if isinstance(lead_source, dict):
             lead_source = lead_source.get("name")
 
-        contact_fields = {
+        return {
+            "crm_contact_id": crm_contact_id,
             "crm_owner_id": owner_id,
             "email_hash": email_hashed,
             "phone_hash": phone_hashed,
@@ -429,24 +428,6 @@ class ZohoSyncService:
             "crm_updated_at": crm_updated,
         }
 
-        if existing:
-            # Update existing contact
-            for key, value in contact_fields.items():
-                if value is not None:
-                    setattr(existing, key, value)
-            existing.updated_at = datetime.now(UTC)
-            return False, True
-        else:
-            # Create new contact
-            contact = CRMContact(
-                tenant_id=self.tenant_id,
-                connection_id=connection_id,
-                crm_contact_id=crm_contact_id,
-                **contact_fields,
-            )
-            self.db.add(contact)
-            return True, False
-
     async def _sync_deals(
         self,
         connection: CRMConnection,
@@ -468,6 +449,7 @@ class ZohoSyncService:
             "Created_Time",
             "Modified_Time",
         ]
+        writer = CRMBulkWriter(self.db, self.tenant_id, connection.id)
 
         async with self.client:
             while True:
@@ -481,20 +463,19 @@ class ZohoSyncService:
                 if not response or "data" not in response:
                     break
 
+                rows = []
                 for deal_data in response["data"]:
                     try:
-                        created, updated = await self._upsert_deal(
-                            connection.id,
-                            deal_data,
-                        )
-                        results["synced"] += 1
-                        if created:
-                            results["created"] += 1
-                        elif updated:
-                            results["updated"] += 1
+                        rows.append(self._deal_row(deal_data))
                     except (ValueError, TypeError, KeyError) as e:
                         results["errors"].append(f"Deal {deal_data.get('id')}: {e!s}")
 
+                # Write the page in one upsert
+                created, updated = await writer.upsert_deals(rows)
+                results["synced"] += created + updated
+                results["created"] += created
+                results["updated"] += updated
+
                 # Check for more pages
                 info = response.get("info", {})
                 if not info.get("more_records", False):
@@ -516,23 +497,18 @@ class ZohoSyncService:
         deal_data: dict[str, Any],
     ) -> tuple[bool, bool]:
         """
-        Insert or update a deal.
+        Insert or update a single deal.
 
         Returns:
             Tuple of (created, updated) booleans
         """
-        crm_deal_id = str(deal_data.get("id"))
+        writer = CRMBulkWriter(self.db, self.tenant_id, connection_id)
+        created, updated = await writer.upsert_deals([self._deal_row(deal_data)])
+        return created == 1, updated == 1
 
-        # Check if deal exists
-        result = await self.db.execute(
-            select(CRMDeal).where(
-                and_(
-                    CRMDeal.connection_id == connection_id,
-                    CRMDeal.crm_deal_id == crm_deal_id,
-                )
-            )
-        )
-        existing = result.scalar_one_or_none()
+    def _deal_row(self, deal_data: dict[str, Any]) -> dict[str, Any]:
+        """Parse a Zoho deal into a crm_deals row for CRMBulkWriter."""
+        crm_deal_id = str(deal_data.get("id"))
 
         # Parse amount
         amount = None
@@ -601,6 +577,7 @@ class ZohoSyncService:
             pipeline_id = str(pipeline)
 
         deal_fields = {
+            "crm_deal_id": crm_deal_id,
             "crm_pipeline_id": pipeline_id,
             "crm_owner_id": owner_id,
             "deal_name": deal_data.get("Deal_Name"),
@@ -624,91 +601,43 @@ class ZohoSyncService:
                 tzinfo=UTC,
             )
 
-        if existing:
-            # Update existing deal
-            for key, value in deal_fields.items():
-                if value is not None:
-                    setattr(existing, key, value)
-            existing.updated_at = datetime.now(UTC)
-            return False, True
-        else:
-            # Create new deal
-            deal = CRMDeal(
-                tenant_id=self.tenant_id,
-                connection_id=connection_id,
-                crm_deal_id=crm_deal_id,
-                **deal_fields,
-            )
-            self.db.add(deal)
-            return True, False
+        return deal_fields
 
     async def _associate_deals_with_contacts(self, connection_id: UUID) -> None:
         """Associate deals with their contacts via Zoho API."""
         # Get all deals without contacts
         result = await self.db.execute(
-            select(CRMDeal).where(
+            select(CRMDeal.crm_deal_id).where(
                 and_(
                     CRMDeal.connection_id == connection_id,
                     CRMDeal.contact_id.is_(None),
                 )
             )
         )
-        deals_without_contacts = result.scalars().all()
+        deal_ids = result.scalars().all()
 
+        # Collect each deal's first associated contact, then link them all
+        # in one joined UPDATE
+        links = {}
         async with self.client:
-            for deal in deals_without_contacts:
+            for deal_id in deal_ids:
                 try:
                     # Get deal contacts from Zoho
-                    contacts_response = await self.client.get_deal_contacts(
-                        deal.crm_deal_id,
-                    )
+                    contacts_response = await self.client.get_deal_contacts(deal_id)
 
                     if contacts_response and contacts_response.get("data"):
-                        # Get first associated contact
                         contact_data = contacts_response["data"][0]
-                        zoho_contact_id = str(contact_data.get("id"))
-
-                        # Find contact in our database
-                        contact_result = await self.db.execute(
-                            select(CRMContact).where(
-                                and_(
-                                    CRMContact.connection_id == connection_id,
-                                    CRMContact.crm_contact_id == zoho_contact_id,
-                                )
-                            )
-                        )
-                        contact = contact_result.scalar_one_or_none()
-
-                        if contact:
-                            deal.contact_id = contact.id
-
-                            # Copy attribution from contact if available
-                            if contact.last_touch_campaign_id:
-                                deal.attributed_campaign_id = (
-                                    contact.last_touch_campaign_id
-                                )
-                            if contact.utm_source:
-                                # Map utm_source to platform
-                                platform_map = {
-                                    "facebook": "meta",
-                                    "fb": "meta",
-                                    "meta": "meta",
-                                    "google": "google",
-                                    "tiktok": "tiktok",
-                                    "snapchat": "snapchat",
-                                }
-                                deal.attributed_platform = platform_map.get(
-                                    contact.utm_source.lower(),
-                                    contact.utm_source,
-                                )
+                        links[deal_id] = str(contact_data.get("id"))
 
                 except (ValueError, TypeError, KeyError) as e:
                     logger.warning(
                         "zoho_deal_association_failed",
-                        deal_id=deal.crm_deal_id,
+                        deal_id=deal_id,
                         error=str(e),
                     )
 
+        writer = CRMBulkWriter(self.db, self.tenant_id, connection_id)
+        await writer.link_deals_to_contacts(links)
         await self.db.commit()
 
     async def _get_connection(self) -> Optional[CRMConnection]:
@@ -32,6 +32,13 @@ from app.models.crm import (
     CRMProvider,
     Touchpoint,
 )
+from app.services.crm.writeback_scheduler import (
+    CONTACT,
+    DEAL,
+    WritebackScheduler,
+    ZohoTarget,
+    request_budget,
+)
 from app.services.crm.zoho_client import ZohoClient
 
 logger = get_logger(__name__)
@@ -365,7 +372,7 @@ class ZohoWritebackService:
         # Build query for contacts to sync
         conditions = [
             CRMContact.tenant_id == self.tenant_id,
-            CRMContact.crm_contact_id.isnot(None),
+            CRMContact.connection_id.in_(self._connection_ids()),
         ]
 
         if contact_id:
@@ -387,66 +394,66 @@ class ZohoWritebackService:
                 "failed": 0,
             }
 
-        # Build update payloads
-        updates = []
-        for contact in contacts:
-            # Skip lead-prefixed contacts (leads have different module)
-            if contact.crm_contact_id.startswith("lead_"):
-                continue
-
-            # Get attribution data
-            attribution = await self._get_contact_attribution(contact.id)
-
-            if attribution:
-                update_data = {
-                    "id": contact.crm_contact_id,
-                    "Stratum_Ad_Platform": attribution.get("platform"),
-                    "Stratum_Campaign_ID": attribution.get("campaign_id"),
-                    "Stratum_Campaign_Name": attribution.get("campaign_name"),
-                    "Stratum_Adset_ID": attribution.get("adset_id"),
-                    "Stratum_Ad_ID": attribution.get("ad_id"),
-                    "Stratum_First_Touch_Source": attribution.get("first_touch_source"),
-                    "Stratum_Last_Touch_Source": attribution.get("last_touch_source"),
-                    "Stratum_Attribution_Confidence": attribution.get("confidence"),
-                    "Stratum_Total_Ad_Spend": attribution.get("total_spend"),
-                    "Stratum_Touchpoints_Count": attribution.get("touchpoints_count"),
-                    "Stratum_Last_Sync": datetime.now(UTC).strftime(
-                        "%Y-%m-%dT%H:%M:%S+00:00"
-                    ),
-                }
-
-                # Remove None values
-                update_data = {k: v for k, v in update_data.items() if v is not None}
-                updates.append(update_data)
+        async with ZohoClient(self.db, self.tenant_id, self.region) as client:
+            scheduler = self._scheduler(client)
+
+            for contact in contacts:
+                # Skip lead-prefixed contacts (leads have different module)
+                if contact.crm_contact_id.startswith("lead_"):
+                    continue
+
+                # Get attribution data
+                attribution = await self._get_contact_attribution(contact.id)
+
+                if attribution:
+                    scheduler.enqueue(
+                        CONTACT,
+                        contact.crm_contact_id,
+                        {
+                            "Stratum_Ad_Platform": attribution.get("platform"),
+                            "Stratum_Campaign_ID": attribution.get("campaign_id"),
+                            "Stratum_Campaign_Name": attribution.get("campaign_name"),
+                            "Stratum_Adset_ID": attribution.get("adset_id"),
+                            "Stratum_Ad_ID": attribution.get("ad_id"),
+                            "Stratum_First_Touch_Source": attribution.get(
+                                "first_touch_source"
+                            ),
+                            "Stratum_Last_Touch_Source": attribution.get(
+                                "last_touch_source"
+                            ),
+                            "Stratum_Attribution_Confidence": attribution.get(
+                                "confidence"
+                            ),
+                            "Stratum_Total_Ad_Spend": attribution.get("total_spend"),
+                            "Stratum_Touchpoints_Count": attribution.get(
+                                "touchpoints_count"
+                            ),
+                        },
+                        record=contact,
+                    )
 
-        if not updates:
-            return {
-                "status": "success",
-                "message": "No attribution data to sync",
-                "synced": 0,
-                "failed": 0,
-            }
+            if not scheduler.pending:
+                return {
+                    "status": "success",
+                    "message": "No attribution data to sync",
+                    "synced": 0,
+                    "failed": 0,
+                }
 
-        # Batch update in Zoho
-        async with ZohoClient(self.db, self.tenant_id, self.region) as client:
-            response = await client.batch_update_contacts(updates)
+            # Changed contacts only, in batches of 100
+            flushed = await scheduler.flush()
 
-        synced = len(response.get("data", [])) if response else 0
-        failed = len(response.get("errors", [])) if response else len(updates)
+        await self.db.commit()
 
         logger.info(
             "zoho_contact_writeback_complete",
             tenant_id=self.tenant_id,
-            synced=synced,
-            failed=failed,
+            synced=flushed.synced,
+            failed=flushed.failed,
+            unchanged=flushed.unchanged,
         )
 
-        return {
-            "status": "completed" if failed == 0 else "partial",
-            "synced": synced,
-            "failed": failed,
-            "errors": response.get("errors", []) if response else [],
-        }
+        return flushed.to_dict()
 
     async def sync_deal_attribution(
         self,
@@ -468,7 +475,7 @@ class ZohoWritebackService:
         # Build query for deals to sync
         conditions = [
             CRMDeal.tenant_id == self.tenant_id,
-            CRMDeal.crm_deal_id.isnot(None),
+            CRMDeal.connection_id.in_(self._connection_ids()),
         ]
 
         if deal_id:
@@ -490,63 +497,72 @@ class ZohoWritebackService:
                 "failed": 0,
             }
 
-        # Build update payloads
-        updates = []
-        for deal in deals:
-            # Get attribution data
-            attribution = await self._get_deal_attribution(deal.id)
-
-            update_data = {
-                "id": deal.crm_deal_id,
-                "Stratum_Attributed_Platform": attribution.get("platform"),
-                "Stratum_Attributed_Campaign": attribution.get("campaign_name"),
-                "Stratum_Attributed_Campaign_ID": attribution.get("campaign_id"),
-                "Stratum_Attribution_Model": attribution.get("attribution_model"),
-                "Stratum_Attributed_Spend": attribution.get("attributed_spend"),
-                "Stratum_Revenue_ROAS": attribution.get("revenue_roas"),
-                "Stratum_Profit_ROAS": attribution.get("profit_roas"),
-                "Stratum_COGS": attribution.get("cogs"),
-                "Stratum_Gross_Profit": attribution.get("gross_profit"),
-                "Stratum_Net_Profit": attribution.get("net_profit"),
-                "Stratum_Days_to_Close": attribution.get("days_to_close"),
-                "Stratum_Touchpoints_Count": attribution.get("touchpoints_count"),
-                "Stratum_Last_Sync": datetime.now(UTC).strftime(
-                    "%Y-%m-%dT%H:%M:%S+00:00"
-                ),
-            }
-
-            # Remove None values
-            update_data = {k: v for k, v in update_data.items() if v is not None}
-            updates.append(update_data)
-
-        if not updates:
-            return {
-                "status": "success",
-                "message": "No attribution data to sync",
-                "synced": 0,
-                "failed": 0,
-            }
-
-        # Batch update in Zoho
         async with ZohoClient(self.db, self.tenant_id, self.region) as client:
-            response = await client.batch_update_deals(updates)
+            scheduler = self._scheduler(client)
+
+            for deal in deals:
+                # Get attribution data
+                attribution = await self._get_deal_attribution(deal.id)
+
+                scheduler.enqueue(
+                    DEAL,
+                    deal.crm_deal_id,
+                    {
+                        "Stratum_Attributed_Platform": attribution.get("platform"),
+                        "Stratum_Attributed_Campaign": attribution.get("campaign_name"),
+                        "Stratum_Attributed_Campaign_ID": attribution.get(
+                            "campaign_id"
+                        ),
+                        "Stratum_Attribution_Model": attribution.get(
+                            "attribution_model"
+                        ),
+                        "Stratum_Attributed_Spend": attribution.get("attributed_spend"),
+                        "Stratum_Revenue_ROAS": attribution.get("revenue_roas"),
+                        "Stratum_Profit_ROAS": attribution.get("profit_roas"),
+                        "Stratum_COGS": attribution.get("cogs"),
+                        "Stratum_Gross_Profit": attribution.get("gross_profit"),
+                        "Stratum_Net_Profit": attribution.get("net_profit"),
+                        "Stratum_Days_to_Close": attribution.get("days_to_close"),
+                        "Stratum_Touchpoints_Count": attribution.get(
+                            "touchpoints_count"
+                        ),
+                    },
+                    record=deal,
+                )
+
+            # Changed deals only, in batches of 100
+            flushed = await scheduler.flush()
 
-        synced = len(response.get("data", [])) if response else 0
-        failed = len(response.get("errors", [])) if response else len(updates)
+        await self.db.commit()
 
         logger.info(
             "zoho_deal_writeback_complete",
             tenant_id=self.tenant_id,
-            synced=synced,
-            failed=failed,
+            synced=flushed.synced,
+            failed=flushed.failed,
+            unchanged=flushed.unchanged,
         )
 
-        return {
-            "status": "completed" if failed == 0 else "partial",
-            "synced": synced,
-            "failed": failed,
-            "errors": response.get("errors", []) if response else [],
-        }
+        return flushed.to_dict()
+
+    def _connection_ids(self):
+        """Subquery of the tenant's Zoho connection ids."""
+        return select(CRMConnection.id).where(
+            CRMConnection.tenant_id == self.tenant_id,
+            CRMConnection.provider == CRMProvider.ZOHO,
+        )
+
+    def _scheduler(self, client: ZohoClient) -> WritebackScheduler:
+        """Writeback scheduler for this tenant's Zoho account."""
+        return WritebackScheduler(
+            ZohoTarget(client),
+            request_budget(CRMProvider.ZOHO, self.tenant_id),
+            stamp={
+                "Stratum_Last_Sync": datetime.now(UTC).strftime(
+                    "%Y-%m-%dT%H:%M:%S+00:00"
+                )
+            },
+        )
 
     async def full_sync(
         self,
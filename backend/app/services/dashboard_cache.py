@@ -0,0 +1,188 @@
+# =============================================================================
+# Stratum AI - Dashboard Insight Result Cache
+# =============================================================================
+"""
+Stale-while-revalidate cache for heavy dashboard insight endpoints.
+
+Morning briefing, signal recovery, predictive budget, AI report, churn
+prevention and the cross-platform optimizer rebuild their whole response
+from several queries on every request. Results are cached per process,
+keyed on endpoint, tenant and parameters, and stamped with the tenant's
+data version:
+
+- The data version is read from the database (latest campaign and daily
+  rollup write), so it advances as soon as a sync or ingestion commits and
+  every API worker sees the same stamp without extra bookkeeping.
+- A cached result is returned immediately. When it is older than the fresh
+  window or its version no longer matches, one background refresh is
+  started; concurrent requests for the same key share it (single-flight).
+- Past ``max_stale_seconds`` a result is not served; the request waits for
+  the (still single-flight) recompute instead.
+
+Computations run in their own session so a background refresh outlives
+the request that triggered it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.base_models import Campaign, TenantDailyRollup
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.db.session import async_session_context
+
+logger = get_logger(__name__)
+
+Compute = Callable[[int, AsyncSession], Awaitable[Any]]
+
+
+async def data_version(db: AsyncSession, tenant_id: int) -> str:
+    """
+    Stamp that changes whenever a tenant's campaign or metric data changes.
+
+    One round trip of three indexed aggregates; the rollup row count catches
+    refreshes that only delete days.
+    """
+
+    def scalar(column, model):
+        return select(column).where(model.tenant_id == tenant_id).scalar_subquery()
+
+    row = (
+        await db.execute(
+            select(
+                scalar(func.max(Campaign.updated_at), Campaign),
+                scalar(func.max(TenantDailyRollup.updated_at), TenantDailyRollup),
+                scalar(func.count(TenantDailyRollup.id), TenantDailyRollup),
+            )
+        )
+    ).one()
+    return "|".join(str(value) for value in row)
+
+
+@dataclass
+class _Entry:
+    value: Any
+    version: str
+    stored_at: float
+
+
+class InsightsCache:
+    """Per-process SWR cache with single-flight recomputes."""
+
+    def __init__(
+        self,
+        fresh_seconds: float = 300.0,
+        max_stale_seconds: float = 3600.0,
+        max_entries: int = 2048,
+        session_factory: Callable[[], Any] = async_session_context,
+        version_fn: Callable[[AsyncSession, int], Awaitable[str]] = data_version,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.fresh_seconds = fresh_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self.max_entries = max_entries
+        self._session_factory = session_factory
+        self._version_fn = version_fn
+        self._clock = clock
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Task] = {}
+
+    async def get_or_compute(
+        self,
+        name: str,
+        tenant_id: int,
+        db: AsyncSession,
+        compute: Compute,
+        *params: Hashable,
+    ) -> Any:
+        """
+        Return the cached result of ``compute(tenant_id, session)``.
+
+        ``db`` (the request session) is only used to read the data version.
+        ``params`` become part of the key, e.g. a query parameter or the
+        current day for day-dependent results.
+        """
+        key = (name, tenant_id, *params)
+        version = await self._version_fn(db, tenant_id)
+        entry = self._entries.get(key)
+        now = self._clock()
+
+        if entry is not None and now - entry.stored_at <= self.max_stale_seconds:
+            self._entries.move_to_end(key)
+            if entry.version != version or now - entry.stored_at > self.fresh_seconds:
+                self._start(key, tenant_id, version, compute)
+            return entry.value
+
+        # Shielded so one cancelled request does not abort the recompute
+        # other requests for the same key are waiting on.
+        return await asyncio.shield(self._start(key, tenant_id, version, compute))
+
+    def invalidate(self, tenant_id: Optional[int] = None) -> None:
+        """Drop cached results for one tenant, or all of them."""
+        if tenant_id is None:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if k[1] == tenant_id]:
+            del self._entries[key]
+
+    def _start(
+        self, key: tuple, tenant_id: int, version: str, compute: Compute
+    ) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh(key, tenant_id, version, compute))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, key=key: self._finished(key, t))
+        return task
+
+    async def _refresh(
+        self, key: tuple, tenant_id: int, version: str, compute: Compute
+    ) -> Any:
+        async with self._session_factory() as session:
+            value = await compute(tenant_id, session)
+        # Stamped with the version read *before* computing: if data changed
+        # meanwhile, the next request sees a mismatch and refreshes again.
+        self._entries[key] = _Entry(value, version, self._clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def _finished(self, key: tuple, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(
+                "dashboard_insight_refresh_failed",
+                insight=key[0],
+                tenant_id=key[1],
+                error=str(task.exception()),
+            )
+
+
+insights_cache = InsightsCache(
+    fresh_seconds=settings.dashboard_insights_cache_fresh_seconds,
+    max_stale_seconds=settings.dashboard_insights_cache_max_stale_seconds,
+    max_entries=settings.dashboard_insights_cache_max_entries,
+)
+
+
+async def cached_insight(
+    name: str,
+    tenant_id: int,
+    db: AsyncSession,
+    compute: Compute,
+    *params: Hashable,
+) -> Any:
+    """Serve ``compute`` through ``insights_cache`` unless caching is disabled."""
+    if not settings.dashboard_insights_cache_enabled:
+        return await compute(tenant_id, db)
+    return await insights_cache.get_or_compute(name, tenant_id, db, compute, *params)
@@ -0,0 +1,423 @@
+# =============================================================================
+# Stratum AI - Streaming Dashboard Export
+# =============================================================================
+"""
+Row-at-a-time dashboard export (CSV, JSON, XLSX).
+
+``export_rows`` walks the export sections in a fixed order (metrics
+summary, campaigns, recommendations) and yields one row at a time.
+Campaigns are read in keyset pages of ``page_size`` ordered by id, and
+each page's period metrics are aggregated for just those campaign ids, so
+memory is bounded by one page whatever the tenant's size. Keyset pages
+(short statements) are used instead of a server-side cursor, which would
+pin a pooled connection and an open transaction for the whole download.
+
+Because each campaign and recommendation row carries its campaign id and
+rows come in id order, a download that broke off can be resumed: pass
+the section it was in and the last id received, and the export starts
+right after it.
+
+The ``stream_*`` encoders turn those rows into bytes and flush after
+every page, so the first bytes leave before the next query runs.
+"""
+
+import csv
+import json
+from collections.abc import AsyncIterator, Callable, Sequence
+from datetime import UTC, date, datetime
+from io import StringIO
+from typing import Any, Optional, Union
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.base_models import Campaign, CampaignMetric
+from app.db.session import async_session_context
+from app.services import dashboard_rollups
+from app.services.reporting.xlsx_stream import XlsxStreamWriter
+
+SECTIONS = ("metrics", "campaigns", "recommendations")
+
+EXPORT_PAGE_SIZE = 500
+
+CSV_TITLES = {
+    "metrics": "=== METRICS SUMMARY ===",
+    "campaigns": "=== CAMPAIGNS ===",
+    "recommendations": "=== RECOMMENDATIONS ===",
+}
+
+# (header, row key) per section, in output column order
+COLUMNS = {
+    "metrics": [("Metric", "metric"), ("Value", "value")],
+    "campaigns": [
+        ("ID", "id"),
+        ("Name", "name"),
+        ("Platform", "platform"),
+        ("Status", "status"),
+        ("Spend", "spend"),
+        ("Revenue", "revenue"),
+        ("ROAS", "roas"),
+        ("Conversions", "conversions"),
+        ("Impressions", "impressions"),
+        ("Clicks", "clicks"),
+    ],
+    "recommendations": [
+        ("Campaign ID", "campaign_id"),
+        ("Campaign", "campaign"),
+        ("Type", "type"),
+        ("Description", "description"),
+    ],
+}
+
+# Yielded by export_rows between pages: encoders flush what they hold
+PAGE_END = None
+
+ExportEvent = Optional[tuple[str, dict[str, Any]]]
+
+
+# =============================================================================
+# Rows
+# =============================================================================
+
+
+def included_sections(
+    sections: Sequence[str], resume_section: Optional[str] = None
+) -> list[str]:
+    """Requested sections in export order, from ``resume_section`` on."""
+    first = SECTIONS.index(resume_section) if resume_section else 0
+    return [s for s in SECTIONS if s in sections and SECTIONS.index(s) >= first]
+
+
+def _metrics_summary(totals: dict[str, int]) -> dict[str, Union[int, float]]:
+    # Convert cents to dollars at the end to avoid floating point accumulation
+    spend = totals["spend_cents"] / 100
+    revenue = totals["revenue_cents"] / 100
+    conversions = totals["conversions"]
+    impressions = totals["impressions"]
+    clicks = totals["clicks"]
+    return {
+        "total_spend": round(spend, 2),
+        "total_revenue": round(revenue, 2),
+        "roas": round(revenue / spend, 2) if spend > 0 else 0,
+        "conversions": conversions,
+        "cpa": round(spend / conversions, 2) if conversions > 0 else 0,
+        "impressions": impressions,
+        "clicks": clicks,
+        "ctr": round(clicks / impressions * 100, 2) if impressions > 0 else 0,
+    }
+
+
+async def _campaign_pages(
+    db: AsyncSession,
+    tenant_id: int,
+    after_id: int,
+    page_size: int,
+    *conditions,
+) -> AsyncIterator[list]:
+    """Live campaigns in id order, one keyset page at a time."""
+    while True:
+        result = await db.execute(
+            select(
+                Campaign.id,
+                Campaign.name,
+                Campaign.platform,
+                Campaign.status,
+                Campaign.total_spend_cents,
+                Campaign.revenue_cents,
+            )
+            .where(
+                Campaign.tenant_id == tenant_id,
+                Campaign.is_deleted == False,
+                Campaign.id > after_id,
+                *conditions,
+            )
+            .order_by(Campaign.id)
+            .limit(page_size)
+        )
+        page = result.all()
+        if not page:
+            return
+        yield page
+        if len(page) < page_size:
+            return
+        after_id = page[-1].id
+
+
+async def _period_metrics(
+    db: AsyncSession,
+    tenant_id: int,
+    campaign_ids: Sequence[int],
+    start: date,
+    end: date,
+) -> dict[int, Any]:
+    result = await db.execute(
+        select(
+            CampaignMetric.campaign_id,
+            func.sum(CampaignMetric.spend_cents).label("spend_cents"),
+            func.sum(CampaignMetric.revenue_cents).label("revenue_cents"),
+            func.sum(CampaignMetric.conversions).label("conversions"),
+            func.sum(CampaignMetric.impressions).label("impressions"),
+            func.sum(CampaignMetric.clicks).label("clicks"),
+        )
+        .where(
+            CampaignMetric.tenant_id == tenant_id,
+            CampaignMetric.campaign_id.in_(campaign_ids),
+            CampaignMetric.date >= start,
+            CampaignMetric.date <= end,
+        )
+        .group_by(CampaignMetric.campaign_id)
+    )
+    return {row.campaign_id: row for row in result.all()}
+
+
+def _campaign_row(campaign: Any, metrics: Any) -> dict[str, Any]:
+    spend = (metrics.spend_cents or 0) / 100 if metrics else 0.0
+    revenue = (metrics.revenue_cents or 0) / 100 if metrics else 0.0
+    return {
+        "id": campaign.id,
+        "name": campaign.name,
+        "platform": campaign.platform.value,
+        "status": campaign.status.value,
+        "spend": round(spend, 2),
+        "revenue": round(revenue, 2),
+        "conversions": (metrics.conversions or 0) if metrics else 0,
+        "impressions": (metrics.impressions or 0) if metrics else 0,
+        "clicks": (metrics.clicks or 0) if metrics else 0,
+        "roas": round(revenue / spend, 2) if spend > 0 else 0,
+    }
+
+
+def _recommendation_row(campaign: Any) -> Optional[dict[str, Any]]:
+    spend = (campaign.total_spend_cents or 0) / 100
+    revenue = (campaign.revenue_cents or 0) / 100
+    roas = revenue / spend if spend > 0 else 0
+    if roas >= 3:
+        kind, description = "scale", f"Scale budget by 20-30% - ROAS {roas:.2f}x"
+    elif roas < 1 and spend > 0:
+        kind = "fix"
+        description = f"Review targeting - ROAS {roas:.2f}x below breakeven"
+    else:
+        return None
+    return {
+        "campaign_id": campaign.id,
+        "campaign": campaign.name,
+        "type": kind,
+        "description": description,
+    }
+
+
+async def export_rows(
+    db: AsyncSession,
+    tenant_id: int,
+    start: date,
+    end: date,
+    sections: Sequence[str] = SECTIONS,
+    resume_section: Optional[str] = None,
+    resume_after_id: int = 0,
+    page_size: int = EXPORT_PAGE_SIZE,
+) -> AsyncIterator[ExportEvent]:
+    """
+    Yield ``(section, row)`` for every export row, and ``PAGE_END``
+    after each query's worth of rows.
+
+    With ``resume_section``, sections before it are skipped and that
+    section starts after campaign id ``resume_after_id``.
+    """
+    for section in included_sections(sections, resume_section):
+        after_id = resume_after_id if section == resume_section else 0
+
+        if section == "metrics":
+            totals = await dashboard_rollups.period_totals(
+                db, tenant_id, {"period": (start, end)}
+            )
+            for metric, value in _metrics_summary(totals["period"]).items():
+                yield section, {"metric": metric, "value": value}
+            yield PAGE_END
+
+        elif section == "campaigns":
+            async for page in _campaign_pages(db, tenant_id, after_id, page_size):
+                metrics = await _period_metrics(
+                    db, tenant_id, [c.id for c in page], start, end
+                )
+                for campaign in page:
+                    yield section, _campaign_row(campaign, metrics.get(campaign.id))
+                yield PAGE_END
+
+        elif section == "recommendations":
+            # Only campaigns that can produce a recommendation are fetched
+            spend = func.coalesce(Campaign.total_spend_cents, 0)
+            revenue = func.coalesce(Campaign.revenue_cents, 0)
+            actionable = and_(spend > 0, or_(revenue >= spend * 3, revenue < spend))
+            async for page in _campaign_pages(
+                db, tenant_id, after_id, page_size, actionable
+            ):
+                for campaign in page:
+                    row = _recommendation_row(campaign)
+                    if row is not None:
+                        yield section, row
+                yield PAGE_END
+
+
+# =============================================================================
+# Encoders
+# =============================================================================
+
+
+def _csv_value(section: str, key: str, value: Any) -> Any:
+    if section == "campaigns" and key in ("spend", "revenue"):
+        return f"${value:.2f}"
+    if section == "campaigns" and key == "roas":
+        return f"{value:.2f}x"
+    if section == "metrics" and isinstance(value, float):
+        return f"{value:.2f}"
+    return value
+
+
+async def stream_csv(rows: AsyncIterator[ExportEvent]) -> AsyncIterator[bytes]:
+    """CSV with one titled block per non-empty section."""
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    current = None
+    async for event in rows:
+        if event is not PAGE_END:
+            section, row = event
+            if section != current:
+                if current is not None:
+                    writer.writerow([])
+                current = section
+                writer.writerow([CSV_TITLES[section]])
+                writer.writerow([header for header, _ in COLUMNS[section]])
+            writer.writerow(
+                [_csv_value(section, key, row[key]) for _, key in COLUMNS[section]]
+            )
+        elif buffer.tell():
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _json_open(section: str) -> str:
+    return f", {json.dumps(section)}: " + ("{" if section == "metrics" else "[")
+
+
+def _json_close(section: str) -> str:
+    return "}" if section == "metrics" else "]"
+
+
+def _json_item(section: str, row: dict[str, Any]) -> str:
+    if section == "metrics":
+        return f"{json.dumps(row['metric'])}: {json.dumps(row['value'])}"
+    return json.dumps(row, default=str)
+
+
+async def stream_json(
+    rows: AsyncIterator[ExportEvent],
+    preamble: dict[str, Any],
+    sections: Sequence[str],
+) -> AsyncIterator[bytes]:
+    """
+    One JSON object: ``preamble`` keys, then a key per section.
+
+    ``metrics`` is an object and the other sections are arrays, as in the
+    buffered export; ``sections`` without rows still get an empty value.
+    """
+    yield json.dumps(preamble, default=str)[:-1].encode()
+    pending: list[str] = []
+    remaining = list(sections)
+    current = None
+    async for event in rows:
+        if event is not PAGE_END:
+            section, row = event
+            if section != current:
+                if current is not None:
+                    pending.append(_json_close(current))
+                while remaining[0] != section:
+                    empty = remaining.pop(0)
+                    pending.append(_json_open(empty) + _json_close(empty))
+                current = remaining.pop(0)
+                pending.append(_json_open(current))
+            else:
+                pending.append(", ")
+            pending.append(_json_item(section, row))
+        elif pending:
+            yield "".join(pending).encode()
+            pending.clear()
+    if current is not None:
+        pending.append(_json_close(current))
+    for empty in remaining:
+        pending.append(_json_open(empty) + _json_close(empty))
+    pending.append("}")
+    yield "".join(pending).encode()
+
+
+async def stream_xlsx(rows: AsyncIterator[ExportEvent]) -> AsyncIterator[bytes]:
+    """Workbook with one sheet per non-empty section."""
+    writer = XlsxStreamWriter()
+    chunks: list[bytes] = []
+    current = None
+    async for event in rows:
+        if event is not PAGE_END:
+            section, row = event
+            if section != current:
+                current = section
+                chunks.append(writer.start_sheet(section.title()))
+                chunks.append(writer.write_row(h for h, _ in COLUMNS[section]))
+            chunks.append(writer.write_row(row[key] for _, key in COLUMNS[section]))
+        else:
+            data = b"".join(chunks)
+            chunks.clear()
+            if data:
+                yield data
+    chunks.append(writer.close())
+    yield b"".join(chunks)
+
+
+async def stream_export(
+    fmt: str,
+    tenant_id: int,
+    start: date,
+    end: date,
+    period: str,
+    sections: Sequence[str] = SECTIONS,
+    resume_section: Optional[str] = None,
+    resume_after_id: int = 0,
+    session_factory: Callable[[], Any] = async_session_context,
+) -> AsyncIterator[bytes]:
+    """
+    Encoded export body for a ``StreamingResponse``.
+
+    Runs in its own session: the response body is produced after the
+    request handler (and its session) has returned.
+    """
+    async with session_factory() as db:
+        rows = export_rows(
+            db,
+            tenant_id,
+            start,
+            end,
+            sections,
+            resume_section=resume_section,
+            resume_after_id=resume_after_id,
+        )
+        if fmt == "json":
+            preamble = {
+                "export_date": datetime.now(UTC).isoformat(),
+                "period": period,
+                "date_range": {"start": start.isoformat(), "end": end.isoformat()},
+            }
+            if resume_section is not None:
+                preamble["resumed_after"] = {
+                    "section": resume_section,
+                    "campaign_id": resume_after_id,
+                }
+            encoded = stream_json(
+                rows, preamble, included_sections(sections, resume_section)
+            )
+        elif fmt == "xlsx":
+            encoded = stream_xlsx(rows)
+        else:
+            encoded = stream_csv(rows)
+        async for chunk in encoded:
+            yield chunk
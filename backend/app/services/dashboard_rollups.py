@@ -0,0 +1,228 @@
+# =============================================================================
+# Stratum AI - Dashboard Daily Rollups
+# =============================================================================
+"""
+Maintenance and reads for ``tenant_daily_rollups``.
+
+The dashboard overview, platform breakdown and trends endpoints used to sum
+``campaign_metrics`` (one row per campaign per day) on every request, so
+their cost grew with campaign count and history. The rollup keeps one row
+per tenant, day and platform:
+
+- Writers (platform sync, the mock sync task, demo seeding, CSV loads)
+  call ``refresh_daily_rollups`` with the days they touched. The rows for
+  those days are recomputed from ``campaign_metrics`` in the same
+  transaction as the metric writes, so a refresh is idempotent and never
+  drifts the way delta increments can.
+- Readers aggregate at most ``days x platforms`` rows.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import date
+from typing import Any, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.base_models import AdPlatform, Campaign, CampaignMetric, TenantDailyRollup
+
+METRIC_COLUMNS = (
+    "spend_cents",
+    "revenue_cents",
+    "impressions",
+    "clicks",
+    "conversions",
+)
+
+
+def _insert_for(dialect_name: str):
+    """Dialect ``insert`` that supports ON CONFLICT (PostgreSQL, SQLite)."""
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert
+
+
+def refresh_statements(
+    dialect_name: str,
+    tenant_id: int,
+    dates: Optional[Iterable[date]] = None,
+    platform: Optional[AdPlatform] = None,
+) -> list:
+    """
+    Statements that recompute a tenant's rollup rows for ``dates``.
+
+    ``dates=None`` rebuilds every day. Rows whose source metrics are gone
+    are deleted first; the upsert then rewrites the rest, so two workers
+    refreshing the same day serialize on the unique key instead of failing.
+    """
+    day_list = sorted(set(dates)) if dates is not None else None
+
+    stale = delete(TenantDailyRollup).where(TenantDailyRollup.tenant_id == tenant_id)
+    if day_list is not None:
+        stale = stale.where(TenantDailyRollup.date.in_(day_list))
+    if platform is not None:
+        stale = stale.where(TenantDailyRollup.platform == platform)
+
+    source = (
+        select(
+            CampaignMetric.tenant_id,
+            CampaignMetric.date,
+            Campaign.platform,
+            *(
+                func.coalesce(func.sum(getattr(CampaignMetric, col)), 0)
+                for col in METRIC_COLUMNS
+            ),
+            func.count(CampaignMetric.id),
+            func.now(),
+        )
+        .join(Campaign, Campaign.id == CampaignMetric.campaign_id)
+        .where(CampaignMetric.tenant_id == tenant_id)
+        .group_by(CampaignMetric.tenant_id, CampaignMetric.date, Campaign.platform)
+    )
+    if day_list is not None:
+        source = source.where(CampaignMetric.date.in_(day_list))
+    if platform is not None:
+        source = source.where(Campaign.platform == platform)
+
+    insert = _insert_for(dialect_name)
+    columns = [
+        "tenant_id",
+        "date",
+        "platform",
+        *METRIC_COLUMNS,
+        "campaigns_with_metrics",
+        "updated_at",
+    ]
+    upsert = insert(TenantDailyRollup).from_select(columns, source)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=["tenant_id", "date", "platform"],
+        set_={
+            col: getattr(upsert.excluded, col)
+            for col in (*METRIC_COLUMNS, "campaigns_with_metrics", "updated_at")
+        },
+    )
+    return [stale, upsert]
+
+
+async def refresh_daily_rollups(
+    db: AsyncSession,
+    tenant_id: int,
+    dates: Optional[Iterable[date]] = None,
+    platform: Optional[AdPlatform] = None,
+) -> None:
+    """Recompute rollups for ``dates`` in the caller's transaction (async)."""
+    if dates is not None:
+        dates = list(dates)
+        if not dates:
+            return
+    for stmt in refresh_statements(
+        db.get_bind().dialect.name, tenant_id, dates, platform
+    ):
+        await db.execute(stmt)
+
+
+def refresh_daily_rollups_sync(
+    db: Session,
+    tenant_id: int,
+    dates: Optional[Iterable[date]] = None,
+    platform: Optional[AdPlatform] = None,
+) -> None:
+    """Recompute rollups for ``dates`` in the caller's transaction (sync)."""
+    if dates is not None:
+        dates = list(dates)
+        if not dates:
+            return
+    for stmt in refresh_statements(
+        db.get_bind().dialect.name, tenant_id, dates, platform
+    ):
+        db.execute(stmt)
+
+
+# =============================================================================
+# Reads
+# =============================================================================
+
+
+def _sums() -> list:
+    return [
+        func.coalesce(func.sum(getattr(TenantDailyRollup, col)), 0).label(col)
+        for col in METRIC_COLUMNS
+    ]
+
+
+def _totals(row: Any) -> dict[str, int]:
+    return {col: int(getattr(row, col) or 0) for col in METRIC_COLUMNS}
+
+
+def _empty_totals() -> dict[str, int]:
+    return dict.fromkeys(METRIC_COLUMNS, 0)
+
+
+async def period_totals(
+    db: AsyncSession,
+    tenant_id: int,
+    periods: dict[str, tuple[date, date]],
+) -> dict[str, dict[str, int]]:
+    """
+    Totals for several inclusive date ranges in one query.
+
+    Returns ``{name: {spend_cents, revenue_cents, impressions, clicks,
+    conversions}}`` with zeros for ranges without data. The query returns
+    one row per day of the combined span, bucketed here.
+    """
+    days = await daily_totals(
+        db,
+        tenant_id,
+        min(start for start, _ in periods.values()),
+        max(end for _, end in periods.values()),
+    )
+    totals = {name: _empty_totals() for name in periods}
+    for day, day_totals in days:
+        for name, (start, end) in periods.items():
+            if start <= day <= end:
+                bucket = totals[name]
+                for col in METRIC_COLUMNS:
+                    bucket[col] += day_totals[col]
+    return totals
+
+
+async def platform_totals(
+    db: AsyncSession,
+    tenant_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> dict[AdPlatform, dict[str, int]]:
+    """Per-platform totals, all-time unless ``start``/``end`` are given."""
+    query = select(TenantDailyRollup.platform, *_sums()).where(
+        TenantDailyRollup.tenant_id == tenant_id
+    )
+    if start is not None:
+        query = query.where(TenantDailyRollup.date >= start)
+    if end is not None:
+        query = query.where(TenantDailyRollup.date <= end)
+    result = await db.execute(query.group_by(TenantDailyRollup.platform))
+    return {row.platform: _totals(row) for row in result.all()}
+
+
+async def daily_totals(
+    db: AsyncSession,
+    tenant_id: int,
+    start: date,
+    end: Optional[date] = None,
+) -> list[tuple[date, dict[str, int]]]:
+    """Totals per day across platforms, oldest first."""
+    query = select(TenantDailyRollup.date, *_sums()).where(
+        TenantDailyRollup.tenant_id == tenant_id,
+        TenantDailyRollup.date >= start,
+    )
+    if end is not None:
+        query = query.where(TenantDailyRollup.date <= end)
+    result = await db.execute(
+        query.group_by(TenantDailyRollup.date).order_by(TenantDailyRollup.date)
+    )
+    return [(row.date, _totals(row)) for row in result.all()]
@@ -656,11 +656,40 @@ If you didn't expect this invitation, you can safely ignore this email.
         Returns:
             True if sent successfully, False otherwise.
         """
-        # Strip HTML tags for plain text fallback
-        import re
+        message = self.build_newsletter_message(
+            to_email,
+            subject,
+            html_content,
+            from_name=from_name,
+            from_email=from_email,
+            reply_to=reply_to,
+            unsubscribe_url=unsubscribe_url,
+        )
+        return self._send_email(to_email, message)
+
+    def build_newsletter_message(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        from_name: Optional[str] = None,
+        from_email: Optional[str] = None,
+        reply_to: Optional[str] = None,
+        unsubscribe_url: Optional[str] = None,
+        text_content: Optional[str] = None,
+    ) -> MIMEMultipart:
+        """
+        Build the MIME message for a newsletter email without sending it.
 
-        text_content = re.sub(r"<[^>]+>", "", html_content)
-        text_content = re.sub(r"\s+", " ", text_content).strip()
+        ``text_content`` defaults to the HTML with tags stripped; bulk
+        senders pass a pre-rendered one to skip the per-message regex.
+        """
+        if text_content is None:
+            # Strip HTML tags for plain text fallback
+            import re
+
+            text_content = re.sub(r"<[^>]+>", "", html_content)
+            text_content = re.sub(r"\s+", " ", text_content).strip()
 
         message = MIMEMultipart("alternative")
         message["Subject"] = subject
@@ -681,7 +710,7 @@ If you didn't expect this invitation, you can safely ignore this email.
         message.attach(MIMEText(text_content, "plain"))
         message.attach(MIMEText(html_content, "html"))
 
-        return self._send_email(to_email, message)
+        return message
 
 
 # Singleton instance
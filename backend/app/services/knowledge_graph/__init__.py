@@ -19,6 +19,7 @@ Usage:
     path = kg.trace_automation_decision(automation_id)
 """
 
+from .detection import ProblemDetector, problem_detector
 from .insights import (
     KnowledgeGraphInsightsEngine,
     Problem,
@@ -57,6 +58,7 @@ __all__ = [
     "KnowledgeGraphSyncService",
     "Problem",
     "ProblemCategory",
+    "ProblemDetector",
     "ProblemSeverity",
     "ProfileNode",
     "RevenueNode",
@@ -65,4 +67,5 @@ __all__ = [
     "Solution",
     "TouchpointNode",
     "TrustGateNode",
+    "problem_detector",
 ]
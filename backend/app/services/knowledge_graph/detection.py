@@ -0,0 +1,173 @@
+"""
+Knowledge Graph Problem Detection
+
+Runs the insights engine's detectors for one tenant and memoizes the result
+per graph version. The insights health summary, the problems list and a
+problem's detail page are usually requested together; they share one
+detection pass instead of each running every detector.
+
+- Detectors run concurrently, each on its own session: an AsyncSession
+  cannot run two statements at once, so sharing the request session would
+  serialize them again.
+- Lookups several detectors need (blocked automations, signal scores) are
+  read once per pass and shared across those sessions; see
+  ``KnowledgeGraphInsightsEngine._lookup``.
+- A result is reused while the graph version (``graph_version``) is
+  unchanged and it is younger than ``max_age_seconds``. The age bound also
+  moves the day-relative detection windows and problem IDs forward when
+  nothing is written. Concurrent requests for the same pass share it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import async_session_context
+
+from .insights import (
+    DETECTOR_ERRORS,
+    DETECTORS,
+    KnowledgeGraphInsightsEngine,
+    Problem,
+    health_summary,
+    sort_problems,
+)
+from .service import KnowledgeGraphService
+
+logger = logging.getLogger(__name__)
+
+
+async def graph_version(db: AsyncSession) -> str:
+    """The knowledge graph's current write stamp."""
+    return await KnowledgeGraphService(db).graph_version()
+
+
+@dataclass
+class _Entry:
+    problems: list[Problem]
+    version: str
+    stored_at: float
+
+
+class ProblemDetector:
+    """
+    Concurrent, memoized problem detection.
+
+    Usage:
+        problems = await problem_detector.detect(db, tenant_id, days=7)
+        summary = await problem_detector.health_summary(db, tenant_id)
+    """
+
+    def __init__(
+        self,
+        max_age_seconds: float = 300.0,
+        max_entries: int = 1024,
+        session_factory: Callable[[], Any] = async_session_context,
+        version_fn: Callable[[AsyncSession], Awaitable[str]] = graph_version,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_age_seconds = max_age_seconds
+        self.max_entries = max_entries
+        self._session_factory = session_factory
+        self._version_fn = version_fn
+        self._clock = clock
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Task] = {}
+
+    async def detect(
+        self, db: AsyncSession, tenant_id: int, days: int = 7
+    ) -> list[Problem]:
+        """
+        Problems for a tenant, sorted by severity (critical first).
+
+        ``db`` (the request session) is only used to read the graph version.
+        """
+        key = (tenant_id, days)
+        version = await self._version_fn(db)
+        entry = self._entries.get(key)
+        if (
+            entry is not None
+            and entry.version == version
+            and self._clock() - entry.stored_at <= self.max_age_seconds
+        ):
+            self._entries.move_to_end(key)
+            return list(entry.problems)
+
+        task = self._inflight.get((*key, version))
+        if task is None:
+            task = asyncio.create_task(self._refresh(key, version))
+            self._inflight[(*key, version)] = task
+            task.add_done_callback(
+                lambda t, k=(*key, version): self._inflight.pop(k, None)
+            )
+        # Shielded so one cancelled request does not abort the pass other
+        # requests for the same tenant are waiting on.
+        return list(await asyncio.shield(task))
+
+    async def health_summary(self, db: AsyncSession, tenant_id: int) -> dict[str, Any]:
+        """Health score and problem counts over the default lookback."""
+        return health_summary(await self.detect(db, tenant_id))
+
+    async def problem_details(
+        self, db: AsyncSession, tenant_id: int, problem_id: str
+    ) -> Optional[Problem]:
+        """One problem from the default lookback, or None if not detected."""
+        problems = await self.detect(db, tenant_id)
+        return next((p for p in problems if p.id == problem_id), None)
+
+    def invalidate(self, tenant_id: Optional[int] = None) -> None:
+        """Drop memoized results for one tenant, or all of them."""
+        if tenant_id is None:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if k[0] == tenant_id]:
+            del self._entries[key]
+
+    async def _refresh(self, key: tuple[int, int], version: str) -> list[Problem]:
+        problems = await self._run(*key)
+        # Stamped with the version read *before* detecting: if the graph
+        # changed meanwhile, the next request sees a mismatch and reruns.
+        self._entries[key] = _Entry(problems, version, self._clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return problems
+
+    async def _run(self, tenant_id: int, days: int) -> list[Problem]:
+        """Run every detector concurrently and collect what they found."""
+        lookups: dict = {}
+        results = await asyncio.gather(
+            *(self._run_detector(name, tenant_id, days, lookups) for name in DETECTORS),
+            return_exceptions=True,
+        )
+
+        problems: list[Problem] = []
+        for name, detected in zip(DETECTORS, results):
+            if isinstance(detected, DETECTOR_ERRORS):
+                logger.error(f"Problem detector {name} failed: {detected}")
+            elif isinstance(detected, BaseException):
+                raise detected
+            elif detected:
+                problems.extend(detected if isinstance(detected, list) else [detected])
+        return sort_problems(problems)
+
+    async def _run_detector(
+        self, name: str, tenant_id: int, days: int, lookups: dict
+    ) -> Any:
+        async with self._session_factory() as session:
+            engine = KnowledgeGraphInsightsEngine(session, lookups=lookups)
+            return await getattr(engine, name)(tenant_id, days)
+
+
+problem_detector = ProblemDetector(
+    max_age_seconds=settings.knowledge_graph_problems_cache_seconds
+)
@@ -9,7 +9,9 @@ This is the "why" engine - it explains what's happening and what to do about it.
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import Awaitable, Callable, Hashable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from enum import Enum
@@ -34,6 +36,21 @@ def _days_ago_iso(days: int) -> str:
     return (datetime.now(UTC) - timedelta(days=days)).isoformat()
 
 
+# Errors a detector is expected to raise on malformed graph data; any other
+# failure (a database error, say) propagates to the caller.
+DETECTOR_ERRORS = (ValueError, TypeError, KeyError, ZeroDivisionError, OSError)
+
+# Detection passes, in the order their problems are reported before sorting.
+DETECTORS = (
+    "_detect_revenue_decline",
+    "_detect_blocked_automations",
+    "_detect_signal_degradation",
+    "_detect_segment_issues",
+    "_detect_trust_gate_bottlenecks",
+    "_detect_channel_inefficiency",
+)
+
+
 class ProblemSeverity(str, Enum):
     """Severity levels for detected problems."""
 
@@ -118,6 +135,58 @@ class Problem:
         }
 
 
+_BLOCK_SUMS = ("action_count", "health_sum", "health_n")
+
+_SEVERITY_ORDER = {
+    ProblemSeverity.CRITICAL: 0,
+    ProblemSeverity.HIGH: 1,
+    ProblemSeverity.MEDIUM: 2,
+    ProblemSeverity.LOW: 3,
+}
+
+_SEVERITY_PENALTY = {
+    ProblemSeverity.CRITICAL: 25,
+    ProblemSeverity.HIGH: 15,
+    ProblemSeverity.MEDIUM: 8,
+    ProblemSeverity.LOW: 3,
+}
+
+
+def sort_problems(problems: list[Problem]) -> list[Problem]:
+    """Order problems by severity, critical first, keeping detector order."""
+    return sorted(problems, key=lambda p: _SEVERITY_ORDER[p.severity])
+
+
+def health_summary(problems: list[Problem]) -> dict[str, Any]:
+    """
+    Summarize detected problems as a health score and counts by severity.
+
+    Args:
+        problems: Problems sorted by severity (see ``sort_problems``)
+
+    Returns:
+        Health summary with score and problem counts
+    """
+    # Calculate health score (100 - penalty for problems)
+    penalty = sum(_SEVERITY_PENALTY[p.severity] for p in problems)
+    health_score = max(0, 100 - penalty)
+
+    return {
+        "health_score": health_score,
+        "status": (
+            "healthy"
+            if health_score >= 80
+            else "degraded" if health_score >= 50 else "critical"
+        ),
+        "problem_counts": {
+            severity.value: len([p for p in problems if p.severity == severity])
+            for severity in ProblemSeverity
+        },
+        "total_problems": len(problems),
+        "top_problem": problems[0].to_dict() if problems else None,
+    }
+
+
 class KnowledgeGraphInsightsEngine:
     """
     Analyzes the Knowledge Graph to detect problems and suggest solutions.
@@ -143,9 +212,103 @@ class KnowledgeGraphInsightsEngine:
     SIGNAL_HEALTH_THRESHOLD = 70  # Below 70 is degraded
     SEGMENT_DECLINE_THRESHOLD = 0.20  # 20% segment revenue decline
 
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        lookups: Optional[dict[Hashable, asyncio.Future]] = None,
+    ):
         self.session = session
         self.kg = KnowledgeGraphService(session)
+        # Graph reads several detectors share (see _blocked_automations and
+        # _signal_sources), run once and awaited by every detector needing
+        # them. Engines on different sessions can share one dict.
+        self._lookups = {} if lookups is None else lookups
+
+    async def _lookup(
+        self, key: Hashable, query: Callable[[], Awaitable[list[dict[str, Any]]]]
+    ) -> list[dict[str, Any]]:
+        """Run ``query`` the first time ``key`` is asked for; share it after."""
+        future = self._lookups.get(key)
+        if future is None:
+            future = asyncio.ensure_future(query())
+            self._lookups[key] = future
+        return await future
+
+    async def _blocked_automations(
+        self, tenant_id: int, days: int
+    ) -> list[dict[str, Any]]:
+        """
+        Trust Gate blocks in the window, grouped by action type, platform and
+        gate decision.
+
+        Block-rate details, bottleneck detection and the revenue-decline trace
+        all read these; each re-groups the rows itself. Health is returned as
+        a sum and a count of non-null scores so averages stay exact across
+        regrouping.
+        """
+        cypher = f"""
+            MATCH (tg:TrustGate {{tenant_id: '{tenant_id}'}})-[blk:BLOCKED]->(a:Automation)
+            WHERE tg.evaluated_at >= '{_days_ago_iso(days)}'
+            WITH a.action_type AS action_type, a.platform AS platform,
+                 tg.decision AS decision, count(*) AS action_count,
+                 sum(tg.signal_health_score) AS health_sum,
+                 count(tg.signal_health_score) AS health_n
+            RETURN {{action_type: action_type, platform: platform,
+                    decision: decision, action_count: action_count,
+                    health_sum: health_sum, health_n: health_n}} AS result
+        """
+        return await self._lookup(
+            ("blocked_automations", tenant_id, days),
+            lambda: self.kg.execute_cypher(cypher),
+        )
+
+    async def _signal_sources(self, tenant_id: int, days: int) -> list[dict[str, Any]]:
+        """
+        Signal scores in the window, grouped by source and platform.
+
+        Read by signal degradation detection and the revenue-decline trace;
+        scores come back as a sum and count for the same reason as above.
+        """
+        cypher = f"""
+            MATCH (s:Signal {{tenant_id: '{tenant_id}'}})
+            WHERE s.measured_at >= '{_days_ago_iso(days)}'
+            WITH s.source AS source, s.platform AS platform,
+                 sum(s.score) AS score_sum, count(s.score) AS score_n,
+                 min(s.score) AS min_score,
+                 collect(DISTINCT s.status) AS statuses
+            RETURN {{source: source, platform: platform, score_sum: score_sum,
+                    score_n: score_n, min_score: min_score,
+                    statuses: statuses}} AS result
+        """
+        return await self._lookup(
+            ("signal_sources", tenant_id, days),
+            lambda: self.kg.execute_cypher(cypher),
+        )
+
+    @staticmethod
+    def _regroup(
+        rows: list[dict[str, Any]], keys: tuple[str, ...], sums: tuple[str, ...]
+    ) -> list[dict[str, Any]]:
+        """Re-aggregate lookup rows on ``keys``, adding up the ``sums`` columns.
+
+        Groups keep the order their first row arrived in.
+        """
+        groups: dict[tuple, dict[str, Any]] = {}
+        for row in rows:
+            group_key = tuple(row.get(k) for k in keys)
+            group = groups.get(group_key)
+            if group is None:
+                group = groups[group_key] = {
+                    **dict(zip(keys, group_key)),
+                    **dict.fromkeys(sums, 0),
+                }
+            for column in sums:
+                group[column] += row.get(column) or 0
+        return list(groups.values())
+
+    @staticmethod
+    def _mean(total: Any, n: Any) -> Optional[float]:
+        return total / n if n else None
 
     async def detect_all_problems(self, tenant_id: int, days: int = 7) -> list[Problem]:
         """
@@ -161,35 +324,17 @@ class KnowledgeGraphInsightsEngine:
         problems = []
 
         # Run all detectors
-        detectors = [
-            self._detect_revenue_decline,
-            self._detect_blocked_automations,
-            self._detect_signal_degradation,
-            self._detect_segment_issues,
-            self._detect_trust_gate_bottlenecks,
-            self._detect_channel_inefficiency,
-        ]
-
-        for detector in detectors:
+        for name in DETECTORS:
             try:
-                detected = await detector(tenant_id, days)
+                detected = await getattr(self, name)(tenant_id, days)
                 if detected:
                     problems.extend(
                         detected if isinstance(detected, list) else [detected]
                     )
-            except (ValueError, TypeError, KeyError, ZeroDivisionError, OSError) as e:
-                logger.error(f"Problem detector {detector.__name__} failed: {e}")
-
-        # Sort by severity
-        severity_order = {
-            ProblemSeverity.CRITICAL: 0,
-            ProblemSeverity.HIGH: 1,
-            ProblemSeverity.MEDIUM: 2,
-            ProblemSeverity.LOW: 3,
-        }
-        problems.sort(key=lambda p: severity_order[p.severity])
+            except DETECTOR_ERRORS as e:
+                logger.error(f"Problem detector {name} failed: {e}")
 
-        return problems
+        return sort_problems(problems)
 
     async def _detect_revenue_decline(
         self, tenant_id: int, days: int
@@ -285,32 +430,38 @@ class KnowledgeGraphInsightsEngine:
         """
         campaigns = await self.kg.execute_cypher(campaign_query)
 
-        # Check for blocked automations
-        blocked_query = f"""
-            MATCH (tg:TrustGate {{tenant_id: '{tenant_id}', decision: 'block'}})-[blk:BLOCKED]->(a:Automation)
-            WHERE tg.evaluated_at >= '{_days_ago_iso(days)}'
-            RETURN {{blocked_count: count(a),
-                    action_types: collect(DISTINCT a.action_type)[0..5],
-                    avg_health: avg(tg.signal_health_score)}} AS result
-        """
-        blocked = await self.kg.execute_cypher(blocked_query)
-
-        # Check signal health
-        signal_query = f"""
-            MATCH (s:Signal {{tenant_id: '{tenant_id}'}})
-            WHERE s.measured_at >= '{_days_ago_iso(days)}'
-            RETURN {{source: s.source, avg_score: avg(s.score),
-                    statuses: collect(DISTINCT s.status)}} AS result
-        """
-        signals = await self.kg.execute_cypher(signal_query)
+        # Check for blocked automations and signal health. Both are shared
+        # lookups, usually already read by the other detectors.
+        blocked = self._regroup(
+            [
+                row
+                for row in await self._blocked_automations(tenant_id, days)
+                if row.get("decision") == "block"
+            ],
+            (),
+            _BLOCK_SUMS,
+        )
+        signals = [
+            {
+                "source": row["source"],
+                "avg_score": self._mean(row["score_sum"], row["score_n"]),
+            }
+            for row in self._regroup(
+                await self._signal_sources(tenant_id, days),
+                ("source",),
+                ("score_sum", "score_n"),
+            )
+        ]
 
         # Build cause chain
-        if blocked and blocked[0].get("blocked_count", 0) > 5:
+        blocked_count = blocked[0]["action_count"] if blocked else 0
+        if blocked_count > 5:
+            avg_health = self._mean(blocked[0]["health_sum"], blocked[0]["health_n"])
             causes["path"].append(
                 {
                     "node": "TrustGate",
-                    "finding": f"{blocked[0]['blocked_count']} automations blocked",
-                    "detail": f"Avg signal health: {blocked[0].get('avg_health', 0):.1f}%",
+                    "finding": f"{blocked_count} automations blocked",
+                    "detail": f"Avg signal health: {avg_health or 0:.1f}%",
                 }
             )
 
@@ -318,7 +469,8 @@ class KnowledgeGraphInsightsEngine:
             degraded = [
                 s
                 for s in signals
-                if s.get("avg_score", 100) < self.SIGNAL_HEALTH_THRESHOLD
+                if (s["avg_score"] if s["avg_score"] is not None else 100)
+                < self.SIGNAL_HEALTH_THRESHOLD
             ]
             if degraded:
                 causes["path"].append(
@@ -460,19 +612,25 @@ class KnowledgeGraphInsightsEngine:
 
             if block_rate > self.BLOCK_RATE_THRESHOLD and data.get("total", 0) > 10:
                 # Get details on what's being blocked
-                detail_query = f"""
-                    MATCH (tg:TrustGate {{tenant_id: '{tenant_id}', decision: 'block'}})-[blk:BLOCKED]->(a:Automation)
-                    WHERE tg.evaluated_at >= '{_days_ago_iso(days)}'
-                    WITH a.action_type AS action_type, a.platform AS platform,
-                         count(*) AS action_count,
-                         avg(tg.signal_health_score) AS avg_health
-                    WITH action_type, platform, action_count, avg_health
-                    ORDER BY action_count DESC
-                    LIMIT 5
-                    RETURN {{action_type: action_type, platform: platform,
-                            count: action_count, avg_health: avg_health}} AS result
-                """
-                details = await self.kg.execute_cypher(detail_query)
+                groups = self._regroup(
+                    [
+                        row
+                        for row in await self._blocked_automations(tenant_id, days)
+                        if row.get("decision") == "block"
+                    ],
+                    ("action_type", "platform"),
+                    _BLOCK_SUMS,
+                )
+                groups.sort(key=lambda g: g["action_count"], reverse=True)
+                details = [
+                    {
+                        "action_type": g["action_type"],
+                        "platform": g["platform"],
+                        "count": g["action_count"],
+                        "avg_health": self._mean(g["health_sum"], g["health_n"]),
+                    }
+                    for g in groups[:5]
+                ]
 
                 return Problem(
                     id=f"block_rate_{tenant_id}_{datetime.now(tz=UTC).strftime('%Y%m%d')}",
@@ -534,22 +692,25 @@ class KnowledgeGraphInsightsEngine:
 
         problems = []
 
-        cypher = f"""
-            MATCH (s:Signal {{tenant_id: '{tenant_id}'}})
-            WHERE s.measured_at >= '{_days_ago_iso(days)}'
-            WITH s.source AS source, s.platform AS platform,
-                 avg(s.score) AS avg_score,
-                 min(s.score) AS min_score,
-                 collect(DISTINCT s.status) AS statuses
-            WHERE avg_score < {self.SIGNAL_HEALTH_THRESHOLD}
-            RETURN {{source: source, platform: platform, avg_score: avg_score,
-                    min_score: min_score, statuses: statuses}} AS result
-        """
-
         try:
-            results = await self.kg.execute_cypher(cypher)
+            results = [
+                {
+                    "source": row.get("source"),
+                    "platform": row.get("platform"),
+                    "avg_score": self._mean(row.get("score_sum"), row.get("score_n")),
+                    "min_score": row.get("min_score"),
+                    "statuses": row.get("statuses"),
+                }
+                for row in await self._signal_sources(tenant_id, days)
+            ]
+            results = [
+                r
+                for r in results
+                if r["avg_score"] is not None
+                and r["avg_score"] < self.SIGNAL_HEALTH_THRESHOLD
+            ]
 
-            for signal in results or []:
+            for signal in results:
                 severity = (
                     ProblemSeverity.CRITICAL
                     if signal.get("avg_score", 0) < 40
@@ -713,21 +874,22 @@ class KnowledgeGraphInsightsEngine:
     ) -> Optional[Problem]:
         """Detect if Trust Gate is consistently blocking specific action types."""
 
-        cypher = f"""
-            MATCH (tg:TrustGate {{tenant_id: '{tenant_id}'}})-[blk:BLOCKED]->(a:Automation)
-            WHERE tg.evaluated_at >= '{_days_ago_iso(days)}'
-            WITH a.action_type AS action_type, count(*) AS blocked_count,
-                 avg(tg.signal_health_score) AS avg_health_at_block
-            WHERE blocked_count >= 5
-            WITH action_type, blocked_count, avg_health_at_block
-            ORDER BY blocked_count DESC
-            LIMIT 3
-            RETURN {{action_type: action_type, blocked_count: blocked_count,
-                    avg_health_at_block: avg_health_at_block}} AS result
-        """
-
         try:
-            results = await self.kg.execute_cypher(cypher)
+            groups = self._regroup(
+                await self._blocked_automations(tenant_id, days),
+                ("action_type",),
+                _BLOCK_SUMS,
+            )
+            groups.sort(key=lambda g: g["action_count"], reverse=True)
+            results = [
+                {
+                    "action_type": g["action_type"],
+                    "blocked_count": g["action_count"],
+                    "avg_health_at_block": self._mean(g["health_sum"], g["health_n"]),
+                }
+                for g in groups
+                if g["action_count"] >= 5
+            ][:3]
 
             if results and len(results) > 0:
                 top_blocked = results[0]
@@ -857,41 +1019,4 @@ class KnowledgeGraphInsightsEngine:
         Returns:
             Health summary with score and problem counts
         """
-        problems = await self.detect_all_problems(tenant_id)
-
-        # Calculate health score (100 - penalty for problems)
-        penalty = 0
-        for p in problems:
-            if p.severity == ProblemSeverity.CRITICAL:
-                penalty += 25
-            elif p.severity == ProblemSeverity.HIGH:
-                penalty += 15
-            elif p.severity == ProblemSeverity.MEDIUM:
-                penalty += 8
-            else:
-                penalty += 3
-
-        health_score = max(0, 100 - penalty)
-
-        return {
-            "health_score": health_score,
-            "status": (
-                "healthy"
-                if health_score >= 80
-                else "degraded" if health_score >= 50 else "critical"
-            ),
-            "problem_counts": {
-                "critical": len(
-                    [p for p in problems if p.severity == ProblemSeverity.CRITICAL]
-                ),
-                "high": len(
-                    [p for p in problems if p.severity == ProblemSeverity.HIGH]
-                ),
-                "medium": len(
-                    [p for p in problems if p.severity == ProblemSeverity.MEDIUM]
-                ),
-                "low": len([p for p in problems if p.severity == ProblemSeverity.LOW]),
-            },
-            "total_problems": len(problems),
-            "top_problem": problems[0].to_dict() if problems else None,
-        }
+        return health_summary(await self.detect_all_problems(tenant_id))
@@ -599,6 +599,30 @@ class KnowledgeGraphService:
     # GRAPH STATISTICS
     # =========================================================================
 
+    async def graph_version(self) -> str:
+        """
+        Stamp that changes whenever the graph is written to.
+
+        AGE keeps each label in its own table in a schema named after the
+        graph, so Postgres' cumulative write counters for that schema advance
+        with every committed node or edge insert, update or delete. Read from
+        the statistics views rather than the graph, it is one catalog query
+        and needs no AGE session setup.
+
+        The stamp is graph-wide rather than per tenant: a write for any tenant
+        changes it, which costs a recompute but never serves a stale result.
+        Counters are published by the writing backend on commit, at most about
+        a second apart, so a caller should also bound how long it trusts one.
+        """
+        result = await self.session.execute(
+            text(
+                "SELECT coalesce(sum(n_tup_ins + n_tup_upd + n_tup_del), 0) "
+                "FROM pg_stat_user_tables WHERE schemaname = :graph"
+            ),
+            {"graph": self.GRAPH_NAME},
+        )
+        return str(result.scalar_one())
+
     async def get_graph_stats(self, tenant_id: int) -> dict[str, Any]:
         """
         Get overall graph statistics for a tenant.
@@ -0,0 +1,457 @@
+# =============================================================================
+# Stratum AI - Bounded-Memory Latency Sketches
+# =============================================================================
+"""
+Mergeable quantile sketches for latency series.
+
+Used by the conversion latency tracker so that memory per
+(platform, event_type) series stays constant regardless of uptime.
+
+Two building blocks:
+- LatencySketch: a DDSketch-style log-bucketed histogram with a relative
+  accuracy guarantee. Small series are held exactly until they outgrow
+  ``exact_limit``, so low-volume percentiles match a plain sort.
+- SketchRingBuffer: a fixed number of time slots, each holding one
+  LatencySketch, used for period filtering and timelines.
+- TieredSketchRing: a short ring of fine slots for recent data plus an
+  hourly roll-up ring for the full retention window, so a week of history
+  costs 168 sketches instead of 2016.
+
+Both serialize to plain dicts (JSON-safe) so per-worker state can be
+published to Redis and merged across workers.
+"""
+
+import math
+import statistics
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+# Default relative accuracy of histogram-mode quantiles (1%)
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+# Values held exactly before switching to histogram mode
+DEFAULT_EXACT_LIMIT = 256
+
+# Maximum number of histogram bins; lowest bins collapse beyond this
+DEFAULT_BIN_LIMIT = 1024
+
+# Latencies at or below this (ms) are counted in the zero bucket
+MIN_TRACKED_VALUE_MS = 1e-3
+
+
+class LatencySketch:
+    """
+    Mergeable quantile sketch with bounded memory.
+
+    Keeps count, mean, M2 (for standard deviation), min and max exactly.
+    Quantiles are exact while the sketch holds at most ``exact_limit``
+    values, and within ``relative_accuracy`` afterwards.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        exact_limit: int = DEFAULT_EXACT_LIMIT,
+        bin_limit: int = DEFAULT_BIN_LIMIT,
+    ):
+        self.relative_accuracy = relative_accuracy
+        self.exact_limit = exact_limit
+        self.bin_limit = bin_limit
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+        # Exact mode storage; None once the sketch switches to bins
+        self._values: Optional[List[float]] = []
+        self._bins: Dict[int, int] = {}
+        self._zero_count = 0
+
+    # -------------------------------------------------------------------------
+    # Insertion and merge
+    # -------------------------------------------------------------------------
+
+    def add(self, value: float) -> None:
+        """Add a single latency value (ms)."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+        if self._values is not None:
+            self._values.append(value)
+            if len(self._values) > self.exact_limit:
+                self._switch_to_bins()
+        else:
+            self._add_to_bins(value, 1)
+
+    def merge(self, other: "LatencySketch") -> None:
+        """Merge another sketch into this one in place."""
+        if other.count == 0:
+            return
+
+        if self.count == 0:
+            self.mean = other.mean
+            self._m2 = other._m2
+        else:
+            total = self.count + other.count
+            delta = other.mean - self.mean
+            self._m2 += other._m2 + delta * delta * self.count * other.count / total
+            self.mean += delta * other.count / total
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+        if self._values is not None and other._values is not None:
+            self._values.extend(other._values)
+            if len(self._values) > self.exact_limit:
+                self._switch_to_bins()
+            return
+
+        if self._values is not None:
+            self._switch_to_bins()
+        if other._values is not None:
+            for value in other._values:
+                self._add_to_bins(value, 1)
+        else:
+            self._zero_count += other._zero_count
+            for key, bin_count in other._bins.items():
+                self._bins[key] = self._bins.get(key, 0) + bin_count
+            self._collapse_bins()
+
+    def _switch_to_bins(self) -> None:
+        values, self._values = self._values or [], None
+        for value in values:
+            self._add_to_bins(value, 1)
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2 * self._gamma**key / (self._gamma + 1)
+
+    def _add_to_bins(self, value: float, weight: int) -> None:
+        if value <= MIN_TRACKED_VALUE_MS:
+            self._zero_count += weight
+            return
+        key = self._key(value)
+        self._bins[key] = self._bins.get(key, 0) + weight
+        if len(self._bins) > self.bin_limit:
+            self._collapse_bins()
+
+    def _collapse_bins(self) -> None:
+        """Fold the lowest bins together so the bin count stays bounded."""
+        if len(self._bins) <= self.bin_limit:
+            return
+        keys = sorted(self._bins)
+        overflow = keys[: len(keys) - self.bin_limit + 1]
+        folded = sum(self._bins.pop(key) for key in overflow)
+        target = overflow[-1]
+        self._bins[target] = self._bins.get(target, 0) + folded
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    @property
+    def is_exact(self) -> bool:
+        """Whether quantiles are currently computed from raw values."""
+        return self._values is not None
+
+    @property
+    def std_dev(self) -> float:
+        """Sample standard deviation."""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(max(self._m2, 0.0) / (self.count - 1))
+
+    def quantile(self, q: float) -> float:
+        """
+        Value at quantile ``q`` (0..1).
+
+        Uses the ``sorted[int(n * q)]`` rank convention so results match
+        the historical list-based implementation in exact mode.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = min(int(self.count * q), self.count - 1)
+
+        if self._values is not None:
+            return sorted(self._values)[rank]
+
+        if rank < self._zero_count:
+            return max(self.min, 0.0)
+        seen = self._zero_count
+        for key in sorted(self._bins):
+            seen += self._bins[key]
+            if seen > rank:
+                return min(max(self._value(key), self.min), self.max)
+        return self.max
+
+    def median(self) -> float:
+        """Median, averaging the two middle values in exact mode."""
+        if self.count == 0:
+            return 0.0
+        if self._values is not None:
+            return statistics.median(self._values)
+        return self.quantile(0.5)
+
+    # -------------------------------------------------------------------------
+    # Serialization
+    # -------------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe representation, suitable for storing in Redis."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "exact_limit": self.exact_limit,
+            "bin_limit": self.bin_limit,
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self._m2,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "values": self._values,
+            "bins": {str(k): v for k, v in self._bins.items()},
+            "zero_count": self._zero_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencySketch":
+        """Rebuild a sketch from ``to_dict`` output."""
+        sketch = cls(
+            relative_accuracy=data.get("relative_accuracy", DEFAULT_RELATIVE_ACCURACY),
+            exact_limit=data.get("exact_limit", DEFAULT_EXACT_LIMIT),
+            bin_limit=data.get("bin_limit", DEFAULT_BIN_LIMIT),
+        )
+        sketch.count = data.get("count", 0)
+        sketch.mean = data.get("mean", 0.0)
+        sketch._m2 = data.get("m2", 0.0)
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        values = data.get("values")
+        sketch._values = list(values) if values is not None else None
+        sketch._bins = {int(k): v for k, v in (data.get("bins") or {}).items()}
+        sketch._zero_count = data.get("zero_count", 0)
+        return sketch
+
+
+class SketchRingBuffer:
+    """
+    Fixed-size ring of time-bucketed latency sketches.
+
+    Each slot covers ``slot_minutes`` of wall-clock time. Slot ``n`` lives
+    at index ``n % num_slots`` and is overwritten once the ring wraps, so
+    memory is bounded by ``num_slots`` sketches.
+    """
+
+    def __init__(self, slot_minutes: int = 5, retention_hours: int = 168):
+        self.slot_minutes = slot_minutes
+        self.retention_hours = retention_hours
+        self.num_slots = max(1, (retention_hours * 60) // slot_minutes)
+        self._slots: List[Optional[Tuple[int, LatencySketch]]] = [None] * self.num_slots
+
+    def slot_for(self, when: datetime) -> int:
+        """Absolute slot number for a timestamp."""
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return int(when.timestamp() // (self.slot_minutes * 60))
+
+    def slot_start(self, slot: int) -> datetime:
+        """Start time of an absolute slot number."""
+        return datetime.fromtimestamp(slot * self.slot_minutes * 60, tz=timezone.utc)
+
+    def add(self, value: float, when: datetime) -> bool:
+        """
+        Add a value in the slot covering ``when``.
+
+        Returns False if the timestamp is older than the data the ring
+        currently holds for that index (i.e. outside retention).
+        """
+        slot = self.slot_for(when)
+        sketch = self._get_or_create(slot)
+        if sketch is None:
+            return False
+        sketch.add(value)
+        return True
+
+    def merge_slot(self, slot: int, other: LatencySketch) -> None:
+        """Merge a sketch into an absolute slot (used when combining workers)."""
+        sketch = self._get_or_create(slot)
+        if sketch is not None:
+            sketch.merge(other)
+
+    def _get_or_create(self, slot: int) -> Optional[LatencySketch]:
+        index = slot % self.num_slots
+        entry = self._slots[index]
+        if entry is not None:
+            if entry[0] == slot:
+                return entry[1]
+            if entry[0] > slot:
+                return None
+        sketch = LatencySketch()
+        self._slots[index] = (slot, sketch)
+        return sketch
+
+    def slots_since(
+        self, cutoff: datetime, now: Optional[datetime] = None
+    ) -> List[Tuple[int, LatencySketch]]:
+        """Non-empty slots from ``cutoff`` up to ``now``, oldest first."""
+        first = self.slot_for(cutoff)
+        last = self.slot_for(now or datetime.now(timezone.utc))
+        live = [
+            entry
+            for entry in self._slots
+            if entry is not None and first <= entry[0] <= last and entry[1].count
+        ]
+        return sorted(live, key=lambda entry: entry[0])
+
+    def merged_since(
+        self, cutoff: datetime, now: Optional[datetime] = None
+    ) -> LatencySketch:
+        """Single sketch covering every slot since ``cutoff``."""
+        merged = LatencySketch()
+        for _, sketch in self.slots_since(cutoff, now):
+            merged.merge(sketch)
+        return merged
+
+    def total_count(self) -> int:
+        """Number of values held across all live slots."""
+        return sum(entry[1].count for entry in self._slots if entry is not None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe representation keyed by absolute slot number."""
+        return {
+            "slot_minutes": self.slot_minutes,
+            "retention_hours": self.retention_hours,
+            "slots": {
+                str(slot): sketch.to_dict()
+                for slot, sketch in (e for e in self._slots if e is not None)
+                if sketch.count
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SketchRingBuffer":
+        """Rebuild a ring from ``to_dict`` output."""
+        ring = cls(
+            slot_minutes=data.get("slot_minutes", 5),
+            retention_hours=data.get("retention_hours", 168),
+        )
+        for slot, sketch_data in (data.get("slots") or {}).items():
+            ring.merge_slot(int(slot), LatencySketch.from_dict(sketch_data))
+        return ring
+
+
+class TieredSketchRing:
+    """
+    Fine-grained recent slots plus a coarse roll-up for older data.
+
+    Every value is written to both rings: ``fine`` keeps ``slot_minutes``
+    resolution for the last ``fine_hours``, ``coarse`` keeps
+    ``rollup_minutes`` slots for the whole ``retention_hours``. Reads take
+    fine slots from the boundary onwards and roll-up slots before it, so
+    older windows are answered at roll-up resolution (a cutoff falling
+    inside a roll-up slot includes that whole slot).
+    """
+
+    def __init__(
+        self,
+        slot_minutes: int = 5,
+        retention_hours: int = 168,
+        fine_hours: int = 6,
+        rollup_minutes: int = 60,
+    ):
+        if rollup_minutes % slot_minutes:
+            raise ValueError("rollup_minutes must be a multiple of slot_minutes")
+        self.slot_minutes = slot_minutes
+        self.retention_hours = retention_hours
+        self.fine_hours = min(fine_hours, retention_hours)
+        self.rollup_minutes = rollup_minutes
+        self.fine = SketchRingBuffer(slot_minutes, self.fine_hours)
+        self.coarse = SketchRingBuffer(rollup_minutes, retention_hours)
+
+    def add(self, value: float, when: datetime) -> bool:
+        """Add a value to both tiers; False if outside the retention window."""
+        self.fine.add(value, when)
+        return self.coarse.add(value, when)
+
+    def _boundary(self, now: datetime) -> datetime:
+        """Start of the oldest roll-up slot still fully covered by fine slots."""
+        oldest_fine = self.fine.slot_for(now) - self.fine.num_slots + 1
+        fine_start = oldest_fine * self.slot_minutes * 60
+        rollup_seconds = self.rollup_minutes * 60
+        boundary = -(-fine_start // rollup_seconds) * rollup_seconds
+        return datetime.fromtimestamp(boundary, tz=timezone.utc)
+
+    def sketches_since(
+        self, cutoff: datetime, now: Optional[datetime] = None
+    ) -> List[Tuple[datetime, LatencySketch]]:
+        """Non-empty ``(slot start, sketch)`` pairs since ``cutoff``, oldest first."""
+        now = now or datetime.now(timezone.utc)
+        boundary = self._boundary(now)
+        older = [
+            (self.coarse.slot_start(slot), sketch)
+            for slot, sketch in self.coarse.slots_since(cutoff, now)
+            if self.coarse.slot_start(slot) < boundary
+        ]
+        recent = [
+            (self.fine.slot_start(slot), sketch)
+            for slot, sketch in self.fine.slots_since(max(cutoff, boundary), now)
+            if self.fine.slot_start(slot) >= boundary
+        ]
+        return older + recent
+
+    def merged_since(
+        self, cutoff: datetime, now: Optional[datetime] = None
+    ) -> LatencySketch:
+        """Single sketch covering every slot since ``cutoff``."""
+        merged = LatencySketch()
+        for _, sketch in self.sketches_since(cutoff, now):
+            merged.merge(sketch)
+        return merged
+
+    def merge(self, other: "TieredSketchRing", now: Optional[datetime] = None) -> None:
+        """Merge another tiered ring (e.g. from another worker) in place."""
+        now = now or datetime.now(timezone.utc)
+        for mine, theirs in ((self.fine, other.fine), (self.coarse, other.coarse)):
+            cutoff = now - timedelta(hours=mine.retention_hours)
+            for slot, sketch in theirs.slots_since(cutoff, now):
+                mine.merge_slot(slot, sketch)
+
+    def total_count(self) -> int:
+        """Number of values held across the retention window."""
+        return self.coarse.total_count()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe representation of both tiers."""
+        return {
+            "slot_minutes": self.slot_minutes,
+            "retention_hours": self.retention_hours,
+            "fine_hours": self.fine_hours,
+            "rollup_minutes": self.rollup_minutes,
+            "fine": self.fine.to_dict(),
+            "coarse": self.coarse.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TieredSketchRing":
+        """Rebuild a tiered ring from ``to_dict`` output."""
+        ring = cls(
+            slot_minutes=data.get("slot_minutes", 5),
+            retention_hours=data.get("retention_hours", 168),
+            fine_hours=data.get("fine_hours", 6),
+            rollup_minutes=data.get("rollup_minutes", 60),
+        )
+        for tier, name in ((ring.fine, "fine"), (ring.coarse, "coarse")):
+            slots = (data.get(name) or {}).get("slots") or {}
+            for slot, sketch_data in slots.items():
+                tier.merge_slot(int(slot), LatencySketch.from_dict(sketch_data))
+        return ring
@@ -0,0 +1,421 @@
+# =============================================================================
+# Stratum AI - Newsletter Delivery Pipeline
+# =============================================================================
+"""
+Building blocks for sending one newsletter campaign to a large list.
+
+- CompiledNewsletter: the campaign HTML with tracking links, open pixel and
+  unsubscribe footer injected ONCE, split into literal segments and
+  per-recipient substitution slots. Rendering a recipient is a join.
+- TokenBucket: blocking, thread-safe send-rate control (replaces fixed
+  sleeps between batches).
+- SmtpSessionPool: a bounded set of persistent SMTP sessions reused across
+  messages, reconnecting on drop and after MESSAGES_PER_SESSION sends.
+- NewsletterSender: fans prepared messages out over the pool with a thread
+  per session, falling back to EmailService (SendGrid / dev logging) when
+  SMTP is not the configured transport.
+"""
+
+import base64
+import queue
+import re
+import smtplib
+import ssl
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from email.mime.multipart import MIMEMultipart
+from typing import Any, Optional
+from urllib.parse import quote
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Servers commonly cap messages per connection; recycle before they do.
+MESSAGES_PER_SESSION = 500
+
+# Private-use code points delimit slots in the compiled template:
+# _SLOT_OPEN name _SLOT_CLOSE is substituted verbatim, _QUOTED_OPEN name
+# _SLOT_CLOSE is URL-quoted (personalization inside a tracked link).
+_SLOT_OPEN = "\ue000"
+_QUOTED_OPEN = "\ue002"
+_SLOT_CLOSE = "\ue001"
+_WHITESPACE_RE = re.compile(r"\s+")
+_SLOT_RE = re.compile(f"([{_SLOT_OPEN}{_QUOTED_OPEN}])(\\w+){_SLOT_CLOSE}")
+
+_PERSONALIZATION_TOKENS = {
+    "{{email}}": "email",
+    "{{first_name}}": "first_name",
+    "{{full_name}}": "full_name",
+    "{{company_name}}": "company_name",
+}
+
+
+def _slot(name: str) -> str:
+    return f"{_SLOT_OPEN}{name}{_SLOT_CLOSE}"
+
+
+def unsubscribe_url_for(api_base_url: str, campaign_id: int, subscriber_id: int) -> str:
+    """One-click unsubscribe URL carrying the campaign/subscriber token."""
+    token = base64.urlsafe_b64encode(f"{campaign_id}:{subscriber_id}".encode()).decode()
+    return f"{api_base_url}/api/v1/newsletter/unsubscribe?token={token}"
+
+
+def _quote_href(href: str) -> str:
+    """URL-quote a link, turning its personalization slots into quoted slots."""
+    parts = []
+    last = 0
+    for match in _SLOT_RE.finditer(href):
+        parts.append(quote(href[last : match.start()], safe=""))
+        parts.append(f"{_QUOTED_OPEN}{match.group(2)}{_SLOT_CLOSE}")
+        last = match.end()
+    parts.append(quote(href[last:], safe=""))
+    return "".join(parts)
+
+
+def _split(template: str) -> tuple[tuple[str, ...], tuple[tuple[str, bool], ...]]:
+    """Split a slotted template into literals and (slot name, quoted) pairs."""
+    literals: list[str] = []
+    slots: list[tuple[str, bool]] = []
+    last = 0
+    for match in _SLOT_RE.finditer(template):
+        literals.append(template[last : match.start()])
+        slots.append((match.group(2), match.group(1) == _QUOTED_OPEN))
+        last = match.end()
+    literals.append(template[last:])
+    return tuple(literals), tuple(slots)
+
+
+def _render(
+    literals: tuple[str, ...],
+    slots: tuple[tuple[str, bool], ...],
+    values: dict[str, str],
+) -> str:
+    out = [literals[0]]
+    for (name, quoted), literal in zip(slots, literals[1:]):
+        value = values[name]
+        out.append(quote(value, safe="") if quoted else value)
+        out.append(literal)
+    return "".join(out)
+
+
+@dataclass(frozen=True)
+class CompiledNewsletter:
+    """
+    Campaign HTML (and its plain-text fallback) compiled for fast rendering.
+
+    Produces the same output as personalizing, then injecting tracking,
+    then adding the unsubscribe footer per recipient, but the regex link
+    rewrite and string scans run once per campaign instead of once per
+    recipient.
+    """
+
+    html_literals: tuple[str, ...]
+    html_slots: tuple[tuple[str, bool], ...]
+    text_literals: tuple[str, ...]
+    text_slots: tuple[tuple[str, bool], ...]
+
+    @classmethod
+    def compile(
+        cls, html: str, campaign_id: int, api_base_url: str
+    ) -> "CompiledNewsletter":
+        """Compile ``html`` for ``campaign_id`` with tracking and footer."""
+        for token, name in _PERSONALIZATION_TOKENS.items():
+            html = html.replace(token, _slot(name))
+
+        subscriber_id = _slot("subscriber_id")
+        pixel_url = (
+            f"{api_base_url}/api/v1/newsletter/track/open/{campaign_id}/{subscriber_id}"
+        )
+        pixel_tag = f'<img src="{pixel_url}" width="1" height="1" style="display:none" alt="" />'
+        if "</body>" in html:
+            html = html.replace("</body>", f"{pixel_tag}</body>")
+        else:
+            html += pixel_tag
+
+        def rewrite_link(match: re.Match) -> str:
+            href = match.group(1)
+            # Skip mailto:, tel:, and tracking URLs
+            if (
+                href.startswith(("mailto:", "tel:", "#"))
+                or "/newsletter/track/" in href
+            ):
+                return match.group(0)
+            tracked_url = (
+                f"{api_base_url}/api/v1/newsletter/track/click/"
+                f"{campaign_id}/{subscriber_id}?url={_quote_href(href)}"
+            )
+            return f'href="{tracked_url}"'
+
+        html = re.sub(r'href="([^"]+)"', rewrite_link, html)
+
+        footer = f"""
+    <div style="margin-top:40px;padding-top:20px;border-top:1px solid rgba(255,255,255,0.1);text-align:center;font-size:12px;color:#86868b;">
+        <p>You received this because you subscribed at stratumai.app</p>
+        <p>&copy; {datetime.now().year} Stratum AI &bull;
+        <a href="{_slot("unsubscribe_url")}" style="color:#00c7be;text-decoration:underline;">Unsubscribe</a></p>
+    </div>
+    """
+        if "</body>" in html:
+            html = html.replace("</body>", f"{footer}</body>")
+        else:
+            html += footer
+
+        # Plain-text fallback, as EmailService.send_newsletter_email derives it
+        text = re.sub(r"<[^>]+>", "", html)
+        text = re.sub(r"\s+", " ", text).strip()
+
+        html_literals, html_slots = _split(html)
+        text_literals, text_slots = _split(text)
+        return cls(html_literals, html_slots, text_literals, text_slots)
+
+    @staticmethod
+    def slot_values(
+        subscriber_id: int,
+        email: str,
+        full_name: Optional[str],
+        company_name: Optional[str],
+        unsubscribe_url: str,
+    ) -> dict[str, str]:
+        """Substitution values for one recipient."""
+        return {
+            "email": email,
+            "first_name": (full_name or "").split(" ")[0] or "there",
+            "full_name": full_name or "",
+            "company_name": company_name or "",
+            "subscriber_id": str(subscriber_id),
+            "unsubscribe_url": unsubscribe_url,
+        }
+
+    def render_html(self, values: dict[str, str]) -> str:
+        return _render(self.html_literals, self.html_slots, values)
+
+    def render_text(self, values: dict[str, str]) -> str:
+        # The template is already whitespace-collapsed; keep it that way
+        # across substituted values (e.g. an empty name between spaces).
+        out: list[str] = []
+        prev_space = True
+        pieces = [self.text_literals[0]]
+        for (name, _), literal in zip(self.text_slots, self.text_literals[1:]):
+            pieces.append(_WHITESPACE_RE.sub(" ", values[name]))
+            pieces.append(literal)
+        for piece in pieces:
+            if prev_space and piece.startswith(" "):
+                piece = piece[1:]
+            if piece:
+                out.append(piece)
+                prev_space = piece.endswith(" ")
+        return "".join(out).strip()
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``acquire`` blocks until a token is free."""
+
+    def __init__(self, rate: float, capacity: Optional[int] = None):
+        self.rate = rate
+        self.capacity = float(capacity if capacity is not None else max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class _SmtpSession:
+    """One persistent SMTP connection, reopened when dropped or worn out."""
+
+    def __init__(self, pool: "SmtpSessionPool"):
+        self._pool = pool
+        self._server: Optional[smtplib.SMTP] = None
+        self._sent = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        pool = self._pool
+        if pool.use_ssl:
+            server = pool.smtp_ssl_factory(
+                pool.host, pool.port, context=ssl.create_default_context()
+            )
+        else:
+            server = pool.smtp_factory(pool.host, pool.port)
+            if pool.use_tls:
+                server.starttls(context=ssl.create_default_context())
+        if pool.user and pool.password:
+            server.login(pool.user, pool.password)
+        self._sent = 0
+        return server
+
+    def send(self, from_address: str, to_email: str, message: str) -> None:
+        if self._server is None or self._sent >= MESSAGES_PER_SESSION:
+            self.close()
+            self._server = self._connect()
+        try:
+            self._server.sendmail(from_address, to_email, message)
+        except smtplib.SMTPServerDisconnected:
+            # Idle timeout or server-side recycle: reconnect once and retry
+            self._server = self._connect()
+            self._server.sendmail(from_address, to_email, message)
+        self._sent += 1
+
+    def close(self) -> None:
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._server = None
+
+
+class SmtpSessionPool:
+    """
+    Bounded pool of persistent SMTP sessions.
+
+    Usage:
+        with SmtpSessionPool(host, port, user, password, size=4) as pool:
+            pool.send(from_address, "a@example.com", message.as_string())
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = True,
+        use_ssl: bool = False,
+        size: int = 4,
+        smtp_factory: Callable[..., Any] = smtplib.SMTP,
+        smtp_ssl_factory: Callable[..., Any] = smtplib.SMTP_SSL,
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.use_tls = use_tls
+        self.use_ssl = use_ssl
+        self.size = size
+        self.smtp_factory = smtp_factory
+        self.smtp_ssl_factory = smtp_ssl_factory
+        self._sessions: queue.Queue[_SmtpSession] = queue.Queue()
+        self._all: list[_SmtpSession] = []
+        for _ in range(size):
+            session = _SmtpSession(self)
+            self._all.append(session)
+            self._sessions.put(session)
+
+    def send(self, from_address: str, to_email: str, message: str) -> bool:
+        """Send on a free session (blocks until one is). Returns success."""
+        session = self._sessions.get()
+        try:
+            session.send(from_address, to_email, message)
+            return True
+        except smtplib.SMTPException as e:
+            logger.error("SMTP error sending newsletter", error=str(e))
+            session.close()
+            return False
+        except (ConnectionError, TimeoutError, OSError) as e:
+            logger.error("SMTP connection error sending newsletter", error=str(e))
+            session.close()
+            return False
+        finally:
+            self._sessions.put(session)
+
+    def close(self) -> None:
+        for session in self._all:
+            session.close()
+
+    def __enter__(self) -> "SmtpSessionPool":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+@dataclass
+class OutgoingNewsletter:
+    """One prepared recipient message."""
+
+    subscriber_id: int
+    to_email: str
+    message: MIMEMultipart
+
+
+class NewsletterSender:
+    """
+    Sends prepared newsletter messages concurrently at a bounded rate.
+
+    With SMTP configured (and no SendGrid key) messages go through an
+    SmtpSessionPool with one worker thread per session; otherwise each
+    message is handed to ``EmailService._send_email`` on the same threads.
+    """
+
+    def __init__(
+        self,
+        email_service: Any,
+        concurrency: int,
+        rate_per_second: float,
+        pool: Optional[SmtpSessionPool] = None,
+    ):
+        self._email_service = email_service
+        self._concurrency = max(1, concurrency)
+        self._bucket = TokenBucket(rate_per_second) if rate_per_second > 0 else None
+        self._pool = pool
+        if (
+            self._pool is None
+            and email_service._sg is None
+            and email_service.user
+            and email_service.password
+        ):
+            self._pool = SmtpSessionPool(
+                email_service.host,
+                email_service.port,
+                email_service.user,
+                email_service.password,
+                use_tls=email_service.use_tls,
+                use_ssl=email_service.use_ssl,
+                size=self._concurrency,
+            )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._concurrency, thread_name_prefix="newsletter-send"
+        )
+
+    def _send_one(self, outgoing: OutgoingNewsletter) -> bool:
+        if self._bucket is not None:
+            self._bucket.acquire()
+        if self._pool is not None:
+            return self._pool.send(
+                self._email_service.from_address,
+                outgoing.to_email,
+                outgoing.message.as_string(),
+            )
+        return self._email_service._send_email(outgoing.to_email, outgoing.message)
+
+    def send_all(self, messages: Iterable[OutgoingNewsletter]) -> list[bool]:
+        """Send ``messages`` concurrently; results are in input order."""
+        return list(self._executor.map(self._send_one, messages))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        if self._pool is not None:
+            self._pool.close()
+
+    def __enter__(self) -> "NewsletterSender":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -15,6 +15,10 @@ Supports:
 - Meta (Facebook) Offline Conversions API
 - Google Ads Offline Conversion Import
 - TikTok Events API (offline mode)
+
+Large CSV uploads go through ``upload_csv_stream``, which reads the file in
+fixed-size chunks, normalizes and hashes PII column-wise per chunk, and
+uploads chunks concurrently so the file is never fully resident in memory.
 """
 
 import asyncio
@@ -22,19 +26,44 @@ import csv
 import hashlib
 import io
 import json
+import re
 import statistics
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import IO, Any, Dict, List, Optional, Tuple, Union
 
 import httpx
+import pandas as pd
 
 from app.core.logging import get_logger
 from app.services.capi.pii_hasher import PIIHasher
 
 logger = get_logger(__name__)
 
+# Rows per streamed CSV chunk; each chunk is parsed, hashed and uploaded as a unit
+CSV_STREAM_CHUNK_ROWS = 5000
+
+# Chunks uploaded concurrently (also caps how many chunks are resident at once)
+CSV_STREAM_MAX_CONCURRENCY = 4
+
+# Date formats accepted in CSV event_time columns, tried in order
+CSV_DATE_FORMATS = ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y"]
+
+_SHA256_HEX_RE = re.compile(r"^[a-f0-9]{64}$")
+
+
+def _sha256_hex(value: str) -> str:
+    """SHA-256 hex digest of an already-normalized value."""
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def _is_sha256_hex(value: str) -> bool:
+    """Whether a value is already a SHA-256 hex digest."""
+    return bool(_SHA256_HEX_RE.match(value))
+
 
 # =============================================================================
 # Data Models
@@ -108,6 +137,10 @@ class OfflineConversionBatch:
     successful_records: int = 0
     failed_records: int = 0
     error_summary: Optional[str] = None
+    skipped_records: int = 0  # CSV rows without any user identifier
+    chunks_completed: int = 0
+    chunk_progress: List[Dict[str, Any]] = field(default_factory=list)
+    tenant_id: Optional[str] = None
 
 
 @dataclass
@@ -147,19 +180,31 @@ class BaseOfflineUploader:
         raise NotImplementedError
 
     def _hash_email(self, email: Optional[str]) -> Optional[str]:
-        """Hash email for privacy."""
+        """Hash email for privacy (pre-hashed values pass through)."""
         if not email:
             return None
+        if _is_sha256_hex(email):
+            return email
         return hashlib.sha256(email.lower().strip().encode()).hexdigest()
 
     def _hash_phone(self, phone: Optional[str]) -> Optional[str]:
-        """Hash phone for privacy."""
+        """Hash phone for privacy (pre-hashed values pass through)."""
         if not phone:
             return None
+        if _is_sha256_hex(phone):
+            return phone
         # Normalize: remove spaces, dashes, and leading +
         normalized = phone.replace(" ", "").replace("-", "").replace("+", "")
         return hashlib.sha256(normalized.encode()).hexdigest()
 
+    def _hash_name(self, name: Optional[str]) -> Optional[str]:
+        """Hash first/last name for privacy (pre-hashed values pass through)."""
+        if not name:
+            return None
+        if _is_sha256_hex(name):
+            return name
+        return hashlib.sha256(name.lower().encode()).hexdigest()
+
 
 class MetaOfflineUploader(BaseOfflineUploader):
     """
@@ -267,13 +312,9 @@ class MetaOfflineUploader(BaseOfflineUploader):
         if conv.phone:
             match_keys["ph"] = [self._hash_phone(conv.phone)]
         if conv.first_name:
-            match_keys["fn"] = [
-                hashlib.sha256(conv.first_name.lower().encode()).hexdigest()
-            ]
+            match_keys["fn"] = [self._hash_name(conv.first_name)]
         if conv.last_name:
-            match_keys["ln"] = [
-                hashlib.sha256(conv.last_name.lower().encode()).hexdigest()
-            ]
+            match_keys["ln"] = [self._hash_name(conv.last_name)]
         if conv.external_id:
             match_keys["external_id"] = [conv.external_id]
 
@@ -572,11 +613,32 @@ class OfflineConversionService:
 
     Features:
     - CSV file parsing and validation
+    - Streaming, chunked CSV uploads with per-chunk progress
     - Multi-platform upload support
     - Batch processing with retry
     - Upload history tracking
     """
 
+    # CSV column aliases per conversion field, checked in order
+    DEFAULT_COLUMN_MAPPING: Dict[str, List[str]] = {
+        "email": ["email", "user_email", "customer_email"],
+        "phone": ["phone", "phone_number", "mobile"],
+        "first_name": ["first_name", "firstname", "fname"],
+        "last_name": ["last_name", "lastname", "lname"],
+        "conversion_value": [
+            "value",
+            "amount",
+            "revenue",
+            "conversion_value",
+            "order_value",
+        ],
+        "currency": ["currency", "currency_code"],
+        "event_time": ["event_time", "timestamp", "date", "conversion_time"],
+        "order_id": ["order_id", "transaction_id", "reference"],
+        "click_id": ["click_id", "gclid", "fbclid", "ttclid"],
+        "event_name": ["event_name", "event", "action"],
+    }
+
     def __init__(self):
         self._uploaders: Dict[str, BaseOfflineUploader] = {
             "meta": MetaOfflineUploader(),
@@ -585,6 +647,10 @@ class OfflineConversionService:
         }
         self._batches: Dict[str, OfflineConversionBatch] = {}
 
+    def supports_platform(self, platform: str) -> bool:
+        """Whether an uploader exists for ``platform``."""
+        return platform in self._uploaders
+
     def set_platform_credentials(self, platform: str, credentials: Dict[str, str]):
         """Set credentials for a platform uploader."""
         if platform in self._uploaders:
@@ -609,22 +675,8 @@ class OfflineConversionService:
         """
         # Default column mapping
         default_mapping = {
-            "email": ["email", "user_email", "customer_email"],
-            "phone": ["phone", "phone_number", "mobile"],
-            "first_name": ["first_name", "firstname", "fname"],
-            "last_name": ["last_name", "lastname", "lname"],
-            "conversion_value": [
-                "value",
-                "amount",
-                "revenue",
-                "conversion_value",
-                "order_value",
-            ],
-            "currency": ["currency", "currency_code"],
-            "event_time": ["event_time", "timestamp", "date", "conversion_time"],
-            "order_id": ["order_id", "transaction_id", "reference"],
-            "click_id": ["click_id", "gclid", "fbclid", "ttclid"],
-            "event_name": ["event_name", "event", "action"],
+            field_name: list(aliases)
+            for field_name, aliases in self.DEFAULT_COLUMN_MAPPING.items()
         }
 
         if column_mapping:
@@ -713,6 +765,7 @@ class OfflineConversionService:
         self,
         conversions: List[OfflineConversion],
         platform: str,
+        tenant_id: Optional[str] = None,
     ) -> UploadResult:
         """
         Upload offline conversions to a platform.
@@ -720,6 +773,7 @@ class OfflineConversionService:
         Args:
             conversions: List of conversions to upload
             platform: Target platform
+            tenant_id: Owning tenant, recorded on the batch
 
         Returns:
             UploadResult with success/failure details
@@ -745,6 +799,7 @@ class OfflineConversionService:
             conversions=conversions,
             total_records=len(conversions),
             status=OfflineConversionStatus.PROCESSING,
+            tenant_id=tenant_id,
         )
         self._batches[batch_id] = batch
 
@@ -794,31 +849,445 @@ class OfflineConversionService:
         Returns:
             UploadResult
         """
-        # Set credentials
-        self.set_platform_credentials(platform, credentials)
+        return await self.upload_csv_stream(
+            io.StringIO(csv_content), platform, credentials, column_mapping
+        )
 
-        # Parse CSV
-        conversions = self.parse_csv(csv_content, platform, column_mapping)
+    def create_batch(
+        self, platform: str, tenant_id: Optional[str] = None
+    ) -> OfflineConversionBatch:
+        """
+        Register an empty PENDING batch.
 
-        if not conversions:
+        Lets a caller hand out the batch id before the upload starts (see
+        ``upload_csv_stream(batch_id=...)``) so progress can be polled.
+        """
+        batch_id = f"{platform}_{datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        batch = OfflineConversionBatch(
+            batch_id=batch_id,
+            platform=platform,
+            conversions=[],
+            tenant_id=tenant_id,
+        )
+        self._batches[batch_id] = batch
+        return batch
+
+    async def upload_csv_stream(
+        self,
+        source: Union[str, IO],
+        platform: str,
+        credentials: Optional[Dict[str, str]] = None,
+        column_mapping: Optional[Dict[str, str]] = None,
+        chunk_rows: int = CSV_STREAM_CHUNK_ROWS,
+        max_concurrency: int = CSV_STREAM_MAX_CONCURRENCY,
+        hash_workers: int = 0,
+        tenant_id: Optional[str] = None,
+        batch_id: Optional[str] = None,
+    ) -> UploadResult:
+        """
+        Stream a CSV file to a platform in chunks.
+
+        The file is read ``chunk_rows`` rows at a time. Each chunk is
+        normalized and SHA-256 hashed column-wise, then uploaded while the
+        next chunks are read. At most ``max_concurrency`` chunks are in
+        flight, which also bounds memory. Per-chunk progress is recorded on
+        the batch (see ``get_batch_status``).
+
+        A chunk whose upload raises is marked failed and the rest of the
+        file continues; a read or parse error stops reading. Either way the
+        batch always ends UPLOADED, PARTIAL or FAILED, never PROCESSING.
+
+        Args:
+            source: File path or file-like object (text or binary)
+            platform: Target platform
+            credentials: Platform credentials (None keeps the uploader's
+                currently configured credentials)
+            column_mapping: Optional column mapping
+            chunk_rows: Rows per chunk
+            max_concurrency: Chunks uploaded concurrently
+            hash_workers: If > 0, hash unique PII values in a process pool
+                of this size instead of the preparing thread
+            tenant_id: Owning tenant, recorded on a newly created batch
+            batch_id: Existing batch from ``create_batch`` to fill in
+
+        Returns:
+            Aggregated UploadResult for the whole file
+        """
+        if platform not in self._uploaders:
+            if batch_id in self._batches:
+                batch = self._batches[batch_id]
+                batch.status = OfflineConversionStatus.FAILED
+                batch.error_summary = f"Unknown platform: {platform}"
             return UploadResult(
-                batch_id="",
+                batch_id=batch_id or "",
                 platform=platform,
                 success=False,
                 total_records=0,
                 successful_records=0,
                 failed_records=0,
-                errors=[{"message": "No valid conversions found in CSV"}],
+                errors=[{"message": f"Unknown platform: {platform}"}],
             )
 
-        # Upload
-        return await self.upload_conversions(conversions, platform)
+        if credentials is not None:
+            self.set_platform_credentials(platform, credentials)
+        uploader = self._uploaders[platform]
+        mapping = self._resolve_mapping(column_mapping)
+
+        batch = self._batches.get(batch_id) if batch_id else None
+        if batch is None:
+            batch = self.create_batch(platform, tenant_id)
+        batch_id = batch.batch_id
+        batch.status = OfflineConversionStatus.PROCESSING
+
+        hash_executor = ProcessPoolExecutor(hash_workers) if hash_workers > 0 else None
+        semaphore = asyncio.Semaphore(max_concurrency)
+        results: List[UploadResult] = []
+        tasks: List[asyncio.Task] = []
+        read_error: Optional[str] = None
+
+        async def upload_chunk(index: int, conversions: List[OfflineConversion]):
+            try:
+                result = await uploader.upload(conversions)
+            except Exception as e:  # noqa: BLE001 - one chunk must not sink the batch
+                logger.warning(f"Offline upload {batch_id} chunk {index} raised: {e}")
+                result = UploadResult(
+                    batch_id=batch_id,
+                    platform=platform,
+                    success=False,
+                    total_records=len(conversions),
+                    successful_records=0,
+                    failed_records=len(conversions),
+                    errors=[{"message": f"Chunk {index} upload error: {e}"}],
+                )
+            finally:
+                semaphore.release()
+
+            results.append(result)
+            batch.successful_records += result.successful_records
+            batch.failed_records += result.failed_records
+            batch.chunks_completed += 1
+            batch.chunk_progress[index].update(
+                status=(
+                    OfflineConversionStatus.UPLOADED.value
+                    if result.success
+                    else OfflineConversionStatus.FAILED.value
+                ),
+                successful_records=result.successful_records,
+                failed_records=result.failed_records,
+            )
+            if not result.success and result.errors:
+                batch.chunk_progress[index]["error"] = str(
+                    result.errors[0].get("message", "")
+                )
+            logger.info(
+                f"Offline upload {batch_id} chunk {index}: "
+                f"{result.successful_records}/{result.total_records} succeeded"
+            )
 
-    def get_batch_status(self, batch_id: str) -> Optional[Dict[str, Any]]:
-        """Get status of an upload batch."""
+        row_offset = 0
+        try:
+            try:
+                reader = pd.read_csv(
+                    source,
+                    chunksize=chunk_rows,
+                    dtype=str,
+                    keep_default_na=False,
+                    skipinitialspace=False,
+                )
+            except pd.errors.EmptyDataError:
+                reader = iter(())
+
+            while True:
+                # Acquire before reading so at most max_concurrency chunks
+                # are parsed-but-not-yet-uploaded at any time
+                await semaphore.acquire()
+                try:
+                    frame = await asyncio.to_thread(next, reader, None)
+                    if frame is None:
+                        semaphore.release()
+                        break
+
+                    conversions, skipped = await asyncio.to_thread(
+                        self._prepare_chunk,
+                        frame,
+                        platform,
+                        mapping,
+                        row_offset,
+                        hash_executor,
+                    )
+                except BaseException:
+                    semaphore.release()
+                    raise
+                row_offset += len(frame)
+                batch.skipped_records += skipped
+                batch.total_records += len(conversions)
+
+                index = len(batch.chunk_progress)
+                batch.chunk_progress.append(
+                    {
+                        "chunk": index,
+                        "rows": len(frame),
+                        "records": len(conversions),
+                        "skipped_records": skipped,
+                        "status": OfflineConversionStatus.PROCESSING.value,
+                        "successful_records": 0,
+                        "failed_records": 0,
+                    }
+                )
+
+                if not conversions:
+                    batch.chunk_progress[index][
+                        "status"
+                    ] = OfflineConversionStatus.UPLOADED.value
+                    batch.chunks_completed += 1
+                    semaphore.release()
+                    continue
+
+                tasks.append(asyncio.create_task(upload_chunk(index, conversions)))
+        except (
+            Exception
+        ) as e:  # noqa: BLE001 - malformed input ends the read, not the batch
+            read_error = f"CSV read failed after {row_offset} rows: {e}"
+            logger.warning(f"Offline upload {batch_id}: {read_error}")
+        finally:
+            # Let in-flight chunks settle (they record their own failures);
+            # on cancellation, stop them rather than leaving them orphaned.
+            try:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            except asyncio.CancelledError:
+                for task in tasks:
+                    task.cancel()
+                batch.status = OfflineConversionStatus.FAILED
+                batch.error_summary = "Upload cancelled"
+                raise
+            finally:
+                if hash_executor is not None:
+                    hash_executor.shutdown(wait=False)
+
+        if batch.total_records == 0:
+            message = read_error or "No valid conversions found in CSV"
+            batch.status = OfflineConversionStatus.FAILED
+            batch.error_summary = message
+            return UploadResult(
+                batch_id=batch_id,
+                platform=platform,
+                success=False,
+                total_records=0,
+                successful_records=0,
+                failed_records=0,
+                errors=[{"message": message}],
+            )
+
+        errors = [error for result in results for error in result.errors]
+        if read_error:
+            errors.insert(0, {"message": read_error})
+        success = read_error is None and all(result.success for result in results)
+        batch.status = (
+            OfflineConversionStatus.UPLOADED
+            if success
+            else (
+                OfflineConversionStatus.PARTIAL
+                if batch.successful_records > 0
+                else OfflineConversionStatus.FAILED
+            )
+        )
+        if errors:
+            batch.error_summary = "; ".join(
+                str(e.get("message", "")) for e in errors[:3]
+            )
+
+        logger.info(
+            f"Offline upload {batch_id}: {batch.successful_records}/{batch.total_records} "
+            f"succeeded across {len(batch.chunk_progress)} chunks"
+        )
+
+        return UploadResult(
+            batch_id=batch_id,
+            platform=platform,
+            success=success,
+            total_records=batch.total_records,
+            successful_records=batch.successful_records,
+            failed_records=batch.failed_records,
+            errors=errors[:20],
+            platform_response=results[0].platform_response if results else None,
+        )
+
+    def _resolve_mapping(
+        self, column_mapping: Optional[Dict[str, Any]]
+    ) -> Dict[str, List[str]]:
+        """Merge a caller mapping over the defaults (str or list aliases)."""
+        mapping = {
+            field_name: list(aliases)
+            for field_name, aliases in self.DEFAULT_COLUMN_MAPPING.items()
+        }
+        for field_name, aliases in (column_mapping or {}).items():
+            mapping[field_name] = (
+                [aliases] if isinstance(aliases, str) else list(aliases)
+            )
+        return mapping
+
+    def _prepare_chunk(
+        self,
+        frame: pd.DataFrame,
+        platform: str,
+        mapping: Dict[str, List[str]],
+        row_offset: int,
+        hash_executor: Optional[Executor] = None,
+    ) -> Tuple[List[OfflineConversion], int]:
+        """
+        Turn one CSV chunk into hashed OfflineConversion records.
+
+        Column lookup, normalization, date/value parsing and PII hashing
+        are done per column rather than per row; each distinct PII value
+        is hashed once per chunk.
+
+        Returns:
+            (conversions, number of rows skipped for missing identifiers)
+        """
+        columns = {str(c).lower(): c for c in frame.columns}
+        empty = pd.Series("", index=frame.index, dtype=object)
+        row_numbers = pd.Series(
+            range(row_offset, row_offset + len(frame)), index=frame.index
+        )
+
+        def column(field_name: str) -> pd.Series:
+            # First non-empty value across the field's alias columns
+            values: Optional[pd.Series] = None
+            for alias in mapping.get(field_name, [field_name]):
+                actual = columns.get(alias.lower())
+                if actual is None:
+                    continue
+                col = frame[actual].astype(str).str.strip()
+                values = col if values is None else values.where(values != "", col)
+            return values if values is not None else empty
+
+        email = column("email")
+        phone = column("phone")
+        click_id = column("click_id")
+
+        # At least one identifier required
+        has_identifier = (email != "") | (phone != "") | (click_id != "")
+        skipped = int((~has_identifier).sum())
+        if skipped:
+            logger.warning(
+                f"Rows {row_offset}-{row_offset + len(frame) - 1}: "
+                f"{skipped} without user identifiers skipped"
+            )
+        if not has_identifier.any():
+            return [], skipped
+
+        frame = frame[has_identifier]
+        email, phone, click_id = (
+            email[has_identifier],
+            phone[has_identifier],
+            click_id[has_identifier],
+        )
+
+        def field_values(field_name: str) -> pd.Series:
+            return column(field_name)[has_identifier]
+
+        # Parse event time, trying each accepted format on the rows still unparsed
+        raw_time = field_values("event_time")
+        event_time = pd.Series(
+            pd.NaT, index=raw_time.index, dtype="datetime64[ns, UTC]"
+        )
+        for fmt in CSV_DATE_FORMATS:
+            pending = event_time.isna() & (raw_time != "")
+            if not pending.any():
+                break
+            event_time[pending] = pd.to_datetime(
+                raw_time[pending], format=fmt, errors="coerce", utc=True
+            )
+
+        # Parse value
+        conversion_value = pd.to_numeric(
+            field_values("conversion_value")
+            .str.replace(",", "", regex=False)
+            .str.replace("$", "", regex=False),
+            errors="coerce",
+        ).fillna(0.0)
+
+        # Normalize + hash PII with the same rules as the uploaders
+        hashed_email = self._hash_column(email.str.lower(), hash_executor)
+        hashed_phone = self._hash_column(
+            phone.str.replace(r"[ \-+]", "", regex=True), hash_executor
+        )
+        hashed_first = self._hash_column(
+            field_values("first_name").str.lower(), hash_executor
+        )
+        hashed_last = self._hash_column(
+            field_values("last_name").str.lower(), hash_executor
+        )
+
+        stamp = datetime.now().strftime("%Y%m%d%H%M%S")
+
+        def optional(series: pd.Series) -> List[Optional[str]]:
+            return [value or None for value in series.tolist()]
+
+        conversions = [
+            OfflineConversion(
+                conversion_id=f"{platform}_{row_number}_{stamp}",
+                platform=platform,
+                email=em,
+                phone=ph,
+                first_name=fn,
+                last_name=ln,
+                click_id=cid,
+                external_id=ext,
+                event_name=name or "Purchase",
+                event_time=None if pd.isna(ts) else ts.to_pydatetime(),
+                conversion_value=float(value),
+                currency=currency or "USD",
+                order_id=order,
+                source=OfflineConversionSource.CSV_UPLOAD,
+            )
+            for row_number, em, ph, fn, ln, cid, ext, name, ts, value, currency, order in zip(
+                row_numbers[has_identifier].tolist(),
+                hashed_email,
+                hashed_phone,
+                hashed_first,
+                hashed_last,
+                optional(click_id),
+                optional(field_values("external_id")),
+                field_values("event_name").tolist(),
+                event_time.tolist(),
+                conversion_value.tolist(),
+                field_values("currency").tolist(),
+                optional(field_values("order_id")),
+            )
+        ]
+        return conversions, skipped
+
+    @staticmethod
+    def _hash_column(
+        values: pd.Series, executor: Optional[Executor] = None
+    ) -> List[Optional[str]]:
+        """SHA-256 a normalized column, hashing each distinct value once."""
+        present = values[values != ""]
+        unique = [v for v in pd.unique(present) if not _is_sha256_hex(v)]
+        if executor is not None and unique:
+            digests = list(executor.map(_sha256_hex, unique, chunksize=1024))
+        else:
+            digests = [_sha256_hex(v) for v in unique]
+        lookup = dict(zip(unique, digests))
+        return [
+            (lookup.get(value, value) if value else None) for value in values.tolist()
+        ]
+
+    def get_batch_status(
+        self, batch_id: str, tenant_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get status of an upload batch.
+
+        With ``tenant_id``, a batch owned by another tenant is reported as
+        missing.
+        """
         batch = self._batches.get(batch_id)
         if not batch:
             return None
+        if tenant_id is not None and batch.tenant_id != tenant_id:
+            return None
 
         return {
             "batch_id": batch.batch_id,
@@ -828,6 +1297,9 @@ class OfflineConversionService:
             "total_records": batch.total_records,
             "successful_records": batch.successful_records,
             "failed_records": batch.failed_records,
+            "skipped_records": batch.skipped_records,
+            "chunks_completed": batch.chunks_completed,
+            "chunks": batch.chunk_progress,
             "error_summary": batch.error_summary,
         }
 
@@ -869,7 +1341,7 @@ class OfflineConversionService:
         List offline conversion batches.
 
         Args:
-            tenant_id: Tenant ID (for filtering in production)
+            tenant_id: Only batches owned by this tenant are listed
             platform: Filter by platform
             status: Filter by status
             limit: Maximum number of results
@@ -877,7 +1349,7 @@ class OfflineConversionService:
         Returns:
             List of batch information
         """
-        batches = list(self._batches.values())
+        batches = [b for b in self._batches.values() if b.tenant_id == tenant_id]
 
         if platform:
             batches = [b for b in batches if b.platform == platform]
@@ -54,6 +54,9 @@ class PacingAlertService:
     - Sudden performance drops (pacing cliff)
     """
 
+    # Alert types auto-resolved when a target is back on track
+    _PACING_ALERT_TYPES = [AlertType.UNDERPACING_SPEND, AlertType.OVERPACING_SPEND]
+
     def __init__(self, db: AsyncSession, tenant_id: int):
         self.db = db
         self.tenant_id = tenant_id
@@ -83,6 +86,16 @@ class PacingAlertService:
         if pacing.get("status") != "success":
             return []
 
+        return await self._check_pacing_alerts(target_id, pacing, as_of_date)
+
+    async def _check_pacing_alerts(
+        self,
+        target_id: UUID,
+        pacing: Dict[str, Any],
+        as_of_date: date,
+        open_alerts: Optional[List[PacingAlert]] = None,
+    ) -> List[PacingAlert]:
+        """Create and resolve alerts for a computed pacing result."""
         created_alerts = []
 
         # Check for underpacing
@@ -171,7 +184,9 @@ class PacingAlertService:
                     created_alerts.append(alert)
 
         # Auto-resolve alerts that are no longer valid
-        await self._resolve_outdated_alerts(target_id, pacing, as_of_date)
+        await self._resolve_outdated_alerts(
+            target_id, pacing, as_of_date, open_alerts=open_alerts
+        )
 
         return created_alerts
 
@@ -204,11 +219,35 @@ class PacingAlertService:
         )
         targets = result.scalars().all()
 
+        # Pacing for every target from one MTD query and one batched
+        # forecast, and the open pacing alerts they may resolve in one query
+        pacings = await self.pacing_service.get_targets_pacing(targets, as_of_date)
+        open_alerts: Dict[Any, List[PacingAlert]] = {t.id: [] for t in targets}
+        if targets:
+            result = await self.db.execute(
+                select(PacingAlert).where(
+                    and_(
+                        PacingAlert.target_id.in_(list(open_alerts)),
+                        PacingAlert.alert_type.in_(self._PACING_ALERT_TYPES),
+                        PacingAlert.status.in_(
+                            [AlertStatus.ACTIVE, AlertStatus.ACKNOWLEDGED]
+                        ),
+                    )
+                )
+            )
+            for alert in result.scalars().all():
+                open_alerts[alert.target_id].append(alert)
+
         total_alerts = 0
         targets_with_alerts = 0
 
         for target in targets:
-            alerts = await self.check_target_alerts(target.id, as_of_date)
+            pacing = pacings[target.id]
+            if pacing.get("status") != "success":
+                continue
+            alerts = await self._check_pacing_alerts(
+                target.id, pacing, as_of_date, open_alerts=open_alerts[target.id]
+            )
             if alerts:
                 total_alerts += len(alerts)
                 targets_with_alerts += 1
@@ -656,29 +695,33 @@ class PacingAlertService:
         target_id: UUID,
         pacing: Dict[str, Any],
         as_of_date: date,
+        open_alerts: Optional[List[PacingAlert]] = None,
     ) -> None:
-        """Auto-resolve alerts that are no longer valid."""
+        """
+        Auto-resolve alerts that are no longer valid.
+
+        ``open_alerts`` is the target's open pacing alerts when the caller
+        already loaded them; otherwise they are queried here.
+        """
         status_flags = pacing.get("status_flags", {})
 
         # If now on track, resolve underpacing/overpacing alerts
         if status_flags.get("on_track"):
-            result = await self.db.execute(
-                select(PacingAlert).where(
-                    and_(
-                        PacingAlert.target_id == target_id,
-                        PacingAlert.alert_type.in_(
-                            [
-                                AlertType.UNDERPACING_SPEND,
-                                AlertType.OVERPACING_SPEND,
-                            ]
-                        ),
-                        PacingAlert.status.in_(
-                            [AlertStatus.ACTIVE, AlertStatus.ACKNOWLEDGED]
-                        ),
+            if open_alerts is not None:
+                alerts_to_resolve = list(open_alerts)
+            else:
+                result = await self.db.execute(
+                    select(PacingAlert).where(
+                        and_(
+                            PacingAlert.target_id == target_id,
+                            PacingAlert.alert_type.in_(self._PACING_ALERT_TYPES),
+                            PacingAlert.status.in_(
+                                [AlertStatus.ACTIVE, AlertStatus.ACKNOWLEDGED]
+                            ),
+                        )
                     )
                 )
-            )
-            alerts_to_resolve = result.scalars().all()
+                alerts_to_resolve = result.scalars().all()
 
             for alert in alerts_to_resolve:
                 alert.status = AlertStatus.RESOLVED
@@ -9,13 +9,19 @@ Features:
 - Day-of-week seasonality adjustment
 - Confidence intervals based on residual variance
 - Support for spend, revenue, ROAS, conversions forecasting
+- BatchForecaster: the same model for many targets from one history query,
+  computed as array operations (used by the pacing alert sweep)
 """
 
 import math
+from collections.abc import Sequence
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import and_, func, select
+import numpy as np
+import pandas as pd
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logging import get_logger
@@ -466,3 +472,254 @@ class ForecastingService:
             self.db.add(forecast)
 
         await self.db.commit()
+
+
+# =============================================================================
+# Batch Forecasting
+# =============================================================================
+
+# DailyKPI columns needed to derive any TargetMetric value
+KPI_VALUE_COLUMNS = (
+    "spend_cents",
+    "revenue_cents",
+    "roas",
+    "conversions",
+    "leads",
+    "crm_leads",
+    "crm_pipeline_cents",
+    "crm_won_revenue_cents",
+    "cpa_cents",
+    "cpl_cents",
+)
+
+
+def metric_values(frame: pd.DataFrame, metric: TargetMetric) -> np.ndarray:
+    """
+    Column-wise ``_get_metric_value`` over DailyKPI rows.
+
+    NaN marks rows the scalar version maps to None (a missing ROAS, or a
+    metric DailyKPI does not carry).
+    """
+
+    def cents(column: str) -> np.ndarray:
+        return frame[column].fillna(0).to_numpy(dtype=float) / 100
+
+    if metric == TargetMetric.SPEND:
+        return cents("spend_cents")
+    elif metric == TargetMetric.REVENUE:
+        return cents("revenue_cents")
+    elif metric == TargetMetric.ROAS:
+        return frame["roas"].to_numpy(dtype=float)
+    elif metric == TargetMetric.CONVERSIONS:
+        return frame["conversions"].to_numpy(dtype=float)
+    elif metric == TargetMetric.LEADS:
+        return (frame["leads"] + frame["crm_leads"]).to_numpy(dtype=float)
+    elif metric == TargetMetric.PIPELINE_VALUE:
+        return cents("crm_pipeline_cents")
+    elif metric == TargetMetric.WON_REVENUE:
+        return cents("crm_won_revenue_cents")
+    elif metric == TargetMetric.CPA:
+        return cents("cpa_cents")
+    elif metric == TargetMetric.CPL:
+        return cents("cpl_cents")
+    return np.full(len(frame), np.nan)
+
+
+def scope_filter(column, values: Sequence[Optional[str]]):
+    """``column`` is NULL or one of the non-null ``values``."""
+    named = sorted({v for v in values if v})
+    if named:
+        return or_(column.is_(None), column.in_(named))
+    return column.is_(None)
+
+
+@dataclass
+class BatchForecastModel:
+    """Fitted EWMA/day-of-week parameters, one row per series."""
+
+    historical_days: np.ndarray  # (n,)
+    ewma: np.ndarray  # (n,)
+    dow_factors: np.ndarray  # (n, 7)
+    residual_std: np.ndarray  # (n,)
+
+    def horizon_totals(
+        self, as_of_date: date, horizons: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Summed daily point, lower and upper forecasts over each horizon.
+
+        Matches summing ``forecast_metric``'s rounded ``daily_forecasts``
+        for ``horizons[i]`` days after ``as_of_date``.
+        """
+        horizons = np.asarray(horizons, dtype=int)
+        steps = int(horizons.max()) if horizons.size else 0
+        offsets = np.arange(steps)
+        future_dow = np.array(
+            [(as_of_date + timedelta(days=int(k) + 1)).weekday() for k in offsets],
+            dtype=int,
+        )
+        point = self.ewma[:, None] * self.dow_factors[:, future_dow]
+        ci_width = (
+            1.645 * self.residual_std[:, None] * np.sqrt(1 + offsets * 0.1)[None, :]
+        )
+        lower = np.maximum(0, point - ci_width)
+        upper = point + ci_width
+        in_horizon = offsets[None, :] < horizons[:, None]
+        return tuple(
+            np.where(in_horizon, np.round(values, 2), 0.0).sum(axis=1)
+            for values in (point, lower, upper)
+        )
+
+
+class BatchForecaster:
+    """
+    ``ForecastingService``'s EWMA/day-of-week model for many series at once.
+
+    History for every target scope is read with one query. Each series is
+    right-aligned in a (series x observation) matrix, so the EWMA becomes a
+    weighted row sum, day-of-week factors become seven masked row means,
+    and forecasts over every horizon are one broadcast. Results match the
+    per-target path, which treats each DailyKPI row as one observation.
+    """
+
+    MIN_HISTORY_DAYS = 7
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        tenant_id: int,
+        ewma_alpha: float = ForecastingService.DEFAULT_EWMA_ALPHA,
+    ):
+        self.db = db
+        self.tenant_id = tenant_id
+        self.ewma_alpha = ewma_alpha
+
+    async def forecast_targets(
+        self,
+        targets: Sequence[Target],
+        as_of_date: date,
+        horizons: Sequence[int],
+        days: int = 60,
+    ) -> Dict[Any, Optional[Tuple[float, float, float]]]:
+        """
+        Remaining-period forecast totals per target id.
+
+        Returns ``(point, lower, upper)`` summed over ``horizons[i]`` days
+        for each target, or None where history is shorter than a week (the
+        per-target path reports ``insufficient_data`` there).
+        """
+        if not targets:
+            return {}
+        history = await self._load_history(targets, as_of_date, days)
+        groups = history.groupby(["scope_platform", "scope_campaign"], sort=False)
+        indices = groups.indices if len(history) else {}
+
+        values, dows = [], []
+        for target in targets:
+            rows = indices.get((target.platform or "", target.campaign_id or ""))
+            if rows is None:
+                values.append(np.empty(0))
+                dows.append(np.empty(0, dtype=int))
+                continue
+            scoped = history.iloc[rows]
+            series = metric_values(scoped, target.metric_type)
+            present = ~np.isnan(series)
+            values.append(series[present])
+            dows.append(scoped["day_of_week"].to_numpy(dtype=int)[present])
+
+        model = self.fit(values, dows)
+        point, lower, upper = model.horizon_totals(as_of_date, np.asarray(horizons))
+        enough = model.historical_days >= self.MIN_HISTORY_DAYS
+        return {
+            target.id: (
+                (float(point[i]), float(lower[i]), float(upper[i]))
+                if enough[i]
+                else None
+            )
+            for i, target in enumerate(targets)
+        }
+
+    def fit(
+        self, values: Sequence[np.ndarray], dows: Sequence[np.ndarray]
+    ) -> BatchForecastModel:
+        """Fit every series (oldest observation first) in one pass."""
+        n = np.array([len(v) for v in values], dtype=int)
+        width = max(int(n.max()) if n.size else 0, 1)
+        V = np.zeros((len(values), width))
+        D = np.full((len(values), width), -1, dtype=int)
+        for i, (series, dow) in enumerate(zip(values, dows)):
+            if len(series):
+                V[i, width - len(series) :] = series
+                D[i, width - len(series) :] = dow
+        valid = D >= 0
+        column = np.arange(width)
+        age = width - 1 - column  # observations after this one
+
+        # EWMA seeded with the first observation:
+        # (1-a)^(n-1) x_0 + sum_k a (1-a)^(n-1-k) x_k
+        alpha = self.ewma_alpha
+        weights = np.where(valid, alpha * (1 - alpha) ** age, 0.0)
+        has_data = n > 0
+        first = width - n[has_data]
+        weights[has_data, first] = (1 - alpha) ** (n[has_data] - 1)
+        ewma = (V * weights).sum(axis=1)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            overall_mean = np.where(has_data, V.sum(axis=1) / np.maximum(n, 1), 1.0)
+            window = valid & (age < ForecastingService.DEFAULT_SEASONALITY_WINDOW)
+            factors = np.ones((len(values), 7))
+            for dow in range(7):
+                in_dow = window & (D == dow)
+                count = in_dow.sum(axis=1)
+                dow_mean = (V * in_dow).sum(axis=1) / np.maximum(count, 1)
+                factors[:, dow] = np.where(
+                    (count > 0) & (overall_mean > 0),
+                    dow_mean / np.where(overall_mean > 0, overall_mean, 1.0),
+                    1.0,
+                )
+
+        recent = valid & (age < ForecastingService.DEFAULT_TREND_WINDOW)
+        expected = ewma[:, None] * np.take_along_axis(factors, np.clip(D, 0, 6), axis=1)
+        squared = np.where(recent, (V - expected) ** 2, 0.0)
+        residual_std = np.where(
+            n < 3,
+            ewma * 0.2,
+            np.sqrt(squared.sum(axis=1) / np.maximum(recent.sum(axis=1), 1)),
+        )
+        return BatchForecastModel(n, ewma, factors, residual_std)
+
+    async def _load_history(
+        self, targets: Sequence[Target], as_of_date: date, days: int
+    ) -> pd.DataFrame:
+        """Rows for every target scope in one query, oldest first."""
+        columns = [getattr(DailyKPI, c) for c in KPI_VALUE_COLUMNS]
+        result = await self.db.execute(
+            select(
+                DailyKPI.platform,
+                DailyKPI.campaign_id,
+                DailyKPI.date,
+                DailyKPI.day_of_week,
+                *columns,
+            )
+            .where(
+                DailyKPI.tenant_id == self.tenant_id,
+                DailyKPI.date >= as_of_date - timedelta(days=days),
+                DailyKPI.date <= as_of_date,
+                scope_filter(DailyKPI.platform, [t.platform for t in targets]),
+                scope_filter(DailyKPI.campaign_id, [t.campaign_id for t in targets]),
+            )
+            .order_by(DailyKPI.date, DailyKPI.account_id)
+        )
+        frame = pd.DataFrame(
+            result.all(),
+            columns=[
+                "platform",
+                "campaign_id",
+                "date",
+                "day_of_week",
+                *KPI_VALUE_COLUMNS,
+            ],
+        )
+        frame["scope_platform"] = frame["platform"].fillna("")
+        frame["scope_campaign"] = frame["campaign_id"].fillna("")
+        return frame
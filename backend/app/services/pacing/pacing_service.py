@@ -12,10 +12,13 @@ Features:
 - Pacing summary snapshots
 """
 
+from collections.abc import Sequence
 from datetime import date, datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
+import numpy as np
+import pandas as pd
 from sqlalchemy import and_, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -32,7 +35,13 @@ from app.models.pacing import (
     TargetMetric,
     TargetPeriod,
 )
-from app.services.pacing.forecasting import ForecastingService
+from app.services.pacing.forecasting import (
+    KPI_VALUE_COLUMNS,
+    BatchForecaster,
+    ForecastingService,
+    metric_values,
+    scope_filter,
+)
 
 logger = get_logger(__name__)
 
@@ -91,13 +100,88 @@ class PacingService:
         if not target:
             return {"status": "error", "message": "Target not found"}
 
-        if not target.is_active:
-            return {"status": "error", "message": "Target is inactive"}
+        unavailable = self._unavailable_pacing(target, as_of_date)
+        if unavailable is not None:
+            return unavailable
 
-        # Calculate period metrics
-        period_days = (target.period_end - target.period_start).days + 1
-        days_elapsed = max(0, (as_of_date - target.period_start).days + 1)
+        # Get MTD actual
+        mtd_actual = await self._get_mtd_actual(
+            target.metric_type,
+            target.platform,
+            getattr(target, "account_id", None),
+            target.campaign_id,
+            target.period_start,
+            as_of_date,
+        )
+
+        # Get forecast for remaining period
+        forecast_totals = None
         days_remaining = max(0, (target.period_end - as_of_date).days)
+        if days_remaining > 0:
+            forecast = await self.forecasting.forecast_metric(
+                target.metric_type,
+                forecast_days=days_remaining,
+                platform=target.platform,
+                campaign_id=target.campaign_id,
+                as_of_date=as_of_date,
+            )
+
+            if forecast.get("status") == "success":
+                daily = forecast.get("daily_forecasts", [])
+                forecast_totals = (
+                    sum(f["point_forecast"] for f in daily),
+                    sum(f["lower_bound"] for f in daily),
+                    sum(f["upper_bound"] for f in daily),
+                )
+
+        return self._build_pacing(target, as_of_date, mtd_actual, forecast_totals)
+
+    async def get_targets_pacing(
+        self,
+        targets: Sequence[Target],
+        as_of_date: date,
+    ) -> Dict[Any, Dict[str, Any]]:
+        """
+        Pacing for many already-loaded targets, keyed by target id.
+
+        Same result as ``get_target_pacing`` per target, but MTD actuals
+        come from one DailyKPI query and forecasts from one
+        ``BatchForecaster`` pass instead of three queries per target.
+        """
+        results: Dict[Any, Dict[str, Any]] = {}
+        live = []
+        for target in targets:
+            unavailable = self._unavailable_pacing(target, as_of_date)
+            if unavailable is not None:
+                results[target.id] = unavailable
+            else:
+                live.append(target)
+        if not live:
+            return results
+
+        mtd_actuals = await self._get_mtd_actuals(live, as_of_date)
+
+        forecasting = [t for t in live if t.period_end > as_of_date]
+        forecasts = await BatchForecaster(
+            self.db, self.tenant_id, self.forecasting.ewma_alpha
+        ).forecast_targets(
+            forecasting,
+            as_of_date,
+            [(t.period_end - as_of_date).days for t in forecasting],
+        )
+
+        for target in live:
+            results[target.id] = self._build_pacing(
+                target, as_of_date, mtd_actuals[target.id], forecasts.get(target.id)
+            )
+        return results
+
+    def _unavailable_pacing(
+        self, target: Target, as_of_date: date
+    ) -> Optional[Dict[str, Any]]:
+        """Result for targets pacing cannot be computed for, else None."""
+        if not target.is_active:
+            return {"status": "error", "message": "Target is inactive"}
 
         # Handle dates outside period
         if as_of_date < target.period_start:
@@ -115,16 +199,25 @@ class PacingService:
                 "target_id": str(target.id),
                 "period_end": target.period_end.isoformat(),
             }
+        return None
 
-        # Get MTD actual
-        mtd_actual = await self._get_mtd_actual(
-            target.metric_type,
-            target.platform,
-            getattr(target, "account_id", None),
-            target.campaign_id,
-            target.period_start,
-            as_of_date,
-        )
+    def _build_pacing(
+        self,
+        target: Target,
+        as_of_date: date,
+        mtd_actual: float,
+        forecast_totals: Optional[Tuple[float, float, float]],
+    ) -> Dict[str, Any]:
+        """
+        Pacing result from the MTD actual and the remaining-period forecast.
+
+        ``forecast_totals`` is the summed (point, lower, upper) forecast,
+        or None when no forecast is available (linear fallback).
+        """
+        # Calculate period metrics
+        period_days = (target.period_end - target.period_start).days + 1
+        days_elapsed = max(0, (as_of_date - target.period_start).days + 1)
+        days_remaining = max(0, (target.period_end - as_of_date).days)
 
         # Calculate expected (pro-rated target)
         progress_pct = days_elapsed / period_days
@@ -142,25 +235,8 @@ class PacingService:
         projected_upper = mtd_actual
 
         if days_remaining > 0:
-            forecast = await self.forecasting.forecast_metric(
-                target.metric_type,
-                forecast_days=days_remaining,
-                platform=target.platform,
-                campaign_id=target.campaign_id,
-                as_of_date=as_of_date,
-            )
-
-            if forecast.get("status") == "success":
-                remaining_forecast = sum(
-                    f["point_forecast"] for f in forecast.get("daily_forecasts", [])
-                )
-                remaining_lower = sum(
-                    f["lower_bound"] for f in forecast.get("daily_forecasts", [])
-                )
-                remaining_upper = sum(
-                    f["upper_bound"] for f in forecast.get("daily_forecasts", [])
-                )
-
+            if forecast_totals is not None:
+                remaining_forecast, remaining_lower, remaining_upper = forecast_totals
                 projected_eom = mtd_actual + remaining_forecast
                 projected_lower = mtd_actual + remaining_lower
                 projected_upper = mtd_actual + remaining_upper
@@ -571,6 +647,64 @@ class PacingService:
 
         return total
 
+    async def _get_mtd_actuals(
+        self, targets: Sequence[Target], as_of_date: date
+    ) -> Dict[Any, float]:
+        """``_get_mtd_actual`` for every target from a single query."""
+        columns = [getattr(DailyKPI, c) for c in KPI_VALUE_COLUMNS]
+        result = await self.db.execute(
+            select(
+                DailyKPI.platform,
+                DailyKPI.account_id,
+                DailyKPI.campaign_id,
+                DailyKPI.date,
+                *columns,
+            ).where(
+                DailyKPI.tenant_id == self.tenant_id,
+                DailyKPI.date >= min(t.period_start for t in targets),
+                DailyKPI.date <= as_of_date,
+                scope_filter(DailyKPI.platform, [t.platform for t in targets]),
+                scope_filter(
+                    DailyKPI.account_id,
+                    [getattr(t, "account_id", None) for t in targets],
+                ),
+                scope_filter(DailyKPI.campaign_id, [t.campaign_id for t in targets]),
+            )
+        )
+        frame = pd.DataFrame(
+            result.all(),
+            columns=[
+                "platform",
+                "account_id",
+                "campaign_id",
+                "date",
+                *KPI_VALUE_COLUMNS,
+            ],
+        )
+        scope = ["platform", "account_id", "campaign_id"]
+        indices = (
+            frame[scope].fillna("").groupby(scope, sort=False).indices
+            if len(frame)
+            else {}
+        )
+
+        actuals: Dict[Any, float] = {}
+        for target in targets:
+            key = (
+                target.platform or "",
+                getattr(target, "account_id", None) or "",
+                target.campaign_id or "",
+            )
+            rows = indices.get(key)
+            if rows is None:
+                actuals[target.id] = 0.0
+                continue
+            scoped = frame.iloc[rows]
+            in_period = (scoped["date"] >= target.period_start).to_numpy()
+            values = metric_values(scoped, target.metric_type)[in_period]
+            actuals[target.id] = float(np.nansum(values))
+        return actuals
+
     def _get_metric_value(
         self, record: DailyKPI, metric: TargetMetric
     ) -> Optional[float]:
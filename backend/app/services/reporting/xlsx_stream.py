@@ -0,0 +1,155 @@
+# =============================================================================
+# Stratum AI - Streaming XLSX Writer
+# =============================================================================
+"""
+Minimal SpreadsheetML (.xlsx) writer that emits bytes as rows are added.
+
+An .xlsx file is a zip of XML parts. Worksheets are written as deflated zip
+entries straight into an unseekable sink (zipfile then uses data
+descriptors), and the sink is drained after every call, so memory stays
+flat however many rows are written. Cells are inline strings or numbers;
+no styles or shared-string table are produced.
+"""
+
+import io
+import re
+import zipfile
+from collections.abc import Iterable
+from typing import Any, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Characters XML 1.0 cannot carry, even escaped
+_ILLEGAL_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Unseekable write target whose contents are drained by the caller."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return "<c/>"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f"<c><v>{value}</v></c>"
+    text = _ILLEGAL_XML.sub("", str(value))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(text)}</t></is></c>'
+
+
+class XlsxStreamWriter:
+    """
+    Write sheets row by row; every method returns the bytes ready to send.
+
+    Usage:
+        writer = XlsxStreamWriter()
+        yield writer.start_sheet("Campaigns")
+        for row in rows:
+            yield writer.write_row(row)
+        yield writer.close()
+    """
+
+    def __init__(self):
+        self._sink = _ChunkSink()
+        self._zip = zipfile.ZipFile(self._sink, "w", zipfile.ZIP_DEFLATED)
+        self._sheet_names: list[str] = []
+        self._sheet: Optional[Any] = None
+
+    def start_sheet(self, name: str) -> bytes:
+        """Finish the current sheet (if any) and open a new one."""
+        self._end_sheet()
+        title = re.sub(r"[\[\]:*?/\\]", "", name)[:31] or "Sheet"
+        if title in self._sheet_names:
+            title = f"{title[:28]}_{len(self._sheet_names) + 1}"
+        self._sheet_names.append(title)
+        path = f"xl/worksheets/sheet{len(self._sheet_names)}.xml"
+        self._sheet = self._zip.open(path, "w", force_zip64=True)
+        self._sheet.write(
+            f'{XML_DECL}<worksheet xmlns="{MAIN_NS}"><sheetData>'.encode()
+        )
+        return self._sink.drain()
+
+    def write_row(self, values: Iterable[Any]) -> bytes:
+        if self._sheet is None:
+            self.start_sheet("Sheet1")
+        cells = "".join(_cell(value) for value in values)
+        self._sheet.write(f"<row>{cells}</row>".encode())
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        """Write the workbook parts and the zip directory."""
+        if not self._sheet_names:
+            self.start_sheet("Sheet1")
+        self._end_sheet()
+
+        count = len(self._sheet_names)
+        sheets = "".join(
+            f'<sheet name={quoteattr(name)} sheetId="{i}" r:id="rId{i}"/>'
+            for i, name in enumerate(self._sheet_names, start=1)
+        )
+        sheet_rels = "".join(
+            f'<Relationship Id="rId{i}" Type="{REL_NS}/worksheet" '
+            f'Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, count + 1)
+        )
+        sheet_types = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType='
+            '"application/vnd.openxmlformats-officedocument.spreadsheetml'
+            '.worksheet+xml"/>'
+            for i in range(1, count + 1)
+        )
+        parts = {
+            "[Content_Types].xml": (
+                f"{XML_DECL}<Types xmlns="
+                '"http://schemas.openxmlformats.org/package/2006/content-types">'
+                '<Default Extension="rels" ContentType='
+                '"application/vnd.openxmlformats-package.relationships+xml"/>'
+                '<Default Extension="xml" ContentType="application/xml"/>'
+                '<Override PartName="/xl/workbook.xml" ContentType='
+                '"application/vnd.openxmlformats-officedocument.spreadsheetml'
+                f'.sheet.main+xml"/>{sheet_types}</Types>'
+            ),
+            "_rels/.rels": (
+                f'{XML_DECL}<Relationships xmlns="{PKG_REL_NS}">'
+                f'<Relationship Id="rId1" Type="{REL_NS}/officeDocument" '
+                'Target="xl/workbook.xml"/></Relationships>'
+            ),
+            "xl/workbook.xml": (
+                f'{XML_DECL}<workbook xmlns="{MAIN_NS}" xmlns:r="{REL_NS}">'
+                f"<sheets>{sheets}</sheets></workbook>"
+            ),
+            "xl/_rels/workbook.xml.rels": (
+                f'{XML_DECL}<Relationships xmlns="{PKG_REL_NS}">'
+                f"{sheet_rels}</Relationships>"
+            ),
+        }
+        for path, xml in parts.items():
+            self._zip.writestr(path, xml)
+        self._zip.close()
+        return self._sink.drain()
+
+    def _end_sheet(self) -> None:
+        if self._sheet is not None:
+            self._sheet.write(b"</sheetData></worksheet>")
+            self._sheet.close()
+            self._sheet = None
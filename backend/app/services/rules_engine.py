@@ -4,10 +4,19 @@
 """
 IFTTT-style automation rules engine.
 Implements Module C: Stratum Automation.
+
+Rules are compiled once (field lookup, parsed threshold, comparator, scope)
+and evaluated together against a single load of the tenant's campaigns, so
+evaluating R rules over C campaigns costs one campaign query per tenant
+rather than one per rule. The compiled path is shared by ``RulesEngine``
+and the Celery evaluator in ``app.workers.tasks.rules``.
 """
 
+import json
+import operator as op
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -25,6 +34,222 @@ from app.models import (
 logger = get_logger(__name__)
 
 
+# =============================================================================
+# Compiled Evaluation
+# =============================================================================
+
+#: Metrics derived from campaign totals. Direct campaign attributes take
+#: precedence over these.
+COMPUTED_FIELDS: Dict[str, Callable[[Any], Any]] = {
+    "spend": lambda c: c.total_spend_cents / 100,
+    "revenue": lambda c: c.revenue_cents / 100,
+    "cpc": lambda c: (c.total_spend_cents / c.clicks / 100) if c.clicks > 0 else None,
+    "cpm": lambda c: (
+        (c.total_spend_cents / c.impressions * 1000 / 100)
+        if c.impressions > 0
+        else None
+    ),
+    "cpa": lambda c: (
+        (c.total_spend_cents / c.conversions / 100) if c.conversions > 0 else None
+    ),
+    "conversion_rate": lambda c: (
+        (c.conversions / c.clicks * 100) if c.clicks > 0 else None
+    ),
+}
+
+_COMPARATORS: Dict[RuleOperator, Callable[[Any, Any], Any]] = {
+    RuleOperator.EQUALS: op.eq,
+    RuleOperator.NOT_EQUALS: op.ne,
+    RuleOperator.GREATER_THAN: op.gt,
+    RuleOperator.LESS_THAN: op.lt,
+    RuleOperator.GREATER_THAN_OR_EQUAL: op.ge,
+    RuleOperator.LESS_THAN_OR_EQUAL: op.le,
+    RuleOperator.CONTAINS: lambda actual, expected: str(expected) in str(actual),
+    RuleOperator.IN: lambda actual, expected: actual in expected,
+}
+
+
+def get_field_value(campaign: Any, field_name: str) -> Optional[Any]:
+    """Get a field value from a campaign, handling computed fields."""
+    if hasattr(campaign, field_name):
+        return getattr(campaign, field_name)
+    compute = COMPUTED_FIELDS.get(field_name)
+    return compute(campaign) if compute else None
+
+
+def parse_value(value: str, target_type: type) -> Any:
+    """Parse a string condition value to the target type."""
+    if target_type == float:
+        return float(value)
+    elif target_type == int:
+        return int(float(value))
+    elif target_type == bool:
+        return value.lower() in ("true", "1", "yes")
+    elif target_type == list:
+        return json.loads(value) if value.startswith("[") else [value]
+    return value
+
+
+def get_comparator(
+    operator: RuleOperator,
+) -> Optional[Callable[[Any, Any], Any]]:
+    """Resolve the comparison function for a rule operator, or None."""
+    try:
+        return _COMPARATORS[RuleOperator(operator)]
+    except (ValueError, KeyError):
+        return None
+
+
+def compare_values(actual: Any, operator: RuleOperator, expected: Any) -> bool:
+    """Compare two values based on the operator."""
+    comparator = get_comparator(operator)
+    return bool(comparator(actual, expected)) if comparator else False
+
+
+def _scope_key(value: Any) -> Any:
+    # Enum members hash by name, not value; compare platforms by their value.
+    return getattr(value, "value", value)
+
+
+@dataclass
+class CompiledRule:
+    """A rule reduced to what evaluation needs, prepared once per run."""
+
+    rule: Any
+    field_name: str
+    operator: RuleOperator
+    comparator: Optional[Callable[[Any, Any], Any]]
+    raw_value: str
+    campaign_ids: Optional[frozenset] = None
+    platforms: Optional[frozenset] = None
+    # Parsed threshold per actual-value type: (ok, value or error message)
+    _expected: Dict[type, Tuple[bool, Any]] = field(default_factory=dict, repr=False)
+
+    def applies_to(self, campaign: Any) -> bool:
+        """Whether the campaign is within this rule's scope."""
+        if self.campaign_ids is not None and campaign.id not in self.campaign_ids:
+            return False
+        if (
+            self.platforms is not None
+            and _scope_key(campaign.platform) not in self.platforms
+        ):
+            return False
+        return True
+
+    def expected_for(self, target_type: type) -> Tuple[bool, Any]:
+        cached = self._expected.get(target_type)
+        if cached is None:
+            try:
+                cached = (True, parse_value(self.raw_value, target_type))
+            except (ValueError, TypeError, AttributeError) as e:
+                cached = (False, str(e))
+            self._expected[target_type] = cached
+        return cached
+
+    def evaluate(self, actual: Any) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Evaluate the condition against one resolved field value.
+
+        Returns:
+            (matched, condition). ``condition`` describes the comparison, or
+            carries a ``reason`` when it could not be made.
+        """
+        if actual is None:
+            return False, {
+                "field": self.field_name,
+                "reason": f"Field '{self.field_name}' not found or null",
+            }
+
+        ok, expected = self.expected_for(type(actual))
+        if not ok:
+            return False, {
+                "field": self.field_name,
+                "reason": f"Invalid condition value: {expected}",
+            }
+
+        try:
+            matched = (
+                bool(self.comparator(actual, expected)) if self.comparator else False
+            )
+        except TypeError as e:
+            return False, {
+                "field": self.field_name,
+                "reason": f"Cannot compare values: {e}",
+            }
+
+        return matched, {
+            "field": self.field_name,
+            "operator": getattr(self.operator, "value", self.operator),
+            "expected": expected,
+            "actual": actual,
+        }
+
+
+class CampaignEvaluation(NamedTuple):
+    """One rule's verdict for one in-scope campaign."""
+
+    campaign: Any
+    matched: bool
+    condition: Dict[str, Any]
+
+
+def compile_rule(rule: Any) -> CompiledRule:
+    """Compile a rule's condition and scope for repeated evaluation."""
+    campaigns = getattr(rule, "applies_to_campaigns", None)
+    platforms = getattr(rule, "applies_to_platforms", None)
+    return CompiledRule(
+        rule=rule,
+        field_name=rule.condition_field,
+        operator=rule.condition_operator,
+        comparator=get_comparator(rule.condition_operator),
+        raw_value=rule.condition_value,
+        campaign_ids=frozenset(campaigns) if campaigns else None,
+        platforms=frozenset(_scope_key(p) for p in platforms) if platforms else None,
+    )
+
+
+def rule_cooldown_end(rule: Any, now: datetime) -> Optional[datetime]:
+    """End of the rule's cooldown if it is still cooling down at ``now``."""
+    if not rule.last_triggered_at:
+        return None
+    cooldown_end = rule.last_triggered_at + timedelta(hours=rule.cooldown_hours)
+    return cooldown_end if now < cooldown_end else None
+
+
+def build_metric_frame(
+    campaigns: Sequence[Any], field_names: Sequence[str]
+) -> List[Dict[str, Any]]:
+    """Resolve every referenced field once per campaign."""
+    return [{f: get_field_value(c, f) for f in field_names} for c in campaigns]
+
+
+def evaluate_compiled_rules(
+    compiled_rules: Sequence[CompiledRule],
+    campaigns: Sequence[Any],
+) -> List[List[CampaignEvaluation]]:
+    """
+    Evaluate all rules against the same campaigns in one pass.
+
+    Every rule sees the campaigns as loaded (actions applied for one rule
+    do not change what another rule is evaluated against in this pass).
+
+    Returns:
+        One list of evaluations per compiled rule, in input order, holding
+        only the campaigns within that rule's scope.
+    """
+    results: List[List[CampaignEvaluation]] = [[] for _ in compiled_rules]
+    field_names = list(dict.fromkeys(r.field_name for r in compiled_rules))
+    frame = build_metric_frame(campaigns, field_names)
+
+    for campaign, row in zip(campaigns, frame):
+        for i, compiled in enumerate(compiled_rules):
+            if not compiled.applies_to(campaign):
+                continue
+            matched, condition = compiled.evaluate(row[compiled.field_name])
+            results[i].append(CampaignEvaluation(campaign, matched, condition))
+    return results
+
+
 class RulesEngine:
     """
     Rules engine that evaluates IFTTT-style automation rules.
@@ -64,43 +289,91 @@ class RulesEngine:
         Returns:
             Evaluation results
         """
-        # Check if rule is active
-        if rule.status != RuleStatus.ACTIVE and not dry_run:
-            return {
-                "status": "skipped",
-                "reason": "Rule is not active",
-            }
+        return (await self.evaluate_rules([rule], dry_run=dry_run))[0]
 
-        # Check cooldown
-        if rule.last_triggered_at and not dry_run:
-            cooldown_end = rule.last_triggered_at + timedelta(hours=rule.cooldown_hours)
-            if datetime.now(timezone.utc) < cooldown_end:
-                return {
+    async def evaluate_rules(
+        self,
+        rules: Sequence[Rule],
+        dry_run: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate several rules against one load of the tenant's campaigns.
+
+        Args:
+            rules: Rules to evaluate (all belonging to this tenant)
+            dry_run: If True, don't execute actions (for testing)
+
+        Returns:
+            One result per rule, in input order, shaped like ``evaluate_rule``
+        """
+        now = datetime.now(timezone.utc)
+        outcomes: List[Optional[Dict[str, Any]]] = [None] * len(rules)
+        runnable: List[int] = []
+
+        for i, rule in enumerate(rules):
+            # Check if rule is active
+            if rule.status != RuleStatus.ACTIVE and not dry_run:
+                outcomes[i] = {
+                    "status": "skipped",
+                    "reason": "Rule is not active",
+                }
+                continue
+
+            # Check cooldown
+            cooldown_end = None if dry_run else rule_cooldown_end(rule, now)
+            if cooldown_end:
+                outcomes[i] = {
                     "status": "skipped",
                     "reason": "Rule is in cooldown",
                     "cooldown_ends": cooldown_end.isoformat(),
                 }
+                continue
 
-        # Get campaigns to evaluate
-        campaigns = await self._get_applicable_campaigns(rule)
+            runnable.append(i)
+
+        if not runnable:
+            return outcomes
+
+        compiled = [compile_rule(rules[i]) for i in runnable]
+        campaigns = await self._get_tenant_campaigns()
+        evaluations = evaluate_compiled_rules(compiled, campaigns)
+
+        triggered = False
+        for i, rule_evaluations in zip(runnable, evaluations):
+            outcomes[i] = await self._apply_evaluations(
+                rules[i], rule_evaluations, dry_run, now
+            )
+            triggered = triggered or outcomes[i]["campaigns_matched"] > 0
+
+        if triggered and not dry_run:
+            await self.db.commit()
 
-        if not campaigns:
+        return outcomes
+
+    async def _apply_evaluations(
+        self,
+        rule: Rule,
+        evaluations: List[CampaignEvaluation],
+        dry_run: bool,
+        now: datetime,
+    ) -> Dict[str, Any]:
+        """Execute actions for matched campaigns and shape the rule result."""
+        if not evaluations:
             return {
                 "status": "completed",
                 "campaigns_evaluated": 0,
                 "campaigns_matched": 0,
             }
 
-        # Evaluate each campaign
         results = []
-        matched_campaigns = []
+        matched = 0
 
-        for campaign in campaigns:
-            evaluation = await self._evaluate_condition(rule, campaign)
+        for campaign, is_match, condition in evaluations:
+            evaluation = self._format_evaluation(campaign, is_match, condition)
             results.append(evaluation)
 
-            if evaluation["matched"]:
-                matched_campaigns.append(campaign)
+            if is_match:
+                matched += 1
 
                 if not dry_run:
                     # Execute action
@@ -111,38 +384,44 @@ class RulesEngine:
                     await self._log_execution(rule, campaign, evaluation, action_result)
 
         # Update rule metadata if any matched
-        if matched_campaigns and not dry_run:
-            rule.last_evaluated_at = datetime.now(timezone.utc)
-            rule.last_triggered_at = datetime.now(timezone.utc)
+        if matched and not dry_run:
+            rule.last_evaluated_at = now
+            rule.last_triggered_at = now
             rule.trigger_count += 1
-            await self.db.commit()
 
         return {
             "status": "completed",
-            "campaigns_evaluated": len(campaigns),
-            "campaigns_matched": len(matched_campaigns),
+            "campaigns_evaluated": len(evaluations),
+            "campaigns_matched": matched,
             "dry_run": dry_run,
             "results": results,
         }
 
-    async def _get_applicable_campaigns(self, rule: Rule) -> List[Campaign]:
-        """Get campaigns that this rule applies to."""
-        query = select(Campaign).where(
-            Campaign.tenant_id == self.tenant_id,
-            Campaign.is_deleted == False,
+    async def _get_tenant_campaigns(self) -> List[Campaign]:
+        """Load the tenant's campaigns once; rule scope is applied in memory."""
+        result = await self.db.execute(
+            select(Campaign).where(
+                Campaign.tenant_id == self.tenant_id,
+                Campaign.is_deleted == False,
+            )
         )
-
-        # Filter by specific campaigns if specified
-        if rule.applies_to_campaigns:
-            query = query.where(Campaign.id.in_(rule.applies_to_campaigns))
-
-        # Filter by platforms if specified
-        if rule.applies_to_platforms:
-            query = query.where(Campaign.platform.in_(rule.applies_to_platforms))
-
-        result = await self.db.execute(query)
         return list(result.scalars().all())
 
+    @staticmethod
+    def _format_evaluation(
+        campaign: Campaign, matched: bool, condition: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        evaluation = {
+            "campaign_id": campaign.id,
+            "campaign_name": campaign.name,
+            "matched": matched,
+        }
+        if "reason" in condition:
+            evaluation["reason"] = condition["reason"]
+        else:
+            evaluation["condition"] = condition
+        return evaluation
+
     async def _evaluate_condition(
         self,
         rule: Rule,
@@ -151,93 +430,19 @@ class RulesEngine:
         """
         Evaluate a rule condition against a campaign.
         """
-        field = rule.condition_field
-        operator = rule.condition_operator
-        expected_value = rule.condition_value
-
-        # Get actual value
-        actual_value = self._get_field_value(campaign, field)
-
-        if actual_value is None:
-            return {
-                "campaign_id": campaign.id,
-                "campaign_name": campaign.name,
-                "matched": False,
-                "reason": f"Field '{field}' not found or null",
-            }
-
-        # Parse expected value
-        try:
-            expected = self._parse_value(expected_value, type(actual_value))
-        except ValueError as e:
-            return {
-                "campaign_id": campaign.id,
-                "campaign_name": campaign.name,
-                "matched": False,
-                "reason": f"Invalid condition value: {e}",
-            }
-
-        # Evaluate
-        matched = self._compare_values(actual_value, operator, expected)
-
-        return {
-            "campaign_id": campaign.id,
-            "campaign_name": campaign.name,
-            "matched": matched,
-            "condition": {
-                "field": field,
-                "operator": operator.value,
-                "expected": expected,
-                "actual": actual_value,
-            },
-        }
+        compiled = compile_rule(rule)
+        matched, condition = compiled.evaluate(
+            get_field_value(campaign, compiled.field_name)
+        )
+        return self._format_evaluation(campaign, matched, condition)
 
     def _get_field_value(self, campaign: Campaign, field: str) -> Optional[Any]:
         """Get a field value from a campaign, handling computed fields."""
-        # Direct attributes
-        if hasattr(campaign, field):
-            return getattr(campaign, field)
-
-        # Computed fields
-        computed_fields = {
-            "spend": lambda c: c.total_spend_cents / 100,
-            "revenue": lambda c: c.revenue_cents / 100,
-            "cpc": lambda c: (
-                (c.total_spend_cents / c.clicks / 100) if c.clicks > 0 else None
-            ),
-            "cpm": lambda c: (
-                (c.total_spend_cents / c.impressions * 1000 / 100)
-                if c.impressions > 0
-                else None
-            ),
-            "cpa": lambda c: (
-                (c.total_spend_cents / c.conversions / 100)
-                if c.conversions > 0
-                else None
-            ),
-            "conversion_rate": lambda c: (
-                (c.conversions / c.clicks * 100) if c.clicks > 0 else None
-            ),
-        }
-
-        if field in computed_fields:
-            return computed_fields[field](campaign)
-
-        return None
+        return get_field_value(campaign, field)
 
     def _parse_value(self, value: str, target_type: type) -> Any:
         """Parse a string value to the target type."""
-        if target_type == float:
-            return float(value)
-        elif target_type == int:
-            return int(float(value))
-        elif target_type == bool:
-            return value.lower() in ("true", "1", "yes")
-        elif target_type == list:
-            import json
-
-            return json.loads(value) if value.startswith("[") else [value]
-        return value
+        return parse_value(value, target_type)
 
     def _compare_values(
         self,
@@ -246,24 +451,7 @@ class RulesEngine:
         expected: Any,
     ) -> bool:
         """Compare two values based on the operator."""
-        if operator == RuleOperator.EQUALS:
-            return actual == expected
-        elif operator == RuleOperator.NOT_EQUALS:
-            return actual != expected
-        elif operator == RuleOperator.GREATER_THAN:
-            return actual > expected
-        elif operator == RuleOperator.LESS_THAN:
-            return actual < expected
-        elif operator == RuleOperator.GREATER_THAN_OR_EQUAL:
-            return actual >= expected
-        elif operator == RuleOperator.LESS_THAN_OR_EQUAL:
-            return actual <= expected
-        elif operator == RuleOperator.CONTAINS:
-            return str(expected) in str(actual)
-        elif operator == RuleOperator.IN:
-            return actual in expected
-
-        return False
+        return compare_values(actual, operator, expected)
 
     async def _execute_action(
         self,
@@ -9,7 +9,7 @@ Responsibilities:
 2. Decrypt and refresh tokens as needed
 3. Delegate to platform-specific sync services
 4. Upsert Campaign and CampaignMetric rows
-5. Recalculate aggregate metrics
+5. Recalculate aggregate metrics and the dashboard daily rollups
 6. Update last_synced_at
 
 Respects settings.use_mock_ad_data — skips real API calls when True.
@@ -34,6 +34,7 @@ from app.models.campaign_builder import (
     TenantAdAccount,
     TenantPlatformConnection,
 )
+from app.services.dashboard_rollups import refresh_daily_rollups
 from app.services.oauth import get_oauth_service
 from app.services.sync.meta_sync import MetaCampaignSyncService, TokenExpiredError
 from app.services.sync.snapchat_sync import SnapchatCampaignSyncService
@@ -62,6 +63,8 @@ class PlatformSyncOrchestrator:
         self._meta_sync = MetaCampaignSyncService()
         self._tiktok_sync = TikTokCampaignSyncService()
         self._snapchat_sync = SnapchatCampaignSyncService()
+        # Metric days written by the current sync_platform call
+        self._touched_dates: set[date] = set()
 
     async def sync_platform(
         self,
@@ -79,6 +82,7 @@ class PlatformSyncOrchestrator:
         """
         t0 = time.monotonic()
         result = SyncResult(platform=platform.value, tenant_id=tenant_id)
+        self._touched_dates = set()
 
         if settings.use_mock_ad_data:
             logger.info(
@@ -175,7 +179,12 @@ class PlatformSyncOrchestrator:
                 logger.error("sync_account_error", account=acct_id, error=str(e))
                 result.errors.append(f"Account {acct_id}: {e}")
 
-        # 5. Update connection last sync time
+        # 5. Refresh the dashboard rollup for the days this sync wrote
+        await refresh_daily_rollups(
+            self.db, tenant_id, self._touched_dates, platform=platform
+        )
+
+        # 6. Update connection last sync time
         if conn:
             conn.last_refreshed_at = datetime.now(UTC)
         await self.db.commit()
@@ -551,6 +560,7 @@ class PlatformSyncOrchestrator:
         video_views: Optional[int] = None,
     ) -> None:
         """Insert or update a daily metric row."""
+        self._touched_dates.add(metric_date)
         result = await self.db.execute(
             select(CampaignMetric).where(
                 and_(
@@ -669,9 +669,70 @@ class AutopilotEngine:
         Returns:
             List of results including rule output and gate decisions
         """
+        return self._evaluate(
+            platform,
+            account_id,
+            campaign,
+            adsets,
+            metrics,
+            signal_health,
+            historical_metrics or [],
+            targets or {},
+        )
+
+    async def evaluate_account(
+        self,
+        platform: Platform,
+        account_id: str,
+        campaigns: list[UnifiedCampaign],
+        adsets_by_campaign: dict[str, list[UnifiedAdSet]],
+        metrics_by_campaign: dict[str, PerformanceMetrics],
+        signal_health_by_campaign: dict[str, SignalHealth],
+        historical_by_campaign: Optional[dict[str, list[PerformanceMetrics]]] = None,
+        targets: Optional[dict[str, float]] = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Evaluate all rules for every campaign of an account in one pass.
+
+        Takes the account's data already fetched in bulk (one metrics call
+        and one ad set call for the whole account) and returns the same
+        per-rule results as ``evaluate_campaign``, keyed by campaign ID.
+        Campaigns without metrics or signal health are skipped.
+        """
         targets = targets or {}
-        historical_metrics = historical_metrics or []
+        historical_by_campaign = historical_by_campaign or {}
+
+        results: dict[str, list[dict[str, Any]]] = {}
+        for campaign in campaigns:
+            campaign_id = campaign.campaign_id
+            metrics = metrics_by_campaign.get(campaign_id)
+            signal_health = signal_health_by_campaign.get(campaign_id)
+            if metrics is None or signal_health is None:
+                continue
+            results[campaign_id] = self._evaluate(
+                platform,
+                account_id,
+                campaign,
+                adsets_by_campaign.get(campaign_id, []),
+                metrics,
+                signal_health,
+                historical_by_campaign.get(campaign_id, []),
+                targets,
+            )
+        return results
 
+    def _evaluate(
+        self,
+        platform: Platform,
+        account_id: str,
+        campaign: UnifiedCampaign,
+        adsets: list[UnifiedAdSet],
+        metrics: PerformanceMetrics,
+        signal_health: SignalHealth,
+        historical_metrics: list[PerformanceMetrics],
+        targets: dict[str, float],
+    ) -> list[dict[str, Any]]:
+        """Evaluate every enabled rule for one campaign (no I/O)."""
         # Calculate days since last change
         entity_key = f"{platform.value}:{account_id}:{campaign.campaign_id}"
         last_change = self._execution_history.get(entity_key)
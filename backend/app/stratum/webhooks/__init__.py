@@ -46,6 +46,14 @@ Running the Server
 
     # Production
     gunicorn app.stratum.webhooks:app -w 4 -k uvicorn.workers.UvicornWorker -b 0.0.0.0:8000
+
+    # Webhook processing (one or more consumers, any host)
+    python -m app.stratum.webhooks.consumer
+
+Verified payloads are appended to a Redis stream and acknowledged at once;
+the consumer processes them in batches with retries and idempotency keys
+(see ``app.stratum.webhooks.queue``). With WEBHOOK_QUEUE_ENABLED=false, or
+while Redis is unreachable, payloads are processed in-process instead.
 """
 
 import asyncio
@@ -58,9 +66,13 @@ from collections.abc import Callable
 from datetime import UTC, datetime
 from typing import Any, Optional
 
+import redis.asyncio as aioredis
 from fastapi import BackgroundTasks, FastAPI, Header, HTTPException, Query, Request
 from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
+from redis.exceptions import RedisError
+
+from app.stratum.webhooks.queue import WebhookQueue
 
 logger = logging.getLogger("app.stratum.webhooks")
 
@@ -91,6 +103,11 @@ class WebhookConfig:
 
     # General
     WEBHOOK_SECRET=your_internal_secret
+
+    # Durable queue
+    WEBHOOK_QUEUE_ENABLED=true
+    WEBHOOK_STREAM=stratum:webhooks
+    REDIS_URL=redis://localhost:6379/0
     """
 
     # Meta
@@ -110,6 +127,14 @@ class WebhookConfig:
     # Internal webhook secret (for your own integrations)
     WEBHOOK_SECRET: str = os.getenv("WEBHOOK_SECRET", "change_me_in_production")
 
+    # Durable queue: receivers append to this Redis stream and the consumer
+    # process (app.stratum.webhooks.consumer) does the work.
+    WEBHOOK_QUEUE_ENABLED: bool = (
+        os.getenv("WEBHOOK_QUEUE_ENABLED", "true").lower() == "true"
+    )
+    WEBHOOK_STREAM: str = os.getenv("WEBHOOK_STREAM", "stratum:webhooks")
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
 
 config = WebhookConfig()
 
@@ -157,6 +182,54 @@ async def dispatch_event(event_type: str, data: dict[str, Any]):
             logger.error(f"Handler error for {event_type}: {e}")
 
 
+# =============================================================================
+# DURABLE QUEUE
+# =============================================================================
+
+_queue: Optional[WebhookQueue] = None
+
+
+def get_webhook_queue() -> Optional[WebhookQueue]:
+    """Shared queue for this process, or None when the queue is disabled."""
+    global _queue
+    if _queue is None and config.WEBHOOK_QUEUE_ENABLED:
+        _queue = WebhookQueue(
+            aioredis.from_url(
+                config.REDIS_URL, decode_responses=True, socket_connect_timeout=1
+            ),
+            stream=config.WEBHOOK_STREAM,
+        )
+    return _queue
+
+
+def idempotency_key(source: str, body: bytes, event_id: Optional[str] = None) -> str:
+    """Platform event id when there is one, else a hash of the signed body."""
+    return f"{source}:{event_id or hashlib.sha256(body).hexdigest()}"
+
+
+async def accept_webhook(
+    background_tasks: BackgroundTasks,
+    source: str,
+    payload: dict[str, Any],
+    key: str,
+) -> None:
+    """
+    Hand a verified payload to the durable queue.
+
+    Falls back to in-process processing (the pre-queue behaviour) when the
+    queue is disabled or Redis cannot take the entry, so a Redis outage never
+    turns into rejected webhooks.
+    """
+    queue = get_webhook_queue()
+    if queue is not None:
+        try:
+            await queue.enqueue(source, payload, key)
+            return
+        except (ConnectionError, TimeoutError, OSError, RedisError) as e:
+            logger.error(f"Webhook queue unavailable, processing in-process: {e}")
+    background_tasks.add_task(WEBHOOK_PROCESSORS[source], payload)
+
+
 # =============================================================================
 # SIGNATURE VERIFICATION
 # =============================================================================
@@ -290,8 +363,9 @@ async def meta_webhook_receive(
 
     logger.info(f"Meta webhook received: {payload.get('object')}")
 
-    # Process in background
-    background_tasks.add_task(process_meta_webhook, payload)
+    await accept_webhook(
+        background_tasks, "meta", payload, idempotency_key("meta", body)
+    )
 
     return {"status": "received"}
 
@@ -456,8 +530,9 @@ async def whatsapp_webhook_receive(
 
     logger.info("WhatsApp webhook received")
 
-    # Process in background
-    background_tasks.add_task(process_whatsapp_webhook, payload)
+    await accept_webhook(
+        background_tasks, "whatsapp", payload, idempotency_key("whatsapp", body)
+    )
 
     return {"status": "received"}
 
@@ -613,8 +688,9 @@ async def tiktok_webhook_receive(
 
     logger.info(f"TikTok webhook received: {payload.get('event_type')}")
 
-    # Process in background
-    background_tasks.add_task(process_tiktok_webhook, payload)
+    await accept_webhook(
+        background_tasks, "tiktok", payload, idempotency_key("tiktok", body)
+    )
 
     return {"status": "received"}
 
@@ -732,16 +808,20 @@ async def ecommerce_webhook_receive(
     4. Shopify webhook (custom app)
     5. WooCommerce webhook
     """
+    body = await request.body()
+
     # Optional signature verification
-    if x_webhook_signature:
-        body = await request.body()
-        if not verify_internal_signature(body, x_webhook_signature):
-            raise HTTPException(status_code=403, detail="Invalid signature")
+    if x_webhook_signature and not verify_internal_signature(body, x_webhook_signature):
+        raise HTTPException(status_code=403, detail="Invalid signature")
 
     logger.info(f"E-commerce event received: {event.event_type}")
 
-    # Process in background
-    background_tasks.add_task(process_ecommerce_event, event.dict())
+    await accept_webhook(
+        background_tasks,
+        "ecommerce",
+        event.dict(),
+        idempotency_key("ecommerce", body, event.event_id),
+    )
 
     return {"status": "received", "event_id": event.event_id}
 
@@ -850,10 +930,20 @@ async def process_ecommerce_event(event_data: dict[str, Any]):
         )
     except (ConnectionError, TimeoutError, OSError) as e:
         logger.error(f"Network error forwarding event: {e}")
+        raise  # transient: the queue retries it
     except (ValueError, KeyError, TypeError) as e:
         logger.error(f"Data error forwarding event: {e}")
 
 
+# Queue source -> processor, used by the consumer and the in-process fallback
+WEBHOOK_PROCESSORS = {
+    "meta": process_meta_webhook,
+    "whatsapp": process_whatsapp_webhook,
+    "tiktok": process_tiktok_webhook,
+    "ecommerce": process_ecommerce_event,
+}
+
+
 # =============================================================================
 # HEALTH & STATUS ENDPOINTS
 # =============================================================================
@@ -880,6 +970,10 @@ async def webhook_status():
         },
         "tiktok": {"configured": bool(config.TIKTOK_APP_SECRET)},
         "ecommerce": {"signature_verification": bool(config.WEBHOOK_SECRET)},
+        "queue": {
+            "enabled": config.WEBHOOK_QUEUE_ENABLED,
+            "stream": config.WEBHOOK_STREAM,
+        },
         "handlers_registered": {
             event_type: len(handlers)
             for event_type, handlers in _event_handlers.items()
@@ -966,14 +1060,19 @@ async def shutdown_event():
 # =============================================================================
 
 __all__ = [
+    "WEBHOOK_PROCESSORS",
     # Models
     "EcommerceEvent",
     # Configuration
     "WebhookConfig",
+    # Durable queue
+    "accept_webhook",
     # FastAPI app
     "app",
     "config",
     "dispatch_event",
+    "get_webhook_queue",
+    "idempotency_key",
     # Event handling
     "register_handler",
     "verify_internal_signature",
@@ -0,0 +1,48 @@
+# =============================================================================
+# Stratum AI - Webhook Queue Consumer
+# =============================================================================
+"""
+Dedicated process that works through the durable webhook stream.
+
+    python -m app.stratum.webhooks.consumer
+
+Run as many as needed; they share the consumer group, so each entry is
+handled by one of them. SIGINT/SIGTERM finish the current batch and exit.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+
+import redis.asyncio as aioredis
+
+from app.stratum.webhooks import WEBHOOK_PROCESSORS, config
+from app.stratum.webhooks.queue import WebhookQueue, run_consumer
+
+logger = logging.getLogger("app.stratum.webhooks.consumer")
+
+
+async def main() -> None:
+    queue = WebhookQueue(
+        aioredis.from_url(config.REDIS_URL, decode_responses=True),
+        stream=config.WEBHOOK_STREAM,
+        batch_size=int(os.getenv("WEBHOOK_BATCH_SIZE", "50")),
+        max_attempts=int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "5")),
+        retry_base_delay=float(os.getenv("WEBHOOK_RETRY_BASE_DELAY", "5")),
+        retry_max_delay=float(os.getenv("WEBHOOK_RETRY_MAX_DELAY", "300")),
+    )
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    logger.info(f"Webhook consumer {queue.consumer} reading {queue.stream}")
+    # Short blocking reads so a stop signal is noticed promptly
+    await run_consumer(queue, WEBHOOK_PROCESSORS, stop=stop, block_ms=1000)
+    await queue.redis.aclose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+    asyncio.run(main())
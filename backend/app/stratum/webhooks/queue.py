@@ -0,0 +1,277 @@
+# =============================================================================
+# Stratum AI - Durable Webhook Queue
+# =============================================================================
+"""
+Durable webhook ingestion backed by a Redis stream.
+
+The receivers in ``app.stratum.webhooks`` verify a payload, append it to the
+stream and answer the platform straight away. Processing happens in a
+separate consumer process (``python -m app.stratum.webhooks.consumer``) that
+reads the stream through a consumer group, so webhook bursts never compete
+with request handling and nothing is lost when the API restarts.
+
+Delivery
+--------
+
+- **At least once**: an entry is acknowledged only after its processor has
+  returned (or it has been moved to the dead-letter stream). Entries left
+  pending by a consumer that died are reclaimed with XAUTOCLAIM once they
+  have been idle for ``claim_idle_ms``.
+- **Idempotency**: every entry carries a key (the platform event id, or a
+  hash of the signed body). Keys of processed entries are remembered for
+  ``idempotency_ttl`` seconds, so platform retries and reclaimed entries are
+  acknowledged without running the processor again.
+- **Retries**: a failing entry is scheduled on ``<stream>:retry``, a sorted
+  set scored by when it is due, with its attempt count incremented. The
+  delay doubles per attempt from ``retry_base_delay`` up to
+  ``retry_max_delay``, so a platform outage is ridden out instead of burning
+  every attempt at once. Each read first moves due retries back onto the
+  stream, in one script so two consumers never both promote an entry. After
+  ``max_attempts`` an entry goes to ``<stream>:dead`` with the last error.
+- **Batches**: up to ``batch_size`` entries are read per call, and their
+  acknowledgements, retries and idempotency markers are written in one
+  MULTI/EXEC pipeline.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from typing import Any, Optional
+
+from redis.exceptions import RedisError, ResponseError
+
+logger = logging.getLogger("app.stratum.webhooks.queue")
+
+Processor = Callable[[dict[str, Any]], Awaitable[Any]]
+
+# KEYS: retry set, stream. ARGV: now, count, maxlen.
+# Members are the JSON-encoded stream fields of the retried entry.
+PROMOTE_RETRIES_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, member in ipairs(due) do
+    local args = {}
+    for name, value in pairs(cjson.decode(member)) do
+        args[#args + 1] = name
+        args[#args + 1] = value
+    end
+    redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[3], '*', unpack(args))
+    redis.call('ZREM', KEYS[1], member)
+end
+return #due
+"""
+
+
+class WebhookQueue:
+    """Producer and consumer-group side of the webhook stream."""
+
+    def __init__(
+        self,
+        redis_client: Any,
+        stream: str = "stratum:webhooks",
+        group: str = "webhook-processors",
+        consumer: Optional[str] = None,
+        batch_size: int = 50,
+        max_attempts: int = 5,
+        idempotency_ttl: int = 86400,
+        claim_idle_ms: int = 60_000,
+        maxlen: int = 100_000,
+        retry_base_delay: float = 5.0,
+        retry_max_delay: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.redis = redis_client
+        self.stream = stream
+        self.group = group
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.idempotency_ttl = idempotency_ttl
+        self.claim_idle_ms = claim_idle_ms
+        self.maxlen = maxlen
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self._clock = clock
+        self._promote_retries = redis_client.register_script(PROMOTE_RETRIES_SCRIPT)
+
+    @property
+    def dead_stream(self) -> str:
+        return f"{self.stream}:dead"
+
+    @property
+    def retry_key(self) -> str:
+        return f"{self.stream}:retry"
+
+    def retry_delay(self, attempts: int) -> float:
+        """Seconds to wait before retrying an entry that failed ``attempts`` times."""
+        return min(self.retry_max_delay, self.retry_base_delay * 2 ** (attempts - 1))
+
+    def _done_key(self, idempotency_key: str) -> str:
+        return f"{self.stream}:done:{idempotency_key}"
+
+    # -------------------------------------------------------------------------
+    # Producer
+    # -------------------------------------------------------------------------
+
+    async def enqueue(
+        self, source: str, payload: dict[str, Any], idempotency_key: str
+    ) -> str:
+        """Append a verified webhook payload; returns the stream entry id."""
+        return await self.redis.xadd(
+            self.stream,
+            {
+                "source": source,
+                "key": idempotency_key,
+                "payload": json.dumps(payload),
+                "attempts": "0",
+                "received_at": datetime.now(UTC).isoformat(),
+            },
+            maxlen=self.maxlen,
+            approximate=True,
+        )
+
+    # -------------------------------------------------------------------------
+    # Consumer
+    # -------------------------------------------------------------------------
+
+    async def ensure_group(self) -> None:
+        """Create the stream and consumer group if they do not exist yet."""
+        try:
+            await self.redis.xgroup_create(
+                self.stream, self.group, id="0", mkstream=True
+            )
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def promote_due_retries(self) -> int:
+        """Move retries whose delay has passed back onto the stream."""
+        return await self._promote_retries(
+            keys=[self.retry_key, self.stream],
+            args=[self._clock(), self.batch_size, self.maxlen],
+        )
+
+    async def read_batch(self, block_ms: int = 5000) -> list[tuple[str, dict]]:
+        """
+        Next batch for this consumer.
+
+        Due retries are put back on the stream first. Entries another
+        consumer left pending for too long come next; new entries are read
+        (blocking up to ``block_ms``) only when there are none to reclaim.
+        """
+        await self.promote_due_retries()
+        claimed = await self.redis.xautoclaim(
+            self.stream,
+            self.group,
+            self.consumer,
+            min_idle_time=self.claim_idle_ms,
+            start_id="0-0",
+            count=self.batch_size,
+        )
+        entries = [(entry_id, fields) for entry_id, fields in claimed[1] if fields]
+        if entries:
+            return entries
+
+        response = await self.redis.xreadgroup(
+            self.group,
+            self.consumer,
+            {self.stream: ">"},
+            count=self.batch_size,
+            block=block_ms,
+        )
+        return response[0][1] if response else []
+
+    async def process_batch(
+        self,
+        entries: list[tuple[str, dict]],
+        processors: dict[str, Processor],
+    ) -> dict[str, int]:
+        """Run the processors for a batch and settle every entry in it."""
+        counts = {"processed": 0, "duplicates": 0, "retried": 0, "dead": 0}
+        if not entries:
+            return counts
+
+        already_done = await self.redis.mget(
+            [self._done_key(fields["key"]) for _, fields in entries]
+        )
+        seen: set[str] = set()
+        done_keys: list[str] = []
+        retries: dict[str, float] = {}
+        dead: list[dict] = []
+
+        for (entry_id, fields), done in zip(entries, already_done, strict=True):
+            key = fields["key"]
+            if done or key in seen:
+                counts["duplicates"] += 1
+                continue
+            seen.add(key)
+
+            processor = processors.get(fields["source"])
+            try:
+                if processor is None:
+                    raise LookupError(f"No processor for source {fields['source']!r}")
+                await processor(json.loads(fields["payload"]))
+            except Exception as e:  # noqa: BLE001
+                # One bad event must not stall the batch
+                attempts = int(fields.get("attempts", 0)) + 1
+                failed = {**fields, "attempts": str(attempts), "error": str(e)[:500]}
+                if processor is None or attempts >= self.max_attempts:
+                    logger.error(f"Webhook {entry_id} ({key}) dead-lettered: {e}")
+                    dead.append(failed)
+                else:
+                    logger.warning(f"Webhook {entry_id} ({key}) failed, retrying: {e}")
+                    due = self._clock() + self.retry_delay(attempts)
+                    retries[json.dumps(failed, sort_keys=True)] = due
+                continue
+
+            done_keys.append(key)
+            counts["processed"] += 1
+
+        pipe = self.redis.pipeline(transaction=True)
+        if retries:
+            pipe.zadd(self.retry_key, retries)
+        for fields in dead:
+            pipe.xadd(self.dead_stream, fields, maxlen=self.maxlen, approximate=True)
+        for key in done_keys:
+            pipe.set(self._done_key(key), "1", ex=self.idempotency_ttl)
+        pipe.xack(self.stream, self.group, *[entry_id for entry_id, _ in entries])
+        await pipe.execute()
+
+        counts["retried"] = len(retries)
+        counts["dead"] = len(dead)
+        return counts
+
+
+async def run_consumer(
+    queue: WebhookQueue,
+    processors: dict[str, Processor],
+    stop: Optional[asyncio.Event] = None,
+    block_ms: int = 5000,
+    error_backoff: float = 5.0,
+) -> None:
+    """Process batches until ``stop`` is set, backing off while Redis is down."""
+    stop = stop or asyncio.Event()
+    group_ready = False
+    while not stop.is_set():
+        try:
+            if not group_ready:
+                await queue.ensure_group()
+                group_ready = True
+            entries = await queue.read_batch(block_ms)
+            if entries:
+                counts = await queue.process_batch(entries, processors)
+                logger.info(f"Webhook batch settled: {counts}")
+        except (ConnectionError, TimeoutError, OSError, RedisError) as e:
+            logger.error(f"Webhook queue unavailable: {e}")
+            group_ready = False  # the stream may have been recreated
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=error_backoff)
+            except TimeoutError:
+                pass
+
+
+__all__ = ["Processor", "WebhookQueue", "run_consumer"]
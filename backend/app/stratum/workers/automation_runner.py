@@ -411,6 +411,89 @@ async def execute_action_batch(
 # ============================================================================
 
 
+# Campaign IDs per bulk metrics request. Platform filters (Meta ``IN``,
+# GAQL ``IN (...)``) accept long lists, but very large accounts are split
+# so a single request stays well under URL/query size limits.
+METRICS_BATCH_SIZE = 500
+
+
+async def _fetch_account_snapshot(
+    adapter: Any,
+    account_id: str,
+    campaigns: list[Any],
+    date_start: datetime,
+    date_end: datetime,
+) -> tuple[dict[str, Any], dict[str, list[Any]]]:
+    """
+    Fetch metrics and ad sets for every campaign of an account in bulk.
+
+    One ``get_metrics`` call per METRICS_BATCH_SIZE campaigns and a single
+    account-wide ``get_adsets`` call, instead of one of each per campaign.
+
+    Returns:
+        (metrics by campaign ID, ad sets grouped by campaign ID)
+    """
+    campaign_ids = [campaign.campaign_id for campaign in campaigns]
+    metrics_by_campaign: dict[str, Any] = {}
+    for i in range(0, len(campaign_ids), METRICS_BATCH_SIZE):
+        metrics_by_campaign.update(
+            await adapter.get_metrics(
+                account_id=account_id,
+                entity_type="campaign",
+                entity_ids=campaign_ids[i : i + METRICS_BATCH_SIZE],
+                date_start=date_start,
+                date_end=date_end,
+            )
+        )
+
+    adsets_by_campaign: dict[str, list[Any]] = {cid: [] for cid in campaign_ids}
+    for adset in await adapter.get_adsets(account_id):
+        if adset.campaign_id in adsets_by_campaign:
+            adsets_by_campaign[adset.campaign_id].append(adset)
+
+    return metrics_by_campaign, adsets_by_campaign
+
+
+def _tally_rule_results(
+    result: dict[str, Any],
+    rule_results: list[dict[str, Any]],
+    platform: str,
+    account_id: str,
+    credentials: dict[str, Any],
+) -> None:
+    """Count one campaign's rule results and queue its approved actions."""
+    for rule_result in rule_results:
+        result["rules_evaluated"] += 1
+
+        if not rule_result["triggered"]:
+            continue
+        result["actions_proposed"] += len(rule_result["actions"])
+
+        for i, action in enumerate(rule_result["actions"]):
+            gate_result = (
+                rule_result["gate_results"][i]
+                if i < len(rule_result["gate_results"])
+                else {}
+            )
+            decision = gate_result.get("decision", "blocked")
+
+            if decision == "approved":
+                result["actions_approved"] += 1
+                # Queue for execution
+                execute_action.delay(
+                    action_data={
+                        "platform": platform,
+                        "account_id": account_id,
+                        **action,
+                    },
+                    credentials=credentials,
+                )
+            elif decision == "queued":
+                result["actions_queued"] += 1
+            else:
+                result["actions_blocked"] += 1
+
+
 @shared_task(bind=True)
 @async_task
 async def run_autopilot_for_account(
@@ -419,12 +502,18 @@ async def run_autopilot_for_account(
     account_id: str,
     credentials: dict[str, Any],
     targets: dict[str, float],
+    batch: bool = True,
 ) -> dict[str, Any]:
     """
     Run the autopilot engine for a single account.
 
     This evaluates all rules and queues any approved actions
     for execution.
+
+    In batch mode (default) metrics and ad sets for all active campaigns
+    are fetched with one adapter call each and the account is evaluated
+    in a single engine pass. ``batch=False`` keeps the per-campaign fetch
+    for adapters that cannot filter by many IDs at once.
     """
     from app.stratum.adapters.registry import get_adapter
     from app.stratum.core.signal_health import SignalHealthCalculator
@@ -442,88 +531,77 @@ async def run_autopilot_for_account(
 
     try:
         platform_enum = Platform(platform)
-        adapter = await get_adapter(platform_enum, credentials)
+        adapter = get_adapter(platform_enum, credentials)
+        await adapter.initialize()
 
         # Get current data
         campaigns = await adapter.get_campaigns(account_id)
         emq_scores = await adapter.get_emq_scores(account_id)
-
-        # Calculate signal health
-        calculator = SignalHealthCalculator()
+        active = [c for c in campaigns if c.status == EntityStatus.ACTIVE]
+        date_end = datetime.now(UTC)
+        date_start = date_end - timedelta(days=1)
+
+        # Signal health is an account-level property (EMQ + freshness of
+        # the data just pulled), so it is calculated once per run.
+        signal_health = SignalHealthCalculator().calculate(
+            emq_scores=[score.score for score in emq_scores],
+            last_data_received=date_end,
+        )
 
         # Initialize autopilot
         engine = AutopilotEngine(auto_execute=False)
 
-        for campaign in campaigns:
-            # Skip inactive campaigns
-            if campaign.status != EntityStatus.ACTIVE:
-                continue
-
-            # Get metrics
-            metrics_dict = await adapter.get_metrics(
-                account_id=account_id,
-                entity_type="campaign",
-                entity_ids=[campaign.campaign_id],
-                date_start=datetime.now(UTC) - timedelta(days=1),
-                date_end=datetime.now(UTC),
+        if batch:
+            metrics_by_campaign, adsets_by_campaign = await _fetch_account_snapshot(
+                adapter, account_id, active, date_start, date_end
             )
-
-            if campaign.campaign_id not in metrics_dict:
-                continue
-
-            metrics = metrics_dict[campaign.campaign_id]
-
-            # Get ad sets
-            adsets = await adapter.get_adsets(account_id, campaign.campaign_id)
-
-            # Calculate signal health
-            signal_health = calculator.calculate(
+            account_results = await engine.evaluate_account(
                 platform=platform_enum,
                 account_id=account_id,
-                emq_scores=emq_scores,
-                recent_metrics=[metrics],
-            )
-
-            # Evaluate autopilot rules
-            rule_results = await engine.evaluate_campaign(
-                platform=platform_enum,
-                account_id=account_id,
-                campaign=campaign,
-                adsets=adsets,
-                metrics=metrics,
-                signal_health=signal_health,
+                campaigns=active,
+                adsets_by_campaign=adsets_by_campaign,
+                metrics_by_campaign=metrics_by_campaign,
+                signal_health_by_campaign=dict.fromkeys(
+                    metrics_by_campaign, signal_health
+                ),
                 targets=targets,
             )
+            for rule_results in account_results.values():
+                _tally_rule_results(
+                    result, rule_results, platform, account_id, credentials
+                )
+        else:
+            for campaign in active:
+                # Get metrics
+                metrics_dict = await adapter.get_metrics(
+                    account_id=account_id,
+                    entity_type="campaign",
+                    entity_ids=[campaign.campaign_id],
+                    date_start=date_start,
+                    date_end=date_end,
+                )
 
-            for rule_result in rule_results:
-                result["rules_evaluated"] += 1
-
-                if rule_result["triggered"]:
-                    result["actions_proposed"] += len(rule_result["actions"])
-
-                    for i, action in enumerate(rule_result["actions"]):
-                        gate_result = (
-                            rule_result["gate_results"][i]
-                            if i < len(rule_result["gate_results"])
-                            else {}
-                        )
-                        decision = gate_result.get("decision", "blocked")
-
-                        if decision == "approved":
-                            result["actions_approved"] += 1
-                            # Queue for execution
-                            execute_action.delay(
-                                action_data={
-                                    "platform": platform,
-                                    "account_id": account_id,
-                                    **action,
-                                },
-                                credentials=credentials,
-                            )
-                        elif decision == "queued":
-                            result["actions_queued"] += 1
-                        else:
-                            result["actions_blocked"] += 1
+                if campaign.campaign_id not in metrics_dict:
+                    continue
+
+                metrics = metrics_dict[campaign.campaign_id]
+
+                # Get ad sets
+                adsets = await adapter.get_adsets(account_id, campaign.campaign_id)
+
+                # Evaluate autopilot rules
+                rule_results = await engine.evaluate_campaign(
+                    platform=platform_enum,
+                    account_id=account_id,
+                    campaign=campaign,
+                    adsets=adsets,
+                    metrics=metrics,
+                    signal_health=signal_health,
+                    targets=targets,
+                )
+                _tally_rule_results(
+                    result, rule_results, platform, account_id, credentials
+                )
 
         await adapter.cleanup()
 
@@ -81,6 +81,7 @@ celery_app.conf.update(
     task_routes={
         "app.workers.tasks.sync_campaign_data": {"queue": "sync"},
         "app.workers.tasks.evaluate_rules": {"queue": "rules"},
+        "app.workers.tasks.evaluate_tenant_rules": {"queue": "rules"},
         "app.workers.tasks.fetch_competitor_data": {"queue": "intel"},
         "app.workers.tasks.generate_forecast": {"queue": "ml"},
     },
@@ -361,6 +362,21 @@ def _init_worker_pii_dek_cache(**_kwargs):
         logger.warning("worker_pii_keys_init_failed: %s: %s", type(exc).__name__, exc)
 
 
+# ---------------------------------------------------------------------------
+# Cross-worker task telemetry
+# ---------------------------------------------------------------------------
+# Connected in every process that imports the app: publishers (the API) stamp
+# the enqueue time on outgoing messages, workers record the execution. Nothing
+# scrapes the worker, so the numbers go to Redis rather than to per-process
+# Prometheus metrics that would never be collected.
+if settings.celery_task_telemetry_enabled:
+    from app.monitoring.celery_hooks import CeleryMemoryHooks
+    from app.monitoring.task_telemetry import TaskTelemetryStore
+
+    task_hooks = CeleryMemoryHooks(telemetry=TaskTelemetryStore(settings.redis_url))
+    task_hooks.connect(celery_app)
+
+
 # ---------------------------------------------------------------------------
 # Task decorators for common patterns
 # ---------------------------------------------------------------------------
@@ -8,95 +8,28 @@ Celery tasks for sending newsletter campaigns.
 - process_scheduled_campaigns: Beat-scheduled task to dispatch due campaigns
 """
 
-import base64
-import re
-import time
 from datetime import UTC, datetime
 
 from celery import shared_task
 from celery.utils.log import get_task_logger
-from sqlalchemy import and_, select
 
 logger = get_task_logger(__name__)
 
-BATCH_SIZE = 50
-BATCH_DELAY_SECONDS = 1  # Delay between batches to avoid SMTP throttling
+# Subscribers loaded (and events committed) per keyset page
+BATCH_SIZE = 500
 
 
-def _personalize_html(
-    html: str,
-    subscriber_email: str,
-    subscriber_name: str | None,
-    subscriber_company: str | None,
-) -> str:
-    """Replace template variables in email HTML."""
-    html = html.replace("{{email}}", subscriber_email)
-    html = html.replace(
-        "{{first_name}}", (subscriber_name or "").split(" ")[0] or "there"
-    )
-    html = html.replace("{{full_name}}", subscriber_name or "")
-    html = html.replace("{{company_name}}", subscriber_company or "")
-    return html
-
-
-def _inject_tracking(
-    html: str,
-    campaign_id: int,
-    subscriber_id: int,
-    api_base_url: str,
-) -> str:
-    """Inject open tracking pixel and rewrite links for click tracking."""
-    # Open tracking pixel (before </body>)
-    pixel_url = (
-        f"{api_base_url}/api/v1/newsletter/track/open/{campaign_id}/{subscriber_id}"
-    )
-    pixel_tag = (
-        f'<img src="{pixel_url}" width="1" height="1" style="display:none" alt="" />'
-    )
-
-    if "</body>" in html:
-        html = html.replace("</body>", f"{pixel_tag}</body>")
-    else:
-        html += pixel_tag
-
-    # Click tracking: rewrite <a href="..."> links
-    def rewrite_link(match: re.Match) -> str:
-        href = match.group(1)
-        # Skip mailto:, tel:, and tracking URLs
-        if href.startswith(("mailto:", "tel:", "#")) or "/newsletter/track/" in href:
-            return match.group(0)
-        from urllib.parse import quote
-
-        tracked_url = (
-            f"{api_base_url}/api/v1/newsletter/track/click/"
-            f"{campaign_id}/{subscriber_id}?url={quote(href, safe='')}"
+def _iter_subscriber_batches(query, model, batch_size: int = BATCH_SIZE):
+    """Yield ``query`` results in id-ordered keyset pages of ``batch_size``."""
+    last_id = 0
+    while True:
+        batch = (
+            query.filter(model.id > last_id).order_by(model.id).limit(batch_size).all()
         )
-        return f'href="{tracked_url}"'
-
-    html = re.sub(r'href="([^"]+)"', rewrite_link, html)
-
-    return html
-
-
-def _add_unsubscribe_footer(
-    html: str,
-    unsubscribe_url: str,
-) -> str:
-    """Add CAN-SPAM compliant unsubscribe footer."""
-    footer = f"""
-    <div style="margin-top:40px;padding-top:20px;border-top:1px solid rgba(255,255,255,0.1);text-align:center;font-size:12px;color:#86868b;">
-        <p>You received this because you subscribed at stratumai.app</p>
-        <p>&copy; {datetime.now().year} Stratum AI &bull;
-        <a href="{unsubscribe_url}" style="color:#00c7be;text-decoration:underline;">Unsubscribe</a></p>
-    </div>
-    """
-
-    if "</body>" in html:
-        html = html.replace("</body>", f"{footer}</body>")
-    else:
-        html += footer
-
-    return html
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1].id
 
 
 @shared_task(
@@ -114,9 +47,11 @@ def send_newsletter_campaign(
 
     This task:
     1. Loads the campaign and validates status
-    2. Queries matching subscribers
-    3. Batch-sends personalized emails with tracking
-    4. Updates campaign stats on completion
+    2. Compiles the campaign HTML (tracking + footer) once
+    3. Streams matching subscribers in keyset pages of BATCH_SIZE
+    4. Sends each page concurrently over pooled SMTP sessions, paced by a
+       token bucket, and records its events in one commit
+    5. Updates campaign stats on completion
 
     Idempotent via status checks — safe to retry.
 
@@ -134,6 +69,12 @@ def send_newsletter_campaign(
         NewsletterEventType,
     )
     from app.services.email_service import get_email_service
+    from app.services.newsletter_delivery import (
+        CompiledNewsletter,
+        NewsletterSender,
+        OutgoingNewsletter,
+        unsubscribe_url_for,
+    )
 
     db = SyncSessionLocal()
     email_service = get_email_service()
@@ -181,80 +122,95 @@ def send_newsletter_campaign(
                 LandingPageSubscriber.attributed_platform.in_(filters["platforms"])
             )
 
-        subscribers = query.all()
-        total_recipients = len(subscribers)
+        total_recipients = query.count()
         campaign.total_recipients = total_recipients
         db.commit()
 
         logger.info(f"Sending campaign {campaign_id} to {total_recipients} subscribers")
 
+        # Tracking, pixel and footer are injected once; each recipient is
+        # then a join of literal segments and their own values.
+        compiled = CompiledNewsletter.compile(
+            campaign.content_html, campaign_id, api_base_url
+        )
+        subject = campaign.subject
+        from_name = campaign.from_name
+        from_email = campaign.from_email
+        reply_to = campaign.reply_to_email
+
         sent_count = 0
         bounced_count = 0
+        cancelled = False
+
+        with NewsletterSender(
+            email_service,
+            concurrency=settings.newsletter_send_concurrency,
+            rate_per_second=settings.newsletter_send_rate_per_second,
+        ) as sender:
+            for page, subscribers in enumerate(
+                _iter_subscriber_batches(query, LandingPageSubscriber)
+            ):
+                # Check if campaign was cancelled mid-send
+                if page > 0:
+                    db.refresh(campaign)
+                    if campaign.status == CampaignStatus.CANCELLED.value:
+                        logger.info(
+                            f"Campaign {campaign_id} was cancelled, stopping send"
+                        )
+                        cancelled = True
+                        break
+
+                outgoing = []
+                for subscriber in subscribers:
+                    unsubscribe_url = unsubscribe_url_for(
+                        api_base_url, campaign_id, subscriber.id
+                    )
+                    values = CompiledNewsletter.slot_values(
+                        subscriber.id,
+                        subscriber.email,
+                        subscriber.full_name,
+                        subscriber.company_name,
+                        unsubscribe_url,
+                    )
+                    message = email_service.build_newsletter_message(
+                        subscriber.email,
+                        subject,
+                        compiled.render_html(values),
+                        from_name=from_name,
+                        from_email=from_email,
+                        reply_to=reply_to,
+                        unsubscribe_url=unsubscribe_url,
+                        text_content=compiled.render_text(values),
+                    )
+                    outgoing.append(
+                        OutgoingNewsletter(subscriber.id, subscriber.email, message)
+                    )
+
+                results = sender.send_all(outgoing)
+
+                # Record events for the whole page in one commit
+                sent_at = datetime.now(UTC)
+                events = []
+                for subscriber, success in zip(subscribers, results):
+                    events.append(
+                        NewsletterEvent(
+                            campaign_id=campaign_id,
+                            subscriber_id=subscriber.id,
+                            event_type=(
+                                NewsletterEventType.SENT.value
+                                if success
+                                else NewsletterEventType.BOUNCED.value
+                            ),
+                        )
+                    )
+                    if success:
+                        sent_count += 1
+                        subscriber.last_email_sent_at = sent_at
+                        subscriber.email_send_count += 1
+                    else:
+                        bounced_count += 1
+                db.add_all(events)
 
-        for i, subscriber in enumerate(subscribers):
-            # Check if campaign was cancelled mid-send
-            if i % BATCH_SIZE == 0 and i > 0:
-                db.refresh(campaign)
-                if campaign.status == CampaignStatus.CANCELLED.value:
-                    logger.info(f"Campaign {campaign_id} was cancelled, stopping send")
-                    break
-                time.sleep(BATCH_DELAY_SECONDS)
-
-            # Generate unsubscribe token & URL
-            token = base64.urlsafe_b64encode(
-                f"{campaign_id}:{subscriber.id}".encode()
-            ).decode()
-            unsubscribe_url = (
-                f"{api_base_url}/api/v1/newsletter/unsubscribe?token={token}"
-            )
-
-            # Personalize HTML
-            html = _personalize_html(
-                campaign.content_html,
-                subscriber.email,
-                subscriber.full_name,
-                subscriber.company_name,
-            )
-
-            # Inject tracking pixel + click tracking
-            html = _inject_tracking(html, campaign_id, subscriber.id, api_base_url)
-
-            # Add unsubscribe footer
-            html = _add_unsubscribe_footer(html, unsubscribe_url)
-
-            # Send email
-            success = email_service.send_newsletter_email(
-                to_email=subscriber.email,
-                subject=campaign.subject,
-                html_content=html,
-                from_name=campaign.from_name,
-                from_email=campaign.from_email,
-                reply_to=campaign.reply_to_email,
-                unsubscribe_url=unsubscribe_url,
-            )
-
-            # Record event
-            event_type = (
-                NewsletterEventType.SENT.value
-                if success
-                else NewsletterEventType.BOUNCED.value
-            )
-            event = NewsletterEvent(
-                campaign_id=campaign_id,
-                subscriber_id=subscriber.id,
-                event_type=event_type,
-            )
-            db.add(event)
-
-            if success:
-                sent_count += 1
-                subscriber.last_email_sent_at = datetime.now(UTC)
-                subscriber.email_send_count += 1
-            else:
-                bounced_count += 1
-
-            # Commit every batch
-            if (i + 1) % BATCH_SIZE == 0:
                 campaign.total_sent = sent_count
                 campaign.total_bounced = bounced_count
                 db.commit()
@@ -263,8 +219,9 @@ def send_newsletter_campaign(
         campaign.total_sent = sent_count
         campaign.total_delivered = sent_count  # SMTP delivery = success for now
         campaign.total_bounced = bounced_count
-        campaign.status = CampaignStatus.SENT.value
-        campaign.completed_at = datetime.now(UTC)
+        if not cancelled:
+            campaign.status = CampaignStatus.SENT.value
+            campaign.completed_at = datetime.now(UTC)
         db.commit()
 
         logger.info(
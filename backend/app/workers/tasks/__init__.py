@@ -75,9 +75,11 @@ from app.workers.tasks.monitoring import (
 from app.workers.tasks.rules import (
     evaluate_all_rules,
     evaluate_rules,
+    evaluate_tenant_rules,
 )
 from app.workers.tasks.scores import (
     calculate_daily_scores,
+    calculate_tenant_scores,
 )
 from app.workers.tasks.sync import (
     sync_all_campaigns,
@@ -97,6 +99,7 @@ __all__ = [
     # Score tasks
     "calculate_daily_scores",
     "calculate_task_confidence",
+    "calculate_tenant_scores",
     "calculate_usage_rollup",
     # Monitoring tasks
     "check_pipeline_health",
@@ -111,6 +114,7 @@ __all__ = [
     "evaluate_all_rules",
     # Rules tasks
     "evaluate_rules",
+    "evaluate_tenant_rules",
     # Competitor tasks
     "fetch_competitor_data",
     "generate_daily_forecasts",
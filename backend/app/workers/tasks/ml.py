@@ -7,18 +7,44 @@ Background tasks for ML predictions and ROAS alerts.
 
 from datetime import UTC, datetime
 
+import pandas as pd
 from celery import shared_task
 from celery.utils.log import get_task_logger
 from sqlalchemy import select
 
+from app.core.config import settings
 from app.db.session import SyncSessionLocal
+from app.ml.inference import ModelRegistry, ModelUnavailableError
 from app.models import Campaign, MLPrediction, Tenant
 from app.workers.locks import with_distributed_lock
 from app.workers.tasks.helpers import calculate_task_confidence, publish_event
+from app.workers.tasks.sync import _run_async
 
 logger = get_task_logger(__name__)
 
 
+def _campaign_feature_frame(campaigns) -> pd.DataFrame:
+    """One feature row per campaign, engineered exactly as at training time."""
+    from app.ml.train import ModelTrainer
+
+    frame = pd.DataFrame(
+        [
+            {
+                "campaign_id": c.id,
+                "platform": getattr(c.platform, "value", c.platform),
+                "objective": c.objective,
+                "spend": (c.total_spend_cents or 0) / 100,
+                "revenue": (c.revenue_cents or 0) / 100,
+                "impressions": c.impressions or 0,
+                "clicks": c.clicks or 0,
+                "conversions": c.conversions or 0,
+            }
+            for c in campaigns
+        ]
+    )
+    return ModelTrainer(settings.ml_models_path)._prepare_data(frame)
+
+
 @shared_task(
     bind=True,
     autoretry_for=(Exception,),
@@ -63,30 +89,34 @@ def run_live_predictions(self, tenant_id: int):
         ]
         confidence = calculate_task_confidence(campaign_data, "portfolio")
 
-        predictions = []
-        for campaign in campaigns:
-            try:
-                # Use ROAS optimizer for predictions
-                from app.ml.roas_optimizer import ROASOptimizer
-
-                optimizer = ROASOptimizer(tenant_id)
-                prediction = optimizer.predict_campaign(campaign.id)
-
-                # Store prediction
-                ml_pred = MLPrediction(
-                    tenant_id=tenant_id,
-                    campaign_id=campaign.id,
-                    prediction_type="roas_trajectory",
-                    predicted_value=prediction.get("predicted_roas"),
-                    confidence=prediction.get("confidence", confidence),
-                    features=prediction.get("features"),
-                    created_at=datetime.now(UTC),
-                )
-                db.add(ml_pred)
-                predictions.append(prediction)
-
-            except (ValueError, TypeError, KeyError, RuntimeError) as e:
-                logger.error(f"Prediction failed for campaign {campaign.id}: {e}")
+        # Score every campaign in one model call rather than one per campaign.
+        features = _campaign_feature_frame(campaigns)
+        try:
+            batch = _run_async(ModelRegistry().predict_many("roas_predictor", features))
+        except ModelUnavailableError as e:
+            logger.warning(f"ROAS model unavailable for tenant {tenant_id}: {e}")
+            return {"status": "model_unavailable", "retry_after": e.retry_after}
+
+        predicted_at = datetime.now(UTC)
+        confidences = batch.get("confidences") or [None] * len(campaigns)
+        predictions = [
+            MLPrediction(
+                tenant_id=tenant_id,
+                campaign_id=campaign.id,
+                prediction_type="roas_trajectory",
+                model_type="roas_predictor",
+                model_version=batch.get("model_version"),
+                prediction_value=value,
+                confidence_score=(
+                    model_confidence if model_confidence is not None else confidence
+                ),
+                predicted_at=predicted_at,
+            )
+            for campaign, value, model_confidence in zip(
+                campaigns, batch["values"], confidences
+            )
+        ]
+        db.add_all(predictions)
 
         db.commit()
 
@@ -4,12 +4,16 @@
 """
 Background tasks for automation rules evaluation and execution.
 
+Rules are evaluated per tenant: every active rule is compiled once and run
+against a single load of the tenant's campaigns (see
+``app.services.rules_engine.evaluate_compiled_rules``).
+
 Security: Beat-scheduled tasks use distributed locks to prevent
 duplicate execution across multiple Celery workers.
 """
 
 from datetime import UTC, datetime
-from typing import Any
+from typing import Any, Optional
 
 from celery import shared_task
 from celery.utils.log import get_task_logger
@@ -25,13 +29,23 @@ from app.models import (
     RuleOperator,
     RuleStatus,
 )
+from app.services.rules_engine import (
+    compare_values,
+    compile_rule,
+    evaluate_compiled_rules,
+    get_field_value,
+    parse_value,
+    rule_cooldown_end,
+)
 from app.workers.locks import with_distributed_lock
 from app.workers.tasks.helpers import publish_event
 
 logger = get_task_logger(__name__)
 
 
-@shared_task(bind=True)
+# Explicit name so the "rules" queue route in celery_app matches; the
+# auto-generated name carried the submodule segment and was never routed.
+@shared_task(bind=True, name="app.workers.tasks.evaluate_rules")
 def evaluate_rules(self, tenant_id: int, rule_id: int):
     """
     Evaluate a specific rule against matching campaigns.
@@ -43,97 +57,173 @@ def evaluate_rules(self, tenant_id: int, rule_id: int):
     logger.info(f"Evaluating rule {rule_id} for tenant {tenant_id}")
 
     with SyncSessionLocal() as db:
-        rule = db.execute(
-            select(Rule).where(
-                Rule.id == rule_id,
-                Rule.tenant_id == tenant_id,
-                Rule.status == RuleStatus.ACTIVE,
-            )
-        ).scalar_one_or_none()
-
-        if not rule:
-            logger.warning(f"Rule {rule_id} not found or inactive")
-            return {"status": "not_found"}
-
-        # Rules mutate campaign state — status and daily_budget_cents — which
-        # feeds pacing, ROAS, and the numbers an operator reads before deciding
-        # a real budget change. That makes it automation, so it answers to the
-        # same gate as every other execution path instead of running whatever
-        # the signal state happens to be.
-        #
-        # Mutating actions are held when the gate says no. Non-mutating ones
-        # (send_alert, apply_label) still run: an alert is precisely what a
-        # degraded tenant needs, and suppressing it would make the gate hide
-        # the problem it exists to surface.
-        gate = evaluate_execution_gate_sync(db, tenant_id)
-        if not gate.allowed:
-            logger.warning(
-                "rules_execution_gate_blocked",
-                extra={
-                    "tenant_id": tenant_id,
-                    "rule_id": rule_id,
-                    "reason": gate.reason,
-                },
-            )
+        summary = _evaluate_tenant_rules(db, tenant_id, rule_ids=[rule_id])
 
-        # Get campaigns matching rule scope
-        campaigns = (
-            db.execute(
-                select(Campaign).where(
-                    Campaign.tenant_id == tenant_id,
-                    Campaign.is_deleted == False,
-                )
+    rule_result = summary["rules"].get(rule_id)
+    if rule_result is None:
+        logger.warning(f"Rule {rule_id} not found or inactive")
+        return {"status": "not_found"}
+    return rule_result
+
+
+@shared_task(name="app.workers.tasks.evaluate_tenant_rules")
+def evaluate_tenant_rules(tenant_id: int):
+    """
+    Evaluate every active rule of one tenant in a single pass.
+
+    Rules are compiled once and evaluated together against one load of the
+    tenant's campaigns, so the database cost is per tenant, not per rule.
+
+    Args:
+        tenant_id: Tenant ID for isolation
+    """
+    with SyncSessionLocal() as db:
+        summary = _evaluate_tenant_rules(db, tenant_id)
+
+    logger.info(
+        f"Tenant {tenant_id}: {summary['rules_evaluated']} rules, "
+        f"{summary['matches']} matches, {summary['executions']} executions"
+    )
+    return summary
+
+
+def _evaluate_tenant_rules(
+    db: Session,
+    tenant_id: int,
+    rule_ids: Optional[list[int]] = None,
+) -> dict[str, Any]:
+    """
+    Evaluate a tenant's active rules (optionally only ``rule_ids``).
+
+    One query for the rules, one for the campaigns, one gate check, one
+    commit. Rules still in cooldown are skipped, as in ``RulesEngine``.
+    """
+    query = select(Rule).where(
+        Rule.tenant_id == tenant_id,
+        Rule.status == RuleStatus.ACTIVE,
+        Rule.is_deleted == False,
+    )
+    if rule_ids is not None:
+        query = query.where(Rule.id.in_(rule_ids))
+    rules = db.execute(query).scalars().all()
+
+    now = datetime.now(UTC)
+    summary: dict[str, Any] = {
+        "tenant_id": tenant_id,
+        "rules_evaluated": 0,
+        "rules_in_cooldown": 0,
+        "matches": 0,
+        "executions": 0,
+        "rules": {},
+    }
+
+    active = []
+    for rule in rules:
+        if rule_cooldown_end(rule, now):
+            summary["rules_in_cooldown"] += 1
+            summary["rules"][rule.id] = {"status": "cooldown"}
+        else:
+            active.append(rule)
+    if not active:
+        return summary
+
+    # Rules mutate campaign state — status and daily_budget_cents — which
+    # feeds pacing, ROAS, and the numbers an operator reads before deciding
+    # a real budget change. That makes it automation, so it answers to the
+    # same gate as every other execution path instead of running whatever
+    # the signal state happens to be.
+    #
+    # Mutating actions are held when the gate says no. Non-mutating ones
+    # (send_alert, apply_label) still run: an alert is precisely what a
+    # degraded tenant needs, and suppressing it would make the gate hide
+    # the problem it exists to surface.
+    gate = evaluate_execution_gate_sync(db, tenant_id)
+    if not gate.allowed:
+        logger.warning(
+            "rules_execution_gate_blocked",
+            extra={
+                "tenant_id": tenant_id,
+                "rule_ids": [r.id for r in active],
+                "reason": gate.reason,
+            },
+        )
+
+    campaigns = (
+        db.execute(
+            select(Campaign).where(
+                Campaign.tenant_id == tenant_id,
+                Campaign.is_deleted == False,
             )
-            .scalars()
-            .all()
         )
+        .scalars()
+        .all()
+    )
+
+    compiled = [compile_rule(rule) for rule in active]
+    evaluations = evaluate_compiled_rules(compiled, campaigns)
 
+    triggered = []
+    for rule, rule_evaluations in zip(active, evaluations):
         matches = 0
         executions = 0
+        acted = False
 
-        for campaign in campaigns:
-            # Evaluate rule conditions
-            result = _evaluate_condition(rule, campaign)
+        for campaign, matched, condition in rule_evaluations:
+            if not matched:
+                continue
+            matches += 1
 
-            if result["matched"]:
-                matches += 1
-
-                # Execute rule action, unless the gate is holding mutations.
-                action_result = _execute_action(
-                    rule, campaign, db, gate_allows_mutation=gate.allowed
-                )
+            # Execute rule action, unless the gate is holding mutations.
+            action_result = _execute_action(
+                rule, campaign, db, gate_allows_mutation=gate.allowed
+            )
+            acted = acted or not action_result.get("skipped")
 
-                # Log execution (columns per RuleExecution model:
-                # triggered/condition_result/action_result, not the old
-                # triggered_at/condition_values/action_taken kwargs).
-                execution = RuleExecution(
+            # Log execution (columns per RuleExecution model:
+            # triggered/condition_result/action_result, not the old
+            # triggered_at/condition_values/action_taken kwargs).
+            db.add(
+                RuleExecution(
                     tenant_id=tenant_id,
                     rule_id=rule.id,
                     campaign_id=campaign.id,
                     triggered=True,
-                    condition_result=result["values"],
+                    condition_result=condition,
                     action_result=action_result,
                 )
-                db.add(execution)
-                executions += 1
-
-        db.commit()
-
-        # Publish event if any actions taken
-        if executions > 0:
-            publish_event(
-                tenant_id,
-                "rule_triggered",
-                {
-                    "rule_id": rule_id,
-                    "rule_name": rule.name,
-                    "matches": matches,
-                    "executions": executions,
-                },
             )
+            executions += 1
+
+        rule.last_evaluated_at = now
+        # A gate-held run doesn't start the cooldown, so the rule acts as
+        # soon as the gate opens again.
+        if acted:
+            rule.last_triggered_at = now
+            rule.trigger_count = (rule.trigger_count or 0) + 1
+
+        summary["rules_evaluated"] += 1
+        summary["matches"] += matches
+        summary["executions"] += executions
+        summary["rules"][rule.id] = {"matches": matches, "executions": executions}
+        if executions:
+            triggered.append((rule, matches, executions))
+
+    db.commit()
+
+    # Publish event if any actions taken
+    for rule, matches, executions in triggered:
+        publish_event(
+            tenant_id,
+            "rule_triggered",
+            {
+                "rule_id": rule.id,
+                "rule_name": rule.name,
+                "matches": matches,
+                "executions": executions,
+            },
+        )
 
-        logger.info(f"Rule {rule_id}: {matches} matches, {executions} executions")
-        return {"matches": matches, "executions": executions}
+    return summary
 
 
 # Explicit name: this module was split out of the old app/workers/tasks.py;
@@ -146,30 +236,30 @@ def evaluate_all_rules():
     Evaluate all active rules across all tenants.
     Scheduled by Celery beat (typically every 15 minutes).
 
+    Queues one evaluate_tenant_rules task per tenant with active rules.
     Uses distributed lock to prevent duplicate execution across workers.
     """
     logger.info("Starting evaluation of all rules")
 
     with SyncSessionLocal() as db:
-        # Get all active rules
-        rules = (
+        tenant_ids = (
             db.execute(
-                select(Rule).where(
+                select(Rule.tenant_id)
+                .where(
                     Rule.status == RuleStatus.ACTIVE,
                     Rule.is_deleted == False,
                 )
+                .distinct()
             )
             .scalars()
             .all()
         )
 
-        task_count = 0
-        for rule in rules:
-            evaluate_rules.delay(rule.tenant_id, rule.id)
-            task_count += 1
+    for tenant_id in tenant_ids:
+        evaluate_tenant_rules.delay(tenant_id)
 
-    logger.info(f"Queued {task_count} rule evaluation tasks")
-    return {"tasks_queued": task_count}
+    logger.info(f"Queued rule evaluation for {len(tenant_ids)} tenants")
+    return {"tasks_queued": len(tenant_ids)}
 
 
 def _evaluate_condition(rule: Rule, campaign: Campaign) -> dict[str, Any]:
@@ -179,101 +269,31 @@ def _evaluate_condition(rule: Rule, campaign: Campaign) -> dict[str, Any]:
     The Rule model stores a single flat condition
     (``condition_field`` / ``condition_operator`` / ``condition_value``), not a
     ``conditions`` list — reading the latter raised AttributeError and killed
-    the beat task. This mirrors the canonical async ``RulesEngine`` so the
-    scheduled evaluator and the API dry-run agree.
+    the beat task. Evaluation goes through the compiled path shared with the
+    canonical async ``RulesEngine`` so the scheduled evaluator and the API
+    dry-run agree.
 
     Returns:
         Dict with 'matched' bool and 'values' dict describing the evaluation.
     """
-    field = rule.condition_field
-    operator = rule.condition_operator
-    expected_raw = rule.condition_value
-
-    actual = _get_field_value(campaign, field)
-    if actual is None:
-        return {
-            "matched": False,
-            "values": {"field": field, "reason": "field not found or null"},
-        }
-
-    try:
-        expected = _parse_value(expected_raw, type(actual))
-    except (ValueError, TypeError) as e:
-        return {
-            "matched": False,
-            "values": {"field": field, "reason": f"invalid condition value: {e}"},
-        }
-
-    matched = _compare_values(actual, operator, expected)
-    return {
-        "matched": matched,
-        "values": {
-            "field": field,
-            "operator": getattr(operator, "value", operator),
-            "expected": expected,
-            "actual": actual,
-        },
-    }
+    compiled = compile_rule(rule)
+    matched, values = compiled.evaluate(get_field_value(campaign, compiled.field_name))
+    return {"matched": matched, "values": values}
 
 
 def _get_field_value(campaign: Campaign, field: str) -> Any:
     """Resolve a metric value from a campaign, including computed metrics."""
-    if hasattr(campaign, field):
-        return getattr(campaign, field)
-
-    computed = {
-        "spend": lambda c: c.total_spend_cents / 100,
-        "revenue": lambda c: c.revenue_cents / 100,
-        "cpc": lambda c: (
-            (c.total_spend_cents / c.clicks / 100) if c.clicks > 0 else None
-        ),
-        "cpm": lambda c: (
-            (c.total_spend_cents / c.impressions * 1000 / 100)
-            if c.impressions > 0
-            else None
-        ),
-        "cpa": lambda c: (
-            (c.total_spend_cents / c.conversions / 100) if c.conversions > 0 else None
-        ),
-        "conversion_rate": lambda c: (
-            (c.conversions / c.clicks * 100) if c.clicks > 0 else None
-        ),
-    }
-    if field in computed:
-        return computed[field](campaign)
-    return None
+    return get_field_value(campaign, field)
 
 
 def _parse_value(value: str, target_type: type) -> Any:
     """Parse a string condition value to match the actual value's type."""
-    if target_type == float:
-        return float(value)
-    elif target_type == int:
-        return int(float(value))
-    elif target_type == bool:
-        return value.lower() in ("true", "1", "yes")
-    return value
+    return parse_value(value, target_type)
 
 
 def _compare_values(actual: Any, operator: RuleOperator, expected: Any) -> bool:
     """Compare actual vs expected using the rule operator."""
-    if operator == RuleOperator.EQUALS:
-        return actual == expected
-    elif operator == RuleOperator.NOT_EQUALS:
-        return actual != expected
-    elif operator == RuleOperator.GREATER_THAN:
-        return actual > expected
-    elif operator == RuleOperator.LESS_THAN:
-        return actual < expected
-    elif operator == RuleOperator.GREATER_THAN_OR_EQUAL:
-        return actual >= expected
-    elif operator == RuleOperator.LESS_THAN_OR_EQUAL:
-        return actual <= expected
-    elif operator == RuleOperator.CONTAINS:
-        return str(expected) in str(actual)
-    elif operator == RuleOperator.IN:
-        return actual in expected
-    return False
+    return compare_values(actual, operator, expected)
 
 
 #: Rule actions that change campaign state. These answer to the execution
@@ -3,104 +3,274 @@
 # =============================================================================
 """
 Background tasks for daily score calculations (scaling, health, etc.).
+
+The beat task only fans out: each tenant is scored by its own
+``calculate_tenant_scores`` task, which loads every campaign's metrics in a
+single grouped query, computes all scores on NumPy arrays, and writes them
+back with one bulk UPDATE.
 """
 
-from datetime import UTC, datetime
+from collections.abc import Sequence
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
 
+import numpy as np
 from celery import shared_task
 from celery.utils.log import get_task_logger
-from sqlalchemy import select
+from sqlalchemy import case, func, select, update
 
+from app.analytics.logic.scoring import scaling_score_arrays
+from app.analytics.logic.signal_health import signal_health_status_arrays
 from app.db.session import SyncSessionLocal
-from app.models import Campaign, Tenant
+from app.ml.roas_optimizer import calculate_health_scores
+from app.models import (
+    Campaign,
+    CampaignMetric,
+    CampaignStatus,
+    FactSignalHealthDaily,
+    Tenant,
+)
+from app.models.trust_layer import SignalHealthStatus as StoredSignalStatus
+from app.workers.locks import with_distributed_lock
 from app.workers.tasks.helpers import publish_event
 
 logger = get_task_logger(__name__)
 
+# Days of history (before the scored day) that form the baseline
+BASELINE_DAYS = 7
+
+# Metric columns summed per window
+_METRICS = ("impressions", "clicks", "conversions", "spend_cents", "revenue_cents")
+
 
 # Explicit name: this module was split out of the old app/workers/tasks.py;
 # without it the auto-generated name gains the submodule segment and the
 # beat schedule's task reference silently dispatches to nothing.
 @shared_task(name="app.workers.tasks.calculate_daily_scores")
+@with_distributed_lock(timeout=1800)  # 30 minute lock timeout
 def calculate_daily_scores():
     """
-    Calculate daily performance scores for all campaigns.
+    Queue daily score calculation for every tenant.
     Scheduled daily by Celery beat.
 
+    Each tenant is scored by ``calculate_tenant_scores`` so the work spreads
+    across the worker pool instead of running serially in one task.
+    """
+    logger.info("Starting daily score calculations")
+
+    with SyncSessionLocal() as db:
+        tenant_ids = (
+            db.execute(select(Tenant.id).where(Tenant.is_deleted == False))
+            .scalars()
+            .all()
+        )
+
+    score_date = (datetime.now(UTC) - timedelta(days=1)).date().isoformat()
+    for tenant_id in tenant_ids:
+        calculate_tenant_scores.delay(tenant_id, score_date)
+
+    logger.info(f"Queued daily scoring for {len(tenant_ids)} tenants")
+    return {"tasks_queued": len(tenant_ids)}
+
+
+@shared_task(name="app.workers.tasks.calculate_tenant_scores")
+def calculate_tenant_scores(tenant_id: int, score_date: str | None = None):
+    """
+    Calculate daily performance scores for one tenant's campaigns.
+
     Calculates:
     - Scaling scores (scale/watch/fix recommendations)
     - Health scores (0-100 composite)
     - Signal health for trust engine
+
+    Args:
+        tenant_id: Tenant to score
+        score_date: ISO date being scored (defaults to yesterday, UTC)
     """
-    logger.info("Starting daily score calculations")
+    day = (
+        date.fromisoformat(score_date)
+        if score_date
+        else (datetime.now(UTC) - timedelta(days=1)).date()
+    )
+    baseline_start = day - timedelta(days=BASELINE_DAYS)
 
     with SyncSessionLocal() as db:
-        tenants = (
-            db.execute(select(Tenant).where(Tenant.is_deleted == False)).scalars().all()
-        )
+        metric_rows = db.execute(
+            _campaign_metrics_query(tenant_id, day, baseline_start)
+        ).all()
+        if not metric_rows:
+            return {"tenant_id": tenant_id, "campaigns_scored": 0}
 
-        total_scored = 0
-        for tenant in tenants:
-            campaigns = (
-                db.execute(
-                    select(Campaign).where(
-                        Campaign.tenant_id == tenant.id,
-                        Campaign.is_deleted == False,
-                        Campaign.status.in_(["active", "paused"]),
-                    )
-                )
-                .scalars()
-                .all()
+        signal_rows = db.execute(
+            select(
+                FactSignalHealthDaily.platform,
+                FactSignalHealthDaily.account_id,
+                FactSignalHealthDaily.emq_score,
+                FactSignalHealthDaily.event_loss_pct,
+                FactSignalHealthDaily.status,
             )
-
-            for campaign in campaigns:
-                try:
-                    # Calculate scaling score
-                    from app.analytics.logic.scoring import calculate_scaling_score
-
-                    scaling = calculate_scaling_score(
-                        campaign_id=campaign.id,
-                        tenant_id=tenant.id,
-                    )
-                    campaign.scaling_score = scaling.get("score")
-                    campaign.scaling_recommendation = scaling.get("recommendation")
-
-                    # Calculate health score
-                    from app.ml.roas_optimizer import ROASOptimizer
-
-                    optimizer = ROASOptimizer(tenant.id)
-                    health = optimizer.calculate_health_score(campaign.id)
-                    campaign.health_score = health.get("score")
-
-                    # Calculate signal health for trust engine
-                    from app.analytics.logic.signal_health import (
-                        calculate_signal_health,
-                    )
-
-                    signal = calculate_signal_health(
-                        campaign_id=campaign.id,
-                        tenant_id=tenant.id,
-                    )
-                    campaign.signal_health = signal.get("score")
-                    campaign.signal_health_status = signal.get("status")
-
-                    total_scored += 1
-
-                except (ValueError, TypeError, KeyError, RuntimeError) as e:
-                    logger.error(f"Scoring failed for campaign {campaign.id}: {e}")
-
-            # Commit per tenant to avoid long transactions
-            db.commit()
-
-            # Publish tenant scores updated event
-            publish_event(
-                tenant.id,
-                "scores_updated",
-                {
-                    "campaigns_scored": len(campaigns),
-                    "timestamp": datetime.now(UTC).isoformat(),
-                },
+            .where(
+                FactSignalHealthDaily.tenant_id == tenant_id,
+                FactSignalHealthDaily.date.between(baseline_start, day),
             )
+            .order_by(FactSignalHealthDaily.date)
+        ).all()
+
+        updates = score_campaigns(metric_rows, signal_rows, scored_at=datetime.now(UTC))
+        db.execute(update(Campaign), updates)
+        db.commit()
+
+    publish_event(
+        tenant_id,
+        "scores_updated",
+        {
+            "campaigns_scored": len(updates),
+            "timestamp": datetime.now(UTC).isoformat(),
+        },
+    )
+
+    logger.info(f"Calculated scores for {len(updates)} campaigns of tenant {tenant_id}")
+    return {"tenant_id": tenant_id, "campaigns_scored": len(updates)}
+
+
+def _campaign_metrics_query(tenant_id: int, day: date, baseline_start: date):
+    """Per-campaign sums for the scored day and the baseline window."""
+
+    def _window_sum(column, in_window):
+        return func.coalesce(func.sum(case((in_window, column), else_=0)), 0)
+
+    is_today = CampaignMetric.date == day
+    is_baseline = CampaignMetric.date < day
+    columns = [
+        _window_sum(getattr(CampaignMetric, name), window).label(f"{prefix}_{name}")
+        for prefix, window in (("today", is_today), ("baseline", is_baseline))
+        for name in _METRICS
+    ]
+
+    return (
+        select(
+            CampaignMetric.campaign_id,
+            Campaign.platform,
+            Campaign.account_id,
+            *columns,
+        )
+        .join(Campaign, Campaign.id == CampaignMetric.campaign_id)
+        .where(
+            CampaignMetric.tenant_id == tenant_id,
+            CampaignMetric.date.between(baseline_start, day),
+            Campaign.is_deleted == False,
+            Campaign.status.in_([CampaignStatus.ACTIVE, CampaignStatus.PAUSED]),
+        )
+        .group_by(CampaignMetric.campaign_id, Campaign.platform, Campaign.account_id)
+    )
+
+
+def _rates(
+    impressions: np.ndarray,
+    clicks: np.ndarray,
+    conversions: np.ndarray,
+    spend: np.ndarray,
+    revenue: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """Derived ratio metrics, 0 wherever the denominator is 0."""
+
+    def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+        return np.divide(num, den, out=np.zeros_like(num), where=den > 0)
+
+    return {
+        "roas": _ratio(revenue, spend),
+        "cpa": _ratio(spend, conversions),
+        "cvr": _ratio(conversions, clicks),
+        "ctr": _ratio(clicks, impressions),
+    }
+
+
+def score_campaigns(
+    metric_rows: Sequence[Any],
+    signal_rows: Sequence[Any],
+    scored_at: datetime,
+) -> list[dict[str, Any]]:
+    """
+    Score a tenant's campaigns from aggregated metric rows.
+
+    Args:
+        metric_rows: Rows from ``_campaign_metrics_query``
+        signal_rows: FactSignalHealthDaily rows ordered oldest first
+        scored_at: Timestamp stamped on every campaign
+
+    Returns:
+        Bulk UPDATE parameter dicts keyed by campaign primary key
+    """
+
+    def _column(name: str) -> np.ndarray:
+        return np.array([getattr(r, name) for r in metric_rows], dtype=float)
+
+    today = {name: _column(f"today_{name}") for name in _METRICS}
+    baseline = {name: _column(f"baseline_{name}") for name in _METRICS}
+    today_spend = today["spend_cents"] / 100
+    today_rates = _rates(
+        today["impressions"],
+        today["clicks"],
+        today["conversions"],
+        today_spend,
+        today["revenue_cents"] / 100,
+    )
+    baseline_rates = _rates(
+        baseline["impressions"],
+        baseline["clicks"],
+        baseline["conversions"],
+        baseline["spend_cents"] / 100,
+        baseline["revenue_cents"] / 100,
+    )
+
+    # Latest signal health per platform/account; account rows win over
+    # platform-wide rows (account_id NULL)
+    latest: dict[tuple[str, str | None], Any] = {}
+    for row in signal_rows:
+        latest[(row.platform, row.account_id)] = row
+
+    platforms = [getattr(r.platform, "value", r.platform) for r in metric_rows]
+    signals = [
+        latest.get((platform, r.account_id)) or latest.get((platform, None))
+        for platform, r in zip(platforms, metric_rows)
+    ]
+    emq = np.array(
+        [s.emq_score if s and s.emq_score is not None else np.nan for s in signals],
+        dtype=float,
+    )
+    loss = np.array(
+        [
+            s.event_loss_pct if s and s.event_loss_pct is not None else np.nan
+            for s in signals
+        ],
+        dtype=float,
+    )
+    api_ok = np.array(
+        [not s or s.status != StoredSignalStatus.CRITICAL for s in signals],
+        dtype=bool,
+    )
+
+    scores, actions = scaling_score_arrays(
+        {**today_rates, "conversions": today["conversions"], "emq_score": emq},
+        baseline_rates,
+    )
+    health = calculate_health_scores(
+        np.array(platforms, dtype=object),
+        today_rates["roas"],
+        today_rates["ctr"] * 100,
+        today_spend,
+        today["conversions"],
+    )
+    signal_status = signal_health_status_arrays(emq, loss, api_ok)
 
-    logger.info(f"Calculated scores for {total_scored} campaigns")
-    return {"campaigns_scored": total_scored}
+    return [
+        {
+            "id": row.campaign_id,
+            "scaling_score": float(scores[i]),
+            "scaling_recommendation": str(actions[i]),
+            "health_score": float(health[i]),
+            "signal_health_status": str(signal_status[i]),
+            "scores_calculated_at": scored_at,
+        }
+        for i, row in enumerate(metric_rows)
+    ]
@@ -18,6 +18,7 @@ from sqlalchemy import select
 from app.core.config import settings
 from app.db.session import SyncSessionLocal
 from app.models import Campaign, CampaignMetric, Tenant
+from app.services.dashboard_rollups import refresh_daily_rollups_sync
 from app.workers.locks import with_distributed_lock
 from app.workers.tasks.helpers import publish_event
 
@@ -145,6 +146,13 @@ def sync_campaign_data(self, tenant_id: int, campaign_id: int):
                 campaign.last_synced_at = datetime.now(UTC)
                 campaign.sync_error = None
 
+                refresh_daily_rollups_sync(
+                    db,
+                    tenant_id,
+                    [day_data["date"] for day_data in time_series],
+                    platform=campaign.platform,
+                )
+
             db.commit()
 
             # Publish real-time event
@@ -0,0 +1,83 @@
+# =============================================================================
+# Stratum AI - Benchmark Configuration (conftest.py)
+# =============================================================================
+"""
+Pytest configuration for the hot-path benchmark suite.
+
+Benchmarks run against the synthetic CSVs bundled under ``datasets/`` at the
+repository root (gcc, v1, ml_datasets). Each dataset fixture is available at
+its native size and as a generated larger variant (``--bench-scale``), so the
+same benchmark shows how a code path scales.
+
+Benchmarks live outside ``tests/`` so ``make test`` never runs them. See
+benchmarks/README.md for saving and comparing JSON baselines.
+"""
+
+import importlib.util
+import os
+
+import pandas as pd
+import pytest
+
+# Set environment variables before any app imports
+os.environ.setdefault("APP_ENV", "development")
+os.environ.setdefault("DEBUG", "false")
+
+from benchmarks.datasets import load_csv  # noqa: E402
+
+# Without the plugin there is no ``benchmark`` fixture; skip collection
+# rather than erroring every test.
+if importlib.util.find_spec("pytest_benchmark") is None:
+    collect_ignore_glob = ["test_*.py"]
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--bench-scale",
+        type=int,
+        default=10,
+        help="Multiplier for the generated large dataset variants (default: 10)",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize every benchmark that asks for ``size`` as base vs scaled."""
+    if "size" in metafunc.fixturenames:
+        scale = metafunc.config.getoption("--bench-scale")
+        metafunc.parametrize("size", [1, scale], ids=["base", f"x{scale}"])
+
+
+# =============================================================================
+# Dataset fixtures (session-scoped; loading is not what we measure)
+# =============================================================================
+
+
+@pytest.fixture(scope="session")
+def gcc_daily() -> pd.DataFrame:
+    """Ad-level daily facts for KSA, Kuwait and Qatar."""
+    frames = [
+        load_csv(f"gcc/fact_daily_{market}.csv")
+        for market in ("KSA", "Kuwait", "Qatar")
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.fixture(scope="session")
+def v1_creatives() -> pd.DataFrame:
+    """Creative dimension from the v1 synthetic dataset."""
+    return load_csv("v1/dim_creative.csv")
+
+
+@pytest.fixture(scope="session")
+def campaign_performance() -> pd.DataFrame:
+    return load_csv("ml_datasets/campaign_performance_dataset.csv")
+
+
+@pytest.fixture(scope="session")
+def ltv_customers() -> pd.DataFrame:
+    return load_csv("ml_datasets/ltv_prediction_dataset.csv")
+
+
+@pytest.fixture(scope="session")
+def anomaly_series() -> pd.DataFrame:
+    return load_csv("ml_datasets/anomaly_detection_dataset.csv")
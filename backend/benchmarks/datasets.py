@@ -0,0 +1,52 @@
+# =============================================================================
+# Stratum AI - Benchmark Datasets
+# =============================================================================
+"""
+Loaders for the synthetic CSVs bundled under ``datasets/`` at the repository
+root, plus a generator for larger variants of them.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+DATASETS_DIR = Path(__file__).resolve().parents[2] / "datasets"
+
+
+def load_csv(relative_path: str) -> pd.DataFrame:
+    """Load a bundled dataset CSV, skipping the benchmark if it is absent."""
+    path = DATASETS_DIR / relative_path
+    if not path.exists():
+        pytest.skip(f"dataset not found: {path}")
+    return pd.read_csv(path)
+
+
+def scale_frame(
+    df: pd.DataFrame,
+    factor: int,
+    id_columns: tuple[str, ...] = (),
+    seed: int = 42,
+) -> pd.DataFrame:
+    """
+    Generate a larger variant of a dataset.
+
+    Tiles the frame ``factor`` times, suffixes identifier columns so each
+    copy is a distinct entity, and applies +/-10% multiplicative noise to
+    float columns so copies are not byte-identical.
+    """
+    if factor <= 1:
+        return df
+    rng = np.random.default_rng(seed)
+    copies = []
+    float_cols = df.select_dtypes(include="float").columns
+    for i in range(factor):
+        copy = df.copy()
+        for col in id_columns:
+            copy[col] = copy[col].astype(str) + f"_{i}"
+        if i and len(float_cols):
+            noise = rng.uniform(0.9, 1.1, size=(len(copy), len(float_cols)))
+            copy[float_cols] = copy[float_cols].to_numpy() * noise
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
@@ -0,0 +1,191 @@
+# =============================================================================
+# Stratum AI - Analytics Logic Benchmarks
+# =============================================================================
+"""
+Benchmarks for app/analytics/logic: anomalies, budget, scoring, attribution.
+
+Inputs are built from the GCC ad-level daily facts: each ad is an entity,
+its last day is "today" and the preceding days are its history/baseline.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.analytics.logic.anomalies import detect_anomalies, detect_entity_anomalies
+from app.analytics.logic.attribution import batch_attribution_variance
+from app.analytics.logic.budget import reallocate_budget
+from app.analytics.logic.scoring import batch_scaling_scores, scaling_score_arrays
+from app.analytics.logic.types import (
+    BaselineMetrics,
+    EntityLevel,
+    EntityMetrics,
+    Platform,
+)
+from benchmarks.datasets import scale_frame
+
+_PLATFORMS = {p.value for p in Platform}
+_PLATFORM_ALIASES = {"google ads": "google", "snapchat": "snap"}
+
+
+@pytest.fixture
+def entity_daily(gcc_daily, size) -> pd.DataFrame:
+    """Per-ad daily facts with derived rate columns, oldest day first."""
+    df = scale_frame(gcc_daily, size, id_columns=("ad_id",))
+    df = df.assign(
+        platform=df["platform"].str.lower().replace(_PLATFORM_ALIASES),
+        cpa=np.where(
+            df["conversions_total"] > 0,
+            df["spend_usd"] / df["conversions_total"].clip(lower=1),
+            0.0,
+        ),
+        cvr=np.where(
+            df["clicks"] > 0, df["conversions_total"] / df["clicks"].clip(lower=1), 0.0
+        ),
+    )
+    return df.sort_values(["ad_id", "date"], kind="stable")
+
+
+@pytest.fixture
+def today_and_baseline(entity_daily):
+    """(today rows, baseline aggregates) per ad."""
+    last_day = entity_daily.groupby("ad_id")["date"].transform("max")
+    is_today = entity_daily["date"] == last_day
+    today = entity_daily[is_today].set_index("ad_id")
+    baseline = (
+        entity_daily[~is_today]
+        .groupby("ad_id")[
+            ["spend_usd", "revenue_usd", "impressions", "clicks", "conversions_total"]
+        ]
+        .sum()
+    )
+    return today, baseline.reindex(today.index, fill_value=0)
+
+
+@pytest.fixture
+def scoring_inputs(today_and_baseline):
+    today, baseline = today_and_baseline
+    entities = [
+        EntityMetrics(
+            entity_id=ad_id,
+            entity_name=ad_id,
+            entity_level=EntityLevel.CREATIVE,
+            platform=row.platform if row.platform in _PLATFORMS else "meta",
+            date=datetime.fromisoformat(row.date),
+            spend=row.spend_usd,
+            impressions=int(row.impressions),
+            clicks=int(row.clicks),
+            conversions=int(row.conversions_total),
+            revenue=row.revenue_usd,
+            cpa=row.cpa,
+            roas=row.roas,
+            cvr=row.cvr,
+            ctr=row.ctr,
+            emq_score=row.emq_score,
+        )
+        for ad_id, row in today.iterrows()
+    ]
+    baselines = {}
+    for ad_id, row in baseline.iterrows():
+        spend, conv, clicks = row.spend_usd, row.conversions_total, row.clicks
+        baselines[ad_id] = BaselineMetrics(
+            spend=spend,
+            impressions=int(row.impressions),
+            clicks=int(clicks),
+            conversions=int(conv),
+            revenue=row.revenue_usd,
+            roas=row.revenue_usd / spend if spend else 0.0,
+            cpa=spend / conv if conv else 0.0,
+            cvr=conv / clicks if clicks else 0.0,
+            ctr=clicks / row.impressions if row.impressions else 0.0,
+        )
+    return entities, baselines
+
+
+def test_scaling_scores(benchmark, scoring_inputs):
+    entities, baselines = scoring_inputs
+    results = benchmark(batch_scaling_scores, entities, baselines)
+    assert len(results) == len(entities)
+
+
+def test_scaling_score_arrays(benchmark, scoring_inputs):
+    entities, baselines = scoring_inputs
+    today = {
+        key: np.array([getattr(e, key) for e in entities], dtype=float)
+        for key in ("roas", "cpa", "cvr", "ctr", "conversions", "emq_score")
+    }
+    baseline = {
+        key: np.array([getattr(baselines[e.entity_id], key) for e in entities])
+        for key in ("roas", "cpa", "cvr", "ctr")
+    }
+    scores, _ = benchmark(scaling_score_arrays, today, baseline)
+    assert len(scores) == len(entities)
+
+
+def test_budget_reallocation(benchmark, scoring_inputs):
+    entities, baselines = scoring_inputs
+    scores = batch_scaling_scores(entities, baselines)
+    spends = {e.entity_id: max(e.spend, 50.0) for e in entities}
+    actions = benchmark(reallocate_budget, scores, spends)
+    assert isinstance(actions, list)
+
+
+def test_account_anomalies_rolling(benchmark, anomaly_series, size):
+    """Daily account-level detection replayed over the whole series."""
+    series = scale_frame(anomaly_series, size)
+    metrics = ["spend", "revenue", "roas", "cpa", "conversions"]
+    columns = {m: series[m].tolist() for m in metrics}
+
+    def run():
+        return [
+            detect_anomalies(
+                {m: values[:day] for m, values in columns.items()},
+                {m: values[day] for m, values in columns.items()},
+            )
+            for day in range(14, len(series))
+        ]
+
+    results = benchmark(run)
+    assert len(results) == len(series) - 14
+
+
+def test_entity_anomalies(benchmark, entity_daily):
+    metrics = {
+        "spend": "spend_usd",
+        "revenue": "revenue_usd",
+        "roas": "roas",
+        "cpa": "cpa",
+        "conversions": "conversions_total",
+        "emq_score": "emq_score",
+    }
+    entities = []
+    for ad_id, group in entity_daily.groupby("ad_id", sort=False):
+        history = {m: group[col].iloc[:-1].tolist() for m, col in metrics.items()}
+        current = {m: float(group[col].iloc[-1]) for m, col in metrics.items()}
+        entities.append((ad_id, history, current))
+
+    def run():
+        return [detect_entity_anomalies(*entity) for entity in entities]
+
+    results = benchmark(run)
+    assert len(results) == len(entities)
+
+
+def test_attribution_variance(benchmark, entity_daily):
+    totals = entity_daily.groupby("ad_id")[
+        ["revenue_usd", "purchases", "conv_7d_click", "conv_1d_click"]
+    ].sum()
+    entities = [
+        {
+            "entity_id": ad_id,
+            "platform_revenue": row.revenue_usd,
+            "platform_conversions": int(row.conv_7d_click),
+            "ga4_revenue": row.revenue_usd * 0.8,
+            "ga4_conversions": int(row.purchases),
+        }
+        for ad_id, row in totals.iterrows()
+    ]
+    results = benchmark(batch_attribution_variance, entities)
+    assert len(results) == len(entities)
@@ -0,0 +1,65 @@
+# =============================================================================
+# Stratum AI - Data-Driven Attribution Benchmarks
+# =============================================================================
+"""
+Benchmarks for the Markov chain and Shapley value attribution models.
+
+Journeys are synthesized from the GCC daily facts: touchpoints are drawn
+from the platform channels in proportion to their clicks, and each journey
+converts at the observed click-to-conversion rate.
+"""
+
+import numpy as np
+import pytest
+
+from app.services.attribution.markov_attribution import MarkovChainModel
+from app.services.attribution.shapley_attribution import ShapleyValueModel
+
+
+@pytest.fixture
+def journeys(gcc_daily, size):
+    """One synthetic journey per fact row (scaled by ``size``)."""
+    rng = np.random.default_rng(7)
+    by_channel = gcc_daily.groupby("platform")[["clicks", "conversions_total"]].sum()
+    channels = by_channel.index.to_numpy()
+    weights = (by_channel["clicks"] / by_channel["clicks"].sum()).to_numpy()
+    conversion_rate = by_channel["conversions_total"].sum() / by_channel["clicks"].sum()
+
+    count = len(gcc_daily) * size
+    lengths = rng.integers(1, 5, count)
+    touches = rng.choice(channels, size=lengths.sum(), p=weights)
+    converted = rng.random(count) < min(conversion_rate * 2, 0.5)
+    bounds = np.concatenate(([0], np.cumsum(lengths)))
+    return [
+        (list(touches[bounds[i] : bounds[i + 1]]), bool(converted[i]))
+        for i in range(count)
+    ]
+
+
+def _fit(model_cls, journeys):
+    model = model_cls()
+    for channels, converted in journeys:
+        model.add_journey(channels, converted)
+    return model
+
+
+def test_markov_fit(benchmark, journeys):
+    model = benchmark(_fit, MarkovChainModel, journeys)
+    assert model.journey_count == len(journeys)
+
+
+def test_markov_attribution_weights(benchmark, journeys):
+    model = _fit(MarkovChainModel, journeys)
+    weights = benchmark(model.calculate_attribution_weights)
+    assert weights
+
+
+def test_shapley_fit(benchmark, journeys):
+    model = benchmark(_fit, ShapleyValueModel, journeys)
+    assert model.journey_count == len(journeys)
+
+
+def test_shapley_attribution_weights(benchmark, journeys):
+    model = _fit(ShapleyValueModel, journeys)
+    weights = benchmark(model.calculate_attribution_weights)
+    assert weights
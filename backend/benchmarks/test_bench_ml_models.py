@@ -0,0 +1,225 @@
+# =============================================================================
+# Stratum AI - ML Model Benchmarks
+# =============================================================================
+"""
+Benchmarks for RFMSegmenter, LTVPredictor, CreativeLifecyclePredictor and
+ModelRegistry.predict.
+
+Customer inputs come from ml_datasets/ltv_prediction_dataset.csv, creative
+histories from the GCC daily facts (joined to the v1 creative formats), and
+the registry serves a small ROAS model trained on
+ml_datasets/campaign_performance_dataset.csv.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app.ml.creative_lifecycle import (
+    CreativeLifecyclePredictor,
+    CreativePerformanceHistory,
+)
+from app.ml.inference import LocalInferenceStrategy, ModelRegistry
+from app.ml.integrity import write_checksum
+from app.ml.ltv_predictor import CustomerBehavior, LTVPredictor
+from app.ml.rfm_segmenter import CustomerRFMData, RFMSegmenter
+from benchmarks.datasets import scale_frame
+
+_ROAS_FEATURES = ["log_spend", "log_impressions", "log_clicks", "ctr", "cpm"]
+
+
+# =============================================================================
+# Customer models
+# =============================================================================
+
+
+@pytest.fixture
+def customers(ltv_customers, size):
+    return scale_frame(ltv_customers, size, id_columns=("customer_id",))
+
+
+@pytest.fixture
+def rfm_customers(customers):
+    return [
+        CustomerRFMData(
+            customer_id=row.customer_id,
+            days_since_last_order=int(row.recency_days),
+            total_orders=int(row.total_orders),
+            total_revenue=float(row.total_revenue),
+        )
+        for row in customers.itertuples(index=False)
+    ]
+
+
+@pytest.fixture
+def ltv_behaviors(customers):
+    now = datetime.now(timezone.utc)
+    return [
+        CustomerBehavior(
+            customer_id=row.customer_id,
+            acquisition_date=now - timedelta(days=int(row.account_age_days)),
+            acquisition_channel=row.acquisition_channel,
+            first_order_value=float(row.first_purchase_value),
+            sessions_first_week=int(row.website_visits_30d) // 4,
+            email_opens_first_week=int(row.email_opens_30d) // 4,
+            total_orders=int(row.total_orders),
+            total_revenue=float(row.total_revenue),
+            days_since_last_order=int(row.recency_days),
+            avg_order_value=float(row.avg_order_value),
+            order_frequency_days=float(row.avg_days_between_orders),
+        )
+        for row in customers.itertuples(index=False)
+    ]
+
+
+def test_rfm_fit(benchmark, rfm_customers):
+    segmenter = benchmark(RFMSegmenter().fit, rfm_customers)
+    assert segmenter is not None
+
+
+def test_rfm_segment_customers(benchmark, rfm_customers):
+    segmenter = RFMSegmenter().fit(rfm_customers)
+    result = benchmark(segmenter.segment_customers, rfm_customers)
+    assert result["segments"]
+
+
+def test_ltv_predict_batch(benchmark, ltv_behaviors, tmp_path):
+    predictor = LTVPredictor(models_path=str(tmp_path))
+
+    def run():
+        return [predictor.predict(b) for b in ltv_behaviors]
+
+    predictions = benchmark(run)
+    assert len(predictions) == len(ltv_behaviors)
+
+
+# =============================================================================
+# Creative lifecycle
+# =============================================================================
+
+
+@pytest.fixture
+def creative_histories(gcc_daily, v1_creatives, size):
+    formats = dict(zip(v1_creatives["creative_id"], v1_creatives["format"].str.lower()))
+    daily = (
+        gcc_daily.groupby(["creative_id", "platform", "date"])[
+            ["impressions", "clicks", "conversions_total", "spend_usd", "revenue_usd"]
+        ]
+        .sum()
+        .reset_index()
+    )
+    daily = scale_frame(daily, size, id_columns=("creative_id",))
+
+    histories = []
+    for (creative_id, platform), g in daily.groupby(["creative_id", "platform"]):
+        impressions = g["impressions"].to_numpy()
+        clicks = g["clicks"].to_numpy()
+        conversions = g["conversions_total"].to_numpy()
+        spend = g["spend_usd"].to_numpy()
+        histories.append(
+            CreativePerformanceHistory(
+                creative_id=creative_id,
+                creative_name=creative_id,
+                platform=platform.lower(),
+                creative_type=formats.get(creative_id.split("_")[0], "image"),
+                dates=[datetime.fromisoformat(d) for d in g["date"]],
+                impressions=impressions.tolist(),
+                clicks=clicks.tolist(),
+                conversions=conversions.tolist(),
+                spend=spend.tolist(),
+                ctr=(clicks / np.maximum(impressions, 1) * 100).tolist(),
+                cvr=(conversions / np.maximum(clicks, 1) * 100).tolist(),
+                cpa=(spend / np.maximum(conversions, 1)).tolist(),
+                roas=(g["revenue_usd"].to_numpy() / np.maximum(spend, 1e-9)).tolist(),
+                total_spend=float(spend.sum()),
+                days_active=len(g),
+            )
+        )
+    return histories
+
+
+def test_creative_fatigue_predictions(benchmark, creative_histories):
+    predictor = CreativeLifecyclePredictor()
+
+    def run():
+        return [predictor.predict_fatigue(h) for h in creative_histories]
+
+    predictions = benchmark(run)
+    assert len(predictions) == len(creative_histories)
+
+
+def test_creative_fatigue_batch_predictions(benchmark, creative_histories):
+    predictor = CreativeLifecyclePredictor()
+
+    predictions = benchmark(predictor.predict_fatigue_batch, creative_histories)
+    assert len(predictions) == len(creative_histories)
+
+
+# =============================================================================
+# Model registry
+# =============================================================================
+
+
+@pytest.fixture(scope="module")
+def roas_model_dir(campaign_performance, tmp_path_factory):
+    """Train and register a small ROAS model in a scratch models directory."""
+    sklearn = pytest.importorskip("sklearn.ensemble")
+    joblib = pytest.importorskip("joblib")
+
+    df = campaign_performance
+    X = np.column_stack(
+        [
+            np.log1p(df["spend"]),
+            np.log1p(df["impressions"]),
+            np.log1p(df["clicks"]),
+            df["ctr"],
+            df["cpm"],
+        ]
+    )
+    model = sklearn.GradientBoostingRegressor(n_estimators=50, random_state=0)
+    model.fit(X, df["roas"])
+
+    models_dir = tmp_path_factory.mktemp("ml_models")
+    model_file = models_dir / "roas_predictor.pkl"
+    joblib.dump(model, model_file)
+    write_checksum(model_file)
+    (models_dir / "roas_predictor_metadata.json").write_text(
+        json.dumps({"version": "bench", "features": _ROAS_FEATURES})
+    )
+    return models_dir
+
+
+@pytest.fixture
+def registry(roas_model_dir):
+    registry = ModelRegistry()
+    original = registry._strategy
+    registry._strategy = LocalInferenceStrategy(models_path=str(roas_model_dir))
+    yield registry
+    registry._strategy = original
+
+
+def test_model_registry_predict(benchmark, registry, campaign_performance, size):
+    rows = campaign_performance.head(100 * size)
+    features = [
+        {
+            "log_spend": float(np.log1p(r.spend)),
+            "log_impressions": float(np.log1p(r.impressions)),
+            "log_clicks": float(np.log1p(r.clicks)),
+            "ctr": float(r.ctr),
+            "cpm": float(r.cpm),
+        }
+        for r in rows.itertuples(index=False)
+    ]
+    loop = asyncio.new_event_loop()
+
+    async def predict_all():
+        return [await registry.predict("roas_predictor", f) for f in features]
+
+    try:
+        results = benchmark(lambda: loop.run_until_complete(predict_all()))
+    finally:
+        loop.close()
+    assert len(results) == len(features)
@@ -0,0 +1,41 @@
+# =============================================================================
+# Stratum AI - PII Encryption Benchmarks
+# =============================================================================
+"""
+Benchmarks for encrypt_pii / decrypt_pii on the customer identifiers in
+ml_datasets/ltv_prediction_dataset.csv.
+"""
+
+import pytest
+
+from app.core.security import decrypt_pii, encrypt_pii
+from benchmarks.datasets import scale_frame
+
+# Without a cached tenant DEK every call derives its Fernet key with
+# PBKDF2 (100k iterations), so each call costs tens of milliseconds. Keep
+# batches and rounds small so the suite stays usable.
+_BATCH = 20
+_ROUNDS = 3
+
+
+@pytest.fixture
+def plaintexts(ltv_customers, size):
+    customers = scale_frame(ltv_customers.head(_BATCH), size, ("customer_id",))
+    return [f"{cid.lower()}@example.com" for cid in customers["customer_id"]]
+
+
+@pytest.mark.parametrize("tenant_id", [None, 1], ids=["global", "tenant"])
+def test_encrypt_pii(benchmark, plaintexts, tenant_id):
+    ciphertexts = benchmark.pedantic(
+        lambda: [encrypt_pii(p, tenant_id) for p in plaintexts], rounds=_ROUNDS
+    )
+    assert len(ciphertexts) == len(plaintexts)
+
+
+@pytest.mark.parametrize("tenant_id", [None, 1], ids=["global", "tenant"])
+def test_decrypt_pii(benchmark, plaintexts, tenant_id):
+    ciphertexts = [encrypt_pii(p, tenant_id) for p in plaintexts]
+    decrypted = benchmark.pedantic(
+        lambda: [decrypt_pii(c, tenant_id) for c in ciphertexts], rounds=_ROUNDS
+    )
+    assert decrypted == plaintexts
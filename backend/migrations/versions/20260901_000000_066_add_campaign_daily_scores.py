@@ -0,0 +1,45 @@
+"""Add daily score columns to campaigns.
+
+``calculate_daily_scores`` has always assigned scaling/health/signal-health
+scores onto Campaign rows, but the columns never existed, so the nightly job
+could not persist anything. These are the columns it now bulk-updates per
+tenant.
+
+All nullable with no default: a metadata-only change on PostgreSQL, and
+unscored campaigns read as NULL rather than a misleading zero.
+
+Revision ID: 066_add_campaign_daily_scores
+Revises: 065_add_age_knowledge_graph
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "066_add_campaign_daily_scores"
+down_revision = "065_add_age_knowledge_graph"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("campaigns", sa.Column("scaling_score", sa.Float(), nullable=True))
+    op.add_column(
+        "campaigns", sa.Column("scaling_recommendation", sa.String(20), nullable=True)
+    )
+    op.add_column("campaigns", sa.Column("health_score", sa.Float(), nullable=True))
+    op.add_column(
+        "campaigns", sa.Column("signal_health_status", sa.String(20), nullable=True)
+    )
+    op.add_column(
+        "campaigns",
+        sa.Column("scores_calculated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("campaigns", "scores_calculated_at")
+    op.drop_column("campaigns", "signal_health_status")
+    op.drop_column("campaigns", "health_score")
+    op.drop_column("campaigns", "scaling_recommendation")
+    op.drop_column("campaigns", "scaling_score")
@@ -0,0 +1,88 @@
+"""Add tenant_daily_rollups for the dashboard.
+
+One row per tenant, day and platform holding the sums of
+``campaign_metrics``. The sync workers refresh the days they write
+(app.services.dashboard_rollups); the dashboard overview, platform
+breakdown and trends endpoints read it instead of scanning every
+campaign's metric rows per request.
+
+The upgrade backfills the table from existing ``campaign_metrics`` so the
+dashboard shows full history immediately.
+
+Revision ID: 067_add_tenant_daily_rollups
+Revises: 066_add_campaign_daily_scores
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "067_add_tenant_daily_rollups"
+down_revision = "066_add_campaign_daily_scores"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tenant_daily_rollups",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("tenant_id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column(
+            "platform",
+            postgresql.ENUM(name="adplatform", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("spend_cents", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("revenue_cents", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("impressions", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("clicks", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("conversions", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column(
+            "campaigns_with_metrics",
+            sa.Integer(),
+            nullable=False,
+            server_default="0",
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "tenant_id", "date", "platform", name="uq_tenant_daily_rollup"
+        ),
+    )
+    op.create_index(
+        "ix_tenant_daily_rollups_tenant_id", "tenant_daily_rollups", ["tenant_id"]
+    )
+
+    op.execute("""
+        INSERT INTO tenant_daily_rollups (
+            tenant_id, date, platform, spend_cents, revenue_cents,
+            impressions, clicks, conversions, campaigns_with_metrics, updated_at
+        )
+        SELECT cm.tenant_id, cm.date, c.platform,
+               COALESCE(SUM(cm.spend_cents), 0),
+               COALESCE(SUM(cm.revenue_cents), 0),
+               COALESCE(SUM(cm.impressions), 0),
+               COALESCE(SUM(cm.clicks), 0),
+               COALESCE(SUM(cm.conversions), 0),
+               COUNT(cm.id),
+               NOW()
+        FROM campaign_metrics cm
+        JOIN campaigns c ON c.id = cm.campaign_id
+        GROUP BY cm.tenant_id, cm.date, c.platform
+        """)
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_tenant_daily_rollups_tenant_id", table_name="tenant_daily_rollups"
+    )
+    op.drop_table("tenant_daily_rollups")
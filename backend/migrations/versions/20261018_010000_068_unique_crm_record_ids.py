@@ -0,0 +1,70 @@
+"""Make CRM contact and deal ids unique per connection.
+
+The HubSpot and Zoho syncs now write each page of contacts and deals with
+one ``INSERT ... ON CONFLICT (connection_id, crm_*_id) DO UPDATE``, which
+needs a unique index to arbitrate on. The existing lookup indexes on the
+same columns become unique.
+
+The old select-then-insert could race (a webhook and a scheduled sync
+inserting the same record), so duplicates are collapsed first: the most
+recently updated row survives, and deals and touchpoints pointing at a
+dropped contact are moved to the survivor.
+
+Revision ID: 068_unique_crm_record_ids
+Revises: 067_add_tenant_daily_rollups
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "068_unique_crm_record_ids"
+down_revision = "067_add_tenant_daily_rollups"
+branch_labels = None
+depends_on = None
+
+# Each row's id and the id of the row kept for its (connection, CRM id)
+_RANKED = """
+    WITH ranked AS (
+        SELECT id, first_value(id) OVER (
+            PARTITION BY connection_id, {key}
+            ORDER BY updated_at DESC, created_at DESC, id
+        ) AS keep_id
+        FROM {table}
+    )
+"""
+
+
+def upgrade() -> None:
+    contacts = _RANKED.format(key="crm_contact_id", table="crm_contacts")
+    for referencing in ("crm_deals", "touchpoints"):
+        op.execute(contacts + f"""
+            UPDATE {referencing} AS r SET contact_id = ranked.keep_id
+            FROM ranked
+            WHERE r.contact_id = ranked.id AND ranked.id <> ranked.keep_id
+            """)
+    op.execute(contacts + """
+        DELETE FROM crm_contacts AS c USING ranked
+        WHERE c.id = ranked.id AND ranked.id <> ranked.keep_id
+        """)
+    op.execute(_RANKED.format(key="crm_deal_id", table="crm_deals") + """
+        DELETE FROM crm_deals AS d USING ranked
+        WHERE d.id = ranked.id AND ranked.id <> ranked.keep_id
+        """)
+
+    for table, key in (
+        ("crm_contacts", "crm_contact_id"),
+        ("crm_deals", "crm_deal_id"),
+    ):
+        name = f"ix_{table}_crm_id"
+        op.drop_index(name, table_name=table)
+        op.create_index(name, table, ["connection_id", key], unique=True)
+
+
+def downgrade() -> None:
+    for table, key in (
+        ("crm_contacts", "crm_contact_id"),
+        ("crm_deals", "crm_deal_id"),
+    ):
+        name = f"ix_{table}_crm_id"
+        op.drop_index(name, table_name=table)
+        op.create_index(name, table, ["connection_id", key])
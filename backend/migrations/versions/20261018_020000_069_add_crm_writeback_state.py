@@ -0,0 +1,42 @@
+"""Track what was last written back to each CRM contact and deal.
+
+The writeback scheduler (app.services.crm.writeback_scheduler) compares
+each field it is about to push with the value last written to the CRM and
+only sends the ones that changed. ``writeback_values`` holds those values;
+``written_back_at`` records when the object was last written.
+
+Revision ID: 069_add_crm_writeback_state
+Revises: 068_unique_crm_record_ids
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "069_add_crm_writeback_state"
+down_revision = "068_unique_crm_record_ids"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for table in ("crm_contacts", "crm_deals"):
+        op.add_column(
+            table,
+            sa.Column(
+                "writeback_values",
+                postgresql.JSONB(astext_type=sa.Text()),
+                nullable=True,
+            ),
+        )
+        op.add_column(
+            table,
+            sa.Column("written_back_at", sa.DateTime(timezone=True), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    for table in ("crm_contacts", "crm_deals"):
+        op.drop_column(table, "written_back_at")
+        op.drop_column(table, "writeback_values")
@@ -0,0 +1,118 @@
+"""Add per-minute CAPI delivery rollups.
+
+``DeliveryLogger`` now upserts one row per tenant, minute, platform, event
+name, status and latency bucket in the same transaction as each batch of
+delivery logs, and ``get_metrics`` reads those rows instead of scanning
+``capi_delivery_logs``. The upgrade backfills the rollups from existing
+logs so metrics keep their history.
+
+The latency bucket edges must match
+``app.services.capi.delivery_logger.LATENCY_BUCKETS_MS``; ``width_bucket``
+with an edge array assigns the same bucket as ``bisect_right`` there.
+
+Revision ID: 070_add_capi_delivery_minute_rollups
+Revises: 069_add_crm_writeback_state
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "070_add_capi_delivery_minute_rollups"
+down_revision = "069_add_crm_writeback_state"
+branch_labels = None
+depends_on = None
+
+TABLE = "capi_delivery_minute_rollups"
+LATENCY_BUCKETS_MS = (
+    10,
+    25,
+    50,
+    100,
+    150,
+    250,
+    400,
+    600,
+    1000,
+    1500,
+    2500,
+    5000,
+    10000,
+    30000,
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        TABLE,
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("tenant_id", sa.Integer(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("platform", sa.String(50), nullable=False),
+        sa.Column("event_name", sa.String(100), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("latency_bucket", sa.Integer(), nullable=False),
+        sa.Column("event_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latency_sum_ms", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("latency_max_ms", sa.Float(), nullable=False, server_default="0"),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(f"ix_{TABLE}_tenant_id", TABLE, ["tenant_id"])
+    op.create_index(
+        "ix_capi_minute_rollup_unique",
+        TABLE,
+        [
+            "tenant_id",
+            "bucket_start",
+            "platform",
+            "event_name",
+            "status",
+            "latency_bucket",
+        ],
+        unique=True,
+    )
+
+    edges = ", ".join(str(edge) for edge in LATENCY_BUCKETS_MS)
+    op.execute(f"""
+        INSERT INTO {TABLE} (
+            id, tenant_id, bucket_start, platform, event_name, status,
+            latency_bucket, event_count, latency_sum_ms, latency_max_ms,
+            updated_at
+        )
+        SELECT gen_random_uuid(), tenant_id, date_trunc('minute', delivery_time),
+               platform, event_name, status,
+               width_bucket(latency_ms, ARRAY[{edges}]::float8[]),
+               COUNT(*), SUM(latency_ms), MAX(latency_ms), NOW()
+        FROM capi_delivery_logs
+        GROUP BY 2, 3, 4, 5, 6, 7
+        """)
+
+    # Same tenant isolation as capi_delivery_logs (migration 034)
+    op.execute(f"ALTER TABLE {TABLE} ENABLE ROW LEVEL SECURITY")
+    op.execute(f"ALTER TABLE {TABLE} FORCE ROW LEVEL SECURITY")
+    op.execute(f"""
+        CREATE POLICY tenant_isolation_policy ON {TABLE}
+            FOR ALL
+            USING (tenant_id = current_tenant_id() OR is_superadmin())
+        """)
+    op.execute(f"""
+        CREATE POLICY tenant_insert_policy ON {TABLE}
+            FOR INSERT
+            WITH CHECK (tenant_id = current_tenant_id() OR is_superadmin())
+        """)
+
+
+def downgrade() -> None:
+    op.execute(f"DROP POLICY IF EXISTS tenant_insert_policy ON {TABLE}")
+    op.execute(f"DROP POLICY IF EXISTS tenant_isolation_policy ON {TABLE}")
+    op.drop_index("ix_capi_minute_rollup_unique", table_name=TABLE)
+    op.drop_index(f"ix_{TABLE}_tenant_id", table_name=TABLE)
+    op.drop_table(TABLE)
@@ -113,8 +113,9 @@ def broken_dlq() -> DeadLetterQueue:
     dlq = DeadLetterQueue()
     dlq._connected = True
     dlq._redis = mock.AsyncMock()
-    for method in ("set", "get", "zadd", "zrange", "zrangebyscore", "zrem"):
+    for method in ("set", "get", "mget", "zadd", "zrange", "zrangebyscore", "zrem"):
         getattr(dlq._redis, method).side_effect = ConnectionError("redis down")
+    dlq._redis.pipeline = mock.Mock(side_effect=ConnectionError("redis down"))
     return dlq
 
 
@@ -0,0 +1,250 @@
+# =============================================================================
+# Stratum AI - CAPI Delivery Minute Rollups unit tests
+# =============================================================================
+"""Unit tests for the bulk flush and minute rollups in
+``app.services.capi.delivery_logger``.
+
+The flush runs its real statements against in-memory SQLite, which shares
+Postgres' ``INSERT ... ON CONFLICT`` syntax, through a thin async adapter
+over a sync session. JSONB columns are compiled as plain JSON.
+"""
+
+import asyncio
+import gc
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from app.models.capi_delivery import CAPIDeliveryLog, CAPIDeliveryMinuteRollup
+from app.services.capi.delivery_logger import (
+    LATENCY_BUCKETS_MS,
+    DeliveryLogger,
+    DeliveryStatus,
+)
+
+pytestmark = pytest.mark.unit
+
+_MODULE = "app.services.capi.delivery_logger.async_session_factory"
+_MINUTE = datetime(2026, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_as_json(type_, compiler, **kw):
+    return "JSON"
+
+
+class _AsyncSession:
+    """Just enough of AsyncSession for the logger, counting statements."""
+
+    def __init__(self, session):
+        self._session = session
+        self.statements = 0
+
+    async def execute(self, statement, params=None):
+        self.statements += 1
+        return self._session.execute(statement, params)
+
+    async def commit(self):
+        self._session.commit()
+
+    def get_bind(self):
+        return self._session.get_bind()
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    CAPIDeliveryLog.metadata.create_all(
+        engine,
+        tables=[CAPIDeliveryLog.__table__, CAPIDeliveryMinuteRollup.__table__],
+    )
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def db(session):
+    adapter = _AsyncSession(session)
+
+    @asynccontextmanager
+    async def factory():
+        yield adapter
+
+    with patch(_MODULE, new=factory):
+        yield adapter
+
+
+@pytest.fixture(autouse=True)
+def _clear_shared_buffer():
+    DeliveryLogger._buffer.clear()
+    yield
+    DeliveryLogger._buffer.clear()
+
+
+async def _log(logger, at, latency_ms, status=DeliveryStatus.SUCCESS, **kw):
+    with patch("app.services.capi.delivery_logger.datetime") as clock:
+        clock.now.return_value = at
+        return await logger.log_delivery(
+            tenant_id=kw.pop("tenant_id", 7),
+            platform=kw.pop("platform", "meta"),
+            event_name=kw.pop("event_name", "Purchase"),
+            status=status,
+            latency_ms=latency_ms,
+            **kw,
+        )
+
+
+def _rollups(session):
+    return session.execute(
+        select(CAPIDeliveryMinuteRollup).order_by(
+            CAPIDeliveryMinuteRollup.bucket_start,
+            CAPIDeliveryMinuteRollup.latency_bucket,
+        )
+    ).scalars()
+
+
+async def test_flush_writes_logs_and_rollups_in_two_statements(db, session):
+    logger = DeliveryLogger(buffer_size=1000)
+    for i in range(300):
+        await _log(logger, _MINUTE + timedelta(seconds=i % 60), 40.0 + i % 3)
+    await _log(logger, _MINUTE, 900.0, DeliveryStatus.FAILED, event_value=12.5)
+    await _log(logger, _MINUTE + timedelta(minutes=1), 20.0, platform="google")
+
+    await logger.flush()
+
+    assert db.statements == 2
+    assert session.execute(select(func.count(CAPIDeliveryLog.id))).scalar() == 302
+    rows = [
+        (r.bucket_start.minute, r.platform, r.status, r.latency_bucket, r.event_count)
+        for r in _rollups(session)
+    ]
+    assert rows == [
+        (0, "meta", "success", 2, 300),
+        (0, "meta", "failed", 8, 1),
+        (1, "google", "success", 1, 1),
+    ]
+
+
+async def test_later_flushes_add_to_existing_rollups(db, session):
+    logger = DeliveryLogger(buffer_size=1000)
+    await _log(logger, _MINUTE, 30.0)
+    await logger.flush()
+    await _log(logger, _MINUTE + timedelta(seconds=30), 45.0)
+    await _log(logger, _MINUTE + timedelta(seconds=31), 35.0)
+    await logger.flush()
+
+    (row,) = _rollups(session)
+    assert row.event_count == 3
+    assert row.latency_sum_ms == 110.0
+    assert row.latency_max_ms == 45.0
+
+
+async def test_size_trigger_flushes_a_full_buffer(db, session):
+    logger = DeliveryLogger(buffer_size=5)
+    for _ in range(12):
+        await _log(logger, _MINUTE, 10.0)
+
+    assert session.execute(select(func.count(CAPIDeliveryLog.id))).scalar() == 10
+    assert len(logger._buffer) == 2
+    assert db.statements == 4
+
+
+async def test_time_trigger_flushes_a_quiet_buffer(db, session):
+    logger = DeliveryLogger(buffer_size=100, flush_interval=0.01)
+    await logger.log_delivery(
+        tenant_id=7,
+        platform="meta",
+        event_name="Lead",
+        status=DeliveryStatus.SUCCESS,
+        latency_ms=12.0,
+    )
+    assert session.execute(select(func.count(CAPIDeliveryLog.id))).scalar() == 0
+
+    await asyncio.sleep(0.05)
+
+    assert session.execute(select(func.count(CAPIDeliveryLog.id))).scalar() == 1
+    assert logger._buffer == []
+
+
+async def test_close_waits_for_a_timed_flush_then_writes_the_rest(db, session):
+    logger = DeliveryLogger(buffer_size=100, flush_interval=0.01)
+    gate = asyncio.Event()
+    execute = db.execute
+
+    async def slow_execute(statement, params=None):
+        await gate.wait()
+        return await execute(statement, params)
+
+    db.execute = slow_execute
+    await _log(logger, _MINUTE, 10.0)
+    await asyncio.sleep(0.05)
+
+    # The timed flush is in flight and referenced until it finishes
+    (task,) = logger._flush_tasks
+    gc.collect()
+    assert not task.done()
+
+    await _log(logger, _MINUTE, 11.0)
+    closing = asyncio.create_task(logger.close())
+    await asyncio.sleep(0)
+    gate.set()
+    await closing
+
+    assert session.execute(select(func.count(CAPIDeliveryLog.id))).scalar() == 2
+    assert logger._flush_tasks == set()
+    assert logger._flush_timer is None
+
+
+async def test_get_metrics_reads_the_rollups(db, session):
+    logger = DeliveryLogger(buffer_size=10000)
+    latencies = [5.0 + i for i in range(200)]
+    for i, latency in enumerate(latencies):
+        await _log(logger, _MINUTE + timedelta(seconds=i % 50), latency)
+    for _ in range(50):
+        await _log(logger, _MINUTE, 3000.0, DeliveryStatus.FAILED, event_name="Lead")
+    await _log(logger, _MINUTE, 8.0, tenant_id=8)
+    await _log(logger, _MINUTE - timedelta(hours=2), 8.0)
+    await logger.flush()
+    db.statements = 0
+
+    metrics = await logger.get_metrics(
+        tenant_id=7,
+        start_time=_MINUTE - timedelta(minutes=30),
+        end_time=_MINUTE + timedelta(minutes=5),
+    )
+
+    assert db.statements == 1
+    assert (metrics.total_events, metrics.successful, metrics.failed) == (250, 200, 50)
+    assert metrics.success_rate_pct == 80.0
+    assert metrics.avg_latency_ms == pytest.approx((sum(latencies) + 150000) / 250)
+    assert metrics.by_platform == {"meta": {"success": 200, "failed": 50}}
+    assert metrics.by_event_type["Lead"] == {"success": 0, "failed": 50}
+
+    # Percentiles are bounded by the exact value and its bucket's upper edge
+    ordered = sorted(latencies)
+    for estimate, q in (
+        (metrics.p50_latency_ms, 0.50),
+        (metrics.p95_latency_ms, 0.95),
+        (metrics.p99_latency_ms, 0.99),
+    ):
+        exact = ordered[int(len(ordered) * q)]
+        edges = [e for e in LATENCY_BUCKETS_MS if e > exact]
+        assert exact <= estimate <= edges[0]
+
+
+async def test_cleanup_prunes_rollups_with_logs(db, session):
+    logger = DeliveryLogger(buffer_size=100)
+    now = datetime.now(timezone.utc)
+    await _log(logger, now - timedelta(days=120), 10.0)
+    await _log(logger, now, 10.0)
+    await logger.flush()
+
+    assert await logger.cleanup_old_logs(retention_days=90) == 1
+
+    assert [r.event_count for r in _rollups(session)] == [1]
@@ -0,0 +1,437 @@
+# =============================================================================
+# Stratum AI - DLQ Indexed Stats and Batch Replay unit tests
+# =============================================================================
+"""Unit tests for the Redis indexes behind ``DeadLetterQueue.get_stats`` and
+for ``DLQReplayEngine``.
+
+``FakeRedis`` models the handful of string, hash and sorted-set commands the
+queue uses, plus pipelines, and counts round trips so the tests can pin that
+stats and replays no longer fetch entries one by one. Postgres persistence is
+replaced by a session double that records statements.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.services.capi.capi_service import CAPIService
+from app.services.capi.dead_letter_queue import (
+    DeadLetterQueue,
+    DLQEntry,
+    DLQReplayEngine,
+    DLQStatus,
+    FailureReason,
+)
+from app.services.capi.platform_connectors import CAPIResponse
+
+pytestmark = pytest.mark.unit
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        self._redis.round_trips += 1
+        return [getattr(self._redis, f"_{n}")(*a, **kw) for n, a, kw in self._calls]
+
+
+class FakeRedis:
+    """Strings, hashes and sorted sets; no TTLs."""
+
+    def __init__(self):
+        self.data = {}
+        self.round_trips = 0
+        self.commands = []
+
+    def __getattr__(self, name):
+        command = getattr(self, f"_{name}")
+
+        async def call(*args, **kwargs):
+            self.round_trips += 1
+            self.commands.append(name)
+            return command(*args, **kwargs)
+
+        return call
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def scan_iter(self, match):
+        for key in list(self.data):
+            if key.startswith(match.rstrip("*")):
+                yield key
+
+    # -- strings --------------------------------------------------------- #
+    def _set(self, key, value, ex=None):
+        self.data[key] = value
+        return True
+
+    def _get(self, key):
+        return self.data.get(key)
+
+    def _mget(self, keys):
+        return [self.data.get(k) for k in keys]
+
+    def _delete(self, *keys):
+        return sum(self.data.pop(k, None) is not None for k in keys)
+
+    # -- hashes ---------------------------------------------------------- #
+    def _hsetnx(self, key, field, value):
+        h = self.data.setdefault(key, {})
+        if field in h:
+            return 0
+        h[field] = value
+        return 1
+
+    def _hincrby(self, key, field, amount):
+        h = self.data.setdefault(key, {})
+        h[field] = str(int(h.get(field, 0)) + amount)
+        return int(h[field])
+
+    def _hdel(self, key, field):
+        return int(self.data.get(key, {}).pop(field, None) is not None)
+
+    def _hmget(self, key, fields):
+        return [self.data.get(key, {}).get(f) for f in fields]
+
+    def _hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    # -- sorted sets ----------------------------------------------------- #
+    def _sorted(self, key):
+        return sorted(self.data.get(key, {}).items(), key=lambda kv: (kv[1], kv[0]))
+
+    def _zadd(self, key, mapping):
+        z = self.data.setdefault(key, {})
+        added = sum(member not in z for member in mapping)
+        z.update(mapping)
+        return added
+
+    def _zrem(self, key, member):
+        return int(self.data.get(key, {}).pop(member, None) is not None)
+
+    def _zcard(self, key):
+        return len(self.data.get(key, {}))
+
+    def _zrange(self, key, start, end, withscores=False):
+        rows = self._sorted(key)
+        rows = rows[start:] if end == -1 else rows[start : end + 1]
+        return rows if withscores else [member for member, _ in rows]
+
+    def _zrangebyscore(self, key, low, high):
+        return [m for m, score in self._sorted(key) if score <= high]
+
+
+@pytest.fixture
+def db():
+    session = MagicMock()
+    session.merge = AsyncMock()
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+
+    @asynccontextmanager
+    async def factory():
+        yield session
+
+    with patch("app.services.capi.dead_letter_queue.async_session_factory", factory):
+        yield session
+
+
+@pytest.fixture
+def redis():
+    return FakeRedis()
+
+
+@pytest.fixture
+def dlq(redis, db):
+    queue = DeadLetterQueue()
+    queue._redis = redis
+    queue._connected = True
+    return queue
+
+
+def _entry(platform="meta", tenant_id=1, age=timedelta(0), pixel_id=None, **kw):
+    ts = datetime.now(timezone.utc) - age
+    return DLQEntry(
+        id=str(uuid4()),
+        tenant_id=tenant_id,
+        platform=platform,
+        event_name="Purchase",
+        event_id=None,
+        event_data={"event_name": "Purchase", "n": kw.pop("n", 0)},
+        failure_reason="timed out",
+        failure_category=kw.pop("category", FailureReason.TIMEOUT),
+        error_message="timed out",
+        retry_count=0,
+        max_retries=3,
+        first_failure_at=ts,
+        last_failure_at=ts,
+        context={"pixel_id": pixel_id} if pixel_id else None,
+        **kw,
+    )
+
+
+async def _add(dlq, platform, error="timed out", tenant_id=1):
+    return await dlq.add_failed_event(
+        tenant_id=tenant_id,
+        platform=platform,
+        event_name="Purchase",
+        event_data={},
+        error_message=error,
+    )
+
+
+# =============================================================================
+# Indexed statistics
+# =============================================================================
+
+
+async def test_stats_follow_every_transition_in_one_round_trip(dlq, redis):
+    pending = await _add(dlq, "meta")
+    recovered = await _add(dlq, "google", "rate limit")
+    discarded = await _add(dlq, "meta", "invalid payload")
+    retrying = await _add(dlq, "snapchat", "connection reset")
+    await dlq.mark_recovered(recovered.id)
+    await dlq.mark_discarded(discarded.id)
+    await dlq.replay_event(retrying.id)
+    await dlq.update_retry(pending.id, "timed out again")
+    await dlq._store_entry(_entry(age=timedelta(hours=5)))
+
+    redis.round_trips = 0
+    stats = await dlq.get_stats()
+
+    assert redis.round_trips == 1
+    assert (stats.total_entries, stats.pending, stats.retrying) == (5, 2, 1)
+    assert (stats.recovered, stats.discarded, stats.expired) == (1, 1, 0)
+    assert stats.by_platform == {"meta": 3, "google": 1, "snapchat": 1}
+    assert stats.by_failure_category == {
+        "timeout": 2,
+        "rate_limited": 1,
+        "validation_error": 1,
+        "network_error": 1,
+    }
+    assert stats.oldest_entry_age_hours == pytest.approx(5, abs=0.01)
+    assert stats.recovery_rate_pct == pytest.approx(50.0)
+
+
+async def test_stats_match_a_full_scan(dlq):
+    entries = [
+        _entry(platform=p, category=c, status=s)
+        for p, c, s in [
+            ("meta", FailureReason.TIMEOUT, DLQStatus.PENDING),
+            ("meta", FailureReason.AUTH_ERROR, DLQStatus.RECOVERED),
+            ("tiktok", FailureReason.TIMEOUT, DLQStatus.EXPIRED),
+            ("google", FailureReason.UNKNOWN, DLQStatus.RETRYING),
+        ]
+    ]
+    await dlq._store_entries(entries)
+
+    indexed = await dlq.get_stats()
+    scanned = dlq._scan_stats(entries)
+
+    for name in ("total_entries", "pending", "retrying", "recovered", "expired"):
+        assert getattr(indexed, name) == getattr(scanned, name)
+    assert indexed.by_platform == scanned.by_platform
+    assert indexed.by_failure_category == scanned.by_failure_category
+
+
+async def test_cleanup_takes_entries_out_of_the_indexes(dlq, redis, db):
+    old_pending = _entry(age=timedelta(days=10))
+    old_recovered = _entry(age=timedelta(days=10), status=DLQStatus.RECOVERED)
+    orphan = _entry(platform="google", age=timedelta(days=10))
+    fresh = _entry(platform="tiktok")
+    await dlq._store_entries([old_pending, old_recovered, orphan, fresh])
+    # The orphan's JSON has already hit its TTL
+    del redis.data[f"{dlq.ENTRY_PREFIX}{orphan.id}"]
+    db.execute.reset_mock()
+
+    assert await dlq.cleanup_expired() == 3
+
+    assert (await dlq.get_entry(old_pending.id)).status == DLQStatus.EXPIRED
+    assert (await dlq.get_entry(old_recovered.id)).status == DLQStatus.RECOVERED
+    stats = await dlq.get_stats()
+    assert (stats.total_entries, stats.pending) == (1, 1)
+    assert stats.by_platform == {"tiktok": 1}
+    assert stats.by_failure_category == {"timeout": 1}
+    assert redis.data[dlq.LABELS_KEY] == {fresh.id: "tiktok|timeout"}
+    # The expired entry is persisted in one statement
+    db.execute.assert_awaited_once()
+
+
+async def test_rebuild_index_recovers_entries_written_before_it(dlq, redis):
+    entries = [_entry(), _entry(platform="google", status=DLQStatus.DISCARDED)]
+    await dlq._store_entries(entries)
+    expected = await dlq.get_stats()
+    for key in list(redis.data):
+        if not key.startswith((dlq.ENTRY_PREFIX, dlq.QUEUE_KEY)):
+            del redis.data[key]
+    assert (await dlq.get_stats()).total_entries == 0
+
+    assert await dlq.rebuild_index() == 2
+    assert await dlq.rebuild_index() == 2
+
+    rebuilt = await dlq.get_stats()
+    assert rebuilt.total_entries == expected.total_entries
+    assert rebuilt.by_platform == expected.by_platform
+    assert rebuilt.discarded == 1
+
+
+async def test_pending_entries_are_fetched_with_mget(dlq, redis):
+    entries = [_entry(n=i) for i in range(30)]
+    entries.append(_entry(platform="google"))
+    await dlq._store_entries(entries)
+    await dlq.mark_recovered(entries[0].id)
+    redis.commands.clear()
+
+    meta = await dlq.get_pending_entries(platform="meta", limit=100)
+
+    assert len(meta) == 29
+    assert redis.commands == ["zrange", "mget"]
+
+
+# =============================================================================
+# Batch replay
+# =============================================================================
+
+
+class RecordingSender:
+    """Answers per (platform, pixel) and tracks how many sends overlap."""
+
+    def __init__(self, outcomes):
+        self.outcomes = outcomes
+        self.batches = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, tenant_id, platform, pixel_id, events):
+        self.batches.append((tenant_id, platform, pixel_id, len(events)))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0)
+        self.active -= 1
+        outcome = self.outcomes.get((platform, pixel_id), "success")
+        if outcome is None:
+            return None
+        if isinstance(outcome, Exception):
+            raise outcome
+        if outcome == "success":
+            return CAPIResponse(True, len(events), len(events), [], platform)
+        return CAPIResponse(False, len(events), 0, [{"message": outcome}], platform)
+
+
+async def test_replay_groups_batches_and_settles_each_outcome(dlq, redis, db):
+    dlq.FETCH_CHUNK = 100
+    entries = (
+        [_entry(pixel_id="px-a", n=i) for i in range(250)]
+        + [_entry(pixel_id="px-b") for _ in range(30)]
+        + [_entry(platform="google") for _ in range(5)]
+        + [_entry(platform="tiktok") for _ in range(4)]
+    )
+    await dlq._store_entries(entries)
+    sender = RecordingSender(
+        {
+            ("meta", "px-b"): "rate limit exceeded",
+            ("google", None): None,
+            ("tiktok", None): TimeoutError("read timed out"),
+        }
+    )
+    engine = DLQReplayEngine(
+        dlq, sender, concurrency=2, batch_sizes={"meta": 100, "google": 50}
+    )
+    redis.commands.clear()
+    db.execute.reset_mock()
+
+    result = await engine.replay()
+
+    assert (result.claimed, result.recovered) == (289, 250)
+    assert (result.failed, result.skipped, result.batches) == (34, 5, 6)
+    assert sorted(b for b in sender.batches if b[2] == "px-a") == [
+        (1, "meta", "px-a", 50),
+        (1, "meta", "px-a", 100),
+        (1, "meta", "px-a", 100),
+    ]
+    assert sender.peak <= 2
+    # Entries are read one chunk at a time, never with a GET each
+    assert "get" not in redis.commands
+    assert redis.commands.count("mget") == 3
+
+    stats = await dlq.get_stats()
+    assert (stats.recovered, stats.pending, stats.retrying) == (250, 39, 0)
+    failed = await dlq.get_entry(entries[250].id)
+    assert (failed.retry_count, failed.error_message) == (1, "rate limit exceeded")
+    timed_out = await dlq.get_entry(entries[-1].id)
+    assert timed_out.error_message == "read timed out"
+    skipped = await dlq.get_entry(entries[280].id)
+    assert (skipped.status, skipped.retry_count) == (DLQStatus.PENDING, 0)
+    # One claim write per chunk and one settle write per batch
+    assert db.execute.await_count == 3 + 6
+
+
+async def test_replay_respects_filters_and_limit(dlq):
+    entries = (
+        [_entry(n=i) for i in range(10)]
+        + [_entry(tenant_id=2) for _ in range(3)]
+        + [_entry(platform="google")]
+    )
+    await dlq._store_entries(entries)
+    await dlq.mark_discarded(entries[0].id)
+    sender = RecordingSender({})
+
+    result = await DLQReplayEngine(dlq, sender).replay(
+        platform="meta", tenant_id=1, limit=6
+    )
+
+    assert result.claimed == result.recovered == 6
+    assert {(t, p) for t, p, _, _ in sender.batches} == {(1, "meta")}
+    assert (await dlq.get_stats()).pending == 7
+
+
+async def test_replay_without_redis_uses_the_memory_queue():
+    queue = DeadLetterQueue()
+    queue._persist_to_db = AsyncMock()
+    queue._persist_batch_to_db = AsyncMock()
+    queue._memory_queue.extend(_entry(n=i) for i in range(3))
+
+    result = await DLQReplayEngine(queue, RecordingSender({})).replay()
+
+    assert result.recovered == 3
+    assert len(queue._memory_queue) == 3
+    assert {e.status for e in queue._memory_queue} == {DLQStatus.RECOVERED}
+
+
+async def test_capi_service_replays_through_matching_connectors(dlq):
+    await dlq._store_entries(
+        [
+            _entry(pixel_id="px-1"),
+            _entry(pixel_id="px-old"),
+            _entry(platform="google"),
+            _entry(tenant_id=9),
+        ]
+    )
+    meta = MagicMock(pixel_id="px-1")
+    meta.send_events = AsyncMock(return_value=CAPIResponse(True, 1, 1, [], "meta"))
+    svc = CAPIService(tenant_id=1)
+    svc.connectors = {"meta": meta}
+
+    with patch(
+        "app.services.capi.dead_letter_queue.get_dlq",
+        new=AsyncMock(return_value=dlq),
+    ):
+        result = await svc.replay_dead_letters()
+
+    assert (result["claimed"], result["recovered"], result["skipped"]) == (3, 1, 2)
+    meta.send_events.assert_awaited_once()
+    assert (await dlq.get_stats()).pending == 3
@@ -0,0 +1,243 @@
+# =============================================================================
+# Stratum AI - Celery Task Telemetry unit tests
+# =============================================================================
+"""Unit tests for app.monitoring.task_telemetry and the telemetry side of
+CeleryMemoryHooks.
+
+Redis is replaced by a small in-memory client implementing only the
+commands the store uses, so the tests cover the real key layout and merge
+logic without a server.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.monitoring.celery_hooks import ENQUEUED_AT_HEADER, CeleryMemoryHooks
+from app.monitoring.task_telemetry import TaskTelemetryStore
+
+pytestmark = pytest.mark.unit
+
+NOW = 1_767_225_600.0  # 2026-01-01T00:00:00Z, on an hour boundary
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self._client = client
+        self._calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self):
+        results = [getattr(self._client, n)(*a, **kw) for n, a, kw in self._calls]
+        self._calls = []
+        return results
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.hashes = defaultdict(dict)
+        self.sets = defaultdict(set)
+        self.zsets = defaultdict(dict)
+        self.expiry = {}
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def sadd(self, key, member):
+        self.sets[key].add(member)
+
+    def smembers(self, key):
+        return set(self.sets.get(key, ()))
+
+    def hincrby(self, key, field, amount):
+        self.hashes[key][field] = str(int(self.hashes[key].get(field, 0)) + amount)
+
+    def hincrbyfloat(self, key, field, amount):
+        value = float(self.hashes[key].get(field, 0)) + amount
+        self.hashes[key][field] = str(value)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def zadd(self, key, mapping, gt=False):
+        for member, score in mapping.items():
+            current = self.zsets[key].get(member)
+            if current is None or not gt or score > current:
+                self.zsets[key][member] = score
+
+    def zrange(self, key, start, end, withscores=False):
+        return sorted(self.zsets.get(key, {}).items(), key=lambda kv: kv[1])
+
+    def expireat(self, key, when):
+        self.expiry[key] = when
+
+
+@pytest.fixture
+def store():
+    return TaskTelemetryStore(client=_FakeRedis())
+
+
+class TestTaskTelemetryStore:
+    def test_summary_merges_hours_and_ranks_by_total_time(self, store):
+        for i in range(10):
+            store.record("app.tasks.sync", "sync", 2_000.0, 40.0, 100.0, now=NOW + i)
+        # Same task an hour earlier lands in a different bucket
+        store.record("app.tasks.sync", "sync", 4_000.0, 90.0, 300.0, now=NOW - 3600)
+        for i in range(50):
+            store.record("app.tasks.ping", "default", 5.0, 1.0, 0.0, now=NOW + i)
+
+        summary = store.summary(hours=24, now=NOW + 60)
+
+        assert summary["total_executions"] == 61
+        assert summary["task_types"] == 2
+        top = summary["tasks"][0]
+        assert top["task_name"] == "app.tasks.sync"
+        assert top["short_name"] == "sync"
+        assert top["queue"] == "sync"
+        assert top["executions"] == 11
+        assert top["total_duration_ms"] == pytest.approx(24_000.0)
+        assert top["avg_duration_ms"] == pytest.approx(24_000.0 / 11, abs=0.01)
+        assert top["max_duration_ms"] == pytest.approx(4_000.0)
+        assert top["max_wait_ms"] == pytest.approx(90.0)
+        assert top["share_pct"] == pytest.approx(100 * 24_000 / 24_250, abs=0.01)
+
+    def test_window_excludes_older_buckets(self, store):
+        store.record("app.tasks.old", "default", 100.0, None, 0.0, now=NOW - 5 * 3600)
+        store.record("app.tasks.new", "default", 100.0, None, 0.0, now=NOW)
+
+        summary = store.summary(hours=2, now=NOW)
+
+        assert [t["task_name"] for t in summary["tasks"]] == ["app.tasks.new"]
+
+    def test_percentiles_come_from_histogram_buckets(self, store):
+        for _ in range(90):
+            store.record("t", "q", 80.0, 5.0, 0.0, now=NOW)
+        for _ in range(10):
+            store.record("t", "q", 4_000.0, 20_000.0, 0.0, now=NOW)
+
+        row = store.summary(now=NOW)["tasks"][0]
+
+        assert row["p50_duration_ms"] == 100.0
+        assert row["p95_duration_ms"] == 5_000.0
+        assert row["p95_wait_ms"] == 30_000.0
+
+    def test_failures_retries_and_missing_wait(self, store):
+        store.record("t", "q", 10.0, None, 0.0, failed=True, now=NOW)
+        store.record("t", "q", 10.0, None, 0.0, now=NOW)
+        store.record_retry("t", "q", now=NOW)
+
+        row = store.summary(now=NOW)["tasks"][0]
+
+        assert row["failures"] == 1
+        assert row["retries"] == 1
+        assert row["failure_rate"] == 0.5
+        assert row["avg_wait_ms"] is None
+        assert row["max_wait_ms"] is None
+
+    def test_keys_expire_after_retention(self, store):
+        store.record("t", "q", 10.0, 1.0, 0.0, now=NOW)
+        assert store.client.expiry
+        assert all(ts > NOW + 7 * 24 * 3600 for ts in store.client.expiry.values())
+
+    def test_unknown_sort_field_rejected(self, store):
+        with pytest.raises(ValueError):
+            store.summary(sort_by="nope")
+
+    def test_write_errors_are_swallowed(self):
+        class _Broken:
+            def pipeline(self, transaction=True):
+                raise ConnectionError("redis down")
+
+        broken = TaskTelemetryStore(client=_Broken())
+        broken.record("t", "q", 1.0, 1.0, 0.0)
+        broken.record_retry("t", "q")
+
+
+class TestHookTelemetry:
+    def _task(self, name="app.tasks.sync", queue="sync", **request):
+        request.setdefault("delivery_info", {"routing_key": queue})
+        return SimpleNamespace(name=name, request=SimpleNamespace(**request))
+
+    def test_publish_stamps_enqueue_header_once(self):
+        headers = {}
+        CeleryMemoryHooks._on_before_publish(headers=headers)
+        stamped = headers[ENQUEUED_AT_HEADER]
+        CeleryMemoryHooks._on_before_publish(headers=headers)
+        assert headers[ENQUEUED_AT_HEADER] == stamped
+
+    def test_execution_is_published_with_queue_and_wait(self, store):
+        hooks = CeleryMemoryHooks(telemetry=store)
+        task = self._task(headers={ENQUEUED_AT_HEADER: 0.0})
+
+        hooks._on_task_prerun(sender=task, task_id="1", task=task)
+        hooks._on_task_postrun(sender=task, task_id="1", task=task, state="FAILURE")
+
+        row = store.summary()["tasks"][0]
+        assert row["task_name"] == "app.tasks.sync"
+        assert row["queue"] == "sync"
+        assert row["failures"] == 1
+        assert row["avg_wait_ms"] > 0
+
+    def test_wait_measured_from_eta_when_later(self):
+        started = NOW + 100
+        eta = datetime.fromtimestamp(NOW + 90, tz=timezone.utc)
+        request = SimpleNamespace(
+            headers={ENQUEUED_AT_HEADER: NOW}, eta=eta.isoformat()
+        )
+
+        assert CeleryMemoryHooks._queue_wait_ms(request, started) == 10_000.0
+
+    def test_wait_never_negative_under_clock_skew(self):
+        request = SimpleNamespace(**{ENQUEUED_AT_HEADER: NOW + 5})
+        assert CeleryMemoryHooks._queue_wait_ms(request, NOW) == 0.0
+
+    def test_wait_unknown_without_header(self):
+        request = SimpleNamespace(headers=None, eta=None)
+        assert CeleryMemoryHooks._queue_wait_ms(request, NOW) is None
+
+    def test_retry_is_counted(self, store):
+        hooks = CeleryMemoryHooks(telemetry=store)
+        task = self._task()
+
+        hooks._on_task_retry(sender=task, request=task.request)
+
+        row = store.summary()["tasks"][0]
+        assert row["retries"] == 1
+        assert row["executions"] == 0
+
+    def test_hooks_without_store_keep_local_stats_only(self):
+        hooks = CeleryMemoryHooks()
+        task = self._task()
+
+        hooks._on_task_prerun(sender=task, task_id="1", task=task)
+        hooks._on_task_postrun(sender=task, task_id="1", task=task, state="SUCCESS")
+        hooks._on_task_retry(sender=task, request=task.request)
+
+        assert hooks.get_summary()["total_executions_profiled"] == 1
+
+
+def test_eta_datetime_accepted():
+    eta = datetime.fromtimestamp(NOW, tz=timezone.utc) + timedelta(seconds=30)
+    request = SimpleNamespace(headers={ENQUEUED_AT_HEADER: NOW}, eta=eta)
+    assert CeleryMemoryHooks._queue_wait_ms(request, NOW + 31) == 1_000.0
+
+
+def test_worker_init_rebinds_to_child_process(monkeypatch):
+    hooks = CeleryMemoryHooks()
+    parent = hooks._process
+    child = SimpleNamespace(memory_info=lambda: SimpleNamespace(rss=64 * 1024 * 1024))
+    monkeypatch.setattr("app.monitoring.celery_hooks.psutil.Process", lambda: child)
+
+    hooks._on_worker_init()
+
+    assert hooks._process is child
+    assert hooks._process is not parent
+    assert hooks._worker_start_rss == 64 * 1024 * 1024
@@ -5,15 +5,18 @@
 
 Pure numpy/scipy/sklearn logic, no I/O. Covers the fatigue predictor
 (phase detection, fatigue scoring, heuristic + ML decay fitting,
-projections, urgency, recommendations, confidence), rotation planning,
+projections, urgency, recommendations, confidence), batched decay fitting,
+rotation planning,
 the convenience entrypoint, decay-pattern extraction + clustering, the
 cross-creative transfer learner, and the A/B test suggester.
 """
 
 from datetime import datetime, timezone
 
+import numpy as np
 import pytest
 
+from app.ml import creative_lifecycle
 from app.ml.creative_lifecycle import (
     CreativeClusterAnalyzer,
     CreativeLifecyclePredictor,
@@ -136,6 +139,94 @@ class TestPredictFatigue:
         assert prediction.estimated_performance_loss_if_not_refreshed >= 0
 
 
+# =============================================================================
+# Batched fatigue prediction
+# =============================================================================
+def _noisy_decays(count, seed=0):
+    rng = np.random.default_rng(seed)
+    histories = []
+    for i in range(count):
+        days = int(rng.integers(10, 40))
+        a, b, c = rng.uniform(1, 4), rng.uniform(0.03, 0.4), rng.uniform(0.2, 1)
+        ctr = a * np.exp(-b * np.arange(days)) + c
+        ctr = np.concatenate(
+            [[0.5 * ctr[0]], ctr * (1 + 0.05 * rng.standard_normal(days))]
+        )
+        histories.append(_history(np.maximum(ctr, 0.05).round(4), creative_id=f"c{i}"))
+    return histories
+
+
+class TestBatchFatigue:
+    def test_batch_fit_matches_curve_fit(self):
+        predictor = CreativeLifecyclePredictor()
+        histories = _noisy_decays(40)
+        batch = predictor._fit_decay_models(histories)
+        for history, params in zip(histories, batch):
+            single = predictor._fit_decay_model(history)
+            assert params["method"] == "ml_fit"
+            assert params["peak_day"] == single["peak_day"]
+            assert params["decay_rate"] == pytest.approx(
+                single["decay_rate"], rel=0.02, abs=1e-3
+            )
+            assert params["floor_ctr"] == pytest.approx(
+                single["floor_ctr"], rel=0.02, abs=1e-3
+            )
+
+    def test_short_tail_uses_platform_rate(self):
+        predictor = CreativeLifecyclePredictor()
+        history = _history([1.0, 1.2, 1.4, 1.6, 1.8, 2.0, 2.2, 2.1], platform="tiktok")
+        (params,) = predictor._fit_decay_models([history])
+        assert params["peak_day"] == 7
+        assert params["decay_rate"] == pytest.approx(
+            predictor._get_platform_decay_rate("tiktok", "image")
+        )
+        assert params["floor_ctr"] == pytest.approx(2.2 * 0.3)
+
+    def test_zero_ctr_tail_falls_back_to_single_fit(self, monkeypatch):
+        predictor = CreativeLifecyclePredictor()
+        refitted = []
+        single_fit = predictor._fit_decay_model
+        monkeypatch.setattr(
+            predictor,
+            "_fit_decay_model",
+            lambda h: refitted.append(h.creative_id) or single_fit(h),
+        )
+        clean = _history(_rise_then_decay(days=20), creative_id="clean")
+        zeros = _history(
+            [1.0, 3.0, 2.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0], creative_id="zeros"
+        )
+        params = predictor._fit_decay_models([clean, zeros])
+        assert refitted == ["zeros"]
+        assert params[1]["peak_day"] == 2
+
+    def test_predict_batch_matches_single_predictions(self, monkeypatch):
+        monkeypatch.setattr(creative_lifecycle, "DECAY_FIT_CHUNK", 7)
+        predictor = CreativeLifecyclePredictor()
+        histories = _noisy_decays(20) + [
+            _history([1.0, 1.1], creative_id="new"),
+            _history([1.0, 1.2, 1.4, 1.5, 1.6], creative_id="short"),
+            _history(_rise_then_decay(days=20), creative_id="tired"),
+        ]
+        batch = predictor.predict_fatigue_batch(histories)
+        assert [p.creative_id for p in batch] == [h.creative_id for h in histories]
+        for history, prediction in zip(histories, batch):
+            single = predictor.predict_fatigue(history)
+            assert prediction.current_phase == single.current_phase
+            assert prediction.refresh_urgency == single.refresh_urgency
+            assert prediction.confidence == single.confidence
+            assert prediction.projected_ctr_7d == pytest.approx(
+                single.projected_ctr_7d, rel=0.02, abs=1e-3
+            )
+
+    def test_batch_without_ml_uses_heuristics(self):
+        predictor = CreativeLifecyclePredictor()
+        history = _history(_rise_then_decay(days=20))
+        (prediction,) = predictor.predict_fatigue_batch([history], use_ml=False)
+        single = predictor.predict_fatigue(history, use_ml=False)
+        assert prediction.decay_rate == single.decay_rate
+        assert predictor.predict_fatigue_batch([]) == []
+
+
 # =============================================================================
 # Phase detection
 # =============================================================================
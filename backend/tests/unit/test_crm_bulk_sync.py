@@ -0,0 +1,398 @@
+# =============================================================================
+# Stratum AI - CRM Bulk Sync unit tests
+# =============================================================================
+"""Unit tests for app.services.crm.bulk_sync and the page-at-a-time syncs.
+
+The upserts run against in-memory SQLite, which shares Postgres'
+``INSERT ... ON CONFLICT`` and ``UPDATE ... FROM`` syntax. Fake clients
+replay recorded pages so the tests can pin a fixed number of statements per
+page, whatever its size. JSONB columns are compiled as plain JSON.
+"""
+
+from datetime import UTC, datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from app.models.cdp import (
+    CDPEvent,
+    CDPProfile,
+    CDPProfileIdentifier,
+    IdentifierType,
+)
+from app.models.crm import (
+    CRMConnection,
+    CRMConnectionStatus,
+    CRMContact,
+    CRMDeal,
+    CRMProvider,
+)
+from app.services.crm.bulk_sync import CRMBulkWriter, profiles_by_external_id
+from app.services.crm.hubspot_sync import HubSpotSyncService
+from app.services.crm.pipedrive_sync import PipedriveSyncService
+from app.services.crm.zoho_sync import ZohoSyncService
+
+pytestmark = pytest.mark.unit
+
+TENANT = 1
+NOW = datetime.now(UTC).replace(microsecond=0)
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_as_json(type_, compiler, **kw):
+    return "JSON"
+
+
+class _AsyncSession:
+    """Just enough of AsyncSession for the services, counting statements."""
+
+    def __init__(self, session):
+        self._session = session
+        self.statements = 0
+
+    async def execute(self, statement):
+        self.statements += 1
+        return self._session.execute(statement)
+
+    async def flush(self):
+        self._session.flush()
+
+    async def commit(self):
+        self._session.commit()
+
+    def add(self, instance):
+        self._session.add(instance)
+
+    def get_bind(self):
+        return self._session.get_bind()
+
+
+class _PagedClient:
+    """Replays recorded pages; the sync services only page through them."""
+
+    def __init__(self, pages, associations=None):
+        self.pages = list(pages)
+        self.associations = associations or {}
+        self.calls = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def _next_page(self, **kwargs):
+        self.calls += 1
+        return self.pages.pop(0) if self.pages else None
+
+    get_contacts = get_deals = get_leads = _next_page
+
+    async def get_deal_associations(self, deal_id, to_object_type):
+        contact_id = self.associations.get(deal_id)
+        return {"results": [{"id": contact_id}] if contact_id else []}
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    metadata = CRMContact.metadata
+    tables = [
+        table
+        for name, table in metadata.tables.items()
+        if name.startswith(("crm_", "cdp_"))
+    ]
+    metadata.create_all(engine, tables=tables)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def db(session):
+    return _AsyncSession(session)
+
+
+@pytest.fixture
+def connection(session):
+    connection = CRMConnection(
+        id=uuid4(),
+        tenant_id=TENANT,
+        provider=CRMProvider.HUBSPOT,
+        status=CRMConnectionStatus.CONNECTED,
+    )
+    session.add(connection)
+    session.commit()
+    return connection
+
+
+def _hubspot_page(records, after=None):
+    page = {"results": records}
+    if after:
+        page["paging"] = {"next": {"after": after}}
+    return page
+
+
+def _hubspot_contact(contact_id, **properties):
+    return {"id": contact_id, "properties": properties}
+
+
+def _contacts(session, connection):
+    rows = session.execute(
+        select(CRMContact).where(CRMContact.connection_id == connection.id)
+    ).scalars()
+    return {c.crm_contact_id: c for c in rows}
+
+
+# =============================================================================
+# CRMBulkWriter
+# =============================================================================
+
+
+async def test_upsert_counts_and_keeps_unsent_fields(db, session, connection):
+    writer = CRMBulkWriter(db, TENANT, connection.id)
+    first = [
+        {"crm_contact_id": "1", "utm_source": "facebook", "lifecycle_stage": "lead"},
+        {"crm_contact_id": "2", "utm_source": "google"},
+    ]
+    assert await writer.upsert_contacts(first) == (2, 0)
+
+    second = [
+        {"crm_contact_id": "1", "utm_source": None, "lifecycle_stage": "customer"},
+        {"crm_contact_id": "3", "utm_source": "tiktok"},
+    ]
+    assert await writer.upsert_contacts(second) == (1, 1)
+
+    session.expire_all()
+    contacts = _contacts(session, connection)
+    assert sorted(contacts) == ["1", "2", "3"]
+    # None means "not sent": the stored value stays
+    assert contacts["1"].utm_source == "facebook"
+    assert contacts["1"].lifecycle_stage == "customer"
+    assert contacts["3"].tenant_id == TENANT
+    # One key lookup and one upsert per page
+    assert db.statements == 4
+
+
+async def test_duplicates_within_a_page_collapse_to_the_last(db, session, connection):
+    writer = CRMBulkWriter(db, TENANT, connection.id)
+
+    created, updated = await writer.upsert_deals(
+        [
+            {"crm_deal_id": "d1", "deal_name": "Old name", "amount": 10.0},
+            {"crm_deal_id": "d1", "deal_name": "New name", "amount": 20.0},
+        ]
+    )
+
+    assert (created, updated) == (1, 0)
+    deal = session.execute(select(CRMDeal)).scalar_one()
+    assert (deal.deal_name, deal.amount) == ("New name", 20.0)
+
+
+async def test_connections_are_kept_apart(db, session, connection):
+    other = CRMConnection(
+        id=uuid4(),
+        tenant_id=TENANT,
+        provider=CRMProvider.ZOHO,
+        status=CRMConnectionStatus.CONNECTED,
+    )
+    session.add(other)
+    session.commit()
+
+    await CRMBulkWriter(db, TENANT, connection.id).upsert_contacts(
+        [{"crm_contact_id": "1"}]
+    )
+    created, _ = await CRMBulkWriter(db, TENANT, other.id).upsert_contacts(
+        [{"crm_contact_id": "1"}]
+    )
+
+    assert created == 1
+    assert len(session.execute(select(CRMContact)).all()) == 2
+
+
+async def test_link_deals_to_contacts_in_one_statement(db, session, connection):
+    writer = CRMBulkWriter(db, TENANT, connection.id)
+    await writer.upsert_contacts(
+        [
+            {
+                "crm_contact_id": "c1",
+                "utm_source": "FB",
+                "last_touch_campaign_id": "cmp-1",
+            },
+            {"crm_contact_id": "c2", "utm_source": "newsletter"},
+            {"crm_contact_id": "c3", "utm_source": ""},
+        ]
+    )
+    await writer.upsert_deals(
+        [
+            {"crm_deal_id": "d1"},
+            {"crm_deal_id": "d2", "attributed_campaign_id": "kept"},
+            {"crm_deal_id": "d3", "attributed_platform": "google"},
+            {"crm_deal_id": "d4"},
+        ]
+    )
+    db.statements = 0
+
+    linked = await writer.link_deals_to_contacts(
+        {"d1": "c1", "d2": "c2", "d3": "c3", "d4": "not-synced"}
+    )
+
+    assert linked == 3
+    assert db.statements == 1
+    session.expire_all()
+    contacts = _contacts(session, connection)
+    deals = {d.crm_deal_id: d for d in session.execute(select(CRMDeal)).scalars()}
+    assert deals["d1"].contact_id == contacts["c1"].id
+    assert (deals["d1"].attributed_platform, deals["d1"].attributed_campaign_id) == (
+        "meta",
+        "cmp-1",
+    )
+    # Unknown sources pass through; empty ones keep what the deal had
+    assert deals["d2"].attributed_platform == "newsletter"
+    assert deals["d2"].attributed_campaign_id == "kept"
+    assert deals["d3"].attributed_platform == "google"
+    assert deals["d4"].contact_id is None
+
+
+# =============================================================================
+# Sync services
+# =============================================================================
+
+
+async def test_hubspot_contact_sync_writes_each_page_in_bulk(db, session, connection):
+    service = HubSpotSyncService(db, TENANT)
+    service.client = _PagedClient(
+        [
+            _hubspot_page(
+                [
+                    _hubspot_contact(str(i), email=f"u{i}@example.com")
+                    for i in range(50)
+                ],
+                after="50",
+            ),
+            _hubspot_page(
+                [
+                    _hubspot_contact("0", utm_source="google"),
+                    _hubspot_contact("50", createdate="not a date"),
+                ]
+            ),
+        ]
+    )
+
+    results = await service._sync_contacts(connection)
+
+    assert results == {"synced": 52, "created": 51, "updated": 1, "errors": []}
+    assert db.statements == 4
+    session.expire_all()
+    contacts = _contacts(session, connection)
+    assert contacts["0"].utm_source == "google"
+    assert contacts["0"].email_hash is not None
+
+
+async def test_hubspot_deal_sync_links_contacts_after_paging(db, session, connection):
+    service = HubSpotSyncService(db, TENANT)
+    await CRMBulkWriter(db, TENANT, connection.id).upsert_contacts(
+        [{"crm_contact_id": "c1", "utm_source": "google"}]
+    )
+    service.client = _PagedClient(
+        [
+            _hubspot_page(
+                [
+                    {"id": "d1", "properties": {"amount": "12.50"}},
+                    {"id": "d2", "properties": {"dealstage": "closedwon"}},
+                ]
+            )
+        ],
+        associations={"d1": "c1"},
+    )
+    db.statements = 0
+
+    results = await service._sync_deals(connection)
+
+    assert results["created"] == 2
+    # Upsert page (2), unlinked deals (1), one joined UPDATE (1)
+    assert db.statements == 4
+    session.expire_all()
+    deal = session.execute(
+        select(CRMDeal).where(CRMDeal.crm_deal_id == "d1")
+    ).scalar_one()
+    assert (deal.amount_cents, deal.attributed_platform) == (1250, "google")
+    assert deal.contact_id is not None
+
+
+async def test_zoho_leads_are_stored_as_lead_contacts(db, session, connection):
+    service = ZohoSyncService(db, TENANT)
+    service.client = _PagedClient(
+        [
+            {
+                "data": [
+                    {"id": "L1", "Email": "lead@example.com", "Lead_Source": "Web"},
+                    {"id": "L2", "Phone": "+1 555 0100"},
+                ],
+                "info": {"more_records": False},
+            }
+        ]
+    )
+
+    results = await service._sync_leads(connection)
+
+    assert (results["created"], results["errors"]) == (2, [])
+    session.expire_all()
+    contacts = _contacts(session, connection)
+    assert {c.lifecycle_stage for c in contacts.values()} == {"lead"}
+    assert contacts["lead_L2"].phone_hash is not None
+
+
+async def test_pipedrive_deals_resolve_profiles_once_per_page(db, session):
+    profiles = []
+    for person_id in (7, 8):
+        profile = CDPProfile(
+            id=uuid4(),
+            tenant_id=TENANT,
+            first_seen_at=NOW,
+            last_seen_at=NOW,
+            profile_data={},
+        )
+        session.add(profile)
+        session.add(
+            CDPProfileIdentifier(
+                id=uuid4(),
+                tenant_id=TENANT,
+                profile_id=profile.id,
+                identifier_type=IdentifierType.EXTERNAL_ID.value,
+                identifier_hash=f"pipedrive:{person_id}",
+            )
+        )
+        profiles.append(profile)
+    session.commit()
+
+    found = await profiles_by_external_id(
+        db, TENANT, ["pipedrive:7", "pipedrive:7", "pipedrive:9"]
+    )
+    assert {k: p.id for k, p in found.items()} == {"pipedrive:7": profiles[0].id}
+    assert await profiles_by_external_id(db, 2, ["pipedrive:7"]) == {}
+
+    service = PipedriveSyncService(db, TENANT)
+    service.client = _PagedClient(
+        [
+            {
+                "success": True,
+                "data": [
+                    {"id": i, "person_id": 7 + i % 3, "status": "won", "value": 100}
+                    for i in range(30)
+                ],
+            }
+        ]
+    )
+    db.statements = 0
+
+    results = await service._sync_deals()
+
+    assert results["deals_synced"] == 30
+    assert db.statements == 1
+    events = session.execute(select(CDPEvent)).scalars().all()
+    # Deals for person 9 have no profile and are skipped
+    assert len(events) == 20
+    assert profiles[0].total_revenue == 1000
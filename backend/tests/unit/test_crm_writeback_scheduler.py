@@ -0,0 +1,480 @@
+# =============================================================================
+# Stratum AI - CRM Writeback Scheduler unit tests
+# =============================================================================
+"""Unit tests for app.services.crm.writeback_scheduler.
+
+Coalescing, deduplication and pacing are checked against a recording
+target. The provider targets talk to a local HTTP stub that answers the
+HubSpot batch, Salesforce sObject Collections, Zoho bulk and Pipedrive
+update endpoints, so each test can count the API calls a writeback makes.
+"""
+
+from types import SimpleNamespace
+from uuid import uuid4
+
+import httpx
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from sqlalchemy import create_engine, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from app.models.crm import (
+    CRMConnection,
+    CRMConnectionStatus,
+    CRMContact,
+    CRMProvider,
+)
+from app.services.crm import hubspot_client
+from app.services.crm.hubspot_client import HubSpotClient
+from app.services.crm.hubspot_writeback import HubSpotWritebackService
+from app.services.crm.pipedrive_client import PipedriveClient
+from app.services.crm.salesforce_client import SalesforceClient
+from app.services.crm.writeback_scheduler import (
+    CONTACT,
+    DEAL,
+    HubSpotTarget,
+    PipedriveTarget,
+    RequestBudget,
+    SalesforceTarget,
+    WritebackScheduler,
+    ZohoTarget,
+)
+from app.services.crm.zoho_client import ZohoClient
+
+pytestmark = pytest.mark.unit
+
+TENANT = 1
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_as_json(type_, compiler, **kw):
+    return "JSON"
+
+
+def _record(**written):
+    return SimpleNamespace(writeback_values=written or None, written_back_at=None)
+
+
+def _unlimited():
+    return RequestBudget(rate=1000.0, burst=1000)
+
+
+class RecordingTarget:
+    provider = CRMProvider.HUBSPOT
+    batch_size = 2
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.sent = []
+
+    async def send(self, object_type, batch):
+        self.sent.append((object_type, {u.external_id: u.fields for u in batch}))
+        return {u.external_id: "rejected" for u in batch if u.external_id in self.fail}
+
+
+# =============================================================================
+# Local CRM stub
+# =============================================================================
+
+
+class CRMStub:
+    """Answers the providers' update endpoints and records each request."""
+
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, str, object]] = []
+        self.reject: set[str] = set()
+        self.url = ""
+
+    async def handle(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.requests.append((request.method, request.path, body))
+        path = request.path
+
+        if path.endswith("/batch/update"):  # HubSpot
+            ids = [i["id"] for i in body["inputs"]]
+            return web.json_response(
+                {
+                    "status": "COMPLETE",
+                    "results": [{"id": i} for i in ids if i not in self.reject],
+                    "errors": [
+                        {"message": "Object not found", "context": {"ids": [i]}}
+                        for i in ids
+                        if i in self.reject
+                    ],
+                }
+            )
+        if path.endswith("/composite/sobjects"):  # Salesforce
+            return web.json_response(
+                [
+                    {
+                        "id": r["id"],
+                        "success": r["id"] not in self.reject,
+                        "errors": (
+                            [{"statusCode": "ENTITY_IS_DELETED"}]
+                            if r["id"] in self.reject
+                            else []
+                        ),
+                    }
+                    for r in body["records"]
+                ]
+            )
+        if path.startswith("/crm/v3/"):  # Zoho
+            return web.json_response(
+                {
+                    "data": [
+                        (
+                            {
+                                "code": "SUCCESS",
+                                "details": {"id": r["id"]},
+                                "message": "record updated",
+                                "status": "success",
+                            }
+                            if r["id"] not in self.reject
+                            else {
+                                "code": "INVALID_DATA",
+                                "message": "the id given seems to be invalid",
+                                "status": "error",
+                            }
+                        )
+                        for r in body["data"]
+                    ]
+                }
+            )
+        # Pipedrive
+        return web.json_response(
+            {"success": True, "data": {"id": path.rsplit("/")[-1]}}
+        )
+
+    def paths(self):
+        return [path for _, path, _ in self.requests]
+
+
+class _ToStub(httpx.AsyncBaseTransport):
+    """Sends an httpx client's requests, whatever their host, to the stub."""
+
+    def __init__(self, url: str):
+        self._url = httpx.URL(url)
+        self._inner = httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request):
+        request.url = request.url.copy_with(
+            scheme="http", host=self._url.host, port=self._url.port
+        )
+        return await self._inner.handle_async_request(request)
+
+    async def aclose(self):
+        await self._inner.aclose()
+
+
+@pytest.fixture
+async def stub():
+    crm = CRMStub()
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", crm.handle)
+    server = TestServer(app)
+    await server.start_server()
+    crm.url = str(server.make_url("")).rstrip("/")
+    yield crm
+    await server.close()
+
+
+async def _token(self):
+    return "token"
+
+
+@pytest.fixture
+def hubspot(stub, monkeypatch):
+    monkeypatch.setattr(hubspot_client, "HUBSPOT_API_BASE", stub.url)
+    monkeypatch.setattr(HubSpotClient, "get_access_token", _token)
+
+
+# =============================================================================
+# Scheduler
+# =============================================================================
+
+
+async def test_updates_to_one_object_are_coalesced():
+    target = RecordingTarget()
+    scheduler = WritebackScheduler(target, _unlimited(), stamp={"last_sync": "d"})
+    contact = _record()
+
+    scheduler.enqueue(CONTACT, "1", {"platform": "meta", "spend": None}, contact)
+    scheduler.enqueue(CONTACT, 1, {"campaign": "c1"})
+    scheduler.enqueue(CONTACT, "1", {"platform": "google"})
+    scheduler.enqueue(DEAL, "1", {"roas": 2.5})
+    assert scheduler.pending == 2
+
+    result = await scheduler.flush()
+
+    assert target.sent == [
+        (CONTACT, {"1": {"platform": "google", "campaign": "c1", "last_sync": "d"}}),
+        (DEAL, {"1": {"roas": 2.5, "last_sync": "d"}}),
+    ]
+    assert (result.synced, result.requests, scheduler.pending) == (2, 2, 0)
+    # The stamp is not remembered: it never makes an object "changed"
+    assert contact.writeback_values == {"platform": "google", "campaign": "c1"}
+    assert contact.written_back_at is not None
+
+
+async def test_only_changed_fields_are_written():
+    target = RecordingTarget()
+    scheduler = WritebackScheduler(target, _unlimited(), stamp={"last_sync": "d2"})
+    same = _record(platform="meta", spend=10.0)
+    moved = _record(platform="meta", spend=10.0)
+
+    scheduler.enqueue(CONTACT, "same", {"platform": "meta", "spend": 10}, same)
+    scheduler.enqueue(CONTACT, "moved", {"platform": "meta", "spend": 12.5}, moved)
+    result = await scheduler.flush()
+
+    assert target.sent == [(CONTACT, {"moved": {"spend": 12.5, "last_sync": "d2"}})]
+    assert (result.synced, result.unchanged, result.requests) == (1, 1, 1)
+    assert moved.writeback_values == {"platform": "meta", "spend": 12.5}
+
+
+async def test_batches_follow_the_target_size_and_failures_are_retried_later():
+    target = RecordingTarget(fail={"3"})
+    scheduler = WritebackScheduler(target, _unlimited())
+    records = {str(i): _record() for i in range(5)}
+    for external_id, record in records.items():
+        scheduler.enqueue(CONTACT, external_id, {"platform": "meta"}, record)
+
+    result = await scheduler.flush()
+
+    assert [list(batch) for _, batch in target.sent] == [
+        ["0", "1"],
+        ["2", "3"],
+        ["4"],
+    ]
+    assert (result.synced, result.failed) == (4, 1)
+    assert result.errors == [{"object_id": "3", "error": "rejected"}]
+    # Nothing recorded for the failure, so the next run sends it again
+    assert records["3"].writeback_values is None
+    assert result.to_dict()["status"] == "partial"
+
+
+async def test_request_budget_paces_requests():
+    now = [0.0]
+    waits = []
+
+    async def sleep(seconds):
+        waits.append(seconds)
+        now[0] += seconds
+
+    budget = RequestBudget(rate=2.0, burst=2, clock=lambda: now[0], sleep=sleep)
+    target = RecordingTarget()
+    target.batch_size = 1
+    scheduler = WritebackScheduler(target, budget)
+    for i in range(5):
+        scheduler.enqueue(DEAL, str(i), {"roas": i})
+
+    await scheduler.flush()
+
+    # Two requests from the burst, then one every half second
+    assert waits == [0.5, 0.5, 0.5]
+    assert now[0] == 1.5
+
+
+# =============================================================================
+# Provider targets against the stub
+# =============================================================================
+
+
+async def test_hubspot_sends_100_objects_per_request(stub, hubspot):
+    stub.reject = {"7"}
+    async with HubSpotClient(None, TENANT) as client:
+        scheduler = WritebackScheduler(HubSpotTarget(client), _unlimited())
+        for i in range(250):
+            scheduler.enqueue(CONTACT, str(i), {"stratum_ad_platform": "meta"})
+        scheduler.enqueue(DEAL, "d1", {"stratum_revenue_roas": 3.2})
+
+        result = await scheduler.flush()
+
+    assert stub.paths() == ["/crm/v3/objects/contacts/batch/update"] * 3 + [
+        "/crm/v3/objects/deals/batch/update"
+    ]
+    assert (result.synced, result.failed, result.requests) == (250, 1, 4)
+    assert result.errors == [{"object_id": "7", "error": "Object not found"}]
+    _, _, body = stub.requests[0]
+    assert body["inputs"][0] == {
+        "id": "0",
+        "properties": {"stratum_ad_platform": "meta"},
+    }
+
+
+async def test_salesforce_uses_sobject_collections(stub, monkeypatch):
+    async def no_connection(self):
+        return None
+
+    monkeypatch.setattr(SalesforceClient, "_get_access_token", _token)
+    monkeypatch.setattr(SalesforceClient, "_get_connection", no_connection)
+    stub.reject = {"003B"}
+
+    async with SalesforceClient(None, TENANT) as client:
+        client._instance_url = stub.url
+        scheduler = WritebackScheduler(SalesforceTarget(client), _unlimited())
+        for i in range(150):
+            scheduler.enqueue(CONTACT, f"003{i}", {"Stratum_Ad_Platform__c": "meta"})
+        scheduler.enqueue(CONTACT, "003B", {"Stratum_Ad_Platform__c": "meta"})
+        scheduler.enqueue(DEAL, "006A", {"Stratum_Revenue_ROAS__c": 1.5})
+
+        result = await scheduler.flush()
+
+    assert stub.paths() == ["/services/data/v59.0/composite/sobjects"] * 2
+    method, _, body = stub.requests[0]
+    assert method == "PATCH" and body["allOrNone"] is False
+    assert body["records"][0] == {
+        "attributes": {"type": "Contact"},
+        "id": "0030",
+        "Stratum_Ad_Platform__c": "meta",
+    }
+    assert stub.requests[1][2]["records"][-1]["attributes"] == {"type": "Opportunity"}
+    assert (result.synced, result.failed, result.requests) == (151, 1, 2)
+    assert "ENTITY_IS_DELETED" in result.errors[0]["error"]
+
+
+async def test_zoho_uses_bulk_update(stub, monkeypatch):
+    monkeypatch.setattr(ZohoClient, "get_access_token", _token)
+    stub.reject = {"z2"}
+
+    async with ZohoClient(None, TENANT) as client:
+        client.api_base = f"{stub.url}/crm/v3"
+        scheduler = WritebackScheduler(ZohoTarget(client), _unlimited())
+        for i in range(120):
+            scheduler.enqueue(CONTACT, f"z{i}", {"Stratum_Ad_Platform": "google"})
+
+        result = await scheduler.flush()
+
+    assert [(m, p) for m, p, _ in stub.requests] == [("PUT", "/crm/v3/Contacts")] * 2
+    assert len(stub.requests[0][2]["data"]) == 100
+    assert (result.synced, result.failed) == (119, 1)
+    assert result.errors[0]["error"] == "the id given seems to be invalid"
+
+
+async def test_pipedrive_sends_one_object_per_request(stub, monkeypatch):
+    async def domain(self):
+        return "tenant.pipedrive.com"
+
+    monkeypatch.setattr(PipedriveClient, "get_access_token", _token)
+    monkeypatch.setattr(PipedriveClient, "_get_api_domain", domain)
+
+    async with PipedriveClient(None, TENANT) as client:
+        client._http_client = httpx.AsyncClient(transport=_ToStub(stub.url))
+        scheduler = WritebackScheduler(PipedriveTarget(client), _unlimited())
+        scheduler.enqueue(CONTACT, 11, {"abc123": "meta"})
+        scheduler.enqueue(CONTACT, 11, {"def456": "c1"})
+        scheduler.enqueue(DEAL, 21, {"fff000": 2.0})
+
+        result = await scheduler.flush()
+
+    assert stub.requests == [
+        ("PUT", "/v1/persons/11", {"abc123": "meta", "def456": "c1"}),
+        ("PUT", "/v1/deals/21", {"fff000": 2.0}),
+    ]
+    assert result.synced == 2
+
+
+# =============================================================================
+# Writeback service
+# =============================================================================
+
+
+class _AsyncSession:
+    """Just enough of AsyncSession for the writeback service."""
+
+    def __init__(self, session):
+        self._session = session
+
+    async def execute(self, statement):
+        return self._session.execute(statement)
+
+    async def commit(self):
+        self._session.commit()
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    metadata = CRMContact.metadata
+    tables = [t for name, t in metadata.tables.items() if name.startswith("crm_")]
+    metadata.create_all(engine, tables=tables)
+    with Session(engine) as session:
+        yield session
+
+
+async def test_contact_writeback_only_resends_changes(stub, hubspot, session):
+    connections = {}
+    for provider in (CRMProvider.HUBSPOT, CRMProvider.ZOHO):
+        connections[provider] = CRMConnection(
+            id=uuid4(),
+            tenant_id=TENANT,
+            provider=provider,
+            status=CRMConnectionStatus.CONNECTED,
+        )
+        session.add(connections[provider])
+    for i in range(150):
+        session.add(
+            CRMContact(
+                id=uuid4(),
+                tenant_id=TENANT,
+                connection_id=connections[CRMProvider.HUBSPOT].id,
+                crm_contact_id=str(i),
+            )
+        )
+    session.add(
+        CRMContact(
+            id=uuid4(),
+            tenant_id=TENANT,
+            connection_id=connections[CRMProvider.ZOHO].id,
+            crm_contact_id="zoho-only",
+        )
+    )
+    session.commit()
+
+    spend = {}
+    service = HubSpotWritebackService(_AsyncSession(session), TENANT)
+
+    async def attribution(contact_id):
+        return {
+            "platform": "meta",
+            "campaign_id": "c1",
+            "total_spend": spend.get(contact_id, 10.0),
+            "touchpoints_count": 2,
+        }
+
+    service._get_contact_attribution = attribution
+
+    first = await service.sync_contact_attribution(batch_size=100)
+    assert (first["synced"], first["requests"]) == (150, 2)
+    # Only the tenant's HubSpot contacts are pushed to HubSpot
+    assert all(
+        i["id"] != "zoho-only" for _, _, body in stub.requests for i in body["inputs"]
+    )
+
+    second = await service.sync_contact_attribution(batch_size=100)
+    assert (second["synced"], second["unchanged"], second["requests"]) == (0, 150, 0)
+
+    changed = session.execute(
+        select(CRMContact).where(CRMContact.crm_contact_id == "42")
+    ).scalar_one()
+    spend[changed.id] = 25.0
+    third = await service.sync_contact_attribution(batch_size=100)
+
+    assert (third["synced"], third["requests"]) == (1, 1)
+    _, _, body = stub.requests[-1]
+    assert body["inputs"] == [
+        {
+            "id": "42",
+            "properties": {
+                "stratum_total_ad_spend": 25.0,
+                "stratum_last_sync": body["inputs"][0]["properties"][
+                    "stratum_last_sync"
+                ],
+            },
+        }
+    ]
+    session.expire_all()
+    assert changed.writeback_values["stratum_total_ad_spend"] == 25.0
+    assert len(stub.requests) == 3
@@ -0,0 +1,235 @@
+# =============================================================================
+# Stratum AI - Vectorized Daily Scoring Tests
+# =============================================================================
+"""
+Unit tests for the per-tenant daily scoring path.
+
+The vectorized scaling, health and signal-health functions must agree with
+their scalar counterparts element-wise, and ``score_campaigns`` must turn
+grouped metric rows into bulk UPDATE parameters without touching a database.
+"""
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.analytics.logic.scoring import scaling_score, scaling_score_arrays
+from app.analytics.logic.signal_health import (
+    signal_health,
+    signal_health_status_arrays,
+)
+from app.analytics.logic.types import (
+    BaselineMetrics,
+    EntityLevel,
+    EntityMetrics,
+    Platform,
+)
+from app.ml.roas_optimizer import (
+    PLATFORM_ROAS_TARGETS,
+    ROASOptimizer,
+    calculate_health_scores,
+)
+from app.models.trust_layer import SignalHealthStatus as StoredSignalStatus
+from app.workers.tasks.scores import _campaign_metrics_query, score_campaigns
+
+pytestmark = pytest.mark.unit
+
+
+def _random_metrics(rng, n):
+    return {
+        "roas": rng.uniform(0, 6, n),
+        "cpa": rng.uniform(0, 80, n),
+        "cvr": rng.uniform(0, 0.2, n),
+        "ctr": rng.uniform(0, 0.05, n),
+    }
+
+
+class TestScalingScoreArrays:
+    def test_matches_scalar_scaling_score(self):
+        rng = np.random.default_rng(3)
+        n = 200
+        today = _random_metrics(rng, n)
+        baseline = _random_metrics(rng, n)
+        today["conversions"] = rng.integers(0, 30, n).astype(float)
+        today["emq_score"] = np.where(
+            rng.random(n) < 0.3, np.nan, rng.uniform(50, 100, n)
+        )
+        # exercise the zero-baseline branch
+        baseline["roas"][:10] = 0.0
+
+        scores, actions = scaling_score_arrays(today, baseline)
+
+        for i in range(n):
+            emq = None if np.isnan(today["emq_score"][i]) else today["emq_score"][i]
+            result = scaling_score(
+                EntityMetrics(
+                    entity_id=str(i),
+                    entity_name="c",
+                    entity_level=EntityLevel.CAMPAIGN,
+                    platform=Platform.META,
+                    date=datetime.now(UTC),
+                    conversions=int(today["conversions"][i]),
+                    roas=today["roas"][i],
+                    cpa=today["cpa"][i],
+                    cvr=today["cvr"][i],
+                    ctr=today["ctr"][i],
+                    emq_score=emq,
+                ),
+                BaselineMetrics(**{k: baseline[k][i] for k in baseline}),
+            )
+            assert scores[i] == pytest.approx(result.score, abs=1e-4)
+            assert actions[i] == result.action.value
+
+
+class TestSignalHealthArrays:
+    @pytest.mark.parametrize(
+        "emq,loss,api_ok",
+        [
+            (95.0, 1.0, True),
+            (85.0, 1.0, True),
+            (75.0, 1.0, True),
+            (95.0, 7.0, True),
+            (95.0, 12.0, True),
+            (None, None, True),
+            (None, 7.0, True),
+            (95.0, 1.0, False),
+        ],
+    )
+    def test_matches_scalar_signal_health(self, emq, loss, api_ok):
+        status = signal_health_status_arrays(
+            np.array([np.nan if emq is None else emq]),
+            np.array([np.nan if loss is None else loss]),
+            np.array([api_ok]),
+        )
+        assert status[0] == signal_health(emq, loss, api_ok).status.value
+
+
+class TestHealthScoreArrays:
+    def test_matches_optimizer_health_score(self):
+        rng = np.random.default_rng(11)
+        n = 150
+        platforms = np.array(
+            rng.choice([*PLATFORM_ROAS_TARGETS, "pinterest"], n), dtype=object
+        )
+        roas = rng.uniform(0, 6, n)
+        ctr = rng.uniform(0, 3, n)
+        spend = np.where(rng.random(n) < 0.1, 0.0, rng.uniform(1, 5000, n))
+        conversions = rng.integers(0, 100, n).astype(float)
+
+        scores = calculate_health_scores(platforms, roas, ctr, spend, conversions)
+
+        optimizer = ROASOptimizer()
+        for i in range(n):
+            thresholds = optimizer.platform_targets.get(
+                platforms[i], optimizer.platform_targets["meta"]
+            )
+            expected = optimizer._calculate_health_score(
+                {
+                    "roas": roas[i],
+                    "ctr": ctr[i],
+                    "spend": spend[i],
+                    "conversions": conversions[i],
+                },
+                thresholds,
+            )
+            assert scores[i] == pytest.approx(expected, abs=0.051)
+
+
+def _metric_row(campaign_id, platform="meta", account_id="act_1", **kw):
+    base = {
+        f"{w}_{m}": 0
+        for w in ("today", "baseline")
+        for m in (
+            "impressions",
+            "clicks",
+            "conversions",
+            "spend_cents",
+            "revenue_cents",
+        )
+    }
+    base.update(kw)
+    return SimpleNamespace(
+        campaign_id=campaign_id, platform=platform, account_id=account_id, **base
+    )
+
+
+class TestScoreCampaigns:
+    def test_builds_bulk_update_params(self):
+        rows = [
+            _metric_row(
+                1,
+                today_impressions=10000,
+                today_clicks=300,
+                today_conversions=40,
+                today_spend_cents=100000,
+                today_revenue_cents=500000,
+                baseline_impressions=70000,
+                baseline_clicks=1400,
+                baseline_conversions=140,
+                baseline_spend_cents=700000,
+                baseline_revenue_cents=1400000,
+            ),
+            _metric_row(2, platform="google", account_id="g_1"),
+        ]
+        signals = [
+            SimpleNamespace(
+                platform="meta",
+                account_id=None,
+                emq_score=95.0,
+                event_loss_pct=1.0,
+                status=StoredSignalStatus.OK,
+            ),
+            SimpleNamespace(
+                platform="google",
+                account_id="g_1",
+                emq_score=70.0,
+                event_loss_pct=2.0,
+                status=StoredSignalStatus.DEGRADED,
+            ),
+        ]
+        scored_at = datetime.now(UTC)
+
+        updates = score_campaigns(rows, signals, scored_at)
+
+        assert [u["id"] for u in updates] == [1, 2]
+        improving, idle = updates
+        assert improving["scaling_recommendation"] == "scale"
+        assert improving["signal_health_status"] == "healthy"
+        assert improving["health_score"] > 50
+        assert idle["scaling_score"] == 0.0
+        assert idle["health_score"] == 0.0
+        assert idle["signal_health_status"] == "degraded"
+        assert all(u["scores_calculated_at"] is scored_at for u in updates)
+
+    def test_latest_signal_row_wins(self):
+        signals = [
+            SimpleNamespace(
+                platform="meta",
+                account_id="act_1",
+                emq_score=60.0,
+                event_loss_pct=0.0,
+                status=StoredSignalStatus.DEGRADED,
+            ),
+            SimpleNamespace(
+                platform="meta",
+                account_id="act_1",
+                emq_score=None,
+                event_loss_pct=None,
+                status=StoredSignalStatus.CRITICAL,
+            ),
+        ]
+        (update,) = score_campaigns([_metric_row(1)], signals, datetime.now(UTC))
+        assert update["signal_health_status"] == "critical"
+
+    def test_metrics_query_is_single_grouped_select(self):
+        sql = str(
+            _campaign_metrics_query(
+                7, datetime(2026, 1, 8).date(), datetime(2026, 1, 1).date()
+            ).compile(dialect=postgresql.dialect())
+        )
+        assert sql.count("SELECT") == 1
+        assert "GROUP BY" in sql
+        assert "today_spend_cents" in sql and "baseline_spend_cents" in sql
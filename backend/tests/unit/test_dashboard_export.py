@@ -0,0 +1,236 @@
+# =============================================================================
+# Stratum AI - Streaming dashboard export unit tests
+# =============================================================================
+"""Unit tests for app.services.dashboard_export.
+
+Rows are read from in-memory SQLite through a minimal async adapter, as in
+test_dashboard_rollups; the XLSX output is checked by unzipping it.
+"""
+
+import csv
+import io
+import json
+import zipfile
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from app.base_models import (
+    AdPlatform,
+    Campaign,
+    CampaignMetric,
+    CampaignStatus,
+    TenantDailyRollup,
+)
+from app.services.dashboard_export import PAGE_END, export_rows, stream_export
+from app.services.dashboard_rollups import refresh_daily_rollups_sync
+
+pytestmark = pytest.mark.unit
+
+TENANT = 1
+DAY = date(2026, 3, 10)
+START, END = DAY - timedelta(days=6), DAY
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_as_json(type_, compiler, **kw):
+    return "JSON"
+
+
+class _AsyncSession:
+    """Just enough of AsyncSession for the export queries."""
+
+    def __init__(self, session):
+        self._session = session
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        return self._session.execute(statement)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    tables = [t.__table__ for t in (Campaign, CampaignMetric, TenantDailyRollup)]
+    Campaign.metadata.create_all(engine, tables=tables)
+    with Session(engine) as session:
+        # (all-time spend, all-time revenue, period spend) per campaign
+        for n, (spend, revenue, period_spend) in enumerate(
+            [(100, 500, 40), (100, 50, 10), (100, 150, 0), (0, 0, 0), (200, 900, 25)],
+            start=1,
+        ):
+            campaign = Campaign(
+                tenant_id=TENANT,
+                platform=AdPlatform.META,
+                external_id=f"c{n}",
+                account_id="act_1",
+                name=f"Campaign {n}",
+                status=CampaignStatus.ACTIVE,
+                labels=[],
+                total_spend_cents=spend * 100,
+                revenue_cents=revenue * 100,
+            )
+            session.add(campaign)
+            session.flush()
+            if period_spend:
+                session.add(
+                    CampaignMetric(
+                        tenant_id=TENANT,
+                        campaign_id=campaign.id,
+                        date=DAY,
+                        spend_cents=period_spend * 100,
+                        revenue_cents=period_spend * 300,
+                        impressions=1000,
+                        clicks=10,
+                        conversions=2,
+                    )
+                )
+        session.add(
+            Campaign(
+                tenant_id=TENANT,
+                platform=AdPlatform.GOOGLE,
+                external_id="deleted",
+                account_id="act_1",
+                name="Deleted",
+                status=CampaignStatus.PAUSED,
+                labels=[],
+                is_deleted=True,
+            )
+        )
+        session.flush()
+        refresh_daily_rollups_sync(session, TENANT)
+        yield _AsyncSession(session)
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+def _export(db, fmt, **kwargs):
+    @asynccontextmanager
+    async def factory():
+        yield db
+
+    return stream_export(
+        fmt, TENANT, START, END, "7d", session_factory=factory, **kwargs
+    )
+
+
+async def test_csv_keeps_sectioned_layout(db):
+    body = b"".join(await _collect(_export(db, "csv"))).decode()
+    rows = list(csv.reader(io.StringIO(body)))
+
+    assert rows[0] == ["=== METRICS SUMMARY ==="]
+    assert rows[2] == ["total_spend", "75.00"]
+    assert rows[10] == []
+    assert rows[11] == ["=== CAMPAIGNS ==="]
+    assert rows[13] == [
+        "1",
+        "Campaign 1",
+        "meta",
+        "active",
+        "$40.00",
+        "$120.00",
+        "3.00x",
+        "2",
+        "1000",
+        "10",
+    ]
+    assert [r[0] for r in rows[13:18]] == ["1", "2", "3", "4", "5"]
+    assert rows[19] == ["=== RECOMMENDATIONS ==="]
+    assert rows[20] == ["Campaign ID", "Campaign", "Type", "Description"]
+    assert [(r[0], r[2]) for r in rows[21:]] == [
+        ("1", "scale"),
+        ("2", "fix"),
+        ("5", "scale"),
+    ]
+
+
+async def test_rows_are_paged_and_flushed_per_page(db):
+    events = [
+        e async for e in export_rows(db, TENANT, START, END, ["campaigns"], page_size=2)
+    ]
+
+    ids = [e[1]["id"] for e in events if e is not PAGE_END]
+    assert ids == [1, 2, 3, 4, 5]
+    assert events.count(PAGE_END) == 3
+    assert events[2] is PAGE_END
+
+
+async def test_first_row_is_yielded_before_later_pages_are_read(db):
+    stream = export_rows(db, TENANT, START, END, ["campaigns"], page_size=1)
+
+    await stream.__anext__()
+
+    assert db.queries == 2  # one campaign page + its metrics
+    await stream.aclose()
+
+
+async def test_resume_skips_earlier_sections_and_ids(db):
+    body = b"".join(
+        await _collect(
+            _export(db, "csv", resume_section="campaigns", resume_after_id=3)
+        )
+    ).decode()
+    rows = list(csv.reader(io.StringIO(body)))
+
+    assert rows[0] == ["=== CAMPAIGNS ==="]
+    assert [r[0] for r in rows[2:4]] == ["4", "5"]
+    assert [r[0] for r in rows[7:]] == ["1", "2", "5"]
+
+
+async def test_json_is_one_valid_document(db):
+    body = b"".join(
+        await _collect(
+            _export(db, "json", sections=["metrics", "campaigns", "recommendations"])
+        )
+    )
+    data = json.loads(body)
+
+    assert data["period"] == "7d"
+    assert data["metrics"]["total_spend"] == 75.0
+    assert [c["id"] for c in data["campaigns"]] == [1, 2, 3, 4, 5]
+    assert data["recommendations"][1] == {
+        "campaign_id": 2,
+        "campaign": "Campaign 2",
+        "type": "fix",
+        "description": "Review targeting - ROAS 0.50x below breakeven",
+    }
+
+
+async def test_json_keeps_requested_sections_without_rows(db):
+    body = b"".join(
+        await _collect(
+            _export(
+                db,
+                "json",
+                sections=["campaigns", "recommendations"],
+                resume_section="recommendations",
+                resume_after_id=5,
+            )
+        )
+    )
+
+    data = json.loads(body)
+    assert data["recommendations"] == []
+    assert "campaigns" not in data
+    assert data["resumed_after"] == {"section": "recommendations", "campaign_id": 5}
+
+
+async def test_xlsx_has_a_sheet_per_section(db):
+    body = b"".join(await _collect(_export(db, "xlsx")))
+
+    archive = zipfile.ZipFile(io.BytesIO(body))
+    assert archive.testzip() is None
+    workbook = archive.read("xl/workbook.xml").decode()
+    for name in ("Metrics", "Campaigns", "Recommendations"):
+        assert f'name="{name}"' in workbook
+    campaigns = archive.read("xl/worksheets/sheet2.xml").decode()
+    assert campaigns.count("<row>") == 6
+    assert "Campaign 5" in campaigns
@@ -0,0 +1,212 @@
+# =============================================================================
+# Stratum AI - Dashboard insight cache unit tests
+# =============================================================================
+"""Unit tests for app.services.dashboard_cache.InsightsCache.
+
+The data version, the session factory and the clock are injected, so the
+tests drive staleness and version changes directly without a database.
+Cached endpoints are called through the test app with a mocked session.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from fastapi import Request
+
+from app.auth.deps import CurrentUser, get_current_user
+from app.base_models import UserRole
+from app.core.config import settings
+from app.core.security import decode_token
+from app.services.dashboard_cache import InsightsCache
+
+pytestmark = pytest.mark.unit
+
+
+class _Harness:
+    """Controls the version/clock and counts computations per tenant."""
+
+    def __init__(self, **kwargs):
+        self.now = 0.0
+        self.version = "v1"
+        self.calls = 0
+        self.gate = None
+        self.fail = False
+        self.cache = InsightsCache(
+            session_factory=self._session,
+            version_fn=self._version,
+            clock=lambda: self.now,
+            **kwargs,
+        )
+
+    @asynccontextmanager
+    async def _session(self):
+        yield "session"
+
+    async def _version(self, db, tenant_id):
+        return self.version
+
+    async def compute(self, tenant_id, session):
+        assert session == "session"
+        self.calls += 1
+        call = self.calls
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.fail:
+            raise RuntimeError("boom")
+        return f"tenant{tenant_id}-result{call}"
+
+    async def get(self, tenant_id=1, *params):
+        return await self.cache.get_or_compute(
+            "insight", tenant_id, "request-db", self.compute, *params
+        )
+
+
+async def _drain():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def h():
+    return _Harness(fresh_seconds=60, max_stale_seconds=600, max_entries=3)
+
+
+async def test_miss_computes_then_hit_is_served_from_cache(h):
+    assert await h.get() == "tenant1-result1"
+    assert await h.get() == "tenant1-result1"
+    assert h.calls == 1
+
+
+async def test_concurrent_misses_share_one_computation(h):
+    h.gate = asyncio.Event()
+    waiters = [asyncio.create_task(h.get()) for _ in range(10)]
+    await _drain()
+    h.gate.set()
+
+    results = await asyncio.gather(*waiters)
+
+    assert h.calls == 1
+    assert set(results) == {"tenant1-result1"}
+
+
+async def test_version_change_serves_stale_and_refreshes_once(h):
+    await h.get()
+    h.version = "v2"
+    h.gate = asyncio.Event()
+
+    # Stale value returned immediately, many times, one refresh in flight
+    assert [await h.get() for _ in range(5)] == ["tenant1-result1"] * 5
+    h.gate.set()
+    await _drain()
+
+    assert h.calls == 2
+    assert await h.get() == "tenant1-result2"
+    assert h.calls == 2
+
+
+async def test_old_entry_refreshes_in_background(h):
+    await h.get()
+    h.now = 61
+
+    assert await h.get() == "tenant1-result1"
+    await _drain()
+    assert await h.get() == "tenant1-result2"
+
+
+async def test_entry_past_max_stale_is_recomputed_inline(h):
+    await h.get()
+    h.now = 601
+
+    assert await h.get() == "tenant1-result2"
+
+
+async def test_failed_refresh_keeps_serving_stale_value(h):
+    await h.get()
+    h.version = "v2"
+    h.fail = True
+
+    assert await h.get() == "tenant1-result1"
+    await _drain()
+    assert await h.get() == "tenant1-result1"
+
+
+async def test_failed_miss_raises_to_caller(h):
+    h.fail = True
+    with pytest.raises(RuntimeError):
+        await h.get()
+
+
+async def test_keys_are_scoped_by_tenant_and_params(h):
+    assert await h.get(1) == "tenant1-result1"
+    assert await h.get(2) == "tenant2-result2"
+    assert await h.get(1, "roas_max") == "tenant1-result3"
+    assert await h.get(1) == "tenant1-result1"
+
+
+async def test_lru_bound_and_invalidate(h):
+    for tenant_id in (1, 2, 3, 4):
+        await h.get(tenant_id)
+    assert await h.get(1) == "tenant1-result5"
+
+    h.cache.invalidate(1)
+    assert await h.get(1) == "tenant1-result6"
+    assert await h.get(4) == "tenant4-result4"
+
+
+# =============================================================================
+# Cached endpoints
+# =============================================================================
+
+
+async def test_morning_briefing_greets_each_user_from_one_cached_briefing(
+    api_client, test_app, mock_db, admin_headers, viewer_headers, monkeypatch
+):
+    names = {1: "Ada Lovelace", 2: None}
+
+    async def named_user(request: Request) -> CurrentUser:
+        token = request.headers["Authorization"].split(" ", 1)[1]
+        user_id = int(decode_token(token)["sub"])
+        user = SimpleNamespace(
+            id=user_id,
+            tenant_id=1,
+            role=UserRole.ADMIN,
+            is_active=True,
+            is_verified=True,
+            permissions={},
+        )
+        return CurrentUser(user=user, email="u@example.com", full_name=names[user_id])
+
+    @asynccontextmanager
+    async def session():
+        yield mock_db
+
+    async def version(db, tenant_id):
+        return "v1"
+
+    cache = InsightsCache(session_factory=session, version_fn=version)
+    test_app.dependency_overrides[get_current_user] = named_user
+    monkeypatch.setattr(settings, "dashboard_insights_cache_enabled", True)
+
+    with patch("app.services.dashboard_cache.insights_cache", cache):
+        first = await api_client.get(
+            "/api/v1/dashboard/morning-briefing", headers=admin_headers
+        )
+        computed = mock_db.execute.await_count
+        second = await api_client.get(
+            "/api/v1/dashboard/morning-briefing", headers=viewer_headers
+        )
+
+    assert first.status_code == 200, first.text
+    assert second.status_code == 200, second.text
+    # The second user is served from the cache, without recomputing
+    assert mock_db.execute.await_count == computed
+    first, second = first.json()["data"], second.json()["data"]
+    assert first["greeting"].endswith(", Ada")
+    assert second["greeting"].endswith(", there")
+    assert first["greeting"].rsplit(", ", 1)[0] == second["greeting"].rsplit(", ", 1)[0]
+    assert {k: v for k, v in first.items() if k != "greeting"} == {
+        k: v for k, v in second.items() if k != "greeting"
+    }
@@ -0,0 +1,215 @@
+# =============================================================================
+# Stratum AI - Dashboard Daily Rollup unit tests
+# =============================================================================
+"""Unit tests for app.services.dashboard_rollups.
+
+Runs the real refresh statements against in-memory SQLite (which shares
+PostgreSQL's INSERT ... ON CONFLICT syntax); JSONB columns on the campaign
+table are compiled as plain JSON for the test database.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from app.base_models import (
+    AdPlatform,
+    Campaign,
+    CampaignMetric,
+    CampaignStatus,
+    TenantDailyRollup,
+)
+from app.services import dashboard_rollups
+from app.services.dashboard_rollups import refresh_daily_rollups_sync
+
+pytestmark = pytest.mark.unit
+
+TENANT = 1
+DAY = date(2026, 3, 10)
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_as_json(type_, compiler, **kw):
+    return "JSON"
+
+
+class _AsyncSession:
+    """Just enough of AsyncSession for the read helpers."""
+
+    def __init__(self, session):
+        self._session = session
+
+    async def execute(self, statement):
+        return self._session.execute(statement)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    tables = [t.__table__ for t in (Campaign, CampaignMetric, TenantDailyRollup)]
+    Campaign.metadata.create_all(engine, tables=tables)
+    with Session(engine) as session:
+        yield session
+
+
+def _campaign(db, platform, tenant_id=TENANT, external_id=None):
+    campaign = Campaign(
+        tenant_id=tenant_id,
+        platform=platform,
+        external_id=external_id or f"{platform.value}-{tenant_id}",
+        account_id="act_1",
+        name="Campaign",
+        status=CampaignStatus.ACTIVE,
+        labels=[],
+    )
+    db.add(campaign)
+    db.flush()
+    return campaign
+
+
+def _metric(db, campaign, day, spend_cents, revenue_cents=0, clicks=0):
+    db.add(
+        CampaignMetric(
+            tenant_id=campaign.tenant_id,
+            campaign_id=campaign.id,
+            date=day,
+            spend_cents=spend_cents,
+            revenue_cents=revenue_cents,
+            impressions=clicks * 10,
+            clicks=clicks,
+            conversions=0,
+        )
+    )
+
+
+def _rollups(db, tenant_id=TENANT):
+    rows = db.execute(
+        select(TenantDailyRollup).where(TenantDailyRollup.tenant_id == tenant_id)
+    ).scalars()
+    return {
+        (r.date, AdPlatform(r.platform)): (r.spend_cents, r.campaigns_with_metrics)
+        for r in rows
+    }
+
+
+def test_refresh_sums_campaigns_per_day_and_platform(db):
+    meta_a = _campaign(db, AdPlatform.META, external_id="a")
+    meta_b = _campaign(db, AdPlatform.META, external_id="b")
+    google = _campaign(db, AdPlatform.GOOGLE)
+    _metric(db, meta_a, DAY, 100)
+    _metric(db, meta_b, DAY, 250)
+    _metric(db, google, DAY, 40)
+    _metric(db, google, DAY + timedelta(days=1), 60)
+
+    refresh_daily_rollups_sync(db, TENANT, [DAY, DAY + timedelta(days=1)])
+
+    assert _rollups(db) == {
+        (DAY, AdPlatform.META): (350, 2),
+        (DAY, AdPlatform.GOOGLE): (40, 1),
+        (DAY + timedelta(days=1), AdPlatform.GOOGLE): (60, 1),
+    }
+
+
+def test_refresh_only_touches_requested_days_and_platform(db):
+    meta = _campaign(db, AdPlatform.META)
+    google = _campaign(db, AdPlatform.GOOGLE)
+    _metric(db, meta, DAY, 100)
+    _metric(db, google, DAY, 40)
+    refresh_daily_rollups_sync(db, TENANT, [DAY])
+
+    # Every source row changes...
+    db.execute(CampaignMetric.__table__.update().values(spend_cents=999))
+    refresh_daily_rollups_sync(db, TENANT, [DAY], platform=AdPlatform.META)
+
+    # ...but only the refreshed platform is recomputed
+    assert _rollups(db) == {
+        (DAY, AdPlatform.META): (999, 1),
+        (DAY, AdPlatform.GOOGLE): (40, 1),
+    }
+
+
+def test_refresh_is_idempotent_and_drops_emptied_days(db):
+    meta = _campaign(db, AdPlatform.META)
+    _metric(db, meta, DAY, 100)
+    _metric(db, meta, DAY + timedelta(days=1), 50)
+    refresh_daily_rollups_sync(db, TENANT, [DAY, DAY + timedelta(days=1)])
+    refresh_daily_rollups_sync(db, TENANT, [DAY, DAY + timedelta(days=1)])
+    assert _rollups(db)[(DAY, AdPlatform.META)] == (100, 1)
+
+    db.execute(
+        CampaignMetric.__table__.delete().where(
+            CampaignMetric.date == DAY + timedelta(days=1)
+        )
+    )
+    refresh_daily_rollups_sync(db, TENANT, [DAY + timedelta(days=1)])
+
+    assert _rollups(db) == {(DAY, AdPlatform.META): (100, 1)}
+
+
+def test_full_rebuild_is_scoped_to_tenant(db):
+    ours = _campaign(db, AdPlatform.META)
+    theirs = _campaign(db, AdPlatform.META, tenant_id=2)
+    _metric(db, ours, DAY, 100)
+    _metric(db, theirs, DAY, 70)
+
+    refresh_daily_rollups_sync(db, TENANT)
+
+    assert _rollups(db) == {(DAY, AdPlatform.META): (100, 1)}
+    assert _rollups(db, tenant_id=2) == {}
+
+
+def test_empty_dates_is_a_no_op(db):
+    meta = _campaign(db, AdPlatform.META)
+    _metric(db, meta, DAY, 100)
+
+    refresh_daily_rollups_sync(db, TENANT, [])
+
+    assert _rollups(db) == {}
+
+
+@pytest.fixture
+def seeded(db):
+    meta = _campaign(db, AdPlatform.META)
+    tiktok = _campaign(db, AdPlatform.TIKTOK)
+    for offset in range(14):
+        _metric(db, meta, DAY - timedelta(days=offset), 100, 300, clicks=5)
+        _metric(db, tiktok, DAY - timedelta(days=offset), 10, 5, clicks=1)
+    refresh_daily_rollups_sync(db, TENANT)
+    return _AsyncSession(db)
+
+
+async def test_period_totals_buckets_ranges(seeded):
+    totals = await dashboard_rollups.period_totals(
+        seeded,
+        TENANT,
+        {
+            "current": (DAY - timedelta(days=6), DAY),
+            "previous": (DAY - timedelta(days=13), DAY - timedelta(days=7)),
+            "future": (DAY + timedelta(days=1), DAY + timedelta(days=7)),
+        },
+    )
+
+    assert totals["current"]["spend_cents"] == 7 * 110
+    assert totals["current"]["revenue_cents"] == 7 * 305
+    assert totals["current"]["clicks"] == 7 * 6
+    assert totals["previous"] == totals["current"]
+    assert totals["future"] == dict.fromkeys(dashboard_rollups.METRIC_COLUMNS, 0)
+
+
+async def test_platform_totals_all_time(seeded):
+    totals = await dashboard_rollups.platform_totals(seeded, TENANT)
+
+    assert totals[AdPlatform.META]["spend_cents"] == 14 * 100
+    assert totals[AdPlatform.TIKTOK]["impressions"] == 14 * 10
+    assert AdPlatform.GOOGLE not in totals
+
+
+async def test_daily_totals_ordered_across_platforms(seeded):
+    days = await dashboard_rollups.daily_totals(seeded, TENANT, DAY - timedelta(days=2))
+
+    assert [d for d, _ in days] == [DAY - timedelta(days=n) for n in (2, 1, 0)]
+    assert all(t["spend_cents"] == 110 for _, t in days)
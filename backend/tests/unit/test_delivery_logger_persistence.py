@@ -5,8 +5,8 @@
 Covers the database-backed paths of ``app.services.capi.delivery_logger`` that
 the pure-logic suite left out: ``flush`` (write + re-buffer on error),
 ``get_delivery_history`` (row->entry mapping, filters, error), ``get_metrics``
-(counts, success rate, latency percentiles, by-platform/event, error), and
-``cleanup_old_logs``.
+(counts, success rate, latency percentiles, by-platform/event from the minute
+rollups, error), and ``cleanup_old_logs``.
 
 Same mock-at-the-session-boundary technique as ``test_capi_dlq_postgres.py``:
 ``async_session_factory`` is patched with a fake factory yielding a mock ``db``,
@@ -96,14 +96,17 @@ async def test_flush_writes_each_buffered_entry():
     with patch(_MODULE, new=_fake_session_factory(db)):
         await logger.flush()
 
-    assert db.add.call_count == 2
+    # One multi-row insert for the logs and one rollup upsert, one commit.
+    assert db.execute.await_count == 2
+    db.add.assert_not_called()
     db.commit.assert_awaited_once()
     # Buffer is drained on a successful flush.
     assert logger._buffer == []
+    rows = db.execute.call_args_list[0].args[1]
+    assert [row["platform"] for row in rows] == ["meta", "google"]
     # event_value dollars -> cents, and the enum is stored as its string value.
-    written = db.add.call_args_list[0].args[0]
-    assert written.event_value_cents == 4999
-    assert written.status == "success"
+    assert rows[0]["event_value_cents"] == 4999
+    assert rows[0]["status"] == "success"
 
 
 @pytest.mark.asyncio
@@ -140,7 +143,7 @@ async def test_none_event_value_maps_to_null_cents():
     with patch(_MODULE, new=_fake_session_factory(db)):
         await logger.flush()
 
-    assert db.add.call_args.args[0].event_value_cents is None
+    assert db.execute.call_args_list[0].args[1][0]["event_value_cents"] is None
 
 
 # ---------------------------------------------------------------------------
@@ -214,38 +217,43 @@ async def test_get_delivery_history_returns_empty_on_db_error():
 # ---------------------------------------------------------------------------
 
 
+def _rollup_row(status, latency_bucket, count, latency_sum, latency_max, **kw):
+    base = dict(platform="meta", event_name="Purchase")
+    base.update(kw)
+    return SimpleNamespace(
+        status=status,
+        latency_bucket=latency_bucket,
+        count=count,
+        latency_sum=latency_sum,
+        latency_max=latency_max,
+        **base,
+    )
+
+
 @pytest.mark.asyncio
 async def test_get_metrics_aggregates_counts_percentiles_and_breakdowns():
     db = _mock_db()
-
-    totals = MagicMock()
-    totals.one.return_value = SimpleNamespace(
-        total=200, successful=180, failed=20, avg_latency=95.0
-    )
-    latencies = MagicMock()
-    # >100 successful latencies so the p95/p99 index branches are exercised.
-    latencies.all.return_value = [(float(i),) for i in range(1, 121)]
-    by_platform = MagicMock()
-    by_platform.all.return_value = [
-        SimpleNamespace(platform="meta", status="success", count=180),
-        SimpleNamespace(platform="meta", status="failed", count=20),
-    ]
-    by_event = MagicMock()
-    by_event.all.return_value = [
-        SimpleNamespace(event_name="Purchase", status="success", count=180),
+    rows = MagicMock()
+    rows.all.return_value = [
+        _rollup_row("success", 3, 100, 7000.0, 95.0),
+        _rollup_row("success", 5, 80, 10000.0, 240.0),
+        _rollup_row("failed", 9, 20, 2000.0, 1200.0),
     ]
-    db.execute = AsyncMock(side_effect=[totals, latencies, by_platform, by_event])
+    db.execute = AsyncMock(return_value=rows)
 
     with patch(_MODULE, new=_fake_session_factory(db)):
         metrics = await DeliveryLogger().get_metrics(tenant_id=7)
 
+    # A single query over the minute rollups
+    db.execute.assert_awaited_once()
     assert metrics.total_events == 200
     assert metrics.successful == 180
     assert metrics.failed == 20
     assert metrics.success_rate_pct == 90.0
     assert metrics.avg_latency_ms == 95.0
-    assert metrics.p50_latency_ms > 0
-    assert metrics.p95_latency_ms > metrics.p50_latency_ms
+    assert metrics.p50_latency_ms == 95.0
+    assert metrics.p95_latency_ms == 240.0
+    assert metrics.p99_latency_ms == 240.0
     assert metrics.by_platform["meta"] == {"success": 180, "failed": 20}
     assert metrics.by_event_type["Purchase"]["success"] == 180
 
@@ -253,13 +261,9 @@ async def test_get_metrics_aggregates_counts_percentiles_and_breakdowns():
 @pytest.mark.asyncio
 async def test_get_metrics_zero_events_leaves_defaults():
     db = _mock_db()
-    totals = MagicMock()
-    totals.one.return_value = SimpleNamespace(
-        total=0, successful=0, failed=0, avg_latency=None
-    )
     empty = MagicMock()
     empty.all.return_value = []
-    db.execute = AsyncMock(side_effect=[totals, empty, empty, empty])
+    db.execute = AsyncMock(return_value=empty)
 
     with patch(_MODULE, new=_fake_session_factory(db)):
         metrics = await DeliveryLogger().get_metrics(
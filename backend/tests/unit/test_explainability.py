@@ -4,21 +4,31 @@
 """Unit tests for app.ml.explainability.
 
 Pure numpy/statistics logic, no I/O (no model file -> fallback paths).
-Covers the ModelExplainer fallback contribution/explanation helpers, the
-convenience entrypoints, and the P2 enhancements (counterfactual
+Covers the ModelExplainer fallback contribution/explanation helpers, batched
+explanations, the process-wide explainer cache, the convenience entrypoints,
+and the P2 enhancements (counterfactual
 explainer, model-drift detector, feature-interaction analyzer) — with
 regression coverage for the previously-missing statistics / timedelta
 imports.
 """
 
+import json
+import os
+
+import joblib
+import numpy as np
 import pytest
+from sklearn.linear_model import LinearRegression
 
+from app.ml import explainability
 from app.ml.explainability import (
     CounterfactualExplainer,
+    ExplainerCache,
     FeatureInteractionAnalyzer,
     ModelDriftDetector,
     ModelExplainer,
     explain_roas_prediction,
+    explain_roas_predictions,
     get_model_feature_importance,
 )
 
@@ -33,6 +43,29 @@ def explainer():
     return exp
 
 
+def _save_model(path, name="roas_predictor", version="2.0.0"):
+    model = LinearRegression().fit(
+        np.array([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]), [2, 3, 5]
+    )
+    joblib.dump(model, path / f"{name}.pkl")
+    (path / f"{name}_metadata.json").write_text(
+        json.dumps({"version": version, "features": ["ctr", "cvr"]})
+    )
+
+
+class _CountingShap:
+    """Stands in for a SHAP explainer: contribution = 0.1 * feature value."""
+
+    expected_value = 1.0
+
+    def __init__(self):
+        self.calls = 0
+
+    def shap_values(self, X):
+        self.calls += 1
+        return np.asarray(X) * 0.1
+
+
 # =============================================================================
 # Fallback contributions + explanation helpers
 # =============================================================================
@@ -108,6 +141,96 @@ class TestFallbackContributions:
         )
 
 
+# =============================================================================
+# Batched explanations
+# =============================================================================
+class TestExplainBatch:
+    def test_batch_matches_single_explanations(self, explainer):
+        rows = [
+            {"ctr": 2.0, "cvr": 3.0, "spend": 50.0, "roas_7d_avg": 4.0},
+            {"ctr": 1.0, "spend": 500.0},
+        ]
+        batch = explainer.explain_batch(rows, predictions=[3.2, 1.1])
+        single = [
+            explainer.explain_prediction(r, prediction=p)
+            for r, p in zip(rows, [3.2, 1.1])
+        ]
+        assert [e.explanation_summary for e in batch] == [
+            e.explanation_summary for e in single
+        ]
+        assert [e.confidence_score for e in batch] == [1.0, 0.5]
+        assert len({e.prediction_id for e in batch}) == 2
+        assert explainer.explain_batch([]) == []
+
+    def test_one_model_call_and_one_shap_evaluation(self, tmp_path, monkeypatch):
+        _save_model(tmp_path)
+        exp = ModelExplainer("roas_predictor", models_path=str(tmp_path))
+        shap_stub = _CountingShap()
+        exp.shap_explainer = shap_stub
+        monkeypatch.setattr(explainability, "SHAP_AVAILABLE", True)
+        predict_calls = []
+        model_predict = exp.model.predict
+        monkeypatch.setattr(
+            exp.model,
+            "predict",
+            lambda X: predict_calls.append(len(X)) or model_predict(X),
+            raising=False,
+        )
+
+        rows = [{"ctr": float(i), "cvr": 1.0} for i in range(50)]
+        results = exp.explain_batch(rows, predictions=[None] * 49 + [9.0])
+
+        assert shap_stub.calls == 1
+        assert predict_calls == [49]
+        assert results[0].predicted_value == pytest.approx(3.0)
+        assert results[-1].predicted_value == 9.0
+        top = results[10].top_positive_factors[0]
+        assert (top.feature_name, top.contribution) == ("ctr", pytest.approx(1.0))
+
+
+# =============================================================================
+# Explainer cache
+# =============================================================================
+class TestExplainerCache:
+    def test_reuses_explainer_until_model_changes(self, tmp_path):
+        _save_model(tmp_path)
+        cache = ExplainerCache()
+        first = cache.get("roas_predictor", str(tmp_path))
+        assert first.model is not None and first.version == "2.0.0"
+        assert cache.get("roas_predictor", str(tmp_path)) is first
+
+        # A promotion replaces the files -> new version -> fresh explainer
+        _save_model(tmp_path, version="2.1.0")
+        pkl = tmp_path / "roas_predictor.pkl"
+        stat = pkl.stat()
+        os.utime(pkl, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        second = cache.get("roas_predictor", str(tmp_path))
+        assert second is not first and second.version == "2.1.0"
+        assert cache.get("roas_predictor", str(tmp_path)) is second
+
+    def test_invalidate(self, tmp_path):
+        _save_model(tmp_path)
+        _save_model(tmp_path, name="ltv_predictor")
+        cache = ExplainerCache()
+        roas = cache.get("roas_predictor", str(tmp_path))
+        ltv = cache.get("ltv_predictor", str(tmp_path))
+
+        cache.invalidate("roas_predictor")
+        assert cache.get("roas_predictor", str(tmp_path)) is not roas
+        assert cache.get("ltv_predictor", str(tmp_path)) is ltv
+        cache.invalidate()
+        assert cache.get("ltv_predictor", str(tmp_path)) is not ltv
+
+    def test_promotion_invalidates_process_cache(self, tmp_path):
+        from app.ml.retraining_pipeline import _notify_model_changed
+
+        _save_model(tmp_path)
+        cached = explainability.explainer_cache.get("roas_predictor", str(tmp_path))
+        _notify_model_changed("roas_predictor")
+        fresh = explainability.explainer_cache.get("roas_predictor", str(tmp_path))
+        assert fresh is not cached
+
+
 # =============================================================================
 # Convenience functions
 # =============================================================================
@@ -122,6 +245,14 @@ class TestConvenience:
         assert "summary" in result
         assert isinstance(result["top_positive_factors"], list)
 
+    def test_explain_roas_predictions(self):
+        results = explain_roas_predictions(
+            features=[{"ctr": 2.0}, {"roas_7d_avg": 4.0}],
+            predictions=[3.5, 1.5],
+            models_path="/tmp/nonexistent_models",
+        )
+        assert [r["prediction"] for r in results] == [3.5, 1.5]
+
     def test_get_model_feature_importance_empty_without_model(self):
         # no model, no feature_names -> empty importance dict
         importance = get_model_feature_importance(
@@ -0,0 +1,358 @@
+# =============================================================================
+# Stratum AI - CDP Identity Graph Resolver unit tests
+# =============================================================================
+"""Unit tests for app.services.cdp.identity_graph and the batched lookups in
+IdentityResolutionService.
+
+The resolver's statements run against in-memory SQLite; JSONB columns are
+compiled as plain JSON for the test database. The session double counts
+statements so the tests can pin that traversal costs a fixed number of
+queries per hop rather than per node.
+"""
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from itertools import pairwise
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from app.models.cdp import (
+    CDPCanonicalIdentity,
+    CDPConsent,
+    CDPEvent,
+    CDPIdentityLink,
+    CDPProfile,
+    CDPProfileIdentifier,
+    CDPProfileMerge,
+)
+from app.services.cdp.identity_graph import IdentityGraphResolver, UnionFind
+from app.services.cdp.identity_resolution import (
+    IdentityResolutionService,
+    resolve_identity_on_event,
+)
+
+pytestmark = pytest.mark.unit
+
+TENANT = 1
+NOW = datetime(2026, 3, 1, tzinfo=UTC)
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_as_json(type_, compiler, **kw):
+    return "JSON"
+
+
+class _AsyncSession:
+    """Just enough of AsyncSession for the resolver, counting statements."""
+
+    def __init__(self, session):
+        self._session = session
+        self.statements = 0
+
+    async def execute(self, statement):
+        self.statements += 1
+        return self._session.execute(statement)
+
+    async def flush(self):
+        self._session.flush()
+
+    async def refresh(self, instance, attribute_names=None):
+        self._session.refresh(instance, attribute_names)
+
+    def add(self, instance):
+        self._session.add(instance)
+
+    def add_all(self, instances):
+        self._session.add_all(instances)
+
+    def expunge(self, instance):
+        self._session.expunge(instance)
+
+
+MODELS = (
+    CDPProfile,
+    CDPProfileIdentifier,
+    CDPIdentityLink,
+    CDPEvent,
+    CDPConsent,
+    CDPCanonicalIdentity,
+    CDPProfileMerge,
+)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    CDPProfile.metadata.create_all(engine, tables=[m.__table__ for m in MODELS])
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def db(session):
+    return _AsyncSession(session)
+
+
+@pytest.fixture
+def service(db):
+    return IdentityResolutionService(db, TENANT)
+
+
+def _profile(session, events=0, age_days=0, **fields):
+    profile = CDPProfile(
+        id=uuid4(),
+        tenant_id=TENANT,
+        first_seen_at=NOW - timedelta(days=age_days),
+        last_seen_at=NOW - timedelta(days=age_days),
+        created_at=NOW - timedelta(days=age_days),
+        profile_data=fields.pop("profile_data", {}),
+        computed_traits={},
+        total_events=events,
+        total_revenue=Decimal("0"),
+        **fields,
+    )
+    session.add(profile)
+    session.flush()
+    return profile
+
+
+def _identifier(session, profile, identifier_type="anonymous_id"):
+    identifier = CDPProfileIdentifier(
+        id=uuid4(),
+        tenant_id=TENANT,
+        profile_id=profile.id,
+        identifier_type=identifier_type,
+        identifier_hash=uuid4().hex,
+    )
+    session.add(identifier)
+    session.flush()
+    return identifier
+
+
+def _link(session, source, target, is_active=True):
+    session.add(
+        CDPIdentityLink(
+            id=uuid4(),
+            tenant_id=TENANT,
+            source_identifier_id=source.id,
+            target_identifier_id=target.id,
+            is_active=is_active,
+        )
+    )
+    session.flush()
+
+
+def _consent(session, profile, consent_type, granted, updated_days_ago):
+    session.add(
+        CDPConsent(
+            id=uuid4(),
+            tenant_id=TENANT,
+            profile_id=profile.id,
+            consent_type=consent_type,
+            granted=granted,
+            updated_at=NOW - timedelta(days=updated_days_ago),
+        )
+    )
+    session.flush()
+
+
+# =============================================================================
+# Union-find
+# =============================================================================
+
+
+def test_union_find_groups_connected_nodes():
+    sets = UnionFind()
+    for a, b in [(1, 2), (3, 4), (2, 3), (5, 6)]:
+        sets.union(a, b)
+
+    groups = sorted(sorted(g) for g in sets.groups(range(1, 8)).values())
+
+    assert groups == [[1, 2, 3, 4], [5, 6], [7]]
+
+
+# =============================================================================
+# Graph loading
+# =============================================================================
+
+
+async def test_components_cost_queries_per_hop_not_per_node(session, db, service):
+    # A household: one device shared by twenty anonymous cookies
+    hub_profile = _profile(session)
+    device = _identifier(session, hub_profile, "device_id")
+    cookies = []
+    for _ in range(20):
+        cookie = _identifier(session, _profile(session))
+        _link(session, device, cookie)
+        cookies.append(cookie)
+    stranger = _identifier(session, _profile(session))
+    _link(session, stranger, _identifier(session, _profile(session)))
+    db.statements = 0
+
+    sets, identifiers = await IdentityGraphResolver(service).load_components(
+        [cookies[0].id]
+    )
+
+    assert set(identifiers) == {device.id, *(c.id for c in cookies)}
+    assert len({sets.find(i) for i in identifiers}) == 1
+    # cookie -> device -> the other cookies: three hops, three queries each
+    assert db.statements <= 9
+
+
+async def test_inactive_links_do_not_join_components(session, service):
+    a = _identifier(session, _profile(session))
+    b = _identifier(session, _profile(session))
+    _link(session, a, b, is_active=False)
+
+    _, identifiers = await IdentityGraphResolver(service).load_components([a.id])
+
+    assert set(identifiers) == {a.id}
+
+
+# =============================================================================
+# Merging
+# =============================================================================
+
+
+async def test_component_is_merged_into_strongest_profile(session, db, service):
+    anonymous = _profile(session, events=7, age_days=30, lifecycle_stage="anonymous")
+    known = _profile(session, events=2, age_days=5, lifecycle_stage="customer")
+    device = _profile(session, events=1, age_days=1, profile_data={"os": "ios"})
+    cookie = _identifier(session, anonymous)
+    email = _identifier(session, known, "email")
+    phone = _identifier(session, known, "phone")
+    fingerprint = _identifier(session, device, "device_id")
+    _link(session, cookie, email)
+    _link(session, fingerprint, phone)
+    session.add(
+        CDPCanonicalIdentity(
+            tenant_id=TENANT,
+            profile_id=known.id,
+            canonical_identifier_id=phone.id,
+            canonical_type="phone",
+            canonical_value_hash=phone.identifier_hash,
+            priority_score=70,
+        )
+    )
+    for profile in (anonymous, device):
+        session.add(
+            CDPEvent(
+                id=uuid4(),
+                tenant_id=TENANT,
+                profile_id=profile.id,
+                event_name="Page View",
+                event_time=NOW,
+                received_at=NOW,
+                properties={},
+            )
+        )
+    _consent(session, known, "email", granted=False, updated_days_ago=10)
+    _consent(session, anonymous, "email", granted=True, updated_days_ago=1)
+    _consent(session, device, "sms", granted=True, updated_days_ago=3)
+    survivor_id, merged_ids = known.id, {anonymous.id, device.id}
+
+    records = await IdentityGraphResolver(service).resolve([cookie.id])
+
+    assert {r.merged_profile_id for r in records} == merged_ids
+    assert {r.surviving_profile_id for r in records} == {survivor_id}
+    assert session.scalars(select(CDPProfile.id)).all() == [survivor_id]
+    assert set(session.scalars(select(CDPProfileIdentifier.profile_id))) == {
+        survivor_id
+    }
+    assert set(session.scalars(select(CDPEvent.profile_id))) == {survivor_id}
+    survivor = session.get(CDPProfile, survivor_id)
+    assert survivor.total_events == 10
+    assert survivor.lifecycle_stage == "customer"
+    assert survivor.profile_data == {"os": "ios"}
+    assert survivor.first_seen_at.date() == (NOW - timedelta(days=30)).date()
+    assert len(survivor.identifiers) == 4
+    # The newer consent decision wins; types only one side had move across
+    consents = {c.consent_type: c.granted for c in survivor.consents}
+    assert consents == {"email": True, "sms": True}
+    canonical = session.scalars(select(CDPCanonicalIdentity)).one()
+    assert (canonical.profile_id, canonical.canonical_type) == (survivor_id, "email")
+    assert canonical.priority_score == 80
+    assert len(session.scalars(select(CDPProfileMerge)).all()) == 2
+
+
+async def test_unconnected_profiles_are_left_alone(session, service):
+    a = _identifier(session, _profile(session))
+    b = _identifier(session, _profile(session))
+
+    assert await IdentityGraphResolver(service).resolve([a.id, b.id]) == []
+    assert len(session.scalars(select(CDPProfile)).all()) == 2
+
+
+async def test_event_resolution_links_and_merges(session, service, db):
+    first = _profile(session, events=3, age_days=10)
+    second = _profile(session, events=1)
+    cookie = _identifier(session, first)
+    email = _identifier(session, second, "email")
+
+    merge = await resolve_identity_on_event(db, TENANT, second, [cookie, email])
+
+    assert merge is not None
+    assert merge.surviving_profile_id == first.id
+    canonical = session.scalars(select(CDPCanonicalIdentity)).one()
+    assert (canonical.profile_id, canonical.canonical_type) == (first.id, "email")
+
+
+# =============================================================================
+# Batched lookups in IdentityResolutionService
+# =============================================================================
+
+
+async def test_link_identifiers_checks_existing_links_in_one_query(
+    session, db, service
+):
+    profile = _profile(session)
+    a, b, c = (_identifier(session, profile) for _ in range(3))
+    _link(session, b, a)  # the reverse direction already exists
+    db.statements = 0
+
+    created = await service.link_identifiers([a, b, c])
+
+    assert db.statements == 1
+    assert {
+        (link.source_identifier_id, link.target_identifier_id) for link in created
+    } == {
+        (a.id, c.id),
+        (b.id, c.id),
+    }
+
+
+async def test_linked_identifiers_query_once_per_depth(session, db, service):
+    profile = _profile(session)
+    chain = [_identifier(session, profile) for _ in range(5)]
+    for source, target in pairwise(chain):
+        _link(session, source, target)
+    db.statements = 0
+
+    linked = await service.get_linked_identifiers(chain[0].id, max_depth=3)
+
+    assert {i.id for i in linked} == {i.id for i in chain[:4]}
+    assert db.statements == 3 + 1
+
+
+async def test_resolve_profile_prefers_first_matching_identifier(session, db, service):
+    first = _profile(session)
+    second = _profile(session)
+    cookie = _identifier(session, first)
+    email = _identifier(session, second, "email")
+    db.statements = 0
+
+    profile = await service.resolve_profile(
+        [
+            {"type": "phone", "hash": "unknown"},
+            {"type": "email", "hash": email.identifier_hash},
+            {"type": "anonymous_id", "hash": cookie.identifier_hash},
+        ]
+    )
+
+    assert profile.id == second.id
+    assert db.statements == 2
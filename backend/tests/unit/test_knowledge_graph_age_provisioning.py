@@ -193,7 +193,7 @@ def test_migrations_have_exactly_one_head():
 
     heads = sorted(set(revisions) - referenced)
 
-    assert heads == [AGE_REVISION], f"expected a single head, found {heads}"
+    assert len(heads) == 1, f"expected a single head, found {heads}"
 
 
 # =============================================================================
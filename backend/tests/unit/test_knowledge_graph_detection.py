@@ -0,0 +1,305 @@
+# =============================================================================
+# Stratum AI - Knowledge Graph Problem Detection unit tests
+# =============================================================================
+"""Unit tests for app.services.knowledge_graph.detection and the shared
+lookups in KnowledgeGraphInsightsEngine.
+
+CI's Postgres has no AGE, so a fake graph client stands in for
+``KnowledgeGraphService.execute_cypher``: it answers each detector's query
+with canned rows and records which session ran it, which lets the tests pin
+that detectors run concurrently without ever sharing a session.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.services.knowledge_graph import (
+    KnowledgeGraphInsightsEngine,
+    KnowledgeGraphService,
+    ProblemCategory,
+    ProblemDetector,
+    ProblemSeverity,
+)
+
+pytestmark = pytest.mark.unit
+
+TENANT = 1
+
+BLOCKED = [
+    {
+        "action_type": "budget_increase",
+        "platform": "meta",
+        "decision": "block",
+        "action_count": 6,
+        "health_sum": 300,
+        "health_n": 6,
+    },
+    {
+        "action_type": "budget_increase",
+        "platform": "google",
+        "decision": "block",
+        "action_count": 4,
+        "health_sum": 240,
+        "health_n": 4,
+    },
+    {
+        "action_type": "pause_campaign",
+        "platform": "meta",
+        "decision": "block",
+        "action_count": 3,
+        "health_sum": 150,
+        "health_n": 2,
+    },
+    {
+        "action_type": "pause_campaign",
+        "platform": "meta",
+        "decision": "alert",
+        "action_count": 2,
+        "health_sum": None,
+        "health_n": 0,
+    },
+]
+
+SIGNALS = [
+    {
+        "source": "emq",
+        "platform": "meta",
+        "score_sum": 120,
+        "score_n": 3,
+        "min_score": 30,
+        "statuses": ["degraded"],
+    },
+    {
+        "source": "emq",
+        "platform": "google",
+        "score_sum": 270,
+        "score_n": 3,
+        "min_score": 85,
+        "statuses": ["ok"],
+    },
+    {
+        "source": "freshness",
+        "platform": "meta",
+        "score_sum": 180,
+        "score_n": 2,
+        "min_score": 85,
+        "statuses": ["ok"],
+    },
+]
+
+
+class FakeGraph:
+    """Answers the detectors' Cypher by the pattern each one matches."""
+
+    def __init__(self) -> None:
+        self.version = "1"
+        self.queries: list[str] = []
+        self.busy: set = set()
+        self.peak = 0
+        self.fail_on = None
+        self.answers = [
+            ("UNWIND recent", [{"recent_total": 50_000, "previous_total": 100_000, "change_pct": -0.5}]),
+            ("DROVE", [{"campaign": "Prospecting", "platform": "meta", "spend": 20_000, "revenue": 10_000, "roas": 0.5}]),
+            ("BLOCKED", BLOCKED),
+            ("TrustGate {", [{"blocked": 40, "passed": 20, "total": 60, "block_rate": 40 / 60}]),
+            ("Signal {", SIGNALS),
+            ("Segment {", []),
+            ("Channel {", []),
+        ]  # fmt: skip
+
+    async def run(self, session, cypher: str) -> list[dict]:
+        assert session not in self.busy, "two statements on one session"
+        self.busy.add(session)
+        self.peak = max(self.peak, len(self.busy))
+        self.queries.append(cypher)
+        await asyncio.sleep(0)
+        self.busy.discard(session)
+        if self.fail_on and self.fail_on in cypher:
+            raise RuntimeError("connection reset")
+        return next(rows for marker, rows in self.answers if marker in cypher)
+
+    def count(self, marker: str) -> int:
+        return sum(marker in q for q in self.queries)
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    graph = FakeGraph()
+
+    async def execute_cypher(service, cypher, tenant_id=None):
+        return await graph.run(service.session, cypher)
+
+    monkeypatch.setattr(KnowledgeGraphService, "execute_cypher", execute_cypher)
+    return graph
+
+
+class _Sessions:
+    def __init__(self) -> None:
+        self.opened = 0
+
+    @asynccontextmanager
+    async def open(self):
+        self.opened += 1
+        yield object()
+
+
+@pytest.fixture
+def sessions():
+    return _Sessions()
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture
+def detector(graph, sessions, clock):
+    async def version(db):
+        return graph.version
+
+    return ProblemDetector(
+        max_age_seconds=60,
+        session_factory=sessions.open,
+        version_fn=version,
+        clock=clock,
+    )
+
+
+# =============================================================================
+# Detection pass
+# =============================================================================
+
+
+async def test_detectors_share_lookups_and_run_concurrently(graph, sessions, detector):
+    problems = await detector.detect(None, TENANT)
+
+    assert [(p.category, p.severity) for p in problems] == [
+        (ProblemCategory.REVENUE_DECLINE, ProblemSeverity.CRITICAL),
+        (ProblemCategory.AUTOMATION_BLOCKED, ProblemSeverity.HIGH),
+        (ProblemCategory.SIGNAL_DEGRADED, ProblemSeverity.MEDIUM),
+        (ProblemCategory.TRUST_GATE_BOTTLENECK, ProblemSeverity.MEDIUM),
+    ]
+    # Three detectors read blocked automations and two read signals; each
+    # lookup runs once, for seven queries in all.
+    assert graph.count("BLOCKED") == 1
+    assert graph.count("Signal {") == 1
+    assert len(graph.queries) == 7
+    assert sessions.opened == 6
+    assert graph.peak > 1
+
+
+async def test_shared_lookups_regroup_exactly(graph, detector):
+    problems = {p.category: p for p in await detector.detect(None, TENANT)}
+
+    # Details keep only 'block' decisions, grouped by action and platform
+    assert problems[ProblemCategory.AUTOMATION_BLOCKED].affected_nodes == [
+        {"action_type": "budget_increase", "platform": "meta", "count": 6, "avg_health": 50.0},
+        {"action_type": "budget_increase", "platform": "google", "count": 4, "avg_health": 60.0},
+        {"action_type": "pause_campaign", "platform": "meta", "count": 3, "avg_health": 75.0},
+    ]  # fmt: skip
+    # Bottlenecks count every BLOCKED edge per action; averages skip nulls
+    assert problems[ProblemCategory.TRUST_GATE_BOTTLENECK].affected_nodes == [
+        {"action_type": "budget_increase", "blocked_count": 10, "avg_health_at_block": 54.0},
+        {"action_type": "pause_campaign", "blocked_count": 5, "avg_health_at_block": 75.0},
+    ]  # fmt: skip
+    signal = problems[ProblemCategory.SIGNAL_DEGRADED]
+    assert (signal.metrics["platform"], signal.metrics["avg_score"]) == ("meta", 40.0)
+    assert problems[ProblemCategory.REVENUE_DECLINE].root_cause_path == [
+        {
+            "node": "TrustGate",
+            "finding": "13 automations blocked",
+            "detail": "Avg signal health: 57.5%",
+        },
+        {"node": "Signal", "finding": "1 signal sources degraded", "detail": "Sources: emq"},
+        {"node": "Campaign", "finding": "1 campaigns with ROAS < 1.0", "detail": "Campaigns: Prospecting"},
+    ]  # fmt: skip
+
+
+async def test_engine_detects_the_same_problems_on_one_session(graph, detector):
+    concurrent = await detector.detect(None, TENANT)
+    graph.queries.clear()
+
+    sequential = await KnowledgeGraphInsightsEngine(object()).detect_all_problems(
+        TENANT
+    )
+
+    assert [p.to_dict() | {"detected_at": None} for p in sequential] == [
+        p.to_dict() | {"detected_at": None} for p in concurrent
+    ]
+    assert len(graph.queries) == 7
+
+
+async def test_unexpected_errors_propagate(graph, detector):
+    graph.fail_on = "Segment {"
+
+    with pytest.raises(RuntimeError, match="connection reset"):
+        await detector.detect(None, TENANT)
+
+
+# =============================================================================
+# Memoization
+# =============================================================================
+
+
+async def test_summary_and_details_reuse_one_pass(graph, detector):
+    problems = await detector.detect(None, TENANT)
+    queries = len(graph.queries)
+
+    summary = await detector.health_summary(None, TENANT)
+    detail = await detector.problem_details(None, TENANT, problems[1].id)
+
+    assert len(graph.queries) == queries
+    assert summary["total_problems"] == 4
+    assert summary["problem_counts"] == {
+        "critical": 1,
+        "high": 1,
+        "medium": 2,
+        "low": 0,
+    }
+    assert summary["health_score"] == 100 - 25 - 15 - 8 - 8
+    assert summary["status"] == "critical"
+    assert detail is problems[1]
+    assert await detector.problem_details(None, TENANT, "missing") is None
+
+
+async def test_a_graph_write_or_age_reruns_detection(graph, detector, clock):
+    await detector.detect(None, TENANT)
+    await detector.detect(None, TENANT, days=30)  # its own entry
+    assert len(graph.queries) == 14
+
+    graph.version = "2"
+    await detector.detect(None, TENANT)
+    assert len(graph.queries) == 21
+
+    clock.now = 61
+    await detector.detect(None, TENANT)
+    assert len(graph.queries) == 28
+
+
+async def test_concurrent_requests_share_one_pass(graph, detector):
+    results = await asyncio.gather(*(detector.detect(None, TENANT) for _ in range(5)))
+
+    assert len(graph.queries) == 7
+    assert all(len(r) == 4 for r in results)
+
+
+async def test_invalidate_drops_one_tenant(graph, detector):
+    await detector.detect(None, TENANT)
+    await detector.detect(None, 2)
+
+    detector.invalidate(TENANT)
+    await detector.detect(None, TENANT)
+    await detector.detect(None, 2)
+
+    assert len(graph.queries) == 21
@@ -0,0 +1,369 @@
+# =============================================================================
+# Stratum AI - Latency Sketch unit tests
+# =============================================================================
+"""Unit tests for app.services.latency_sketch.
+
+Covers exact/histogram quantile modes, merge semantics, JSON round-trips,
+the fixed-size time ring and its hourly roll-up tier, cross-worker merging
+through ConversionLatencyTracker.export_state / merge_state, and the
+Redis publish/read paths of LatencySketchStore (against in-memory stubs).
+"""
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.conversion_latency_service import (
+    ConversionLatencyTracker,
+    LatencySketchStore,
+)
+from app.services.latency_sketch import (
+    LatencySketch,
+    SketchRingBuffer,
+    TieredSketchRing,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+class TestLatencySketch:
+    def test_exact_mode_matches_sorted_index(self):
+        sketch = LatencySketch()
+        for v in range(1, 101):
+            sketch.add(float(v))
+        assert sketch.is_exact
+        assert sketch.quantile(0.75) == 76.0
+        assert sketch.quantile(0.99) == 100.0
+        assert sketch.median() == 50.5
+
+    def test_switches_to_bins_past_exact_limit(self):
+        sketch = LatencySketch(exact_limit=10)
+        for v in range(1, 12):
+            sketch.add(float(v))
+        assert not sketch.is_exact
+        assert sketch.count == 11
+
+    def test_histogram_quantiles_within_relative_accuracy(self):
+        rng = random.Random(7)
+        values = [rng.lognormvariate(6, 1.2) for _ in range(20000)]
+        sketch = LatencySketch(relative_accuracy=0.01)
+        for v in values:
+            sketch.add(v)
+        ordered = sorted(values)
+        for q in (0.5, 0.9, 0.95, 0.99):
+            expected = ordered[int(len(ordered) * q)]
+            assert sketch.quantile(q) == pytest.approx(expected, rel=0.02)
+
+    def test_bin_count_bounded(self):
+        sketch = LatencySketch(exact_limit=0, bin_limit=64)
+        for v in range(1, 100000, 7):
+            sketch.add(float(v))
+        assert len(sketch._bins) <= 64
+        assert sketch.max == 99996.0
+
+    def test_moments_exact_in_both_modes(self):
+        values = [float(v) for v in range(1, 501)]
+        sketch = LatencySketch(exact_limit=50)
+        for v in values:
+            sketch.add(v)
+        assert sketch.mean == pytest.approx(250.5)
+        assert sketch.std_dev == pytest.approx(144.4818, rel=1e-4)
+        assert sketch.min == 1.0 and sketch.max == 500.0
+
+    def test_merge_equals_single_sketch(self):
+        a, b, whole = LatencySketch(exact_limit=20), LatencySketch(), LatencySketch()
+        for v in range(1, 40):
+            a.add(float(v))
+            whole.add(float(v))
+        for v in range(40, 60):
+            b.add(float(v))
+            whole.add(float(v))
+        a.merge(b)
+        assert a.count == whole.count == 59
+        assert a.mean == pytest.approx(whole.mean)
+        assert a.std_dev == pytest.approx(whole.std_dev)
+        assert a.quantile(0.5) == pytest.approx(whole.quantile(0.5), rel=0.02)
+
+    def test_zero_latencies_counted(self):
+        sketch = LatencySketch(exact_limit=0)
+        sketch.add(0.0)
+        sketch.add(0.0)
+        sketch.add(10.0)
+        assert sketch.quantile(0.1) == 0.0
+        assert sketch.quantile(0.99) == pytest.approx(10.0, rel=0.01)
+
+    def test_json_round_trip(self):
+        sketch = LatencySketch(exact_limit=5)
+        for v in (3.0, 7.0, 11.0, 200.0, 5000.0, 9.0):
+            sketch.add(v)
+        restored = LatencySketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+        assert restored.count == sketch.count
+        assert restored.quantile(0.9) == sketch.quantile(0.9)
+        assert restored.std_dev == pytest.approx(sketch.std_dev)
+
+    def test_empty_sketch(self):
+        sketch = LatencySketch()
+        assert sketch.quantile(0.95) == 0.0
+        assert sketch.median() == 0.0
+        assert LatencySketch.from_dict(sketch.to_dict()).count == 0
+
+
+class TestSketchRingBuffer:
+    def test_slot_count_fixed(self):
+        ring = SketchRingBuffer(slot_minutes=60, retention_hours=24)
+        assert ring.num_slots == 24
+        now = _now()
+        for h in range(100):
+            ring.add(1.0, now - timedelta(hours=h))
+        assert len(ring._slots) == 24
+        assert ring.total_count() == 24
+
+    def test_stale_timestamp_dropped_after_wrap(self):
+        ring = SketchRingBuffer(slot_minutes=60, retention_hours=2)
+        now = _now()
+        assert ring.add(1.0, now)
+        # two hours earlier maps onto the same index but is older
+        assert not ring.add(1.0, now - timedelta(hours=2))
+
+    def test_merged_since_respects_cutoff(self):
+        ring = SketchRingBuffer(slot_minutes=5, retention_hours=168)
+        now = _now()
+        ring.add(100.0, now - timedelta(hours=30))
+        ring.add(500.0, now)
+        recent = ring.merged_since(now - timedelta(hours=24))
+        assert recent.count == 1
+        assert recent.mean == 500.0
+
+    def test_round_trip(self):
+        ring = SketchRingBuffer(slot_minutes=5, retention_hours=24)
+        ring.add(42.0, _now())
+        restored = SketchRingBuffer.from_dict(json.loads(json.dumps(ring.to_dict())))
+        assert restored.total_count() == 1
+
+
+class TestTieredSketchRing:
+    def test_week_costs_hourly_rollups_plus_fine_window(self):
+        ring = TieredSketchRing(slot_minutes=5, retention_hours=168, fine_hours=6)
+        assert ring.fine.num_slots == 72
+        assert ring.coarse.num_slots == 168
+
+    def test_recent_and_old_data_counted_once(self):
+        ring = TieredSketchRing(slot_minutes=5, retention_hours=168, fine_hours=6)
+        now = _now()
+        for minutes in range(0, 48 * 60, 5):
+            ring.add(float(minutes), now - timedelta(minutes=minutes))
+
+        merged = ring.merged_since(now - timedelta(hours=168), now)
+
+        assert merged.count == ring.total_count() == 48 * 12
+
+    def test_recent_window_keeps_fine_resolution(self):
+        ring = TieredSketchRing(slot_minutes=5, retention_hours=168, fine_hours=6)
+        now = _now()
+        ring.add(100.0, now - timedelta(minutes=50))
+        ring.add(500.0, now - timedelta(minutes=5))
+
+        recent = ring.merged_since(now - timedelta(minutes=20), now)
+
+        assert recent.count == 1
+        assert recent.mean == 500.0
+
+    def test_old_data_served_from_rollup(self):
+        ring = TieredSketchRing(slot_minutes=5, retention_hours=168, fine_hours=6)
+        now = _now()
+        ring.add(100.0, now - timedelta(hours=30))
+        ring.add(500.0, now)
+
+        starts = [start for start, _ in ring.sketches_since(now - timedelta(hours=48))]
+
+        assert len(starts) == 2
+        assert starts[0].minute == 0  # hourly roll-up slot
+        assert ring.merged_since(now - timedelta(hours=24), now).mean == 500.0
+
+    def test_merge_and_round_trip(self):
+        a, b = TieredSketchRing(), TieredSketchRing()
+        now = _now()
+        a.add(10.0, now)
+        b.add(30.0, now - timedelta(hours=12))
+        a.merge(TieredSketchRing.from_dict(json.loads(json.dumps(b.to_dict()))))
+
+        merged = a.merged_since(now - timedelta(hours=24), now)
+
+        assert merged.count == 2
+        assert merged.mean == 20.0
+
+    def test_rollup_must_align_with_slots(self):
+        with pytest.raises(ValueError):
+            TieredSketchRing(slot_minutes=7, rollup_minutes=60)
+
+
+class TestTrackerCrossWorkerMerge:
+    def test_export_merge_combines_workers(self):
+        worker_a, worker_b = ConversionLatencyTracker(), ConversionLatencyTracker()
+        for v in range(1, 51):
+            worker_a.record_latency("meta", "send_to_ack", float(v))
+        for v in range(51, 101):
+            worker_b.record_latency("meta", "send_to_ack", float(v))
+
+        combined = ConversionLatencyTracker()
+        combined.merge_state(json.loads(json.dumps(worker_a.export_state())))
+        combined.merge_state(json.loads(json.dumps(worker_b.export_state())))
+
+        stats = combined.get_stats("meta", "send_to_ack")
+        assert stats.count == 100
+        assert stats.avg_ms == 50.5
+        assert stats.p95_ms == pytest.approx(96.0, rel=0.02)
+
+    def test_memory_bounded_under_load(self):
+        tracker = ConversionLatencyTracker(max_recent_measurements=100)
+        for i in range(5000):
+            tracker.record_latency("meta", "send_to_ack", float(i % 997))
+        assert len(tracker._measurements) == 100
+        assert tracker.get_stats("meta", "send_to_ack").count == 5000
+        assert tracker.get_diagnostics()["total_measurements"] == 5000
+
+
+class _SyncPipeline:
+    def __init__(self, client):
+        self._client = client
+        self._calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+
+        return queue
+
+    def execute(self):
+        for name, args, kwargs in self._calls:
+            self._client.calls.append(name)
+            getattr(self._client, name)(*args, **kwargs)
+
+
+class _SyncRedis:
+    def __init__(self):
+        self.values = {}
+        self.members = set()
+        self.calls = []
+
+    def pipeline(self, transaction=True):
+        return _SyncPipeline(self)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    def expire(self, key, seconds):
+        pass
+
+    def sadd(self, key, member):
+        self.members.add(member)
+
+
+class _AsyncRedis:
+    def __init__(self, sync):
+        self._sync = sync
+
+    async def smembers(self, key):
+        return set(self._sync.members)
+
+    async def mget(self, keys):
+        return [self._sync.values.get(key) for key in keys]
+
+    async def srem(self, key, member):
+        self._sync.members.discard(member)
+
+
+def _store(redis, worker_id="w-local"):
+    store = LatencySketchStore(
+        redis_url="redis://unused",
+        worker_id=worker_id,
+        publish_interval_seconds=0,
+    )
+    store._sync_redis = redis
+    store._redis = _AsyncRedis(redis)
+    return store
+
+
+class TestLatencySketchStore:
+    def test_publish_skips_serializing_unchanged_state(self):
+        redis = _SyncRedis()
+        store = _store(redis)
+        tracker = ConversionLatencyTracker()
+        tracker.record_latency("meta", "send_to_ack", 10.0)
+
+        assert store.publish_if_changed(tracker)
+        assert store.publish_if_changed(tracker)
+        tracker.record_latency("meta", "send_to_ack", 20.0)
+        assert store.publish_if_changed(tracker)
+
+        assert [c for c in redis.calls if c != "sadd"] == ["set", "expire", "set"]
+
+    async def test_read_merges_peers_and_local_without_publishing(self):
+        redis = _SyncRedis()
+        peer_tracker = ConversionLatencyTracker()
+        peer_tracker.record_latency("meta", "send_to_ack", 30.0)
+        _store(redis, worker_id="w-peer").publish_if_changed(peer_tracker)
+        redis.calls.clear()
+
+        store = _store(redis)
+        local = ConversionLatencyTracker()
+        local.record_latency("meta", "send_to_ack", 10.0)
+        # a stale copy of our own state must not be double counted
+        redis.values[f"{store.KEY_PREFIX}w-local"] = json.dumps(local.export_state())
+        redis.members.add("w-local")
+
+        merged = await store.merged_tracker(local=local)
+
+        stats = merged.get_stats("meta", "send_to_ack")
+        assert stats.count == 2
+        assert stats.avg_ms == 20.0
+        assert redis.calls == []
+
+    async def test_merged_result_cached_and_expired_workers_dropped(self):
+        redis = _SyncRedis()
+        redis.members.add("w-gone")
+        store = _store(redis)
+
+        first = await store.merged_tracker(local=ConversionLatencyTracker())
+        second = await store.merged_tracker(local=ConversionLatencyTracker())
+
+        assert first is second
+        assert "w-gone" not in redis.members
+
+    def test_publisher_started_once_per_process(self, monkeypatch):
+        started = []
+
+        class _Thread:
+            def __init__(self, target, args, name, daemon):
+                started.append(args)
+
+            def start(self):
+                pass
+
+        monkeypatch.setattr(
+            "app.services.conversion_latency_service.threading.Thread", _Thread
+        )
+        monkeypatch.setattr(
+            "app.services.conversion_latency_service.atexit.register",
+            lambda *args: None,
+        )
+        store = LatencySketchStore(
+            redis_url="redis://unused", publish_interval_seconds=30
+        )
+        tracker = ConversionLatencyTracker()
+        store.attach(tracker)
+
+        tracker.record_latency("meta", "send_to_ack", 1.0)
+        tracker.record_latency("meta", "send_to_ack", 2.0)
+        assert len(started) == 1
+
+        # a forked child sees a new PID and starts its own publisher
+        store._publisher_pid = -1
+        tracker.record_latency("meta", "send_to_ack", 3.0)
+        assert len(started) == 2
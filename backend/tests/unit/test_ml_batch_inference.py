@@ -0,0 +1,156 @@
+# =============================================================================
+# Stratum AI - Batch inference tests
+# =============================================================================
+"""
+predict_many scores a whole batch of feature rows with one sklearn call and
+must agree row-for-row with the single-row predict path.
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+
+from app.ml.inference import LocalInferenceStrategy, ModelUnavailableError
+from app.workers.tasks.ml import _campaign_feature_frame
+
+pytestmark = pytest.mark.unit
+
+FEATURES = ["spend", "clicks", "ctr"]
+
+
+def _save(tmp_path, name, model, features=FEATURES):
+    joblib.dump(model, tmp_path / f"{name}.pkl")
+    (tmp_path / f"{name}_metadata.json").write_text(
+        json.dumps({"version": "2.1.0", "features": features})
+    )
+
+
+@pytest.fixture
+def rows():
+    rng = np.random.default_rng(7)
+    return pd.DataFrame(rng.random((40, 3)) * 100, columns=FEATURES)
+
+
+@pytest.fixture
+def regressor(tmp_path, rows):
+    model = RandomForestRegressor(n_estimators=5, random_state=0)
+    model.fit(rows.to_numpy(), rows["spend"] / 10)
+    _save(tmp_path, "roas_predictor", model)
+    return LocalInferenceStrategy(models_path=str(tmp_path))
+
+
+class CountingModel:
+    """Wraps a model and counts predict() calls."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.calls = 0
+
+    def predict(self, X):
+        self.calls += 1
+        return self.inner.predict(X)
+
+
+async def test_matches_single_row_predictions(regressor, rows):
+    batch = await regressor.predict_many("roas_predictor", rows)
+
+    singles = [
+        (await regressor.predict("roas_predictor", r))["value"]
+        for r in rows.to_dict(orient="records")
+    ]
+    assert batch["values"] == pytest.approx(singles)
+    assert batch["model_version"] == "2.1.0"
+    assert set(batch["feature_importances"]) == set(FEATURES)
+
+
+async def test_scores_batch_in_one_model_call(regressor, rows):
+    model = regressor._load_model("roas_predictor")
+    counting = CountingModel(model)
+    regressor._models["roas_predictor"] = counting
+
+    batch = await regressor.predict_many("roas_predictor", rows)
+
+    assert counting.calls == 1
+    assert len(batch["values"]) == len(rows)
+
+
+async def test_dataframe_columns_reordered_and_missing_filled(regressor, rows):
+    shuffled = rows[["ctr", "spend"]].assign(extra="ignored")
+    expected = rows.assign(clicks=0)[FEATURES].to_numpy()
+
+    batch = await regressor.predict_many("roas_predictor", shuffled)
+
+    model = regressor._load_model("roas_predictor")
+    assert batch["values"] == pytest.approx(model.predict(expected).tolist())
+
+
+async def test_ndarray_rows_in_feature_order(regressor, rows):
+    from_frame = await regressor.predict_many("roas_predictor", rows)
+    from_array = await regressor.predict_many("roas_predictor", rows.to_numpy())
+
+    assert from_array["values"] == pytest.approx(from_frame["values"])
+
+
+async def test_ndarray_with_wrong_width_is_rejected(regressor):
+    with pytest.raises(ModelUnavailableError):
+        await regressor.predict_many("roas_predictor", np.ones((3, 5)))
+
+
+async def test_empty_batch_returns_no_values(regressor):
+    batch = await regressor.predict_many("roas_predictor", pd.DataFrame())
+    assert batch["values"] == []
+
+
+async def test_classifier_confidences_per_row(tmp_path, rows):
+    model = RandomForestClassifier(n_estimators=5, random_state=0)
+    model.fit(rows.to_numpy(), (rows["ctr"] > 50).astype(int))
+    _save(tmp_path, "converter", model)
+    strategy = LocalInferenceStrategy(models_path=str(tmp_path))
+
+    batch = await strategy.predict_many("converter", rows)
+
+    assert len(batch["confidences"]) == len(rows)
+    assert all(0.5 <= c <= 1.0 for c in batch["confidences"])
+
+
+async def test_missing_model_raises(tmp_path, rows):
+    strategy = LocalInferenceStrategy(models_path=str(tmp_path))
+    with pytest.raises(ModelUnavailableError):
+        await strategy.predict_many("nope", rows)
+
+
+async def test_hot_cache_skips_file_stat(regressor, rows):
+    await regressor.predict_many("roas_predictor", rows)
+
+    with patch("pathlib.Path.stat", side_effect=AssertionError("stat called")):
+        await regressor.predict_many("roas_predictor", rows)
+        await regressor.predict("roas_predictor", {"spend": 1.0})
+
+
+def test_campaign_feature_frame_uses_training_features():
+    campaigns = [
+        SimpleNamespace(
+            id=i,
+            platform=SimpleNamespace(value="meta"),
+            objective="conversions",
+            total_spend_cents=10_000 * i,
+            revenue_cents=30_000 * i,
+            impressions=1_000 * i,
+            clicks=20 * i,
+            conversions=2 * i,
+        )
+        for i in (1, 2)
+    ]
+
+    frame = _campaign_feature_frame(campaigns)
+
+    assert list(frame["campaign_id"]) == [1, 2]
+    assert list(frame["platform_meta"]) == [1, 1]
+    assert frame["log_spend"].iloc[1] == pytest.approx(np.log1p(200.0))
+    assert frame["roas"].tolist() == [3.0, 3.0]
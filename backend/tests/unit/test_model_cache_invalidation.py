@@ -4,7 +4,8 @@
 """
 ModelRegistry is a process-wide singleton, so a model cached in memory was
 served for the life of the process even after a retrain promoted a new .pkl to
-disk. _load_model now reloads when the file's mtime changes.
+disk. _load_model now reloads when the file's mtime changes, checking the file
+at most once per revalidation window unless the cache is invalidated.
 """
 
 import os
@@ -29,7 +30,7 @@ def test_serves_cache_when_file_unchanged(tmp_path):
 
 
 def test_reloads_when_file_mtime_changes(tmp_path):
-    reg = LocalInferenceStrategy(models_path=str(tmp_path))
+    reg = LocalInferenceStrategy(models_path=str(tmp_path), revalidate_seconds=0)
     f = tmp_path / "m.pkl"
     joblib.dump({"v": 1}, f)
     assert reg._load_model("m") == {"v": 1}
@@ -51,3 +52,32 @@ def test_missing_file_keeps_previous_copy(tmp_path):
     f.unlink()  # file vanishes mid-run
     # Still serves the previously loaded copy rather than returning None.
     assert reg._load_model("m") is first
+
+
+def _promote(f, payload):
+    joblib.dump(payload, f)
+    st = f.stat()
+    os.utime(f, (st.st_atime, st.st_mtime + 10))
+
+
+def test_no_disk_check_within_revalidation_window(tmp_path):
+    reg = LocalInferenceStrategy(models_path=str(tmp_path), revalidate_seconds=3600)
+    f = tmp_path / "m.pkl"
+    joblib.dump({"v": 1}, f)
+    first = reg._load_model("m")
+
+    _promote(f, {"v": 2})
+    # Hot path: the cached model is served without touching the file.
+    assert reg._load_model("m") is first
+
+
+def test_invalidate_forces_reload(tmp_path):
+    reg = LocalInferenceStrategy(models_path=str(tmp_path), revalidate_seconds=3600)
+    f = tmp_path / "m.pkl"
+    joblib.dump({"v": 1}, f)
+    reg._load_model("m")
+
+    _promote(f, {"v": 2})
+    reg.invalidate("m")
+
+    assert reg._load_model("m") == {"v": 2}
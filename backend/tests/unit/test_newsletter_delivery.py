@@ -0,0 +1,316 @@
+# =============================================================================
+# Stratum AI - Newsletter Delivery Pipeline unit tests
+# =============================================================================
+"""Unit tests for app.services.newsletter_delivery and the keyset paging in
+app.workers.newsletter_tasks.
+
+The compiled template is checked against a reference copy of the original
+per-recipient personalize -> track -> footer pipeline. SMTP is replaced by
+a recording stand-in (plus a real aiosmtpd server when it is installed).
+"""
+
+import base64
+import re
+import smtplib
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from urllib.parse import quote
+
+import pytest
+from sqlalchemy import Integer, create_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from app.services.newsletter_delivery import (
+    MESSAGES_PER_SESSION,
+    CompiledNewsletter,
+    NewsletterSender,
+    OutgoingNewsletter,
+    SmtpSessionPool,
+    TokenBucket,
+    unsubscribe_url_for,
+)
+from app.workers.newsletter_tasks import _iter_subscriber_batches
+
+pytestmark = pytest.mark.unit
+
+BASE = "https://app.example.com"
+
+
+def _reference(html, campaign_id, subscriber_id, email, name, company):
+    """The per-recipient pipeline the compiled template replaces."""
+    html = html.replace("{{email}}", email)
+    html = html.replace("{{first_name}}", (name or "").split(" ")[0] or "there")
+    html = html.replace("{{full_name}}", name or "")
+    html = html.replace("{{company_name}}", company or "")
+
+    pixel_url = f"{BASE}/api/v1/newsletter/track/open/{campaign_id}/{subscriber_id}"
+    pixel = (
+        f'<img src="{pixel_url}" width="1" height="1" style="display:none" alt="" />'
+    )
+    html = (
+        html.replace("</body>", f"{pixel}</body>")
+        if "</body>" in html
+        else html + pixel
+    )
+
+    def rewrite(match):
+        href = match.group(1)
+        if href.startswith(("mailto:", "tel:", "#")) or "/newsletter/track/" in href:
+            return match.group(0)
+        return (
+            f'href="{BASE}/api/v1/newsletter/track/click/{campaign_id}/'
+            f'{subscriber_id}?url={quote(href, safe="")}"'
+        )
+
+    html = re.sub(r'href="([^"]+)"', rewrite, html)
+
+    token = base64.urlsafe_b64encode(f"{campaign_id}:{subscriber_id}".encode()).decode()
+    unsubscribe_url = f"{BASE}/api/v1/newsletter/unsubscribe?token={token}"
+    footer = f"""
+    <div style="margin-top:40px;padding-top:20px;border-top:1px solid rgba(255,255,255,0.1);text-align:center;font-size:12px;color:#86868b;">
+        <p>You received this because you subscribed at stratumai.app</p>
+        <p>&copy; {datetime.now().year} Stratum AI &bull;
+        <a href="{unsubscribe_url}" style="color:#00c7be;text-decoration:underline;">Unsubscribe</a></p>
+    </div>
+    """
+    html = (
+        html.replace("</body>", f"{footer}</body>")
+        if "</body>" in html
+        else html + footer
+    )
+    text = re.sub(r"\s+", " ", re.sub(r"<[^>]+>", "", html)).strip()
+    return html, text, unsubscribe_url
+
+
+CAMPAIGN_HTML = (
+    "<html><body><h1>Hi {{first_name}}</h1>"
+    '<p>{{company_name}} &mdash; <a href="https://shop.example.com/?e={{email}}&x=1">'
+    'Shop</a> or <a href="mailto:help@example.com">mail us</a>'
+    ' <a href="#top">top</a></p></body></html>'
+)
+
+
+class TestCompiledNewsletter:
+    @pytest.mark.parametrize(
+        "html",
+        [CAMPAIGN_HTML, "<p>No body tag, <a href='x'>single</a> {{full_name}}</p>"],
+    )
+    @pytest.mark.parametrize(
+        "name,company",
+        [("Ada Lovelace", "Analytical & Co"), (None, None), ("", "Acme")],
+    )
+    def test_matches_per_recipient_pipeline(self, html, name, company):
+        compiled = CompiledNewsletter.compile(html, 7, BASE)
+        email = "ada+news@example.com"
+
+        expected_html, expected_text, _ = _reference(html, 7, 42, email, name, company)
+        values = CompiledNewsletter.slot_values(
+            42, email, name, company, unsubscribe_url_for(BASE, 7, 42)
+        )
+
+        assert compiled.render_html(values) == expected_html
+        assert compiled.render_text(values) == expected_text
+
+    def test_personalization_in_links_is_url_quoted(self):
+        compiled = CompiledNewsletter.compile(CAMPAIGN_HTML, 7, BASE)
+        html = compiled.render_html(
+            CompiledNewsletter.slot_values(1, "a+b@x.io", "A", "C", "u")
+        )
+        assert quote("?e=a+b@x.io&x=1", safe="") in html
+        assert 'href="mailto:help@example.com"' in html
+
+
+class TestTokenBucket:
+    def test_paces_to_rate_after_burst(self):
+        bucket = TokenBucket(rate=100, capacity=1)
+        started = time.monotonic()
+        for _ in range(11):
+            bucket.acquire()
+        assert time.monotonic() - started >= 0.09
+
+
+class _FakeSMTP:
+    """Records connections and messages; can drop once to test reconnects."""
+
+    instances = []
+    lock = threading.Lock()
+
+    def __init__(self, host, port, **kwargs):
+        self.sent = []
+        self.logged_in = False
+        self.fail_next = False
+        with self.lock:
+            self.instances.append(self)
+
+    def starttls(self, context=None):
+        pass
+
+    def login(self, user, password):
+        self.logged_in = True
+
+    def sendmail(self, from_addr, to_addr, message):
+        if self.fail_next:
+            self.fail_next = False
+            raise smtplib.SMTPServerDisconnected("idle timeout")
+        self.sent.append(to_addr)
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def fake_smtp():
+    _FakeSMTP.instances = []
+    return _FakeSMTP
+
+
+def _pool(fake_smtp, size=2):
+    return SmtpSessionPool(
+        "localhost", 25, "user", "pass", size=size, smtp_factory=fake_smtp
+    )
+
+
+class TestSmtpSessionPool:
+    def test_sessions_are_reused_across_messages(self, fake_smtp):
+        with _pool(fake_smtp, size=1) as pool:
+            for i in range(20):
+                assert pool.send("from@x.io", f"r{i}@x.io", "msg")
+
+        assert len(fake_smtp.instances) == 1
+        assert fake_smtp.instances[0].logged_in
+        assert len(fake_smtp.instances[0].sent) == 20
+
+    def test_reconnects_when_server_drops(self, fake_smtp):
+        with _pool(fake_smtp, size=1) as pool:
+            pool.send("from@x.io", "a@x.io", "msg")
+            fake_smtp.instances[0].fail_next = True
+            assert pool.send("from@x.io", "b@x.io", "msg")
+
+        assert len(fake_smtp.instances) == 2
+        assert fake_smtp.instances[1].sent == ["b@x.io"]
+
+    def test_session_recycled_after_message_cap(self, fake_smtp, monkeypatch):
+        monkeypatch.setattr("app.services.newsletter_delivery.MESSAGES_PER_SESSION", 3)
+        with _pool(fake_smtp, size=1) as pool:
+            for i in range(7):
+                pool.send("from@x.io", f"r{i}@x.io", "msg")
+
+        assert [len(s.sent) for s in fake_smtp.instances] == [3, 3, 1]
+        assert MESSAGES_PER_SESSION == 500
+
+
+def _email_service(**overrides):
+    service = SimpleNamespace(
+        _sg=None,
+        user=None,
+        password=None,
+        host="localhost",
+        port=25,
+        use_tls=False,
+        use_ssl=False,
+        from_address="noreply@x.io",
+        sent=[],
+    )
+    service._send_email = lambda to, message: service.sent.append(to) or True
+    service.__dict__.update(overrides)
+    return service
+
+
+def _outgoing(n):
+    return [
+        OutgoingNewsletter(i, f"r{i}@x.io", SimpleNamespace(as_string=lambda: "m"))
+        for i in range(n)
+    ]
+
+
+class TestNewsletterSender:
+    def test_fans_out_over_bounded_pool(self, fake_smtp):
+        pool = _pool(fake_smtp, size=3)
+        with NewsletterSender(
+            _email_service(), concurrency=3, rate_per_second=0, pool=pool
+        ) as sender:
+            results = sender.send_all(_outgoing(60))
+
+        assert results == [True] * 60
+        assert len(fake_smtp.instances) <= 3
+        assert sum(len(s.sent) for s in fake_smtp.instances) == 60
+
+    def test_builds_smtp_pool_from_email_service(self, fake_smtp):
+        service = _email_service(user="u", password="p")
+        with NewsletterSender(service, concurrency=2, rate_per_second=0) as sender:
+            assert sender._pool is not None
+            assert sender._pool.size == 2
+            sender._pool.smtp_factory = fake_smtp
+            assert sender.send_all(_outgoing(4)) == [True] * 4
+        assert service.sent == []
+
+    def test_falls_back_to_email_service_without_smtp(self):
+        service = _email_service(_sg=object())
+        with NewsletterSender(service, concurrency=2, rate_per_second=0) as sender:
+            assert sender.send_all(_outgoing(5)) == [True] * 5
+        assert sorted(service.sent) == [f"r{i}@x.io" for i in range(5)]
+
+    def test_failed_send_reported_not_raised(self, fake_smtp):
+        class _Rejecting(_FakeSMTP):
+            def sendmail(self, from_addr, to_addr, message):
+                raise smtplib.SMTPRecipientsRefused({to_addr: (550, b"no")})
+
+        pool = _pool(_Rejecting, size=1)
+        with NewsletterSender(
+            _email_service(), concurrency=1, rate_per_second=0, pool=pool
+        ) as sender:
+            assert sender.send_all(_outgoing(2)) == [False, False]
+
+
+def test_real_smtp_server_receives_every_message():
+    aiosmtpd = pytest.importorskip("aiosmtpd.controller")
+
+    received = []
+
+    class _Handler:
+        async def handle_DATA(self, server, session, envelope):
+            received.extend(envelope.rcpt_tos)
+            return "250 OK"
+
+    controller = aiosmtpd.Controller(_Handler(), hostname="127.0.0.1", port=0)
+    controller.start()
+    try:
+        pool = SmtpSessionPool(
+            "127.0.0.1", controller.server.sockets[0].getsockname()[1], use_tls=False
+        )
+        with NewsletterSender(
+            _email_service(), concurrency=2, rate_per_second=0, pool=pool
+        ) as sender:
+            assert all(sender.send_all(_outgoing(25)))
+    finally:
+        controller.stop()
+
+    assert sorted(received) == sorted(f"r{i}@x.io" for i in range(25))
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class _Subscriber(_Base):
+    __tablename__ = "subscribers"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    score: Mapped[int] = mapped_column(Integer)
+
+
+def test_keyset_batches_cover_filtered_rows_once():
+    engine = create_engine("sqlite://")
+    _Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all(_Subscriber(id=i, score=i % 3) for i in range(1, 26))
+        db.commit()
+        query = db.query(_Subscriber).filter(_Subscriber.score > 0)
+
+        batches = list(_iter_subscriber_batches(query, _Subscriber, batch_size=4))
+
+    ids = [s.id for batch in batches for s in batch]
+    assert ids == [i for i in range(1, 26) if i % 3]
+    assert all(len(batch) <= 4 for batch in batches)
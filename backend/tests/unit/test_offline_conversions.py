@@ -4,7 +4,8 @@
 """Unit tests for app.services.offline_conversion_service.
 
 Covers the pure logic only — PII hashing, per-platform payload
-formatting, CSV parsing, batch bookkeeping, the credential-guard
+formatting, CSV parsing, streamed chunked CSV uploads (with a recording
+uploader stub), batch bookkeeping, the credential-guard
 early-return paths of the uploaders (no HTTP is issued), and the P0
 enhancements (match-rate predictor, data-quality scorer, platform
 reconciler).
@@ -12,7 +13,9 @@ reconciler).
 
 import asyncio
 import hashlib
+import io
 from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
 
 import pytest
 
@@ -27,6 +30,7 @@ from app.services.offline_conversion_service import (
     OfflineConversionStatus,
     PlatformReconciler,
     TikTokOfflineUploader,
+    UploadResult,
 )
 
 pytestmark = pytest.mark.unit
@@ -258,14 +262,249 @@ class TestServiceBatches:
 
     def test_history_and_listing_filters(self):
         svc = OfflineConversionService()
-        asyncio.run(svc.upload_conversions([_conversion()], "meta"))
-        asyncio.run(svc.upload_conversions([_conversion(platform="tiktok")], "tiktok"))
+        asyncio.run(svc.upload_conversions([_conversion()], "meta", tenant_id="t1"))
+        asyncio.run(
+            svc.upload_conversions(
+                [_conversion(platform="tiktok")], "tiktok", tenant_id="t1"
+            )
+        )
         assert len(svc.get_upload_history()) == 2
         assert len(svc.get_upload_history(platform="meta")) == 1
         failed = svc.list_batches("t1", status="failed")
         assert len(failed) == 2
         assert svc.list_batches("t1", platform="tiktok")[0]["platform"] == "tiktok"
 
+    def test_batches_scoped_to_tenant(self):
+        svc = OfflineConversionService()
+        result = asyncio.run(
+            svc.upload_conversions([_conversion()], "meta", tenant_id="t1")
+        )
+        assert svc.list_batches("t2") == []
+        assert svc.get_batch_status(result.batch_id, tenant_id="t2") is None
+        assert svc.get_batch_status(result.batch_id, tenant_id="t1") is not None
+
+
+# =============================================================================
+# Streaming CSV upload
+# =============================================================================
+class _RecordingUploader(MetaOfflineUploader):
+    """Meta uploader stub that records chunks instead of calling the API."""
+
+    def __init__(self, fail_chunks=(), raise_chunks=()):
+        super().__init__()
+        self.chunks = []
+        self.fail_chunks = set(fail_chunks)
+        self.raise_chunks = set(raise_chunks)
+
+    async def upload(self, conversions):
+        index = len(self.chunks)
+        self.chunks.append(conversions)
+        if index in self.raise_chunks:
+            raise ConnectionError("platform unreachable")
+        ok = index not in self.fail_chunks
+        return UploadResult(
+            batch_id="",
+            platform="meta",
+            success=ok,
+            total_records=len(conversions),
+            successful_records=len(conversions) if ok else 0,
+            failed_records=0 if ok else len(conversions),
+            errors=[] if ok else [{"message": "boom"}],
+        )
+
+
+def _stream_service(uploader):
+    svc = OfflineConversionService()
+    svc._uploaders["meta"] = uploader
+    return svc
+
+
+class TestStreamingCsvUpload:
+    CSV = (
+        "email,phone,first_name,value,date,order_id\n"
+        '  User@Example.COM ,+1 555-123-4567,Ada,"$1,234.56",2026-01-15,o1\n'
+        ",,,5,2026-01-15,o2\n"
+        "user@example.com,,,7,06/15/2026,o3\n"
+        "z@y.com,,,bad,not_a_date,o4\n"
+    )
+
+    def test_chunks_and_progress_recorded(self):
+        uploader = _RecordingUploader()
+        svc = _stream_service(uploader)
+        result = asyncio.run(
+            svc.upload_csv_stream(io.StringIO(self.CSV), "meta", {}, chunk_rows=2)
+        )
+        assert result.success is True
+        assert result.total_records == 3
+        assert [len(c) for c in uploader.chunks] == [1, 2]
+
+        status = svc.get_batch_status(result.batch_id)
+        assert status["status"] == OfflineConversionStatus.UPLOADED.value
+        assert status["skipped_records"] == 1
+        assert status["chunks_completed"] == 2
+        assert [c["records"] for c in status["chunks"]] == [1, 2]
+
+    def test_pii_hashed_to_uploader_rules(self):
+        uploader = _RecordingUploader()
+        svc = _stream_service(uploader)
+        asyncio.run(svc.upload_csv_stream(io.StringIO(self.CSV), "meta", {}))
+        first, second, _third = uploader.chunks[0]
+        reference = MetaOfflineUploader()
+        assert first.email == reference._hash_email("user@example.com")
+        assert second.email == first.email  # same normalized value, same digest
+        assert first.phone == reference._hash_phone("+1 555-123-4567")
+        assert first.first_name == reference._hash_name("Ada")
+        # hashed values pass through the uploader unchanged
+        event = uploader._format_conversion(first)
+        assert event["match_keys"]["em"] == [first.email]
+        assert event["match_keys"]["fn"] == [first.first_name]
+
+    def test_values_dates_and_row_numbers_parsed(self):
+        uploader = _RecordingUploader()
+        svc = _stream_service(uploader)
+        asyncio.run(svc.upload_csv_stream(io.StringIO(self.CSV), "meta", {}))
+        first, second, third = uploader.chunks[0]
+        assert first.conversion_value == 1234.56
+        assert first.event_time == datetime(2026, 1, 15, tzinfo=timezone.utc)
+        assert second.event_time == datetime(2026, 6, 15, tzinfo=timezone.utc)
+        assert third.conversion_value == 0.0
+        assert third.event_time is None
+        assert first.event_name == "Purchase"
+        assert [c.conversion_id.split("_")[1] for c in (first, second, third)] == [
+            "0",
+            "2",
+            "3",
+        ]
+        assert third.source == OfflineConversionSource.CSV_UPLOAD
+
+    def test_failed_chunk_marks_batch_partial(self):
+        uploader = _RecordingUploader(fail_chunks={1})
+        svc = _stream_service(uploader)
+        result = asyncio.run(
+            svc.upload_csv_stream(io.StringIO(self.CSV), "meta", {}, chunk_rows=2)
+        )
+        assert result.success is False
+        assert result.successful_records == 1
+        assert result.failed_records == 2
+        status = svc.get_batch_status(result.batch_id)
+        assert status["status"] == OfflineConversionStatus.PARTIAL.value
+        assert status["chunks"][1]["status"] == OfflineConversionStatus.FAILED.value
+        assert status["error_summary"] == "boom"
+
+    def test_raising_chunk_upload_fails_chunk_not_batch(self):
+        uploader = _RecordingUploader(raise_chunks={1})
+        svc = _stream_service(uploader)
+        result = asyncio.run(
+            svc.upload_csv_stream(io.StringIO(self.CSV), "meta", {}, chunk_rows=2)
+        )
+        assert result.successful_records == 1
+        assert result.failed_records == 2
+        status = svc.get_batch_status(result.batch_id)
+        assert status["status"] == OfflineConversionStatus.PARTIAL.value
+        assert status["chunks_completed"] == 2
+        assert status["chunks"][1]["status"] == OfflineConversionStatus.FAILED.value
+        assert "platform unreachable" in status["chunks"][1]["error"]
+
+    def test_every_chunk_raising_marks_batch_failed(self):
+        uploader = _RecordingUploader(raise_chunks={0, 1})
+        svc = _stream_service(uploader)
+        result = asyncio.run(
+            svc.upload_csv_stream(io.StringIO(self.CSV), "meta", {}, chunk_rows=2)
+        )
+        status = svc.get_batch_status(result.batch_id)
+        assert status["status"] == OfflineConversionStatus.FAILED.value
+        assert all(c["status"] != "processing" for c in status["chunks"])
+
+    def test_read_error_mid_file_finishes_batch(self, monkeypatch):
+        uploader = _RecordingUploader()
+        svc = _stream_service(uploader)
+        calls = {"n": 0}
+        original = svc._prepare_chunk
+
+        def flaky(*args, **kwargs):
+            calls["n"] += 1
+            if calls["n"] == 2:
+                raise ValueError("corrupt chunk")
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(svc, "_prepare_chunk", flaky)
+        result = asyncio.run(
+            svc.upload_csv_stream(io.StringIO(self.CSV), "meta", {}, chunk_rows=2)
+        )
+        assert result.success is False
+        status = svc.get_batch_status(result.batch_id)
+        assert status["status"] == OfflineConversionStatus.PARTIAL.value
+        assert "corrupt chunk" in status["error_summary"]
+
+    def test_precreated_batch_is_filled_in(self):
+        uploader = _RecordingUploader()
+        svc = _stream_service(uploader)
+        batch = svc.create_batch("meta", tenant_id="t1")
+        assert svc.get_batch_status(batch.batch_id)["status"] == "pending"
+        result = asyncio.run(
+            svc.upload_csv_stream(
+                io.StringIO(self.CSV), "meta", {}, batch_id=batch.batch_id
+            )
+        )
+        assert result.batch_id == batch.batch_id
+        assert svc.list_batches("t1")[0]["status"] == "uploaded"
+
+    def test_binary_file_source(self, tmp_path):
+        path = tmp_path / "conversions.csv"
+        path.write_text(self.CSV)
+        uploader = _RecordingUploader()
+        with open(path, "rb") as fh:
+            result = asyncio.run(
+                _stream_service(uploader).upload_csv_stream(fh, "meta", {})
+            )
+        assert result.total_records == 3
+
+    def test_empty_file(self):
+        svc = _stream_service(_RecordingUploader())
+        result = asyncio.run(svc.upload_csv_stream(io.StringIO(""), "meta", {}))
+        assert result.success is False
+        assert "No valid conversions" in result.errors[0]["message"]
+
+    def test_unknown_platform(self):
+        svc = OfflineConversionService()
+        result = asyncio.run(
+            svc.upload_csv_stream(io.StringIO(self.CSV), "linkedin", {})
+        )
+        assert "Unknown platform" in result.errors[0]["message"]
+
+    def test_process_pool_hashing_matches_inline(self):
+        inline, pooled = _RecordingUploader(), _RecordingUploader()
+        asyncio.run(
+            _stream_service(inline).upload_csv_stream(io.StringIO(self.CSV), "meta")
+        )
+        asyncio.run(
+            _stream_service(pooled).upload_csv_stream(
+                io.StringIO(self.CSV), "meta", hash_workers=2
+            )
+        )
+        assert [(c.email, c.phone, c.first_name) for c in pooled.chunks[0]] == [
+            (c.email, c.phone, c.first_name) for c in inline.chunks[0]
+        ]
+
+    def test_endpoint_upload_uses_configured_hash_workers(self, tmp_path, monkeypatch):
+        from app.api.v1.endpoints import audit_services
+        from app.core.config import settings
+
+        path = tmp_path / "conversions.csv"
+        path.write_text(self.CSV)
+        upload = AsyncMock()
+        monkeypatch.setattr(
+            audit_services.offline_conversion_service, "upload_csv_stream", upload
+        )
+        monkeypatch.setattr(settings, "offline_conversion_hash_workers", 3)
+
+        asyncio.run(audit_services._run_csv_upload(str(path), "meta", "b1"))
+
+        upload.assert_awaited_once_with(
+            str(path), platform="meta", batch_id="b1", hash_workers=3
+        )
+        assert not path.exists()
+
 
 # =============================================================================
 # MatchRatePredictor
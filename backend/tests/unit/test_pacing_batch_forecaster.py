@@ -0,0 +1,228 @@
+# =============================================================================
+# Stratum AI - Batch pacing forecaster unit tests
+# =============================================================================
+"""Unit tests for BatchForecaster and PacingService.get_targets_pacing.
+
+The batch path must reproduce the per-target path: the fitted model is
+compared with ForecastingService's helpers, and whole pacing results are
+compared target by target against get_target_pacing on in-memory SQLite.
+"""
+
+from datetime import date, timedelta
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from app.models.pacing import DailyKPI, Target, TargetMetric, TargetPeriod
+from app.services.pacing.forecasting import BatchForecaster, ForecastingService
+from app.services.pacing.pacing_service import PacingService
+
+pytestmark = pytest.mark.unit
+
+TENANT = 1
+AS_OF = date(2026, 3, 20)
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_as_json(type_, compiler, **kw):
+    return "JSON"
+
+
+class _AsyncSession:
+    """Just enough of AsyncSession for the pacing queries."""
+
+    def __init__(self, session):
+        self._session = session
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        return self._session.execute(statement)
+
+
+def _flatten(result, prefix=""):
+    flat = {}
+    for key, value in result.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+# =============================================================================
+# Model parity
+# =============================================================================
+
+
+def test_fit_matches_per_series_helpers():
+    rng = np.random.default_rng(3)
+    service = ForecastingService(db=None, tenant_id=TENANT)
+    histories = []
+    for length in (0, 1, 2, 3, 7, 13, 29, 45, 61):
+        start = rng.integers(0, 7)
+        histories.append(
+            [
+                {"value": float(v), "dow": int((start + k) % 7)}
+                for k, v in enumerate(rng.gamma(2.0, 50.0, length))
+            ]
+        )
+
+    model = BatchForecaster(db=None, tenant_id=TENANT).fit(
+        [np.array([h["value"] for h in hist]) for hist in histories],
+        [np.array([h["dow"] for h in hist], dtype=int) for hist in histories],
+    )
+
+    for i, hist in enumerate(histories):
+        ewma = service._calculate_ewma(hist)
+        factors = (
+            service._calculate_dow_factors(hist) if hist else {d: 1.0 for d in range(7)}
+        )
+        assert model.historical_days[i] == len(hist)
+        assert model.ewma[i] == pytest.approx(ewma)
+        assert model.dow_factors[i] == pytest.approx([factors[d] for d in range(7)])
+        if hist:
+            std = service._calculate_residual_std(hist, ewma, factors)
+            assert model.residual_std[i] == pytest.approx(std)
+
+
+async def test_horizon_totals_match_forecast_metric(monkeypatch):
+    rng = np.random.default_rng(11)
+    hist = [
+        {"date": AS_OF - timedelta(days=40 - k), "value": float(v)}
+        for k, v in enumerate(rng.gamma(3.0, 20.0, 41))
+    ]
+    for record in hist:
+        record["dow"] = record["date"].weekday()
+    service = ForecastingService(db=None, tenant_id=TENANT)
+
+    async def history(*args, **kwargs):
+        return hist
+
+    monkeypatch.setattr(service, "_load_historical_data", history)
+    model = BatchForecaster(db=None, tenant_id=TENANT).fit(
+        [np.array([h["value"] for h in hist])],
+        [np.array([h["dow"] for h in hist])],
+    )
+
+    for horizon in (1, 6, 11, 30):
+        single = await service.forecast_metric(
+            TargetMetric.SPEND, horizon, as_of_date=AS_OF
+        )
+        point, lower, upper = model.horizon_totals(AS_OF, np.array([horizon]))
+        daily = single["daily_forecasts"]
+        assert point[0] == pytest.approx(sum(d["point_forecast"] for d in daily))
+        assert lower[0] == pytest.approx(sum(d["lower_bound"] for d in daily))
+        assert upper[0] == pytest.approx(sum(d["upper_bound"] for d in daily))
+
+
+# =============================================================================
+# Pacing parity against the per-target path
+# =============================================================================
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    DailyKPI.metadata.create_all(engine, tables=[Target.__table__, DailyKPI.__table__])
+    rng = np.random.default_rng(5)
+    with Session(engine) as session:
+        scopes = [
+            (None, None, None, 60),
+            ("meta", None, None, 60),
+            ("meta", "act_1", None, 45),  # per-account rows under meta
+            ("google", None, "cmp_1", 5),  # too short to forecast
+        ]
+        for platform, account_id, campaign_id, days in scopes:
+            for offset in range(days):
+                day = AS_OF - timedelta(days=offset)
+                spend = int(rng.integers(5_000, 20_000))
+                session.add(
+                    DailyKPI(
+                        tenant_id=TENANT,
+                        date=day,
+                        platform=platform,
+                        account_id=account_id,
+                        campaign_id=campaign_id,
+                        spend_cents=spend,
+                        revenue_cents=spend * 3,
+                        roas=None if offset % 9 == 0 else float(rng.uniform(1, 5)),
+                        conversions=int(rng.integers(0, 40)),
+                        day_of_week=day.weekday(),
+                        is_weekend=day.weekday() >= 5,
+                    )
+                )
+        session.flush()
+        yield _AsyncSession(session)
+
+
+def _target(db, name, metric, value, platform=None, campaign_id=None, **fields):
+    target = Target(
+        id=uuid4(),
+        tenant_id=TENANT,
+        name=name,
+        period_type=TargetPeriod.MONTHLY,
+        period_start=fields.pop("period_start", date(2026, 3, 1)),
+        period_end=fields.pop("period_end", date(2026, 3, 31)),
+        platform=platform,
+        campaign_id=campaign_id,
+        metric_type=metric,
+        target_value=value,
+        warning_threshold_pct=10.0,
+        critical_threshold_pct=20.0,
+        is_active=fields.pop("is_active", True),
+        **fields,
+    )
+    db._session.add(target)
+    return target
+
+
+async def test_batch_pacing_matches_per_target_pacing(db):
+    targets = [
+        _target(db, "all spend", TargetMetric.SPEND, 4000.0),
+        _target(db, "meta roas", TargetMetric.ROAS, 3.0, platform="meta"),
+        _target(
+            db, "meta account", TargetMetric.SPEND, 3500.0, "meta", account_id="act_1"
+        ),
+        _target(db, "google cmp", TargetMetric.REVENUE, 9000.0, "google", "cmp_1"),
+        _target(db, "tiktok", TargetMetric.CONVERSIONS, 500.0, platform="tiktok"),
+        _target(db, "ends today", TargetMetric.SPEND, 2000.0, period_end=AS_OF),
+        _target(
+            db,
+            "ended",
+            TargetMetric.SPEND,
+            2000.0,
+            period_start=date(2026, 2, 1),
+            period_end=date(2026, 2, 28),
+        ),
+        _target(db, "paused", TargetMetric.SPEND, 1000.0, is_active=False),
+    ]
+    db._session.flush()
+    service = PacingService(db, TENANT)
+
+    batch = await service.get_targets_pacing(targets, AS_OF)
+
+    for target in targets:
+        single = _flatten(await service.get_target_pacing(target.id, AS_OF))
+        assert _flatten(batch[target.id]) == pytest.approx(
+            single, abs=0.011
+        ), target.name
+    assert batch[targets[3].id]["status"] == "success"
+    assert batch[targets[6].id]["status"] == "ended"
+
+
+async def test_batch_pacing_query_count_is_independent_of_targets(db):
+    targets = [
+        _target(db, f"t{i}", TargetMetric.SPEND, 1000.0 + i, platform=p)
+        for i, p in enumerate(["meta", None, "google", "meta", None] * 20)
+    ]
+    db._session.flush()
+
+    await PacingService(db, TENANT).get_targets_pacing(targets, AS_OF)
+
+    assert db.queries == 2  # MTD actuals + forecast history
@@ -0,0 +1,164 @@
+# =============================================================================
+# Stratum AI - Parallel retraining orchestrator tests
+# =============================================================================
+"""
+RetrainingPipeline.retrain_models prepares the training data once, trains
+each model from the materialized frame (in worker processes when more than
+one is allowed), and only then compares and promotes.
+
+Trains real models on a slice of the bundled
+datasets/ml_datasets/campaign_performance_dataset.csv.
+"""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from app.ml.retraining_pipeline import (
+    RetrainingConfig,
+    RetrainingPipeline,
+    RetrainingTrigger,
+)
+from app.ml.train import ModelTrainer
+
+pytestmark = pytest.mark.unit
+
+DATASET = (
+    Path(__file__).resolve().parents[3]
+    / "datasets"
+    / "ml_datasets"
+    / "campaign_performance_dataset.csv"
+)
+
+
+@pytest.fixture(scope="module")
+def training_data():
+    if not DATASET.exists():
+        pytest.skip(f"dataset not found: {DATASET}")
+    # About four campaigns per platform (meta, google, tiktok, snapchat)
+    return pd.read_csv(DATASET).groupby("platform").head(120).reset_index(drop=True)
+
+
+def _pipeline(tmp_path, max_workers=1):
+    return RetrainingPipeline(
+        RetrainingConfig(
+            models_path=str(tmp_path / "models"),
+            archive_path=str(tmp_path / "models" / "archive"),
+            staging_path=str(tmp_path / "models" / "staging"),
+            max_workers=max_workers,
+        )
+    )
+
+
+def _counting_prepare():
+    calls = []
+    prepare = ModelTrainer._prepare_data
+
+    def counted(self, df):
+        calls.append(len(df))
+        return prepare(self, df)
+
+    return calls, patch.object(ModelTrainer, "_prepare_data", counted)
+
+
+def test_prepares_features_once_and_promotes_every_model(tmp_path, training_data):
+    pipeline = _pipeline(tmp_path)
+    models = {
+        "roas_predictor": RetrainingTrigger.SCHEDULED,
+        "conversion_predictor": RetrainingTrigger.SCHEDULED,
+        "budget_impact": RetrainingTrigger.MANUAL,
+        "roas_predictor_google": RetrainingTrigger.MANUAL,
+        "roas_predictor_tiktok": RetrainingTrigger.MANUAL,
+    }
+
+    calls, counting = _counting_prepare()
+    with counting:
+        results = pipeline.retrain_models(models, training_data)
+
+    assert calls == [len(training_data)]
+    assert {r["status"] for r in results.values()} == {"promoted"}
+    assert len({r["version_id"] for r in results.values()}) == 1
+    assert results["budget_impact"]["trigger"] == "manual"
+    for model_name in models:
+        assert (tmp_path / "models" / f"{model_name}.pkl").exists()
+        assert pipeline.get_model_status(model_name)["exists"]
+
+
+def test_failed_models_do_not_block_the_rest(tmp_path, training_data):
+    pipeline = _pipeline(tmp_path)
+    results = pipeline.retrain_models(
+        {
+            "budget_impact": RetrainingTrigger.MANUAL,
+            "roas_predictor_linkedin": RetrainingTrigger.MANUAL,
+            "churn_predictor": RetrainingTrigger.MANUAL,
+        },
+        training_data,
+    )
+
+    assert results["budget_impact"]["status"] == "promoted"
+    assert results["roas_predictor_linkedin"]["status"] == "failed"
+    assert results["roas_predictor_linkedin"]["error"] == (
+        "Insufficient data for linkedin"
+    )
+    assert results["churn_predictor"]["error"] == "Unknown model: churn_predictor"
+
+
+def test_feature_frame_is_cached_per_training_data(tmp_path, training_data):
+    pipeline = _pipeline(tmp_path)
+
+    calls, counting = _counting_prepare()
+    with counting:
+        first = pipeline._materialize_features(training_data)
+        again = pipeline._materialize_features(training_data.copy())
+        other = pipeline._materialize_features(training_data.head(200))
+
+    assert again == first
+    assert other != first and not first.exists()
+    assert calls == [len(training_data), 200]
+    assert [p.name for p in other.parent.iterdir()] == [other.name]
+
+
+def test_worker_processes_match_inline_training(tmp_path, training_data):
+    models = {
+        "conversion_predictor": RetrainingTrigger.MANUAL,
+        "budget_impact": RetrainingTrigger.MANUAL,
+    }
+    inline = _pipeline(tmp_path / "inline").retrain_models(models, training_data)
+    pooled = _pipeline(tmp_path / "pooled", max_workers=2).retrain_models(
+        models, training_data
+    )
+
+    for model_name in models:
+        assert pooled[model_name]["status"] == "promoted"
+        assert pooled[model_name]["metrics"]["r2"] == pytest.approx(
+            inline[model_name]["metrics"]["r2"]
+        )
+
+
+def test_retrain_model_saves_platform_model_under_its_name(tmp_path, training_data):
+    pipeline = _pipeline(tmp_path)
+    result = pipeline.retrain_model("roas_predictor_meta", training_data)
+
+    assert result["status"] == "promoted"
+    assert (tmp_path / "models" / "roas_predictor_meta.pkl").exists()
+    assert not (tmp_path / "models" / "roas_predictor.pkl").exists()
+
+
+def test_scheduled_run_adds_platform_models(tmp_path, training_data):
+    pipeline = _pipeline(tmp_path)
+    with patch.object(pipeline, "retrain_models", return_value={}) as retrain:
+        pipeline.run_scheduled_retraining(lambda: training_data)
+
+    models, data = retrain.call_args.args
+    assert data is training_data
+    assert set(models) == {
+        "roas_predictor",
+        "conversion_predictor",
+        "budget_impact",
+        "roas_predictor_meta",
+        "roas_predictor_google",
+        "roas_predictor_tiktok",
+        "roas_predictor_snapchat",
+    }
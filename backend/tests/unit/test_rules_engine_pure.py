@@ -5,16 +5,22 @@
 
 Covers the fluent ``RuleBuilder`` (build + validate) and the pure
 ``RulesEngine`` helpers: value parsing, operator comparison, and campaign
-field extraction. The DB-backed evaluation/execution paths are out of
-scope here.
+field extraction. The compiled batch evaluation is covered with
+in-memory campaigns; action execution is out of scope here.
 """
 
+from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 
 import pytest
 
-from app.models import RuleAction, RuleOperator
-from app.services.rules_engine import RuleBuilder, RulesEngine
+from app.models import RuleAction, RuleOperator, RuleStatus
+from app.services.rules_engine import (
+    RuleBuilder,
+    RulesEngine,
+    compile_rule,
+    evaluate_compiled_rules,
+)
 
 pytestmark = pytest.mark.unit
 
@@ -123,3 +129,160 @@ class TestGetFieldValue:
     def test_unknown_field_returns_none(self, engine):
         campaign = SimpleNamespace(status="active")
         assert engine._get_field_value(campaign, "nonexistent_field") is None
+
+
+# =============================================================================
+# Compiled batch evaluation
+# =============================================================================
+def _campaign(id, **kw):
+    base = dict(
+        id=id,
+        name=f"Camp {id}",
+        platform="meta",
+        total_spend_cents=20000,
+        revenue_cents=100000,
+        clicks=100,
+        impressions=10000,
+        conversions=2,
+    )
+    base.update(kw)
+    return SimpleNamespace(**base)
+
+
+def _rule(id, field, operator, value, **kw):
+    base = dict(
+        id=id,
+        name=f"Rule {id}",
+        status=RuleStatus.ACTIVE,
+        condition_field=field,
+        condition_operator=operator,
+        condition_value=value,
+        applies_to_campaigns=None,
+        applies_to_platforms=None,
+        last_triggered_at=None,
+        cooldown_hours=24,
+    )
+    base.update(kw)
+    return SimpleNamespace(**base)
+
+
+class TestCompiledEvaluation:
+    def test_all_rules_share_one_pass(self):
+        campaigns = [_campaign(1), _campaign(2, conversions=0), _campaign(3)]
+        compiled = [
+            compile_rule(_rule(1, "cpa", RuleOperator.GREATER_THAN, "50")),
+            compile_rule(_rule(2, "clicks", RuleOperator.GREATER_THAN_OR_EQUAL, "100")),
+        ]
+
+        results = evaluate_compiled_rules(compiled, campaigns)
+
+        cpa = {e.campaign.id: e for e in results[0]}
+        assert cpa[1].matched and cpa[1].condition["actual"] == 100.0
+        assert not cpa[2].matched and "not found or null" in cpa[2].condition["reason"]
+        assert [e.matched for e in results[1]] == [True, True, True]
+
+    def test_scope_filters_campaigns_and_platform_enums(self):
+        platform = SimpleNamespace(value="google")  # enum-like member
+        campaigns = [_campaign(1), _campaign(2, platform=platform), _campaign(3)]
+        compiled = [
+            compile_rule(
+                _rule(
+                    1,
+                    "clicks",
+                    RuleOperator.GREATER_THAN,
+                    "0",
+                    applies_to_campaigns=[1, 2],
+                )
+            ),
+            compile_rule(
+                _rule(
+                    2,
+                    "clicks",
+                    RuleOperator.GREATER_THAN,
+                    "0",
+                    applies_to_platforms=["google"],
+                )
+            ),
+        ]
+
+        results = evaluate_compiled_rules(compiled, campaigns)
+
+        assert [e.campaign.id for e in results[0]] == [1, 2]
+        assert [e.campaign.id for e in results[1]] == [2]
+
+    def test_invalid_threshold_and_uncomparable_values_do_not_raise(self):
+        compiled = [
+            compile_rule(_rule(1, "cpa", RuleOperator.GREATER_THAN, "abc")),
+            compile_rule(_rule(2, "name", RuleOperator.GREATER_THAN, "x")),
+            compile_rule(_rule(3, "labels", RuleOperator.GREATER_THAN, "x")),
+        ]
+        campaign = _campaign(1, labels=None)
+
+        results = evaluate_compiled_rules(compiled, [campaign])
+
+        assert "Invalid condition value" in results[0][0].condition["reason"]
+        assert results[1][0].matched is False
+        assert "not found or null" in results[2][0].condition["reason"]
+
+    def test_threshold_parsed_once_per_type(self):
+        compiled = compile_rule(_rule(1, "clicks", RuleOperator.EQUALS, "100"))
+        compiled.evaluate(100)
+        compiled.evaluate(99)
+        assert list(compiled._expected) == [int]
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class _CountingSession:
+    def __init__(self, campaigns):
+        self.campaigns = campaigns
+        self.queries = 0
+
+    async def execute(self, query):
+        self.queries += 1
+        return _Result(self.campaigns)
+
+
+class TestEvaluateRules:
+    async def test_dry_run_loads_campaigns_once_for_all_rules(self):
+        db = _CountingSession([_campaign(1), _campaign(2, conversions=0)])
+        engine = RulesEngine(db=db, tenant_id=1)
+        rules = [
+            _rule(1, "cpa", RuleOperator.GREATER_THAN, "50"),
+            _rule(2, "spend", RuleOperator.LESS_THAN, "100"),
+            _rule(3, "roas", RuleOperator.GREATER_THAN, "1", status=RuleStatus.DRAFT),
+        ]
+
+        results = await engine.evaluate_rules(rules, dry_run=True)
+
+        assert db.queries == 1
+        assert results[0]["campaigns_evaluated"] == 2
+        assert results[0]["campaigns_matched"] == 1
+        assert results[0]["results"][0]["condition"]["actual"] == 100.0
+        assert results[0]["results"][1]["reason"].startswith("Field 'cpa'")
+        assert results[1]["campaigns_matched"] == 0
+        assert results[2]["dry_run"] is True
+
+    async def test_inactive_and_cooldown_rules_skip_the_query(self):
+        db = _CountingSession([_campaign(1)])
+        engine = RulesEngine(db=db, tenant_id=1)
+        recent = datetime.now(timezone.utc) - timedelta(hours=1)
+        rules = [
+            _rule(1, "cpa", RuleOperator.GREATER_THAN, "50", status=RuleStatus.PAUSED),
+            _rule(2, "cpa", RuleOperator.GREATER_THAN, "50", last_triggered_at=recent),
+        ]
+
+        results = await engine.evaluate_rules(rules)
+
+        assert db.queries == 0
+        assert results[0]["reason"] == "Rule is not active"
+        assert results[1]["reason"] == "Rule is in cooldown"
@@ -12,14 +12,17 @@ TypeError on every 15-minute tick. It now reads the flat
 columns, mirroring the canonical async ``RulesEngine``.
 """
 
+from datetime import UTC, datetime, timedelta
 from types import SimpleNamespace
 
 import pytest
 
 from app.models import RuleExecution, RuleOperator
+from app.workers.tasks import rules as rules_tasks
 from app.workers.tasks.rules import (
     _compare_values,
     _evaluate_condition,
+    _evaluate_tenant_rules,
     _get_field_value,
     _parse_value,
 )
@@ -124,3 +127,127 @@ def test_rule_execution_rejects_old_columns():
             condition_values={},
             action_taken="x",
         )
+
+
+# --- tenant-batched evaluation ---
+class _Rows:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class _SyncSession:
+    """Answers the rules query, then the campaigns query."""
+
+    def __init__(self, rules, campaigns):
+        self._results = [rules, campaigns]
+        self.queries = 0
+        self.added = []
+        self.commits = 0
+
+    def execute(self, query):
+        self.queries += 1
+        return _Rows(self._results.pop(0))
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    def commit(self):
+        self.commits += 1
+
+
+def _tenant_rule(id, field, operator, value, action="apply_label", **kw):
+    base = dict(
+        id=id,
+        name=f"Rule {id}",
+        condition_field=field,
+        condition_operator=operator,
+        condition_value=value,
+        action_type=action,
+        action_config={"label": f"r{id}"},
+        applies_to_campaigns=None,
+        applies_to_platforms=None,
+        last_triggered_at=None,
+        last_evaluated_at=None,
+        cooldown_hours=24,
+        trigger_count=0,
+    )
+    base.update(kw)
+    return SimpleNamespace(**base)
+
+
+@pytest.fixture
+def gate(monkeypatch):
+    state = SimpleNamespace(allowed=True, reason=None)
+    monkeypatch.setattr(
+        rules_tasks, "evaluate_execution_gate_sync", lambda db, t: state
+    )
+    monkeypatch.setattr(rules_tasks, "publish_event", lambda *a, **k: None)
+    return state
+
+
+def test_tenant_rules_share_one_campaign_query(gate):
+    campaigns = [
+        _campaign(id=1, labels=[], platform="meta"),
+        _campaign(id=2, labels=[], platform="meta", conversions=0),
+    ]
+    rules = [
+        _tenant_rule(1, "cpa", RuleOperator.GREATER_THAN, "50"),
+        _tenant_rule(2, "clicks", RuleOperator.GREATER_THAN, "10"),
+        _tenant_rule(
+            3, "clicks", RuleOperator.GREATER_THAN, "10", applies_to_campaigns=[2]
+        ),
+    ]
+    db = _SyncSession(rules, campaigns)
+
+    summary = _evaluate_tenant_rules(db, tenant_id=7)
+
+    assert db.queries == 2  # rules + campaigns, regardless of rule count
+    assert db.commits == 1
+    assert summary["rules"] == {
+        1: {"matches": 1, "executions": 1},
+        2: {"matches": 2, "executions": 2},
+        3: {"matches": 1, "executions": 1},
+    }
+    assert campaigns[0].labels == ["r1", "r2"]
+    assert campaigns[1].labels == ["r2", "r3"]
+    assert len(db.added) == 4
+    assert all(r.trigger_count == 1 for r in rules)
+
+
+def test_cooldown_rules_skipped_without_loading_campaigns(gate):
+    recent = datetime.now(UTC) - timedelta(hours=1)
+    rules = [
+        _tenant_rule(
+            1, "cpa", RuleOperator.GREATER_THAN, "50", last_triggered_at=recent
+        )
+    ]
+    db = _SyncSession(rules, [])
+
+    summary = _evaluate_tenant_rules(db, tenant_id=7)
+
+    assert db.queries == 1
+    assert summary["rules_in_cooldown"] == 1
+    assert summary["rules"][1] == {"status": "cooldown"}
+
+
+def test_gate_held_mutation_does_not_start_cooldown(gate):
+    gate.allowed = False
+    campaign = _campaign(id=1, status="active", labels=[], platform="meta")
+    rule = _tenant_rule(
+        1, "cpa", RuleOperator.GREATER_THAN, "50", action="pause_campaign"
+    )
+    db = _SyncSession([rule], [campaign])
+
+    summary = _evaluate_tenant_rules(db, tenant_id=7)
+
+    assert summary["executions"] == 1
+    assert campaign.status == "active"
+    assert db.added[0].action_result["skipped"] is True
+    assert rule.last_triggered_at is None
+    assert rule.last_evaluated_at is not None
@@ -15,12 +15,15 @@ Tests cover:
 - Rate limiting: requests above limit return 429
 - Rate limiting: rate limit headers are included in responses
 - Rate limiting: token bucket fallback when Redis is unavailable
+- Rate limiting: leased GCRA spends Redis tokens locally
 """
 
+import math
 import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
 from starlette.requests import Request
 from starlette.responses import Response
 from starlette.testclient import TestClient
@@ -650,3 +653,184 @@ class TestRateLimitRedisWindow:
             assert response.status_code == 200
 
         assert fake.values == {}, "health probes consumed rate limit budget"
+
+
+# =============================================================================
+# RateLimitMiddleware — leased GCRA
+# =============================================================================
+
+
+class FakeGcraRedis:
+    """Redis double that runs GCRA_LEASE_SCRIPT's arithmetic in Python.
+
+    There is no Lua runtime in the unit environment, so the script body is
+    mirrored line for line; the clock is manual and shared with the limiter.
+    """
+
+    def __init__(self) -> None:
+        self.now = 1000.0  # seconds
+        self.values: dict[str, float] = {}
+        self.calls: list[tuple] = []
+
+    def clock(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+    async def ping(self) -> bool:
+        return True
+
+    def register_script(self, body: str) -> "FakeScript":
+        return FakeScript(self)
+
+    def run(self, key: str, interval, tolerance, want, refund) -> list[int]:
+        self.calls.append((key, want, refund))
+        now = math.floor(self.now * 1000)
+        tat = self.values.get(key, now)
+        if tat <= now:
+            tat = now  # expired key
+        tat = max(tat - refund * interval, now)
+        available = math.floor((now + tolerance - tat) / interval) + 1
+        granted = max(0, min(want, available))
+        tat = tat + granted * interval
+        if tat > now:
+            self.values[key] = tat
+        else:
+            self.values.pop(key, None)
+        retry_after = max(0, math.ceil(tat - tolerance - now))
+        return [granted, max(0, available - granted), retry_after]
+
+
+class FakeScript:
+    def __init__(self, redis: FakeGcraRedis) -> None:
+        self.registered_client = redis
+
+    async def __call__(self, keys, args) -> list[int]:
+        return self.registered_client.run(keys[0], *args)
+
+
+class TestRateLimitGcraLeases:
+    """The leased GCRA backend keeps Redis off most requests."""
+
+    @staticmethod
+    def _middleware(
+        rpm: int = 60, burst: int = 10, lease_size: int = 5, fake=None
+    ) -> tuple[RateLimitMiddleware, FakeGcraRedis]:
+        middleware = RateLimitMiddleware(
+            MagicMock(),
+            requests_per_minute=rpm,
+            burst_size=burst,
+            algorithm="gcra",
+            lease_size=lease_size,
+        )
+        fake = fake or FakeGcraRedis()
+        middleware._redis = fake
+        middleware._redis_available = True
+        middleware._gcra._clock = fake.clock
+        return middleware, fake
+
+    async def _statuses(self, middleware, request, count: int) -> list[int]:
+        return [
+            (await middleware.dispatch(request, _ok_call_next)).status_code
+            for _ in range(count)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_redis_is_called_once_per_lease(self):
+        middleware, fake = self._middleware(burst=10, lease_size=5)
+        request = _make_request("/api/v1/data", client_host="10.0.1.1")
+
+        assert await self._statuses(middleware, request, 10) == [200] * 10
+        assert [want for _, want, _ in fake.calls] == [5, 5]
+
+    @pytest.mark.asyncio
+    async def test_over_limit_is_rejected_locally_until_retry_after(self):
+        middleware, fake = self._middleware(rpm=60, burst=10)
+        request = _make_request("/api/v1/data", client_host="10.0.1.2")
+        await self._statuses(middleware, request, 10)
+
+        blocked = await middleware.dispatch(request, _ok_call_next)
+        assert blocked.status_code == 429
+        assert blocked.headers["Retry-After"] == "1"
+        calls = len(fake.calls)
+
+        assert await self._statuses(middleware, request, 20) == [429] * 20
+        assert len(fake.calls) == calls, "blocked client still reached Redis"
+
+        fake.advance(1)
+        assert (await middleware.dispatch(request, _ok_call_next)).status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_steady_rate_is_never_blocked_across_window_edges(self):
+        middleware, fake = self._middleware(rpm=60, burst=5)
+        request = _make_request("/api/v1/data", client_host="10.0.1.3")
+
+        for _ in range(300):
+            response = await middleware.dispatch(request, _ok_call_next)
+            assert response.status_code == 200
+            fake.advance(1)
+
+    @pytest.mark.asyncio
+    async def test_sustained_rate_above_limit_is_throttled_to_the_limit(self):
+        middleware, fake = self._middleware(rpm=60, burst=5)
+        request = _make_request("/api/v1/data", client_host="10.0.1.4")
+
+        allowed = 0
+        for _ in range(600):  # 4 req/s for 150 s
+            response = await middleware.dispatch(request, _ok_call_next)
+            allowed += response.status_code == 200
+            fake.advance(0.25)
+
+        # 1 req/s plus the initial burst, give or take one lease
+        assert 150 <= allowed <= 150 + 5 + 5
+
+    @pytest.mark.asyncio
+    async def test_workers_share_one_budget(self):
+        worker_a, fake = self._middleware(burst=10, lease_size=5)
+        worker_b, _ = self._middleware(burst=10, lease_size=5, fake=fake)
+        request = _make_request("/api/v1/data", client_host="10.0.1.5")
+
+        statuses = []
+        for _ in range(10):
+            statuses += await self._statuses(worker_a, request, 1)
+            statuses += await self._statuses(worker_b, request, 1)
+
+        assert statuses.count(200) == 10
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_refunds_unused_tokens(self):
+        middleware, fake = self._middleware(rpm=60, burst=10, lease_size=5)
+        request = _make_request("/api/v1/data", client_host="10.0.1.6")
+
+        await middleware.dispatch(request, _ok_call_next)
+        fake.advance(1.5)
+        await middleware.dispatch(request, _ok_call_next)
+
+        assert fake.calls[1][2] == 4
+        # Without the refund the TAT would still carry the four unused tokens;
+        # with it only the new lease of five is outstanding.
+        now_ms = math.floor(fake.now * 1000)
+        assert fake.values["rl:gcra:ip:10.0.1.6"] == now_ms + 5 * 1000
+
+    @pytest.mark.asyncio
+    async def test_auth_endpoints_are_not_leased(self):
+        middleware, fake = self._middleware()
+        request = _make_request("/api/v1/auth/login", client_host="10.0.1.7")
+
+        assert await self._statuses(middleware, request, 6) == [200] * 5 + [429]
+        assert [want for _, want, _ in fake.calls] == [1] * 6
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_fall_back_to_local_bucket(self):
+        middleware, fake = self._middleware()
+
+        def broken(*args, **kwargs):
+            raise RedisConnectionError("connection reset")
+
+        fake.run = broken
+        request = _make_request("/api/v1/data", client_host="10.0.1.8")
+
+        response = await middleware.dispatch(request, _ok_call_next)
+        assert response.status_code == 200
+        assert "ip:10.0.1.8" in middleware._buckets
@@ -0,0 +1,129 @@
+# =============================================================================
+# Stratum AI - Automation Runner unit tests
+# =============================================================================
+"""Unit tests for app.stratum.workers.automation_runner.run_autopilot_for_account.
+
+A mock adapter counts platform calls, so the tests check that batch mode
+fetches metrics and ad sets once per account (instead of once per
+campaign) and produces the same tallies as the per-campaign path.
+"""
+
+import pytest
+
+from app.stratum.models import (
+    EMQScore,
+    EntityStatus,
+    PerformanceMetrics,
+    Platform,
+    UnifiedAdSet,
+    UnifiedCampaign,
+)
+from app.stratum.workers import automation_runner
+
+pytestmark = pytest.mark.unit
+
+
+class _MockAdapter:
+    def __init__(self, n_campaigns=5):
+        self.calls = {"get_metrics": 0, "get_adsets": 0}
+        self.campaigns = [
+            UnifiedCampaign(
+                platform=Platform.META,
+                account_id="acct_1",
+                campaign_id=f"camp_{i}",
+                campaign_name=f"Campaign {i}",
+                daily_budget=100.0,
+                status=EntityStatus.PAUSED if i == 0 else EntityStatus.ACTIVE,
+            )
+            for i in range(n_campaigns)
+        ]
+
+    async def initialize(self):
+        pass
+
+    async def cleanup(self):
+        pass
+
+    async def get_campaigns(self, account_id):
+        return self.campaigns
+
+    async def get_emq_scores(self, account_id):
+        return [EMQScore(platform=Platform.META, event_name="Purchase", score=9.0)]
+
+    async def get_metrics(self, account_id, entity_type, entity_ids, **kwargs):
+        self.calls["get_metrics"] += 1
+        # every other campaign converts badly enough to be paused
+        return {
+            cid: PerformanceMetrics(
+                spend=10.0,
+                conversions=10,
+                roas=0.3 if int(cid.split("_")[1]) % 2 else 4.0,
+            )
+            for cid in entity_ids
+        }
+
+    async def get_adsets(self, account_id, campaign_id=None):
+        self.calls["get_adsets"] += 1
+        return [
+            UnifiedAdSet(
+                platform=Platform.META,
+                account_id=account_id,
+                campaign_id=c.campaign_id,
+                adset_id=f"{c.campaign_id}_as",
+                adset_name="Ad set",
+            )
+            for c in self.campaigns
+            if campaign_id in (None, c.campaign_id)
+        ]
+
+
+@pytest.fixture
+def adapter(monkeypatch):
+    mock = _MockAdapter()
+    monkeypatch.setattr(
+        "app.stratum.adapters.registry.get_adapter", lambda platform, creds: mock
+    )
+    monkeypatch.setattr(
+        automation_runner.execute_action, "delay", lambda **kwargs: None
+    )
+    return mock
+
+
+def _run(batch):
+    return automation_runner.run_autopilot_for_account(
+        "meta", "acct_1", {}, {"min_roas": 2.0}, batch=batch
+    )
+
+
+def test_batch_mode_fetches_once_per_account(adapter):
+    result = _run(batch=True)
+
+    assert "error" not in result
+    assert adapter.calls == {"get_metrics": 1, "get_adsets": 1}
+    # 4 active campaigns x 3 default rules
+    assert result["rules_evaluated"] == 12
+
+
+def test_batch_mode_matches_per_campaign_mode(adapter):
+    batched = _run(batch=True)
+    adapter.calls = {"get_metrics": 0, "get_adsets": 0}
+    sequential = _run(batch=False)
+
+    assert adapter.calls == {"get_metrics": 4, "get_adsets": 4}
+    for key in (
+        "rules_evaluated",
+        "actions_proposed",
+        "actions_approved",
+        "actions_queued",
+        "actions_blocked",
+    ):
+        assert batched[key] == sequential[key]
+    assert batched["actions_proposed"] >= 2
+
+
+def test_large_accounts_split_metric_requests(adapter, monkeypatch):
+    monkeypatch.setattr(automation_runner, "METRICS_BATCH_SIZE", 2)
+
+    _run(batch=True)
+
+    assert adapter.calls == {"get_metrics": 2, "get_adsets": 1}
@@ -316,3 +316,47 @@ class TestEvaluateCampaign:
         assert action.signal_health_at_execution == 85.0
         assert action.parameters["created_by"] == "autopilot:budget_pacing"
         assert action.parameters["daily_budget"] == 120.0
+
+
+# =============================================================================
+# evaluate_account (whole-account pass)
+# =============================================================================
+class TestEvaluateAccount:
+    def test_matches_per_campaign_evaluation(self):
+        campaigns = [
+            _campaign().model_copy(update={"campaign_id": f"camp_{i}"})
+            for i in range(3)
+        ]
+        metrics = {
+            "camp_0": _metrics(spend=10.0, conversions=10, roas=0.3),
+            "camp_1": _metrics(spend=50.0, conversions=20, roas=6.0),
+        }
+        targets = {"min_roas": 2.0, "target_roas": 3.0}
+
+        account = asyncio.run(
+            AutopilotEngine().evaluate_account(
+                platform=Platform.META,
+                account_id="acct_1",
+                campaigns=campaigns,
+                adsets_by_campaign={},
+                metrics_by_campaign=metrics,
+                signal_health_by_campaign=dict.fromkeys(metrics, _health(90.0)),
+                targets=targets,
+            )
+        )
+
+        # camp_2 has no metrics and is skipped, like the per-campaign loop
+        assert list(account) == ["camp_0", "camp_1"]
+        for campaign in campaigns[:2]:
+            single = asyncio.run(
+                AutopilotEngine().evaluate_campaign(
+                    platform=Platform.META,
+                    account_id="acct_1",
+                    campaign=campaign,
+                    adsets=[],
+                    metrics=metrics[campaign.campaign_id],
+                    signal_health=_health(90.0),
+                    targets=targets,
+                )
+            )
+            assert account[campaign.campaign_id] == single
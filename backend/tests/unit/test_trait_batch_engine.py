@@ -0,0 +1,268 @@
+# =============================================================================
+# Stratum AI - CDP Trait Batch Engine unit tests
+# =============================================================================
+"""Unit tests for app.services.cdp.trait_batch_engine.
+
+The set-based statements run against in-memory SQLite and are checked
+against ComputedTraitsService.compute_trait_for_profile, the per-profile
+reference, for every trait type. JSONB columns are compiled as plain JSON
+for the test database.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, literal, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from app.models.cdp import (
+    CDPComputedTrait,
+    CDPEvent,
+    CDPProfile,
+    ComputedTraitType,
+)
+from app.services.cdp.computed_traits_service import (
+    ComputedTraitsService,
+    RFMAnalysisService,
+)
+from app.services.cdp.trait_batch_engine import TraitBatchEngine, rfm_segment
+
+pytestmark = pytest.mark.unit
+
+TENANT = 1
+NOW = datetime.now(UTC).replace(microsecond=0)
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_as_json(type_, compiler, **kw):
+    return "JSON"
+
+
+class _AsyncSession:
+    """Just enough of AsyncSession for the services, counting statements."""
+
+    def __init__(self, session):
+        self._session = session
+        self.statements = 0
+
+    async def execute(self, statement):
+        self.statements += 1
+        return self._session.execute(statement)
+
+    async def flush(self):
+        self._session.flush()
+
+    def add(self, instance):
+        self._session.add(instance)
+
+    def get_bind(self):
+        return self._session.get_bind()
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        with self._session.begin_nested():
+            yield
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    tables = [t.__table__ for t in (CDPProfile, CDPEvent, CDPComputedTrait)]
+    CDPProfile.metadata.create_all(engine, tables=tables)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def db(session):
+    return _AsyncSession(session)
+
+
+def _profile(session, tenant_id=TENANT, traits=None):
+    profile = CDPProfile(
+        id=uuid4(),
+        tenant_id=tenant_id,
+        first_seen_at=NOW,
+        last_seen_at=NOW,
+        profile_data={},
+        computed_traits=traits or {},
+    )
+    session.add(profile)
+    session.flush()
+    return profile
+
+
+def _event(session, profile, name, days_ago, tenant_id=TENANT, **properties):
+    session.add(
+        CDPEvent(
+            id=uuid4(),
+            tenant_id=tenant_id,
+            profile_id=profile.id if profile else None,
+            event_name=name,
+            event_time=NOW - timedelta(days=days_ago, hours=1),
+            received_at=NOW,
+            properties=properties,
+        )
+    )
+
+
+def _trait(session, name, trait_type, **config):
+    trait = CDPComputedTrait(
+        id=uuid4(),
+        tenant_id=TENANT,
+        name=name,
+        display_name=name,
+        trait_type=trait_type.value,
+        source_config=config,
+        output_type="number",
+        default_value=config.pop("default", None),
+        is_active=True,
+    )
+    session.add(trait)
+    session.flush()
+    return trait
+
+
+@pytest.fixture
+def shoppers(session):
+    heavy = _profile(session, traits={"vip": True})
+    light = _profile(session)
+    idle = _profile(session)
+    for days, total, sku in [(1, 30, "a"), (5, "12.5", "b"), (40, 100, "a")]:
+        _event(session, heavy, "Purchase", days, total=total, sku=sku)
+    _event(session, heavy, "Purchase", 3, sku="c")  # no total
+    _event(session, heavy, "Purchase", 2, total="n/a")  # not a number
+    _event(session, heavy, "Page View", 0, path="/")
+    _event(session, light, "Purchase", 200, total=7, sku="z")
+    _event(session, light, "Page View", 10, path="/pricing")
+    _event(session, None, "Purchase", 1, total=999)  # anonymous
+    other_tenant = _profile(session, tenant_id=2)
+    _event(session, other_tenant, "Purchase", 1, tenant_id=2, total=5)
+    session.flush()
+    return heavy, light, idle, other_tenant
+
+
+TRAITS = [
+    ("purchases", ComputedTraitType.COUNT, {"event_name": "Purchase"}),
+    ("recent_events", ComputedTraitType.COUNT, {"time_window_days": 30}),
+    ("revenue", ComputedTraitType.SUM, {"event_name": "Purchase", "property": "total"}),
+    ("no_property_sum", ComputedTraitType.SUM, {}),
+    ("aov", ComputedTraitType.AVERAGE, {"event_name": "Purchase", "property": "total"}),
+    ("smallest", ComputedTraitType.MIN, {"property": "total"}),
+    ("largest", ComputedTraitType.MAX, {"property": "total", "time_window_days": 30}),
+    (
+        "first_sku",
+        ComputedTraitType.FIRST,
+        {"event_name": "Purchase", "property": "sku"},
+    ),
+    ("last_path", ComputedTraitType.LAST, {"property": "path"}),
+    ("first_seen", ComputedTraitType.FIRST, {}),
+    ("last_purchase_at", ComputedTraitType.LAST, {"event_name": "Purchase"}),
+    ("skus", ComputedTraitType.UNIQUE_COUNT, {"property": "sku"}),
+    ("has_purchased", ComputedTraitType.EXISTS, {"event_name": "Purchase"}),
+    ("tier", ComputedTraitType.FORMULA, {"default": "bronze"}),
+]
+
+
+async def test_traits_match_per_profile_computation(session, db, shoppers):
+    heavy, light, idle, other_tenant = shoppers
+    # Rows the per-profile path cannot parse are left out of the comparison
+    comparable = {"revenue", "aov", "smallest", "largest"}
+    traits = [_trait(session, *spec[:2], **spec[2]) for spec in TRAITS]
+
+    processed, failed = await TraitBatchEngine(db, TENANT).compute_traits(traits)
+
+    assert (processed, failed) == (3, [])
+    service = ComputedTraitsService(db, TENANT)
+    for profile in (heavy, light, idle):
+        session.refresh(profile, ["computed_traits"])
+        for trait in traits:
+            if trait.name in comparable and profile is heavy:
+                continue
+            expected = await service.compute_trait_for_profile(profile, trait)
+            assert profile.computed_traits[trait.name] == expected, trait.name
+
+    assert heavy.computed_traits["vip"] is True
+    assert heavy.computed_traits["revenue"] == 142.5
+    assert heavy.computed_traits["aov"] == pytest.approx(142.5 / 3)
+    assert heavy.computed_traits["smallest"] == 12.5
+    assert heavy.computed_traits["largest"] == 30
+    assert heavy.computed_traits["first_sku"] == "a"
+    assert heavy.computed_traits["skus"] == 3
+    assert idle.computed_traits["has_purchased"] is False
+    assert idle.computed_traits["tier"] == "bronze"
+    session.refresh(other_tenant, ["computed_traits"])
+    assert other_tenant.computed_traits == {}
+
+
+async def test_one_statement_per_trait(session, db, shoppers):
+    traits = [_trait(session, *spec[:2], **spec[2]) for spec in TRAITS]
+    db.statements = 0
+
+    await TraitBatchEngine(db, TENANT).compute_traits(traits)
+
+    # One UPDATE per trait plus the profile count, whatever the profile count
+    assert db.statements == len(TRAITS) + 1
+
+
+async def test_service_batch_uses_engine(session, db, shoppers):
+    heavy, *_ = shoppers
+    _trait(session, "purchases", ComputedTraitType.COUNT, event_name="Purchase")
+
+    processed, errors = await ComputedTraitsService(db, TENANT).compute_traits_batch()
+
+    assert (processed, errors) == (3, 0)
+    session.refresh(heavy, ["computed_traits"])
+    assert heavy.computed_traits["purchases"] == 5
+
+
+async def test_rfm_scores_quintiles_and_segments(session, db):
+    # Ten purchasers: the i-th bought i times, $10 each, last i days ago
+    profiles = []
+    for i in range(1, 11):
+        profile = _profile(session)
+        for n in range(i):
+            _event(session, profile, "Purchase", i + n * 3, total=10)
+        profiles.append(profile)
+    idle = _profile(session)
+    session.flush()
+    service = RFMAnalysisService(db, TENANT)
+
+    summary = await service.calculate_rfm_batch()
+
+    assert summary["profiles_processed"] == 11
+    for i, profile in enumerate(profiles, start=1):
+        session.refresh(profile, ["computed_traits"])
+        traits = profile.computed_traits
+        # Two profiles per quintile; the most recent score highest on R
+        q = (i + 1) // 2
+        assert traits["rfm_recency_days"] == i
+        assert traits["rfm_frequency"] == i
+        assert traits["rfm_monetary"] == 10 * i
+        assert traits["rfm_score"] == round((6 - q + q + q) / 3)
+        assert traits["rfm_segment"] == service._determine_segment(6 - q, q, q)
+    session.refresh(idle, ["computed_traits"])
+    assert idle.computed_traits["rfm_recency_days"] == 365
+    assert idle.computed_traits["rfm_frequency"] == 0
+    assert idle.computed_traits["rfm_segment"] == "hibernating"
+    assert summary["segment_distribution"] == {
+        "new_customers": 2,
+        "potential_loyalists": 2,
+        "need_attention": 2,
+        "about_to_sleep": 4,
+        "hibernating": 1,
+    }
+
+
+async def test_rfm_segment_case_matches_python_rules(session, db):
+    service = RFMAnalysisService(db, TENANT)
+    scores = [(r, f, m) for r in range(1, 6) for f in range(1, 6) for m in range(1, 6)]
+    rows = session.execute(
+        select(*[rfm_segment(literal(r), literal(f), literal(m)) for r, f, m in scores])
+    ).one()
+
+    assert list(rows) == [service._determine_segment(*s) for s in scores]
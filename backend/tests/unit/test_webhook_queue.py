@@ -0,0 +1,360 @@
+# =============================================================================
+# Stratum AI - Durable Webhook Queue Unit Tests
+# =============================================================================
+"""Unit tests for ``app.stratum.webhooks.queue`` and the receivers that feed it.
+
+A small in-memory double models the Redis stream and consumer-group commands
+the queue uses (XADD, XREADGROUP, XAUTOCLAIM, XACK), the retry set and its
+promotion script, with a manual clock for idle times and retry delays, so
+redelivery after a consumer crash and retry backoff can be tested directly.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import ResponseError
+from starlette.testclient import TestClient
+
+from app.stratum import webhooks
+from app.stratum.webhooks.queue import WebhookQueue, run_consumer
+
+pytestmark = pytest.mark.unit
+
+SECRET = "s3cr3t"  # gitleaks:allow
+
+
+class FakeStreamRedis:
+    """Just the stream, group and string commands WebhookQueue sends."""
+
+    def __init__(self) -> None:
+        self.now_ms = 0
+        self.streams: dict[str, list[tuple[str, dict]]] = {}
+        self.groups: dict[tuple[str, str], dict] = {}
+        self.strings: dict[str, str] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+        self._seq = 0
+
+    async def xadd(self, stream, fields, maxlen=None, approximate=True):
+        self._seq += 1
+        entry_id = f"{self._seq}-0"
+        self.streams.setdefault(stream, []).append((entry_id, dict(fields)))
+        return entry_id
+
+    async def xgroup_create(self, stream, group, id="$", mkstream=False):
+        if (stream, group) in self.groups:
+            raise ResponseError("BUSYGROUP Consumer Group name already exists")
+        self.streams.setdefault(stream, [])
+        self.groups[(stream, group)] = {"last": 0, "pending": {}}
+
+    async def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        ((stream, _),) = streams.items()
+        state = self.groups[(stream, group)]
+        new = [
+            e for e in self.streams[stream] if int(e[0].split("-")[0]) > state["last"]
+        ]
+        new = new[:count]
+        if not new:
+            return []
+        state["last"] = int(new[-1][0].split("-")[0])
+        for entry_id, _ in new:
+            state["pending"][entry_id] = [consumer, self.now_ms]
+        return [[stream, new]]
+
+    async def xautoclaim(
+        self, stream, group, consumer, min_idle_time, start_id="0-0", count=None
+    ):
+        state = self.groups[(stream, group)]
+        entries = dict(self.streams[stream])
+        claimed = []
+        for entry_id, pending in state["pending"].items():
+            if self.now_ms - pending[1] >= min_idle_time:
+                state["pending"][entry_id] = [consumer, self.now_ms]
+                claimed.append((entry_id, entries[entry_id]))
+        return ["0-0", claimed[:count], []]
+
+    async def xack(self, stream, group, *ids):
+        pending = self.groups[(stream, group)]["pending"]
+        return sum(pending.pop(i, None) is not None for i in ids)
+
+    async def mget(self, keys):
+        return [self.strings.get(k) for k in keys]
+
+    async def set(self, key, value, ex=None):
+        self.strings[key] = value
+
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def register_script(self, script):
+        assert "ZRANGEBYSCORE" in script
+
+        async def promote_retries(keys, args):
+            retry_key, stream = keys
+            now, count, _maxlen = args
+            retries = self.zsets.get(retry_key, {})
+            due = sorted((s, m) for m, s in retries.items() if s <= now)[:count]
+            for _, member in due:
+                await self.xadd(stream, json.loads(member))
+                del retries[member]
+            return len(due)
+
+        return promote_retries
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def pending(self, stream="stratum:webhooks", group="webhook-processors"):
+        return self.groups[(stream, group)]["pending"]
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeStreamRedis) -> None:
+        self._redis = redis
+        self._calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+
+        return queue
+
+    async def execute(self):
+        return [
+            await getattr(self._redis, name)(*args, **kwargs)
+            for name, args, kwargs in self._calls
+        ]
+
+
+class _Processors:
+    def __init__(self, fail_times: int = 0) -> None:
+        self.seen: list[dict] = []
+        self.fail_times = fail_times
+
+    async def meta(self, payload):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise ConnectionError("graph API timed out")
+        self.seen.append(payload)
+
+    def table(self):
+        return {"meta": self.meta}
+
+
+@pytest.fixture
+def redis():
+    return FakeStreamRedis()
+
+
+@pytest.fixture
+async def queue(redis):
+    q = WebhookQueue(
+        redis,
+        consumer="c1",
+        max_attempts=3,
+        claim_idle_ms=1000,
+        retry_base_delay=10,
+        clock=lambda: redis.now_ms / 1000,
+    )
+    await q.ensure_group()
+    return q
+
+
+async def _drain(queue, processors):
+    totals = {"processed": 0, "duplicates": 0, "retried": 0, "dead": 0}
+    while entries := await queue.read_batch(block_ms=0):
+        for name, n in (await queue.process_batch(entries, processors)).items():
+            totals[name] += n
+    return totals
+
+
+# =============================================================================
+# Queue semantics
+# =============================================================================
+
+
+async def test_batch_is_processed_and_acknowledged(queue, redis):
+    processors = _Processors()
+    for n in range(3):
+        await queue.enqueue("meta", {"n": n}, f"meta:{n}")
+
+    totals = await _drain(queue, processors.table())
+
+    assert [p["n"] for p in processors.seen] == [0, 1, 2]
+    assert totals["processed"] == 3
+    assert redis.pending() == {}
+    assert redis.strings["stratum:webhooks:done:meta:1"] == "1"
+
+
+async def test_group_creation_is_idempotent(queue):
+    await queue.ensure_group()
+
+
+async def test_duplicate_keys_run_once(queue):
+    processors = _Processors()
+    await queue.enqueue("meta", {"n": 1}, "meta:abc")
+    await _drain(queue, processors.table())
+
+    # The platform retries the same delivery, twice in one batch
+    await queue.enqueue("meta", {"n": 1}, "meta:abc")
+    await queue.enqueue("meta", {"n": 1}, "meta:abc")
+    totals = await _drain(queue, processors.table())
+
+    assert len(processors.seen) == 1
+    assert totals["duplicates"] == 2
+
+
+async def test_failures_are_retried_then_dead_lettered(queue, redis):
+    await queue.enqueue("meta", {"n": 1}, "meta:flaky")
+    await queue.enqueue("meta", {"n": 2}, "meta:broken")
+    await queue.enqueue("unknown", {"n": 3}, "unknown:1")
+    flaky = _Processors(fail_times=1)
+
+    async def meta(payload):
+        if payload["n"] == 2:
+            raise ValueError("bad payload")
+        await flaky.meta(payload)
+
+    totals = await _drain(queue, {"meta": meta})
+    for _ in range(2):
+        redis.now_ms += 60_000
+        for name, n in (await _drain(queue, {"meta": meta})).items():
+            totals[name] += n
+
+    assert flaky.seen == [{"n": 1}]
+    assert totals["processed"] == 1
+    dead = redis.streams[queue.dead_stream]
+    assert [(f["key"], f["attempts"]) for _, f in dead] == [
+        ("unknown:1", "1"),
+        ("meta:broken", "3"),
+    ]
+    assert dead[1][1]["error"] == "bad payload"
+    assert redis.pending() == {}
+
+
+async def test_retries_wait_for_an_exponential_backoff(queue, redis):
+    processors = _Processors(fail_times=2)
+    await queue.enqueue("meta", {"n": 1}, "meta:flaky")
+
+    assert (await _drain(queue, processors.table()))["retried"] == 1
+    (due,) = redis.zsets[queue.retry_key].values()
+    assert due == 10
+
+    # Not run again until its delay has passed
+    redis.now_ms = 9_999
+    assert await queue.read_batch(block_ms=0) == []
+    redis.now_ms = 10_000
+    assert (await _drain(queue, processors.table()))["retried"] == 1
+
+    # The second delay is twice the first
+    (due,) = redis.zsets[queue.retry_key].values()
+    assert due == 10 + 20
+    redis.now_ms = 29_999
+    assert await queue.read_batch(block_ms=0) == []
+    redis.now_ms = 30_000
+    assert (await _drain(queue, processors.table()))["processed"] == 1
+
+    assert processors.seen == [{"n": 1}]
+    assert redis.zsets[queue.retry_key] == {}
+    assert redis.pending() == {}
+
+
+def test_retry_delay_is_capped():
+    queue = WebhookQueue(FakeStreamRedis(), retry_base_delay=5, retry_max_delay=300)
+    assert [queue.retry_delay(n) for n in (1, 2, 3, 7, 8)] == [5, 10, 20, 300, 300]
+
+
+async def test_entries_of_a_crashed_consumer_are_reclaimed(queue, redis):
+    await queue.enqueue("meta", {"n": 1}, "meta:1")
+    crashed = WebhookQueue(redis, consumer="c0", claim_idle_ms=1000)
+    assert len(await crashed.read_batch(block_ms=0)) == 1  # never settled
+
+    processors = _Processors()
+    assert await queue.read_batch(block_ms=0) == []
+
+    redis.now_ms += 1000
+    await _drain(queue, processors.table())
+    assert processors.seen == [{"n": 1}]
+    assert redis.pending() == {}
+
+
+async def test_run_consumer_stops_on_signal(queue):
+    stop = asyncio.Event()
+    seen = []
+
+    async def meta(payload):
+        seen.append(payload)
+        stop.set()
+
+    await queue.enqueue("meta", {"n": 1}, "meta:1")
+    await asyncio.wait_for(run_consumer(queue, {"meta": meta}, stop, block_ms=0), 1)
+
+    assert seen == [{"n": 1}]
+
+
+# =============================================================================
+# Receivers
+# =============================================================================
+
+
+@pytest.fixture
+def client(monkeypatch, queue):
+    monkeypatch.setattr(webhooks.config, "META_APP_SECRET", SECRET)
+    monkeypatch.setattr(webhooks, "_queue", queue)
+    return TestClient(webhooks.app)
+
+
+def _post_meta(client, body: bytes):
+    signature = hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return client.post(
+        "/webhooks/meta",
+        content=body,
+        headers={"X-Hub-Signature-256": f"sha256={signature}"},
+    )
+
+
+def test_receiver_enqueues_instead_of_processing(client, redis, monkeypatch):
+    processed = []
+    monkeypatch.setitem(webhooks.WEBHOOK_PROCESSORS, "meta", processed.append)
+    body = json.dumps({"object": "page", "entry": []}).encode()
+
+    response = _post_meta(client, body)
+
+    assert response.json() == {"status": "received"}
+    assert processed == []
+    ((_, fields),) = redis.streams["stratum:webhooks"]
+    assert fields["source"] == "meta"
+    assert fields["key"] == f"meta:{hashlib.sha256(body).hexdigest()}"
+    assert json.loads(fields["payload"]) == {"object": "page", "entry": []}
+
+
+def test_receiver_processes_in_process_when_redis_is_down(client, redis, monkeypatch):
+    processed = []
+
+    async def process(payload):
+        processed.append(payload)
+
+    async def broken(*args, **kwargs):
+        raise RedisConnectionError("connection refused")
+
+    monkeypatch.setitem(webhooks.WEBHOOK_PROCESSORS, "meta", process)
+    monkeypatch.setattr(redis, "xadd", broken)
+
+    response = _post_meta(client, b'{"object": "page", "entry": []}')
+
+    assert response.status_code == 200
+    assert processed == [{"object": "page", "entry": []}]
+
+
+def test_invalid_signature_is_not_enqueued(client, redis):
+    response = client.post(
+        "/webhooks/meta",
+        content=b"{}",
+        headers={"X-Hub-Signature-256": "sha256=deadbeef"},
+    )
+
+    assert response.status_code == 403
+    assert redis.streams["stratum:webhooks"] == []
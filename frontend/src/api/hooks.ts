@@ -419,6 +419,39 @@ export interface SystemHealthMetrics {
   }
 }
 
+export interface TaskTelemetryRow {
+  task_name: string
+  short_name: string
+  queue: string
+  executions: number
+  failures: number
+  retries: number
+  failure_rate: number | null
+  total_duration_ms: number
+  share_pct: number
+  avg_duration_ms: number | null
+  p50_duration_ms: number | null
+  p95_duration_ms: number | null
+  max_duration_ms: number
+  avg_wait_ms: number | null
+  p95_wait_ms: number | null
+  max_wait_ms: number | null
+  avg_rss_delta_kb: number | null
+  max_rss_delta_kb: number
+}
+
+export interface TaskTelemetrySummary {
+  enabled: boolean
+  window_hours: number
+  sort_by: string
+  total_executions: number
+  total_failures: number
+  total_retries: number
+  total_busy_ms: number
+  task_types: number
+  tasks: TaskTelemetryRow[]
+}
+
 export interface ChurnRisk {
   tenantId: number
   tenantName: string
@@ -537,6 +570,19 @@ export const superadminApi = {
     return response.data.data
   },
 
+  // Cross-worker Celery task telemetry
+  getTaskTelemetry: async (params?: {
+    hours?: number
+    limit?: number
+    sort_by?: string
+  }): Promise<TaskTelemetrySummary> => {
+    const response = await apiClient.get<ApiResponse<TaskTelemetrySummary>>(
+      '/superadmin/system/tasks',
+      { params }
+    )
+    return response.data.data
+  },
+
   // Churn Risks
   getChurnRisks: async (params?: {
     minRisk?: number
@@ -680,6 +726,18 @@ export function useSystemHealth() {
   })
 }
 
+/**
+ * Get the most expensive Celery tasks across all workers
+ */
+export function useTaskTelemetry(params?: { hours?: number; limit?: number; sort_by?: string }) {
+  return useQuery({
+    queryKey: ['superadmin', 'system', 'tasks', params],
+    queryFn: () => superadminApi.getTaskTelemetry(params),
+    staleTime: 60 * 1000,
+    refetchInterval: 60 * 1000,
+  })
+}
+
 /**
  * Get churn risk tenants
  */
@@ -6,7 +6,7 @@
 
 import { useState, useEffect } from 'react'
 import { cn } from '@/lib/utils'
-import { useSystemHealth } from '@/api/hooks'
+import { useSystemHealth, useTaskTelemetry } from '@/api/hooks'
 import {
   ServerIcon,
   CpuChipIcon,
@@ -23,6 +23,15 @@ import {
 
 type ServiceStatus = 'healthy' | 'degraded' | 'down'
 type QueueStatus = 'running' | 'paused' | 'stalled'
+type TaskSort = 'total_duration_ms' | 'p95_duration_ms' | 'p95_wait_ms' | 'avg_rss_delta_kb' | 'failures'
+
+const TASK_SORT_OPTIONS: Array<{ value: TaskSort; label: string }> = [
+  { value: 'total_duration_ms', label: 'Total time' },
+  { value: 'p95_duration_ms', label: 'p95 duration' },
+  { value: 'p95_wait_ms', label: 'p95 queue wait' },
+  { value: 'avg_rss_delta_kb', label: 'Memory growth' },
+  { value: 'failures', label: 'Failures' },
+]
 
 interface Service {
   id: string
@@ -66,8 +75,15 @@ export default function System() {
     queueName: string
   } | null>(null)
 
+  const [taskSort, setTaskSort] = useState<TaskSort>('total_duration_ms')
+
   // Fetch system health from API
   const { data: healthData, refetch, isLoading: _isLoading } = useSystemHealth()
+  const { data: taskTelemetry, refetch: refetchTasks } = useTaskTelemetry({
+    hours: 24,
+    limit: 15,
+    sort_by: taskSort,
+  })
 
   // Auto-refresh every 30 seconds
   useEffect(() => {
@@ -81,7 +97,7 @@ export default function System() {
   const handleRefresh = async () => {
     setRefreshing(true)
     try {
-      await refetch()
+      await Promise.all([refetch(), refetchTasks()])
       setLastRefresh(new Date())
     } finally {
       setRefreshing(false)
@@ -256,6 +272,19 @@ export default function System() {
     return `${Math.floor(seconds / 3600)}h`
   }
 
+  const formatMs = (ms: number | null) => {
+    if (ms === null) return '—'
+    if (ms < 1000) return `${Math.round(ms)}ms`
+    if (ms < 60000) return `${(ms / 1000).toFixed(1)}s`
+    return `${(ms / 60000).toFixed(1)}m`
+  }
+
+  const formatKb = (kb: number | null) => {
+    if (kb === null) return '—'
+    if (Math.abs(kb) < 1024) return `${Math.round(kb)} KB`
+    return `${(kb / 1024).toFixed(1)} MB`
+  }
+
   const formatTime = (date: Date) => {
     const mins = Math.floor((Date.now() - date.getTime()) / 60000)
     if (mins < 1) return 'Just now'
@@ -563,6 +592,101 @@ export default function System() {
         </div>
       </div>
 
+      {/* Worker Capacity: most expensive tasks across all workers */}
+      <div className="rounded-2xl bg-surface-secondary border border-foreground/10 overflow-hidden">
+        <div className="flex items-center justify-between gap-3 p-4 border-b border-foreground/10">
+          <div className="flex items-center gap-3">
+            <BoltIcon className="w-5 h-5 text-stratum-400" />
+            <div>
+              <h2 className="font-semibold text-white">Worker Capacity</h2>
+              <p className="text-xs text-muted-foreground">
+                Most expensive tasks across all workers, last {taskTelemetry?.window_hours ?? 24}h
+                {taskTelemetry && (
+                  <>
+                    {' '}&middot; {taskTelemetry.total_executions.toLocaleString()} runs,{' '}
+                    {formatMs(taskTelemetry.total_busy_ms)} busy,{' '}
+                    {taskTelemetry.total_retries.toLocaleString()} retries
+                  </>
+                )}
+              </p>
+            </div>
+          </div>
+          <select
+            value={taskSort}
+            onChange={(e) => setTaskSort(e.target.value as TaskSort)}
+            className="px-3 py-1.5 rounded-lg bg-surface-primary border border-foreground/10 text-sm text-white"
+          >
+            {TASK_SORT_OPTIONS.map((option) => (
+              <option key={option.value} value={option.value}>
+                {option.label}
+              </option>
+            ))}
+          </select>
+        </div>
+        {!taskTelemetry || taskTelemetry.tasks.length === 0 ? (
+          <div className="p-8 text-center text-muted-foreground text-sm">
+            {taskTelemetry && !taskTelemetry.enabled
+              ? 'Task telemetry is disabled (CELERY_TASK_TELEMETRY_ENABLED=false).'
+              : 'No task executions recorded in this window yet.'}
+          </div>
+        ) : (
+          <div className="overflow-x-auto">
+            <table className="w-full">
+              <thead>
+                <tr className="border-b border-foreground/10">
+                  <th className="text-left p-4 text-muted-foreground font-medium">Task</th>
+                  <th className="text-left p-4 text-muted-foreground font-medium">Queue</th>
+                  <th className="text-right p-4 text-muted-foreground font-medium">Runs</th>
+                  <th className="text-right p-4 text-muted-foreground font-medium">Share</th>
+                  <th className="text-right p-4 text-muted-foreground font-medium">Avg / p95</th>
+                  <th className="text-right p-4 text-muted-foreground font-medium">Queue Wait p95</th>
+                  <th className="text-right p-4 text-muted-foreground font-medium">Avg RSS Δ</th>
+                  <th className="text-right p-4 text-muted-foreground font-medium">Failed / Retried</th>
+                </tr>
+              </thead>
+              <tbody className="divide-y divide-foreground/5">
+                {taskTelemetry.tasks.map((task) => (
+                  <tr key={`${task.task_name}|${task.queue}`} className="hover:bg-foreground/5 transition-colors">
+                    <td className="p-4">
+                      <div className="font-medium text-white">{task.short_name}</div>
+                      <div className="text-xs text-muted-foreground">{task.task_name}</div>
+                    </td>
+                    <td className="p-4 text-muted-foreground">{task.queue}</td>
+                    <td className="p-4 text-right text-white">{task.executions.toLocaleString()}</td>
+                    <td className="p-4 text-right text-stratum-400">{task.share_pct}%</td>
+                    <td className="p-4 text-right text-white">
+                      {formatMs(task.avg_duration_ms)} / {formatMs(task.p95_duration_ms)}
+                    </td>
+                    <td
+                      className={cn(
+                        'p-4 text-right',
+                        (task.p95_wait_ms ?? 0) > 60000 ? 'text-warning' : 'text-muted-foreground'
+                      )}
+                    >
+                      {formatMs(task.p95_wait_ms)}
+                    </td>
+                    <td
+                      className={cn(
+                        'p-4 text-right',
+                        (task.avg_rss_delta_kb ?? 0) > 5120 ? 'text-warning' : 'text-muted-foreground'
+                      )}
+                    >
+                      {formatKb(task.avg_rss_delta_kb)}
+                    </td>
+                    <td className="p-4 text-right">
+                      <span className={task.failures > 0 ? 'text-danger' : 'text-muted-foreground'}>
+                        {task.failures}
+                      </span>
+                      <span className="text-muted-foreground"> / {task.retries}</span>
+                    </td>
+                  </tr>
+                ))}
+              </tbody>
+            </table>
+          </div>
+        )}
+      </div>
+
       {/* Confirmation Dialog */}
       {confirmDialog && (
         <div className="fixed inset-0 z-50 flex items-center justify-center">